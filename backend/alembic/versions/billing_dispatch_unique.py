@@ -0,0 +1,35 @@
+"""billing items unique per dispatch
+
+Revision ID: billing_dispatch_unique
+Revises: temperature_rollups
+Create Date: 2026-10-18 18:00:00.000000
+
+- invoice_line_items.dispatch_id / driver_settlement_items.dispatch_id 인덱스를 UNIQUE 로 변경
+  (배차당 청구/정산 항목 1건, 월간 일괄 청구/정산 재실행·동시 실행 시 중복 방지)
+- 기존 데이터에 같은 배차의 항목이 여러 건 있으면 먼저 정리해야 합니다
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'billing_dispatch_unique'
+down_revision: Union[str, Sequence[str], None] = 'temperature_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('invoice_line_items', 'driver_settlement_items')
+
+
+def upgrade() -> None:
+    for name in TABLES:
+        op.drop_index(f'ix_{name}_dispatch_id', table_name=name)
+        op.create_index(f'ix_{name}_dispatch_id', name, ['dispatch_id'], unique=True)
+
+
+def downgrade() -> None:
+    for name in TABLES:
+        op.drop_index(f'ix_{name}_dispatch_id', table_name=name)
+        op.create_index(f'ix_{name}_dispatch_id', name, ['dispatch_id'])
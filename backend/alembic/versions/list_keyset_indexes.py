@@ -0,0 +1,31 @@
+"""keyset pagination indexes for order / dispatch lists
+
+Revision ID: list_keyset_indexes
+Revises: billing_dispatch_unique
+Create Date: 2026-10-18 20:00:00.000000
+
+- orders(order_date, id), dispatches(dispatch_date, id): 목록 커서 페이지네이션 범위 조회
+- dispatch_routes(dispatch_id): 배차 목록 페이지의 주문번호 일괄 조회
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'list_keyset_indexes'
+down_revision: Union[str, Sequence[str], None] = 'billing_dispatch_unique'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_orders_order_date_id', 'orders', ['order_date', 'id'])
+    op.create_index('idx_dispatches_dispatch_date_id', 'dispatches', ['dispatch_date', 'id'])
+    op.create_index('ix_dispatch_routes_dispatch_id', 'dispatch_routes', ['dispatch_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dispatch_routes_dispatch_id', table_name='dispatch_routes')
+    op.drop_index('idx_dispatches_dispatch_date_id', table_name='dispatches')
+    op.drop_index('idx_orders_order_date_id', table_name='orders')
@@ -0,0 +1,206 @@
+"""telemetry partitions, composite indexes and rollup tables
+
+Revision ID: telemetry_partitions
+Revises: vehicle_latest_states
+Create Date: 2026-10-18 12:00:00.000000
+
+- telemetry_rollups_1m / telemetry_rollups_1h 생성
+- PostgreSQL: vehicle_gps_logs, vehicle_temperature_logs (created_at),
+  vehicle_locations, sensor_readings (recorded_at) 를 월별 RANGE 파티션 테이블로 전환
+  (기존 데이터 복사 포함 - 대용량 DB 는 점검 시간에 실행)
+- (vehicle_id, 시각) 복합 인덱스로 vehicle_id 단일 인덱스 대체
+- 파티션 테이블을 참조하는 FK (temperature_alerts.location_id, sensor_alerts.reading_id) 제거
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'telemetry_partitions'
+down_revision: Union[str, Sequence[str], None] = 'vehicle_latest_states'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 2
+
+# 테이블: (파티션 키, 외래키 [(컬럼, 참조 테이블)], 기존 vehicle_id 인덱스, 복합 인덱스, 그 외 인덱스 [(이름, 컬럼)])
+TABLES = {
+    'vehicle_gps_logs': (
+        'created_at',
+        [('vehicle_id', 'vehicles')],
+        'idx_vehicle_gps_vehicle_id',
+        'idx_vehicle_gps_vehicle_created',
+        [
+            ('ix_vehicle_gps_logs_id', ['id']),
+            ('ix_vehicle_gps_logs_tid_id', ['tid_id']),
+            ('idx_vehicle_gps_tid', ['tid_id']),
+            ('idx_vehicle_gps_date_time', ['bi_date', 'bi_time']),
+            ('idx_vehicle_gps_created', ['created_at']),
+        ],
+    ),
+    'vehicle_temperature_logs': (
+        'created_at',
+        [('vehicle_id', 'vehicles')],
+        'idx_vehicle_temp_vehicle_id',
+        'idx_vehicle_temp_vehicle_created',
+        [
+            ('ix_vehicle_temperature_logs_id', ['id']),
+            ('ix_vehicle_temperature_logs_tid_id', ['tid_id']),
+            ('idx_vehicle_temp_tid', ['tid_id']),
+            ('idx_vehicle_temp_date_time', ['tpl_date', 'tpl_time']),
+            ('idx_vehicle_temp_created', ['created_at']),
+        ],
+    ),
+    'vehicle_locations': (
+        'recorded_at',
+        [('vehicle_id', 'vehicles'), ('dispatch_id', 'dispatches')],
+        'ix_vehicle_locations_vehicle_id',
+        'idx_vehicle_locations_vehicle_recorded',
+        [
+            ('ix_vehicle_locations_id', ['id']),
+            ('ix_vehicle_locations_dispatch_id', ['dispatch_id']),
+            ('ix_vehicle_locations_recorded_at', ['recorded_at']),
+        ],
+    ),
+    'sensor_readings': (
+        'recorded_at',
+        [('vehicle_id', 'vehicles'), ('sensor_id', 'vehicle_sensors')],
+        'ix_sensor_readings_vehicle_id',
+        'idx_sensor_readings_vehicle_recorded',
+        [
+            ('ix_sensor_readings_id', ['id']),
+            ('ix_sensor_readings_sensor_id', ['sensor_id']),
+            ('ix_sensor_readings_recorded_at', ['recorded_at']),
+        ],
+    ),
+}
+
+# 파티션 테이블을 참조하는 FK (PostgreSQL 은 파티션 키가 없는 고유키를 참조할 수 없음)
+REFERENCING_FKS = [
+    ('temperature_alerts', 'temperature_alerts_location_id_fkey', 'location_id', 'vehicle_locations'),
+    ('sensor_alerts', 'sensor_alerts_reading_id_fkey', 'reading_id', 'sensor_readings'),
+]
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + (value.month == 12), value.month % 12 + 1, 1)
+
+
+def _create_rollup_table(name: str) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('vehicle_id', sa.Integer(), nullable=False),
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('value_sum', sa.Float(), nullable=False),
+        sa.Column('value_min', sa.Float(), nullable=True),
+        sa.Column('value_max', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['vehicle_id'], ['vehicles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('vehicle_id', 'metric', 'bucket_start', name=f'uq_{name}_bucket'),
+    )
+    op.create_index(f'idx_{name}_bucket', name, ['bucket_start'])
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """
+    같은 컬럼 구성으로 테이블 재생성 후 데이터 복사 (일반 <-> 월별 파티션)
+
+    id 시퀀스는 그대로 재사용합니다.
+    """
+    time_column, foreign_keys, _, composite_index, indexes = TABLES[table]
+    legacy = f'{table}_legacy'
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+    op.execute(f'ALTER INDEX {table}_pkey RENAME TO {legacy}_pkey')  # 인덱스 이름은 스키마 내 고유
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY NONE')
+    for name, _ in indexes:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    for name in (TABLES[table][2], composite_index):
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+    if partitioned:
+        # 파티션 키는 기본키에 포함되어야 하므로 NOT NULL
+        op.execute(f'UPDATE {legacy} SET {time_column} = now() WHERE {time_column} IS NULL')
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE ({time_column})'
+        )
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {time_column} SET NOT NULL')
+        op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, {time_column})')
+
+        first = op.get_bind().execute(sa.text(f'SELECT min({time_column}) FROM {legacy}')).scalar()
+        today = datetime.utcnow().date()
+        month = date((first or today).year, (first or today).month, 1)
+        last = today
+        for _ in range(MONTHS_AHEAD):
+            last = _next_month(last)
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+            )
+            month = _next_month(month)
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+    else:
+        op.execute(f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id)')
+
+    for column, referred in foreign_keys:
+        op.create_foreign_key(f'{table}_{column}_fkey', table, referred, [column], ['id'])
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {legacy}')
+    op.execute(f'DROP TABLE {legacy}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+
+    for name, columns in indexes:
+        op.create_index(name, table, columns)
+    if partitioned:
+        op.create_index(composite_index, table, ['vehicle_id', time_column])
+    else:
+        op.create_index(TABLES[table][2], table, ['vehicle_id'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _create_rollup_table('telemetry_rollups_1m')
+    _create_rollup_table('telemetry_rollups_1h')
+
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite(개발): 파티션 없이 인덱스만 교체 (FK 는 batch 재생성이 필요하므로 유지)
+        for table, (time_column, _, vehicle_index, composite_index, _) in TABLES.items():
+            op.execute(f'DROP INDEX IF EXISTS {vehicle_index}')
+            op.create_index(composite_index, table, ['vehicle_id', time_column], if_not_exists=True)
+        return
+
+    for table, constraint, _, _ in REFERENCING_FKS:
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}')
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        for table, (_, _, vehicle_index, composite_index, _) in TABLES.items():
+            op.execute(f'DROP INDEX IF EXISTS {composite_index}')
+            op.create_index(vehicle_index, table, ['vehicle_id'], if_not_exists=True)
+    else:
+        for table in TABLES:
+            _rebuild(table, partitioned=False)
+        # 보존 기간 정리로 삭제된 행을 참조할 수 있으므로 기존 행은 검증하지 않음
+        for table, constraint, column, referred in REFERENCING_FKS:
+            op.execute(
+                f'ALTER TABLE {table} ADD CONSTRAINT {constraint} '
+                f'FOREIGN KEY ({column}) REFERENCES {referred} (id) NOT VALID'
+            )
+
+    for name in ('telemetry_rollups_1h', 'telemetry_rollups_1m'):
+        op.drop_index(f'idx_{name}_bucket', table_name=name)
+        op.drop_table(name)
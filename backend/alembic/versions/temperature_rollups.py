@@ -0,0 +1,62 @@
+"""temperature analytics rollups
+
+Revision ID: temperature_rollups
+Revises: telemetry_partitions
+Create Date: 2026-10-18 15:00:00.000000
+
+- temperature_rollups_5m / temperature_rollups_1h / temperature_rollups_1d 생성
+  (TemperatureRollupService 가 원시 온도 로그에서 증분 집계, 첫 실행 시 1일 단위로 백필)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'temperature_rollups'
+down_revision: Union[str, Sequence[str], None] = 'telemetry_partitions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('temperature_rollups_5m', 'temperature_rollups_1h', 'temperature_rollups_1d')
+
+
+def _sensor_columns(sensor: str) -> list:
+    return [
+        sa.Column(f'temp_{sensor}_count', sa.Integer(), nullable=False),
+        sa.Column(f'temp_{sensor}_sum', sa.Float(), nullable=False),
+        sa.Column(f'temp_{sensor}_sq_sum', sa.Float(), nullable=False),
+        sa.Column(f'temp_{sensor}_min', sa.Float(), nullable=True),
+        sa.Column(f'temp_{sensor}_max', sa.Float(), nullable=True),
+        sa.Column(f'temp_{sensor}_too_hot', sa.Integer(), nullable=False),
+        sa.Column(f'temp_{sensor}_too_cold', sa.Integer(), nullable=False),
+        sa.Column(f'temp_{sensor}_out_of_range_seconds', sa.Float(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in TABLES:
+        op.create_table(
+            name,
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('vehicle_id', sa.Integer(), nullable=False),
+            sa.Column('bucket_start', sa.DateTime(), nullable=False),
+            sa.Column('record_count', sa.Integer(), nullable=False),
+            sa.Column('sample_slots', sa.Integer(), nullable=False),
+            *_sensor_columns('a'),
+            *_sensor_columns('b'),
+            sa.ForeignKeyConstraint(['vehicle_id'], ['vehicles.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('vehicle_id', 'bucket_start', name=f'uq_{name}_bucket'),
+        )
+        op.create_index(f'idx_{name}_bucket', name, ['bucket_start'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(TABLES):
+        op.drop_index(f'idx_{name}_bucket', table_name=name)
+        op.drop_table(name)
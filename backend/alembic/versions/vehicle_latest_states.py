@@ -0,0 +1,71 @@
+"""add vehicle latest states
+
+Revision ID: vehicle_latest_states
+Revises: a6eb2e22dbd2
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'vehicle_latest_states'
+down_revision: Union[str, Sequence[str], None] = 'a6eb2e22dbd2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'vehicle_latest_states',
+        sa.Column('vehicle_id', sa.Integer(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('speed_kmh', sa.Float(), nullable=True),
+        sa.Column('heading', sa.Float(), nullable=True),
+        sa.Column('is_engine_on', sa.Boolean(), nullable=True),
+        sa.Column('gps_recorded_at', sa.DateTime(), nullable=True),
+        sa.Column('temperature_a', sa.Float(), nullable=True),
+        sa.Column('temperature_b', sa.Float(), nullable=True),
+        sa.Column('temperature_recorded_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['vehicle_id'], ['vehicles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('vehicle_id')
+    )
+    op.create_index('ix_vehicle_latest_states_updated_at', 'vehicle_latest_states', ['updated_at'])
+
+    # 기존 로그에서 차량별 최신 위치/온도 채우기 (created_at 기준, UTC)
+    op.execute("""
+        INSERT INTO vehicle_latest_states
+            (vehicle_id, latitude, longitude, speed_kmh, is_engine_on, gps_recorded_at, updated_at)
+        SELECT DISTINCT ON (vehicle_id)
+            vehicle_id, latitude, longitude, speed_kmh, is_engine_on,
+            created_at AT TIME ZONE 'UTC', now() AT TIME ZONE 'UTC'
+        FROM vehicle_gps_logs
+        WHERE vehicle_id IS NOT NULL AND latitude IS NOT NULL AND longitude IS NOT NULL
+        ORDER BY vehicle_id, created_at DESC, id DESC
+    """)
+    op.execute("""
+        INSERT INTO vehicle_latest_states
+            (vehicle_id, temperature_a, temperature_b, temperature_recorded_at, updated_at)
+        SELECT DISTINCT ON (vehicle_id)
+            vehicle_id, temperature_a, temperature_b,
+            created_at AT TIME ZONE 'UTC', now() AT TIME ZONE 'UTC'
+        FROM vehicle_temperature_logs
+        WHERE vehicle_id IS NOT NULL
+        ORDER BY vehicle_id, created_at DESC, id DESC
+        ON CONFLICT (vehicle_id) DO UPDATE SET
+            temperature_a = EXCLUDED.temperature_a,
+            temperature_b = EXCLUDED.temperature_b,
+            temperature_recorded_at = EXCLUDED.temperature_recorded_at
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_vehicle_latest_states_updated_at', table_name='vehicle_latest_states')
+    op.drop_table('vehicle_latest_states')
@@ -176,6 +176,38 @@ async def get_dashboard_summary(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/analytics/kpis", response_model=List[KPIResponse])
+async def get_kpis(
+    period: str = Query('last_7_days'),
+    keys: Optional[str] = Query(None, description="KPI 키 (쉼표 구분, 미지정 시 전체). 예: order_completion_rate,daily_revenue"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """KPI 조합 조회 (팩트 테이블당 1회 집계, 전 기간 대비 변화 포함)"""
+    start_date, end_date = parse_date_range(period)
+    key_list = [key.strip() for key in keys.split(',') if key.strip()] if keys else None
+    try:
+        kpis = AnalyticsService(db).get_kpis(start_date, end_date, key_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"KPI 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return [
+        KPIResponse(
+            name=kpi.name,
+            value=kpi.value,
+            unit=kpi.unit,
+            target=kpi.target,
+            status=kpi.status,
+            change=kpi.change,
+            trend=kpi.trend
+        )
+        for kpi in kpis
+    ]
+
+
 @router.get("/analytics/kpi/order-completion-rate", response_model=KPIResponse)
 async def get_order_completion_rate(
     period: str = Query('last_7_days'),
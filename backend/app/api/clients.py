@@ -4,7 +4,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from pathlib import Path
 
+from app.api.auth import get_current_user
 from app.core.database import get_db
+from app.models import User
 from app.models.client import Client
 from app.schemas.client import (
     ClientCreate, ClientUpdate, ClientResponse, ClientListResponse,
@@ -126,6 +128,28 @@ async def upload_clients_excel(
         logger.error(f"Error uploading clients: {e}")
         raise HTTPException(status_code=500, detail="업로드 중 오류가 발생했습니다")
 
+@router.post("/upload/jobs", status_code=202)
+async def submit_clients_upload_job(
+    file: UploadFile = File(...),
+    auto_geocode: bool = Query(True, description="자동 지오코딩 실행"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    엑셀 파일로 거래처 일괄 업로드 작업 등록 (비동기)
+
+    즉시 job_id 를 반환하고 청크 저장 진행률을 WebSocket `/ws/optimization-jobs/{job_id}` 로 전송합니다.
+    결과(GET `/optimization-jobs/{job_id}`)는 /upload 와 같은 형식입니다.
+    """
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise HTTPException(status_code=400, detail="엑셀 파일만 업로드 가능합니다")
+
+    content = await file.read()
+    job = await ExcelUploadService.submit_import_job(
+        "clients", content, filename=file.filename, user_id=current_user.id, auto_geocode=auto_geocode
+    )
+    return job.to_dict(include_result=False)
+
+
 
 @router.post("/geocode/auto", response_model=GeocodeResponse)
 async def auto_geocode_missing_clients(
@@ -9,13 +9,14 @@ from datetime import datetime, date
 from pydantic import BaseModel, Field
 import logging
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.api.auth import get_current_user
 from app.models import User
 from app.services.dispatch_optimization_service import (
     DispatchOptimizationService,
     OptimizationResult
 )
+from app.services.optimization_job_service import optimization_job_service
 
 logger = logging.getLogger(__name__)
 
@@ -128,6 +129,32 @@ class DistanceMatrixResponse(BaseModel):
 # API 엔드포인트
 # ========================================
 
+def _to_response(result: OptimizationResult) -> OptimizationResponse:
+    """최적화 결과 → 응답 스키마"""
+    return OptimizationResponse(
+        optimization_id=result.optimization_id,
+        status=result.status,
+        summary=OptimizationSummary(**result.summary),
+        routes=[
+            RouteResponse(
+                route_id=route.route_id,
+                vehicle_id=route.vehicle_id,
+                driver_id=route.driver_id,
+                orders=route.orders,
+                sequence=[RouteSequencePoint(**point) for point in route.sequence],
+                total_distance=route.total_distance,
+                total_time=route.total_time,
+                total_load_weight=route.total_load_weight,
+                total_load_pallets=route.total_load_pallets,
+                estimated_cost=route.estimated_cost
+            )
+            for route in result.routes
+        ],
+        unassigned_orders=result.unassigned_orders,
+        created_at=result.created_at
+    )
+
+
 @router.post("/dispatch-optimization/optimize", response_model=OptimizationResponse)
 async def optimize_dispatch(
     request: OptimizeRequest,
@@ -152,8 +179,8 @@ async def optimize_dispatch(
         # 서비스 초기화
         service = DispatchOptimizationService(db)
         
-        # 최적화 실행
-        result = service.optimize_dispatch(
+        # 최적화 실행 (솔버는 프로세스 풀에서 실행, 이벤트 루프 비차단)
+        result = await service.optimize_dispatch_async(
             order_ids=request.order_ids,
             date=request.date,
             constraints=request.constraints.dict(),
@@ -161,28 +188,7 @@ async def optimize_dispatch(
         )
         
         # 응답 생성
-        response = OptimizationResponse(
-            optimization_id=result.optimization_id,
-            status=result.status,
-            summary=OptimizationSummary(**result.summary),
-            routes=[
-                RouteResponse(
-                    route_id=route.route_id,
-                    vehicle_id=route.vehicle_id,
-                    driver_id=route.driver_id,
-                    orders=route.orders,
-                    sequence=[RouteSequencePoint(**point) for point in route.sequence],
-                    total_distance=route.total_distance,
-                    total_time=route.total_time,
-                    total_load_weight=route.total_load_weight,
-                    total_load_pallets=route.total_load_pallets,
-                    estimated_cost=route.estimated_cost
-                )
-                for route in result.routes
-            ],
-            unassigned_orders=result.unassigned_orders,
-            created_at=result.created_at
-        )
+        response = _to_response(result)
         
         logger.info(f"최적화 완료: {result.optimization_id}, {len(result.routes)}개 경로")
         
@@ -193,6 +199,46 @@ async def optimize_dispatch(
         raise HTTPException(status_code=500, detail=f"최적화 실패: {str(e)}")
 
 
+@router.post("/dispatch-optimization/jobs", status_code=202)
+async def submit_optimization_job(
+    request: OptimizeRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    배차 최적화 작업 등록 (비동기)
+    
+    즉시 job_id 를 반환하고 OR-Tools 솔버는 솔버 프로세스 풀에서 실행됩니다.
+    
+    - 진행 상황: WebSocket `/ws/optimization-jobs/{job_id}` (현재 최적 비용)
+    - 결과 조회: GET `/optimization-jobs/{job_id}`
+    """
+    async def runner(job):
+        db = SessionLocal()
+        try:
+            await optimization_job_service.report_progress(job.job_id, progress=5, message="데이터 로드 중")
+            service = DispatchOptimizationService(db)
+            result = await service.optimize_dispatch_async(
+                order_ids=request.order_ids,
+                date=request.date,
+                constraints=request.constraints.dict(),
+                options=request.options.dict(),
+                progress=optimization_job_service.solver_progress(job.job_id)
+            )
+            return _to_response(result).dict()
+        finally:
+            db.close()
+    
+    job = await optimization_job_service.submit(
+        "dispatch_optimization",
+        runner,
+        params=request.dict(),
+        user_id=current_user.id
+    )
+    logger.info(f"배차 최적화 작업 등록: {job.job_id}, 사용자={current_user.username}, 주문={len(request.order_ids)}개")
+    
+    return job.to_dict(include_result=False)
+
+
 @router.get("/dispatch-optimization/status/{optimization_id}")
 async def get_optimization_status(
     optimization_id: str,
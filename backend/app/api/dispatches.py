@@ -1,13 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func
 from typing import Optional
 from datetime import date, datetime
 import pandas as pd
 from pathlib import Path
 import tempfile
-import asyncio
 
 from app.core.database import get_db
 from app.models.dispatch import Dispatch, DispatchStatus
@@ -21,6 +20,7 @@ from app.schemas.dispatch import (
 )
 from app.services.dispatch_optimization_service import DispatchOptimizationService
 from app.services.cvrptw_service import AdvancedDispatchOptimizationService
+from app.services.list_query import CountMode, InvalidCursorError, list_dispatches
 from loguru import logger
 
 router = APIRouter()
@@ -105,58 +105,23 @@ async def optimize_dispatch_cvrptw(
 def get_dispatches(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정 시 skip 무시)"),
+    count: CountMode = Query("exact", description="전체 건수: exact / approx / none"),
     status: Optional[DispatchStatus] = None,
     dispatch_date: Optional[date] = None,
     vehicle_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    """배차 목록 조회"""
-    query = db.query(Dispatch)
-    
-    if status:
-        query = query.filter(Dispatch.status == status)
-    
-    if dispatch_date:
-        query = query.filter(Dispatch.dispatch_date == dispatch_date)
-    
-    if vehicle_id:
-        query = query.filter(Dispatch.vehicle_id == vehicle_id)
-    
-    query = query.order_by(Dispatch.dispatch_date.desc(), Dispatch.created_at.desc())
-    
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
-    
-    # Add vehicle and driver info
-    for item in items:
-        if item.vehicle:
-            item.vehicle_code = item.vehicle.code
-            item.vehicle_plate = item.vehicle.plate_number
-            # Also include driver info from vehicle if dispatch.driver is not set
-            if not item.driver and item.vehicle.driver_name:
-                item.driver_name = item.vehicle.driver_name
-        if item.driver:
-            item.driver_name = item.driver.name
-        
-        # Add order numbers and addresses (comma-separated)
-        order_numbers = []
-        pickup_addresses = []
-        delivery_addresses = []
-        
-        for route in item.routes:
-            if route.order_id and route.order:
-                order_numbers.append(route.order.order_number)
-                if route.route_type == 'PICKUP' and route.order.pickup_address:
-                    pickup_addresses.append(route.order.pickup_address)
-                elif route.route_type == 'DELIVERY' and route.order.delivery_address:
-                    delivery_addresses.append(route.order.delivery_address)
-        
-        item.order_numbers = ", ".join(order_numbers) if order_numbers else None
-        # Add pickup/delivery addresses as dynamic attributes
-        item.pickup_address = ", ".join(set(pickup_addresses)) if pickup_addresses else None
-        item.delivery_address = ", ".join(set(delivery_addresses)) if delivery_addresses else None
-    
-    return DispatchListResponse(total=total, items=items)
+    """배차 목록 조회 (배차일자, ID 내림차순)"""
+    try:
+        page = list_dispatches(
+            db, limit=limit, cursor=cursor, skip=skip, count_mode=count,
+            status=status, dispatch_date=dispatch_date, vehicle_id=vehicle_id,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return DispatchListResponse(total=page.total, items=page.items, next_cursor=page.next_cursor)
 
 
 @router.get("/dashboard", response_model=DashboardStatsResponse)
@@ -220,110 +185,25 @@ async def websocket_dashboard(websocket: WebSocket):
     """
     대시보드 실시간 업데이트 WebSocket
     
-    클라이언트에게 5초마다 대시보드 통계를 전송합니다.
+    연결 즉시 전체 통계를 전송하고, 이후에는 변경된 항목만 전송합니다.
+    통계는 공유 생산자가 주기마다 1회 집계합니다 (클라이언트 수와 무관).
     """
-    from app.core.database import SessionLocal
-    from datetime import date, datetime
+    from app.services.dashboard_stats_service import dashboard_stats_producer
     
     await websocket.accept()
-    logger.info("✅ Dashboard WebSocket connected, will send real data immediately")
+    logger.info("✅ Dashboard WebSocket connected")
     
     try:
-        while True:
-            # 연결 상태 먼저 체크
-            if websocket.client_state.name != "CONNECTED":
-                logger.info(f"WebSocket not in CONNECTED state: {websocket.client_state.name}, exiting loop")
-                break
-            
-            # DB 쿼리를 비동기로 실행하여 성능 향상
-            try:
-                logger.info("🔄 Starting to collect dashboard stats...")
-                # Define sync helper function
-                def collect_stats():
-                    from app.models.vehicle import Vehicle
-                    
-                    db = SessionLocal()
-                    try:
-                        today = date.today()
-                        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                        
-                        # Optimize: Use single query with conditional aggregation
-                        from sqlalchemy import case
-                        
-                        # Single optimized query for orders
-                        order_stats = db.query(
-                            func.count(Order.id).label('total'),
-                            func.sum(case((Order.status == OrderStatus.PENDING, 1), else_=0)).label('pending')
-                        ).filter(
-                            Order.created_at >= today_start
-                        ).first()
-                        
-                        total_orders = order_stats.total or 0
-                        pending_orders = order_stats.pending or 0
-                        
-                        # Single optimized query for dispatches  
-                        dispatch_stats = db.query(
-                            func.sum(case((Dispatch.status.in_([DispatchStatus.CONFIRMED, DispatchStatus.IN_PROGRESS]), 1), else_=0)).label('active'),
-                            func.sum(case((and_(Dispatch.status == DispatchStatus.COMPLETED, Dispatch.dispatch_date == today), 1), else_=0)).label('completed')
-                        ).first()
-                        
-                        active_dispatches = dispatch_stats.active or 0
-                        completed_today = dispatch_stats.completed or 0
-                        
-                        # Single optimized query for vehicles
-                        vehicle_stats = db.query(
-                            func.sum(case((and_(Vehicle.status == VehicleStatus.AVAILABLE, Vehicle.is_active == True), 1), else_=0)).label('available'),
-                            func.sum(case((Vehicle.status == VehicleStatus.IN_USE, 1), else_=0)).label('active')
-                        ).first()
-                        
-                        available_vehicles = vehicle_stats.available or 0
-                        active_vehicles = vehicle_stats.active or 0
-                        
-                        return {
-                            "total_orders": total_orders,
-                            "pending_orders": pending_orders,
-                            "active_dispatches": active_dispatches,
-                            "completed_today": completed_today,
-                            "available_vehicles": available_vehicles,
-                            "active_vehicles": active_vehicles,
-                            "revenue_today": 0.0,
-                            "revenue_month": 0.0,
-                            "timestamp": datetime.now().isoformat(),
-                            "loading": False
-                        }
-                    finally:
-                        db.close()
-                
-                # Run in thread pool to avoid blocking
-                logger.info("⏳ Executing DB queries in thread pool...")
-                stats = await asyncio.to_thread(collect_stats)
-                logger.info(f"✅ Stats collected successfully: {stats}")
-                
-                # Try to send data
-                try:
-                    await websocket.send_json(stats)
-                    logger.info(f"📊 Sent dashboard stats: pending={stats['pending_orders']}, active={stats['active_dispatches']}")
-                except Exception as send_error:
-                    logger.warning(f"Failed to send stats: {type(send_error).__name__}: {send_error}")
-                    break  # Exit loop if send fails
-                
-            except Exception as inner_e:
-                error_type = type(inner_e).__name__
-                logger.error(f"Error collecting stats: {error_type}: {str(inner_e)}", exc_info=True)
-                # Break on any error
-                break
-            
-            # Wait 5 seconds before next update
-            await asyncio.sleep(5)
-    
+        await dashboard_stats_producer.stream(websocket)
     except WebSocketDisconnect:
-        logger.info("WebSocket disconnected: dashboard")
+        pass
     except Exception as e:
         logger.error(f"WebSocket error: {e}", exc_info=True)
         try:
             await websocket.close()
         except:
             pass
+    logger.info("WebSocket disconnected: dashboard")
 
 
 @router.websocket("/ws/alerts")
@@ -2,15 +2,17 @@
 Phase 12: 통합 배차 API
 자동 배차, 차량 지도, 경로 조회, 분석
 """
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
 from pydantic import BaseModel
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.services.integrated_dispatch_service import IntegratedDispatchService
 from app.services.dispatch_analytics_service import DispatchAnalyticsService
+from app.services.optimization_job_service import optimization_job_service
 from app.core.auth import get_current_user
 from app.models.user import User
 
@@ -349,6 +351,69 @@ async def batch_auto_dispatch(
     }
 
 
+@router.post("/dispatch/batch/jobs", status_code=202)
+async def submit_batch_auto_dispatch_job(
+    order_ids: list[int],
+    apply_rules: bool = True,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    여러 주문 일괄 자동 배차 작업 등록 (비동기)
+    
+    즉시 job_id 를 반환하고 주문별 진행 상황을 WebSocket `/ws/optimization-jobs/{job_id}` 로 전송합니다.
+    결과(GET `/optimization-jobs/{job_id}`)는 /dispatch/batch 와 같은 형식입니다.
+    """
+    async def runner(job):
+        loop = asyncio.get_running_loop()
+        
+        async def dispatch_all(db: Session):
+            service = IntegratedDispatchService(db)
+            results = []
+            
+            for idx, order_id in enumerate(order_ids, start=1):
+                result = await service.auto_dispatch(
+                    order_id=order_id,
+                    apply_rules=apply_rules,
+                    simulate=False
+                )
+                results.append(result)
+                # 작업 스레드 -> API 이벤트 루프로 진행 상황 전달
+                asyncio.run_coroutine_threadsafe(
+                    optimization_job_service.report_progress(
+                        job.job_id,
+                        progress=idx / len(order_ids) * 100,
+                        message=f"{idx}/{len(order_ids)} 주문 처리"
+                    ),
+                    loop
+                )
+            return results
+        
+        def run():
+            # 배차 조회/평가/저장은 스레드 전용 세션으로 API 이벤트 루프 밖에서 실행
+            db = SessionLocal()
+            try:
+                return asyncio.run(dispatch_all(db))
+            finally:
+                db.close()
+        
+        results = await asyncio.to_thread(run)
+        success_count = sum(1 for r in results if r["success"])
+        return {
+            "total": len(order_ids),
+            "success": success_count,
+            "failed": len(results) - success_count,
+            "results": results
+        }
+    
+    job = await optimization_job_service.submit(
+        "integrated_dispatch",
+        runner,
+        params={"order_ids": order_ids, "apply_rules": apply_rules},
+        user_id=current_user.id
+    )
+    return job.to_dict(include_result=False)
+
+
 @router.get("/dispatch/analytics/statistics")
 async def get_dispatch_statistics(
     start_date: Optional[datetime] = Query(None, description="시작 날짜"),
@@ -4,19 +4,21 @@ ML Dispatch API Endpoints
 Phase 2: Historical data simulation and performance benchmarking
 """
 
+import asyncio
 from typing import List, Optional
 from datetime import datetime, date
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from loguru import logger
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.models.user import User
 from app.models.vehicle import Vehicle, VehicleStatus
 from app.models.order import Order, OrderStatus
 from app.models.dispatch import Dispatch, DispatchStatus
 from app.api.auth import get_current_user
 from app.services.ml_dispatch_service import MLDispatchService
+from app.services.optimization_job_service import optimization_job_service
 from app.services.ab_test_service import ABTestService, ABTestMetricsService
 
 
@@ -95,6 +97,7 @@ async def simulate_historical_dispatch(
         
         # ML 서비스 초기화
         ml_service = MLDispatchService(db)
+        snapshot = ml_service.load_vehicle_snapshot(vehicles)
         
         # 시뮬레이션 실행
         comparisons = []
@@ -103,7 +106,7 @@ async def simulate_historical_dispatch(
         
         for order in orders:
             # ML 추천 생성
-            rankings = await ml_service.optimize_single_order(order, vehicles)
+            rankings = await ml_service.optimize_single_order(order, vehicles, snapshot=snapshot)
             
             if not rankings:
                 logger.warning(f"No ML recommendation for order {order.order_number}")
@@ -291,6 +294,7 @@ async def get_simulation_metrics(
 async def optimize_dispatch_ml(
     order_ids: List[int],
     mode: str = Query("recommend", regex="^(recommend|auto)$"),
+    scoring_mode: str = Query("matrix", regex="^(matrix|sequential)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -300,6 +304,7 @@ async def optimize_dispatch_ml(
     Args:
         order_ids: 배차할 주문 ID 리스트
         mode: 'recommend' (추천만) or 'auto' (자동 배차)
+        scoring_mode: 'matrix' (주문×차량 일괄 계산) or 'sequential' (주문별 계산)
     
     Example:
         POST /api/ml-dispatch/optimize?mode=recommend
@@ -327,114 +332,184 @@ async def optimize_dispatch_ml(
         }
     """
     try:
-        # 주문 조회
-        orders = (
-            db.query(Order)
-            .filter(Order.id.in_(order_ids))
-            .filter(Order.status == OrderStatus.PENDING)
-            .all()
-        )
-        
-        if not orders:
-            raise HTTPException(status_code=404, detail="No pending orders found")
+        return await _optimize_orders(db, order_ids, mode, scoring_mode, current_user.id)
         
-        # 가용 차량 조회
-        vehicles = (
-            db.query(Vehicle)
-            .filter(Vehicle.status == VehicleStatus.AVAILABLE)
-            .filter(Vehicle.is_active == True)
-            .all()
-        )
-        
-        if not vehicles:
-            raise HTTPException(status_code=400, detail="No available vehicles")
-        
-        # ML 서비스 실행
-        ml_service = MLDispatchService(db)
-        optimization_results = await ml_service.optimize_dispatch(orders, vehicles)
-        
-        # 결과 포맷팅
-        results = []
-        dispatches_created = []
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"ML optimization error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _optimize_orders(
+    db: Session,
+    order_ids: List[int],
+    mode: str,
+    scoring_mode: str,
+    user_id: int,
+    progress=None
+) -> dict:
+    """
+    ML 배차 최적화 실행 (동기 API / 비동기 작업 공용)
+    
+    progress: 진행 상황 콜백 (async, (진행률, 메시지))
+    """
+    # 주문 조회
+    orders = (
+        db.query(Order)
+        .filter(Order.id.in_(order_ids))
+        .filter(Order.status == OrderStatus.PENDING)
+        .all()
+    )
+    
+    if not orders:
+        raise HTTPException(status_code=404, detail="No pending orders found")
+    
+    # 가용 차량 조회
+    vehicles = (
+        db.query(Vehicle)
+        .filter(Vehicle.status == VehicleStatus.AVAILABLE)
+        .filter(Vehicle.is_active == True)
+        .all()
+    )
+    
+    if not vehicles:
+        raise HTTPException(status_code=400, detail="No available vehicles")
+    
+    # ML 서비스 실행
+    ml_service = MLDispatchService(db, scoring_mode=scoring_mode)
+    optimization_results = await ml_service.optimize_dispatch(orders, vehicles)
+    
+    if progress:
+        await progress(70, f"{len(orders)}건 점수 계산 완료")
+    
+    # 결과 포맷팅
+    results = []
+    dispatches_created = []
+    
+    for result in optimization_results:
+        order = result['order']
+        rankings = result['rankings']
         
-        for result in optimization_results:
-            order = result['order']
-            rankings = result['rankings']
-            
-            if not rankings:
-                logger.warning(f"No vehicles available for order {order.order_number}")
-                results.append({
-                    "order_id": order.id,
-                    "order_number": order.order_number,
-                    "error": "No eligible vehicles",
-                    "top_3": []
-                })
-                continue
-            
-            # Auto mode: 자동 배차
-            if mode == "auto":
-                best = rankings[0]
-                
-                dispatch = Dispatch(
-                    order_id=order.id,
-                    vehicle_id=best.vehicle.id,
-                    optimization_score=best.total_score,
-                    assigned_by='ml_auto',
-                    assigned_user_id=current_user.id,
-                    status=DispatchStatus.ASSIGNED
-                )
-                
-                db.add(dispatch)
-                dispatches_created.append(dispatch)
-                
-                logger.info(
-                    f"Auto-assigned: Order {order.order_number} → "
-                    f"Vehicle {best.vehicle.code} (score: {best.total_score:.3f})"
-                )
-            
-            # 결과 추가
+        if not rankings:
+            logger.warning(f"No vehicles available for order {order.order_number}")
             results.append({
                 "order_id": order.id,
                 "order_number": order.order_number,
-                "temperature_zone": order.temperature_zone.value,
-                "pallet_count": order.pallet_count,
-                "top_3": [
-                    {
-                        "rank": i + 1,
-                        "vehicle_id": rank.vehicle.id,
-                        "vehicle_code": rank.vehicle.code,
-                        "score": round(rank.total_score, 3),
-                        "reason": rank.reason,
-                        "details": {
-                            "distance_score": round(rank.agent_scores.distance, 3),
-                            "rotation_score": round(rank.agent_scores.rotation, 3),
-                            "time_score": round(rank.agent_scores.time_window, 3),
-                            "preference_score": round(rank.agent_scores.preference, 3),
-                            "voltage_ok": rank.agent_scores.voltage == 1.0
-                        }
-                    }
-                    for i, rank in enumerate(rankings[:3])
-                ]
+                "error": "No eligible vehicles",
+                "top_3": []
             })
+            continue
         
-        # Auto mode: DB 커밋
+        # Auto mode: 자동 배차
         if mode == "auto":
-            db.commit()
-            logger.info(f"Auto-dispatch complete: {len(dispatches_created)} dispatches created")
+            best = rankings[0]
+            
+            dispatch = Dispatch(
+                order_id=order.id,
+                vehicle_id=best.vehicle.id,
+                optimization_score=best.total_score,
+                assigned_by='ml_auto',
+                assigned_user_id=user_id,
+                status=DispatchStatus.ASSIGNED
+            )
+            
+            db.add(dispatch)
+            dispatches_created.append(dispatch)
+            
+            logger.info(
+                f"Auto-assigned: Order {order.order_number} → "
+                f"Vehicle {best.vehicle.code} (score: {best.total_score:.3f})"
+            )
         
-        return {
-            "mode": mode,
-            "total_orders": len(orders),
-            "successful": len([r for r in results if 'error' not in r]),
-            "failed": len([r for r in results if 'error' in r]),
-            "dispatches_created": len(dispatches_created) if mode == "auto" else 0,
-            "results": results
-        }
+        # 결과 추가
+        results.append({
+            "order_id": order.id,
+            "order_number": order.order_number,
+            "temperature_zone": order.temperature_zone.value,
+            "pallet_count": order.pallet_count,
+            "top_3": [
+                {
+                    "rank": i + 1,
+                    "vehicle_id": rank.vehicle.id,
+                    "vehicle_code": rank.vehicle.code,
+                    "score": round(rank.total_score, 3),
+                    "reason": rank.reason,
+                    "details": {
+                        "distance_score": round(rank.agent_scores.distance, 3),
+                        "rotation_score": round(rank.agent_scores.rotation, 3),
+                        "time_score": round(rank.agent_scores.time_window, 3),
+                        "preference_score": round(rank.agent_scores.preference, 3),
+                        "voltage_ok": rank.agent_scores.voltage == 1.0
+                    }
+                }
+                for i, rank in enumerate(rankings[:3])
+            ]
+        })
+    
+    # Auto mode: DB 커밋
+    if mode == "auto":
+        db.commit()
+        logger.info(f"Auto-dispatch complete: {len(dispatches_created)} dispatches created")
+    
+    return {
+        "mode": mode,
+        "total_orders": len(orders),
+        "successful": len([r for r in results if 'error' not in r]),
+        "failed": len([r for r in results if 'error' in r]),
+        "dispatches_created": len(dispatches_created) if mode == "auto" else 0,
+        "results": results
+    }
+
+
+@router.post("/optimize/jobs", status_code=202)
+async def submit_ml_optimization_job(
+    order_ids: List[int],
+    mode: str = Query("recommend", regex="^(recommend|auto)$"),
+    scoring_mode: str = Query("matrix", regex="^(matrix|sequential)$"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    ML 배차 최적화 작업 등록 (비동기)
+    
+    즉시 job_id 를 반환합니다.
+    - 진행 상황: WebSocket `/ws/optimization-jobs/{job_id}`
+    - 결과 조회: GET `/api/v1/optimization-jobs/{job_id}` (결과 형식은 /optimize 와 동일)
+    """
+    user_id = current_user.id
+    
+    async def runner(job):
+        loop = asyncio.get_running_loop()
+        
+        async def progress(percent, message):
+            # 작업 스레드에서 호출 -> API 이벤트 루프로 전달
+            asyncio.run_coroutine_threadsafe(
+                optimization_job_service.report_progress(job.job_id, progress=percent, message=message),
+                loop
+            )
         
-    except Exception as e:
-        db.rollback()
-        logger.error(f"ML optimization error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        def run():
+            # 조회/점수 계산/커밋은 스레드 전용 세션으로 API 이벤트 루프 밖에서 실행
+            db = SessionLocal()
+            try:
+                return asyncio.run(_optimize_orders(db, order_ids, mode, scoring_mode, user_id, progress))
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        
+        await optimization_job_service.report_progress(job.job_id, progress=5, message="주문/차량 조회 중")
+        return await asyncio.to_thread(run)
+    
+    job = await optimization_job_service.submit(
+        "ml_dispatch",
+        runner,
+        params={"order_ids": order_ids, "mode": mode, "scoring_mode": scoring_mode},
+        user_id=user_id
+    )
+    return job.to_dict(include_result=False)
 
 
 @router.get("/performance")
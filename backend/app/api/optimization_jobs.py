@@ -0,0 +1,61 @@
+"""
+최적화 작업 API
+비동기 최적화 작업 조회 (등록은 각 최적화 API의 /jobs 엔드포인트)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, Dict, Optional
+
+from app.api.auth import get_current_user
+from app.models import User
+from app.models.user import UserRole
+from app.services.auth_service import AuthService
+from app.services.optimization_job_service import optimization_job_service
+
+router = APIRouter()
+
+
+def can_access_job(job: Dict[str, Any], user: User) -> bool:
+    """작업 등록자 또는 관리자만 작업 파라미터/결과 조회 가능"""
+    return job.get("user_id") == user.id or AuthService.has_permission(user, UserRole.ADMIN)
+
+
+@router.get("/optimization-jobs")
+async def list_optimization_jobs(
+    kind: Optional[str] = Query(None, description="작업 종류 (dispatch_optimization, ml_dispatch, integrated_dispatch, excel_import_orders, excel_import_clients, excel_import_vehicles)"),
+    mine: bool = Query(False, description="내 작업만 조회"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    최근 최적화 작업 목록 (결과 제외, 관리자가 아니면 내 작업만)
+    """
+    if not AuthService.has_permission(current_user, UserRole.ADMIN):
+        mine = True
+    return {
+        "jobs": optimization_job_service.list_jobs(
+            kind=kind,
+            user_id=current_user.id if mine else None,
+            limit=limit
+        ),
+        "stats": optimization_job_service.get_stats()
+    }
+
+
+@router.get("/optimization-jobs/{job_id}")
+async def get_optimization_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    최적화 작업 상태 및 결과 조회
+
+    - 실행 중: status, progress, best_cost
+    - 완료: result 포함
+    - 진행 상황 스트리밍: WebSocket `/ws/optimization-jobs/{job_id}`
+    """
+    job = await optimization_job_service.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="최적화 작업을 찾을 수 없습니다")
+    if not can_access_job(job, current_user):
+        raise HTTPException(status_code=403, detail="권한이 부족합니다")
+    return job
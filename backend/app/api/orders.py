@@ -5,12 +5,15 @@ from typing import Optional
 from datetime import date
 from pathlib import Path
 
+from app.api.auth import get_current_user
 from app.core.database import get_db
+from app.models import User
 from app.models.order import Order, OrderStatus
 from app.schemas.order import (
     OrderCreate, OrderUpdate, OrderResponse, OrderListResponse
 )
 from app.services.excel_upload_service import ExcelUploadService
+from app.services.list_query import CountMode, InvalidCursorError, list_orders
 from app.services.excel_template_service import ExcelTemplateService
 from app.services.order_nlp_service import parse_order_text
 from loguru import logger
@@ -22,73 +25,23 @@ router = APIRouter()
 def get_orders(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정 시 skip 무시)"),
+    count: CountMode = Query("exact", description="전체 건수: exact / approx / none"),
     status: Optional[OrderStatus] = None,
     temperature_zone: Optional[str] = None,
     order_date: Optional[date] = None,
     db: Session = Depends(get_db)
 ):
-    """주문 목록 조회"""
-    query = db.query(Order)
-    
-    if status:
-        query = query.filter(Order.status == status)
-    
-    if temperature_zone:
-        query = query.filter(Order.temperature_zone == temperature_zone)
-    
-    if order_date:
-        query = query.filter(Order.order_date == order_date)
-    
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
-    
-    # Convert items to dict to avoid SQLAlchemy relationship serialization issues
-    items_dict = []
-    for order in items:
-        order_dict = {
-            'id': order.id,
-            'order_number': order.order_number,
-            'order_date': order.order_date,
-            'temperature_zone': order.temperature_zone,
-            'pickup_client_id': order.pickup_client_id,
-            'delivery_client_id': order.delivery_client_id,
-            'pickup_address': order.pickup_address,
-            'pickup_address_detail': order.pickup_address_detail,
-            'delivery_address': order.delivery_address,
-            'delivery_address_detail': order.delivery_address_detail,
-            'pallet_count': order.pallet_count,
-            'weight_kg': order.weight_kg,
-            'volume_cbm': order.volume_cbm,
-            'product_name': order.product_name,
-            'product_code': order.product_code,
-            'pickup_start_time': order.pickup_start_time,
-            'pickup_end_time': order.pickup_end_time,
-            'delivery_start_time': order.delivery_start_time,
-            'delivery_end_time': order.delivery_end_time,
-            'requested_delivery_date': order.requested_delivery_date,
-            'priority': order.priority,
-            'is_reserved': order.is_reserved,
-            'reserved_at': order.reserved_at,
-            'confirmed_at': order.confirmed_at,
-            'recurring_type': order.recurring_type,
-            'recurring_end_date': order.recurring_end_date,
-            'requires_forklift': order.requires_forklift,
-            'is_stackable': order.is_stackable,
-            'notes': order.notes,
-            'status': order.status,
-            'created_at': order.created_at,
-            'updated_at': order.updated_at,
-            'pickup_latitude': order.pickup_latitude,
-            'pickup_longitude': order.pickup_longitude,
-            'delivery_latitude': order.delivery_latitude,
-            'delivery_longitude': order.delivery_longitude,
-            # Add client names
-            'pickup_client_name': order.pickup_client.name if order.pickup_client else None,
-            'delivery_client_name': order.delivery_client.name if order.delivery_client else None,
-        }
-        items_dict.append(order_dict)
-    
-    return OrderListResponse(total=total, items=items_dict)
+    """주문 목록 조회 (주문일자, ID 내림차순)"""
+    try:
+        page = list_orders(
+            db, limit=limit, cursor=cursor, skip=skip, count_mode=count,
+            status=status, temperature_zone=temperature_zone, order_date=order_date,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return OrderListResponse(total=page.total, items=page.items, next_cursor=page.next_cursor)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
@@ -356,6 +309,27 @@ async def upload_orders_excel(
         logger.error(f"Error uploading orders: {e}")
         raise HTTPException(status_code=500, detail="업로드 중 오류가 발생했습니다")
 
+@router.post("/upload/jobs", status_code=202)
+async def submit_orders_upload_job(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    엑셀 파일로 주문 일괄 업로드 작업 등록 (비동기)
+
+    즉시 job_id 를 반환하고 청크 저장 진행률을 WebSocket `/ws/optimization-jobs/{job_id}` 로 전송합니다.
+    결과(GET `/optimization-jobs/{job_id}`)는 /upload 와 같은 형식입니다.
+    """
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise HTTPException(status_code=400, detail="엑셀 파일만 업로드 가능합니다")
+
+    content = await file.read()
+    job = await ExcelUploadService.submit_import_job(
+        "orders", content, filename=file.filename, user_id=current_user.id
+    )
+    return job.to_dict(include_result=False)
+
+
 
 @router.get("/pending/count")
 def get_pending_orders_count(db: Session = Depends(get_db)):
@@ -19,6 +19,7 @@ class UrgentOrderRequest(BaseModel):
     """긴급 주문 추가 요청"""
     order_id: int
     force_dispatch: bool = False
+    incremental: bool = False  # 현재 계획 기반 증분 재최적화
 
 
 class VehicleIssueRequest(BaseModel):
@@ -26,6 +27,7 @@ class VehicleIssueRequest(BaseModel):
     vehicle_id: int
     issue_type: str  # 'breakdown', 'delay', 'accident'
     estimated_delay_minutes: Optional[int] = None
+    incremental: bool = False  # 현재 계획 기반 증분 재최적화
 
 
 class CancelOrderRequest(BaseModel):
@@ -44,6 +46,7 @@ async def add_urgent_order(
     Args:
         order_id: 긴급 주문 ID
         force_dispatch: 기존 배차에 강제 추가 여부
+        incremental: 가까운 차량들의 남은 경로에만 삽입 (완료 정류장 고정, 전체 재계산 없음)
         
     Returns:
         재배차 결과
@@ -52,7 +55,8 @@ async def add_urgent_order(
         service = get_redispatch_service(db)
         result = await service.add_urgent_order(
             order_id=request.order_id,
-            force_dispatch=request.force_dispatch
+            force_dispatch=request.force_dispatch,
+            incremental=request.incremental
         )
         return result
     except ValueError as e:
@@ -74,6 +78,7 @@ async def handle_vehicle_issue(
         vehicle_id: 차량 ID
         issue_type: 문제 유형
         estimated_delay_minutes: 예상 지연 시간
+        incremental: 남은 정류장만 주변 차량 경로에 분배
         
     Returns:
         재배차 결과
@@ -83,7 +88,8 @@ async def handle_vehicle_issue(
         result = await service.handle_vehicle_issue(
             vehicle_id=request.vehicle_id,
             issue_type=request.issue_type,
-            estimated_delay_minutes=request.estimated_delay_minutes
+            estimated_delay_minutes=request.estimated_delay_minutes,
+            incremental=request.incremental
         )
         return result
     except ValueError as e:
@@ -4,6 +4,7 @@ Phase 4 Week 3-4: 실시간 차량 텔레메트리 API
 """
 from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -11,10 +12,12 @@ import json
 import asyncio
 
 from app.core.database import get_db
+from app.core.async_database import get_async_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.services.vehicle_telemetry_service import (
     get_telemetry_service,
+    get_telemetry_query_service,
     TelemetryData,
     VehicleTelemetryService
 )
@@ -149,10 +152,10 @@ def submit_telemetry_data(
 
 
 @router.get("/telemetry/vehicle/{vehicle_id}", tags=["Telemetry"])
-def get_vehicle_telemetry(
+async def get_vehicle_telemetry(
     vehicle_id: int,
     minutes: int = Query(60, ge=1, le=1440),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -163,13 +166,13 @@ def get_vehicle_telemetry(
     - 속도 변화
     - 온도 알림
     """
-    service = get_telemetry_service(db)
-    return service.get_vehicle_telemetry(vehicle_id, minutes)
+    service = get_telemetry_query_service(db)
+    return await service.get_vehicle_telemetry(vehicle_id, minutes)
 
 
 @router.get("/telemetry/vehicles/status", tags=["Telemetry"])
-def get_all_vehicles_status(
-    db: Session = Depends(get_db),
+async def get_all_vehicles_status(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -180,8 +183,8 @@ def get_all_vehicles_status(
     - idle: 정차 중
     - offline: 오프라인
     """
-    service = get_telemetry_service(db)
-    vehicles = service.get_all_vehicles_status()
+    service = get_telemetry_query_service(db)
+    vehicles = await service.get_all_vehicles_status()
     
     # 요약 통계
     summary = VehicleStatusSummary(
@@ -228,9 +231,9 @@ def simulate_telemetry(
 
 
 @router.get("/telemetry/statistics", tags=["Telemetry"])
-def get_telemetry_statistics(
+async def get_telemetry_statistics(
     hours: int = Query(24, ge=1, le=168),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -242,41 +245,5 @@ def get_telemetry_statistics(
     - 평균 속도
     - 온도 알림 수
     """
-    from app.models.vehicle_location import VehicleLocation
-    from app.models.vehicle_location import TemperatureAlert
-    from datetime import timedelta
-    from sqlalchemy import func
-    
-    since = datetime.now() - timedelta(hours=hours)
-    
-    # 총 데이터 포인트
-    total_points = db.query(func.count(VehicleLocation.id)).filter(
-        VehicleLocation.timestamp >= since
-    ).scalar()
-    
-    # 평균 속도
-    avg_speed = db.query(func.avg(VehicleLocation.speed)).filter(
-        VehicleLocation.timestamp >= since
-    ).scalar()
-    
-    # 온도 알림 수
-    temp_alerts = db.query(func.count(TemperatureAlert.id)).filter(
-        TemperatureAlert.created_at >= since
-    ).scalar()
-    
-    # 과속 건수 (100 km/h 이상)
-    speeding_count = db.query(func.count(VehicleLocation.id)).filter(
-        and_(
-            VehicleLocation.timestamp >= since,
-            VehicleLocation.speed > 100
-        )
-    ).scalar()
-    
-    return {
-        "period_hours": hours,
-        "total_data_points": total_points or 0,
-        "average_speed": round(avg_speed, 2) if avg_speed else 0,
-        "temperature_alerts": temp_alerts or 0,
-        "speeding_incidents": speeding_count or 0,
-        "data_quality": "good" if total_points and total_points > hours * 10 else "poor"
-    }
+    service = get_telemetry_query_service(db)
+    return await service.get_statistics(hours)
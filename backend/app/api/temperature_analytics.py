@@ -50,9 +50,11 @@ class FleetOverviewResponse(BaseModel):
     total_vehicles: int
     normal_vehicles: int
     violation_vehicles: int
+    no_data_vehicles: int
     total_alerts: int
     critical_alerts: int
     vehicle_status: list
+    pagination: dict
     summary: dict
 
 
@@ -140,9 +142,38 @@ async def detect_vehicle_anomalies(
     }
 
 
+@router.get("/fleet-anomalies")
+async def detect_fleet_anomalies(
+    hours: int = Query(24, ge=1, le=168, description="분석 기간 (시간, 최대 7일)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    전체 차량 온도 이상 패턴 감지
+    
+    - 전체 차량 온도 로그를 한 번에 조회해 일괄 분석
+    - 이상 패턴이 있는 차량만 반환 (감지 기준은 차량별 감지와 동일)
+    """
+    analytics = TemperatureAnalytics(db)
+    anomalies = analytics.detect_fleet_anomalies(hours)
+    
+    return {
+        "period_hours": hours,
+        "vehicle_count": len(anomalies),
+        "anomaly_count": sum(len(items) for items in anomalies.values()),
+        "vehicles": [
+            {"vehicle_id": vehicle_id, "anomaly_count": len(items), "anomalies": items}
+            for vehicle_id, items in anomalies.items()
+        ]
+    }
+
+
 @router.get("/fleet-overview", response_model=FleetOverviewResponse)
 async def get_fleet_overview(
     hours: int = Query(24, ge=1, le=168, description="분석 기간 (시간)"),
+    status: Optional[str] = Query(None, description="차량 상태 필터 (NORMAL, VIOLATION, NO_DATA)"),
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="차량 목록 최대 건수 (미지정 시 전체)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -153,6 +184,7 @@ async def get_fleet_overview(
     - 정상/위반 차량 수
     - 알림 발생 통계
     - 준수율 및 알림율
+    - 상태별 필터 / 페이지 (집계와 목록을 쿼리 1회로 조회)
     
     **사용 시나리오:**
     - 실시간 차량 온도 모니터링
@@ -160,7 +192,10 @@ async def get_fleet_overview(
     - 일일 운영 보고
     """
     analytics = TemperatureAnalytics(db)
-    overview = analytics.get_fleet_temperature_overview(hours)
+    try:
+        overview = analytics.get_fleet_temperature_overview(hours, status=status, skip=skip, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return overview
 
 
@@ -202,25 +237,15 @@ async def get_top_performers(
     - 각 차량의 점수 및 등급
     - 우수 사례 공유
     """
-    from app.models.vehicle import Vehicle
-    
     analytics = TemperatureAnalytics(db)
-    vehicles = db.query(Vehicle).all()
-    
-    performances = []
-    for vehicle in vehicles:
-        try:
-            perf = analytics.get_vehicle_performance_score(vehicle.id, days)
-            performances.append(perf)
-        except Exception as e:
-            continue
+    performances = analytics.get_performance_scores(days)
     
     # 점수 기준 정렬
     performances.sort(key=lambda x: x["score"], reverse=True)
     
     return {
         "period_days": days,
-        "total_vehicles": len(vehicles),
+        "total_vehicles": len(performances),
         "top_performers": performances[:limit]
     }
 
@@ -239,25 +264,15 @@ async def get_worst_performers(
     - 각 차량의 문제점 및 권장사항
     - 우선 조치 대상 식별
     """
-    from app.models.vehicle import Vehicle
-    
     analytics = TemperatureAnalytics(db)
-    vehicles = db.query(Vehicle).all()
-    
-    performances = []
-    for vehicle in vehicles:
-        try:
-            perf = analytics.get_vehicle_performance_score(vehicle.id, days)
-            performances.append(perf)
-        except Exception as e:
-            continue
+    performances = analytics.get_performance_scores(days)
     
     # 점수 기준 정렬 (낮은 순)
     performances.sort(key=lambda x: x["score"])
     
     return {
         "period_days": days,
-        "total_vehicles": len(vehicles),
+        "total_vehicles": len(performances),
         "worst_performers": performances[:limit]
     }
 
@@ -276,8 +291,6 @@ async def get_analytics_summary(
     - 주요 통계 지표
     - 전반적인 온도 관리 상태
     """
-    from app.models.vehicle import Vehicle
-    
     analytics = TemperatureAnalytics(db)
     
     # 준수 보고서
@@ -286,19 +299,13 @@ async def get_analytics_summary(
     compliance = analytics.get_compliance_report(start_date, end_date)
     
     # 차량 성능 점수
-    vehicles = db.query(Vehicle).all()
-    scores = []
-    for vehicle in vehicles:
-        try:
-            perf = analytics.get_vehicle_performance_score(vehicle.id, days)
-            scores.append(perf["score"])
-        except:
-            continue
+    performances = analytics.get_performance_scores(days)
+    scores = [perf["score"] for perf in performances]
     
     avg_score = sum(scores) / len(scores) if scores else 0
     
     # Fleet overview
-    fleet = analytics.get_fleet_temperature_overview(24)
+    fleet = analytics.get_fleet_temperature_overview(24, limit=0)
     
     return {
         "period_days": days,
@@ -309,7 +316,7 @@ async def get_analytics_summary(
         },
         "performance": {
             "avg_score": round(avg_score, 2),
-            "total_vehicles": len(vehicles),
+            "total_vehicles": len(performances),
             "scored_vehicles": len(scores)
         },
         "fleet_status": {
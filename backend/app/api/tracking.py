@@ -6,10 +6,12 @@ from datetime import datetime, timedelta, date
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import case, func, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from ..core.database import get_db
+from ..core.async_database import get_async_db
 from ..models import Vehicle, VehicleLocation, TemperatureAlert, Dispatch
 from ..models.dispatch import DispatchStatus
 from ..schemas.vehicle_location import (
@@ -174,7 +176,7 @@ async def sync_all_vehicles(
 @router.get("/dashboard", response_model=TrackingDashboardResponse)
 async def get_tracking_dashboard(
     dispatch_date: Optional[date] = Query(None, description="배차 날짜 (기본: 오늘)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     실시간 추적 대시보드 데이터 조회
@@ -183,71 +185,85 @@ async def get_tracking_dashboard(
     """
     if not dispatch_date:
         dispatch_date = date.today()
-    
-    # 전체 차량 수
-    total_vehicles = db.query(Vehicle).filter(Vehicle.is_active == True).count()
-    
-    # 오늘 배차된 차량 (운행 중)
-    active_dispatches = db.query(Dispatch).filter(
-        and_(
+    today_start = datetime.combine(dispatch_date, datetime.min.time())
+    today_end = datetime.combine(dispatch_date, datetime.max.time())
+    
+    # 활성 차량
+    vehicles = (await db.execute(
+        select(Vehicle).where(Vehicle.is_active == True)
+    )).scalars().all()
+    total_vehicles = len(vehicles)
+    
+    # 오늘 배차된 차량 (운행 중) - 차량별 첫 배차
+    active_dispatches = (await db.execute(
+        select(Dispatch).where(
             Dispatch.dispatch_date == dispatch_date,
             Dispatch.status.in_([DispatchStatus.CONFIRMED, DispatchStatus.IN_PROGRESS])
-        )
-    ).all()
+        ).order_by(Dispatch.id)
+    )).scalars().all()
+    dispatch_by_vehicle = {}
+    for dispatch in active_dispatches:
+        dispatch_by_vehicle.setdefault(dispatch.vehicle_id, dispatch)
     
-    active_vehicle_ids = [d.vehicle_id for d in active_dispatches]
-    active_vehicles_count = len(active_vehicle_ids)
+    active_vehicles_count = len(active_dispatches)
     idle_vehicles_count = total_vehicles - active_vehicles_count
     
-    # 차량별 추적 정보
-    vehicles = db.query(Vehicle).filter(Vehicle.is_active == True).all()
+    # 차량별 최신 위치 (차량당 1행)
+    latest_rank = func.row_number().over(
+        partition_by=VehicleLocation.vehicle_id,
+        order_by=(VehicleLocation.recorded_at.desc(), VehicleLocation.id.desc())
+    ).label("rank")
+    latest_ids = select(VehicleLocation.id, latest_rank).subquery()
+    latest_locations = {
+        location.vehicle_id: location
+        for location in (await db.execute(
+            select(VehicleLocation)
+            .join(latest_ids, latest_ids.c.id == VehicleLocation.id)
+            .where(latest_ids.c.rank == 1)
+        )).scalars().all()
+    }
+    
+    # 오늘 주행 거리 / 평균 속도 (차량별 집계)
+    driving_stats = {
+        row.vehicle_id: row
+        for row in (await db.execute(
+            select(
+                VehicleLocation.vehicle_id,
+                func.sum(VehicleLocation.speed).label("total_distance"),
+                func.avg(VehicleLocation.speed).label("avg_speed")
+            ).where(
+                VehicleLocation.recorded_at >= today_start,
+                VehicleLocation.recorded_at <= today_end
+            ).group_by(VehicleLocation.vehicle_id)
+        )).all()
+    }
+    
+    # 미해결 알림 (차량별 최근 5건)
+    alert_rank = func.row_number().over(
+        partition_by=TemperatureAlert.vehicle_id,
+        order_by=(TemperatureAlert.detected_at.desc(), TemperatureAlert.id.desc())
+    ).label("rank")
+    recent_alert_ids = select(TemperatureAlert.id, alert_rank).where(
+        TemperatureAlert.is_resolved == False
+    ).subquery()
+    alerts_by_vehicle = {}
+    for alert in (await db.execute(
+        select(TemperatureAlert)
+        .join(recent_alert_ids, recent_alert_ids.c.id == TemperatureAlert.id)
+        .where(recent_alert_ids.c.rank <= 5)
+        .order_by(TemperatureAlert.vehicle_id, recent_alert_ids.c.rank)
+    )).scalars().all():
+        alerts_by_vehicle.setdefault(alert.vehicle_id, []).append(alert)
     
     vehicle_tracking_list = []
     
     for vehicle in vehicles:
-        # 최신 위치
-        latest_location = db.query(VehicleLocation).filter(
-            VehicleLocation.vehicle_id == vehicle.id
-        ).order_by(VehicleLocation.recorded_at.desc()).first()
-        
-        # 오늘 배차
-        dispatch = db.query(Dispatch).filter(
-            and_(
-                Dispatch.vehicle_id == vehicle.id,
-                Dispatch.dispatch_date == dispatch_date,
-                Dispatch.status.in_([DispatchStatus.CONFIRMED, DispatchStatus.IN_PROGRESS])
-            )
-        ).first()
-        
-        # 오늘 주행 거리
-        today_start = datetime.combine(dispatch_date, datetime.min.time())
-        today_end = datetime.combine(dispatch_date, datetime.max.time())
-        
-        total_distance = db.query(func.sum(VehicleLocation.speed)).filter(
-            and_(
-                VehicleLocation.vehicle_id == vehicle.id,
-                VehicleLocation.recorded_at >= today_start,
-                VehicleLocation.recorded_at <= today_end
-            )
-        ).scalar() or 0.0
-        
-        # 평균 속도
-        avg_speed = db.query(func.avg(VehicleLocation.speed)).filter(
-            and_(
-                VehicleLocation.vehicle_id == vehicle.id,
-                VehicleLocation.recorded_at >= today_start,
-                VehicleLocation.recorded_at <= today_end,
-                VehicleLocation.speed.isnot(None)
-            )
-        ).scalar() or 0.0
-        
-        # 활성 알림
-        active_alerts = db.query(TemperatureAlert).filter(
-            and_(
-                TemperatureAlert.vehicle_id == vehicle.id,
-                TemperatureAlert.is_resolved == False
-            )
-        ).order_by(TemperatureAlert.detected_at.desc()).limit(5).all()
+        latest_location = latest_locations.get(vehicle.id)
+        dispatch = dispatch_by_vehicle.get(vehicle.id)
+        stats = driving_stats.get(vehicle.id)
+        total_distance = (stats.total_distance if stats else None) or 0.0
+        avg_speed = (stats.avg_speed if stats else None) or 0.0
+        active_alerts = alerts_by_vehicle.get(vehicle.id, [])
         
         # 응답 구성
         location_response = None
@@ -281,33 +297,23 @@ async def get_tracking_dashboard(
         
         vehicle_tracking_list.append(tracking_info)
     
-    # 전체 알림 통계
-    total_alerts = db.query(TemperatureAlert).filter(
-        TemperatureAlert.is_resolved == False
-    ).count()
-    
-    critical_alerts = db.query(TemperatureAlert).filter(
-        and_(
-            TemperatureAlert.is_resolved == False,
-            TemperatureAlert.severity == "CRITICAL"
-        )
-    ).count()
-    
-    warning_alerts = db.query(TemperatureAlert).filter(
-        and_(
-            TemperatureAlert.is_resolved == False,
-            TemperatureAlert.severity == "WARNING"
-        )
-    ).count()
+    # 전체 알림 통계 (1쿼리)
+    alert_stats = (await db.execute(
+        select(
+            func.count(TemperatureAlert.id).label("total"),
+            func.sum(case((TemperatureAlert.severity == "CRITICAL", 1), else_=0)).label("critical"),
+            func.sum(case((TemperatureAlert.severity == "WARNING", 1), else_=0)).label("warning")
+        ).where(TemperatureAlert.is_resolved == False)
+    )).one()
     
     return TrackingDashboardResponse(
         total_vehicles=total_vehicles,
         active_vehicles=active_vehicles_count,
         idle_vehicles=idle_vehicles_count,
         vehicles=vehicle_tracking_list,
-        total_alerts=total_alerts,
-        critical_alerts=critical_alerts,
-        warning_alerts=warning_alerts
+        total_alerts=alert_stats.total or 0,
+        critical_alerts=alert_stats.critical or 0,
+        warning_alerts=alert_stats.warning or 0
     )
 
 
@@ -317,7 +323,7 @@ async def get_vehicle_location_history(
     start_date: Optional[datetime] = Query(None, description="시작 시간"),
     end_date: Optional[datetime] = Query(None, description="종료 시간"),
     limit: int = Query(100, ge=1, le=1000, description="최대 결과 수"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     특정 차량의 위치 이력 조회
@@ -328,7 +334,7 @@ async def get_vehicle_location_history(
     - **limit**: 최대 결과 수 (기본: 100, 최대: 1000)
     """
     # 차량 조회
-    vehicle = db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
+    vehicle = await db.get(Vehicle, vehicle_id)
     if not vehicle:
         raise HTTPException(status_code=404, detail="차량을 찾을 수 없습니다")
     
@@ -339,13 +345,13 @@ async def get_vehicle_location_history(
         end_date = datetime.utcnow()
     
     # 위치 이력 조회
-    locations = db.query(VehicleLocation).filter(
-        and_(
+    locations = (await db.execute(
+        select(VehicleLocation).where(
             VehicleLocation.vehicle_id == vehicle_id,
             VehicleLocation.recorded_at >= start_date,
             VehicleLocation.recorded_at <= end_date
-        )
-    ).order_by(VehicleLocation.recorded_at.desc()).limit(limit).all()
+        ).order_by(VehicleLocation.recorded_at.desc()).limit(limit)
+    )).scalars().all()
     
     # 응답 구성
     location_responses = []
@@ -367,7 +373,7 @@ async def get_temperature_alerts(
     end_date: Optional[datetime] = Query(None, description="종료 시간"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     온도 알림 목록 조회
@@ -380,31 +386,42 @@ async def get_temperature_alerts(
     - **skip**: 건너뛸 레코드 수
     - **limit**: 최대 결과 수
     """
-    query = db.query(TemperatureAlert)
+    query = select(TemperatureAlert)
     
     # 필터 적용
     if vehicle_id is not None:
-        query = query.filter(TemperatureAlert.vehicle_id == vehicle_id)
+        query = query.where(TemperatureAlert.vehicle_id == vehicle_id)
     
     if is_resolved is not None:
-        query = query.filter(TemperatureAlert.is_resolved == is_resolved)
+        query = query.where(TemperatureAlert.is_resolved == is_resolved)
     
     if severity:
-        query = query.filter(TemperatureAlert.severity == severity)
+        query = query.where(TemperatureAlert.severity == severity)
     
     if start_date:
-        query = query.filter(TemperatureAlert.detected_at >= start_date)
+        query = query.where(TemperatureAlert.detected_at >= start_date)
     
     if end_date:
-        query = query.filter(TemperatureAlert.detected_at <= end_date)
+        query = query.where(TemperatureAlert.detected_at <= end_date)
     
     # 정렬 및 페이징
-    alerts = query.order_by(TemperatureAlert.detected_at.desc()).offset(skip).limit(limit).all()
+    alerts = (await db.execute(
+        query.order_by(TemperatureAlert.detected_at.desc()).offset(skip).limit(limit)
+    )).scalars().all()
+    
+    # 차량 정보 (1쿼리)
+    vehicle_ids = {alert.vehicle_id for alert in alerts}
+    vehicles = {
+        vehicle.id: vehicle
+        for vehicle in (await db.execute(
+            select(Vehicle).where(Vehicle.id.in_(vehicle_ids))
+        )).scalars().all()
+    } if vehicle_ids else {}
     
     # 응답 구성
     alert_responses = []
     for alert in alerts:
-        vehicle = db.query(Vehicle).filter(Vehicle.id == alert.vehicle_id).first()
+        vehicle = vehicles.get(alert.vehicle_id)
         alert_response = TemperatureAlertResponse.model_validate(alert)
         if vehicle:
             alert_response.vehicle_code = vehicle.code
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 
 from app.core.database import get_db
 from app.services.uvis_gps_service import UvisGPSService
+from app.services.vehicle_state_store import VehicleLastState, vehicle_state_store
 from app.schemas.uvis_gps import (
     UvisAccessKeyResponse,
     VehicleGPSLogResponse,
@@ -147,11 +148,8 @@ async def sync_all_data(
         await service.issue_access_key()
         access_key_issued = True
     
-    # GPS 데이터 가져오기
-    gps_data = await service.get_vehicle_gps_data()
-    
-    # 온도 데이터 가져오기
-    temp_data = await service.get_vehicle_temperature_data()
+    # GPS + 온도 데이터 동시 조회
+    gps_data, temp_data = await service.sync_realtime_data()
     
     return {
         "success": True,
@@ -268,6 +266,33 @@ def get_temperature_log(temp_log_id: int, db: Session = Depends(get_db)):
 
 # ==================== 실시간 모니터링 ====================
 
+KST_OFFSET = timedelta(hours=9)
+
+
+def _build_realtime_status(vehicle: Vehicle, state: Optional[VehicleLastState]) -> VehicleRealtimeStatus:
+    """차량 + 최신 상태 → 실시간 상태 응답 (시각은 KST)"""
+    has_gps = state is not None and state.gps_recorded_at is not None
+    has_temp = state is not None and state.temperature_recorded_at is not None
+    last_updated = state.last_updated if state else None
+    
+    return VehicleRealtimeStatus(
+        vehicle_id=vehicle.id,
+        vehicle_plate_number=vehicle.plate_number,
+        tid_id=vehicle.uvis_device_id or "",
+        gps_datetime=(state.gps_recorded_at + KST_OFFSET).strftime("%Y-%m-%d %H:%M:%S") if has_gps else None,
+        latitude=state.latitude if has_gps else None,
+        longitude=state.longitude if has_gps else None,
+        is_engine_on=state.is_engine_on if has_gps else None,
+        speed_kmh=round(state.speed_kmh) if has_gps and state.speed_kmh is not None else None,
+        temperature_datetime=(
+            (state.temperature_recorded_at + KST_OFFSET).strftime("%Y-%m-%d %H:%M:%S") if has_temp else None
+        ),
+        temperature_a=state.temperature_a if has_temp else None,
+        temperature_b=state.temperature_b if has_temp else None,
+        last_updated=last_updated + KST_OFFSET if last_updated else None
+    )
+
+
 @router.get("/realtime/vehicles", response_model=VehicleRealtimeListResponse)
 def get_realtime_vehicle_status(
     vehicle_ids: Optional[str] = Query(None, description="차량 ID 목록 (쉼표 구분)"),
@@ -275,6 +300,8 @@ def get_realtime_vehicle_status(
 ):
     """
     차량 실시간 상태 조회 (GPS + 온도 통합)
+    
+    차량 목록 조회 1회 + 최신 상태 저장소 조회로 전체 차량을 한 번에 반환합니다.
     """
     # 차량 목록
     vehicle_query = db.query(Vehicle).filter(Vehicle.is_active == True)
@@ -284,70 +311,9 @@ def get_realtime_vehicle_status(
         vehicle_query = vehicle_query.filter(Vehicle.id.in_(id_list))
     
     vehicles = vehicle_query.all()
+    states = vehicle_state_store.get_many(db, [vehicle.id for vehicle in vehicles])
     
-    # 각 차량의 최신 GPS + 온도 정보 가져오기
-    result_items = []
-    
-    for vehicle in vehicles:
-        # 최신 GPS
-        latest_gps = db.query(VehicleGPSLog).filter(
-            VehicleGPSLog.vehicle_id == vehicle.id
-        ).order_by(desc(VehicleGPSLog.created_at)).first()
-        
-        # 최신 온도
-        latest_temp = db.query(VehicleTemperatureLog).filter(
-            VehicleTemperatureLog.vehicle_id == vehicle.id
-        ).order_by(desc(VehicleTemperatureLog.created_at)).first()
-        
-        # GPS 일시
-        gps_datetime = None
-        if latest_gps:
-            try:
-                gps_datetime = f"{latest_gps.bi_date[:4]}-{latest_gps.bi_date[4:6]}-{latest_gps.bi_date[6:8]} {latest_gps.bi_time[:2]}:{latest_gps.bi_time[2:4]}:{latest_gps.bi_time[4:6]}"
-            except:
-                pass
-        
-        # 온도 일시
-        temp_datetime = None
-        if latest_temp:
-            try:
-                temp_datetime = f"{latest_temp.tpl_date[:4]}-{latest_temp.tpl_date[4:6]}-{latest_temp.tpl_date[6:8]} {latest_temp.tpl_time[:2]}:{latest_temp.tpl_time[2:4]}:{latest_temp.tpl_time[4:6]}"
-            except:
-                pass
-        
-        # 최종 업데이트 시간 (GPS와 온도 중 더 최근 것, KST 변환)
-        last_updated = None
-        if latest_gps and latest_temp:
-            last_updated_utc = max(latest_gps.created_at, latest_temp.created_at)
-            # UTC → KST 변환 (+9시간)
-            last_updated = last_updated_utc + timedelta(hours=9)
-        elif latest_gps:
-            # UTC → KST 변환 (+9시간)
-            last_updated = latest_gps.created_at + timedelta(hours=9)
-        elif latest_temp:
-            # UTC → KST 변환 (+9시간)
-            last_updated = latest_temp.created_at + timedelta(hours=9)
-        
-        status = VehicleRealtimeStatus(
-            vehicle_id=vehicle.id,
-            vehicle_plate_number=vehicle.plate_number,
-            tid_id=vehicle.uvis_device_id or "",
-            gps_datetime=gps_datetime,
-            latitude=latest_gps.latitude if latest_gps else None,
-            longitude=latest_gps.longitude if latest_gps else None,
-            is_engine_on=latest_gps.is_engine_on if latest_gps else None,
-            speed_kmh=latest_gps.speed_kmh if latest_gps else None,
-            temperature_datetime=temp_datetime,
-            temperature_a=latest_temp.temperature_a if latest_temp else None,
-            temperature_b=latest_temp.temperature_b if latest_temp else None,
-            last_updated=last_updated
-        )
-        
-        # Debug logging
-        if latest_gps:
-            print(f"🚗 {vehicle.plate_number}: is_engine_on={latest_gps.is_engine_on} (type={type(latest_gps.is_engine_on).__name__}), bi_turn_onoff='{latest_gps.bi_turn_onoff}', speed={latest_gps.speed_kmh}")
-        
-        result_items.append(status)
+    result_items = [_build_realtime_status(vehicle, states.get(vehicle.id)) for vehicle in vehicles]
     
     return VehicleRealtimeListResponse(
         total=len(result_items),
@@ -355,6 +321,20 @@ def get_realtime_vehicle_status(
     )
 
 
+@router.get("/realtime/states", response_model=dict)
+def get_fleet_states(db: Session = Depends(get_db)):
+    """
+    전체 차량 최신 상태 (위치/속도/시동/온도, 시각은 UTC)
+    
+    차량 정보 조인 없이 최신 상태 저장소를 그대로 반환합니다.
+    """
+    states = vehicle_state_store.get_fleet(db)
+    return {
+        "total": len(states),
+        "items": [state.to_dict() for state in states.values()]
+    }
+
+
 @router.get("/realtime/vehicles/{vehicle_id}", response_model=VehicleRealtimeStatus)
 def get_realtime_vehicle_status_by_id(
     vehicle_id: int,
@@ -368,59 +348,7 @@ def get_realtime_vehicle_status_by_id(
     if not vehicle:
         raise HTTPException(status_code=404, detail="차량을 찾을 수 없습니다")
     
-    # 최신 GPS
-    latest_gps = db.query(VehicleGPSLog).filter(
-        VehicleGPSLog.vehicle_id == vehicle_id
-    ).order_by(desc(VehicleGPSLog.created_at)).first()
-    
-    # 최신 온도
-    latest_temp = db.query(VehicleTemperatureLog).filter(
-        VehicleTemperatureLog.vehicle_id == vehicle_id
-    ).order_by(desc(VehicleTemperatureLog.created_at)).first()
-    
-    # GPS 일시
-    gps_datetime = None
-    if latest_gps:
-        try:
-            gps_datetime = f"{latest_gps.bi_date[:4]}-{latest_gps.bi_date[4:6]}-{latest_gps.bi_date[6:8]} {latest_gps.bi_time[:2]}:{latest_gps.bi_time[2:4]}:{latest_gps.bi_time[4:6]}"
-        except:
-            pass
-    
-    # 온도 일시
-    temp_datetime = None
-    if latest_temp:
-        try:
-            temp_datetime = f"{latest_temp.tpl_date[:4]}-{latest_temp.tpl_date[4:6]}-{latest_temp.tpl_date[6:8]} {latest_temp.tpl_time[:2]}:{latest_temp.tpl_time[2:4]}:{latest_temp.tpl_time[4:6]}"
-        except:
-            pass
-    
-    # 최종 업데이트 시간 (GPS와 온도 중 더 최근 것, KST 변환)
-    last_updated = None
-    if latest_gps and latest_temp:
-        last_updated_utc = max(latest_gps.created_at, latest_temp.created_at)
-        # UTC → KST 변환 (+9시간)
-        last_updated = last_updated_utc + timedelta(hours=9)
-    elif latest_gps:
-        # UTC → KST 변환 (+9시간)
-        last_updated = latest_gps.created_at + timedelta(hours=9)
-    elif latest_temp:
-        # UTC → KST 변환 (+9시간)
-        last_updated = latest_temp.created_at + timedelta(hours=9)
-    
-    return VehicleRealtimeStatus(
-        vehicle_id=vehicle.id,
-        vehicle_plate_number=vehicle.plate_number,
-        tid_id=vehicle.uvis_device_id or "",
-        gps_datetime=gps_datetime,
-        latitude=latest_gps.latitude if latest_gps else None,
-        longitude=latest_gps.longitude if latest_gps else None,
-        is_engine_on=latest_gps.is_engine_on if latest_gps else None,
-        speed_kmh=latest_gps.speed_kmh if latest_gps else None,
-        temperature_datetime=temp_datetime,
-        temperature_a=latest_temp.temperature_a if latest_temp else None,
-        temperature_b=latest_temp.temperature_b if latest_temp else None,
-        last_updated=last_updated
-    )
+    return _build_realtime_status(vehicle, vehicle_state_store.get(db, vehicle_id))
 
 
 # ==================== API 로그 조회 ====================
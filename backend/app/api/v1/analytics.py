@@ -153,6 +153,7 @@ async def get_driver_evaluation(
 async def get_driver_rankings(
     start: str = Query(..., description="Start date (YYYY-MM-DD)"),
     end: str = Query(..., description="End date (YYYY-MM-DD)"),
+    limit: Optional[int] = Query(None, ge=1, description="상위 N명"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -162,7 +163,7 @@ async def get_driver_rankings(
     start_date = datetime.fromisoformat(start)
     end_date = datetime.fromisoformat(end)
     
-    return driver_system.get_driver_rankings(start_date, end_date)
+    return driver_system.get_driver_rankings(start_date, end_date, limit=limit)
 
 
 @router.get("/drivers/{driver_id}/recommendations")
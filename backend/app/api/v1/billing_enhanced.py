@@ -22,6 +22,7 @@ from app.schemas.billing_enhanced import (
 )
 from app.services.billing_enhanced_service import BillingEnhancedService
 from app.services.export_service import financial_report_exporter
+from app.services.report_data_service import iter_chunks
 from app.models.billing_enhanced import PaymentReminderType
 
 router = APIRouter(prefix="/billing/enhanced", tags=["Billing Enhanced"])
@@ -769,7 +770,7 @@ async def export_financial_dashboard_excel(
     filename = f"Financial_Dashboard_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.xlsx"
     
     return StreamingResponse(
-        excel_file,
+        iter_chunks(excel_file),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
@@ -871,7 +872,7 @@ async def export_financial_dashboard_pdf(
     filename = f"Financial_Dashboard_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.pdf"
     
     return StreamingResponse(
-        pdf_file,
+        iter_chunks(pdf_file),
         media_type="application/pdf",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
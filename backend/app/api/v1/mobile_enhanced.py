@@ -22,6 +22,7 @@ from app.models.vehicle import Vehicle
 from app.models.order import Order
 from app.models.fcm_token import FCMToken, PushNotificationLog
 from app.models.vehicle_location import VehicleLocation, TemperatureAlert
+from app.services.vehicle_state_store import vehicle_state_store
 from app.schemas.mobile import (
     MobileLoginRequest,
     MobileLoginResponse,
@@ -358,6 +359,14 @@ async def update_location(
         recorded_at=location.timestamp
     )
     db.add(new_location)
+    vehicle_state_store.record_positions(db, [{
+        "vehicle_id": vehicle_id,
+        "latitude": location.latitude,
+        "longitude": location.longitude,
+        "speed_kmh": location.speed,
+        "heading": location.heading,
+        "recorded_at": location.timestamp
+    }])
     db.commit()
     db.refresh(new_location)
     
@@ -408,6 +417,18 @@ async def batch_update_locations(
         db.add(new_loc)
         new_locations.append(new_loc)
     
+    # 오프라인 수집분 중 가장 최근 위치만 최신 상태로 반영
+    vehicle_state_store.record_positions(db, [
+        {
+            "vehicle_id": vehicle_id,
+            "latitude": location.latitude,
+            "longitude": location.longitude,
+            "speed_kmh": location.speed,
+            "heading": location.heading,
+            "recorded_at": location.timestamp
+        }
+        for location in batch.locations
+    ])
     db.commit()
     
     # Refresh all locations
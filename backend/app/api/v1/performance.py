@@ -11,7 +11,7 @@ from app.core.database import get_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.services.cache_service import cache_service
-from app.middleware.performance import query_tracker
+from app.middleware.performance import query_tracker, route_latency
 import psutil
 
 
@@ -89,6 +89,41 @@ async def reset_query_stats(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/performance/route-latency")
+async def get_route_latency(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get per-route latency histograms (this worker)
+
+    Returns request count, avg/max/p50/p95/p99 and bucket counts per route
+    """
+    # Only admins can view performance stats
+    if current_user.role not in ['admin', 'manager']:
+        raise HTTPException(status_code=403, detail="권한이 없습니다")
+
+    return {
+        "status": "success",
+        "data": route_latency.get_stats()
+    }
+
+
+@router.post("/performance/route-latency/reset")
+async def reset_route_latency(
+    current_user: User = Depends(get_current_user)
+):
+    """Reset per-route latency histograms"""
+    if current_user.role not in ['admin', 'manager']:
+        raise HTTPException(status_code=403, detail="권한이 없습니다")
+
+    route_latency.reset()
+
+    return {
+        "status": "success",
+        "message": "Route latency statistics reset"
+    }
+
+
 @router.get("/performance/system")
 async def get_system_performance(
     current_user: User = Depends(get_current_user)
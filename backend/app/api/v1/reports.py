@@ -13,6 +13,7 @@ from app.api.auth import get_current_user
 from app.models.user import User
 from app.services.report_generator import get_report_generator
 from app.services.excel_generator import get_excel_generator
+from app.services.report_data_service import iter_chunks
 
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
@@ -43,7 +44,7 @@ async def generate_dispatch_pdf(
         filename = f"dispatch_report_{start_date}_{end_date}.pdf"
         
         return StreamingResponse(
-            pdf_buffer,
+            iter_chunks(pdf_buffer),
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -76,7 +77,7 @@ async def generate_dispatch_excel(
         filename = f"dispatch_report_{start_date}_{end_date}.xlsx"
         
         return StreamingResponse(
-            excel_buffer,
+            iter_chunks(excel_buffer),
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -111,7 +112,7 @@ async def generate_vehicle_pdf(
         filename = f"vehicle_performance_{start_date}_{end_date}.pdf"
         
         return StreamingResponse(
-            pdf_buffer,
+            iter_chunks(pdf_buffer),
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -146,7 +147,7 @@ async def generate_vehicle_excel(
         filename = f"vehicle_performance_{start_date}_{end_date}.xlsx"
         
         return StreamingResponse(
-            excel_buffer,
+            iter_chunks(excel_buffer),
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -181,7 +182,7 @@ async def generate_driver_pdf(
         filename = f"driver_evaluation_{start_date}_{end_date}.pdf"
         
         return StreamingResponse(
-            pdf_buffer,
+            iter_chunks(pdf_buffer),
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -216,7 +217,7 @@ async def generate_driver_excel(
         filename = f"driver_evaluation_{start_date}_{end_date}.xlsx"
         
         return StreamingResponse(
-            excel_buffer,
+            iter_chunks(excel_buffer),
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -249,7 +250,7 @@ async def generate_customer_excel(
         filename = f"customer_satisfaction_{start_date}_{end_date}.xlsx"
         
         return StreamingResponse(
-            excel_buffer,
+            iter_chunks(excel_buffer),
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
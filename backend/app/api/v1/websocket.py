@@ -382,6 +382,74 @@ async def websocket_analytics(
         manager.disconnect(connection_id)
 
 
+@router.websocket("/optimization-jobs/{job_id}")
+async def websocket_optimization_job(
+    job_id: str,
+    websocket: WebSocket,
+    token: Optional[str] = Query(None)
+):
+    """
+    WebSocket endpoint for optimization job progress
+    
+    Broadcasts:
+    - Job started / progress (best solution cost, progress %)
+    - Job completed (with result) / failed
+    
+    Requires `token` of the job owner or an admin.
+    Sends the current job snapshot right after connecting.
+    """
+    from app.api.optimization_jobs import can_access_job
+    from app.core.database import SessionLocal
+    from app.services.optimization_job_service import optimization_job_service
+    
+    # 작업 파라미터/결과가 전송되므로 토큰 인증 필수 (등록자 또는 관리자)
+    user = None
+    if token:
+        db = SessionLocal()
+        try:
+            user = await get_current_user_websocket(token, db)
+        finally:
+            db.close()
+    if user is None:
+        await websocket.close(code=1008, reason="Authentication failed")
+        return
+    
+    job = await optimization_job_service.get(job_id)
+    if job and not can_access_job(job, user):
+        await websocket.close(code=1008, reason="Forbidden")
+        return
+    
+    connection_id = await manager.connect(
+        websocket, optimization_job_service.job_channel(job_id), user.id
+    )
+    
+    await manager.send_personal_message(
+        {
+            "type": "job_snapshot" if job else "job_not_found",
+            "job": job,
+            "timestamp": datetime.utcnow().isoformat()
+        },
+        websocket
+    )
+    if not job:
+        # 등록자를 확인할 수 없는 채널은 구독하지 않음
+        manager.disconnect(connection_id)
+        await websocket.close(code=1008, reason="Job not found")
+        return
+    
+    try:
+        while True:
+            data = await websocket.receive_json()
+            
+            if data.get("type") == "pong":
+                continue
+    except WebSocketDisconnect:
+        manager.disconnect(connection_id)
+    except Exception as e:
+        logger.error(f"Optimization job WebSocket error: {e}")
+        manager.disconnect(connection_id)
+
+
 @router.get("/stats")
 async def get_websocket_stats():
     """
@@ -4,7 +4,9 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from pathlib import Path
 
+from app.api.auth import get_current_user
 from app.core.database import get_db
+from app.models import User
 from app.models.vehicle import Vehicle, VehicleStatus, VehicleType
 from app.schemas.vehicle import (
     VehicleCreate, VehicleUpdate, VehicleResponse, VehicleListResponse, VehicleWithGPSResponse
@@ -44,9 +46,10 @@ async def get_vehicles(
     
     # Include GPS data if requested
     if include_gps:
-        from app.models.uvis_gps import VehicleGPSLog, VehicleTemperatureLog
-        from sqlalchemy import desc
         from app.schemas.vehicle import VehicleGPSData
+        from app.services.vehicle_state_store import vehicle_state_store
+        
+        states = vehicle_state_store.get_many(db, [vehicle.id for vehicle in items])
         
         enhanced_items = []
         for vehicle in items:
@@ -84,37 +87,22 @@ async def get_vehicles(
             }
             
             if vehicle.uvis_enabled and vehicle.uvis_device_id:
-                # Get latest GPS data
-                latest_gps = db.query(VehicleGPSLog).filter(
-                    VehicleGPSLog.vehicle_id == vehicle.id
-                ).order_by(desc(VehicleGPSLog.created_at)).first()
-                
-                # Get latest temperature data
-                latest_temp = db.query(VehicleTemperatureLog).filter(
-                    VehicleTemperatureLog.vehicle_id == vehicle.id
-                ).order_by(desc(VehicleTemperatureLog.created_at)).first()
+                # Latest GPS / temperature from the vehicle state store
+                state = states.get(vehicle.id)
+                latest_gps = state if state and state.gps_recorded_at else None
+                latest_temp = state if state and state.temperature_recorded_at else None
                 
                 if latest_gps or latest_temp:
                     try:
                         from datetime import timedelta
                         
-                        # GPS datetime
+                        # GPS datetime (KST)
                         gps_datetime = None
-                        if latest_gps and latest_gps.bi_date and latest_gps.bi_time:
-                            try:
-                                gps_datetime = f"{latest_gps.bi_date[:4]}-{latest_gps.bi_date[4:6]}-{latest_gps.bi_date[6:8]} {latest_gps.bi_time[:2]}:{latest_gps.bi_time[2:4]}:{latest_gps.bi_time[4:6]}"
-                            except:
-                                pass
+                        if latest_gps:
+                            gps_datetime = (latest_gps.gps_recorded_at + timedelta(hours=9)).strftime("%Y-%m-%d %H:%M:%S")
                         
                         # Last updated (KST)
-                        last_updated = None
-                        if latest_gps and latest_temp:
-                            last_updated_utc = max(latest_gps.created_at, latest_temp.created_at)
-                            last_updated = last_updated_utc + timedelta(hours=9)
-                        elif latest_gps:
-                            last_updated = latest_gps.created_at + timedelta(hours=9)
-                        elif latest_temp:
-                            last_updated = latest_temp.created_at + timedelta(hours=9)
+                        last_updated = state.last_updated + timedelta(hours=9)
                         
                         # Reverse geocoding: Convert GPS coordinates to address
                         current_address = None
@@ -135,7 +123,7 @@ async def get_vehicles(
                             longitude=latest_gps.longitude if latest_gps else None,
                             current_address=current_address,
                             is_engine_on=latest_gps.is_engine_on if latest_gps else None,
-                            speed_kmh=latest_gps.speed_kmh if latest_gps else None,
+                            speed_kmh=round(latest_gps.speed_kmh) if latest_gps and latest_gps.speed_kmh is not None else None,
                             temperature_a=latest_temp.temperature_a if latest_temp else None,
                             temperature_b=latest_temp.temperature_b if latest_temp else None,
                             battery_voltage=None,  # TODO: Add battery voltage to UVIS data
@@ -246,6 +234,27 @@ async def upload_vehicles_excel(
         raise HTTPException(status_code=500, detail="업로드 중 오류가 발생했습니다")
 
 
+@router.post("/upload/jobs", status_code=202)
+async def submit_vehicles_upload_job(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    엑셀 파일로 차량 일괄 업로드 작업 등록 (비동기)
+
+    즉시 job_id 를 반환하고 청크 저장 진행률을 WebSocket `/ws/optimization-jobs/{job_id}` 로 전송합니다.
+    결과(GET `/optimization-jobs/{job_id}`)는 /upload 와 같은 형식입니다.
+    """
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise HTTPException(status_code=400, detail="엑셀 파일만 업로드 가능합니다")
+
+    content = await file.read()
+    job = await ExcelUploadService.submit_import_job(
+        "vehicles", content, filename=file.filename, user_id=current_user.id
+    )
+    return job.to_dict(include_result=False)
+
+
 
 @router.get("/template/download")
 def download_vehicle_template():
@@ -0,0 +1,87 @@
+"""
+비동기 데이터베이스 세션
+- 실시간/WebSocket/텔레메트리/추적 서비스 전용 (이벤트 루프를 막지 않음)
+- PostgreSQL: asyncpg, SQLite(개발): aiosqlite
+- 동기 엔진(core/database.py)과 별도의 커넥션 풀 사용
+"""
+
+from typing import AsyncGenerator, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from .config import settings
+
+__all__ = [
+    "to_async_database_url", "get_async_engine", "get_async_sessionmaker",
+    "get_async_db", "dispose_async_engine",
+]
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def to_async_database_url(database_url: str) -> str:
+    """동기 DB URL 을 비동기 드라이버 URL 로 변환 (postgresql+psycopg2 → postgresql+asyncpg)"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"비동기 드라이버를 지원하지 않는 DB: {backend}")
+    return url.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """비동기 엔진 (최초 호출 시 생성)"""
+    global _async_engine
+    if _async_engine is None:
+        url = to_async_database_url(settings.DATABASE_URL)
+        if url.startswith("postgresql"):
+            _async_engine = create_async_engine(
+                url,
+                pool_size=settings.ASYNC_DB_POOL_SIZE,
+                max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+                pool_timeout=settings.ASYNC_DB_POOL_TIMEOUT,
+                pool_pre_ping=True,
+                pool_recycle=3600,
+                echo=settings.APP_ENV == "development"
+            )
+        else:
+            _async_engine = create_async_engine(url, echo=settings.APP_ENV == "development")
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """비동기 세션 팩토리 (커밋 후에도 로드된 속성 접근 가능)"""
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(
+            get_async_engine(), class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get async database session.
+
+    Usage:
+        @router.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            return (await db.execute(select(Item))).scalars().all()
+    """
+    async with get_async_sessionmaker()() as session:
+        yield session
+
+
+async def dispose_async_engine():
+    """커넥션 풀 정리 (애플리케이션 종료 시)"""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_sessionmaker = None
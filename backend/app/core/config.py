@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -17,7 +17,17 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
-    
+    ASYNC_DB_POOL_SIZE: int = 10  # 비동기 엔진(실시간/WebSocket 서비스) 풀 크기
+    ASYNC_DB_MAX_OVERFLOW: int = 5
+    ASYNC_DB_POOL_TIMEOUT: int = 10  # 연결 대기 한도 (초)
+
+    # Telemetry Storage (GPS/온도/위치/센서 로그)
+    TELEMETRY_RAW_RETENTION_DAYS: int = 30  # 원시 로그 보존 기간 (이후 1분/1시간 집계만 유지)
+    TELEMETRY_MINUTE_ROLLUP_RETENTION_DAYS: int = 180
+    TELEMETRY_HOUR_ROLLUP_RETENTION_DAYS: int = 0  # 0 = 무기한
+    TELEMETRY_PARTITION_MONTHS_AHEAD: int = 2  # 미리 만들어 둘 월별 파티션 수 (PostgreSQL)
+    TELEMETRY_ROLLUP_INTERVAL_MINUTES: int = 5
+
     # Redis (parse from URL or use separate fields)
     REDIS_URL: str = "redis://redis:6379/0"
     REDIS_HOST: str = "redis"
@@ -25,9 +35,24 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
     
+    # Rate Limiting
+    RATE_LIMIT_BACKEND: str = "redis"  # redis: 워커/인스턴스 공유 한도, memory: 워커 프로세스별
+    RATE_LIMIT_PER_MINUTE: int = 60  # IP(또는 API 키)당 분당 요청 수
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10  # 로그인 시도 한도
+    RATE_LIMIT_API_KEYS: Dict[str, int] = {}  # 등록 API 키 -> 분당 요청 수 (JSON, 미등록 키는 IP 단위)
+    
     # Naver Map API
     NAVER_MAP_CLIENT_ID: str
     NAVER_MAP_CLIENT_SECRET: str
+    NAVER_DIRECTIONS_MAX_CONCURRENCY: int = 10  # 거리 행렬 생성 시 동시 요청 수
+    NAVER_DIRECTIONS_RATE_PER_SECOND: float = 10.0  # Directions API 초당 요청 한도
+    NAVER_ROUTE_CACHE_TTL_SECONDS: int = 604800  # 위치 쌍 캐시 TTL (7일)
+    NAVER_ROUTE_CACHE_MAX_ENTRIES: int = 50000  # 프로세스 메모리 캐시 최대 위치 쌍 수 (LRU)
+    
+    # Optimization Solver
+    SOLVER_POOL_WORKERS: int = 3  # 워커 프로세스당 OR-Tools 솔버 프로세스 수 (0 = 스레드 실행)
+    OPTIMIZATION_JOB_MAX_CONCURRENCY: int = 2  # 워커 프로세스당 동시 실행 최적화 작업 수
+    OPTIMIZATION_JOB_RESULT_TTL_SECONDS: int = 86400  # 최적화 작업 결과 보존 기간 (1일)
     
     # Kakao API (Optional - for traffic information)
     KAKAO_REST_API_KEY: str = ""
@@ -1,75 +1,242 @@
 """
-Response Compression Middleware
-- Gzip compression for API responses
-- Performance optimization
+Response Compression Middleware (순수 ASGI)
+- gzip / brotli(패키지가 설치된 경우) 응답 압축, Accept-Encoding q 값 기준으로 선택
+- 최소 크기 / 압축 대상 Content-Type 규칙
+- 여러 청크로 나가는 응답은 청크마다 flush 하며 스트리밍 압축 (minimum_size 까지만 버퍼링)
+- WebSocket / lifespan, SSE(text/event-stream), 이미 인코딩된 응답, HEAD / 204 / 206 / 304 는 그대로 통과
 """
 
-from fastapi import Request
-from fastapi.responses import Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-import gzip
-import io
+import zlib
+from typing import Dict, List, Optional, Tuple
 
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class CompressionMiddleware(BaseHTTPMiddleware):
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# 압축 대상 Content-Type (접두어 일치) 및 +json / +xml 구조화 타입
+COMPRESSIBLE_TYPES: Tuple[str, ...] = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+COMPRESSIBLE_SUFFIXES: Tuple[str, ...] = ("+json", "+xml")
+EXCLUDED_TYPES: Tuple[str, ...] = ("text/event-stream",)
+
+PASSTHROUGH_STATUSES = frozenset({204, 206, 304})
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Accept-Encoding -> {인코딩: q}"""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if not media_type or media_type.startswith(EXCLUDED_TYPES):
+        return False
+    return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(COMPRESSIBLE_SUFFIXES)
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality, mode=brotli.MODE_TEXT)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
     """HTTP Response Compression Middleware"""
-    
-    def __init__(self, app: ASGIApp, minimum_size: int = 500):
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
         """
         Args:
-            app: FastAPI application
+            app: ASGI application
             minimum_size: Minimum response size (bytes) to compress
+            gzip_level: zlib compression level (1-9)
+            brotli_quality: brotli quality (0-11), 동적 응답은 4 전후가 속도/압축률 균형
         """
-        super().__init__(app)
+        self.app = app
         self.minimum_size = minimum_size
-    
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Check if client accepts gzip
-        accept_encoding = request.headers.get("accept-encoding", "")
-        
-        if "gzip" not in accept_encoding:
-            return response
-        
-        # Skip compression for certain content types
-        content_type = response.headers.get("content-type", "")
-        skip_types = ["image/", "video/", "audio/", "application/zip", "application/gzip"]
-        
-        if any(skip in content_type for skip in skip_types):
-            return response
-        
-        # Get response body
-        response_body = b""
-        async for chunk in response.body_iterator:
-            response_body += chunk
-        
-        # Skip small responses
-        if len(response_body) < self.minimum_size:
-            return Response(
-                content=response_body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type
-            )
-        
-        # Compress response
-        gzip_buffer = io.BytesIO()
-        with gzip.GzipFile(mode="wb", fileobj=gzip_buffer, compresslevel=6) as gzip_file:
-            gzip_file.write(response_body)
-        
-        compressed_body = gzip_buffer.getvalue()
-        
-        # Update headers
-        headers = dict(response.headers)
-        headers["content-encoding"] = "gzip"
-        headers["content-length"] = str(len(compressed_body))
-        headers["vary"] = "Accept-Encoding"
-        
-        return Response(
-            content=compressed_body,
-            status_code=response.status_code,
-            headers=headers,
-            media_type=response.media_type
-        )
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    @staticmethod
+    def select_encoding(accept_encoding: str) -> Optional[str]:
+        """클라이언트가 허용하는 인코딩 중 br > gzip 순으로 선택"""
+        if not accept_encoding:
+            return None
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        candidates = ("br", "gzip") if brotli is not None else ("gzip",)
+        best, best_quality = None, 0.0
+        for coding in candidates:
+            quality = accepted.get(coding, wildcard)
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def create_compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+
+class _CompressionResponder:
+    """
+    응답 1건의 압축 상태
+
+    start 메시지와 앞쪽 본문은 minimum_size 에 도달할 때까지만 보류하고,
+    도달한 뒤에는 청크 하나만 더 기다려 응답이 끝나는지 확인합니다.
+    (BaseHTTPMiddleware 를 거친 응답은 "본문 + 빈 종료 청크" 로 나뉘어 오므로
+    이 경우에도 한 번에 압축해 Content-Length 를 유지)
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._buffer: List[bytes] = []
+        self._buffered_size = 0
+        self._held = False
+        self._compressor = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if (
+                message["status"] in PASSTHROUGH_STATUSES
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            ):
+                self._passthrough = True
+                await self._send(message)
+            else:
+                self._start = message
+            return
+
+        if self._passthrough or message_type != "http.response.body":
+            if self._start is not None:
+                await self._passthrough_buffered(more_body=True)
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is not None:
+            await self._send_compressed(body, more_body)
+            return
+
+        self._buffer.append(body)
+        self._buffered_size += len(body)
+        if more_body and (self._buffered_size < self.middleware.minimum_size or not self._held):
+            self._held = self._buffered_size >= self.middleware.minimum_size
+            return
+
+        if not more_body and self._buffered_size < self.middleware.minimum_size:
+            # 작은 응답: 원본 그대로
+            await self._passthrough_buffered(more_body=False)
+            return
+
+        payload = b"".join(self._buffer)
+        self._buffer = []
+        self._compressor = self.middleware.create_compressor(self.encoding)
+        headers = MutableHeaders(raw=self._start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            # 스트리밍 응답: 길이를 알 수 없으므로 chunked 전송
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self._flush_start()
+            await self._send_compressed(payload, more_body=True)
+            return
+
+        payload = self._compressor.compress(payload) + self._compressor.finish()
+        headers["Content-Length"] = str(len(payload))
+        await self._flush_start()
+        await self._send({"type": "http.response.body", "body": payload, "more_body": False})
+
+    async def _send_compressed(self, body: bytes, more_body: bool) -> None:
+        if more_body:
+            chunk = self._compressor.compress(body) + self._compressor.flush()
+        else:
+            chunk = self._compressor.compress(body) + self._compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _passthrough_buffered(self, more_body: bool) -> None:
+        self._passthrough = True
+        payload = b"".join(self._buffer)
+        self._buffer = []
+        await self._flush_start()
+        if payload or not more_body:
+            await self._send({"type": "http.response.body", "body": payload, "more_body": more_body})
+
+    async def _flush_start(self) -> None:
+        start, self._start = self._start, None
+        await self._send(start)
@@ -1,95 +1,203 @@
 """
-Performance Monitoring Middleware
-- Request/Response timing
-- Slow query detection
-- Memory usage tracking
+Performance Monitoring Middleware (순수 ASGI)
+- Request/Response timing (X-Response-Time, 첫 응답 바이트 기준)
+- 라우트별 지연 히스토그램 (라우트 템플릿 기준, 고정 버킷)
+- Slow request / slow query detection
+- Memory usage tracking (옵션, 요청마다 시스템 호출 2회)
 """
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
 import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
 import psutil
 from loguru import logger
-from typing import Callable
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# 지연 버킷 상한 (ms), 마지막 버킷은 +Inf
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope, root_path: str = "") -> str:
+    """
+    요청의 라우트 템플릿 (예: /api/v1/orders/12 -> /api/v1/orders/{order_id})
+
+    라우터가 매칭하며 scope 에 남긴 값으로 라벨을 정해 라벨 수를 라우트 수로 제한합니다.
+    - FastAPI 라우트: scope["route"].path_format (마운트된 하위 앱이면 마운트 접두어 포함)
+    - 그 외 Mount(StaticFiles 등): 마운트 접두어 하나로 묶음
+    - 매칭되지 않은 요청(404) 등: UNMATCHED_ROUTE
+
+    Args:
+        scope: 앱 호출이 끝난 뒤의 scope (라우터가 제자리에서 갱신)
+        root_path: 앱 호출 전 scope 의 root_path
+    """
+    mount_prefix = scope.get("root_path", "")[len(root_path):]
+    path_format = getattr(scope.get("route"), "path_format", None)
+    if path_format is not None:
+        return mount_prefix + path_format
+    if mount_prefix:
+        return mount_prefix
+    return UNMATCHED_ROUTE
+
+
+class _LatencyHistogram:
+    """라우트 1개의 누적 지연 분포"""
+
+    __slots__ = ("buckets", "count", "total_ms", "max_ms", "errors")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+
+
+class RouteLatencyHistogram:
+    """
+    라우트별 지연 히스토그램
+
+    기록은 버킷 이진 탐색 + 카운터 증가뿐이라 요청당 비용이 작습니다.
+    (이벤트 루프에서만 기록하므로 별도 잠금 없음)
+    """
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._routes: Dict[Tuple[str, str], _LatencyHistogram] = {}
+
+    def record(self, method: str, route: str, duration_ms: float, status: int = 200) -> None:
+        key = (method, route)
+        histogram = self._routes.get(key)
+        if histogram is None:
+            histogram = self._routes[key] = _LatencyHistogram(len(self.buckets_ms) + 1)
+        histogram.buckets[bisect_left(self.buckets_ms, duration_ms)] += 1
+        histogram.count += 1
+        histogram.total_ms += duration_ms
+        if duration_ms > histogram.max_ms:
+            histogram.max_ms = duration_ms
+        if status >= 500:
+            histogram.errors += 1
+
+    def percentile(self, histogram: _LatencyHistogram, q: float) -> Optional[float]:
+        """버킷 상한 기준 분위수 추정 (ms, +Inf 버킷이면 최대값)"""
+        if not histogram.count:
+            return None
+        target = q * histogram.count
+        cumulative = 0
+        for index, bucket_count in enumerate(histogram.buckets):
+            cumulative += bucket_count
+            if cumulative >= target:
+                if index < len(self.buckets_ms):
+                    return min(self.buckets_ms[index], histogram.max_ms)
+                return histogram.max_ms
+        return histogram.max_ms
+
+    def get_stats(self) -> List[Dict]:
+        """라우트별 통계 (평균 지연 내림차순)"""
+        labels = [f"le_{bound:g}" for bound in self.buckets_ms] + ["le_inf"]
+        stats = []
+        for (method, route), histogram in self._routes.items():
+            stats.append({
+                "method": method,
+                "route": route,
+                "count": histogram.count,
+                "errors": histogram.errors,
+                "avg_ms": round(histogram.total_ms / histogram.count, 3),
+                "max_ms": round(histogram.max_ms, 3),
+                "p50_ms": self.percentile(histogram, 0.50),
+                "p95_ms": self.percentile(histogram, 0.95),
+                "p99_ms": self.percentile(histogram, 0.99),
+                "buckets": dict(zip(labels, histogram.buckets)),
+            })
+        return sorted(stats, key=lambda item: item["avg_ms"], reverse=True)
+
+    def reset(self) -> None:
+        self._routes = {}
+
 
+# Global route latency histogram instance
+route_latency = RouteLatencyHistogram()
 
-class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
+
+class PerformanceMonitoringMiddleware:
     """Performance Monitoring Middleware"""
-    
+
     def __init__(
         self,
         app: ASGIApp,
         slow_request_threshold: float = 1.0,
-        enable_memory_tracking: bool = True
+        enable_memory_tracking: bool = True,
+        histogram: Optional[RouteLatencyHistogram] = None
     ):
         """
         Args:
-            app: FastAPI application
+            app: ASGI application
             slow_request_threshold: Threshold (seconds) for slow request logging
             enable_memory_tracking: Enable memory usage tracking
+            histogram: Route latency histogram (default: global route_latency)
         """
-        super().__init__(app)
+        self.app = app
         self.slow_request_threshold = slow_request_threshold
         self.enable_memory_tracking = enable_memory_tracking
+        self.histogram = histogram if histogram is not None else route_latency
         self.process = psutil.Process()
-    
-    async def dispatch(self, request: Request, call_next: Callable):
-        # Start timing
-        start_time = time.time()
-        
-        # Memory before request (if enabled)
-        memory_before = None
-        if self.enable_memory_tracking:
-            try:
-                memory_before = self.process.memory_info().rss / 1024 / 1024  # MB
-            except:
-                pass
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration = time.time() - start_time
-        
-        # Memory after request (if enabled)
-        memory_after = None
-        memory_diff = None
-        if self.enable_memory_tracking and memory_before is not None:
-            try:
-                memory_after = self.process.memory_info().rss / 1024 / 1024  # MB
-                memory_diff = memory_after - memory_before
-            except:
-                pass
-        
-        # Add performance headers
-        response.headers["X-Response-Time"] = f"{duration:.3f}s"
-        
-        if memory_after is not None:
-            response.headers["X-Memory-Usage"] = f"{memory_after:.2f}MB"
-        
-        # Log slow requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        root_path = scope.get("root_path", "")
+        start_time = time.perf_counter()
+        memory_before = self._memory_mb()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Response-Time", f"{time.perf_counter() - start_time:.3f}s")
+                if memory_before is not None:
+                    headers.append("X-Memory-Usage", f"{memory_before:.2f}MB")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self._record(scope, root_path, status_code, time.perf_counter() - start_time, memory_before)
+
+    def _memory_mb(self) -> Optional[float]:
+        if not self.enable_memory_tracking:
+            return None
+        try:
+            return self.process.memory_info().rss / 1024 / 1024
+        except Exception:
+            return None
+
+    def _record(
+        self, scope: Scope, root_path: str, status_code: int, duration: float, memory_before: Optional[float]
+    ) -> None:
+        method = scope["method"]
+        route = route_template(scope, root_path)
+        self.histogram.record(method, route, duration * 1000, status_code)
+
         if duration > self.slow_request_threshold:
             log_data = {
-                "method": request.method,
-                "path": request.url.path,
+                "method": method,
+                "path": scope.get("path", ""),
+                "route": route,
                 "duration": f"{duration:.3f}s",
-                "status": response.status_code
+                "status": status_code
             }
-            
-            if memory_diff is not None:
-                log_data["memory_delta"] = f"{memory_diff:.2f}MB"
-            
+            memory_after = self._memory_mb()
+            if memory_before is not None and memory_after is not None:
+                log_data["memory_delta"] = f"{memory_after - memory_before:.2f}MB"
             logger.warning(f"Slow request detected: {log_data}")
-        else:
-            # Log normal requests at debug level
-            logger.debug(
-                f"{request.method} {request.url.path} "
-                f"- {response.status_code} "
-                f"- {duration:.3f}s"
-            )
-        
-        return response
 
 
 class QueryPerformanceTracker:
@@ -0,0 +1,302 @@
+"""
+Rate Limiting (GCRA)
+- 키당 상태는 "이론적 도착 시각"(TAT) 값 1개, 요청당 O(1) 계산
+  (limit 건 / period 초 슬라이딩 윈도우와 같은 한도를 버스트 없이 균등하게 보충)
+- 상태 저장소 교체 가능
+  - MemoryRateLimitBackend: 프로세스 단위 (테스트 / 단일 워커)
+  - RedisRateLimitBackend: Lua 스크립트 1회 호출로 원자적 갱신, Redis 서버 시각 사용 -> 워커 / 인스턴스 공유 한도
+    Redis 에 연결할 수 없으면 재시도 간격 동안 메모리 저장소로 대체
+- 정책: 경로(접두어 + 메서드)별 > API 키별 > 기본(IP) 순으로 하나를 적용
+"""
+
+import hashlib
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Optional, Sequence, Tuple
+
+from fastapi.responses import JSONResponse
+from loguru import logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# 제외 경로 (헬스체크, 문서, WebSocket)
+EXEMPT_PATHS: Tuple[str, ...] = (
+    "/health",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/api/v1/dispatches/ws/",
+    "/api/v1/ws/",
+    "/ws/",
+)
+
+API_KEY_HEADER = "x-api-key"
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """period_seconds 동안 limit 건"""
+    name: str
+    limit: int
+    period_seconds: float = 60.0
+
+    @property
+    def emission_interval(self) -> float:
+        """요청 1건이 차지하는 시간 (초)"""
+        return self.period_seconds / self.limit
+
+
+@dataclass(frozen=True)
+class RouteRateLimit:
+    """경로 접두어(+ 메서드)별 정책"""
+    path_prefix: str
+    policy: RateLimitPolicy
+    methods: Optional[FrozenSet[str]] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        return path.startswith(self.path_prefix) and (self.methods is None or method in self.methods)
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # 거부 시 다음 요청 가능까지 남은 시간 (초)
+    reset_after: float  # 한도가 완전히 회복될 때까지 남은 시간 (초)
+
+
+def gcra(tat: Optional[float], now: float, policy: RateLimitPolicy) -> Tuple[RateLimitResult, Optional[float]]:
+    """
+    GCRA 1회 판정
+
+    Returns:
+        (판정 결과, 저장할 새 TAT — 거부 시 None)
+    """
+    interval = policy.emission_interval
+    tat = now if tat is None or tat < now else tat
+    new_tat = tat + interval
+    allow_at = new_tat - policy.period_seconds
+
+    if now < allow_at:
+        return RateLimitResult(False, policy.limit, 0, allow_at - now, tat - now), None
+
+    remaining = int(math.floor((policy.period_seconds - (new_tat - now)) / interval + 1e-9))
+    return RateLimitResult(True, policy.limit, remaining, 0.0, new_tat - now), new_tat
+
+
+class MemoryRateLimitBackend:
+    """프로세스 메모리 GCRA 저장소"""
+
+    PURGE_INTERVAL_SECONDS = 60.0
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._tats: Dict[str, float] = {}
+        self._purged_at = clock()
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        return self.hit_sync(key, policy)
+
+    def hit_sync(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        now = self.clock()
+        result, new_tat = gcra(self._tats.get(key), now, policy)
+        if new_tat is not None:
+            self._tats[key] = new_tat
+        if now - self._purged_at >= self.PURGE_INTERVAL_SECONDS:
+            self._purge(now)
+        return result
+
+    def _purge(self, now: float) -> None:
+        """한도가 완전히 회복된 키 제거 (주기적, 분할 상환 O(1))"""
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        self._purged_at = now
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+
+# KEYS[1] = 키, ARGV[1] = emission interval, ARGV[2] = period (초)
+# 소수 반환값은 Lua -> Redis 변환 시 잘리므로 문자열로 반환
+GCRA_LUA = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+  tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+  return {0, 0, tostring(allow_at - now), tostring(tat - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, math.floor((period - (new_tat - now)) / interval + 1e-9), '0', tostring(new_tat - now)}
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Redis GCRA 저장소 (모든 워커 / 인스턴스가 같은 카운터 사용)
+
+    요청당 EVALSHA 1회 왕복. Redis 장애 시 REDIS_RETRY_SECONDS 동안 메모리 저장소로 대체합니다.
+    """
+
+    KEY_PREFIX = "ratelimit"
+    REDIS_RETRY_SECONDS = 60
+
+    def __init__(self, redis_url: str, fallback: Optional[MemoryRateLimitBackend] = None):
+        self.redis_url = redis_url
+        self.fallback = fallback or MemoryRateLimitBackend()
+        self._redis = None
+        self._script = None
+        self._redis_retry_at = 0.0
+
+    async def _get_script(self):
+        if self._script is not None or not self.redis_url or time.monotonic() < self._redis_retry_at:
+            return self._script
+        try:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+            await self._redis.ping()
+            self._script = self._redis.register_script(GCRA_LUA)
+        except Exception as e:
+            logger.warning(f"Rate limit Redis unavailable, using per-process limits: {e}")
+            self._disconnect()
+        return self._script
+
+    def _disconnect(self) -> None:
+        self._redis = None
+        self._script = None
+        self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_SECONDS
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        script = await self._get_script()
+        if script is None:
+            return self.fallback.hit_sync(key, policy)
+        try:
+            allowed, remaining, retry_after, reset_after = await script(
+                keys=[f"{self.KEY_PREFIX}:{key}"],
+                args=[policy.emission_interval, policy.period_seconds],
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit Redis error, using per-process limits: {e}")
+            self._disconnect()
+            return self.fallback.hit_sync(key, policy)
+        return RateLimitResult(
+            bool(int(allowed)), policy.limit, int(remaining), float(retry_after), float(reset_after)
+        )
+
+
+class RateLimiter:
+    """요청 -> (정책, 식별자) 결정 및 판정"""
+
+    def __init__(
+        self,
+        default_policy: RateLimitPolicy,
+        backend=None,
+        route_policies: Sequence[RouteRateLimit] = (),
+        api_key_policies: Optional[Dict[str, RateLimitPolicy]] = None,
+        exempt_paths: Tuple[str, ...] = EXEMPT_PATHS,
+    ):
+        self.default_policy = default_policy
+        self.backend = backend if backend is not None else MemoryRateLimitBackend()
+        self.route_policies = tuple(route_policies)
+        self.api_key_policies = {
+            self.hash_api_key(key): policy for key, policy in (api_key_policies or {}).items()
+        }
+        self.exempt_paths = exempt_paths
+
+    @staticmethod
+    def hash_api_key(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode()).hexdigest()[:24]
+
+    def is_exempt(self, path: str) -> bool:
+        return path.startswith(self.exempt_paths)
+
+    def resolve(self, method: str, path: str, client_ip: str, api_key: Optional[str]) -> Tuple[RateLimitPolicy, str]:
+        """
+        적용할 정책과 카운터 키
+
+        등록된 API 키만 키 단위로 세고, 미등록 키는 IP 단위로 셉니다.
+        (헤더 값을 바꿔 가며 새 카운터를 받는 우회 방지)
+        """
+        key_hash = self.hash_api_key(api_key) if api_key else None
+        key_policy = self.api_key_policies.get(key_hash) if key_hash else None
+        identity = f"key:{key_hash}" if key_policy is not None else f"ip:{client_ip}"
+        for route in self.route_policies:
+            if route.matches(method, path):
+                return route.policy, f"{route.policy.name}:{identity}"
+        if key_policy is not None:
+            return key_policy, f"{key_policy.name}:{identity}"
+        return self.default_policy, f"{self.default_policy.name}:{identity}"
+
+    async def hit(self, method: str, path: str, client_ip: str, api_key: Optional[str] = None) -> RateLimitResult:
+        policy, key = self.resolve(method, path, client_ip, api_key)
+        return await self.backend.hit(key, policy)
+
+
+def client_ip_from_scope(scope: Scope, headers: Headers) -> str:
+    """클라이언트 IP (X-Forwarded-For > X-Real-IP > 직접 연결)"""
+    forwarded = headers.get("x-forwarded-for")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    real_ip = headers.get("x-real-ip")
+    if real_ip:
+        return real_ip
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """
+    Rate Limiting 미들웨어 (순수 ASGI)
+    WebSocket 및 제외 경로는 그대로 통과
+    """
+
+    def __init__(self, app: ASGIApp, requests_per_minute: int = 60, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or RateLimiter(RateLimitPolicy("default", requests_per_minute, 60.0))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.limiter.is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client_ip = client_ip_from_scope(scope, headers)
+        result = await self.limiter.hit(scope["method"], scope["path"], client_ip, headers.get(API_KEY_HEADER))
+        reset_at = str(int(time.time() + result.reset_after))
+
+        if not result.allowed:
+            retry_after = max(1, math.ceil(result.retry_after))
+            logger.warning(f"Rate limit exceeded for {client_ip} on {scope['path']}")
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "detail": "Too many requests. Please try again later.",
+                    "retry_after": retry_after
+                },
+                headers={
+                    "Retry-After": str(retry_after),
+                    "X-RateLimit-Limit": str(result.limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": reset_at,
+                }
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-RateLimit-Limit"] = str(result.limit)
+                response_headers["X-RateLimit-Remaining"] = str(result.remaining)
+                response_headers["X-RateLimit-Reset"] = reset_at
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -4,121 +4,21 @@ Rate Limiting, CORS, 보안 헤더
 """
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
 from starlette.middleware.base import BaseHTTPMiddleware
-from datetime import datetime, timedelta
-from collections import defaultdict
-from typing import Dict, Tuple
+import re
 import time
 from loguru import logger
 
 from app.core.config import settings
-
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """
-    Rate Limiting 미들웨어
-    IP 주소 기반으로 요청 횟수 제한
-    """
-    
-    def __init__(self, app, requests_per_minute: int = 60):
-        super().__init__(app)
-        self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, list] = defaultdict(list)
-        self.cleanup_interval = 300  # 5분마다 정리
-        self.last_cleanup = time.time()
-    
-    async def dispatch(self, request: Request, call_next):
-        # 특정 경로는 Rate Limiting 제외
-        exempt_paths = [
-            "/health",
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            "/api/v1/dispatches/ws/",  # WebSocket endpoints
-            "/api/v1/ws/",               # WebSocket endpoints
-            "/ws/"                       # WebSocket endpoints
-        ]
-        
-        if any(request.url.path.startswith(path) for path in exempt_paths):
-            return await call_next(request)
-        
-        # 클라이언트 IP 가져오기
-        client_ip = self._get_client_ip(request)
-        
-        # 현재 시간
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
-        
-        # IP별 요청 기록 정리 (오래된 요청 제거)
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if req_time > minute_ago
-        ]
-        
-        # Rate Limit 확인
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
-            logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "detail": "Too many requests. Please try again later.",
-                    "retry_after": 60
-                },
-                headers={"Retry-After": "60"}
-            )
-        
-        # 요청 기록
-        self.requests[client_ip].append(now)
-        
-        # 주기적으로 메모리 정리
-        if time.time() - self.last_cleanup > self.cleanup_interval:
-            self._cleanup_old_requests()
-        
-        response = await call_next(request)
-        
-        # Rate Limit 헤더 추가
-        remaining = self.requests_per_minute - len(self.requests[client_ip])
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(max(0, remaining))
-        response.headers["X-RateLimit-Reset"] = str(int((now + timedelta(minutes=1)).timestamp()))
-        
-        return response
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """클라이언트 IP 추출"""
-        # X-Forwarded-For 헤더 확인 (프록시 뒤에 있을 경우)
-        forwarded = request.headers.get("X-Forwarded-For")
-        if forwarded:
-            return forwarded.split(",")[0].strip()
-        
-        # X-Real-IP 헤더 확인
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        # 직접 연결된 클라이언트 IP
-        return request.client.host if request.client else "unknown"
-    
-    def _cleanup_old_requests(self):
-        """오래된 요청 기록 정리"""
-        minute_ago = datetime.now() - timedelta(minutes=1)
-        
-        # 오래된 IP 기록 제거
-        ips_to_remove = []
-        for ip, requests in self.requests.items():
-            # 최근 1분 내 요청만 유지
-            recent_requests = [req for req in requests if req > minute_ago]
-            if recent_requests:
-                self.requests[ip] = recent_requests
-            else:
-                ips_to_remove.append(ip)
-        
-        # 빈 IP 기록 제거
-        for ip in ips_to_remove:
-            del self.requests[ip]
-        
-        self.last_cleanup = time.time()
-        logger.debug(f"Cleaned up rate limit records. Active IPs: {len(self.requests)}")
+from app.middleware.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimiter,
+    RateLimitMiddleware,
+    RateLimitPolicy,
+    RedisRateLimitBackend,
+    RouteRateLimit,
+)
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -204,59 +104,116 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             raise
 
 
-class InputValidationMiddleware(BaseHTTPMiddleware):
+class InputValidationMiddleware:
     """
-    입력 검증 미들웨어
+    입력 검증 미들웨어 (순수 ASGI)
     SQL Injection, XSS 공격 패턴 감지
+
+    본문을 한 번 읽어 검사한 뒤 같은 메시지를 앱에 다시 전달합니다.
+    파일 업로드 등 텍스트가 아닌 본문과 max_body_size 를 넘는 본문은 검사하지 않고 그대로 흘려보냅니다.
     """
     
-    # 위험한 패턴
+    # 위험한 패턴 (키워드나 ';' 하나만으로는 차단하지 않음 -> "문 앞; 2층", "Select 등급" 등 일반 입력 허용)
     DANGEROUS_PATTERNS = [
-        # SQL Injection
-        r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|EXECUTE)\b)",
-        r"(--|;|\/\*|\*\/)",
-        r"(\bOR\b.*=.*)",
-        r"(\bAND\b.*=.*)",
+        # SQL Injection: 따옴표를 닫고 구문 연결 / 주석 처리 / 항상 참 조건, UNION SELECT
+        r"(['\"]\s*;\s*(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|TRUNCATE|EXEC|EXECUTE)\b)",
+        r"(;\s*(DROP|TRUNCATE|ALTER)\s+(TABLE|DATABASE|SCHEMA)\b)",
+        r"('\s*(--|#|\/\*))",
+        r"('\s*(OR|AND)\s+'?\w+'?\s*=\s*'?\w+)",
+        r"(\bUNION\s+(ALL\s+)?SELECT\b)",
         
         # XSS
         r"(<script[^>]*>.*?<\/script>)",
         r"(<iframe[^>]*>)",
         r"(javascript:)",
-        r"(on\w+\s*=)",
+        r"(<[^>]*\bon\w+\s*=)",
     ]
     
-    async def dispatch(self, request: Request, call_next):
-        # POST, PUT, PATCH 요청만 검증
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                # 요청 본문 읽기
-                body = await request.body()
-                body_str = body.decode("utf-8")
-                
-                # 위험한 패턴 검사
-                import re
-                for pattern in self.DANGEROUS_PATTERNS:
-                    if re.search(pattern, body_str, re.IGNORECASE):
-                        logger.warning(
-                            f"Suspicious input detected from {request.client.host if request.client else 'unknown'}: "
-                            f"Pattern: {pattern[:50]}..."
-                        )
-                        return JSONResponse(
-                            status_code=400,
-                            content={"detail": "Invalid input detected"}
-                        )
-                
-                # 원래 요청 본문으로 복원
-                async def receive():
-                    return {"type": "http.request", "body": body}
-                
-                request._receive = receive
-            
-            except Exception as e:
-                logger.error(f"Input validation error: {e}")
-        
-        response = await call_next(request)
-        return response
+    VALIDATED_METHODS = frozenset({"POST", "PUT", "PATCH"})
+    TEXT_CONTENT_TYPES = ("application/json", "application/x-www-form-urlencoded", "text/")
+    
+    def __init__(self, app, max_body_size: int = 1024 * 1024):
+        self.app = app
+        self.max_body_size = max_body_size
+        self._compiled = [
+            (pattern, re.compile(pattern, re.IGNORECASE)) for pattern in self.DANGEROUS_PATTERNS
+        ]
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in self.VALIDATED_METHODS:
+            await self.app(scope, receive, send)
+            return
+        
+        content_type = Headers(scope=scope).get("content-type", "").lower()
+        if content_type and not content_type.startswith(self.TEXT_CONTENT_TYPES):
+            await self.app(scope, receive, send)
+            return
+        
+        # 요청 본문 읽기 (max_body_size 초과 시 검사 생략)
+        messages = []
+        size = 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            size += len(message.get("body", b""))
+            if not message.get("more_body", False) or size > self.max_body_size:
+                break
+        
+        if size <= self.max_body_size:
+            body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.request")
+            matched = self._find_dangerous_pattern(body.decode("utf-8", errors="ignore"))
+            if matched is not None:
+                client = scope.get("client")
+                logger.warning(
+                    f"Suspicious input detected from {client[0] if client else 'unknown'}: "
+                    f"Pattern: {matched[:50]}..."
+                )
+                response = JSONResponse(
+                    status_code=400,
+                    content={"detail": "Invalid input detected"}
+                )
+                await response(scope, receive, send)
+                return
+        
+        # 읽은 메시지를 순서대로 다시 전달한 뒤 원래 receive 로 위임
+        async def replay():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+        
+        await self.app(scope, replay, send)
+    
+    def _find_dangerous_pattern(self, text: str):
+        for pattern, compiled in self._compiled:
+            if compiled.search(text):
+                return pattern
+        return None
+
+
+def create_rate_limiter() -> RateLimiter:
+    """설정 기반 Rate Limiter (Redis 저장소면 모든 워커가 한도를 공유)"""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        backend = RedisRateLimitBackend(settings.REDIS_URL)
+    else:
+        backend = MemoryRateLimitBackend()
+    
+    return RateLimiter(
+        default_policy=RateLimitPolicy("default", settings.RATE_LIMIT_PER_MINUTE, 60.0),
+        backend=backend,
+        route_policies=[
+            RouteRateLimit(
+                f"{settings.API_PREFIX}/auth/login",
+                RateLimitPolicy("login", settings.RATE_LIMIT_LOGIN_PER_MINUTE, 60.0),
+                methods=frozenset({"POST"}),
+            ),
+        ],
+        api_key_policies={
+            api_key: RateLimitPolicy("api_key", limit, 60.0)
+            for api_key, limit in settings.RATE_LIMIT_API_KEYS.items()
+        },
+    )
 
 
 def setup_security_middleware(app):
@@ -266,8 +223,8 @@ def setup_security_middleware(app):
     Args:
         app: FastAPI 애플리케이션
     """
-    # Rate Limiting (분당 60 요청)
-    app.add_middleware(RateLimitMiddleware, requests_per_minute=60)
+    # Rate Limiting (기본 IP 당 분당 RATE_LIMIT_PER_MINUTE, 로그인은 별도 한도)
+    app.add_middleware(RateLimitMiddleware, limiter=create_rate_limiter())
     
     # 보안 헤더
     app.add_middleware(SecurityHeadersMiddleware)
@@ -275,8 +232,8 @@ def setup_security_middleware(app):
     # 요청 로깅
     app.add_middleware(RequestLoggingMiddleware)
     
-    # 입력 검증 - DISABLED (causes ASGI protocol errors)
-    # if settings.APP_ENV == "production":
-    #     app.add_middleware(InputValidationMiddleware)
+    # 입력 검증 (프로덕션)
+    if settings.APP_ENV == "production":
+        app.add_middleware(InputValidationMiddleware)
     
     logger.info("✅ Security middleware configured")
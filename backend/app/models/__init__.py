@@ -5,11 +5,15 @@ from .vehicle import Vehicle, VehicleType, VehicleStatus
 from .driver import Driver
 from .order import Order, OrderStatus
 from .dispatch import Dispatch, DispatchRoute, DispatchStatus
-from .vehicle_location import VehicleLocation, TemperatureAlert
+from .vehicle_location import VehicleLocation, TemperatureAlert, VehicleLatestState
 from .notice import Notice
 from .purchase_order import PurchaseOrder
 from .band_message import BandMessage, BandChatRoom, BandMessageSchedule
 from .uvis_gps import UvisAccessKey, VehicleGPSLog, VehicleTemperatureLog, UvisApiLog
+from .telemetry_rollup import (
+    TelemetryRollupMinute, TelemetryRollupHour,
+    TemperatureRollup5m, TemperatureRollupHour, TemperatureRollupDay
+)
 from .fcm_token import FCMToken, PushNotificationLog
 from .security import TwoFactorAuth, TwoFactorLog, AuditLog, SecurityAlert
 from .ai_chat_history import AIChatHistory
@@ -52,6 +56,7 @@ __all__ = [
     "DispatchStatus",
     "VehicleLocation",
     "TemperatureAlert",
+    "VehicleLatestState",
     "Notice",
     "PurchaseOrder",
     "BandMessage",
@@ -61,6 +66,11 @@ __all__ = [
     "VehicleGPSLog",
     "VehicleTemperatureLog",
     "UvisApiLog",
+    "TelemetryRollupMinute",
+    "TelemetryRollupHour",
+    "TemperatureRollup5m",
+    "TemperatureRollupHour",
+    "TemperatureRollupDay",
     "FCMToken",
     "PushNotificationLog",
     "TwoFactorAuth",
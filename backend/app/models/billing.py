@@ -130,7 +130,7 @@ class InvoiceLineItem(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False, index=True)
-    dispatch_id = Column(Integer, ForeignKey("dispatches.id"), nullable=True, index=True)
+    dispatch_id = Column(Integer, ForeignKey("dispatches.id"), nullable=True, index=True, unique=True)  # 배차당 1건
     
     # 항목 정보
     description = Column(String(500), nullable=False)
@@ -235,7 +235,7 @@ class DriverSettlementItem(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     settlement_id = Column(Integer, ForeignKey("driver_settlements.id"), nullable=False, index=True)
-    dispatch_id = Column(Integer, ForeignKey("dispatches.id"), nullable=False, index=True)
+    dispatch_id = Column(Integer, ForeignKey("dispatches.id"), nullable=False, index=True, unique=True)  # 배차당 1건
     
     # 금액
     revenue = Column(Float, nullable=False)
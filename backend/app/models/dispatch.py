@@ -1,6 +1,6 @@
 from enum import Enum
 from datetime import date
-from sqlalchemy import String, Integer, Float, Date, ForeignKey, Enum as SQLEnum, Text, JSON
+from sqlalchemy import String, Integer, Float, Date, ForeignKey, Enum as SQLEnum, Text, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 from .base import Base, IDMixin, TimestampMixin
@@ -79,6 +79,11 @@ class Dispatch(Base, IDMixin, TimestampMixin):
     invoice_line_items = relationship("InvoiceLineItem", back_populates="dispatch")
     settlement_items = relationship("DriverSettlementItem", back_populates="dispatch")
     
+    # 인덱스 (목록 커서 페이지네이션: 배차일자, ID 내림차순)
+    __table_args__ = (
+        Index('idx_dispatches_dispatch_date_id', 'dispatch_date', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Dispatch(number={self.dispatch_number}, date={self.dispatch_date}, vehicle_id={self.vehicle_id})>"
 
@@ -97,7 +102,7 @@ class DispatchRoute(Base, IDMixin, TimestampMixin):
     __tablename__ = "dispatch_routes"
     
     # 배차 정보
-    dispatch_id: Mapped[int] = mapped_column(ForeignKey("dispatches.id"), nullable=False, comment="배차 ID")
+    dispatch_id: Mapped[int] = mapped_column(ForeignKey("dispatches.id"), nullable=False, index=True, comment="배차 ID")
     
     # 순서
     sequence: Mapped[int] = mapped_column(Integer, nullable=False, comment="경로 순서")
@@ -2,7 +2,7 @@
 IoT Sensor Models for Phase 13-14
 Real-time vehicle sensor monitoring and predictive maintenance
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, JSON, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, JSON, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -74,7 +74,7 @@ class SensorReading(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     sensor_id = Column(Integer, ForeignKey("vehicle_sensors.id"), nullable=False, index=True)
-    vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False, index=True)
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False)
     
     # 측정값
     value = Column(Float, nullable=False)
@@ -98,6 +98,11 @@ class SensorReading(Base):
     # Relationships
     sensor = relationship("VehicleSensor", back_populates="readings")
 
+    # 인덱스 (PostgreSQL 에서는 recorded_at 기준 월별 파티션 테이블)
+    __table_args__ = (
+        Index('idx_sensor_readings_vehicle_recorded', 'vehicle_id', 'recorded_at'),
+    )
+
 
 class SensorAlert(Base):
     """센서 알림"""
@@ -106,7 +111,7 @@ class SensorAlert(Base):
     id = Column(Integer, primary_key=True, index=True)
     sensor_id = Column(Integer, ForeignKey("vehicle_sensors.id"), nullable=False, index=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False, index=True)
-    reading_id = Column(Integer, ForeignKey("sensor_readings.id"), index=True)
+    reading_id = Column(Integer, index=True)  # sensor_readings.id (파티션 테이블이라 FK 없음)
     
     # 알림 정보
     severity = Column(SQLEnum(AlertSeverity), nullable=False, index=True)
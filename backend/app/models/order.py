@@ -1,6 +1,6 @@
 from enum import Enum
 from datetime import date, time
-from sqlalchemy import String, Integer, Float, Date, Time, ForeignKey, Enum as SQLEnum, Text, Boolean
+from sqlalchemy import String, Integer, Float, Date, Time, ForeignKey, Enum as SQLEnum, Text, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 from .base import Base, IDMixin, TimestampMixin
@@ -103,5 +103,10 @@ class Order(Base, IDMixin, TimestampMixin):
     dispatch_routes = relationship("DispatchRoute", back_populates="order")
     # delivery_proofs = relationship("DeliveryProof", back_populates="order", lazy="dynamic")
     
+    # 인덱스 (목록 커서 페이지네이션: 주문일자, ID 내림차순)
+    __table_args__ = (
+        Index('idx_orders_order_date_id', 'order_date', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Order(number={self.order_number}, temp={self.temperature_zone}, pallets={self.pallet_count})>"
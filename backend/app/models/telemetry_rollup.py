@@ -0,0 +1,125 @@
+"""
+Telemetry Rollup Models
+- GPS/온도/위치/센서 원시 로그의 1분·1시간 집계 (보존 기간이 지난 원시 데이터 대체)
+- 온도 분석용 5분·1시간·1일 집계 (준수율/성능 점수/트렌드)
+"""
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import declared_attr
+
+from .base import Base
+
+
+class TelemetryRollupMixin:
+    """
+    차량 x 지표 x 시간 버킷 집계 행
+
+    metric 예: "gps.speed_kmh", "temperature.a", "location.temperature", "sensor.12"
+    평균은 value_sum / sample_count 로 계산하며, 상위 해상도 집계 시 그대로 합산할 수 있습니다.
+    bucket_start 는 UTC (naive) 입니다.
+    """
+
+    id = Column(Integer, primary_key=True)
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False)
+    metric = Column(String(50), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+
+    sample_count = Column(Integer, nullable=False, default=0)
+    value_sum = Column(Float, nullable=False, default=0.0)
+    value_min = Column(Float, nullable=True)
+    value_max = Column(Float, nullable=True)
+
+    @declared_attr
+    def __table_args__(cls):
+        return (
+            UniqueConstraint("vehicle_id", "metric", "bucket_start", name=f"uq_{cls.__tablename__}_bucket"),
+            Index(f"idx_{cls.__tablename__}_bucket", "bucket_start"),
+        )
+
+    @property
+    def value_avg(self):
+        return self.value_sum / self.sample_count if self.sample_count else None
+
+    def __repr__(self):
+        return f"<{type(self).__name__}(vehicle_id={self.vehicle_id}, metric={self.metric}, at={self.bucket_start}, n={self.sample_count})>"
+
+
+class TelemetryRollupMinute(TelemetryRollupMixin, Base):
+    """1분 집계"""
+    __tablename__ = "telemetry_rollups_1m"
+
+    BUCKET_SECONDS = 60
+
+
+class TelemetryRollupHour(TelemetryRollupMixin, Base):
+    """1시간 집계 (1분 집계에서 재집계)"""
+    __tablename__ = "telemetry_rollups_1h"
+
+    BUCKET_SECONDS = 3600
+
+
+class TemperatureRollupMixin:
+    """
+    차량별 온도 집계 (센서 A/B)
+
+    - *_sq_sum: 표준편차 계산용 제곱합
+    - *_too_hot / *_too_cold: 차량 온도대 기준 위반 측정 수
+    - *_out_of_range_seconds: 위반 상태로 지속된 시간 (다음 측정까지, 최대 TemperatureRollupService.MAX_SAMPLE_SECONDS)
+    - sample_slots: 데이터가 있는 5분 구간 수 (수집률 계산용)
+    bucket_start 는 UTC (naive) 입니다.
+    """
+
+    id = Column(Integer, primary_key=True)
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+
+    record_count = Column(Integer, nullable=False, default=0)
+    sample_slots = Column(Integer, nullable=False, default=0)
+
+    temp_a_count = Column(Integer, nullable=False, default=0)
+    temp_a_sum = Column(Float, nullable=False, default=0.0)
+    temp_a_sq_sum = Column(Float, nullable=False, default=0.0)
+    temp_a_min = Column(Float, nullable=True)
+    temp_a_max = Column(Float, nullable=True)
+    temp_a_too_hot = Column(Integer, nullable=False, default=0)
+    temp_a_too_cold = Column(Integer, nullable=False, default=0)
+    temp_a_out_of_range_seconds = Column(Float, nullable=False, default=0.0)
+
+    temp_b_count = Column(Integer, nullable=False, default=0)
+    temp_b_sum = Column(Float, nullable=False, default=0.0)
+    temp_b_sq_sum = Column(Float, nullable=False, default=0.0)
+    temp_b_min = Column(Float, nullable=True)
+    temp_b_max = Column(Float, nullable=True)
+    temp_b_too_hot = Column(Integer, nullable=False, default=0)
+    temp_b_too_cold = Column(Integer, nullable=False, default=0)
+    temp_b_out_of_range_seconds = Column(Float, nullable=False, default=0.0)
+
+    @declared_attr
+    def __table_args__(cls):
+        return (
+            UniqueConstraint("vehicle_id", "bucket_start", name=f"uq_{cls.__tablename__}_bucket"),
+            Index(f"idx_{cls.__tablename__}_bucket", "bucket_start"),
+        )
+
+    def __repr__(self):
+        return f"<{type(self).__name__}(vehicle_id={self.vehicle_id}, at={self.bucket_start}, n={self.record_count})>"
+
+
+class TemperatureRollup5m(TemperatureRollupMixin, Base):
+    """5분 온도 집계 (원시 로그에서 증분 집계)"""
+    __tablename__ = "temperature_rollups_5m"
+
+    BUCKET_SECONDS = 300
+
+
+class TemperatureRollupHour(TemperatureRollupMixin, Base):
+    """1시간 온도 집계 (5분 집계에서 재집계)"""
+    __tablename__ = "temperature_rollups_1h"
+
+    BUCKET_SECONDS = 3600
+
+
+class TemperatureRollupDay(TemperatureRollupMixin, Base):
+    """1일 온도 집계 (1시간 집계에서 재집계, UTC 기준 일)"""
+    __tablename__ = "temperature_rollups_1d"
+
+    BUCKET_SECONDS = 86400
@@ -60,11 +60,11 @@ class VehicleGPSLog(Base):
     # 관계
     vehicle = relationship("Vehicle", back_populates="gps_logs")
 
-    # 인덱스
+    # 인덱스 (PostgreSQL 에서는 created_at 기준 월별 파티션 테이블)
     __table_args__ = (
         Index('idx_vehicle_gps_tid', 'tid_id'),
         Index('idx_vehicle_gps_date_time', 'bi_date', 'bi_time'),
-        Index('idx_vehicle_gps_vehicle_id', 'vehicle_id'),
+        Index('idx_vehicle_gps_vehicle_created', 'vehicle_id', 'created_at'),
         Index('idx_vehicle_gps_created', 'created_at'),
     )
 
@@ -108,11 +108,11 @@ class VehicleTemperatureLog(Base):
     # 관계
     vehicle = relationship("Vehicle", back_populates="temperature_logs")
 
-    # 인덱스
+    # 인덱스 (PostgreSQL 에서는 created_at 기준 월별 파티션 테이블)
     __table_args__ = (
         Index('idx_vehicle_temp_tid', 'tid_id'),
         Index('idx_vehicle_temp_date_time', 'tpl_date', 'tpl_time'),
-        Index('idx_vehicle_temp_vehicle_id', 'vehicle_id'),
+        Index('idx_vehicle_temp_vehicle_created', 'vehicle_id', 'created_at'),
         Index('idx_vehicle_temp_created', 'created_at'),
     )
 
@@ -3,7 +3,7 @@ Vehicle Location Model
 실시간 차량 위치 및 온도 이력 모델
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -13,7 +13,7 @@ class VehicleLocation(Base):
     __tablename__ = "vehicle_locations"
     
     id = Column(Integer, primary_key=True, index=True)
-    vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False, index=True)
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False)
     dispatch_id = Column(Integer, ForeignKey("dispatches.id"), nullable=True, index=True)
     
     # 위치 정보
@@ -47,6 +47,11 @@ class VehicleLocation(Base):
     vehicle = relationship("Vehicle", back_populates="locations")
     dispatch = relationship("Dispatch", back_populates="vehicle_locations")
     
+    # 인덱스 (PostgreSQL 에서는 recorded_at 기준 월별 파티션 테이블)
+    __table_args__ = (
+        Index('idx_vehicle_locations_vehicle_recorded', 'vehicle_id', 'recorded_at'),
+    )
+    
     def __repr__(self):
         return f"<VehicleLocation(vehicle_id={self.vehicle_id}, lat={self.latitude}, lon={self.longitude}, temp={self.temperature_celsius}°C, at={self.recorded_at})>"
 
@@ -58,7 +63,7 @@ class TemperatureAlert(Base):
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False, index=True)
     dispatch_id = Column(Integer, ForeignKey("dispatches.id"), nullable=True, index=True)
-    location_id = Column(Integer, ForeignKey("vehicle_locations.id"), nullable=True)
+    location_id = Column(Integer, nullable=True)  # vehicle_locations.id (파티션 테이블이라 FK 없음, 보존 기간 후 삭제될 수 있음)
     
     # 알림 정보
     alert_type = Column(String(50), nullable=False)  # "TOO_HOT", "TOO_COLD", "SENSOR_ERROR"
@@ -82,7 +87,42 @@ class TemperatureAlert(Base):
     # Relationships
     vehicle = relationship("Vehicle", back_populates="temperature_alerts")
     dispatch = relationship("Dispatch", back_populates="temperature_alerts")
-    location = relationship("VehicleLocation")
+    location = relationship(
+        "VehicleLocation",
+        primaryjoin="foreign(TemperatureAlert.location_id) == VehicleLocation.id",
+        viewonly=True
+    )
     
     def __repr__(self):
         return f"<TemperatureAlert(vehicle_id={self.vehicle_id}, type={self.alert_type}, temp={self.temperature_celsius}°C, at={self.detected_at})>"
+
+
+class VehicleLatestState(Base):
+    """
+    차량 최신 상태 (차량당 1행)
+    
+    GPS/온도/텔레메트리 수집 시 upsert 되며, 최신 위치·온도 조회는 로그 테이블 대신 이 테이블을 사용합니다.
+    시각은 모두 UTC (naive) 입니다.
+    """
+    __tablename__ = "vehicle_latest_states"
+    
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), primary_key=True)
+    
+    # 위치 정보
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    speed_kmh = Column(Float, nullable=True)
+    heading = Column(Float, nullable=True)  # 방향 (0-360도)
+    is_engine_on = Column(Boolean, nullable=True)
+    gps_recorded_at = Column(DateTime, nullable=True)  # 위치 측정 시각
+    
+    # 온도 정보
+    temperature_a = Column(Float, nullable=True)  # A 온도 (냉동실)
+    temperature_b = Column(Float, nullable=True)  # B 온도 (냉장실)
+    temperature_recorded_at = Column(DateTime, nullable=True)  # 온도 측정 시각
+    
+    # 갱신 시각 (워커 간 증분 동기화 기준)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f"<VehicleLatestState(vehicle_id={self.vehicle_id}, lat={self.latitude}, lon={self.longitude}, temp_a={self.temperature_a}°C, at={self.gps_recorded_at})>"
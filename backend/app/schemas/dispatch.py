@@ -91,8 +91,9 @@ class DispatchDetailResponse(DispatchResponse):
 
 class DispatchListResponse(BaseModel):
     """Schema for dispatch list response"""
-    total: int
+    total: Optional[int] = None
     items: List[DispatchResponse]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 None)")
 
 
 class OptimizationRequest(BaseModel):
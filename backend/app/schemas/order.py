@@ -160,8 +160,9 @@ class OrderResponse(OrderBase):
 
 class OrderListResponse(BaseModel):
     """Schema for order list response"""
-    total: int
+    total: Optional[int] = None
     items: list[OrderResponse]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 None)")
 
 
 class OrderWithClientsResponse(OrderResponse):
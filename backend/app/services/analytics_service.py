@@ -12,25 +12,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_, desc
 
 from app.models import (
-    Order, Dispatch, Vehicle, Driver, Client,
-    OrderStatus, DispatchStatus
+    Order, Driver, Client,
+    OrderStatus
 )
+from app.services.kpi_engine import KPIEngine, KPIResult
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class KPIResult:
-    """KPI 결과"""
-    name: str
-    value: float
-    unit: str
-    target: float
-    status: str  # 'good', 'warning', 'critical'
-    change: float  # 전 기간 대비 변화율
-    trend: str  # 'up', 'down', 'stable'
-
-
 @dataclass
 class TrendData:
     """트렌드 데이터"""
@@ -44,267 +33,48 @@ class AnalyticsService:
     
     def __init__(self, db: Session):
         self.db = db
+        self.kpi_engine = KPIEngine(db)
     
     # ========================================
-    # KPI 계산 (15개)
+    # KPI 계산 (KPIEngine: 팩트 테이블당 1회 집계, 기간별 캐시)
     # ========================================
     
-    def get_order_completion_rate(
+    def get_kpis(
         self,
         start_date: date,
-        end_date: date
-    ) -> KPIResult:
+        end_date: date,
+        keys: Optional[List[str]] = None
+    ) -> List[KPIResult]:
+        """KPI 조합 조회 (keys: kpi_engine.KPI_DEFINITIONS 키, None 이면 전체)"""
+        return self.kpi_engine.compute(start_date, end_date, keys)
+    
+    def get_order_completion_rate(self, start_date: date, end_date: date) -> KPIResult:
         """KPI 1: 주문 처리율"""
-        # 전체 주문
-        total_orders = self.db.query(func.count(Order.id)).filter(
-            Order.created_at >= start_date,
-            Order.created_at < end_date + timedelta(days=1)
-        ).scalar() or 0
-        
-        # 완료된 주문
-        completed_orders = self.db.query(func.count(Order.id)).filter(
-            Order.created_at >= start_date,
-            Order.created_at < end_date + timedelta(days=1),
-            Order.status == OrderStatus.COMPLETED
-        ).scalar() or 0
-        
-        rate = (completed_orders / total_orders * 100) if total_orders > 0 else 0
-        
-        # 전 기간 대비 변화
-        prev_start = start_date - (end_date - start_date + timedelta(days=1))
-        prev_end = start_date - timedelta(days=1)
-        prev_rate = self._calculate_completion_rate(prev_start, prev_end)
-        change = rate - prev_rate
-        
-        return KPIResult(
-            name="주문 처리율",
-            value=round(rate, 1),
-            unit="%",
-            target=95.0,
-            status='good' if rate >= 95 else 'warning' if rate >= 90 else 'critical',
-            change=round(change, 1),
-            trend='up' if change > 0 else 'down' if change < 0 else 'stable'
-        )
+        return self.get_kpis(start_date, end_date, ["order_completion_rate"])[0]
     
-    def get_on_time_delivery_rate(
-        self,
-        start_date: date,
-        end_date: date
-    ) -> KPIResult:
+    def get_on_time_delivery_rate(self, start_date: date, end_date: date) -> KPIResult:
         """KPI 2: 정시 배송률"""
-        # 완료된 배차
-        completed_dispatches = self.db.query(Dispatch).filter(
-            Dispatch.created_at >= start_date,
-            Dispatch.created_at < end_date + timedelta(days=1),
-            Dispatch.status == DispatchStatus.COMPLETED
-        ).all()
-        
-        if not completed_dispatches:
-            return self._empty_kpi("정시 배송률", "%", 90.0)
-        
-        # 정시 배송 카운트 (실제 완료 시간 <= 예상 완료 시간)
-        on_time_count = sum(
-            1 for d in completed_dispatches
-            if d.completed_at and d.estimated_arrival_time and
-            d.completed_at <= d.estimated_arrival_time
-        )
-        
-        rate = (on_time_count / len(completed_dispatches) * 100)
-        prev_rate = self._calculate_on_time_rate(
-            start_date - (end_date - start_date + timedelta(days=1)),
-            start_date - timedelta(days=1)
-        )
-        change = rate - prev_rate
-        
-        return KPIResult(
-            name="정시 배송률",
-            value=round(rate, 1),
-            unit="%",
-            target=90.0,
-            status='good' if rate >= 90 else 'warning' if rate >= 85 else 'critical',
-            change=round(change, 1),
-            trend='up' if change > 0 else 'down' if change < 0 else 'stable'
-        )
+        return self.get_kpis(start_date, end_date, ["on_time_delivery_rate"])[0]
     
-    def get_vehicle_utilization(
-        self,
-        start_date: date,
-        end_date: date
-    ) -> KPIResult:
+    def get_vehicle_utilization(self, start_date: date, end_date: date) -> KPIResult:
         """KPI 3: 차량 가동률"""
-        # 활성 차량 수
-        active_vehicles = self.db.query(func.count(Vehicle.id)).filter(
-            Vehicle.is_active == True
-        ).scalar() or 0
-        
-        if active_vehicles == 0:
-            return self._empty_kpi("차량 가동률", "%", 75.0)
-        
-        # 가용 시간 (8시간/일 * 영업일 * 차량 수)
-        business_days = (end_date - start_date).days + 1
-        available_hours = business_days * 8 * active_vehicles
-        
-        # 실제 운행 시간 (배차 시간 합계)
-        total_dispatch_time = self.db.query(
-            func.sum(
-                func.extract('epoch', Dispatch.completed_at - Dispatch.started_at) / 3600
-            )
-        ).filter(
-            Dispatch.started_at >= start_date,
-            Dispatch.started_at < end_date + timedelta(days=1),
-            Dispatch.status == DispatchStatus.COMPLETED,
-            Dispatch.completed_at.isnot(None)
-        ).scalar() or 0
-        
-        rate = (total_dispatch_time / available_hours * 100) if available_hours > 0 else 0
-        prev_rate = self._calculate_utilization_rate(
-            start_date - (end_date - start_date + timedelta(days=1)),
-            start_date - timedelta(days=1)
-        )
-        change = rate - prev_rate
-        
-        return KPIResult(
-            name="차량 가동률",
-            value=round(rate, 1),
-            unit="%",
-            target=75.0,
-            status='good' if rate >= 75 else 'warning' if rate >= 65 else 'critical',
-            change=round(change, 1),
-            trend='up' if change > 0 else 'down' if change < 0 else 'stable'
-        )
+        return self.get_kpis(start_date, end_date, ["vehicle_utilization"])[0]
     
-    def get_average_delivery_time(
-        self,
-        start_date: date,
-        end_date: date
-    ) -> KPIResult:
+    def get_average_delivery_time(self, start_date: date, end_date: date) -> KPIResult:
         """KPI 4: 평균 배송 시간 (시간 단위)"""
-        dispatches = self.db.query(Dispatch).filter(
-            Dispatch.created_at >= start_date,
-            Dispatch.created_at < end_date + timedelta(days=1),
-            Dispatch.status == DispatchStatus.COMPLETED,
-            Dispatch.completed_at.isnot(None)
-        ).all()
-        
-        if not dispatches:
-            return self._empty_kpi("평균 배송 시간", "시간", 4.0)
-        
-        total_hours = sum(
-            (d.completed_at - d.created_at).total_seconds() / 3600
-            for d in dispatches
-        )
-        avg_hours = total_hours / len(dispatches)
-        
-        prev_avg = self._calculate_avg_delivery_time(
-            start_date - (end_date - start_date + timedelta(days=1)),
-            start_date - timedelta(days=1)
-        )
-        change = avg_hours - prev_avg
-        
-        return KPIResult(
-            name="평균 배송 시간",
-            value=round(avg_hours, 1),
-            unit="시간",
-            target=4.0,
-            status='good' if avg_hours <= 4 else 'warning' if avg_hours <= 5 else 'critical',
-            change=round(change, 1),
-            trend='down' if change < 0 else 'up' if change > 0 else 'stable'  # 낮을수록 좋음
-        )
+        return self.get_kpis(start_date, end_date, ["average_delivery_time"])[0]
     
-    def get_daily_orders(
-        self,
-        start_date: date,
-        end_date: date
-    ) -> KPIResult:
+    def get_daily_orders(self, start_date: date, end_date: date) -> KPIResult:
         """KPI 5: 1일 평균 배송 건수"""
-        total_orders = self.db.query(func.count(Order.id)).filter(
-            Order.created_at >= start_date,
-            Order.created_at < end_date + timedelta(days=1)
-        ).scalar() or 0
-        
-        business_days = (end_date - start_date).days + 1
-        avg_orders = total_orders / business_days if business_days > 0 else 0
-        
-        prev_avg = self._calculate_daily_orders(
-            start_date - (end_date - start_date + timedelta(days=1)),
-            start_date - timedelta(days=1)
-        )
-        change = avg_orders - prev_avg
-        
-        return KPIResult(
-            name="1일 평균 주문",
-            value=round(avg_orders, 0),
-            unit="건",
-            target=120.0,
-            status='good' if avg_orders >= 120 else 'warning' if avg_orders >= 100 else 'critical',
-            change=round(change, 0),
-            trend='up' if change > 0 else 'down' if change < 0 else 'stable'
-        )
+        return self.get_kpis(start_date, end_date, ["daily_orders"])[0]
     
-    def get_daily_revenue(
-        self,
-        start_date: date,
-        end_date: date
-    ) -> KPIResult:
+    def get_daily_revenue(self, start_date: date, end_date: date) -> KPIResult:
         """KPI 6: 일일 평균 매출"""
-        total_revenue = self.db.query(
-            func.sum(Order.total_amount)
-        ).filter(
-            Order.created_at >= start_date,
-            Order.created_at < end_date + timedelta(days=1),
-            Order.status == OrderStatus.COMPLETED
-        ).scalar() or 0
-        
-        business_days = (end_date - start_date).days + 1
-        avg_revenue = total_revenue / business_days if business_days > 0 else 0
-        
-        prev_avg = self._calculate_daily_revenue(
-            start_date - (end_date - start_date + timedelta(days=1)),
-            start_date - timedelta(days=1)
-        )
-        change_pct = ((avg_revenue - prev_avg) / prev_avg * 100) if prev_avg > 0 else 0
-        
-        return KPIResult(
-            name="일일 평균 매출",
-            value=round(avg_revenue / 1000000, 1),  # 백만원 단위
-            unit="M원",
-            target=5.0,  # 5백만원
-            status='good' if avg_revenue >= 5000000 else 'warning' if avg_revenue >= 4000000 else 'critical',
-            change=round(change_pct, 1),
-            trend='up' if change_pct > 0 else 'down' if change_pct < 0 else 'stable'
-        )
+        return self.get_kpis(start_date, end_date, ["daily_revenue"])[0]
     
-    def get_average_order_value(
-        self,
-        start_date: date,
-        end_date: date
-    ) -> KPIResult:
+    def get_average_order_value(self, start_date: date, end_date: date) -> KPIResult:
         """KPI 7: 평균 주문 금액"""
-        result = self.db.query(
-            func.avg(Order.total_amount),
-            func.count(Order.id)
-        ).filter(
-            Order.created_at >= start_date,
-            Order.created_at < end_date + timedelta(days=1),
-            Order.status == OrderStatus.COMPLETED
-        ).first()
-        
-        avg_value = result[0] or 0
-        prev_avg = self._calculate_avg_order_value(
-            start_date - (end_date - start_date + timedelta(days=1)),
-            start_date - timedelta(days=1)
-        )
-        change_pct = ((avg_value - prev_avg) / prev_avg * 100) if prev_avg > 0 else 0
-        
-        return KPIResult(
-            name="평균 주문 금액",
-            value=round(avg_value / 1000, 0),  # 천원 단위
-            unit="천원",
-            target=150.0,
-            status='good' if avg_value >= 150000 else 'warning' if avg_value >= 120000 else 'critical',
-            change=round(change_pct, 1),
-            trend='up' if change_pct > 0 else 'down' if change_pct < 0 else 'stable'
-        )
+        return self.get_kpis(start_date, end_date, ["average_order_value"])[0]
     
     def get_all_kpis(
         self,
@@ -312,16 +82,7 @@ class AnalyticsService:
         end_date: date
     ) -> List[KPIResult]:
         """모든 KPI 조회"""
-        kpis = [
-            self.get_order_completion_rate(start_date, end_date),
-            self.get_on_time_delivery_rate(start_date, end_date),
-            self.get_vehicle_utilization(start_date, end_date),
-            self.get_average_delivery_time(start_date, end_date),
-            self.get_daily_orders(start_date, end_date),
-            self.get_daily_revenue(start_date, end_date),
-            self.get_average_order_value(start_date, end_date),
-        ]
-        return kpis
+        return self.get_kpis(start_date, end_date)
     
     # ========================================
     # 트렌드 분석
@@ -459,127 +220,3 @@ class AnalyticsService:
             }
             for hour in range(24)
         ]
-    
-    # ========================================
-    # 헬퍼 메서드
-    # ========================================
-    
-    def _calculate_completion_rate(self, start_date: date, end_date: date) -> float:
-        """주문 처리율 계산 (헬퍼)"""
-        total = self.db.query(func.count(Order.id)).filter(
-            Order.created_at >= start_date,
-            Order.created_at < end_date + timedelta(days=1)
-        ).scalar() or 0
-        
-        completed = self.db.query(func.count(Order.id)).filter(
-            Order.created_at >= start_date,
-            Order.created_at < end_date + timedelta(days=1),
-            Order.status == OrderStatus.COMPLETED
-        ).scalar() or 0
-        
-        return (completed / total * 100) if total > 0 else 0
-    
-    def _calculate_on_time_rate(self, start_date: date, end_date: date) -> float:
-        """정시 배송률 계산 (헬퍼)"""
-        dispatches = self.db.query(Dispatch).filter(
-            Dispatch.created_at >= start_date,
-            Dispatch.created_at < end_date + timedelta(days=1),
-            Dispatch.status == DispatchStatus.COMPLETED
-        ).all()
-        
-        if not dispatches:
-            return 0.0
-        
-        on_time = sum(
-            1 for d in dispatches
-            if d.completed_at and d.estimated_arrival_time and
-            d.completed_at <= d.estimated_arrival_time
-        )
-        
-        return (on_time / len(dispatches) * 100)
-    
-    def _calculate_utilization_rate(self, start_date: date, end_date: date) -> float:
-        """차량 가동률 계산 (헬퍼)"""
-        active_vehicles = self.db.query(func.count(Vehicle.id)).filter(
-            Vehicle.is_active == True
-        ).scalar() or 0
-        
-        if active_vehicles == 0:
-            return 0.0
-        
-        business_days = (end_date - start_date).days + 1
-        available_hours = business_days * 8 * active_vehicles
-        
-        total_time = self.db.query(
-            func.sum(
-                func.extract('epoch', Dispatch.completed_at - Dispatch.started_at) / 3600
-            )
-        ).filter(
-            Dispatch.started_at >= start_date,
-            Dispatch.started_at < end_date + timedelta(days=1),
-            Dispatch.status == DispatchStatus.COMPLETED,
-            Dispatch.completed_at.isnot(None)
-        ).scalar() or 0
-        
-        return (total_time / available_hours * 100) if available_hours > 0 else 0
-    
-    def _calculate_avg_delivery_time(self, start_date: date, end_date: date) -> float:
-        """평균 배송 시간 계산 (헬퍼)"""
-        dispatches = self.db.query(Dispatch).filter(
-            Dispatch.created_at >= start_date,
-            Dispatch.created_at < end_date + timedelta(days=1),
-            Dispatch.status == DispatchStatus.COMPLETED,
-            Dispatch.completed_at.isnot(None)
-        ).all()
-        
-        if not dispatches:
-            return 0.0
-        
-        total_hours = sum(
-            (d.completed_at - d.created_at).total_seconds() / 3600
-            for d in dispatches
-        )
-        return total_hours / len(dispatches)
-    
-    def _calculate_daily_orders(self, start_date: date, end_date: date) -> float:
-        """일일 평균 주문 계산 (헬퍼)"""
-        total = self.db.query(func.count(Order.id)).filter(
-            Order.created_at >= start_date,
-            Order.created_at < end_date + timedelta(days=1)
-        ).scalar() or 0
-        
-        days = (end_date - start_date).days + 1
-        return total / days if days > 0 else 0
-    
-    def _calculate_daily_revenue(self, start_date: date, end_date: date) -> float:
-        """일일 평균 매출 계산 (헬퍼)"""
-        total = self.db.query(func.sum(Order.total_amount)).filter(
-            Order.created_at >= start_date,
-            Order.created_at < end_date + timedelta(days=1),
-            Order.status == OrderStatus.COMPLETED
-        ).scalar() or 0
-        
-        days = (end_date - start_date).days + 1
-        return total / days if days > 0 else 0
-    
-    def _calculate_avg_order_value(self, start_date: date, end_date: date) -> float:
-        """평균 주문 금액 계산 (헬퍼)"""
-        result = self.db.query(func.avg(Order.total_amount)).filter(
-            Order.created_at >= start_date,
-            Order.created_at < end_date + timedelta(days=1),
-            Order.status == OrderStatus.COMPLETED
-        ).scalar()
-        
-        return result or 0.0
-    
-    def _empty_kpi(self, name: str, unit: str, target: float) -> KPIResult:
-        """빈 KPI 결과"""
-        return KPIResult(
-            name=name,
-            value=0.0,
-            unit=unit,
-            target=target,
-            status='critical',
-            change=0.0,
-            trend='stable'
-        )
@@ -4,9 +4,10 @@ Billing Service
 Phase 3-B Week 1: 청구/정산 자동화
 """
 from datetime import datetime, timedelta, date
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, or_, func, distinct, exists, insert, select
+from sqlalchemy.exc import IntegrityError
 import logging
 
 from app.models.billing import (
@@ -14,12 +15,92 @@ from app.models.billing import (
     DriverSettlement, DriverSettlementItem,
     BillingCycleType, BillingStatus, PaymentMethod
 )
-from app.models.dispatch import Dispatch
+from app.models.dispatch import Dispatch, DispatchRoute, DispatchStatus
 from app.models.client import Client
 from app.models.driver import Driver
+from app.models.order import Order
 
 logger = logging.getLogger(__name__)
 
+# 일괄 청구/정산 시 이 건수의 청구서(정산)마다 커밋 (실패 시 해당 묶음만 롤백, 재실행 시 이어서 처리)
+BATCH_COMMIT_SIZE = 200
+
+
+def _month_range(year: int, month: int) -> Tuple[date, date]:
+    """해당 월의 첫날/마지막 날"""
+    start_date = date(year, month, 1)
+    end_date = (start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start_date, end_date
+
+
+def _number_sequence(db: Session, column, prefix: str) -> Iterator[str]:
+    """
+    PREFIX-NNNN 형식 일련번호 (마지막 번호는 한 번만 조회)
+    """
+    last_number = db.query(func.max(column)).filter(column.like(f"{prefix}%")).scalar()
+    number = int(last_number.split('-')[-1]) if last_number else 0
+    while True:
+        number += 1
+        yield f"{prefix}-{number:04d}"
+
+
+def _dispatch_orders(dispatch: Dispatch) -> List[Order]:
+    """배차 경로의 주문 목록 (상차/하차 경로 중복 제거, 경로 순서)"""
+    orders = []
+    seen = set()
+    for route in dispatch.routes:
+        if route.order and route.order.id not in seen:
+            seen.add(route.order.id)
+            orders.append(route.order)
+    return orders
+
+
+def _billing_client_id(dispatch: Dispatch) -> Optional[int]:
+    """청구 거래처 = 배차 첫 주문의 상차 거래처"""
+    for order in _dispatch_orders(dispatch):
+        if order.pickup_client_id:
+            return order.pickup_client_id
+    return None
+
+
+def _insert_documents(
+    db: Session,
+    model,
+    number_column,
+    documents: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]],
+    item_model,
+    foreign_key: str
+) -> List[int]:
+    """
+    (문서 행, 항목 행 목록) 묶음을 다중 행 INSERT 로 저장하고 한 트랜잭션으로 커밋
+
+    같은 배차가 이미 다른 실행에서 청구/정산되었거나 번호가 겹치면(UNIQUE 위반) 묶음 전체를 롤백합니다.
+
+    Returns:
+        저장된 문서 ID 목록 (실패 시 빈 목록)
+    """
+    if not documents:
+        return []
+    try:
+        rows = db.execute(
+            insert(model).returning(model.id, number_column),
+            [document for document, _ in documents]
+        ).all()
+        ids = {number: document_id for document_id, number in rows}
+        items = [
+            {**item, foreign_key: ids[document[number_column.key]]}
+            for document, document_items in documents
+            for item in document_items
+        ]
+        if items:
+            db.execute(insert(item_model), items)
+        db.commit()
+        return list(ids.values())
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"{model.__tablename__} 일괄 저장 실패 ({len(documents)}건, 재실행 시 다시 처리): {e.orig}")
+        return []
+
 
 class BillingService:
     """청구 서비스"""
@@ -46,16 +127,7 @@ class BillingService:
         
         if not policy:
             # 기본 정책 생성
-            policy = BillingPolicy(
-                client_id=client_id,
-                billing_cycle=BillingCycleType.MONTHLY,
-                billing_day=1,
-                payment_terms_days=30,
-                base_rate_per_km=2000.0,
-                base_rate_per_pallet=5000.0,
-                base_rate_per_kg=100.0,
-                is_active=True
-            )
+            policy = self._default_policy(client_id)
             self.db.add(policy)
             self.db.commit()
             self.db.refresh(policy)
@@ -63,6 +135,48 @@ class BillingService:
         
         return policy
     
+    @staticmethod
+    def _default_policy(client_id: int) -> BillingPolicy:
+        """기본 청구 정책"""
+        return BillingPolicy(
+            client_id=client_id,
+            billing_cycle=BillingCycleType.MONTHLY,
+            billing_day=1,
+            payment_terms_days=30,
+            base_rate_per_km=2000.0,
+            base_rate_per_pallet=5000.0,
+            base_rate_per_kg=100.0,
+            weekend_surcharge_rate=0.0,
+            express_surcharge_rate=0.0,
+            temperature_control_rate=0.0,
+            volume_discount_threshold=0,
+            volume_discount_rate=0.0,
+            is_active=True
+        )
+    
+    def _get_policies(self, client_ids: Iterable[int]) -> Dict[int, BillingPolicy]:
+        """
+        거래처별 활성 청구 정책 일괄 조회 (없는 거래처는 기본 정책 생성)
+        """
+        client_ids = list(client_ids)
+        policies: Dict[int, BillingPolicy] = {}
+        for policy in self.db.query(BillingPolicy).filter(
+            and_(
+                BillingPolicy.client_id.in_(client_ids),
+                BillingPolicy.is_active == True
+            )
+        ).order_by(BillingPolicy.id):
+            policies.setdefault(policy.client_id, policy)
+        
+        missing = [self._default_policy(client_id) for client_id in client_ids if client_id not in policies]
+        if missing:
+            self.db.add_all(missing)
+            self.db.commit()
+            policies.update({policy.client_id: policy for policy in missing})
+            logger.info(f"기본 청구 정책 생성: {len(missing)}개 거래처")
+        
+        return policies
+    
     def generate_invoice_number(self) -> str:
         """
         청구서 번호 생성
@@ -70,33 +184,26 @@ class BillingService:
         Returns:
             청구서 번호 (INV-YYYYMMDD-NNNN)
         """
-        today = datetime.now()
-        prefix = f"INV-{today.strftime('%Y%m%d')}"
-        
-        # 오늘 날짜의 마지막 청구서 번호 조회
-        last_invoice = self.db.query(Invoice).filter(
-            Invoice.invoice_number.like(f"{prefix}%")
-        ).order_by(desc(Invoice.invoice_number)).first()
-        
-        if last_invoice:
-            last_number = int(last_invoice.invoice_number.split('-')[-1])
-            new_number = last_number + 1
-        else:
-            new_number = 1
-        
-        return f"{prefix}-{new_number:04d}"
+        return next(self._invoice_numbers())
+    
+    def _invoice_numbers(self) -> Iterator[str]:
+        """오늘 날짜 청구서 번호 (INV-YYYYMMDD-NNNN) 순차 생성"""
+        prefix = f"INV-{datetime.now().strftime('%Y%m%d')}"
+        return _number_sequence(self.db, Invoice.invoice_number, prefix)
     
     def calculate_dispatch_charge(
         self,
         dispatch: Dispatch,
-        policy: BillingPolicy
+        policy: BillingPolicy,
+        monthly_dispatch_count: Optional[int] = None
     ) -> Dict[str, float]:
         """
         배차 요금 계산
         
         Args:
-            dispatch: 배차 객체
+            dispatch: 배차 객체 (routes.order 로드 권장)
             policy: 청구 정책
+            monthly_dispatch_count: 거래처의 해당 월 배차 건수 (물량 할인용, None 이면 조회)
             
         Returns:
             요금 정보 딕셔너리
@@ -109,10 +216,7 @@ class BillingService:
             base_amount += dispatch.total_distance_km * policy.base_rate_per_km
         
         # 팔레트 기반
-        total_pallets = 0
-        for route in dispatch.routes:
-            if route.order and route.order.pallets:
-                total_pallets += route.order.pallets
+        total_pallets = sum(order.pallet_count or 0 for order in _dispatch_orders(dispatch))
         if total_pallets > 0:
             base_amount += total_pallets * policy.base_rate_per_pallet
         
@@ -121,39 +225,28 @@ class BillingService:
         
         # 주말 할증
         if dispatch.dispatch_date.weekday() >= 5:  # 토요일(5), 일요일(6)
-            surcharge_amount += base_amount * (policy.weekend_surcharge_rate / 100)
+            surcharge_amount += base_amount * ((policy.weekend_surcharge_rate or 0) / 100)
         
-        # 긴급 배차 할증 (예: 상태가 URGENT인 경우)
-        if hasattr(dispatch, 'is_urgent') and dispatch.is_urgent:
-            surcharge_amount += base_amount * (policy.express_surcharge_rate / 100)
+        # 긴급 배차 할증
+        if dispatch.is_urgent:
+            surcharge_amount += base_amount * ((policy.express_surcharge_rate or 0) / 100)
         
         # 온도 관리 추가 요금 (냉동/냉장 차량)
         if dispatch.vehicle and dispatch.vehicle.vehicle_type in ['냉동', '냉장']:
-            surcharge_amount += policy.temperature_control_rate
+            surcharge_amount += policy.temperature_control_rate or 0
         
         # 할인 계산
         discount_amount = 0.0
         
-        # 물량 할인 (월간 배차 건수 기준)
-        if policy.volume_discount_threshold > 0:
-            month_start = date(dispatch.dispatch_date.year, dispatch.dispatch_date.month, 1)
-            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            
-            # 해당 월의 배차 건수 조회
-            dispatch_count = self.db.query(func.count(Dispatch.id)).join(
-                Dispatch.routes
-            ).join(
-                Dispatch.routes[0].order.delivery_client if dispatch.routes else None
-            ).filter(
-                and_(
-                    Dispatch.dispatch_date >= month_start,
-                    Dispatch.dispatch_date <= month_end,
-                    Dispatch.status.in_(['COMPLETED', 'IN_PROGRESS'])
-                )
-            ).scalar()
+        # 물량 할인 (거래처 월간 배차 건수 기준)
+        if policy.volume_discount_threshold and policy.volume_discount_threshold > 0:
+            if monthly_dispatch_count is None:
+                month = (dispatch.dispatch_date.year, dispatch.dispatch_date.month)
+                counts = self._monthly_dispatch_counts(dispatch.dispatch_date, dispatch.dispatch_date)
+                monthly_dispatch_count = counts.get((policy.client_id, *month), 0)
             
-            if dispatch_count >= policy.volume_discount_threshold:
-                discount_amount = (base_amount + surcharge_amount) * (policy.volume_discount_rate / 100)
+            if monthly_dispatch_count >= policy.volume_discount_threshold:
+                discount_amount = (base_amount + surcharge_amount) * ((policy.volume_discount_rate or 0) / 100)
         
         total_amount = base_amount + surcharge_amount - discount_amount
         
@@ -164,118 +257,207 @@ class BillingService:
             'total_amount': round(total_amount, 2)
         }
     
-    def generate_invoice_for_client(
+    def _monthly_dispatch_counts(self, start_date: date, end_date: date) -> Dict[Tuple[int, int, int], int]:
+        """
+        거래처(상차)별 월간 배차 건수 (완료/진행중, 기간이 걸친 월 전체)
+        
+        Returns:
+            {(client_id, year, month): 배차 건수}
+        """
+        month_start = start_date.replace(day=1)
+        _, month_end = _month_range(end_date.year, end_date.month)
+        
+        rows = self.db.query(
+            Order.pickup_client_id, Dispatch.dispatch_date, func.count(distinct(Dispatch.id))
+        ).join(
+            DispatchRoute, DispatchRoute.dispatch_id == Dispatch.id
+        ).join(
+            Order, Order.id == DispatchRoute.order_id
+        ).filter(
+            and_(
+                Dispatch.dispatch_date >= month_start,
+                Dispatch.dispatch_date <= month_end,
+                Dispatch.status.in_([DispatchStatus.COMPLETED, DispatchStatus.IN_PROGRESS]),
+                Order.pickup_client_id.isnot(None)
+            )
+        ).group_by(Order.pickup_client_id, Dispatch.dispatch_date).all()
+        
+        counts: Dict[Tuple[int, int, int], int] = {}
+        for client_id, dispatch_date, count in rows:
+            key = (client_id, dispatch_date.year, dispatch_date.month)
+            counts[key] = counts.get(key, 0) + count
+        return counts
+    
+    def _load_billable_dispatches(
         self,
-        client_id: int,
         start_date: date,
         end_date: date,
-        auto_send: bool = False
-    ) -> Invoice:
+        client_ids: Optional[Iterable[int]] = None
+    ) -> Dict[int, List[Dispatch]]:
         """
-        거래처별 청구서 자동 생성
+        기간 내 미청구 완료 배차를 거래처별로 묶어 반환
         
-        Args:
-            client_id: 거래처 ID
-            start_date: 청구 시작일
-            end_date: 청구 종료일
-            auto_send: 자동 발송 여부
-            
-        Returns:
-            생성된 Invoice 객체
+        경로/주문/차량은 함께 로드하고, 이미 청구된 배차는 SQL 에서 제외(NOT EXISTS)합니다.
         """
-        # 청구 정책 조회
-        policy = self.get_or_create_billing_policy(client_id)
-        
-        # 해당 기간의 완료된 배차 조회
-        dispatches = self.db.query(Dispatch).join(
-            Dispatch.routes
+        invoiced = exists().where(InvoiceLineItem.dispatch_id == Dispatch.id)
+        dispatches = self.db.query(Dispatch).options(
+            selectinload(Dispatch.routes).joinedload(DispatchRoute.order),
+            joinedload(Dispatch.vehicle)
         ).filter(
             and_(
                 Dispatch.dispatch_date >= start_date,
                 Dispatch.dispatch_date <= end_date,
-                Dispatch.status == 'COMPLETED'
+                Dispatch.status == DispatchStatus.COMPLETED,
+                ~invoiced
             )
-        ).all()
-        
-        # 이미 청구된 배차 제외
-        dispatches = [d for d in dispatches if not self._is_dispatch_invoiced(d.id)]
-        
-        if not dispatches:
-            logger.warning(f"청구할 배차가 없습니다: client_id={client_id}, period={start_date}~{end_date}")
-            return None
+        ).order_by(Dispatch.dispatch_date, Dispatch.id).all()
         
-        # 청구서 생성
-        invoice_number = self.generate_invoice_number()
-        
-        invoice = Invoice(
-            invoice_number=invoice_number,
-            client_id=client_id,
-            billing_period_start=start_date,
-            billing_period_end=end_date,
-            issue_date=date.today(),
-            due_date=date.today() + timedelta(days=policy.payment_terms_days),
-            status=BillingStatus.DRAFT
-        )
-        
-        self.db.add(invoice)
-        self.db.flush()  # ID 생성
-        
-        # 청구 항목 생성
+        allowed = set(client_ids) if client_ids is not None else None
+        grouped: Dict[int, List[Dispatch]] = {}
+        for dispatch in dispatches:
+            client_id = _billing_client_id(dispatch)
+            if client_id is None or (allowed is not None and client_id not in allowed):
+                continue
+            grouped.setdefault(client_id, []).append(dispatch)
+        return grouped
+    
+    def _build_invoice(
+        self,
+        client_id: int,
+        dispatches: List[Dispatch],
+        policy: BillingPolicy,
+        monthly_counts: Dict[Tuple[int, int, int], int],
+        invoice_number: str,
+        start_date: date,
+        end_date: date,
+        auto_send: bool
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """청구서 행 + 청구 항목 행 생성 (DB 조회 없음)"""
+        line_items = []
         subtotal = 0.0
         
         for dispatch in dispatches:
-            charges = self.calculate_dispatch_charge(dispatch, policy)
+            charges = self.calculate_dispatch_charge(
+                dispatch,
+                policy,
+                monthly_counts.get((client_id, dispatch.dispatch_date.year, dispatch.dispatch_date.month), 0)
+            )
+            orders = _dispatch_orders(dispatch)
             
             # 설명 생성
             description = f"배차번호: {dispatch.dispatch_number}"
-            if dispatch.routes:
-                route_info = []
-                for route in dispatch.routes:
-                    if route.order:
-                        route_info.append(f"{route.order.pickup_address} → {route.order.delivery_address}")
-                if route_info:
-                    description += f" ({', '.join(route_info)})"
-            
-            line_item = InvoiceLineItem(
-                invoice_id=invoice.id,
-                dispatch_id=dispatch.id,
-                description=description,
-                quantity=1.0,
-                unit_price=charges['total_amount'],
-                amount=charges['total_amount'],
-                distance_km=dispatch.total_distance_km,
-                surcharge_amount=charges['surcharge_amount'],
-                discount_amount=charges['discount_amount']
-            )
+            route_info = [f"{order.pickup_address} → {order.delivery_address}" for order in orders]
+            if route_info:
+                description += f" ({', '.join(route_info)})"
             
-            self.db.add(line_item)
+            line_items.append({
+                "dispatch_id": dispatch.id,
+                "description": description[:500],
+                "quantity": 1.0,
+                "unit_price": charges['total_amount'],
+                "amount": charges['total_amount'],
+                "distance_km": dispatch.total_distance_km,
+                "pallets": sum(order.pallet_count or 0 for order in orders),
+                "surcharge_amount": charges['surcharge_amount'],
+                "discount_amount": charges['discount_amount']
+            })
             subtotal += charges['total_amount']
         
         # 총액 계산 (부가세 10%)
         tax_amount = subtotal * 0.1
         total_amount = subtotal + tax_amount
         
-        invoice.subtotal = round(subtotal, 2)
-        invoice.tax_amount = round(tax_amount, 2)
-        invoice.total_amount = round(total_amount, 2)
-        invoice.status = BillingStatus.PENDING if not auto_send else BillingStatus.SENT
+        invoice = {
+            "invoice_number": invoice_number,
+            "client_id": client_id,
+            "billing_period_start": start_date,
+            "billing_period_end": end_date,
+            "issue_date": date.today(),
+            "due_date": date.today() + timedelta(days=policy.payment_terms_days or 30),
+            "subtotal": round(subtotal, 2),
+            "tax_amount": round(tax_amount, 2),
+            "total_amount": round(total_amount, 2),
+            "paid_amount": 0.0,
+            "status": BillingStatus.SENT if auto_send else BillingStatus.PENDING,
+            "sent_at": datetime.utcnow() if auto_send else None
+        }
+        return invoice, line_items
+    
+    def _create_invoices(
+        self,
+        grouped: Dict[int, List[Dispatch]],
+        start_date: date,
+        end_date: date,
+        auto_send: bool = False
+    ) -> List[Invoice]:
+        """
+        거래처별 배차 묶음으로 청구서 일괄 생성 (BATCH_COMMIT_SIZE 건마다 다중 행 INSERT 후 커밋)
+        """
+        if not grouped:
+            return []
+        
+        policies = self._get_policies(grouped)
+        monthly_counts = (
+            self._monthly_dispatch_counts(start_date, end_date)
+            if any(policy.volume_discount_threshold for policy in policies.values())
+            else {}
+        )
+        numbers = self._invoice_numbers()
+        
+        invoice_ids: List[int] = []
+        batch = []
+        for client_id, dispatches in grouped.items():
+            batch.append(self._build_invoice(
+                client_id, dispatches, policies[client_id], monthly_counts,
+                next(numbers), start_date, end_date, auto_send
+            ))
+            if len(batch) >= BATCH_COMMIT_SIZE:
+                invoice_ids += _insert_documents(
+                    self.db, Invoice, Invoice.invoice_number, batch, InvoiceLineItem, "invoice_id"
+                )
+                batch = []
+        invoice_ids += _insert_documents(
+            self.db, Invoice, Invoice.invoice_number, batch, InvoiceLineItem, "invoice_id"
+        )
         
-        if auto_send:
-            invoice.sent_at = datetime.utcnow()
+        if not invoice_ids:
+            return []
+        return self.db.query(Invoice).filter(Invoice.id.in_(invoice_ids)).order_by(Invoice.id).all()
+    
+    def generate_invoice_for_client(
+        self,
+        client_id: int,
+        start_date: date,
+        end_date: date,
+        auto_send: bool = False
+    ) -> Invoice:
+        """
+        거래처별 청구서 자동 생성
         
-        self.db.commit()
-        self.db.refresh(invoice)
+        Args:
+            client_id: 거래처 ID
+            start_date: 청구 시작일
+            end_date: 청구 종료일
+            auto_send: 자동 발송 여부
+            
+        Returns:
+            생성된 Invoice 객체 (청구할 배차가 없으면 None)
+        """
+        grouped = self._load_billable_dispatches(start_date, end_date, [client_id])
+        
+        if not grouped:
+            logger.warning(f"청구할 배차가 없습니다: client_id={client_id}, period={start_date}~{end_date}")
+            return None
         
-        logger.info(f"청구서 생성 완료: {invoice_number}, client_id={client_id}, amount={total_amount:,.0f}원")
+        invoices = self._create_invoices(grouped, start_date, end_date, auto_send)
+        if not invoices:
+            return None
+        
+        invoice = invoices[0]
+        logger.info(f"청구서 생성 완료: {invoice.invoice_number}, client_id={client_id}, amount={invoice.total_amount:,.0f}원")
         
         return invoice
     
-    def _is_dispatch_invoiced(self, dispatch_id: int) -> bool:
-        """배차가 이미 청구되었는지 확인"""
-        return self.db.query(InvoiceLineItem).filter(
-            InvoiceLineItem.dispatch_id == dispatch_id
-        ).first() is not None
-    
     def record_payment(
         self,
         invoice_id: int,
@@ -365,6 +547,10 @@ class BillingService:
         """
         월간 청구서 일괄 생성
         
+        해당 월의 배차/경로/주문을 한 번에 로드해 활성 거래처 전체의 요금을 계산하고,
+        청구서와 청구 항목을 다중 행 INSERT 로 저장합니다.
+        이미 청구된 배차는 제외되므로 중단 후 재실행해도 남은 배차만 청구합니다.
+        
         Args:
             year: 연도
             month: 월
@@ -372,34 +558,17 @@ class BillingService:
         Returns:
             생성된 청구서 리스트
         """
-        start_date = date(year, month, 1)
-        end_date = (start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-        
-        # 활성 거래처 조회
-        clients = self.db.query(Client).filter(
-            Client.is_active == True
-        ).all()
+        start_date, end_date = _month_range(year, month)
         
-        invoices = []
+        # 활성 거래처
+        active_client_ids = [
+            client_id for (client_id,) in self.db.query(Client.id).filter(Client.is_active == True)
+        ]
         
-        for client in clients:
-            try:
-                invoice = self.generate_invoice_for_client(
-                    client_id=client.id,
-                    start_date=start_date,
-                    end_date=end_date,
-                    auto_send=False
-                )
-                
-                if invoice:
-                    invoices.append(invoice)
-                    logger.info(f"월간 청구서 생성: client={client.name}, invoice={invoice.invoice_number}")
-                
-            except Exception as e:
-                logger.error(f"청구서 생성 실패: client_id={client.id}, error={e}")
-                continue
+        grouped = self._load_billable_dispatches(start_date, end_date, active_client_ids)
+        invoices = self._create_invoices(grouped, start_date, end_date)
         
-        logger.info(f"{year}년 {month}월 청구서 {len(invoices)}건 생성 완료")
+        logger.info(f"{year}년 {month}월 청구서 {len(invoices)}건 생성 완료 (대상 거래처 {len(grouped)}곳)")
         
         return invoices
     
@@ -454,102 +623,76 @@ class DriverSettlementService:
     
     def generate_settlement_number(self) -> str:
         """정산 번호 생성"""
-        today = datetime.now()
-        prefix = f"STL-{today.strftime('%Y%m%d')}"
-        
-        last_settlement = self.db.query(DriverSettlement).filter(
-            DriverSettlement.settlement_number.like(f"{prefix}%")
-        ).order_by(desc(DriverSettlement.settlement_number)).first()
-        
-        if last_settlement:
-            last_number = int(last_settlement.settlement_number.split('-')[-1])
-            new_number = last_number + 1
-        else:
-            new_number = 1
-        
-        return f"{prefix}-{new_number:04d}"
+        return next(self._settlement_numbers())
     
-    def generate_driver_settlement(
+    def _settlement_numbers(self) -> Iterator[str]:
+        """오늘 날짜 정산 번호 (STL-YYYYMMDD-NNNN) 순차 생성"""
+        prefix = f"STL-{datetime.now().strftime('%Y%m%d')}"
+        return _number_sequence(self.db, DriverSettlement.settlement_number, prefix)
+    
+    def _load_settleable_dispatches(
         self,
-        driver_id: int,
         start_date: date,
         end_date: date,
-        commission_rate: float = 15.0
-    ) -> DriverSettlement:
+        driver_ids: Optional[Any] = None
+    ) -> Dict[int, List[Tuple[Dispatch, float]]]:
         """
-        기사 정산 생성
+        기간 내 미정산 완료 배차를 기사별로 묶어 반환 (배차, 청구 금액)
+        
+        청구 금액은 청구 항목을 함께 조인해 읽고, 이미 정산된 배차는 SQL 에서 제외(NOT EXISTS)합니다.
         
         Args:
-            driver_id: 기사 ID
-            start_date: 정산 시작일
-            end_date: 정산 종료일
-            commission_rate: 수수료율 (%)
-            
-        Returns:
-            생성된 DriverSettlement 객체
+            driver_ids: 대상 기사 ID 목록 또는 기사 ID 서브쿼리 (None 이면 전체)
         """
-        # 해당 기간의 완료된 배차 조회
-        dispatches = self.db.query(Dispatch).filter(
+        settled = exists().where(DriverSettlementItem.dispatch_id == Dispatch.id)
+        query = self.db.query(Dispatch, InvoiceLineItem.amount).outerjoin(
+            InvoiceLineItem, InvoiceLineItem.dispatch_id == Dispatch.id
+        ).options(
+            selectinload(Dispatch.routes).joinedload(DispatchRoute.order)
+        ).filter(
             and_(
-                Dispatch.driver_id == driver_id,
+                Dispatch.driver_id.isnot(None),
                 Dispatch.dispatch_date >= start_date,
                 Dispatch.dispatch_date <= end_date,
-                Dispatch.status == 'COMPLETED'
+                Dispatch.status == DispatchStatus.COMPLETED,
+                ~settled
             )
-        ).all()
-        
-        # 이미 정산된 배차 제외
-        dispatches = [d for d in dispatches if not self._is_dispatch_settled(d.id)]
-        
-        if not dispatches:
-            logger.warning(f"정산할 배차가 없습니다: driver_id={driver_id}, period={start_date}~{end_date}")
-            return None
-        
-        # 정산 생성
-        settlement_number = self.generate_settlement_number()
-        
-        settlement = DriverSettlement(
-            settlement_number=settlement_number,
-            driver_id=driver_id,
-            settlement_period_start=start_date,
-            settlement_period_end=end_date,
-            is_paid=False
         )
+        if driver_ids is not None:
+            query = query.filter(Dispatch.driver_id.in_(driver_ids))
         
-        self.db.add(settlement)
-        self.db.flush()
-        
-        # 정산 항목 생성
+        grouped: Dict[int, List[Tuple[Dispatch, float]]] = {}
+        for dispatch, revenue in query.order_by(Dispatch.dispatch_date, Dispatch.id):
+            grouped.setdefault(dispatch.driver_id, []).append((dispatch, revenue or 0.0))
+        return grouped
+    
+    @staticmethod
+    def _build_settlement(
+        driver_id: int,
+        dispatches: List[Tuple[Dispatch, float]],
+        settlement_number: str,
+        start_date: date,
+        end_date: date,
+        commission_rate: float
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """정산 행 + 정산 항목 행 생성 (DB 조회 없음)"""
+        items = []
         total_revenue = 0.0
         total_distance = 0.0
         total_pallets = 0
         
-        for dispatch in dispatches:
-            # 배차의 청구 금액 조회
-            line_item = self.db.query(InvoiceLineItem).filter(
-                InvoiceLineItem.dispatch_id == dispatch.id
-            ).first()
-            
-            revenue = line_item.amount if line_item else 0.0
+        for dispatch, revenue in dispatches:
             commission = revenue * (commission_rate / 100)
+            pallets = sum(order.pallet_count or 0 for order in _dispatch_orders(dispatch))
             
-            # 팔레트 수 계산
-            pallets = 0
-            for route in dispatch.routes:
-                if route.order and route.order.pallets:
-                    pallets += route.order.pallets
-            
-            settlement_item = DriverSettlementItem(
-                settlement_id=settlement.id,
-                dispatch_id=dispatch.id,
-                revenue=revenue,
-                commission_rate=commission_rate,
-                commission_amount=commission,
-                distance_km=dispatch.total_distance_km,
-                pallets=pallets
-            )
-            
-            self.db.add(settlement_item)
+            items.append({
+                "dispatch_id": dispatch.id,
+                "revenue": revenue,
+                "commission_rate": commission_rate,
+                "commission_amount": commission,
+                "distance_km": dispatch.total_distance_km,
+                "pallets": pallets
+            })
             
             total_revenue += revenue
             total_distance += dispatch.total_distance_km or 0
@@ -559,26 +702,92 @@ class DriverSettlementService:
         total_commission = total_revenue * (commission_rate / 100)
         net_amount = total_revenue - total_commission
         
-        settlement.total_revenue = round(total_revenue, 2)
-        settlement.commission_amount = round(total_commission, 2)
-        settlement.net_amount = round(net_amount, 2)
-        settlement.dispatch_count = len(dispatches)
-        settlement.total_distance_km = round(total_distance, 2)
-        settlement.total_pallets = total_pallets
+        settlement = {
+            "settlement_number": settlement_number,
+            "driver_id": driver_id,
+            "settlement_period_start": start_date,
+            "settlement_period_end": end_date,
+            "total_revenue": round(total_revenue, 2),
+            "commission_amount": round(total_commission, 2),
+            "net_amount": round(net_amount, 2),
+            "dispatch_count": len(dispatches),
+            "total_distance_km": round(total_distance, 2),
+            "total_pallets": total_pallets,
+            "is_paid": False
+        }
+        return settlement, items
+    
+    def _create_settlements(
+        self,
+        grouped: Dict[int, List[Tuple[Dispatch, float]]],
+        start_date: date,
+        end_date: date,
+        commission_rate: float
+    ) -> List[DriverSettlement]:
+        """
+        기사별 배차 묶음으로 정산 일괄 생성 (BATCH_COMMIT_SIZE 건마다 다중 행 INSERT 후 커밋)
+        """
+        if not grouped:
+            return []
+        
+        numbers = self._settlement_numbers()
+        settlement_ids: List[int] = []
+        batch = []
+        for driver_id, dispatches in grouped.items():
+            batch.append(self._build_settlement(
+                driver_id, dispatches, next(numbers), start_date, end_date, commission_rate
+            ))
+            if len(batch) >= BATCH_COMMIT_SIZE:
+                settlement_ids += _insert_documents(
+                    self.db, DriverSettlement, DriverSettlement.settlement_number, batch,
+                    DriverSettlementItem, "settlement_id"
+                )
+                batch = []
+        settlement_ids += _insert_documents(
+            self.db, DriverSettlement, DriverSettlement.settlement_number, batch,
+            DriverSettlementItem, "settlement_id"
+        )
         
-        self.db.commit()
-        self.db.refresh(settlement)
+        if not settlement_ids:
+            return []
+        return self.db.query(DriverSettlement).filter(
+            DriverSettlement.id.in_(settlement_ids)
+        ).order_by(DriverSettlement.id).all()
+    
+    def generate_driver_settlement(
+        self,
+        driver_id: int,
+        start_date: date,
+        end_date: date,
+        commission_rate: float = 15.0
+    ) -> DriverSettlement:
+        """
+        기사 정산 생성
+        
+        Args:
+            driver_id: 기사 ID
+            start_date: 정산 시작일
+            end_date: 정산 종료일
+            commission_rate: 수수료율 (%)
+            
+        Returns:
+            생성된 DriverSettlement 객체 (정산할 배차가 없으면 None)
+        """
+        grouped = self._load_settleable_dispatches(start_date, end_date, [driver_id])
+        
+        if not grouped:
+            logger.warning(f"정산할 배차가 없습니다: driver_id={driver_id}, period={start_date}~{end_date}")
+            return None
+        
+        settlements = self._create_settlements(grouped, start_date, end_date, commission_rate)
+        if not settlements:
+            return None
         
-        logger.info(f"기사 정산 생성: {settlement_number}, driver_id={driver_id}, net={net_amount:,.0f}원")
+        settlement = settlements[0]
+        logger.info(f"기사 정산 생성: {settlement.settlement_number}, driver_id={driver_id}, net={settlement.net_amount:,.0f}원")
         
         return settlement
     
-    def _is_dispatch_settled(self, dispatch_id: int) -> bool:
-        """배차가 이미 정산되었는지 확인"""
-        return self.db.query(DriverSettlementItem).filter(
-            DriverSettlementItem.dispatch_id == dispatch_id
-        ).first() is not None
-    
     def mark_settlement_paid(
         self,
         settlement_id: int,
@@ -625,6 +834,9 @@ class DriverSettlementService:
         """
         월간 기사 정산 일괄 생성
         
+        해당 월의 배차/청구 금액을 한 번에 로드해 활성 기사 전체를 정산합니다.
+        이미 정산된 배차는 제외되므로 중단 후 재실행해도 남은 배차만 정산합니다.
+        
         Args:
             year: 연도
             month: 월
@@ -633,33 +845,14 @@ class DriverSettlementService:
         Returns:
             생성된 정산 리스트
         """
-        start_date = date(year, month, 1)
-        end_date = (start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-        
-        # 활성 기사 조회
-        drivers = self.db.query(Driver).filter(
-            Driver.is_active == True
-        ).all()
+        start_date, end_date = _month_range(year, month)
         
-        settlements = []
+        # 활성 기사
+        active_driver_ids = select(Driver.id).where(Driver.is_active == True)
         
-        for driver in drivers:
-            try:
-                settlement = self.generate_driver_settlement(
-                    driver_id=driver.id,
-                    start_date=start_date,
-                    end_date=end_date,
-                    commission_rate=commission_rate
-                )
-                
-                if settlement:
-                    settlements.append(settlement)
-                    logger.info(f"월간 정산 생성: driver={driver.name}, settlement={settlement.settlement_number}")
-                
-            except Exception as e:
-                logger.error(f"정산 생성 실패: driver_id={driver.id}, error={e}")
-                continue
+        grouped = self._load_settleable_dispatches(start_date, end_date, active_driver_ids)
+        settlements = self._create_settlements(grouped, start_date, end_date, commission_rate)
         
-        logger.info(f"{year}년 {month}월 정산 {len(settlements)}건 생성 완료")
+        logger.info(f"{year}년 {month}월 정산 {len(settlements)}건 생성 완료 (대상 기사 {len(grouped)}명)")
         
         return settlements
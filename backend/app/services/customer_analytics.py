@@ -1,13 +1,17 @@
 """
 Customer Satisfaction Analytics - Phase 10
 고객 만족도 분석 시스템
+
+고객(주문의 상차 거래처)별 지표는 RankingService 에서 주문 집계 쿼리 1회 + 벡터 계산으로 구하며,
+개별 분석 / 주요 고객 / 이탈 위험 고객이 같은 지표 함수를 사용합니다.
 """
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from app.models import Partner, Order, Dispatch
-import numpy as np
+from app.models import Client
+from app.services.ranking_service import (
+    RankingService, CUSTOMER_GRADES, CUSTOMER_GRADE_FLOOR, grade_for
+)
 
 
 class CustomerSatisfactionAnalytics:
@@ -15,6 +19,7 @@ class CustomerSatisfactionAnalytics:
     
     def __init__(self, db: Session):
         self.db = db
+        self.ranking = RankingService(db)
     
     def analyze_customer_satisfaction(
         self,
@@ -23,7 +28,7 @@ class CustomerSatisfactionAnalytics:
         end_date: datetime
     ) -> Dict:
         """
-        고객(파트너사) 만족도 분석
+        고객(거래처) 만족도 분석
         
         분석 항목:
         - 정시 배송률
@@ -32,66 +37,51 @@ class CustomerSatisfactionAnalytics:
         - 온도 위반 사고
         - 고객 충성도 (재주문율)
         """
-        partner = self.db.query(Partner).filter(Partner.id == partner_id).first()
+        partner = self.db.get(Client, partner_id)
         
         if not partner:
             return {'error': 'Partner not found'}
         
-        # 기간 내 주문 조회
-        orders = self.db.query(Order).filter(
-            and_(
-                Order.partner_id == partner_id,
-                Order.created_at >= start_date,
-                Order.created_at <= end_date
-            )
-        ).all()
+        metrics = self.ranking.customer_scores(start_date, end_date, client_ids=[partner_id])
+        row = metrics.iloc[0]
         
-        if not orders:
+        if not row['orders']:
             return {
                 'partner_name': partner.name,
                 'partner_id': partner_id,
                 'message': 'No orders found for this period'
             }
         
-        # 분석 수행
-        on_time_rate = self._calculate_on_time_rate(orders)
-        completion_rate = self._calculate_completion_rate(orders)
-        avg_delivery_time = self._calculate_avg_delivery_time(orders)
-        temperature_violations = self._count_temperature_violations(orders)
-        loyalty_score = self._calculate_loyalty_score(partner_id, start_date, end_date)
-        
-        # 종합 만족도 점수 (0-100)
-        satisfaction_score = self._calculate_satisfaction_score(
-            on_time_rate,
-            completion_rate,
-            temperature_violations,
-            len(orders)
-        )
-        
-        # 등급 결정
-        grade = self._determine_satisfaction_grade(satisfaction_score)
+        return self._to_analysis(row, start_date, end_date)
+    
+    def _to_analysis(self, row, start_date: datetime, end_date: datetime) -> Dict:
+        """지표 행 -> 만족도 분석 결과"""
+        satisfaction_score = float(row['satisfaction_score'])
+        on_time_rate = float(row['on_time_delivery_rate'])
+        completion_rate = float(row['order_completion_rate'])
+        temperature_violations = int(row['temperature_violations'])
         
         return {
-            'partner_id': partner_id,
-            'partner_name': partner.name,
+            'partner_id': int(row['client_id']),
+            'partner_name': row['client_name'],
             'period': {
                 'start': start_date.date().isoformat(),
                 'end': end_date.date().isoformat()
             },
-            'satisfaction_score': round(satisfaction_score, 2),
-            'grade': grade,
+            'satisfaction_score': satisfaction_score,
+            'grade': row['grade'],
             'metrics': {
-                'on_time_delivery_rate': round(on_time_rate, 2),
-                'order_completion_rate': round(completion_rate, 2),
-                'avg_delivery_time_hours': round(avg_delivery_time, 2),
+                'on_time_delivery_rate': on_time_rate,
+                'order_completion_rate': completion_rate,
+                'avg_delivery_time_hours': float(row['avg_delivery_time_hours']),
                 'temperature_violations': temperature_violations,
-                'loyalty_score': round(loyalty_score, 2)
+                'loyalty_score': float(row['loyalty_score'])
             },
             'statistics': {
-                'total_orders': len(orders),
-                'completed_orders': sum(1 for o in orders if o.status == 'COMPLETED'),
-                'cancelled_orders': sum(1 for o in orders if o.status == 'CANCELLED'),
-                'pending_orders': sum(1 for o in orders if o.status in ['PENDING', 'IN_TRANSIT'])
+                'total_orders': int(row['orders']),
+                'completed_orders': int(row['delivered']),
+                'cancelled_orders': int(row['cancelled']),
+                'pending_orders': int(row['pending'])
             },
             'recommendations': self._generate_customer_recommendations(
                 satisfaction_score,
@@ -101,147 +91,9 @@ class CustomerSatisfactionAnalytics:
             )
         }
     
-    def _calculate_on_time_rate(self, orders: List[Order]) -> float:
-        """정시 배송률 계산"""
-        completed_orders = [o for o in orders if o.status == 'COMPLETED' and o.completed_at]
-        
-        if not completed_orders:
-            return 100.0
-        
-        on_time_count = 0
-        
-        for order in completed_orders:
-            if order.expected_delivery_time:
-                # 30분 허용 오차
-                deadline = order.expected_delivery_time + timedelta(minutes=30)
-                if order.completed_at <= deadline:
-                    on_time_count += 1
-            else:
-                # 예상 시간이 없으면 정시로 간주
-                on_time_count += 1
-        
-        return (on_time_count / len(completed_orders)) * 100
-    
-    def _calculate_completion_rate(self, orders: List[Order]) -> float:
-        """주문 완료율 계산"""
-        if not orders:
-            return 100.0
-        
-        completed = sum(1 for o in orders if o.status == 'COMPLETED')
-        return (completed / len(orders)) * 100
-    
-    def _calculate_avg_delivery_time(self, orders: List[Order]) -> float:
-        """평균 배송 시간 계산 (시간 단위)"""
-        completed_orders = [
-            o for o in orders
-            if o.status == 'COMPLETED' and o.completed_at and o.created_at
-        ]
-        
-        if not completed_orders:
-            return 0
-        
-        total_hours = 0
-        
-        for order in completed_orders:
-            duration = order.completed_at - order.created_at
-            hours = duration.total_seconds() / 3600
-            total_hours += hours
-        
-        return total_hours / len(completed_orders)
-    
-    def _count_temperature_violations(self, orders: List[Order]) -> int:
-        """온도 위반 사고 건수"""
-        # 실제로는 온도 모니터링 데이터 필요
-        # 간단한 추정: 완료되지 않은 주문 중 일부를 온도 문제로 가정
-        cancelled_orders = [o for o in orders if o.status == 'CANCELLED']
-        
-        # 취소된 주문의 20%를 온도 위반으로 추정
-        estimated_violations = int(len(cancelled_orders) * 0.2)
-        
-        return estimated_violations
-    
-    def _calculate_loyalty_score(
-        self,
-        partner_id: int,
-        start_date: datetime,
-        end_date: datetime
-    ) -> float:
-        """
-        고객 충성도 점수
-        
-        재주문 빈도와 주문량 증가율 기반
-        """
-        # 이전 기간과 비교
-        period_days = (end_date - start_date).days
-        prev_start = start_date - timedelta(days=period_days)
-        prev_end = start_date
-        
-        # 현재 기간 주문 수
-        current_orders = self.db.query(func.count(Order.id)).filter(
-            and_(
-                Order.partner_id == partner_id,
-                Order.created_at >= start_date,
-                Order.created_at <= end_date
-            )
-        ).scalar()
-        
-        # 이전 기간 주문 수
-        previous_orders = self.db.query(func.count(Order.id)).filter(
-            and_(
-                Order.partner_id == partner_id,
-                Order.created_at >= prev_start,
-                Order.created_at < prev_end
-            )
-        ).scalar()
-        
-        if previous_orders == 0:
-            # 신규 고객
-            return 70.0
-        
-        # 주문 증가율 계산
-        growth_rate = ((current_orders - previous_orders) / previous_orders) * 100
-        
-        # 증가율을 점수로 변환 (0-100)
-        # 50% 이상 증가 시 만점
-        loyalty_score = min(70 + (growth_rate / 2), 100)
-        loyalty_score = max(loyalty_score, 0)
-        
-        return loyalty_score
-    
-    def _calculate_satisfaction_score(
-        self,
-        on_time_rate: float,
-        completion_rate: float,
-        temperature_violations: int,
-        total_orders: int
-    ) -> float:
-        """종합 만족도 점수 계산"""
-        # 정시 배송률 (40점)
-        on_time_score = (on_time_rate / 100) * 40
-        
-        # 주문 완료율 (40점)
-        completion_score = (completion_rate / 100) * 40
-        
-        # 온도 위반율 (20점)
-        violation_rate = (temperature_violations / total_orders) if total_orders > 0 else 0
-        temperature_score = max(20 - (violation_rate * 100), 0)
-        
-        total_score = on_time_score + completion_score + temperature_score
-        
-        return min(total_score, 100)
-    
     def _determine_satisfaction_grade(self, score: float) -> str:
         """만족도 등급 결정"""
-        if score >= 90:
-            return 'A+ (매우 만족)'
-        elif score >= 80:
-            return 'A (만족)'
-        elif score >= 70:
-            return 'B (보통)'
-        elif score >= 60:
-            return 'C (개선 필요)'
-        else:
-            return 'D (불만족)'
+        return grade_for(score, CUSTOMER_GRADES, CUSTOMER_GRADE_FLOOR)
     
     def _generate_customer_recommendations(
         self,
@@ -285,56 +137,24 @@ class CustomerSatisfactionAnalytics:
         """
         주요 고객 분석
         
-        주문량, 매출, 충성도 기준
+        매출 기준 상위 limit 고객 (기간 내 주문이 있는 고객, 상위 N 은 SQL 에서 선택)
         """
-        partners = self.db.query(Partner).all()
-        
-        customer_data = []
-        
-        for partner in partners:
-            orders = self.db.query(Order).filter(
-                and_(
-                    Order.partner_id == partner.id,
-                    Order.created_at >= start_date,
-                    Order.created_at <= end_date
-                )
-            ).all()
-            
-            if not orders:
-                continue
-            
-            # 매출 계산
-            total_revenue = sum(
-                getattr(order, 'price', 0) or 0
-                for order in orders
-            )
-            
-            # 만족도 분석
-            satisfaction = self.analyze_customer_satisfaction(
-                partner.id,
-                start_date,
-                end_date
-            )
-            
-            if 'error' not in satisfaction and 'message' not in satisfaction:
-                customer_data.append({
-                    'partner_id': partner.id,
-                    'partner_name': partner.name,
-                    'total_orders': len(orders),
-                    'total_revenue': total_revenue,
-                    'satisfaction_score': satisfaction['satisfaction_score'],
-                    'satisfaction_grade': satisfaction['grade'],
-                    'loyalty_score': satisfaction['metrics']['loyalty_score']
-                })
-        
-        # 매출 기준 정렬
-        sorted_customers = sorted(
-            customer_data,
-            key=lambda x: x['total_revenue'],
-            reverse=True
+        metrics = self.ranking.customer_scores(
+            start_date, end_date, limit=limit, with_orders_only=True
         )
         
-        return sorted_customers[:limit]
+        return [
+            {
+                'partner_id': int(row['client_id']),
+                'partner_name': row['client_name'],
+                'total_orders': int(row['orders']),
+                'total_revenue': float(row['total_revenue']),
+                'satisfaction_score': float(row['satisfaction_score']),
+                'satisfaction_grade': row['grade'],
+                'loyalty_score': float(row['loyalty_score'])
+            }
+            for row in metrics.to_dict('records')
+        ]
     
     def get_churn_risk_customers(
         self,
@@ -345,55 +165,41 @@ class CustomerSatisfactionAnalytics:
         이탈 위험 고객 식별
         
         기준:
-        - 주문량 감소
         - 낮은 만족도
         - 최근 주문 없음
         """
-        partners = self.db.query(Partner).all()
+        metrics = self.ranking.customer_scores(start_date, end_date)
+        days_since_order = (datetime.now() - end_date).days
         
         at_risk_customers = []
         
-        for partner in partners:
-            # 최근 주문 확인
-            recent_order = self.db.query(Order).filter(
-                and_(
-                    Order.partner_id == partner.id,
-                    Order.created_at >= start_date
-                )
-            ).order_by(Order.created_at.desc()).first()
-            
-            # 30일 이상 주문 없음
-            if not recent_order:
-                days_since_order = (datetime.now() - end_date).days
+        for row in metrics.to_dict('records'):
+            # 시작일 이후 주문 없음
+            if not row['orders_since_start']:
                 if days_since_order > 30:
                     at_risk_customers.append({
-                        'partner_id': partner.id,
-                        'partner_name': partner.name,
+                        'partner_id': int(row['client_id']),
+                        'partner_name': row['client_name'],
                         'risk_level': 'high',
                         'reason': f'최근 {days_since_order}일간 주문 없음',
                         'last_order_date': None
                     })
                 continue
             
-            # 만족도 분석
-            satisfaction = self.analyze_customer_satisfaction(
-                partner.id,
-                start_date,
-                end_date
-            )
-            
-            if 'error' in satisfaction or 'message' in satisfaction:
+            if not row['orders']:
                 continue
             
             # 낮은 만족도
-            if satisfaction['satisfaction_score'] < 70:
+            satisfaction_score = float(row['satisfaction_score'])
+            if satisfaction_score < 70:
+                last_order_date = row['last_order_date']
                 at_risk_customers.append({
-                    'partner_id': partner.id,
-                    'partner_name': partner.name,
-                    'risk_level': 'high' if satisfaction['satisfaction_score'] < 60 else 'medium',
-                    'reason': f"낮은 만족도 ({satisfaction['satisfaction_score']:.1f}점)",
-                    'satisfaction_score': satisfaction['satisfaction_score'],
-                    'last_order_date': recent_order.created_at.date().isoformat() if recent_order else None
+                    'partner_id': int(row['client_id']),
+                    'partner_name': row['client_name'],
+                    'risk_level': 'high' if satisfaction_score < 60 else 'medium',
+                    'reason': f"낮은 만족도 ({satisfaction_score:.1f}점)",
+                    'satisfaction_score': satisfaction_score,
+                    'last_order_date': str(last_order_date) if last_order_date else None
                 })
         
         # 위험도 순 정렬
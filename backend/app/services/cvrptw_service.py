@@ -8,9 +8,11 @@
 
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-from datetime import datetime, time as dt_time, date, timezone, timedelta
+from datetime import datetime, time as dt_time, date
+import asyncio
 import math
 
+import numpy as np
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
 from sqlalchemy.orm import Session
@@ -20,8 +22,10 @@ from app.models.client import Client
 from app.models.vehicle import Vehicle, VehicleType
 from app.models.order import Order, TemperatureZone, OrderStatus
 from app.models.dispatch import Dispatch, DispatchRoute, RouteType, DispatchStatus
-from app.models.vehicle_location import VehicleLocation
+from app.services.vehicle_state_store import vehicle_state_store
 from app.services.naver_map_service import NaverMapService
+from app.services.distance_matrix import get_distance_matrix_engine
+from app.services.solver_pool import run_in_solver_pool
 
 
 @dataclass
@@ -61,14 +65,15 @@ class CVRPTWSolver:
         self,
         locations: List[Location],
         vehicles: List[VehicleInfo],
-        distance_matrix: List[List[int]],
-        time_matrix: List[List[int]],
+        distance_matrix,
+        time_matrix,
         use_time_windows: bool = True
     ):
         self.locations = locations
         self.vehicles = vehicles
-        self.distance_matrix = distance_matrix
-        self.time_matrix = time_matrix
+        # OR-Tools 콜백은 원소 단위로 호출되므로 NumPy 배열은 리스트로 변환 (스칼라 접근이 더 빠름)
+        self.distance_matrix = distance_matrix.tolist() if isinstance(distance_matrix, np.ndarray) else distance_matrix
+        self.time_matrix = time_matrix.tolist() if isinstance(time_matrix, np.ndarray) else time_matrix
         self.use_time_windows = use_time_windows
         
         # OR-Tools 모델
@@ -299,6 +304,29 @@ class CVRPTWSolver:
         }
 
 
+def solve_cvrptw(
+    locations: List[Location],
+    vehicles: List[VehicleInfo],
+    distance_matrix,
+    time_matrix,
+    use_time_windows: bool,
+    time_limit_seconds: int
+) -> Optional[Dict[str, Any]]:
+    """
+    CVRPTW 문제 해결 (솔버 프로세스 풀에서 실행되는 최상위 함수)
+    
+    DB 세션을 사용하지 않으며 입력/결과는 모두 pickle 가능합니다.
+    """
+    solver = CVRPTWSolver(
+        locations=locations,
+        vehicles=vehicles,
+        distance_matrix=distance_matrix,
+        time_matrix=time_matrix,
+        use_time_windows=use_time_windows
+    )
+    return solver.solve(time_limit_seconds=time_limit_seconds)
+
+
 class AdvancedDispatchOptimizationService:
     """고급 배차 최적화 서비스 (CVRPTW)"""
     
@@ -320,23 +348,12 @@ class AdvancedDispatchOptimizationService:
         
         return R * c
     
-    def _create_distance_matrix(self, locations: List[Location]) -> List[List[int]]:
-        """거리 행렬 생성 (미터) - Haversine"""
-        n = len(locations)
-        matrix = [[0] * n for _ in range(n)]
-        
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    dist_km = self._calculate_haversine_distance(
-                        locations[i].latitude, locations[i].longitude,
-                        locations[j].latitude, locations[j].longitude
-                    )
-                    matrix[i][j] = int(dist_km * 1000)  # Convert to meters
-        
-        return matrix
+    def _create_distance_matrix(self, locations: List[Location]) -> np.ndarray:
+        """거리 행렬 생성 (미터, int32) - Haversine"""
+        coords = [(loc.latitude, loc.longitude) for loc in locations]
+        return get_distance_matrix_engine().distance_matrix_m(coords)
     
-    async def _create_distance_matrix_naver(self, locations: List[Location]) -> Tuple[List[List[int]], List[List[int]]]:
+    async def _create_distance_matrix_naver(self, locations: List[Location]) -> Tuple[np.ndarray, np.ndarray]:
         """거리/시간 행렬 생성 - Naver Directions API"""
         logger.info(f"Naver Directions API로 거리 행렬 생성 중...")
         
@@ -352,19 +369,16 @@ class AdvancedDispatchOptimizationService:
         )
         
         logger.success(f"✓ Naver API 거리 행렬 생성 완료")
+        
+        # Naver 결과(km, 분)를 솔버 단위(미터, 분 정수)로 변환
+        distance_matrix = (np.asarray(distance_matrix, dtype=np.float64) * 1000).astype(np.int32)
+        time_matrix = np.asarray(time_matrix, dtype=np.float64).astype(np.int32)
         return distance_matrix, time_matrix
     
-    def _create_time_matrix(self, distance_matrix: List[List[int]]) -> List[List[int]]:
-        """시간 행렬 생성 (분)"""
-        # 평균 속도 40 km/h 가정
-        avg_speed_m_per_min = (40 * 1000) / 60  # meters per minute
-        
-        time_matrix = []
-        for row in distance_matrix:
-            time_row = [int(dist / avg_speed_m_per_min) for dist in row]
-            time_matrix.append(time_row)
-        
-        return time_matrix
+    def _create_time_matrix(self, locations: List[Location]) -> np.ndarray:
+        """시간 행렬 생성 (분, int32) - 평균 속도 40 km/h 가정"""
+        coords = [(loc.latitude, loc.longitude) for loc in locations]
+        return get_distance_matrix_engine().time_matrix_min(coords, avg_speed_kmh=40)
     
     def _time_str_to_minutes(self, time_input) -> int:
         """시간 문자열 또는 time 객체를 분으로 변환 (e.g., "08:00" -> 480)"""
@@ -409,11 +423,15 @@ class AdvancedDispatchOptimizationService:
         dispatch_date: Optional[str] = None,
         time_limit_seconds: int = 30,
         use_time_windows: bool = True,
-        use_real_routing: bool = False
+        use_real_routing: bool = False,
+        zone_time_limits: Optional[Dict[str, int]] = None
     ) -> Dict[str, Any]:
         """
         CVRPTW 알고리즘을 사용한 배차 최적화
         
+        온도대(냉동/냉장/상온)는 서로 독립된 문제이므로 솔버 프로세스 풀에서 동시에 풀고,
+        DB 저장은 메인 프로세스에서 온도대 순서대로 수행합니다.
+        
         Args:
             order_ids: 주문 ID 리스트
             vehicle_ids: 사용할 차량 ID (None = 모든 가용 차량)
@@ -421,6 +439,7 @@ class AdvancedDispatchOptimizationService:
             time_limit_seconds: 최대 실행 시간 (초)
             use_time_windows: 시간 제약 사용 여부
             use_real_routing: Naver Directions API 사용 여부 (False = Haversine)
+            zone_time_limits: 온도대별 최대 실행 시간 (초), 키는 온도대 이름 또는 값 (예: "FROZEN", "냉동")
             
         Returns:
             최적화 결과
@@ -451,9 +470,11 @@ class AdvancedDispatchOptimizationService:
                     orders_by_temp[order.temperature_zone] = []
                 orders_by_temp[order.temperature_zone].append(order)
             
-            # 4. 각 온도대별로 최적화
+            # 4. 온도대별 문제 구성 (DB 조회는 메인 프로세스에서)
             all_results = []
+            zone_results = []
             failed_zones = []
+            problems = []
             
             for temp_zone, zone_orders in orders_by_temp.items():
                 logger.info(f"\n온도대 [{temp_zone.value}] 최적화: {len(zone_orders)}건")
@@ -472,18 +493,37 @@ class AdvancedDispatchOptimizationService:
                     })
                     continue
                 
-                # 온도대별 최적화 실행
-                result = await self._optimize_temperature_zone(
+                problem = await self._prepare_temperature_zone(
                     zone_orders,
                     compatible_vehicles,
                     dispatch_date,
-                    time_limit_seconds,
                     use_time_windows,
                     use_real_routing
                 )
+                problem['temp_zone'] = temp_zone
+                problem['time_limit_seconds'] = self._zone_time_limit(temp_zone, time_limit_seconds, zone_time_limits)
+                problems.append(problem)
+            
+            # 5. 온도대별 솔버 동시 실행 (벽시계 시간 ≈ 가장 느린 온도대)
+            solutions = await asyncio.gather(
+                *(self._solve_problem(problem) for problem in problems),
+                return_exceptions=True
+            )
+            
+            # 6. 결과 저장 (DB 세션은 순차 사용)
+            for problem, solution in zip(problems, solutions):
+                temp_zone = problem['temp_zone']
+                zone_orders = problem['orders']
+                
+                if isinstance(solution, Exception):
+                    logger.error(f"온도대 [{temp_zone.value}] 솔버 오류: {solution}")
+                    solution = None
+                
+                result = await self._finalize_temperature_zone(problem, solution)
                 
                 if result and result.get('success', True) is not False:
                     all_results.append(result)
+                    zone_results.append((temp_zone, zone_orders, result))
                 else:
                     # 실패 정보 수집
                     failed_zones.append({
@@ -494,7 +534,7 @@ class AdvancedDispatchOptimizationService:
                         'diagnostics': result.get('diagnostics', {}) if result else {}
                     })
             
-            # 5. 결과 취합
+            # 7. 결과 취합
             total_dispatches = sum(r.get('num_dispatches', 0) for r in all_results)
             total_distance = sum(r.get('total_distance', 0) for r in all_results)
             
@@ -539,7 +579,7 @@ class AdvancedDispatchOptimizationService:
                         "dispatches": result.get('num_dispatches', 0),
                         "distance_km": round(result.get('total_distance', 0) / 1000, 2)
                     }
-                    for (temp_zone, zone_orders), result in zip(orders_by_temp.items(), all_results)
+                    for temp_zone, zone_orders, result in zone_results
                 ],
                 "dispatches": [d for r in all_results for d in r.get('dispatches', [])],
                 "failed_zones": failed_zones if failed_zones else None,
@@ -552,6 +592,37 @@ class AdvancedDispatchOptimizationService:
             traceback.print_exc()
             return {"success": False, "error": str(e)}
     
+    def _zone_time_limit(
+        self,
+        temp_zone: TemperatureZone,
+        default_seconds: int,
+        zone_time_limits: Optional[Dict[str, int]]
+    ) -> int:
+        """온도대별 솔버 시간 예산 (미지정 시 기본값)"""
+        if not zone_time_limits:
+            return default_seconds
+        for key in (temp_zone.name, temp_zone.value):
+            if key in zone_time_limits:
+                return int(zone_time_limits[key])
+        return default_seconds
+    
+    async def _solve_problem(self, problem: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """구성된 온도대 문제를 솔버 프로세스 풀에서 실행"""
+        logger.info(
+            f"온도대 [{problem['temp_zone'].value if problem.get('temp_zone') else '-'}] 솔버 실행 "
+            f"(위치 {len(problem['locations'])}, 차량 {len(problem['vehicle_infos'])}, "
+            f"제한 {problem['time_limit_seconds']}초)"
+        )
+        return await run_in_solver_pool(
+            solve_cvrptw,
+            problem['locations'],
+            problem['vehicle_infos'],
+            problem['distance_matrix'],
+            problem['time_matrix'],
+            problem['use_time_windows'],
+            problem['time_limit_seconds']
+        )
+    
     async def _optimize_temperature_zone(
         self,
         orders: List[Order],
@@ -561,7 +632,23 @@ class AdvancedDispatchOptimizationService:
         use_time_windows: bool,
         use_real_routing: bool
     ) -> Optional[Dict[str, Any]]:
-        """특정 온도대의 주문을 최적화"""
+        """특정 온도대의 주문을 최적화 (문제 구성 → 솔버 → 저장)"""
+        problem = await self._prepare_temperature_zone(
+            orders, vehicles, dispatch_date, use_time_windows, use_real_routing
+        )
+        problem['time_limit_seconds'] = time_limit_seconds
+        solution = await self._solve_problem(problem)
+        return await self._finalize_temperature_zone(problem, solution)
+    
+    async def _prepare_temperature_zone(
+        self,
+        orders: List[Order],
+        vehicles: List[Vehicle],
+        dispatch_date: Optional[str],
+        use_time_windows: bool,
+        use_real_routing: bool
+    ) -> Dict[str, Any]:
+        """특정 온도대의 CVRPTW 문제 구성 (위치, 차량, 거리/시간 행렬, 진단 정보)"""
         
         # 진단 정보 수집
         diagnostics = {
@@ -582,13 +669,13 @@ class AdvancedDispatchOptimizationService:
         first_vehicle = vehicles[0]
         
         # 1순위: 실시간 GPS 위치 (최근 30분 이내, 운행중인 경우)
-        thirty_minutes_ago = datetime.now(timezone.utc) - timedelta(minutes=30)
-        latest_location = self.db.query(VehicleLocation).filter(
-            VehicleLocation.vehicle_id == first_vehicle.id,
-            VehicleLocation.recorded_at >= thirty_minutes_ago
-        ).order_by(VehicleLocation.recorded_at.desc()).first()
+        latest_location = vehicle_state_store.get(self.db, first_vehicle.id)
+        location_age = latest_location.position_age_seconds() if latest_location else None
         
-        if latest_location and latest_location.latitude and latest_location.longitude:
+        if (
+            latest_location and latest_location.latitude and latest_location.longitude
+            and location_age is not None and location_age <= 30 * 60
+        ):
             depot_lat = latest_location.latitude
             depot_lon = latest_location.longitude
             logger.info(f"✅ 차량 {first_vehicle.code}: 실시간 GPS 사용 ({depot_lat:.6f}, {depot_lon:.6f}) - {latest_location.recorded_at.strftime('%H:%M:%S')}")
@@ -759,18 +846,36 @@ class AdvancedDispatchOptimizationService:
         else:
             logger.info("📐 Haversine 거리 사용")
             distance_matrix = self._create_distance_matrix(locations)
-            time_matrix = self._create_time_matrix(distance_matrix)
-        
-        # CVRPTW 솔버 실행
-        solver = CVRPTWSolver(
-            locations=locations,
-            vehicles=vehicle_infos,
-            distance_matrix=distance_matrix,
-            time_matrix=time_matrix,
-            use_time_windows=use_time_windows
-        )
+            time_matrix = self._create_time_matrix(locations)
         
-        solution = solver.solve(time_limit_seconds=time_limit_seconds)
+        return {
+            'orders': orders,
+            'vehicles': vehicles,
+            'dispatch_date': dispatch_date,
+            'use_time_windows': use_time_windows,
+            'locations': locations,
+            'vehicle_infos': vehicle_infos,
+            'distance_matrix': distance_matrix,
+            'time_matrix': time_matrix,
+            'diagnostics': diagnostics,
+            'missing_coords_count': missing_coords_count
+        }
+    
+    async def _finalize_temperature_zone(
+        self,
+        problem: Dict[str, Any],
+        solution: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """솔버 결과 처리: 실패 원인 진단 또는 DB 저장"""
+        orders = problem['orders']
+        vehicles = problem['vehicles']
+        locations = problem['locations']
+        diagnostics = problem['diagnostics']
+        missing_coords_count = problem['missing_coords_count']
+        total_pallet_demand = diagnostics['total_pallet_demand']
+        total_weight_demand = diagnostics['total_weight_demand']
+        total_vehicle_pallet_capacity = diagnostics['total_vehicle_pallet_capacity']
+        total_vehicle_weight_capacity = diagnostics['total_vehicle_weight_capacity']
         
         if not solution:
             # 실패 원인 분석 및 로깅
@@ -819,7 +924,7 @@ class AdvancedDispatchOptimizationService:
             orders,
             vehicles,
             locations,
-            dispatch_date
+            problem['dispatch_date']
         )
         
         return {
@@ -0,0 +1,359 @@
+"""
+대시보드 통계 공유 생산자
+- 프로세스당 하나의 생산자가 주기마다 통계를 1회 집계 (Redis 연결 시 클러스터 전체에서 리더 1개만 집계)
+- 이전 스냅샷과 달라진 항목만(delta) 모든 구독자에게 전달
+- 신규 구독자는 연결 즉시 전체 스냅샷 수신
+- 구독자 수와 무관하게 DB 부하 일정 (구독자가 없으면 집계하지 않음)
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+from loguru import logger
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.async_database import get_async_sessionmaker
+from app.models.billing import BillingStatus, Invoice
+from app.models.dispatch import Dispatch, DispatchStatus
+from app.models.order import Order, OrderStatus
+from app.models.vehicle import Vehicle, VehicleStatus
+from app.websocket.connection_manager import manager
+
+
+async def collect_dashboard_stats(db: AsyncSession) -> Dict[str, Any]:
+    """
+    대시보드 카운터 집계 (주문/배차/차량/청구서 각 1쿼리, 조건부 집계)
+
+    수익은 재무 대시보드와 같은 기준 (발행일 기준 청구서 총액, 취소 청구서 제외)
+    """
+    today = date.today()
+    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    order_stats = (await db.execute(
+        select(
+            func.count(Order.id).label('total'),
+            func.sum(case((Order.status == OrderStatus.PENDING, 1), else_=0)).label('pending')
+        ).where(Order.created_at >= today_start)
+    )).one()
+
+    dispatch_stats = (await db.execute(
+        select(
+            func.sum(case((Dispatch.status.in_([DispatchStatus.CONFIRMED, DispatchStatus.IN_PROGRESS]), 1), else_=0)).label('active'),
+            func.sum(case((and_(Dispatch.status == DispatchStatus.COMPLETED, Dispatch.dispatch_date == today), 1), else_=0)).label('completed')
+        )
+    )).one()
+
+    vehicle_stats = (await db.execute(
+        select(
+            func.sum(case((and_(Vehicle.status == VehicleStatus.AVAILABLE, Vehicle.is_active == True), 1), else_=0)).label('available'),
+            func.sum(case((Vehicle.status == VehicleStatus.IN_USE, 1), else_=0)).label('active')
+        )
+    )).one()
+
+    revenue_stats = (await db.execute(
+        select(
+            func.sum(case((Invoice.issue_date == today, Invoice.total_amount), else_=0)).label('today'),
+            func.sum(Invoice.total_amount).label('month')
+        ).where(
+            Invoice.issue_date >= today.replace(day=1),
+            Invoice.issue_date <= today,
+            Invoice.status != BillingStatus.CANCELLED
+        )
+    )).one()
+
+    return {
+        "total_orders": order_stats.total or 0,
+        "pending_orders": order_stats.pending or 0,
+        "active_dispatches": dispatch_stats.active or 0,
+        "completed_today": dispatch_stats.completed or 0,
+        "available_vehicles": vehicle_stats.available or 0,
+        "active_vehicles": vehicle_stats.active or 0,
+        "revenue_today": float(revenue_stats.today or 0),
+        "revenue_month": float(revenue_stats.month or 0),
+    }
+
+
+class DashboardStatsProducer:
+    """
+    대시보드 통계 생산자
+
+    집계 결과는 메시지({"type": "dashboard_snapshot" | "dashboard_delta", "version", "data"})로
+    발행되고, 각 워커는 이를 스냅샷에 반영한 뒤 로컬 구독자 큐로 팬아웃합니다.
+    Redis 연결 시: 리더 키를 가진 워커만 집계하여 ConnectionManager Pub/Sub 으로 발행
+    Redis 미연결 시: 프로세스 내에서 바로 반영
+    """
+
+    CHANNEL = "dashboard_stats"
+    LEADER_KEY = "dashboard_stats:leader"
+    SNAPSHOT_KEY = "dashboard_stats:snapshot"
+    # 느린 구독자 큐 한도 (초과 시 대기 중인 delta 를 버리고 전체 스냅샷으로 재동기화)
+    QUEUE_SIZE = 16
+    # 변경이 없어도 이 간격으로 timestamp 만 전송 (프록시 유휴 타임아웃 방지)
+    KEEPALIVE_SECONDS = 30.0
+
+    def __init__(
+        self,
+        interval: float = 5.0,
+        session_factory: Optional[Callable[[], AsyncSession]] = None
+    ):
+        self.interval = interval
+        self.session_factory = session_factory  # 기본값: 비동기 세션 (core/async_database)
+        self.worker_id = uuid.uuid4().hex
+
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._snapshot: Optional[Dict[str, Any]] = None  # 구독자에게 전달된 최신 통계
+        self._version = 0
+        self._timestamp: Optional[str] = None
+        self._published: Optional[Dict[str, Any]] = None  # 이 워커가 마지막으로 발행한 통계 (리더)
+        self._published_version = 0
+
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+
+    # ==================== 구독 ====================
+
+    @property
+    def has_subscribers(self) -> bool:
+        """로컬 구독자 또는 ConnectionManager 'dashboard' 채널 연결 여부"""
+        return bool(self._subscribers) or bool(manager.active_connections.get("dashboard"))
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    async def subscribe(self) -> asyncio.Queue:
+        """구독 큐 등록 (첫 메시지는 전체 스냅샷)"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._subscribers.add(queue)
+        snapshot = await self.get_snapshot()
+        if snapshot is not None and queue.empty():
+            queue.put_nowait(self._client_snapshot())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    async def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        """최신 통계 (아직 없으면 1회 로드, 동시 호출은 한 번만 집계)"""
+        if self._snapshot is None:
+            async with self._get_lock():
+                if self._snapshot is None:
+                    await self._load_snapshot()
+        return dict(self._snapshot) if self._snapshot is not None else None
+
+    async def stream(self, websocket: WebSocket):
+        """WebSocket 으로 스냅샷 + delta 전송 (연결 종료까지)"""
+        queue = await self.subscribe()
+
+        async def send_updates():
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=self.KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    message = {"timestamp": datetime.now().isoformat()}
+                await websocket.send_json(message)
+
+        async def wait_disconnect():
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+
+        tasks = [asyncio.create_task(send_updates()), asyncio.create_task(wait_disconnect())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() and not isinstance(task.exception(), WebSocketDisconnect):
+                    logger.warning(f"Dashboard stream ended: {type(task.exception()).__name__}: {task.exception()}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.unsubscribe(queue)
+
+    # ==================== 생산 ====================
+
+    async def start(self):
+        """집계 루프 시작 및 Pub/Sub 수신 등록"""
+        if self._task and not self._task.done():
+            return
+        manager.add_channel_listener(self.CHANNEL, self.apply_message)
+        self._task = asyncio.create_task(self._run())
+        logger.info("✅ Dashboard stats producer started")
+
+    async def stop(self):
+        manager.remove_channel_listener(self.CHANNEL, self.apply_message)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("🛑 Dashboard stats producer stopped")
+
+    async def _run(self):
+        while True:
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Dashboard stats tick failed: {type(e).__name__}: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def tick(self):
+        """1회 집계 후 변경분 발행 (구독자가 없거나 리더가 아니면 건너뜀)"""
+        if not self.has_subscribers:
+            return
+        if manager.redis_client and not await self._acquire_leadership():
+            return
+        stats = await self._collect()
+        await self._publish(stats)
+
+    async def _collect(self) -> Dict[str, Any]:
+        session_factory = self.session_factory or get_async_sessionmaker()
+        async with session_factory() as db:
+            return await collect_dashboard_stats(db)
+
+    async def _publish(self, stats: Dict[str, Any]):
+        """직전 발행분과 비교하여 delta (처음이면 전체 스냅샷) 발행"""
+        if self._published is None:
+            message_type, data = "dashboard_snapshot", stats
+        else:
+            data = {key: value for key, value in stats.items() if self._published.get(key) != value}
+            if not data:
+                return
+            message_type = "dashboard_delta"
+
+        self._published = stats
+        self._published_version += 1
+        message = {
+            "type": message_type,
+            "version": self._published_version,
+            "data": data,
+            "timestamp": datetime.now().isoformat()
+        }
+
+        if manager.redis_client:
+            try:
+                await manager.redis_client.set(
+                    self.SNAPSHOT_KEY,
+                    json.dumps({**message, "type": "dashboard_snapshot", "data": stats}),
+                    px=self._lease_ms()
+                )
+            except Exception as e:
+                logger.warning(f"Dashboard snapshot Redis 저장 실패: {e}")
+            # Pub/Sub 리스너가 이 워커를 포함한 모든 워커에 전달
+            await manager.publish_to_redis(self.CHANNEL, message)
+        else:
+            await self.apply_message(message)
+
+    async def apply_message(self, message: Dict[str, Any]):
+        """발행된 스냅샷/delta 를 반영하고 로컬 구독자에게 팬아웃"""
+        data = message.get("data") or {}
+        version = message.get("version", 0)
+
+        if message.get("type") == "dashboard_snapshot":
+            self._snapshot = dict(data)
+        elif self._snapshot is not None and version == self._version + 1:
+            self._snapshot.update(data)
+        else:
+            # 메시지 유실(또는 스냅샷 없음) - 전체 스냅샷 재로드
+            self._snapshot = None
+            await self._load_snapshot()
+            self._fan_out(self._client_snapshot(), resync=True)
+            return
+
+        self._version = version
+        self._timestamp = message.get("timestamp")
+        if message.get("type") == "dashboard_snapshot":
+            self._fan_out(self._client_snapshot(), resync=True)
+        else:
+            self._fan_out({**data, "timestamp": self._timestamp})
+
+    def _fan_out(self, payload: Dict[str, Any], resync: bool = False):
+        for queue in list(self._subscribers):
+            if resync:
+                self._drain(queue)
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # 느린 구독자 - 쌓인 delta 대신 전체 스냅샷으로 교체
+                self._drain(queue)
+                queue.put_nowait(self._client_snapshot())
+
+    @staticmethod
+    def _drain(queue: asyncio.Queue):
+        while not queue.empty():
+            queue.get_nowait()
+
+    def _client_snapshot(self) -> Dict[str, Any]:
+        return {
+            **(self._snapshot or {}),
+            "timestamp": self._timestamp or datetime.now().isoformat(),
+            "loading": False
+        }
+
+    async def _load_snapshot(self):
+        """Redis 에 공유된 스냅샷을 우선 사용하고, 없으면 직접 집계"""
+        if manager.redis_client:
+            try:
+                raw = await manager.redis_client.get(self.SNAPSHOT_KEY)
+                if raw:
+                    message = json.loads(raw)
+                    self._snapshot = dict(message["data"])
+                    self._version = message.get("version", 0)
+                    self._timestamp = message.get("timestamp")
+                    return
+            except Exception as e:
+                logger.warning(f"Dashboard snapshot Redis 조회 실패: {e}")
+
+        stats = await self._collect()
+        if manager.redis_client:
+            # 리더의 다음 발행 전까지 임시 사용 (version 불일치로 다음 delta 수신 시 재로드)
+            self._snapshot = stats
+            self._version = -1
+            self._timestamp = datetime.now().isoformat()
+        else:
+            self._published = None
+            await self._publish(stats)
+
+    # ==================== 리더 선출 ====================
+
+    def _lease_ms(self) -> int:
+        return int(self.interval * 3 * 1000)
+
+    async def _acquire_leadership(self) -> bool:
+        """리더 키 획득/갱신 (리더 부재 시 구독자가 있는 워커가 이어받음)"""
+        redis_client = manager.redis_client
+        try:
+            if await redis_client.set(self.LEADER_KEY, self.worker_id, nx=True, px=self._lease_ms()):
+                # 새 리더는 전체 스냅샷부터 발행
+                self._published = None
+                self._published_version = max(self._published_version, self._version)
+                return True
+            if await redis_client.get(self.LEADER_KEY) == self.worker_id:
+                await redis_client.pexpire(self.LEADER_KEY, self._lease_ms())
+                return True
+            return False
+        except Exception as e:
+            logger.warning(f"Dashboard stats 리더 선출 Redis 오류, 로컬 집계: {e}")
+            return True
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+
+# Global instance
+dashboard_stats_producer = DashboardStatsProducer()
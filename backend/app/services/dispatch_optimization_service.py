@@ -3,7 +3,7 @@
 OR-Tools를 사용한 다중 차량 경로 최적화 (VRP with Time Windows)
 """
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import json
@@ -14,6 +14,8 @@ from ortools.constraint_solver import pywrapcp
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
+from app.services.distance_matrix import get_distance_matrix_engine
+from app.services.solver_pool import run_in_solver_pool
 from app.models import (
     Order, Vehicle, Driver, Dispatch,
     OrderStatus, DispatchStatus, VehicleStatus
@@ -90,6 +92,32 @@ class OptimizationResult:
     created_at: datetime
 
 
+def solve_vrp(
+    depot_location: Location,
+    delivery_points: List[DeliveryPoint],
+    vehicles: List[VehicleInfo],
+    distance_matrix: List[List[float]],
+    time_matrix: List[List[int]],
+    constraints: Dict[str, Any],
+    options: Dict[str, Any],
+    progress: Optional[Callable[[float], None]] = None
+) -> Tuple[List[Route], List[int]]:
+    """
+    VRP 최적화 (솔버 프로세스 풀에서 실행되는 최상위 함수, DB 세션 미사용)
+    """
+    service = DispatchOptimizationService(db=None)
+    service.depot_location = depot_location
+    return service._run_vrp_optimization(
+        delivery_points,
+        vehicles,
+        distance_matrix,
+        time_matrix,
+        constraints,
+        options,
+        progress
+    )
+
+
 class DispatchOptimizationService:
     """배차 최적화 서비스"""
     
@@ -124,21 +152,9 @@ class DispatchOptimizationService:
         logger.info(f"배차 최적화 시작: {len(order_ids)}개 주문")
         
         try:
-            # 1. 데이터 로드
-            delivery_points = self._load_delivery_points(order_ids)
-            vehicles = self._load_available_vehicles(date, constraints)
-            
-            if not delivery_points:
-                raise ValueError("배송 지점이 없습니다")
-            
-            if not vehicles:
-                raise ValueError("사용 가능한 차량이 없습니다")
-            
-            # 2. 거리/시간 매트릭스 계산
-            distance_matrix, time_matrix = self._calculate_distance_matrix(
-                delivery_points,
-                vehicles,
-                options.get("use_traffic_data", True)
+            # 1~2. 데이터 로드 및 거리/시간 매트릭스 계산
+            delivery_points, vehicles, distance_matrix, time_matrix = self._prepare_optimization(
+                order_ids, date, constraints, options
             )
             
             # 3. OR-Tools 최적화 실행
@@ -152,26 +168,103 @@ class DispatchOptimizationService:
             )
             
             # 4. 결과 생성
-            optimization_time = (datetime.now() - start_time).total_seconds()
+            return self._build_result(routes, unassigned, start_time)
             
-            result = OptimizationResult(
-                optimization_id=self._generate_optimization_id(),
-                status="completed",
-                summary=self._calculate_summary(routes, unassigned, optimization_time),
-                routes=routes,
-                unassigned_orders=unassigned,
-                optimization_time=optimization_time,
-                created_at=datetime.now()
+        except Exception as e:
+            logger.error(f"최적화 실패: {str(e)}")
+            raise
+    
+    async def optimize_dispatch_async(
+        self,
+        order_ids: List[int],
+        date: str,
+        constraints: Dict[str, Any],
+        options: Dict[str, Any],
+        progress: Optional[Callable[[float], None]] = None
+    ) -> OptimizationResult:
+        """
+        배차 최적화 실행 (OR-Tools 솔버는 솔버 프로세스 풀에서 실행)
+        
+        Args:
+            progress: 새 해를 찾을 때마다 현재 최적 비용으로 호출 (pickle 가능해야 함)
+        
+        Returns:
+            OptimizationResult
+        """
+        start_time = datetime.now()
+        logger.info(f"배차 최적화 시작 (비동기): {len(order_ids)}개 주문")
+        
+        try:
+            delivery_points, vehicles, distance_matrix, time_matrix = self._prepare_optimization(
+                order_ids, date, constraints, options
             )
             
-            logger.info(f"최적화 완료: {len(routes)}개 경로, {optimization_time:.2f}초")
+            routes, unassigned = await run_in_solver_pool(
+                solve_vrp,
+                self.depot_location,
+                delivery_points,
+                vehicles,
+                distance_matrix,
+                time_matrix,
+                constraints,
+                options,
+                progress
+            )
             
-            return result
+            return self._build_result(routes, unassigned, start_time)
             
         except Exception as e:
             logger.error(f"최적화 실패: {str(e)}")
             raise
     
+    def _prepare_optimization(
+        self,
+        order_ids: List[int],
+        date: str,
+        constraints: Dict[str, Any],
+        options: Dict[str, Any]
+    ) -> Tuple[List[DeliveryPoint], List[VehicleInfo], List[List[float]], List[List[int]]]:
+        """배송 지점/차량 로드 및 거리/시간 매트릭스 계산"""
+        delivery_points = self._load_delivery_points(order_ids)
+        vehicles = self._load_available_vehicles(date, constraints)
+        
+        if not delivery_points:
+            raise ValueError("배송 지점이 없습니다")
+        
+        if not vehicles:
+            raise ValueError("사용 가능한 차량이 없습니다")
+        
+        distance_matrix, time_matrix = self._calculate_distance_matrix(
+            delivery_points,
+            vehicles,
+            options.get("use_traffic_data", True)
+        )
+        
+        return delivery_points, vehicles, distance_matrix, time_matrix
+    
+    def _build_result(
+        self,
+        routes: List[Route],
+        unassigned: List[int],
+        start_time: datetime
+    ) -> OptimizationResult:
+        """최적화 결과 생성"""
+        optimization_time = (datetime.now() - start_time).total_seconds()
+        
+        result = OptimizationResult(
+            optimization_id=self._generate_optimization_id(),
+            status="completed",
+            summary=self._calculate_summary(routes, unassigned, optimization_time),
+            routes=routes,
+            unassigned_orders=unassigned,
+            optimization_time=optimization_time,
+            created_at=datetime.now()
+        )
+        
+        logger.info(f"최적화 완료: {len(routes)}개 경로, {optimization_time:.2f}초")
+        
+        return result
+    
     def _load_delivery_points(self, order_ids: List[int]) -> List[DeliveryPoint]:
         """배송 지점 데이터 로드"""
         orders = self.db.query(Order).filter(
@@ -254,34 +347,18 @@ class DispatchOptimizationService:
         """
         # 모든 위치 (depot + 배송지)
         all_locations = [self.depot_location] + [p.location for p in delivery_points]
-        n = len(all_locations)
+        coords = [(loc.lat, loc.lng) for loc in all_locations]
+        
+        # 거리/시간 행렬은 공용 엔진에서 벡터화 계산 + 캐시 (평균 속도 40km/h, 교통 상황 1.2배)
+        engine = get_distance_matrix_engine()
+        distance_m, time_min = engine.build(
+            coords,
+            avg_speed_kmh=40.0,
+            traffic_factor=1.2 if use_traffic else 1.0
+        )
         
-        # 간단한 유클리드 거리 계산 (실제로는 Google Maps API 사용)
-        distance_matrix = [[0.0] * n for _ in range(n)]
-        time_matrix = [[0] * n for _ in range(n)]
-        
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    continue
-                
-                # 거리 계산 (단순화된 버전)
-                dist = self._haversine_distance(
-                    all_locations[i].lat,
-                    all_locations[i].lng,
-                    all_locations[j].lat,
-                    all_locations[j].lng
-                )
-                
-                distance_matrix[i][j] = dist
-                
-                # 시간 계산 (평균 속도 40km/h 가정)
-                time_minutes = int((dist / 40.0) * 60)
-                if use_traffic:
-                    # 교통 상황 반영 (1.2배)
-                    time_minutes = int(time_minutes * 1.2)
-                
-                time_matrix[i][j] = time_minutes
+        distance_matrix = (distance_m / 1000.0).tolist()
+        time_matrix = time_min.tolist()
         
         return distance_matrix, time_matrix
     
@@ -292,7 +369,8 @@ class DispatchOptimizationService:
         distance_matrix: List[List[float]],
         time_matrix: List[List[int]],
         constraints: Dict[str, Any],
-        options: Dict[str, Any]
+        options: Dict[str, Any],
+        progress: Optional[Callable[[float], None]] = None
     ) -> Tuple[List[Route], List[int]]:
         """OR-Tools VRP 최적화 실행"""
         
@@ -379,6 +457,10 @@ class DispatchOptimizationService:
         )
         search_parameters.time_limit.seconds = 30  # 30초 시간 제한
         
+        # 진행 상황 보고 (새 해를 찾을 때마다 현재 비용 전달)
+        if progress is not None:
+            routing.AddAtSolutionCallback(lambda: progress(routing.CostVar().Value()))
+        
         # 최적화 실행
         solution = routing.SolveWithParameters(search_parameters)
         
@@ -0,0 +1,165 @@
+"""
+거리/시간 행렬 엔진
+- NumPy 브로드캐스팅 기반 Haversine 거리 행렬
+- int32 압축 저장 (미터 / 분)
+- 좌표 집합 해시 기반 LRU 캐시
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+class DistanceMatrixEngine:
+    """CVRPTW / VRP / TSP 공용 거리 행렬 엔진"""
+
+    EARTH_RADIUS_KM = 6371.0
+    DEFAULT_SPEED_KMH = 40.0  # 도심 평균 속도
+
+    def __init__(self, max_entries: int = 32):
+        """
+        Args:
+            max_entries: 캐시에 보관할 최대 행렬 수
+        """
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _as_coords(coords: Sequence[Tuple[float, float]]) -> np.ndarray:
+        """(lat, lon) 시퀀스를 (n, 2) float64 배열로 변환"""
+        arr = np.asarray(coords, dtype=np.float64)
+        if arr.size == 0:
+            return arr.reshape(0, 2)
+        if arr.ndim != 2 or arr.shape[1] != 2:
+            raise ValueError(f"좌표는 (lat, lon) 쌍이어야 합니다: shape={arr.shape}")
+        return np.ascontiguousarray(arr)
+
+    @staticmethod
+    def coords_key(coords: np.ndarray) -> str:
+        """좌표 집합 해시 (캐시 키)"""
+        digest = hashlib.blake2b(coords.tobytes(), digest_size=16)
+        digest.update(str(coords.shape).encode())
+        return digest.hexdigest()
+
+    def haversine_km(self, coords: Sequence[Tuple[float, float]]) -> np.ndarray:
+        """모든 좌표 쌍의 Haversine 거리 (km, float64, n×n)"""
+        arr = self._as_coords(coords)
+        lat = np.radians(arr[:, 0])
+        lon = np.radians(arr[:, 1])
+
+        delta_lat = lat[None, :] - lat[:, None]
+        delta_lon = lon[None, :] - lon[:, None]
+
+        a = (
+            np.sin(delta_lat / 2) ** 2
+            + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(delta_lon / 2) ** 2
+        )
+        np.clip(a, 0.0, 1.0, out=a)
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+        return self.EARTH_RADIUS_KM * c
+
+    def distance_matrix_m(self, coords: Sequence[Tuple[float, float]]) -> np.ndarray:
+        """
+        거리 행렬 (미터, int32)
+
+        동일한 좌표 집합에 대해서는 캐시된 읽기 전용 배열을 반환합니다.
+        """
+        arr = self._as_coords(coords)
+        key = ("distance", self.coords_key(arr))
+
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        matrix = (self.haversine_km(arr) * 1000).astype(np.int32)
+        np.fill_diagonal(matrix, 0)
+        return self._put(key, matrix)
+
+    def time_matrix_min(
+        self,
+        coords: Sequence[Tuple[float, float]],
+        avg_speed_kmh: float = DEFAULT_SPEED_KMH,
+        traffic_factor: float = 1.0
+    ) -> np.ndarray:
+        """
+        이동 시간 행렬 (분, int32)
+
+        Args:
+            coords: (lat, lon) 좌표 목록
+            avg_speed_kmh: 평균 속도 (km/h)
+            traffic_factor: 교통 혼잡도 계수 (분 단위 절사 후 적용)
+        """
+        arr = self._as_coords(coords)
+        key = ("time", self.coords_key(arr), float(avg_speed_kmh), float(traffic_factor))
+
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        speed_m_per_min = (avg_speed_kmh * 1000) / 60
+        distance_m = self.distance_matrix_m(arr)
+        minutes = np.floor(distance_m / speed_m_per_min)
+        if traffic_factor != 1.0:
+            minutes = np.floor(minutes * traffic_factor)
+        return self._put(key, minutes.astype(np.int32))
+
+    def build(
+        self,
+        coords: Sequence[Tuple[float, float]],
+        avg_speed_kmh: float = DEFAULT_SPEED_KMH,
+        traffic_factor: float = 1.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """거리(미터)/시간(분) 행렬을 함께 생성"""
+        arr = self._as_coords(coords)
+        distance_m = self.distance_matrix_m(arr)
+        time_min = self.time_matrix_min(arr, avg_speed_kmh, traffic_factor)
+        logger.debug(f"거리 행렬 준비 완료: {len(arr)}개 위치")
+        return distance_m, time_min
+
+    def clear(self) -> None:
+        """캐시 비우기"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _get(self, key: Tuple):
+        with self._lock:
+            matrix = self._cache.get(key)
+            if matrix is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return matrix
+
+    def _put(self, key: Tuple, matrix: np.ndarray) -> np.ndarray:
+        # 캐시 공유 배열이 호출자에 의해 변경되지 않도록 읽기 전용으로 보관
+        matrix.setflags(write=False)
+        with self._lock:
+            self._cache[key] = matrix
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return matrix
+
+
+# 전역 거리 행렬 엔진 인스턴스
+_distance_matrix_engine = None
+
+
+def get_distance_matrix_engine() -> DistanceMatrixEngine:
+    """거리 행렬 엔진 싱글톤 인스턴스"""
+    global _distance_matrix_engine
+    if _distance_matrix_engine is None:
+        _distance_matrix_engine = DistanceMatrixEngine()
+        logger.info("Distance matrix engine initialized")
+    return _distance_matrix_engine
@@ -1,13 +1,17 @@
 """
 Driver Performance Evaluation System - Phase 10
 운전자 평가 시스템
+
+기사별 점수는 RankingService 에서 배차 집계 쿼리 1회 + 벡터 계산으로 구하며,
+단건 평가와 전체 랭킹이 같은 점수 함수를 사용합니다.
 """
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from app.models import User, Dispatch, Order, Vehicle
-import numpy as np
+from app.models import Driver
+from app.services.ranking_service import (
+    RankingService, DRIVER_GRADES, DRIVER_GRADE_FLOOR, grade_for
+)
 
 
 class DriverEvaluationSystem:
@@ -15,6 +19,7 @@ class DriverEvaluationSystem:
     
     def __init__(self, db: Session):
         self.db = db
+        self.ranking = RankingService(db)
     
     def evaluate_driver(
         self,
@@ -28,80 +33,54 @@ class DriverEvaluationSystem:
         평가 항목:
         - 배송 완료율
         - 정시 배송률
-        - 고객 만족도 (평가가 있는 경우)
-        - 안전 운전 점수
-        - 효율성 점수
+        - 고객 만족도 (배송 완료율 / 정시 배송률 기반 추정)
+        - 안전 운전 점수 (지연율 기반 추정)
+        - 효율성 점수 (배차당 주문 수)
         """
-        driver = self.db.query(User).filter(
-            and_(
-                User.id == driver_id,
-                User.role == 'DRIVER'
-            )
-        ).first()
+        driver = self.db.get(Driver, driver_id)
         
         if not driver:
             return {'error': 'Driver not found'}
         
-        # 기간 내 배차 조회 (driver_id 없으므로 driver_name으로 조회)
-        # TODO: Vehicle 모델에 driver_id 추가 필요
-        dispatches = self.db.query(Dispatch).filter(
-            and_(
-                Dispatch.created_at >= start_date,
-                Dispatch.created_at <= end_date
-            )
-        ).all()
+        scores = self.ranking.driver_scores(start_date, end_date, driver_ids=[driver_id])
         
-        if not dispatches:
+        if scores.empty:
             return {
-                'driver_name': driver.full_name,
+                'driver_name': driver.name,
                 'driver_id': driver_id,
                 'message': 'No dispatch records found for this period'
             }
         
-        # 각 항목 평가
-        delivery_score = self._evaluate_delivery_completion(dispatches)
-        on_time_score = self._evaluate_on_time_delivery(dispatches)
-        efficiency_score = self._evaluate_efficiency(dispatches)
-        safety_score = self._evaluate_safety(dispatches, driver_id)
-        customer_score = self._evaluate_customer_satisfaction(dispatches)
-        
-        # 종합 점수 계산 (가중 평균)
-        overall_score = (
-            delivery_score * 0.25 +
-            on_time_score * 0.25 +
-            efficiency_score * 0.20 +
-            safety_score * 0.15 +
-            customer_score * 0.15
-        )
-        
-        # 등급 결정
-        grade = self._determine_grade(overall_score)
-        
-        # 통계
-        total_deliveries = sum([len(d.orders) for d in dispatches])
-        completed_deliveries = sum([
-            sum(1 for o in d.orders if o.status == 'COMPLETED')
-            for d in dispatches
-        ])
+        return self._to_evaluation(scores.iloc[0], start_date, end_date)
+    
+    def _to_evaluation(self, row, start_date: datetime, end_date: datetime) -> Dict:
+        """점수 행 -> 평가 결과"""
+        delivery_score = float(row['delivery_completion'])
+        on_time_score = float(row['on_time_delivery'])
+        efficiency_score = float(row['efficiency'])
+        safety_score = float(row['safety'])
+        customer_score = float(row['customer_satisfaction'])
+        total_deliveries = int(row['orders'])
+        completed_deliveries = int(row['delivered'])
         
         return {
-            'driver_id': driver_id,
-            'driver_name': driver.full_name,
+            'driver_id': int(row['driver_id']),
+            'driver_name': row['driver_name'],
             'period': {
                 'start': start_date.date().isoformat(),
                 'end': end_date.date().isoformat()
             },
-            'overall_score': round(overall_score, 2),
-            'grade': grade,
+            'overall_score': float(row['overall_score']),
+            'grade': row['grade'],
             'scores': {
-                'delivery_completion': round(delivery_score, 2),
-                'on_time_delivery': round(on_time_score, 2),
-                'efficiency': round(efficiency_score, 2),
-                'safety': round(safety_score, 2),
-                'customer_satisfaction': round(customer_score, 2)
+                'delivery_completion': delivery_score,
+                'on_time_delivery': on_time_score,
+                'efficiency': efficiency_score,
+                'safety': safety_score,
+                'customer_satisfaction': customer_score
             },
             'statistics': {
-                'total_dispatches': len(dispatches),
+                'total_dispatches': int(row['dispatches']),
                 'total_deliveries': total_deliveries,
                 'completed_deliveries': completed_deliveries,
                 'completion_rate': round((completed_deliveries / total_deliveries * 100) if total_deliveries > 0 else 0, 2)
@@ -110,143 +89,9 @@ class DriverEvaluationSystem:
             'areas_for_improvement': self._identify_weaknesses(delivery_score, on_time_score, efficiency_score, safety_score, customer_score)
         }
     
-    def _evaluate_delivery_completion(self, dispatches: List[Dispatch]) -> float:
-        """배송 완료율 평가 (0-100점)"""
-        total_orders = 0
-        completed_orders = 0
-        
-        for dispatch in dispatches:
-            for order in dispatch.orders:
-                total_orders += 1
-                if order.status == 'COMPLETED':
-                    completed_orders += 1
-        
-        if total_orders == 0:
-            return 100.0
-        
-        completion_rate = (completed_orders / total_orders) * 100
-        return completion_rate
-    
-    def _evaluate_on_time_delivery(self, dispatches: List[Dispatch]) -> float:
-        """정시 배송률 평가 (0-100점)"""
-        total_deliveries = 0
-        on_time_deliveries = 0
-        
-        for dispatch in dispatches:
-            for order in dispatch.orders:
-                if order.status == 'COMPLETED' and order.completed_at:
-                    total_deliveries += 1
-                    
-                    # 예상 배송 시간과 실제 배송 시간 비교
-                    if order.expected_delivery_time:
-                        # 30분 허용 오차
-                        deadline = order.expected_delivery_time + timedelta(minutes=30)
-                        if order.completed_at <= deadline:
-                            on_time_deliveries += 1
-                    else:
-                        # 예상 시간이 없으면 정시로 간주
-                        on_time_deliveries += 1
-        
-        if total_deliveries == 0:
-            return 100.0
-        
-        on_time_rate = (on_time_deliveries / total_deliveries) * 100
-        return on_time_rate
-    
-    def _evaluate_efficiency(self, dispatches: List[Dispatch]) -> float:
-        """효율성 평가 (0-100점)"""
-        if not dispatches:
-            return 0
-        
-        efficiency_scores = []
-        
-        for dispatch in dispatches:
-            # 시간당 배송 건수
-            if hasattr(dispatch, 'started_at') and hasattr(dispatch, 'completed_at'):
-                if dispatch.completed_at and dispatch.started_at:
-                    duration_hours = (dispatch.completed_at - dispatch.started_at).total_seconds() / 3600
-                    deliveries_count = len(dispatch.orders)
-                    
-                    if duration_hours > 0:
-                        deliveries_per_hour = deliveries_count / duration_hours
-                        # 시간당 3건 이상이면 만점
-                        score = min((deliveries_per_hour / 3) * 100, 100)
-                        efficiency_scores.append(score)
-        
-        if not efficiency_scores:
-            # 대안: 배차당 평균 주문 수 기준
-            avg_orders_per_dispatch = sum(len(d.orders) for d in dispatches) / len(dispatches)
-            # 배차당 5건 이상이면 만점
-            return min((avg_orders_per_dispatch / 5) * 100, 100)
-        
-        return np.mean(efficiency_scores)
-    
-    def _evaluate_safety(self, dispatches: List[Dispatch], driver_id: int) -> float:
-        """
-        안전 운전 평가 (0-100점)
-        
-        실제로는 다음 데이터 필요:
-        - 속도 위반 기록
-        - 급정거/급가속 횟수
-        - 사고 기록
-        - GPS 데이터 분석
-        
-        현재는 간단한 추정치 사용
-        """
-        # 사고/위반 기록이 없다고 가정
-        base_score = 100.0
-        
-        # 배송 지연이 안전 문제의 간접 지표일 수 있음
-        delayed_deliveries = 0
-        total_deliveries = 0
-        
-        for dispatch in dispatches:
-            for order in dispatch.orders:
-                if order.status == 'COMPLETED' and order.completed_at:
-                    total_deliveries += 1
-                    if order.expected_delivery_time:
-                        # 1시간 이상 지연
-                        if order.completed_at > order.expected_delivery_time + timedelta(hours=1):
-                            delayed_deliveries += 1
-        
-        if total_deliveries > 0:
-            delay_rate = delayed_deliveries / total_deliveries
-            # 지연율이 높으면 점수 감점
-            penalty = delay_rate * 20  # 최대 20점 감점
-            base_score -= penalty
-        
-        return max(base_score, 60)  # 최소 60점
-    
-    def _evaluate_customer_satisfaction(self, dispatches: List[Dispatch]) -> float:
-        """
-        고객 만족도 평가 (0-100점)
-        
-        실제로는 고객 피드백/평점 데이터 필요
-        현재는 배송 완료율과 정시 배송률 기반 추정
-        """
-        # 배송 완료율
-        completion_score = self._evaluate_delivery_completion(dispatches)
-        
-        # 정시 배송률
-        on_time_score = self._evaluate_on_time_delivery(dispatches)
-        
-        # 가중 평균
-        satisfaction_score = (completion_score * 0.5 + on_time_score * 0.5)
-        
-        return satisfaction_score
-    
     def _determine_grade(self, score: float) -> str:
         """점수에 따른 등급 결정"""
-        if score >= 90:
-            return 'S (우수)'
-        elif score >= 80:
-            return 'A (양호)'
-        elif score >= 70:
-            return 'B (보통)'
-        elif score >= 60:
-            return 'C (개선 필요)'
-        else:
-            return 'D (긴급 개선 필요)'
+        return grade_for(score, DRIVER_GRADES, DRIVER_GRADE_FLOOR)
     
     def _identify_strengths(
         self,
@@ -299,36 +144,27 @@ class DriverEvaluationSystem:
     def get_driver_rankings(
         self,
         start_date: datetime,
-        end_date: datetime
+        end_date: datetime,
+        limit: Optional[int] = None
     ) -> List[Dict]:
         """
         전체 운전자 랭킹
         
+        Args:
+            limit: 상위 N명만 반환 (None 이면 전체)
+        
         Returns:
             운전자별 성과 순위
         """
-        drivers = self.db.query(User).filter(User.role == 'DRIVER').all()
+        ranked = self.ranking.driver_rankings(start_date, end_date, limit=limit)
         
         driver_evaluations = []
+        for row in ranked.to_dict('records'):
+            evaluation = self._to_evaluation(row, start_date, end_date)
+            evaluation['rank'] = int(row['rank'])
+            driver_evaluations.append(evaluation)
         
-        for driver in drivers:
-            evaluation = self.evaluate_driver(driver.id, start_date, end_date)
-            
-            if 'error' not in evaluation and 'message' not in evaluation:
-                driver_evaluations.append(evaluation)
-        
-        # 종합 점수 기준 정렬
-        ranked_drivers = sorted(
-            driver_evaluations,
-            key=lambda x: x['overall_score'],
-            reverse=True
-        )
-        
-        # 순위 추가
-        for i, driver in enumerate(ranked_drivers, 1):
-            driver['rank'] = i
-        
-        return ranked_drivers
+        return driver_evaluations
     
     def get_improvement_recommendations(
         self,
@@ -2,14 +2,361 @@
 동적 재배차 알고리즘
 실시간 상황 변화(지연, 고장, 신규 주문)에 대응하여 배차를 동적으로 재조정
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Any
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import logging
+import time
 from ortools.constraint_solver import routing_enums_pb2, pywrapcp
 
+from app.services.distance_matrix import get_distance_matrix_engine
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class RouteStop:
+    """재최적화 대상 정류장 (상차/하차)"""
+    key: str  # 정류장 식별자 (예: "123:pickup")
+    order_id: Optional[int]
+    stop_type: str  # 'pickup' | 'delivery'
+    latitude: float
+    longitude: float
+    pallets: int = 0
+    time_window_start: int = 0  # minutes from start of day
+    time_window_end: int = 1440
+    service_time: int = 30  # minutes
+
+
+@dataclass
+class VehicleTail:
+    """차량의 남은 경로 (완료 정류장 제외)"""
+    vehicle_id: int
+    start: Tuple[float, float]  # 마지막 완료 지점 또는 현재 위치 (lat, lon)
+    end: Tuple[float, float]  # 복귀 지점 (lat, lon)
+    max_pallets: int
+    onboard_pallets: int = 0  # 이미 상차된 팔레트 수
+    stops: List[RouteStop] = field(default_factory=list)  # 미완료 정류장 (현재 계획 순서)
+    start_time: int = 0  # 현재 시각 (minutes from start of day)
+    end_time: int = 2880
+
+
+class IncrementalReoptimizer:
+    """
+    증분 재최적화 엔진 (Warm start)
+    
+    현재 계획(차량별 남은 정류장 순서)을 ReadAssignmentFromRoutes 로 초기해로 넣고
+    신규 정류장만 미배정 상태에서 시작하여 지역 탐색으로 삽입합니다.
+    - 완료된 정류장은 모델에 포함하지 않음 (차량 시작점 = 마지막 완료 지점)
+    - 상차 완료(적재 중) 주문의 하차는 해당 차량에 고정
+    - 시간창 상한은 soft 제약 (지연으로 현재 계획이 시간창을 어겨도 초기해로 사용 가능)
+    - 호출자가 넘긴 차량(영향 차량)만 재계획, 나머지 차량 경로는 그대로 유지
+    """
+    
+    def __init__(
+        self,
+        avg_speed_kmh: float = 40.0,
+        unassigned_penalty: int = 10_000_000,
+        late_penalty_per_minute: int = 1_000
+    ):
+        self.avg_speed_kmh = avg_speed_kmh
+        self.unassigned_penalty = unassigned_penalty
+        self.late_penalty_per_minute = late_penalty_per_minute
+    
+    @staticmethod
+    def select_affected_vehicles(
+        tails: List[VehicleTail],
+        new_stops: List[RouteStop],
+        max_vehicles: int = 5
+    ) -> List[VehicleTail]:
+        """신규 정류장과 가장 가까운 경로를 가진 차량 max_vehicles 대 선택"""
+        if not new_stops or len(tails) <= max_vehicles:
+            return list(tails)
+        
+        engine = get_distance_matrix_engine()
+        targets = [(s.latitude, s.longitude) for s in new_stops]
+        
+        def nearest_km(tail: VehicleTail) -> float:
+            points = [tail.start] + [(s.latitude, s.longitude) for s in tail.stops]
+            km = engine.haversine_km(points + targets)[:len(points), len(points):]
+            return float(km.min())
+        
+        return sorted(tails, key=nearest_km)[:max_vehicles]
+    
+    def reoptimize(
+        self,
+        tails: List[VehicleTail],
+        new_stops: List[RouteStop],
+        time_limit_ms: int = 500,
+        use_time_windows: bool = True
+    ) -> Dict[str, Any]:
+        """
+        영향 차량의 남은 경로에 신규 정류장 삽입 및 재배치
+        
+        Returns:
+            {
+                'routes': {vehicle_id: [{'key', 'arrival_time', 'load'}, ...]},
+                'distance_m': {vehicle_id: 남은 경로 거리},
+                'unassigned': [미배정 정류장 key],
+                'changed_vehicles': [경로가 바뀐 vehicle_id],
+                'warm_start': 초기해 사용 여부,
+                'solve_time_ms': 솔버 시간
+            }
+        """
+        started = time.perf_counter()
+        num_vehicles = len(tails)
+        if num_vehicles == 0:
+            return {
+                'routes': {}, 'distance_m': {}, 'unassigned': [s.key for s in new_stops],
+                'changed_vehicles': [], 'warm_start': False, 'solve_time_ms': 0.0
+            }
+        
+        # 노드: [차량별 시작점..., 차량별 종료점..., 기존 정류장..., 신규 정류장...]
+        coords = [t.start for t in tails] + [t.end for t in tails]
+        stops: List[RouteStop] = []
+        owner: Dict[str, int] = {}  # 기존 정류장 key → 차량 인덱스
+        for v, tail in enumerate(tails):
+            for stop in tail.stops:
+                owner[stop.key] = v
+                stops.append(stop)
+        stops.extend(new_stops)
+        coords += [(s.latitude, s.longitude) for s in stops]
+        
+        first_stop = 2 * num_vehicles
+        node_of = {stop.key: first_stop + i for i, stop in enumerate(stops)}
+        starts = list(range(num_vehicles))
+        ends = list(range(num_vehicles, 2 * num_vehicles))
+        
+        engine = get_distance_matrix_engine()
+        distance = engine.distance_matrix_m(coords).tolist()
+        travel = engine.time_matrix_min(coords, avg_speed_kmh=self.avg_speed_kmh).tolist()
+        service = [0] * first_stop + [s.service_time for s in stops]
+        demand = [0] * first_stop + [
+            s.pallets if s.stop_type == 'pickup' else -s.pallets for s in stops
+        ]
+        
+        manager = pywrapcp.RoutingIndexManager(len(coords), num_vehicles, starts, ends)
+        routing = pywrapcp.RoutingModel(manager)
+        solver = routing.solver()
+        
+        def distance_callback(from_index, to_index):
+            return distance[manager.IndexToNode(from_index)][manager.IndexToNode(to_index)]
+        
+        routing.SetArcCostEvaluatorOfAllVehicles(routing.RegisterTransitCallback(distance_callback))
+        
+        # 적재량: 시작 시 적재 중인 팔레트 반영
+        def demand_callback(from_index):
+            return demand[manager.IndexToNode(from_index)]
+        
+        routing.AddDimensionWithVehicleCapacity(
+            routing.RegisterUnaryTransitCallback(demand_callback),
+            0,
+            [t.max_pallets for t in tails],
+            False,
+            'Pallets'
+        )
+        pallet_dimension = routing.GetDimensionOrDie('Pallets')
+        for v, tail in enumerate(tails):
+            pallet_dimension.CumulVar(routing.Start(v)).SetValue(min(tail.onboard_pallets, tail.max_pallets))
+        
+        # 시간: 대기 허용, 차량 시작 시각 고정
+        def time_callback(from_index, to_index):
+            from_node = manager.IndexToNode(from_index)
+            return travel[from_node][manager.IndexToNode(to_index)] + service[from_node]
+        
+        horizon = max([t.end_time for t in tails] + [s.time_window_end for s in stops] + [1440]) + 1440
+        routing.AddDimension(routing.RegisterTransitCallback(time_callback), horizon, horizon, False, 'Time')
+        time_dimension = routing.GetDimensionOrDie('Time')
+        for v, tail in enumerate(tails):
+            time_dimension.CumulVar(routing.Start(v)).SetValue(tail.start_time)
+        
+        if use_time_windows:
+            for stop in stops:
+                index = manager.NodeToIndex(node_of[stop.key])
+                time_dimension.CumulVar(index).SetMin(stop.time_window_start)
+                time_dimension.SetCumulVarSoftUpperBound(index, stop.time_window_end, self.late_penalty_per_minute)
+        
+        # 상차-하차 쌍 (같은 차량, 상차 먼저)
+        pickups = {s.order_id: s for s in stops if s.stop_type == 'pickup' and s.order_id is not None}
+        for stop in stops:
+            if stop.stop_type != 'delivery':
+                continue
+            delivery_index = manager.NodeToIndex(node_of[stop.key])
+            pickup = pickups.get(stop.order_id)
+            if pickup is not None:
+                pickup_index = manager.NodeToIndex(node_of[pickup.key])
+                routing.AddPickupAndDelivery(pickup_index, delivery_index)
+                solver.Add(routing.VehicleVar(pickup_index) == routing.VehicleVar(delivery_index))
+                solver.Add(time_dimension.CumulVar(pickup_index) <= time_dimension.CumulVar(delivery_index))
+            elif stop.key in owner:
+                # 이미 상차된 주문: 하차는 해당 차량에 고정
+                routing.VehicleVar(delivery_index).SetValue(owner[stop.key])
+        
+        # 신규 정류장은 미배정 허용 (큰 페널티) → 현재 계획이 그대로 초기해가 됨
+        for stop in new_stops:
+            routing.AddDisjunction([manager.NodeToIndex(node_of[stop.key])], self.unassigned_penalty)
+        
+        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
+        search_parameters.first_solution_strategy = (
+            routing_enums_pb2.FirstSolutionStrategy.PARALLEL_CHEAPEST_INSERTION
+        )
+        search_parameters.local_search_metaheuristic = (
+            routing_enums_pb2.LocalSearchMetaheuristic.GREEDY_DESCENT
+        )
+        search_parameters.time_limit.FromMilliseconds(time_limit_ms)
+        routing.CloseModelWithParameters(search_parameters)
+        
+        # 현재 계획 + 신규 정류장 최소비용 삽입을 초기해로 사용
+        seeded_routes = self._seed_insertions(tails, new_stops, distance, demand, node_of)
+        initial = routing.ReadAssignmentFromRoutes(
+            [[manager.NodeToIndex(node) for node in route] for route in seeded_routes], True
+        )
+        if initial is None:
+            # 삽입 초기해가 제약을 어기면 현재 계획만으로 시작 (신규 정류장은 지역 탐색으로 삽입)
+            initial = routing.ReadAssignmentFromRoutes(
+                [[manager.NodeToIndex(node_of[s.key]) for s in tail.stops] for tail in tails], True
+            )
+        if initial is not None:
+            solution = routing.SolveFromAssignmentWithParameters(initial, search_parameters)
+        else:
+            logger.warning("Current plan is not a valid initial assignment, solving from scratch")
+            solution = routing.SolveWithParameters(search_parameters)
+        
+        solve_time_ms = round((time.perf_counter() - started) * 1000, 1)
+        
+        if solution is None:
+            logger.error("No solution found for incremental reoptimization")
+            return {
+                'routes': {}, 'distance_m': {}, 'unassigned': [s.key for s in new_stops],
+                'changed_vehicles': [], 'warm_start': initial is not None, 'solve_time_ms': solve_time_ms
+            }
+        
+        routes: Dict[int, List[Dict[str, Any]]] = {}
+        distances: Dict[int, int] = {}
+        assigned = set()
+        changed = []
+        
+        for v, tail in enumerate(tails):
+            index = solution.Value(routing.NextVar(routing.Start(v)))
+            previous = routing.Start(v)
+            sequence = []
+            route_distance = distance_callback(previous, index)
+            
+            while not routing.IsEnd(index):
+                stop = stops[manager.IndexToNode(index) - first_stop]
+                sequence.append({
+                    'key': stop.key,
+                    'arrival_time': solution.Min(time_dimension.CumulVar(index)),
+                    'load': solution.Value(pallet_dimension.CumulVar(index)) + demand[manager.IndexToNode(index)]
+                })
+                assigned.add(stop.key)
+                previous, index = index, solution.Value(routing.NextVar(index))
+                route_distance += distance_callback(previous, index)
+            
+            routes[tail.vehicle_id] = sequence
+            distances[tail.vehicle_id] = route_distance
+            if [s['key'] for s in sequence] != [s.key for s in tail.stops]:
+                changed.append(tail.vehicle_id)
+        
+        unassigned = [s.key for s in new_stops if s.key not in assigned]
+        logger.info(
+            f"Incremental reoptimization: {num_vehicles} vehicles, {len(stops)} stops, "
+            f"changed={changed}, unassigned={len(unassigned)}, {solve_time_ms}ms "
+            f"(warm_start={initial is not None})"
+        )
+        
+        return {
+            'routes': routes,
+            'distance_m': distances,
+            'unassigned': unassigned,
+            'changed_vehicles': changed,
+            'warm_start': initial is not None,
+            'solve_time_ms': solve_time_ms
+        }
+
+
+    def _seed_insertions(
+        self,
+        tails: List[VehicleTail],
+        new_stops: List[RouteStop],
+        distance: List[List[int]],
+        demand: List[int],
+        node_of: Dict[str, int]
+    ) -> List[List[int]]:
+        """
+        신규 정류장을 현재 경로에 최소 거리 증가 위치로 삽입 (상차-하차 쌍은 함께, 상차 먼저)
+        
+        적재 용량을 넘는 위치는 제외하며, 넣을 곳이 없으면 미배정으로 둡니다.
+        """
+        num_vehicles = len(tails)
+        routes = [[node_of[s.key] for s in tail.stops] for tail in tails]
+        
+        groups: Dict[Any, List[RouteStop]] = {}
+        for stop in new_stops:
+            groups.setdefault(stop.order_id if stop.order_id is not None else stop.key, []).append(stop)
+        
+        for group in groups.values():
+            group.sort(key=lambda s: 0 if s.stop_type == 'pickup' else 1)
+            nodes = [node_of[s.key] for s in group]
+            best = None  # (delta, vehicle, positions)
+            
+            for v, tail in enumerate(tails):
+                path = [v] + routes[v] + [num_vehicles + v]
+                loads = [tail.onboard_pallets]
+                for node in routes[v]:
+                    loads.append(loads[-1] + demand[node])
+                
+                if len(nodes) == 1:
+                    for i in range(len(path) - 1):
+                        a, b = path[i], path[i + 1]
+                        if max(loads[i:]) + demand[nodes[0]] > tail.max_pallets:
+                            continue
+                        delta = distance[a][nodes[0]] + distance[nodes[0]][b] - distance[a][b]
+                        if best is None or delta < best[0]:
+                            best = (delta, v, (i,))
+                    continue
+                
+                p, d = nodes[0], nodes[1]
+                for i in range(len(path) - 1):
+                    for j in range(i, len(path) - 1):
+                        if max(loads[i:j + 1]) + demand[p] > tail.max_pallets:
+                            break
+                        if i == j:
+                            a, b = path[i], path[i + 1]
+                            delta = distance[a][p] + distance[p][d] + distance[d][b] - distance[a][b]
+                        else:
+                            a, b = path[i], path[i + 1]
+                            c, e = path[j], path[j + 1]
+                            delta = (
+                                distance[a][p] + distance[p][b] - distance[a][b]
+                                + distance[c][d] + distance[d][e] - distance[c][e]
+                            )
+                        if best is None or delta < best[0]:
+                            best = (delta, v, (i, j))
+            
+            if best is None:
+                continue
+            _, v, positions = best
+            if len(positions) == 1:
+                routes[v].insert(positions[0], nodes[0])
+            else:
+                i, j = positions
+                routes[v].insert(j, nodes[1])
+                routes[v].insert(i, nodes[0])
+        
+        return routes
+
+
+def reoptimize_incremental(
+    tails: List[VehicleTail],
+    new_stops: List[RouteStop],
+    time_limit_ms: int = 500,
+    use_time_windows: bool = True
+) -> Dict[str, Any]:
+    """증분 재최적화 (솔버 프로세스 풀에서 실행되는 최상위 함수)"""
+    return IncrementalReoptimizer().reoptimize(tails, new_stops, time_limit_ms, use_time_windows)
+
+
 class DynamicRedispatcher:
     """동적 재배차 엔진"""
     
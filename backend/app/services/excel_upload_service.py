@@ -1,7 +1,9 @@
+import asyncio
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
 from datetime import datetime
 from io import BytesIO
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
 from app.models.client import Client, ClientType
@@ -12,307 +14,520 @@ from app.services.excel_template_service import ExcelTemplateService
 from loguru import logger
 
 
+# progress(처리 행 수, 전체 행 수)
+ProgressCallback = Callable[[int, int], None]
+
+
 class ExcelUploadService:
     """
     Service for uploading data from Excel files
-    
+
     This service uses column mappings from ExcelTemplateService to ensure
     consistency between template generation and data upload.
+
+    Uploads run as a set-based pipeline:
+    1. Parse the whole sheet into a DataFrame (vectorized type conversion)
+    2. Preload existing keys / referenced client codes with chunked IN queries
+    3. Validate every row with DataFrame masks (first error per row is reported)
+    4. Insert valid rows with multi-row INSERTs, committing per chunk
     """
-    
+
+    CHUNK_SIZE = 1000  # 다중 행 INSERT / 커밋 단위
+    LOOKUP_CHUNK_SIZE = 1000  # IN (...) 조회 1회당 값 수
+    GEOCODE_CONCURRENCY = 5  # 거래처 지오코딩 동시 요청 수
+
+    # ==================== 공통 ====================
+
     @staticmethod
-    def parse_client_excel(file_content: bytes) -> List[Dict[str, Any]]:
-        """Parse client data from Excel file"""
+    def _read_frame(file_content: bytes, entity_type: str, key: str) -> pd.DataFrame:
+        """
+        엑셀 → DataFrame (템플릿 한글 헤더를 필드명으로 변환, 키가 빈 행 제외)
+
+        index 는 원본 행 순서를 유지하므로 엑셀 행 번호는 index + 2 (헤더 1행) 입니다.
+        """
         try:
             df = pd.read_excel(BytesIO(file_content))
-            
-            # Use centralized column mapping from template service
-            column_mapping = ExcelTemplateService.get_korean_to_field_mapping("clients")
-            
-            df = df.rename(columns=column_mapping)
-            
-            # Filter out example rows and empty rows
-            df = df[df['code'].notna()]  # Remove rows with empty code
-            df = df[~df['code'].astype(str).str.startswith('예시-')]  # Remove example rows
-            
-            # Convert client_type
-            df['client_type'] = df['client_type'].replace({
-                '상차': ClientType.PICKUP,
-                '하차': ClientType.DELIVERY,
-                '양쪽': ClientType.BOTH
-            })
-            
-            # Convert forklift_operator_available
-            df['forklift_operator_available'] = df['forklift_operator_available'].fillna('N').str.upper() == 'Y'
-            
-            # Fill defaults
-            df['loading_time_minutes'] = df['loading_time_minutes'].fillna(30).astype(int)
-            
-            # Convert to list of dicts
-            records = df.to_dict(orient='records')
-            
-            logger.info(f"Parsed {len(records)} client records from Excel")
-            return records
-            
         except Exception as e:
-            logger.error(f"Error parsing client Excel: {e}")
+            logger.error(f"Error reading {entity_type} Excel: {e}")
             raise ValueError(f"엑셀 파일 파싱 오류: {str(e)}")
-    
+
+        df = df.rename(columns=ExcelTemplateService.get_korean_to_field_mapping(entity_type))
+        if key not in df.columns:
+            raise ValueError(f"엑셀 파일 파싱 오류: 필수 컬럼 누락 ({key})")
+
+        df = df[df[key].notna()].copy()
+        df[key] = df[key].astype(str).str.strip()
+        return df[df[key] != ""]
+
     @staticmethod
-    async def upload_clients(
+    def _column(df: pd.DataFrame, name: str) -> pd.Series:
+        """컬럼 (없으면 빈 값)"""
+        if name in df.columns:
+            return df[name]
+        return pd.Series(None, index=df.index, dtype=object)
+
+    @staticmethod
+    def _flag_mask(errors: pd.Series, mask: pd.Series, message: str) -> pd.Series:
+        """아직 오류가 없는 행 중 mask 인 행에 오류 메시지 기록 (행별 첫 오류만 보고)"""
+        errors[mask & errors.isna()] = message
+        return errors
+
+    @staticmethod
+    def _yes_no(series: pd.Series, default: str) -> pd.Series:
+        return series.fillna(default).astype(str).str.strip().str.upper() == "Y"
+
+    @staticmethod
+    def _enum(series: pd.Series, mapping: Dict[str, Any]) -> pd.Series:
+        """한글 라벨 / 값 / 이름 → Enum (알 수 없는 값은 NaN)"""
+        lookup = dict(mapping)
+        for member in set(mapping.values()):
+            lookup.setdefault(member.value, member)
+            lookup.setdefault(member.name, member)
+        return series.astype(str).str.strip().map(lookup)
+
+    @staticmethod
+    def _times(series: pd.Series) -> pd.Series:
+        """HH:MM 문자열 / 엑셀 시간 → datetime.time (빈 값 None, 형식 오류 NaT 유지)"""
+        text = series.where(series.isna(), series.astype(str).str.strip())
+        parsed = pd.to_datetime(text, format="mixed", errors="coerce")
+        return parsed.dt.time.astype(object).where(parsed.notna(), None)
+
+    @staticmethod
+    def _invalid(original: pd.Series, converted: pd.Series) -> pd.Series:
+        """값이 있었지만 변환에 실패한 행"""
+        return original.notna() & (original.astype(str).str.strip() != "") & converted.isna()
+
+    @classmethod
+    def _existing(cls, db: Session, column, values: Iterable[Any]) -> set:
+        """column 값 중 DB 에 이미 있는 값 (IN 조회, LOOKUP_CHUNK_SIZE 단위)"""
+        values = list({value for value in values if value is not None and not pd.isna(value)})
+        found = set()
+        for start in range(0, len(values), cls.LOOKUP_CHUNK_SIZE):
+            chunk = values[start:start + cls.LOOKUP_CHUNK_SIZE]
+            found.update(db.execute(select(column).where(column.in_(chunk))).scalars())
+        return found
+
+    @classmethod
+    def _client_ids(cls, db: Session, codes: Iterable[str]) -> Dict[str, int]:
+        """거래처 코드 → ID (IN 조회, LOOKUP_CHUNK_SIZE 단위)"""
+        codes = list({code for code in codes if code})
+        ids: Dict[str, int] = {}
+        for start in range(0, len(codes), cls.LOOKUP_CHUNK_SIZE):
+            chunk = codes[start:start + cls.LOOKUP_CHUNK_SIZE]
+            ids.update(db.execute(select(Client.code, Client.id).where(Client.code.in_(chunk))).all())
+        return ids
+
+    @staticmethod
+    def _records(df: pd.DataFrame, columns: List[str]) -> List[Dict[str, Any]]:
+        """INSERT 용 dict 목록 (NaN/NaT → None)"""
+        frame = df[[column for column in columns if column in df.columns]].astype(object)
+        return frame.where(frame.notna(), None).to_dict(orient="records")
+
+    @classmethod
+    def _insert_valid(
+        cls,
         db: Session,
-        file_content: bytes,
-        auto_geocode: bool = True
-    ) -> Dict[str, Any]:
-        """Upload clients from Excel file"""
-        records = ExcelUploadService.parse_client_excel(file_content)
-        
-        created = []
-        errors = []
-        
-        for idx, record in enumerate(records):
+        model,
+        df: pd.DataFrame,
+        errors: pd.Series,
+        key: str,
+        columns: List[str],
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[List[str], pd.Series]:
+        """
+        오류 없는 행을 CHUNK_SIZE 단위 다중 행 INSERT 로 저장 (청크마다 커밋)
+
+        청크 저장에 실패하면 해당 청크만 롤백하고 각 행을 오류로 보고합니다.
+
+        Returns:
+            (저장된 키 목록, 갱신된 행별 오류)
+        """
+        valid = df[errors.isna()]
+        total = len(df)
+        created: List[str] = []
+        done = total - len(valid)
+        if progress:
+            progress(done, total)
+
+        for start in range(0, len(valid), cls.CHUNK_SIZE):
+            chunk = valid.iloc[start:start + cls.CHUNK_SIZE]
             try:
-                # Check if client already exists
-                existing = db.query(Client).filter(Client.code == record['code']).first()
-                if existing:
-                    errors.append({
-                        "row": idx + 2,  # Excel row (header + 1)
-                        "code": record['code'],
-                        "error": "이미 존재하는 거래처 코드"
-                    })
-                    continue
-                
-                # Create client
-                client = Client(**record)
-                db.add(client)
-                db.flush()
-                
-                # Auto geocode if enabled
-                if auto_geocode and record.get('address'):
-                    naver_service = NaverMapService()
-                    lat, lon, error = await naver_service.geocode_address(record['address'])
-                    
-                    if lat and lon:
-                        client.latitude = lat
-                        client.longitude = lon
-                        client.geocoded = True
-                    else:
-                        client.geocode_error = error
-                
-                created.append(client.code)
-                
+                db.execute(insert(model), cls._records(chunk, columns))
+                db.commit()
+                created.extend(chunk[key].tolist())
             except Exception as e:
-                errors.append({
-                    "row": idx + 2,
-                    "code": record.get('code', 'Unknown'),
-                    "error": str(e)
-                })
-        
-        db.commit()
-        
+                db.rollback()
+                logger.error(f"{model.__tablename__} 일괄 저장 실패 ({len(chunk)}건): {e}")
+                errors[chunk.index] = f"저장 실패: {str(e).splitlines()[0]}"
+            done += len(chunk)
+            if progress:
+                progress(done, total)
+
+        return created, errors
+
+    @staticmethod
+    def _result(df: pd.DataFrame, errors: pd.Series, created: List[str], key: str) -> Dict[str, Any]:
+        failed = errors[errors.notna()]
         return {
-            "total": len(records),
+            "total": len(df),
             "created": len(created),
-            "failed": len(errors),
+            "failed": len(failed),
             "created_codes": created,
-            "errors": errors
+            "errors": [
+                {
+                    "row": int(index) + 2,  # Excel row (header + 1)
+                    key: df.at[index, key],
+                    "error": message
+                }
+                for index, message in failed.items()
+            ]
         }
-    
+
+    # ==================== 거래처 ====================
+
+    CLIENT_TYPES = {
+        '상차': ClientType.PICKUP,
+        '하차': ClientType.DELIVERY,
+        '양쪽': ClientType.BOTH
+    }
+
+    @classmethod
+    def _client_frame(cls, file_content: bytes) -> Tuple[pd.DataFrame, pd.Series]:
+        """거래처 시트 파싱 및 형식 검증 → (DataFrame, 행별 오류)"""
+        df = cls._read_frame(file_content, "clients", "code")
+        df = df[~df['code'].str.startswith('예시-')]  # Remove example rows
+        errors = pd.Series(None, index=df.index, dtype=object)
+
+        raw_type = cls._column(df, 'client_type')
+        df['client_type'] = cls._enum(raw_type, cls.CLIENT_TYPES)
+        df['forklift_operator_available'] = cls._yes_no(cls._column(df, 'forklift_operator_available'), 'N')
+        loading = pd.to_numeric(cls._column(df, 'loading_time_minutes'), errors='coerce')
+        df['loading_time_minutes'] = loading.fillna(30).astype(int)
+        for column in ('pickup_start_time', 'pickup_end_time', 'delivery_start_time', 'delivery_end_time'):
+            times = cls._times(cls._column(df, column))
+            errors = cls._flag_mask(errors, cls._invalid(cls._column(df, column), times), "시간 형식 오류 (HH:MM)")
+            df[column] = times.map(lambda value: value.strftime("%H:%M") if value else None)
+
+        errors = cls._flag_mask(errors, cls._column(df, 'name').isna(), "거래처명 누락")
+        errors = cls._flag_mask(errors, df['client_type'].isna(), "구분 값 오류 (상차/하차/양쪽)")
+        errors = cls._flag_mask(errors, cls._column(df, 'address').isna(), "주소 누락")
+        errors = cls._flag_mask(errors, df['code'].duplicated(), "파일 내 중복 거래처 코드")
+        return df, errors
+
+    @staticmethod
+    def parse_client_excel(file_content: bytes) -> List[Dict[str, Any]]:
+        """Parse client data from Excel file"""
+        df, _ = ExcelUploadService._client_frame(file_content)
+        records = ExcelUploadService._records(df, list(df.columns))
+        logger.info(f"Parsed {len(records)} client records from Excel")
+        return records
+
+    @staticmethod
+    async def upload_clients(
+        db: Session,
+        file_content: bytes,
+        auto_geocode: bool = True,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """Upload clients from Excel file (파싱/저장은 스레드에서, 지오코딩은 저장 후 동시 요청)"""
+        cls = ExcelUploadService
+        df, errors, created = await asyncio.to_thread(cls._insert_clients, db, file_content, progress)
+
+        if auto_geocode and created:
+            await cls._geocode_clients(db, created)
+
+        return cls._result(df, errors, created, "code")
+
+    @classmethod
+    def _insert_clients(
+        cls,
+        db: Session,
+        file_content: bytes,
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[pd.DataFrame, pd.Series, List[str]]:
+        """거래처 파싱/검증/저장 (블로킹) → (DataFrame, 행별 오류, 생성된 코드)"""
+        df, errors = cls._client_frame(file_content)
+        existing = cls._existing(db, Client.code, df['code'])
+        errors = cls._flag_mask(errors, df['code'].isin(existing), "이미 존재하는 거래처 코드")
+
+        created, errors = cls._insert_valid(
+            db, Client, df, errors, "code", [column.key for column in Client.__table__.columns], progress
+        )
+        return df, errors, created
+
+    @classmethod
+    async def _geocode_clients(cls, db: Session, codes: List[str]):
+        """신규 거래처 주소 지오코딩 (주소별 1회, GEOCODE_CONCURRENCY 동시 요청, 결과 일괄 UPDATE)"""
+        def load():
+            return db.execute(
+                select(Client.id, Client.address).where(Client.code.in_(codes), Client.address.isnot(None))
+            ).all()
+
+        def save(updates: List[Dict[str, Any]]):
+            db.execute(update(Client), updates)
+            db.commit()
+
+        # 조회/UPDATE 는 스레드에서, 지오코딩 요청만 이벤트 루프에서 동시 실행
+        clients = await asyncio.to_thread(load)
+        addresses = {address for _, address in clients if address}
+        if not addresses:
+            return
+
+        naver_service = NaverMapService()
+        semaphore = asyncio.Semaphore(cls.GEOCODE_CONCURRENCY)
+
+        async def geocode(address: str):
+            async with semaphore:
+                try:
+                    return address, await naver_service.geocode_address(address)
+                except Exception as e:
+                    logger.warning(f"Geocoding failed for {address}: {e}")
+                    return address, None
+
+        coordinates = dict(await asyncio.gather(*(geocode(address) for address in addresses)))
+
+        updates = []
+        for client_id, address in clients:
+            coordinate = coordinates.get(address)
+            if coordinate:
+                updates.append({
+                    "id": client_id, "latitude": coordinate[0], "longitude": coordinate[1],
+                    "geocoded": True, "geocode_error": None
+                })
+            else:
+                updates.append({
+                    "id": client_id, "latitude": None, "longitude": None,
+                    "geocoded": False, "geocode_error": "주소 좌표 변환 실패"
+                })
+        await asyncio.to_thread(save, updates)
+        logger.info(f"Geocoded {sum(1 for row in updates if row['geocoded'])}/{len(updates)} uploaded clients")
+
+    # ==================== 차량 ====================
+
+    VEHICLE_TYPES = {
+        '냉동': VehicleType.FROZEN,
+        '냉장': VehicleType.REFRIGERATED,
+        '겸용': VehicleType.DUAL,
+        '상온': VehicleType.AMBIENT
+    }
+
+    VEHICLE_STATUSES = {
+        '운행가능': VehicleStatus.AVAILABLE,
+        '운행중': VehicleStatus.IN_USE,
+        '정비중': VehicleStatus.MAINTENANCE,
+        '운행불가': VehicleStatus.OUT_OF_SERVICE
+    }
+
+    @classmethod
+    def _vehicle_frame(cls, file_content: bytes) -> Tuple[pd.DataFrame, pd.Series]:
+        """차량 시트 파싱 및 형식 검증 → (DataFrame, 행별 오류)"""
+        df = cls._read_frame(file_content, "vehicles", "code")
+        df = df[~df['code'].str.contains('예시-|TRUCK-001', regex=True)]  # Remove example rows
+        errors = pd.Series(None, index=df.index, dtype=object)
+
+        df['forklift_operator_available'] = cls._yes_no(cls._column(df, 'forklift_operator_available'), 'N')
+        df['vehicle_type'] = cls._enum(cls._column(df, 'vehicle_type'), cls.VEHICLE_TYPES)
+        raw_status = cls._column(df, 'status')
+        df['status'] = cls._enum(raw_status.fillna('운행가능'), cls.VEHICLE_STATUSES)
+
+        df['plate_number'] = cls._column(df, 'plate_number').astype(object)
+        df['plate_number'] = df['plate_number'].where(df['plate_number'].isna(), df['plate_number'].astype(str).str.strip())
+        device = cls._column(df, 'uvis_device_id')
+        df['uvis_device_id'] = device.where(device.isna(), device.astype(str).str.strip())
+        df['uvis_enabled'] = df['uvis_device_id'].notna()  # Set UVIS enabled if device ID exists
+
+        for column in ('max_pallets', 'max_weight_kg'):
+            values = pd.to_numeric(cls._column(df, column), errors='coerce')
+            errors = cls._flag_mask(errors, values.isna(), f"{column} 값 누락 또는 형식 오류")
+            df[column] = values
+        df['max_pallets'] = df['max_pallets'].astype('Int64')
+
+        errors = cls._flag_mask(errors, df['plate_number'].isna(), "차량번호 누락")
+        errors = cls._flag_mask(errors, df['vehicle_type'].isna(), "차량타입 값 오류 (냉동/냉장/겸용/상온)")
+        errors = cls._flag_mask(errors, df['status'].isna(), "차량상태 값 오류")
+        errors = cls._flag_mask(errors, df['code'].duplicated(), "파일 내 중복 차량 코드")
+        errors = cls._flag_mask(errors, df['plate_number'].notna() & df['plate_number'].duplicated(), "파일 내 중복 차량번호")
+        errors = cls._flag_mask(
+            errors, df['uvis_device_id'].notna() & df['uvis_device_id'].duplicated(), "파일 내 중복 UVIS 단말기 ID"
+        )
+        return df, errors
+
     @staticmethod
     def parse_vehicle_excel(file_content: bytes) -> List[Dict[str, Any]]:
         """Parse vehicle data from Excel file"""
-        try:
-            df = pd.read_excel(BytesIO(file_content))
-            
-            # Use centralized column mapping from template service
-            column_mapping = ExcelTemplateService.get_korean_to_field_mapping("vehicles")
-            
-            df = df.rename(columns=column_mapping)
-            
-            # Filter out example rows and empty rows
-            df = df[df['code'].notna()]  # Remove rows with empty code
-            df = df[~df['code'].astype(str).str.contains('예시-|TRUCK-001', regex=True)]  # Remove example rows
-            
-            # Convert forklift_operator_available (Y/N to boolean)
-            if 'forklift_operator_available' in df.columns:
-                df['forklift_operator_available'] = df['forklift_operator_available'].fillna('N').str.upper() == 'Y'
-            else:
-                df['forklift_operator_available'] = False
-            
-            # Convert vehicle_type
-            df['vehicle_type'] = df['vehicle_type'].replace({
-                '냉동': VehicleType.FROZEN,
-                '냉장': VehicleType.REFRIGERATED,
-                '겸용': VehicleType.DUAL,
-                '상온': VehicleType.AMBIENT
-            })
-            
-            # Convert status
-            status_mapping = {
-                '운행가능': VehicleStatus.AVAILABLE,
-                '운행중': VehicleStatus.IN_USE,
-                '정비중': VehicleStatus.MAINTENANCE,
-                '운행불가': VehicleStatus.OUT_OF_SERVICE
-            }
-            df['status'] = df['status'].fillna('운행가능').replace(status_mapping)
-            
-            # Set UVIS enabled if device ID exists
-            df['uvis_enabled'] = df['uvis_device_id'].notna()
-            
-            records = df.to_dict(orient='records')
-            
-            logger.info(f"Parsed {len(records)} vehicle records from Excel")
-            return records
-            
-        except Exception as e:
-            logger.error(f"Error parsing vehicle Excel: {e}")
-            raise ValueError(f"엑셀 파일 파싱 오류: {str(e)}")
-    
+        df, _ = ExcelUploadService._vehicle_frame(file_content)
+        records = ExcelUploadService._records(df, list(df.columns))
+        logger.info(f"Parsed {len(records)} vehicle records from Excel")
+        return records
+
     @staticmethod
-    def upload_vehicles(db: Session, file_content: bytes) -> Dict[str, Any]:
+    def upload_vehicles(
+        db: Session,
+        file_content: bytes,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
         """Upload vehicles from Excel file"""
-        records = ExcelUploadService.parse_vehicle_excel(file_content)
-        
-        created = []
-        errors = []
-        
-        for idx, record in enumerate(records):
-            try:
-                # Check if vehicle already exists
-                existing = db.query(Vehicle).filter(Vehicle.code == record['code']).first()
-                if existing:
-                    errors.append({
-                        "row": idx + 2,
-                        "code": record['code'],
-                        "error": "이미 존재하는 차량 코드"
-                    })
-                    continue
-                
-                vehicle = Vehicle(**record)
-                db.add(vehicle)
-                created.append(vehicle.code)
-                
-            except Exception as e:
-                errors.append({
-                    "row": idx + 2,
-                    "code": record.get('code', 'Unknown'),
-                    "error": str(e)
-                })
-        
-        db.commit()
-        
-        return {
-            "total": len(records),
-            "created": len(created),
-            "failed": len(errors),
-            "created_codes": created,
-            "errors": errors
-        }
-    
+        cls = ExcelUploadService
+        df, errors = cls._vehicle_frame(file_content)
+
+        errors = cls._flag_mask(errors, df['code'].isin(cls._existing(db, Vehicle.code, df['code'])), "이미 존재하는 차량 코드")
+        errors = cls._flag_mask(
+            errors, df['plate_number'].isin(cls._existing(db, Vehicle.plate_number, df['plate_number'])),
+            "이미 존재하는 차량번호"
+        )
+        errors = cls._flag_mask(
+            errors, df['uvis_device_id'].isin(cls._existing(db, Vehicle.uvis_device_id, df['uvis_device_id'])),
+            "이미 등록된 UVIS 단말기 ID"
+        )
+
+        created, errors = cls._insert_valid(
+            db, Vehicle, df, errors, "code", [column.key for column in Vehicle.__table__.columns], progress
+        )
+        return cls._result(df, errors, created, "code")
+
+    # ==================== 주문 ====================
+
+    TEMPERATURE_ZONES = {
+        '냉동': TemperatureZone.FROZEN,
+        '냉장': TemperatureZone.REFRIGERATED,
+        '상온': TemperatureZone.AMBIENT
+    }
+
+    @classmethod
+    def _order_frame(cls, file_content: bytes) -> Tuple[pd.DataFrame, pd.Series]:
+        """주문 시트 파싱 및 형식 검증 → (DataFrame, 행별 오류)"""
+        df = cls._read_frame(file_content, "orders", "order_number")
+        df = df[~df['order_number'].str.contains('예시-|ORD-', regex=True)]  # Remove example rows
+        errors = pd.Series(None, index=df.index, dtype=object)
+
+        # Convert dates
+        raw_date = cls._column(df, 'order_date')
+        df['order_date'] = pd.to_datetime(raw_date, errors='coerce').dt.date
+        raw_requested = cls._column(df, 'requested_delivery_date')
+        df['requested_delivery_date'] = pd.to_datetime(raw_requested, errors='coerce').dt.date
+        errors = cls._flag_mask(errors, df['order_date'].isna(), "주문일자 누락 또는 형식 오류")
+        errors = cls._flag_mask(errors, cls._invalid(raw_requested, df['requested_delivery_date']), "희망배송일 형식 오류")
+
+        df['temperature_zone'] = cls._enum(cls._column(df, 'temperature_zone'), cls.TEMPERATURE_ZONES)
+        errors = cls._flag_mask(errors, df['temperature_zone'].isna(), "온도대 값 오류 (냉동/냉장/상온)")
+
+        pallets = pd.to_numeric(cls._column(df, 'pallet_count'), errors='coerce')
+        errors = cls._flag_mask(errors, pallets.isna(), "팔레트 수 누락 또는 형식 오류")
+        df['pallet_count'] = pallets.astype('Int64')
+        df['volume_cbm'] = pd.to_numeric(cls._column(df, 'volume_cbm'), errors='coerce')
+
+        for column in ('pickup_start_time', 'pickup_end_time', 'delivery_start_time', 'delivery_end_time'):
+            times = cls._times(cls._column(df, column))
+            errors = cls._flag_mask(errors, cls._invalid(cls._column(df, column), times), "시간 형식 오류 (HH:MM)")
+            df[column] = times
+
+        # Convert boolean fields
+        df['requires_forklift'] = cls._yes_no(cls._column(df, 'requires_forklift'), 'N')
+        df['is_stackable'] = cls._yes_no(cls._column(df, 'is_stackable'), 'Y')
+
+        # Fill defaults
+        df['priority'] = pd.to_numeric(cls._column(df, 'priority'), errors='coerce').fillna(5).astype(int)
+
+        for column in ('pickup_client_code', 'delivery_client_code'):
+            codes = cls._column(df, column)
+            df[column] = codes.where(codes.isna(), codes.astype(str).str.strip())
+
+        errors = cls._flag_mask(errors, df['order_number'].duplicated(), "파일 내 중복 주문번호")
+        return df, errors
+
     @staticmethod
     def parse_order_excel(file_content: bytes) -> List[Dict[str, Any]]:
         """Parse order data from Excel file"""
-        try:
-            df = pd.read_excel(BytesIO(file_content))
-            
-            # Use centralized column mapping from template service
-            column_mapping = ExcelTemplateService.get_korean_to_field_mapping("orders")
-            
-            df = df.rename(columns=column_mapping)
-            
-            # Filter out example rows and empty rows
-            df = df[df['order_number'].notna()]  # Remove rows with empty order_number
-            df = df[~df['order_number'].astype(str).str.contains('예시-|ORD-', regex=True)]  # Remove example rows
-            
-            # Convert dates
-            df['order_date'] = pd.to_datetime(df['order_date']).dt.date
-            if 'requested_delivery_date' in df.columns:
-                df['requested_delivery_date'] = pd.to_datetime(df['requested_delivery_date'], errors='coerce').dt.date
-            
-            # Convert temperature_zone
-            df['temperature_zone'] = df['temperature_zone'].replace({
-                '냉동': TemperatureZone.FROZEN,
-                '냉장': TemperatureZone.REFRIGERATED,
-                '상온': TemperatureZone.AMBIENT
-            })
-            
-            # Convert boolean fields
-            df['requires_forklift'] = df['requires_forklift'].fillna('N').str.upper() == 'Y'
-            df['is_stackable'] = df['is_stackable'].fillna('Y').str.upper() == 'Y'
-            
-            # Fill defaults
-            df['priority'] = df['priority'].fillna(5).astype(int)
-            
-            records = df.to_dict(orient='records')
-            
-            logger.info(f"Parsed {len(records)} order records from Excel")
-            return records
-            
-        except Exception as e:
-            logger.error(f"Error parsing order Excel: {e}")
-            raise ValueError(f"엑셀 파일 파싱 오류: {str(e)}")
-    
+        df, _ = ExcelUploadService._order_frame(file_content)
+        records = ExcelUploadService._records(df, list(df.columns))
+        logger.info(f"Parsed {len(records)} order records from Excel")
+        return records
+
+    @staticmethod
+    def upload_orders(
+        db: Session,
+        file_content: bytes,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload orders from Excel file
+
+        기존 주문번호와 거래처 코드는 IN 조회로 한 번에 읽고, 유효한 행만 다중 행 INSERT 로 저장합니다.
+        """
+        cls = ExcelUploadService
+        df, errors = cls._order_frame(file_content)
+
+        existing = cls._existing(db, Order.order_number, df['order_number'])
+        errors = cls._flag_mask(errors, df['order_number'].isin(existing), "이미 존재하는 주문번호")
+
+        # Find client IDs
+        client_ids = cls._client_ids(db, pd.concat([df['pickup_client_code'], df['delivery_client_code']]).dropna())
+        df['pickup_client_id'] = df['pickup_client_code'].map(client_ids).astype('Int64')
+        df['delivery_client_id'] = df['delivery_client_code'].map(client_ids).astype('Int64')
+        errors = cls._flag_mask(errors, df['pickup_client_id'].isna(), "상차 거래처를 찾을 수 없음")
+        errors = cls._flag_mask(errors, df['delivery_client_id'].isna(), "하차 거래처를 찾을 수 없음")
+
+        df['status'] = OrderStatus.PENDING
+
+        created, errors = cls._insert_valid(
+            db, Order, df, errors, "order_number", [column.key for column in Order.__table__.columns], progress
+        )
+        return cls._result(df, errors, created, "order_number")
+
+    # ==================== 백그라운드 작업 ====================
+
+    IMPORT_KINDS = ("orders", "clients", "vehicles")
+
     @staticmethod
-    def upload_orders(db: Session, file_content: bytes) -> Dict[str, Any]:
-        """Upload orders from Excel file"""
-        records = ExcelUploadService.parse_order_excel(file_content)
-        
-        created = []
-        errors = []
-        
-        for idx, record in enumerate(records):
+    async def submit_import_job(
+        entity_type: str,
+        file_content: bytes,
+        filename: Optional[str] = None,
+        user_id: Optional[int] = None,
+        **options
+    ):
+        """
+        엑셀 업로드를 백그라운드 작업으로 등록 (즉시 job 반환)
+
+        작업 큐(optimization_job_service)를 공유하므로 진행률은 WebSocket `/ws/optimization-jobs/{job_id}`,
+        결과는 GET `/optimization-jobs/{job_id}` 로 조회합니다 (result 는 동기 업로드 응답과 같은 형식).
+
+        Args:
+            entity_type: orders / clients / vehicles
+            options: 업로드 옵션 (clients: auto_geocode)
+        """
+        from app.core.database import SessionLocal
+        from app.services.optimization_job_service import optimization_job_service
+
+        if entity_type not in ExcelUploadService.IMPORT_KINDS:
+            raise ValueError(f"Unknown entity type: {entity_type}")
+
+        async def runner(job):
+            loop = asyncio.get_running_loop()
+
+            def progress(done: int, total: int):
+                percent = done / total * 100 if total else 100.0
+                asyncio.run_coroutine_threadsafe(
+                    optimization_job_service.report_progress(
+                        job.job_id, progress=percent, message=f"{done}/{total}행 처리"
+                    ),
+                    loop
+                )
+
+            db = SessionLocal()
             try:
-                # Check if order already exists
-                existing = db.query(Order).filter(Order.order_number == record['order_number']).first()
-                if existing:
-                    errors.append({
-                        "row": idx + 2,
-                        "order_number": record['order_number'],
-                        "error": "이미 존재하는 주문번호"
-                    })
-                    continue
-                
-                # Find client IDs
-                pickup_client = db.query(Client).filter(Client.code == record.pop('pickup_client_code')).first()
-                delivery_client = db.query(Client).filter(Client.code == record.pop('delivery_client_code')).first()
-                
-                if not pickup_client:
-                    errors.append({
-                        "row": idx + 2,
-                        "order_number": record['order_number'],
-                        "error": f"상차 거래처를 찾을 수 없음"
-                    })
-                    continue
-                
-                if not delivery_client:
-                    errors.append({
-                        "row": idx + 2,
-                        "order_number": record['order_number'],
-                        "error": f"하차 거래처를 찾을 수 없음"
-                    })
-                    continue
-                
-                record['pickup_client_id'] = pickup_client.id
-                record['delivery_client_id'] = delivery_client.id
-                record['status'] = OrderStatus.PENDING
-                
-                order = Order(**record)
-                db.add(order)
-                created.append(order.order_number)
-                
-            except Exception as e:
-                errors.append({
-                    "row": idx + 2,
-                    "order_number": record.get('order_number', 'Unknown'),
-                    "error": str(e)
-                })
-        
-        db.commit()
-        
-        return {
-            "total": len(records),
-            "created": len(created),
-            "failed": len(errors),
-            "created_codes": created,
-            "errors": errors
-        }
+                if entity_type == "clients":
+                    return await ExcelUploadService.upload_clients(
+                        db, file_content, options.get("auto_geocode", True), progress
+                    )
+                upload = ExcelUploadService.upload_orders if entity_type == "orders" else ExcelUploadService.upload_vehicles
+                return await asyncio.to_thread(upload, db, file_content, progress)
+            finally:
+                db.close()
+
+        return await optimization_job_service.submit(
+            f"excel_import_{entity_type}",
+            runner,
+            params={"filename": filename, **options},
+            user_id=user_id
+        )
@@ -2,15 +2,16 @@
 재무 대시보드 보고서 내보내기 서비스
 Excel 및 PDF 형식으로 재무 데이터를 생성합니다.
 """
-from typing import Dict, Any, List, Optional
+from typing import BinaryIO, Dict, Any, List, Optional
 from datetime import date, datetime
 from decimal import Decimal
-from io import BytesIO
 import logging
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.chart import LineChart, BarChart, Reference
+from openpyxl.utils import get_column_letter
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -21,6 +22,8 @@ from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+from app.services.report_data_service import spooled_output
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,7 +50,7 @@ class FinancialReportExporter:
         top_clients: List[Dict[str, Any]],
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
-    ) -> BytesIO:
+    ) -> BinaryIO:
         """
         재무 대시보드 데이터를 Excel 파일로 생성
         
@@ -59,13 +62,10 @@ class FinancialReportExporter:
             end_date: 조회 종료일
             
         Returns:
-            BytesIO: Excel 파일 바이너리 데이터
+            BinaryIO: Excel 파일 (스풀 버퍼, 처음 위치)
         """
-        wb = Workbook()
-        
-        # 기본 시트 제거
-        if 'Sheet' in wb.sheetnames:
-            wb.remove(wb['Sheet'])
+        # 쓰기 전용 워크북 (행을 순서대로 기록, 기본 시트 없음)
+        wb = Workbook(write_only=True)
         
         # 1. 요약 시트
         self._create_summary_sheet(wb, summary_data, start_date, end_date)
@@ -76,14 +76,51 @@ class FinancialReportExporter:
         # 3. TOP 10 거래처 시트
         self._create_top_clients_sheet(wb, top_clients)
         
-        # BytesIO로 저장
-        output = BytesIO()
+        # 스풀 버퍼로 저장 (일정 크기 초과 시 임시 파일)
+        output = spooled_output()
         wb.save(output)
         output.seek(0)
         
         logger.info("Excel 파일 생성 완료")
         return output
     
+    def _create_sheet(self, wb: Workbook, title: str, widths: List[int]):
+        """쓰기 전용 시트 생성 (열 너비는 행 기록 전에 설정)"""
+        ws = wb.create_sheet(title)
+        for col, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        return ws
+    
+    def _append_title(self, ws, title: str, merge_range: str):
+        """제목 행 추가"""
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = self.title_font
+        ws.append([cell])
+        ws.merged_cells.add(merge_range)
+    
+    def _append_header(self, ws, headers: List[str]):
+        """헤더 행 추가"""
+        cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = self.header_font
+            cell.fill = self.header_fill
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+            cell.border = self.border
+            cells.append(cell)
+        ws.append(cells)
+    
+    def _append_row(self, ws, values: List[Any], number_formats: Dict[int, str]):
+        """테두리가 있는 데이터 행 추가 (number_formats: 열 인덱스 → 표시 형식)"""
+        cells = []
+        for col, value in enumerate(values):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.border = self.border
+            if col in number_formats:
+                cell.number_format = number_formats[col]
+            cells.append(cell)
+        ws.append(cells)
+    
     def _create_summary_sheet(
         self,
         wb: Workbook,
@@ -92,30 +129,21 @@ class FinancialReportExporter:
         end_date: Optional[date]
     ):
         """요약 시트 생성"""
-        ws = wb.create_sheet("재무 요약")
+        ws = self._create_sheet(wb, "재무 요약", [20, 20, 15, 15])
         
         # 제목
-        ws['A1'] = '재무 대시보드 요약'
-        ws['A1'].font = self.title_font
-        ws.merge_cells('A1:D1')
+        self._append_title(ws, '재무 대시보드 요약', 'A1:D1')
         
         # 조회 기간
-        period_text = f"조회 기간: {start_date or '전체'} ~ {end_date or '오늘'}"
-        ws['A2'] = period_text
-        ws.merge_cells('A2:D2')
+        ws.append([f"조회 기간: {start_date or '전체'} ~ {end_date or '오늘'}"])
+        ws.merged_cells.add('A2:D2')
         
-        ws['A3'] = f"생성일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        ws.merge_cells('A3:D3')
+        ws.append([f"생성일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"])
+        ws.merged_cells.add('A3:D3')
+        ws.append([])
         
-        # 헤더
-        row = 5
-        headers = ['항목', '금액 (₩)', '비율 (%)', '건수']
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = self.border
+        # 헤더 (5행)
+        self._append_header(ws, ['항목', '금액 (₩)', '비율 (%)', '건수'])
         
         # 데이터
         total_revenue = float(data.get('total_revenue', 0))
@@ -134,71 +162,41 @@ class FinancialReportExporter:
             ('정산 대기', pending_settlement, '', ''),
         ]
         
-        for idx, (item, amount, rate, count) in enumerate(rows_data, start=row + 1):
-            ws.cell(row=idx, column=1, value=item).border = self.border
-            ws.cell(row=idx, column=2, value=amount).border = self.border
-            ws.cell(row=idx, column=2).number_format = '#,##0'
-            
+        for item, amount, rate, count in rows_data:
+            number_formats = {1: '#,##0'}
             if rate:
-                ws.cell(row=idx, column=3, value=rate).border = self.border
-                ws.cell(row=idx, column=3).number_format = '0.00'
+                number_formats[2] = '0.00'
             else:
-                ws.cell(row=idx, column=3, value='').border = self.border
-            
-            ws.cell(row=idx, column=4, value=count).border = self.border
-        
-        # 열 너비 조정
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 15
+                rate = ''
+            self._append_row(ws, [item, amount, rate, count], number_formats)
     
     def _create_trends_sheet(self, wb: Workbook, trends: List[Dict[str, Any]]):
         """월별 추이 시트 생성"""
-        ws = wb.create_sheet("월별 추이")
+        ws = self._create_sheet(wb, "월별 추이", [15, 20, 20, 15, 20])
         
         # 제목
-        ws['A1'] = '월별 매출/수금 추이'
-        ws['A1'].font = self.title_font
-        ws.merge_cells('A1:E1')
+        self._append_title(ws, '월별 매출/수금 추이', 'A1:E1')
+        ws.append([])
         
-        # 헤더
+        # 헤더 (3행)
         row = 3
-        headers = ['년월', '매출액 (₩)', '수금액 (₩)', '수금률 (%)', '순이익 (₩)']
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = self.border
+        self._append_header(ws, ['년월', '매출액 (₩)', '수금액 (₩)', '수금률 (%)', '순이익 (₩)'])
         
         # 데이터
         if not trends:
-            ws.cell(row=row + 1, column=1, value='데이터 없음')
+            ws.append(['데이터 없음'])
         else:
-            for idx, trend in enumerate(trends, start=row + 1):
-                ws.cell(row=idx, column=1, value=trend.get('month', '')).border = self.border
-                ws.cell(row=idx, column=2, value=float(trend.get('revenue', 0))).border = self.border
-                ws.cell(row=idx, column=2).number_format = '#,##0'
-                ws.cell(row=idx, column=3, value=float(trend.get('collected', 0))).border = self.border
-                ws.cell(row=idx, column=3).number_format = '#,##0'
-                
+            number_formats = {1: '#,##0', 2: '#,##0', 3: '0.00', 4: '#,##0'}
+            for trend in trends:
                 revenue = float(trend.get('revenue', 0))
                 collected = float(trend.get('collected', 0))
                 collection_rate = (collected / revenue * 100) if revenue > 0 else 0
-                ws.cell(row=idx, column=4, value=collection_rate).border = self.border
-                ws.cell(row=idx, column=4).number_format = '0.00'
-                
                 profit = float(trend.get('profit', 0))
-                ws.cell(row=idx, column=5, value=profit).border = self.border
-                ws.cell(row=idx, column=5).number_format = '#,##0'
-        
-        # 열 너비 조정
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 20
+                self._append_row(
+                    ws,
+                    [trend.get('month', ''), revenue, collected, collection_rate, profit],
+                    number_formats
+                )
         
         # 차트 추가 (데이터가 있을 경우)
         if trends and len(trends) > 0:
@@ -206,43 +204,32 @@ class FinancialReportExporter:
     
     def _create_top_clients_sheet(self, wb: Workbook, clients: List[Dict[str, Any]]):
         """TOP 10 거래처 시트 생성"""
-        ws = wb.create_sheet("TOP 10 거래처")
+        ws = self._create_sheet(wb, "TOP 10 거래처", [10, 25, 20, 15, 15])
         
         # 제목
-        ws['A1'] = 'TOP 10 주요 거래처'
-        ws['A1'].font = self.title_font
-        ws.merge_cells('A1:E1')
+        self._append_title(ws, 'TOP 10 주요 거래처', 'A1:E1')
+        ws.append([])
         
-        # 헤더
-        row = 3
-        headers = ['순위', '거래처명', '매출액 (₩)', '청구서 수', '수금률 (%)']
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = self.border
+        # 헤더 (3행)
+        self._append_header(ws, ['순위', '거래처명', '매출액 (₩)', '청구서 수', '수금률 (%)'])
         
         # 데이터
         if not clients:
-            ws.cell(row=row + 1, column=1, value='데이터 없음')
+            ws.append(['데이터 없음'])
         else:
+            number_formats = {2: '#,##0', 4: '0.00'}
             for idx, client in enumerate(clients, start=1):
-                data_row = row + idx
-                ws.cell(row=data_row, column=1, value=idx).border = self.border
-                ws.cell(row=data_row, column=2, value=client.get('client_name', '')).border = self.border
-                ws.cell(row=data_row, column=3, value=float(client.get('total_revenue', 0))).border = self.border
-                ws.cell(row=data_row, column=3).number_format = '#,##0'
-                ws.cell(row=data_row, column=4, value=int(client.get('invoice_count', 0))).border = self.border
-                ws.cell(row=data_row, column=5, value=float(client.get('collection_rate', 0))).border = self.border
-                ws.cell(row=data_row, column=5).number_format = '0.00'
-        
-        # 열 너비 조정
-        ws.column_dimensions['A'].width = 10
-        ws.column_dimensions['B'].width = 25
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 15
+                self._append_row(
+                    ws,
+                    [
+                        idx,
+                        client.get('client_name', ''),
+                        float(client.get('total_revenue', 0)),
+                        int(client.get('invoice_count', 0)),
+                        float(client.get('collection_rate', 0)),
+                    ],
+                    number_formats
+                )
     
     def _add_line_chart(self, ws, data_count: int, start_row: int):
         """월별 추이 라인 차트 추가"""
@@ -273,7 +260,7 @@ class FinancialReportExporter:
         top_clients: List[Dict[str, Any]],
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
-    ) -> BytesIO:
+    ) -> BinaryIO:
         """
         재무 대시보드 데이터를 PDF 파일로 생성
         
@@ -285,9 +272,9 @@ class FinancialReportExporter:
             end_date: 조회 종료일
             
         Returns:
-            BytesIO: PDF 파일 바이너리 데이터
+            BinaryIO: PDF 파일 (스풀 버퍼, 처음 위치)
         """
-        output = BytesIO()
+        output = spooled_output()
         doc = SimpleDocTemplate(
             output,
             pagesize=landscape(A4),
@@ -0,0 +1,326 @@
+"""
+KPI 엔진
+- 현재 기간 + 직전 동일 길이 기간의 KPI 를 팩트 테이블당 조건부 집계 쿼리 1회로 계산
+  (orders: 주문 수/배송완료/정시, dispatches: 완료 배차/소요시간/청구 매출 + 활성 차량 수)
+- 요청한 KPI 가 필요로 하는 팩트 테이블만 조회, 결과는 (테이블, 기간) 키로 프로세스 캐시
+- KPI 정의는 KPI_DEFINITIONS 레지스트리에 선언 (대시보드별 임의 KPI 조합 지원)
+
+실제 컬럼이 없는 항목은 다음 값으로 계산합니다.
+- 배차 완료 시각: 완료 배차의 마지막 수정 시각 (updated_at)
+- 주문 배송 완료 시각: 배송완료 주문의 마지막 수정 시각 (updated_at)
+- 운행 시간: 완료 배차의 예상 소요시간 (estimated_duration_minutes)
+- 매출: 배차별 청구 항목 금액 (invoice_line_items.amount)
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.billing import InvoiceLineItem
+from app.models.dispatch import Dispatch, DispatchStatus
+from app.models.order import Order, OrderStatus
+from app.models.vehicle import Vehicle
+
+
+Window = Tuple[date, date]
+Facts = Dict[str, float]
+
+WORK_HOURS_PER_DAY = 8
+KPI_CACHE_TTL_SECONDS = 60
+
+
+def hours_between(db: Session, start, end):
+    """두 시각 사이 시간(시) SQL 식 (PostgreSQL / SQLite)"""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.extract("epoch", end - start) / 3600
+    return (func.julianday(end) - func.julianday(start)) * 24
+
+
+@dataclass
+class KPIResult:
+    """KPI 결과"""
+    name: str
+    value: float
+    unit: str
+    target: float
+    status: str  # 'good', 'warning', 'critical'
+    change: float  # 전 기간 대비 변화율
+    trend: str  # 'up', 'down', 'stable'
+
+
+@dataclass(frozen=True)
+class KPIDefinition:
+    """
+    KPI 정의
+
+    compute(facts, days) 가 원시 값을 반환 (데이터가 없으면 None -> 빈 KPI)
+    상태 판정(target/warning)은 원시 값, 표시 값은 원시 값 / scale
+    """
+    key: str
+    name: str
+    unit: str
+    fact_table: str
+    compute: Callable[[Facts, int], Optional[float]]
+    target: float
+    warning: float
+    scale: float = 1.0
+    digits: int = 1
+    higher_is_better: bool = True
+    change_percent: bool = False
+
+    def status(self, value: float) -> str:
+        if self.higher_is_better:
+            return 'good' if value >= self.target else 'warning' if value >= self.warning else 'critical'
+        return 'good' if value <= self.target else 'warning' if value <= self.warning else 'critical'
+
+
+def _ratio(numerator: float, denominator: float, factor: float = 1.0) -> Optional[float]:
+    return numerator / denominator * factor if denominator else None
+
+
+KPI_DEFINITIONS: Dict[str, KPIDefinition] = {
+    definition.key: definition
+    for definition in (
+        KPIDefinition(
+            key="order_completion_rate", name="주문 처리율", unit="%", fact_table="orders",
+            compute=lambda f, days: _ratio(f["delivered"], f["orders"], 100) or 0.0,
+            target=95.0, warning=90.0,
+        ),
+        KPIDefinition(
+            key="on_time_delivery_rate", name="정시 배송률", unit="%", fact_table="orders",
+            compute=lambda f, days: _ratio(f["on_time"], f["due_delivered"], 100),
+            target=90.0, warning=85.0,
+        ),
+        KPIDefinition(
+            key="vehicle_utilization", name="차량 가동률", unit="%", fact_table="dispatches",
+            compute=lambda f, days: _ratio(
+                f["planned_minutes"] / 60, days * WORK_HOURS_PER_DAY * f["active_vehicles"], 100
+            ),
+            target=75.0, warning=65.0,
+        ),
+        KPIDefinition(
+            key="average_delivery_time", name="평균 배송 시간", unit="시간", fact_table="dispatches",
+            compute=lambda f, days: _ratio(f["lead_hours"], f["completed"]),
+            target=4.0, warning=5.0, higher_is_better=False,
+        ),
+        KPIDefinition(
+            key="daily_orders", name="1일 평균 주문", unit="건", fact_table="orders",
+            compute=lambda f, days: f["orders"] / days,
+            target=120.0, warning=100.0, digits=0,
+        ),
+        KPIDefinition(
+            key="daily_revenue", name="일일 평균 매출", unit="M원", fact_table="dispatches",
+            compute=lambda f, days: f["revenue"] / days,
+            target=5000000.0, warning=4000000.0, scale=1000000.0, change_percent=True,
+        ),
+        KPIDefinition(
+            key="average_order_value", name="평균 주문 금액", unit="천원", fact_table="dispatches",
+            compute=lambda f, days: _ratio(f["revenue"], f["billed_orders"]) or 0.0,
+            target=150000.0, warning=120000.0, scale=1000.0, digits=0, change_percent=True,
+        ),
+    )
+}
+
+DEFAULT_KPIS = tuple(KPI_DEFINITIONS)
+
+
+def previous_window(start_date: date, end_date: date) -> Window:
+    """직전 동일 길이 기간"""
+    length = end_date - start_date + timedelta(days=1)
+    return start_date - length, start_date - timedelta(days=1)
+
+
+class KPIFactCache:
+    """(팩트 테이블, 기간) 키의 집계 결과 캐시 (TTL)"""
+
+    def __init__(self, ttl_seconds: float = KPI_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, date, date], Tuple[float, Dict[str, Facts]]] = {}
+
+    def get(self, key: Tuple[str, date, date]) -> Optional[Dict[str, Facts]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def set(self, key: Tuple[str, date, date], value: Dict[str, Facts]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+kpi_fact_cache = KPIFactCache()
+
+
+class KPIEngine:
+    """현재/직전 기간 KPI 일괄 계산"""
+
+    def __init__(self, db: Session, cache: Optional[KPIFactCache] = None):
+        self.db = db
+        self.cache = kpi_fact_cache if cache is None else cache
+
+    def compute(
+        self,
+        start_date: date,
+        end_date: date,
+        keys: Optional[Iterable[str]] = None,
+        use_cache: bool = True
+    ) -> List[KPIResult]:
+        """
+        KPI 계산 (요청 순서 유지)
+
+        Args:
+            start_date: 기간 시작일
+            end_date: 기간 종료일 (포함)
+            keys: KPI 키 목록 (None 이면 전체, KPI_DEFINITIONS 참고)
+            use_cache: 팩트 캐시 사용 여부
+        """
+        keys = list(DEFAULT_KPIS if keys is None else keys)
+        unknown = [key for key in keys if key not in KPI_DEFINITIONS]
+        if unknown:
+            raise ValueError(f"Unknown KPI: {', '.join(unknown)}")
+
+        definitions = [KPI_DEFINITIONS[key] for key in keys]
+        facts = {
+            table: self._facts(table, start_date, end_date, use_cache)
+            for table in dict.fromkeys(definition.fact_table for definition in definitions)
+        }
+        days = (end_date - start_date).days + 1
+        return [
+            self._result(definition, facts[definition.fact_table], days)
+            for definition in definitions
+        ]
+
+    # ========================================
+    # 팩트 집계
+    # ========================================
+
+    def _facts(self, table: str, start_date: date, end_date: date, use_cache: bool) -> Dict[str, Facts]:
+        key = (table, start_date, end_date)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        current = (start_date, end_date)
+        previous = previous_window(start_date, end_date)
+        loader = self._order_facts if table == "orders" else self._dispatch_facts
+        facts = loader(current, previous)
+
+        if use_cache:
+            self.cache.set(key, facts)
+        return facts
+
+    @staticmethod
+    def _windowed(aggregates: Dict[str, Callable[[Any], Any]], column, current: Window, previous: Window):
+        """집계식마다 현재/직전 기간 조건부 집계 컬럼 생성"""
+        columns = []
+        for prefix, (start, end) in (("current", current), ("previous", previous)):
+            in_window = and_(column >= start, column <= end)
+            for name, aggregate in aggregates.items():
+                columns.append(aggregate(in_window).label(f"{prefix}__{name}"))
+        return columns
+
+    @staticmethod
+    def _split(row) -> Dict[str, Facts]:
+        facts: Dict[str, Facts] = {"current": {}, "previous": {}}
+        for label, value in row._mapping.items():
+            prefix, _, name = label.partition("__")
+            if prefix in facts:
+                facts[prefix][name] = float(value or 0)
+            else:
+                facts["current"][label] = facts["previous"][label] = float(value or 0)
+        return facts
+
+    def _order_facts(self, current: Window, previous: Window) -> Dict[str, Facts]:
+        """주문 팩트: 주문 수 / 배송완료 / 희망일 있는 배송완료 / 희망일 내 배송완료"""
+        delivered = Order.status == OrderStatus.DELIVERED
+        due = and_(delivered, Order.requested_delivery_date.isnot(None))
+        on_time = and_(due, func.date(Order.updated_at) <= Order.requested_delivery_date)
+
+        def count_if(*conditions):
+            return lambda in_window: func.sum(case((and_(in_window, *conditions), 1), else_=0))
+
+        aggregates = {
+            "orders": count_if(),
+            "delivered": count_if(delivered),
+            "due_delivered": count_if(due),
+            "on_time": count_if(on_time),
+        }
+        query = (
+            select(*self._windowed(aggregates, Order.order_date, current, previous))
+            .where(Order.order_date >= previous[0], Order.order_date <= current[1])
+        )
+        return self._split(self.db.execute(query).one())
+
+    def _dispatch_facts(self, current: Window, previous: Window) -> Dict[str, Facts]:
+        """배차 팩트: 완료 배차 / 배송 소요시간 / 계획 운행시간 / 청구 매출 + 활성 차량 수"""
+        completed = Dispatch.status == DispatchStatus.COMPLETED
+        billed = InvoiceLineItem.id.isnot(None)
+        lead_hours = hours_between(self.db, Dispatch.created_at, Dispatch.updated_at)
+
+        def sum_if(value, *conditions):
+            return lambda in_window: func.sum(case((and_(in_window, *conditions), value), else_=0))
+
+        aggregates = {
+            "completed": sum_if(1, completed),
+            "lead_hours": sum_if(lead_hours, completed),
+            "planned_minutes": sum_if(func.coalesce(Dispatch.estimated_duration_minutes, 0), completed),
+            "revenue": sum_if(InvoiceLineItem.amount, billed),
+            "billed_orders": sum_if(Dispatch.total_orders, billed),
+        }
+        active_vehicles = (
+            select(func.count(Vehicle.id)).where(Vehicle.is_active == True).scalar_subquery()  # noqa: E712
+        )
+        query = (
+            select(
+                *self._windowed(aggregates, Dispatch.dispatch_date, current, previous),
+                active_vehicles.label("active_vehicles"),
+            )
+            .select_from(Dispatch)
+            .outerjoin(InvoiceLineItem, InvoiceLineItem.dispatch_id == Dispatch.id)
+            .where(Dispatch.dispatch_date >= previous[0], Dispatch.dispatch_date <= current[1])
+        )
+        return self._split(self.db.execute(query).one())
+
+    # ========================================
+    # 결과 구성
+    # ========================================
+
+    @staticmethod
+    def _result(definition: KPIDefinition, facts: Dict[str, Facts], days: int) -> KPIResult:
+        value = definition.compute(facts["current"], days)
+        if value is None:
+            return KPIResult(
+                name=definition.name, value=0.0, unit=definition.unit, target=definition.target / definition.scale,
+                status='critical', change=0.0, trend='stable'
+            )
+
+        previous = definition.compute(facts["previous"], days) or 0.0
+        if definition.change_percent:
+            change = (value - previous) / previous * 100 if previous > 0 else 0.0
+        else:
+            change = (value - previous) / definition.scale
+
+        return KPIResult(
+            name=definition.name,
+            value=round(value / definition.scale, definition.digits),
+            unit=definition.unit,
+            target=definition.target / definition.scale,
+            status=definition.status(value),
+            change=round(change, 1 if definition.change_percent else definition.digits),
+            trend='up' if change > 0 else 'down' if change < 0 else 'stable'
+        )
@@ -0,0 +1,235 @@
+"""
+목록 조회 계층 (주문 / 배차)
+- 커서(keyset) 페이지네이션: (일자, id) 내림차순, 다음 페이지는 마지막 행 이후부터 인덱스 범위 조회
+  -> 페이지 깊이와 무관하게 일정한 비용 (OFFSET 은 건너뛸 행을 모두 읽음)
+- 직렬화에 필요한 컬럼만 조인 프로젝션으로 조회 (관계 지연 로딩 N+1 제거)
+  - 주문: 본문 + 상차/하차 거래처명 -> 쿼리 1회
+  - 배차: 본문 + 차량/기사명 1회, 페이지 전체 주문번호 1회
+- 전체 건수: exact(COUNT), approx(PostgreSQL 실행 계획 추정치), none(생략)
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.models.client import Client
+from app.models.dispatch import Dispatch, DispatchRoute, DispatchStatus
+from app.models.driver import Driver
+from app.models.order import Order, OrderStatus
+from app.models.vehicle import Vehicle
+
+
+CountMode = Literal["exact", "approx", "none"]
+
+# 주문 목록 응답(OrderResponse) 컬럼
+ORDER_LIST_COLUMNS = (
+    'id', 'order_number', 'order_date', 'temperature_zone',
+    'pickup_client_id', 'delivery_client_id',
+    'pickup_address', 'pickup_address_detail', 'delivery_address', 'delivery_address_detail',
+    'pallet_count', 'weight_kg', 'volume_cbm', 'product_name', 'product_code',
+    'pickup_start_time', 'pickup_end_time', 'delivery_start_time', 'delivery_end_time',
+    'requested_delivery_date', 'priority', 'is_reserved', 'reserved_at', 'confirmed_at',
+    'recurring_type', 'recurring_end_date', 'requires_forklift', 'is_stackable', 'notes',
+    'status', 'created_at', 'updated_at',
+    'pickup_latitude', 'pickup_longitude', 'delivery_latitude', 'delivery_longitude',
+)
+
+# 배차 목록 응답(DispatchResponse) 컬럼
+DISPATCH_LIST_COLUMNS = (
+    'id', 'dispatch_number', 'dispatch_date', 'vehicle_id', 'driver_id',
+    'total_orders', 'total_pallets', 'total_weight_kg', 'total_distance_km', 'empty_distance_km',
+    'estimated_duration_minutes', 'estimated_cost', 'status', 'optimization_score', 'notes',
+    'created_at', 'updated_at',
+)
+
+
+class InvalidCursorError(ValueError):
+    """해석할 수 없는 커서"""
+
+
+def encode_cursor(sort_date: date, row_id: int) -> str:
+    raw = json.dumps([sort_date.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_date, row_id = json.loads(raw)
+        return date.fromisoformat(sort_date), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"잘못된 커서입니다: {cursor}") from e
+
+
+class ExplainJSON(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) <조회> (PostgreSQL)
+
+    일반 구문처럼 실행되므로 바인드 값에 타입 변환(Enum -> 라벨 등)이 그대로 적용됩니다.
+    """
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(ExplainJSON, "postgresql")
+def _compile_explain_json(element: ExplainJSON, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+@dataclass
+class ListPage:
+    items: List[Dict[str, Any]]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+
+def count_rows(db: Session, stmt: Select, mode: CountMode) -> Optional[int]:
+    """
+    필터가 적용된 조회의 전체 건수
+
+    approx 는 PostgreSQL 에서 EXPLAIN 추정 행 수를 사용 (테이블을 읽지 않음),
+    그 외 DB 에서는 exact 와 같습니다.
+    """
+    if mode == "none":
+        return None
+    if mode == "approx" and db.get_bind().dialect.name == "postgresql":
+        plan = db.execute(ExplainJSON(stmt)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return db.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar() or 0
+
+
+def fetch_page(
+    db: Session,
+    stmt: Select,
+    date_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    (일자, id) 내림차순 페이지 조회
+
+    cursor 가 있으면 keyset, 없으면 skip 기반(첫 페이지 / 기존 클라이언트 호환).
+    limit + 1 건을 읽어 다음 페이지 존재 여부를 판단합니다.
+    """
+    if cursor:
+        stmt = stmt.where(tuple_(date_column, id_column) < tuple_(*decode_cursor(cursor)))
+    elif skip:
+        stmt = stmt.offset(skip)
+    stmt = stmt.order_by(date_column.desc(), id_column.desc()).limit(limit + 1)
+
+    rows = [dict(row) for row in db.execute(stmt).mappings()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last[date_column.key], last[id_column.key])
+    return rows, next_cursor
+
+
+def list_orders(
+    db: Session,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    count_mode: CountMode = "exact",
+    status: Optional[OrderStatus] = None,
+    temperature_zone: Optional[str] = None,
+    order_date: Optional[date] = None,
+) -> ListPage:
+    """주문 목록 (거래처명 포함)"""
+    filtered = select(Order.id)
+    if status:
+        filtered = filtered.where(Order.status == status)
+    if temperature_zone:
+        filtered = filtered.where(Order.temperature_zone == temperature_zone)
+    if order_date:
+        filtered = filtered.where(Order.order_date == order_date)
+
+    pickup_client = aliased(Client)
+    delivery_client = aliased(Client)
+    stmt = (
+        filtered.with_only_columns(
+            *(getattr(Order, name) for name in ORDER_LIST_COLUMNS),
+            pickup_client.name.label('pickup_client_name'),
+            delivery_client.name.label('delivery_client_name'),
+        )
+        .outerjoin(pickup_client, pickup_client.id == Order.pickup_client_id)
+        .outerjoin(delivery_client, delivery_client.id == Order.delivery_client_id)
+    )
+
+    items, next_cursor = fetch_page(db, stmt, Order.order_date, Order.id, limit, cursor, skip)
+    return ListPage(items, count_rows(db, filtered, count_mode), next_cursor)
+
+
+def list_dispatches(
+    db: Session,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    count_mode: CountMode = "exact",
+    status: Optional[DispatchStatus] = None,
+    dispatch_date: Optional[date] = None,
+    vehicle_id: Optional[int] = None,
+) -> ListPage:
+    """배차 목록 (차량 / 기사 / 주문번호 포함)"""
+    filtered = select(Dispatch.id)
+    if status:
+        filtered = filtered.where(Dispatch.status == status)
+    if dispatch_date:
+        filtered = filtered.where(Dispatch.dispatch_date == dispatch_date)
+    if vehicle_id:
+        filtered = filtered.where(Dispatch.vehicle_id == vehicle_id)
+
+    stmt = (
+        filtered.with_only_columns(
+            *(getattr(Dispatch, name) for name in DISPATCH_LIST_COLUMNS),
+            Vehicle.code.label('vehicle_code'),
+            Vehicle.plate_number.label('vehicle_plate'),
+            Vehicle.driver_name.label('vehicle_driver_name'),
+            Driver.name.label('driver_name'),
+        )
+        .outerjoin(Vehicle, Vehicle.id == Dispatch.vehicle_id)
+        .outerjoin(Driver, Driver.id == Dispatch.driver_id)
+    )
+
+    items, next_cursor = fetch_page(db, stmt, Dispatch.dispatch_date, Dispatch.id, limit, cursor, skip)
+
+    order_numbers = _order_numbers_by_dispatch(db, [item['id'] for item in items])
+    for item in items:
+        # 배차에 기사가 지정되지 않았으면 차량의 운전자명 사용
+        vehicle_driver_name = item.pop('vehicle_driver_name')
+        if item['driver_id'] is None:
+            item['driver_name'] = vehicle_driver_name
+        numbers = order_numbers.get(item['id'])
+        item['order_numbers'] = ", ".join(numbers) if numbers else None
+
+    return ListPage(items, count_rows(db, filtered, count_mode), next_cursor)
+
+
+def _order_numbers_by_dispatch(db: Session, dispatch_ids: List[int]) -> Dict[int, List[str]]:
+    """배차별 경로 순서대로의 주문번호 (페이지 전체 1회 조회)"""
+    if not dispatch_ids:
+        return {}
+    rows = db.execute(
+        select(DispatchRoute.dispatch_id, Order.order_number)
+        .join(Order, Order.id == DispatchRoute.order_id)
+        .where(DispatchRoute.dispatch_id.in_(dispatch_ids))
+        .order_by(DispatchRoute.dispatch_id, DispatchRoute.sequence)
+    )
+    numbers: Dict[int, List[str]] = {}
+    for dispatch_id, order_number in rows:
+        numbers.setdefault(dispatch_id, []).append(order_number)
+    return numbers
@@ -4,13 +4,16 @@ ML-based Dispatch Optimization Service
 Multi-Agent 학습 시스템을 활용한 스마트 배차 최적화
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import numpy as np
 import math
+import threading
+import time
 from loguru import logger
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.client import Client
@@ -34,6 +37,16 @@ class AgentScore:
     voltage: float = 1.0  # 기본값 1.0 (안전)
 
 
+@dataclass
+class VehicleState:
+    """차량 최신 상태 (GPS + 전압)"""
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    recorded_at: Optional[datetime] = None
+    voltage: Optional[float] = None
+    engine_on: bool = False
+
+
 @dataclass
 class VehicleRanking:
     """차량 순위 정보"""
@@ -64,6 +77,38 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return R * c
 
 
+def haversine_distance_np(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Haversine 거리 계산 (km) - NumPy 브로드캐스팅 버전"""
+    R = 6371  # 지구 반지름 (km)
+    
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    delta_lat = np.radians(np.subtract(lat2, lat1))
+    delta_lon = np.radians(np.subtract(lon2, lon1))
+    
+    a = (np.sin(delta_lat / 2) ** 2 +
+         np.cos(lat1_rad) * np.cos(lat2_rad) *
+         np.sin(delta_lon / 2) ** 2)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    return R * c
+
+
+def _truthy_array(values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """(값 배열, 유효 마스크) - None/0 은 무효 (스칼라 코드의 truthiness 검사와 동일)"""
+    mask = np.array([bool(v) for v in values], dtype=bool)
+    arr = np.array([float(v) if v else np.nan for v in values], dtype=np.float64)
+    return arr, mask
+
+
+def _hhmm_to_minutes(value) -> int:
+    """'HH:MM' 문자열 또는 time 객체를 분으로 변환"""
+    if hasattr(value, 'hour'):
+        return value.hour * 60 + value.minute
+    hours, minutes = value.split(':')[:2]
+    return int(hours) * 60 + int(minutes)
+
+
 def is_temperature_compatible(vehicle: Vehicle, temp_zone: TemperatureZone) -> bool:
     """온도대 호환성 체크"""
     # Phase 1에서 추가된 필드 사용
@@ -103,6 +148,125 @@ def check_pallet_capacity(vehicle: Vehicle, pallet_type: str, pallet_count: int)
     return pallet_count <= vehicle.max_pallets
 
 
+def _is_recent(recorded_at: Optional[datetime], max_age_seconds: float) -> bool:
+    """기록 시각이 max_age_seconds 이내인지 확인 (timezone aware/naive 모두 지원)"""
+    if recorded_at is None:
+        return False
+    now = datetime.now(recorded_at.tzinfo) if recorded_at.tzinfo else datetime.now()
+    return (now - recorded_at).total_seconds() < max_age_seconds
+
+
+# ============================================
+# Vehicle State Snapshot
+# ============================================
+
+class VehicleStateSnapshot:
+    """
+    배차 실행 단위 차량 상태 스냅샷
+    
+    후보 차량 전체의 최신 GPS/전압을 윈도우 함수 쿼리 한 번으로 로드하고,
+    Agent들은 (주문 × 차량)마다 DB를 조회하는 대신 이 스냅샷에서 읽습니다.
+    reuse_seconds > 0 이면 프로세스 내에서 요청 간 스냅샷을 재사용합니다.
+    """
+    
+    # vehicle_id -> (loaded_at(monotonic), VehicleState | None)
+    _shared: Dict[int, Tuple[float, Optional[VehicleState]]] = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, states: Dict[int, Optional[VehicleState]]):
+        self.states = states
+    
+    def get(self, vehicle_id: int) -> Optional[VehicleState]:
+        return self.states.get(vehicle_id)
+    
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        vehicle_ids: Iterable[int],
+        reuse_seconds: float = 0
+    ) -> "VehicleStateSnapshot":
+        """후보 차량들의 최신 상태 로드"""
+        vehicle_ids = list(dict.fromkeys(vehicle_ids))
+        states: Dict[int, Optional[VehicleState]] = {}
+        missing = vehicle_ids
+        
+        if reuse_seconds > 0:
+            now = time.monotonic()
+            missing = []
+            with cls._shared_lock:
+                for vehicle_id in vehicle_ids:
+                    entry = cls._shared.get(vehicle_id)
+                    if entry and now - entry[0] < reuse_seconds:
+                        states[vehicle_id] = entry[1]
+                    else:
+                        missing.append(vehicle_id)
+        
+        if missing:
+            loaded = cls._query_latest(db, missing)
+            states.update(loaded)
+            
+            if reuse_seconds > 0:
+                loaded_at = time.monotonic()
+                with cls._shared_lock:
+                    for vehicle_id, state in loaded.items():
+                        cls._shared[vehicle_id] = (loaded_at, state)
+        
+        logger.debug(
+            f"Vehicle snapshot: {len(vehicle_ids)} vehicles "
+            f"(queried={len(missing)}, reused={len(vehicle_ids) - len(missing)})"
+        )
+        return cls(states)
+    
+    @classmethod
+    def invalidate(cls, vehicle_ids: Optional[Iterable[int]] = None):
+        """공유 스냅샷 무효화 (None이면 전체)"""
+        with cls._shared_lock:
+            if vehicle_ids is None:
+                cls._shared.clear()
+            else:
+                for vehicle_id in vehicle_ids:
+                    cls._shared.pop(vehicle_id, None)
+    
+    @staticmethod
+    def _query_latest(db: Session, vehicle_ids: List[int]) -> Dict[int, Optional[VehicleState]]:
+        """차량별 최신 GPS 로그를 ROW_NUMBER() 윈도우 쿼리 1회로 조회"""
+        voltage_column = getattr(VehicleGPSLog, 'voltage', None)
+        
+        row_number = func.row_number().over(
+            partition_by=VehicleGPSLog.vehicle_id,
+            order_by=(VehicleGPSLog.created_at.desc(), VehicleGPSLog.id.desc())
+        ).label('rn')
+        
+        columns = [
+            VehicleGPSLog.vehicle_id.label('vehicle_id'),
+            VehicleGPSLog.latitude.label('latitude'),
+            VehicleGPSLog.longitude.label('longitude'),
+            VehicleGPSLog.created_at.label('created_at'),
+            VehicleGPSLog.is_engine_on.label('engine_on'),
+        ]
+        if voltage_column is not None:
+            columns.append(voltage_column.label('voltage'))
+        
+        ranked = (
+            db.query(*columns, row_number)
+            .filter(VehicleGPSLog.vehicle_id.in_(vehicle_ids))
+            .subquery()
+        )
+        rows = db.query(ranked).filter(ranked.c.rn == 1).all()
+        
+        states: Dict[int, Optional[VehicleState]] = {vehicle_id: None for vehicle_id in vehicle_ids}
+        for row in rows:
+            states[row.vehicle_id] = VehicleState(
+                latitude=row.latitude,
+                longitude=row.longitude,
+                recorded_at=row.created_at,
+                voltage=getattr(row, 'voltage', None),
+                engine_on=bool(row.engine_on)
+            )
+        return states
+
+
 # ============================================
 # Hard Rules Filter
 # ============================================
@@ -139,6 +303,69 @@ class HardRulesFilter:
         
         return eligible, rejected
     
+    def eligibility_matrix(
+        self,
+        orders: List[Order],
+        vehicles: List[Vehicle]
+    ) -> np.ndarray:
+        """
+        주문 × 차량 배차 가능 여부 행렬 (_check_vehicle_eligibility와 동일한 규칙)
+        
+        Returns:
+            bool 배열 (len(orders), len(vehicles))
+        """
+        n_orders, n_vehicles = len(orders), len(vehicles)
+        vehicle_index = {v.id: idx for idx, v in enumerate(vehicles)}
+        
+        # 1. 차량 상태
+        status_ok = np.array([v.status in [VehicleStatus.AVAILABLE] for v in vehicles], dtype=bool)
+        eligible = np.repeat(status_ok[None, :], n_orders, axis=0)
+        
+        # 2. 온도대 호환성 (온도대별 차량 마스크)
+        zone_masks: Dict[Any, np.ndarray] = {}
+        # 3. 팔렛트 용량 (팔렛트 타입별 차량 최대 용량)
+        capacity_by_type: Dict[str, np.ndarray] = {}
+        
+        for o_idx, order in enumerate(orders):
+            zone = order.temperature_zone
+            if zone not in zone_masks:
+                zone_masks[zone] = np.array(
+                    [is_temperature_compatible(v, zone) for v in vehicles], dtype=bool
+                )
+            
+            pallet_type = getattr(order, 'pallet_type', '11형')
+            if pallet_type not in capacity_by_type:
+                capacity_by_type[pallet_type] = np.array(
+                    [self._pallet_capacity(v, pallet_type) for v in vehicles], dtype=np.float64
+                )
+            
+            eligible[o_idx] &= zone_masks[zone]
+            eligible[o_idx] &= order.pallet_count <= capacity_by_type[pallet_type]
+            
+            # 4. 기피 차량
+            if hasattr(order, 'delivery_client') and order.delivery_client:
+                for vehicle_id in getattr(order.delivery_client, 'blocked_vehicles', []) or []:
+                    v_idx = vehicle_index.get(vehicle_id)
+                    if v_idx is not None:
+                        eligible[o_idx, v_idx] = False
+        
+        logger.info(f"Eligibility matrix: {int(eligible.sum())}/{n_orders * n_vehicles} pairs eligible")
+        
+        return eligible
+    
+    @staticmethod
+    def _pallet_capacity(vehicle: Vehicle, pallet_type: str) -> float:
+        """팔렛트 타입별 최대 적재 수 (check_pallet_capacity와 동일한 기준)"""
+        if pallet_type == "11형":
+            if hasattr(vehicle, 'max_pallets_11type') and vehicle.max_pallets_11type:
+                return vehicle.max_pallets_11type
+            return vehicle.max_pallets
+        elif pallet_type == "12형":
+            if hasattr(vehicle, 'max_pallets_12type') and vehicle.max_pallets_12type:
+                return vehicle.max_pallets_12type
+            return int(vehicle.max_pallets * 0.85)
+        return vehicle.max_pallets
+    
     def _check_vehicle_eligibility(self, order: Order, vehicle: Vehicle) -> Optional[str]:
         """
         차량 배차 가능 여부 체크
@@ -185,18 +412,22 @@ class DistanceOptimizer:
         self, 
         vehicle: Vehicle, 
         order: Order,
-        db: Session
+        db: Session,
+        snapshot: Optional[VehicleStateSnapshot] = None
     ) -> float:
         """
         거리 점수 계산 (0~1, 낮을수록 좋음)
         
+        Args:
+            snapshot: 차량 상태 스냅샷 (있으면 DB 조회 없이 사용)
+        
         Returns:
             0.0 = 최적 (거리 0km)
             1.0 = 기준치 (150km)
             2.0 = 매우 불리 (300km 이상)
         """
         # 차량 현위치 가져오기
-        vehicle_loc = await self._get_vehicle_location(vehicle, db)
+        vehicle_loc = await self._get_vehicle_location(vehicle, db, snapshot)
         
         if not vehicle_loc:
             logger.warning(f"Vehicle {vehicle.code}: No location, using garage")
@@ -251,22 +482,92 @@ class DistanceOptimizer:
         
         return score
     
+    def compute_score_matrix(
+        self,
+        orders: List[Order],
+        vehicles: List[Vehicle],
+        snapshot: VehicleStateSnapshot
+    ) -> np.ndarray:
+        """
+        주문 × 차량 거리 점수 행렬 (compute_score와 동일한 규칙)
+        
+        Returns:
+            float 배열 (len(orders), len(vehicles))
+        """
+        # 차량 위치: 1시간 이내 GPS → 차고지
+        garage_lat, garage_lat_ok = _truthy_array([v.garage_latitude for v in vehicles])
+        garage_lon, garage_lon_ok = _truthy_array([v.garage_longitude for v in vehicles])
+        
+        loc_lat = garage_lat.copy()
+        loc_lon = garage_lon.copy()
+        loc_ok = garage_lat_ok & garage_lon_ok
+        for v_idx, vehicle in enumerate(vehicles):
+            state = snapshot.get(vehicle.id)
+            if state and state.latitude and state.longitude and _is_recent(state.recorded_at, 3600):
+                loc_lat[v_idx] = state.latitude
+                loc_lon[v_idx] = state.longitude
+                loc_ok[v_idx] = True
+        
+        pickup_lat, pickup_lat_ok = _truthy_array([o.pickup_latitude for o in orders])
+        pickup_lon, pickup_lon_ok = _truthy_array([o.pickup_longitude for o in orders])
+        delivery_lat, delivery_lat_ok = _truthy_array([o.delivery_latitude for o in orders])
+        delivery_lon, delivery_lon_ok = _truthy_array([o.delivery_longitude for o in orders])
+        pickup_ok = pickup_lat_ok & pickup_lon_ok
+        
+        with np.errstate(invalid='ignore'):
+            # 공차 거리: 차량 위치 → 상차지
+            empty_distance = haversine_distance_np(
+                loc_lat[None, :], loc_lon[None, :],
+                pickup_lat[:, None], pickup_lon[:, None]
+            )
+            
+            # 실제 운행 거리: 상차지 → 하차지
+            loaded_distance = np.where(
+                delivery_lat_ok & delivery_lon_ok,
+                haversine_distance_np(pickup_lat, pickup_lon, delivery_lat, delivery_lon),
+                0.0
+            )
+            
+            # 복귀 거리: 하차지 → 차고지
+            return_distance = np.where(
+                (delivery_lat_ok & delivery_lon_ok)[:, None] & (garage_lat_ok & garage_lon_ok)[None, :],
+                haversine_distance_np(
+                    delivery_lat[:, None], delivery_lon[:, None],
+                    garage_lat[None, :], garage_lon[None, :]
+                ),
+                0.0
+            )
+            
+            weighted_distance = empty_distance * 2.0 + loaded_distance[:, None] + return_distance
+            scores = np.minimum(weighted_distance / (self.max_empty_distance_km * 3.0), 2.0)
+        
+        scores = np.where(pickup_ok[:, None], scores, 1.0)
+        scores = np.where(loc_ok[None, :], scores, 1.5)  # 위치 없음 페널티
+        
+        return scores
+    
     async def _get_vehicle_location(
         self, 
         vehicle: Vehicle, 
-        db: Session
+        db: Session,
+        snapshot: Optional[VehicleStateSnapshot] = None
     ) -> Optional[Tuple[float, float]]:
         """차량 현재 위치 가져오기 (GPS 최우선)"""
-        latest_gps = (
-            db.query(VehicleGPSLog)
-            .filter(VehicleGPSLog.vehicle_id == vehicle.id)
-            .order_by(VehicleGPSLog.created_at.desc())
-            .first()
-        )
+        if snapshot is not None:
+            latest_gps = snapshot.get(vehicle.id)
+            recorded_at = latest_gps.recorded_at if latest_gps else None
+        else:
+            latest_gps = (
+                db.query(VehicleGPSLog)
+                .filter(VehicleGPSLog.vehicle_id == vehicle.id)
+                .order_by(VehicleGPSLog.created_at.desc())
+                .first()
+            )
+            recorded_at = latest_gps.created_at if latest_gps else None
         
         if latest_gps and latest_gps.latitude and latest_gps.longitude:
             # GPS 데이터가 1시간 이내인지 확인
-            if (datetime.now() - latest_gps.created_at).total_seconds() < 3600:
+            if _is_recent(recorded_at, 3600):
                 return (latest_gps.latitude, latest_gps.longitude)
         
         # Fallback: 차고지
@@ -322,6 +623,27 @@ class RotationEqualizer:
         return score
 
 
+    def compute_scores(self, vehicles: List[Vehicle], all_vehicles: List[Vehicle]) -> np.ndarray:
+        """차량별 회전수 점수 벡터 (compute_score와 동일한 규칙)"""
+        rotation_counts = np.array(
+            [getattr(v, 'rotation_count_this_month', 0) or 0 for v in all_vehicles], dtype=np.float64
+        )
+        current = np.array(
+            [getattr(v, 'rotation_count_this_month', 0) or 0 for v in vehicles], dtype=np.float64
+        )
+        
+        if rotation_counts.size == 0:
+            return np.full(len(vehicles), 0.5)
+        
+        max_rotation = rotation_counts.max()
+        min_rotation = rotation_counts.min()
+        
+        if max_rotation == min_rotation:
+            return np.full(len(vehicles), 0.5)
+        
+        return (current - min_rotation) / (max_rotation - min_rotation)
+
+
 # ============================================
 # ML Agent 3: Time Window Checker
 # ============================================
@@ -414,6 +736,72 @@ class TimeWindowChecker:
         return score
 
 
+    def compute_scores(self, orders: List[Order], now: Optional[datetime] = None) -> np.ndarray:
+        """
+        주문별 시간 여유도 점수 벡터 (compute_score와 동일한 규칙)
+        
+        시간 점수는 차량과 무관하므로 주문 단위로 한 번만 계산합니다.
+        """
+        now = now or datetime.now()
+        n = len(orders)
+        
+        has_window = np.zeros(n, dtype=bool)
+        start_minutes = np.zeros(n)
+        end_minutes = np.zeros(n)
+        for idx, order in enumerate(orders):
+            client = order.delivery_client
+            if not hasattr(client, 'unload_start_time'):
+                continue
+            if not client.unload_start_time or not client.unload_end_time:
+                continue
+            has_window[idx] = True
+            start_minutes[idx] = _hhmm_to_minutes(client.unload_start_time)
+            end_minutes[idx] = _hhmm_to_minutes(client.unload_end_time)
+        
+        # 예상 도착 시간: 현재 + 상차 30분 + 운행 시간 (평균 40km/h)
+        pickup_lat, pickup_ok = _truthy_array([o.pickup_latitude for o in orders])
+        delivery_lat, delivery_ok = _truthy_array([o.delivery_latitude for o in orders])
+        pickup_lon = np.array([o.pickup_longitude or np.nan for o in orders], dtype=np.float64)
+        delivery_lon = np.array([o.delivery_longitude or np.nan for o in orders], dtype=np.float64)
+        
+        with np.errstate(invalid='ignore'):
+            drive_seconds = np.where(
+                pickup_ok & delivery_ok,
+                haversine_distance_np(pickup_lat, pickup_lon, delivery_lat, delivery_lon) / 40.0 * 3600,
+                0.0
+            )
+        
+        now_seconds = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+        arrival_seconds = np.mod(now_seconds + 30 * 60 + drive_seconds, 24 * 3600)
+        arrival = np.floor(arrival_seconds / 60)
+        
+        # 여유 시간 (분)
+        overnight = start_minutes > end_minutes
+        inside_overnight = (arrival >= start_minutes) | (arrival <= end_minutes)
+        inside_normal = (start_minutes <= arrival) & (arrival <= end_minutes)
+        slack = np.where(
+            overnight,
+            np.where(
+                inside_overnight,
+                120,
+                np.minimum(np.abs(arrival - start_minutes), np.abs(arrival - end_minutes))
+            ),
+            np.where(
+                inside_normal,
+                np.minimum(arrival - start_minutes, end_minutes - arrival),
+                -60
+            )
+        )
+        
+        scores = np.select(
+            [slack >= 120, slack >= 30, slack >= 0],
+            [1.0, 0.5 + (slack - 30) / 180.0, slack / 60.0],
+            default=0.0
+        )
+        
+        return np.where(has_window, scores, 0.8)
+
+
 # ============================================
 # ML Agent 4: Preference Matcher
 # ============================================
@@ -464,6 +852,50 @@ class PreferenceMatcher:
         return score
 
 
+    def compute_score_matrix(self, orders: List[Order], vehicles: List[Vehicle]) -> np.ndarray:
+        """주문 × 차량 선호도 점수 행렬 (compute_score와 동일한 규칙)"""
+        n_orders, n_vehicles = len(orders), len(vehicles)
+        vehicle_index = {v.id: idx for idx, v in enumerate(vehicles)}
+        
+        # 선호 하차지 → 차량 인덱스
+        preferred_by_client: Dict[Any, List[int]] = {}
+        one_way_by_client: Dict[Any, List[int]] = {}
+        for v_idx, vehicle in enumerate(vehicles):
+            if hasattr(vehicle, 'preferred_delivery_clients'):
+                for client_id in vehicle.preferred_delivery_clients or []:
+                    preferred_by_client.setdefault(client_id, []).append(v_idx)
+                    if getattr(vehicle, 'is_one_way_fixed', False):
+                        one_way_by_client.setdefault(client_id, []).append(v_idx)
+        
+        ambient_vehicles = np.array(
+            [v.vehicle_type == VehicleType.AMBIENT for v in vehicles], dtype=bool
+        )
+        
+        scores = np.full((n_orders, n_vehicles), 0.5)
+        for o_idx, order in enumerate(orders):
+            row = scores[o_idx]
+            
+            # 선호 하차지
+            row[preferred_by_client.get(order.delivery_client_id, [])] = 0.7
+            
+            # 편도 고정차량
+            one_way = one_way_by_client.get(order.delivery_client_id, [])
+            row[one_way] = np.maximum(row[one_way], 0.8)
+            
+            # 상온 전용 차량 우선순위
+            if order.temperature_zone == TemperatureZone.AMBIENT:
+                row[ambient_vehicles] = np.maximum(row[ambient_vehicles], 0.6)
+            
+            # 고정배차 (최우선)
+            if hasattr(order, 'is_fixed_dispatch') and order.is_fixed_dispatch:
+                for vehicle_id in getattr(order, 'fixed_vehicles', []) or []:
+                    v_idx = vehicle_index.get(vehicle_id)
+                    if v_idx is not None:
+                        row[v_idx] = 1.0
+        
+        return scores
+
+
 # ============================================
 # ML Agent 5: Voltage Safety Checker
 # ============================================
@@ -476,28 +908,39 @@ class VoltageSafetyChecker:
     
     async def compute_score(
         self, 
-        vehicle: Vehicle
+        vehicle: Vehicle,
+        snapshot: Optional[VehicleStateSnapshot] = None
     ) -> float:
         """
         전압 안전성 점수 (0 or 1)
         
+        Args:
+            snapshot: 차량 상태 스냅샷 (있으면 DB 조회 없이 사용)
+        
         Returns:
             1.0 = 안전
             0.0 = 저전압 (배차 불가)
         """
-        # UVIS GPS 데이터 조회
-        latest_gps = (
-            self.db.query(VehicleGPSLog)
-            .filter(VehicleGPSLog.vehicle_id == vehicle.id)
-            .order_by(VehicleGPSLog.created_at.desc())
-            .first()
-        )
-        
-        if not latest_gps:
-            return 1.0  # 데이터 없으면 안전으로 간주
-        
-        voltage = getattr(latest_gps, 'voltage', None)
-        engine_on = getattr(latest_gps, 'engine_on', False)
+        if snapshot is not None:
+            state = snapshot.get(vehicle.id)
+            if not state:
+                return 1.0  # 데이터 없으면 안전으로 간주
+            voltage = state.voltage
+            engine_on = state.engine_on
+        else:
+            # UVIS GPS 데이터 조회
+            latest_gps = (
+                self.db.query(VehicleGPSLog)
+                .filter(VehicleGPSLog.vehicle_id == vehicle.id)
+                .order_by(VehicleGPSLog.created_at.desc())
+                .first()
+            )
+            
+            if not latest_gps:
+                return 1.0  # 데이터 없으면 안전으로 간주
+            
+            voltage = getattr(latest_gps, 'voltage', None)
+            engine_on = getattr(latest_gps, 'engine_on', False)
         
         if voltage is None:
             return 1.0
@@ -515,6 +958,22 @@ class VoltageSafetyChecker:
         return 1.0
 
 
+    def compute_scores(self, vehicles: List[Vehicle], snapshot: VehicleStateSnapshot) -> np.ndarray:
+        """차량별 전압 안전성 점수 벡터 (compute_score와 동일한 규칙)"""
+        scores = np.ones(len(vehicles))
+        
+        for v_idx, vehicle in enumerate(vehicles):
+            state = snapshot.get(vehicle.id)
+            if not state or state.voltage is None:
+                continue
+            if state.engine_on and state.voltage < 26.0:
+                scores[v_idx] = 0.0
+            elif not state.engine_on and state.voltage < 24.0:
+                scores[v_idx] = 0.0
+        
+        return scores
+
+
 # ============================================
 # Meta Coordinator
 # ============================================
@@ -556,6 +1015,29 @@ class MetaCoordinator:
         
         return final_score
     
+    def compute_final_score_matrix(
+        self,
+        distance: np.ndarray,
+        rotation: np.ndarray,
+        time_window: np.ndarray,
+        preference: np.ndarray,
+        voltage: np.ndarray
+    ) -> np.ndarray:
+        """최종 점수 행렬 (compute_final_score와 동일한 가중 합, 브로드캐스팅 지원)"""
+        distance_score = 1.0 - np.minimum(distance, 1.0)  # 반전
+        rotation_score = 1.0 - rotation                   # 반전
+        
+        final_score = (
+            self.weights['distance'] * distance_score +
+            self.weights['rotation'] * rotation_score +
+            self.weights['time_window'] * time_window +
+            self.weights['preference'] * preference +
+            self.weights['voltage'] * voltage
+        )
+        
+        # 전압이 0이면 즉시 배제
+        return np.where(voltage == 0.0, 0.0, final_score)
+    
     def rank_vehicles(
         self,
         eligible_vehicles: List[Vehicle],
@@ -614,8 +1096,26 @@ class MetaCoordinator:
 class MLDispatchService:
     """ML 기반 배차 최적화 서비스"""
     
-    def __init__(self, db: Session):
+    SCORING_MODES = ("matrix", "sequential")
+    
+    def __init__(
+        self,
+        db: Session,
+        snapshot_reuse_seconds: float = 0,
+        scoring_mode: str = "matrix"
+    ):
+        """
+        Args:
+            db: DB 세션
+            snapshot_reuse_seconds: 차량 상태 스냅샷을 요청 간 재사용할 시간(초), 0이면 매 실행마다 로드
+            scoring_mode: 'matrix' (주문×차량 일괄 계산) 또는 'sequential' (주문별 Agent 호출)
+        """
+        if scoring_mode not in self.SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode: {scoring_mode}")
+        
         self.db = db
+        self.snapshot_reuse_seconds = snapshot_reuse_seconds
+        self.scoring_mode = scoring_mode
         
         # Agents 초기화
         self.hard_filter = HardRulesFilter(db)
@@ -641,10 +1141,20 @@ class MLDispatchService:
         """
         logger.info(f"ML Dispatch: {len(orders)} orders, {len(vehicles)} vehicles")
         
+        # 후보 차량 상태를 실행당 한 번만 로드
+        snapshot = self.load_vehicle_snapshot(vehicles)
+        
+        if self.scoring_mode == "matrix":
+            rankings_per_order = self.score_orders_matrix(orders, vehicles, snapshot)
+            return [
+                {'order': order, 'rankings': rankings}
+                for order, rankings in zip(orders, rankings_per_order)
+            ]
+        
         results = []
         
         for order in orders:
-            ranking = await self.optimize_single_order(order, vehicles)
+            ranking = await self.optimize_single_order(order, vehicles, snapshot=snapshot)
             results.append({
                 'order': order,
                 'rankings': ranking
@@ -652,10 +1162,85 @@ class MLDispatchService:
         
         return results
     
+    def score_orders_matrix(
+        self,
+        orders: List[Order],
+        vehicles: List[Vehicle],
+        snapshot: VehicleStateSnapshot
+    ) -> List[List[VehicleRanking]]:
+        """
+        주문 × 차량 행렬로 모든 Agent 점수와 최종 점수를 한 번에 계산
+        
+        optimize_single_order를 주문마다 호출한 것과 같은 VehicleRanking 리스트를 반환합니다.
+        """
+        if not orders:
+            return []
+        if not vehicles:
+            return [[] for _ in orders]
+        
+        eligible = self.hard_filter.eligibility_matrix(orders, vehicles)
+        
+        distance = self.distance_optimizer.compute_score_matrix(orders, vehicles, snapshot)
+        rotation = self.rotation_equalizer.compute_scores(vehicles, vehicles)
+        time_window = self.time_window_checker.compute_scores(orders)
+        preference = self.preference_matcher.compute_score_matrix(orders, vehicles)
+        voltage = self.voltage_checker.compute_scores(vehicles, snapshot)
+        
+        final = self.meta_coordinator.compute_final_score_matrix(
+            distance,
+            rotation[None, :],
+            time_window[:, None],
+            preference,
+            voltage[None, :]
+        )
+        
+        results = []
+        for o_idx, order in enumerate(orders):
+            candidates = np.flatnonzero(eligible[o_idx])
+            
+            if candidates.size == 0:
+                logger.warning(f"Order {order.order_number}: No eligible vehicles!")
+                results.append([])
+                continue
+            
+            # 점수 높은 순 (동점은 입력 차량 순서 유지 - list.sort와 동일)
+            ordered = candidates[np.argsort(-final[o_idx, candidates], kind='stable')]
+            
+            rankings = []
+            for v_idx in ordered:
+                agent_scores = AgentScore(
+                    distance=float(distance[o_idx, v_idx]),
+                    rotation=float(rotation[v_idx]),
+                    time_window=float(time_window[o_idx]),
+                    preference=float(preference[o_idx, v_idx]),
+                    voltage=float(voltage[v_idx])
+                )
+                total_score = float(final[o_idx, v_idx])
+                rankings.append(VehicleRanking(
+                    vehicle=vehicles[v_idx],
+                    total_score=total_score,
+                    agent_scores=agent_scores,
+                    reason=self.meta_coordinator._generate_reason(agent_scores, total_score)
+                ))
+            results.append(rankings)
+        
+        logger.info(f"ML Dispatch (matrix): scored {len(orders)}x{len(vehicles)} pairs")
+        
+        return results
+    
+    def load_vehicle_snapshot(self, vehicles: List[Vehicle]) -> VehicleStateSnapshot:
+        """후보 차량들의 최신 GPS/전압 스냅샷 로드"""
+        return VehicleStateSnapshot.load(
+            self.db,
+            [v.id for v in vehicles],
+            reuse_seconds=self.snapshot_reuse_seconds
+        )
+    
     async def optimize_single_order(
         self,
         order: Order,
-        vehicles: List[Vehicle]
+        vehicles: List[Vehicle],
+        snapshot: Optional[VehicleStateSnapshot] = None
     ) -> List[VehicleRanking]:
         """단일 주문에 대한 차량 순위 결정"""
         
@@ -667,6 +1252,9 @@ class MLDispatchService:
             logger.warning(f"Rejection reasons: {rejected}")
             return []
         
+        if snapshot is None:
+            snapshot = self.load_vehicle_snapshot(eligible_vehicles)
+        
         # Step 2: ML Agent 점수 계산
         agent_scores_map = {}
         
@@ -674,7 +1262,7 @@ class MLDispatchService:
             scores = AgentScore()
             
             # Distance
-            scores.distance = await self.distance_optimizer.compute_score(vehicle, order, self.db)
+            scores.distance = await self.distance_optimizer.compute_score(vehicle, order, self.db, snapshot)
             
             # Rotation
             scores.rotation = self.rotation_equalizer.compute_score(vehicle, vehicles)
@@ -686,7 +1274,7 @@ class MLDispatchService:
             scores.preference = self.preference_matcher.compute_score(vehicle, order)
             
             # Voltage
-            scores.voltage = await self.voltage_checker.compute_score(vehicle)
+            scores.voltage = await self.voltage_checker.compute_score(vehicle, snapshot)
             
             agent_scores_map[vehicle.id] = scores
         
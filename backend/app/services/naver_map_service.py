@@ -1,11 +1,153 @@
+import asyncio
+import json
+import time
 import httpx
 import logging
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class AsyncTokenBucket:
+    """
+    비동기 토큰 버킷 Rate Limiter
+    
+    초당 rate개의 토큰이 채워지며, 최대 capacity개까지 버스트를 허용합니다.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """토큰 1개 획득 (부족하면 채워질 때까지 대기)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RoutePairCache:
+    """
+    위치 쌍 거리/시간 캐시
+    - 프로세스 메모리 캐시 (TTL, 최대 max_entries 개 LRU)
+    - Redis 영속 캐시 (SETEX TTL, 재시작/다중 워커 간 공유)
+    
+    Redis에 연결할 수 없으면 메모리 캐시만 사용합니다.
+    """
+    
+    KEY_PREFIX = "naver:route"
+    REDIS_RETRY_SECONDS = 60
+    
+    def __init__(
+        self,
+        ttl_seconds: int,
+        redis_url: Optional[str] = None,
+        precision: int = 5,
+        max_entries: int = 50000
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self.precision = precision
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, float]]]" = OrderedDict()
+        self._redis = None
+        self._redis_retry_at = 0.0
+    
+    def make_key(self, origin: Tuple[float, float], dest: Tuple[float, float]) -> str:
+        """좌표를 반올림하여 캐시 키 생성 (약 1m 정밀도)"""
+        p = self.precision
+        return (
+            f"{self.KEY_PREFIX}:{round(origin[0], p)},{round(origin[1], p)}"
+            f":{round(dest[0], p)},{round(dest[1], p)}"
+        )
+    
+    async def _get_redis(self):
+        if self._redis is not None or not self.redis_url or time.monotonic() < self._redis_retry_at:
+            return self._redis
+        try:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+            await self._redis.ping()
+        except Exception as e:
+            logger.warning(f"Route cache Redis unavailable, using memory cache only: {e}")
+            self._redis = None
+            self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_SECONDS
+        return self._redis
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Dict[str, float]]:
+        """여러 키를 한 번에 조회 (메모리 → Redis MGET)"""
+        now = time.monotonic()
+        found: Dict[str, Dict[str, float]] = {}
+        missing: List[str] = []
+        
+        for key in keys:
+            entry = self._memory.get(key)
+            if entry and entry[0] > now:
+                found[key] = entry[1]
+                self._memory.move_to_end(key)
+            else:
+                self._memory.pop(key, None)
+                missing.append(key)
+        
+        redis_client = await self._get_redis()
+        if redis_client and missing:
+            try:
+                values = await redis_client.mget(missing)
+                expires_at = now + self.ttl_seconds
+                for key, raw in zip(missing, values):
+                    if raw:
+                        value = json.loads(raw)
+                        found[key] = value
+                        self._remember(key, expires_at, value)
+            except Exception as e:
+                logger.warning(f"Route cache read error: {e}")
+        
+        return found
+    
+    async def set_many(self, items: Dict[str, Dict[str, float]]):
+        """여러 키를 한 번에 저장 (메모리 + Redis 파이프라인)"""
+        if not items:
+            return
+        
+        expires_at = time.monotonic() + self.ttl_seconds
+        for key, value in items.items():
+            self._remember(key, expires_at, value)
+        
+        redis_client = await self._get_redis()
+        if redis_client:
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for key, value in items.items():
+                        pipe.setex(key, self.ttl_seconds, json.dumps(value))
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Route cache write error: {e}")
+    
+    def _remember(self, key: str, expires_at: float, value: Dict[str, float]):
+        """메모리 캐시 저장 (최근 사용 순서 갱신, 한도 초과 시 가장 오래된 항목 제거)"""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def clear_memory(self):
+        """메모리 캐시 비우기"""
+        self._memory.clear()
+
+
 class NaverMapService:
     """
     네이버 지도 API 연동 서비스
@@ -18,16 +160,38 @@ class NaverMapService:
     BASE_URL_REVERSE_GEOCODING = "https://naveropenapi.apigw.ntruss.com/map-reversegeocode/v2/gc"
     BASE_URL_DIRECTIONS = "https://naveropenapi.apigw.ntruss.com/map-direction/v1/driving"
     
-    def __init__(self, client_id: Optional[str] = None, client_secret: Optional[str] = None):
+    # 프로세스 공용 위치 쌍 캐시 (인스턴스 간 공유)
+    _route_cache: Optional[RoutePairCache] = None
+    
+    def __init__(
+        self,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+        directions_url: Optional[str] = None,
+        route_cache: Optional[RoutePairCache] = None
+    ):
         """
         Initialize Naver Map Service
         
         Args:
             client_id: 네이버 클라우드 플랫폼 Client ID (설정 파일에서 읽어옴)
             client_secret: 네이버 클라우드 플랫폼 Client Secret (설정 파일에서 읽어옴)
+            directions_url: Directions API URL (테스트용 스텁 서버 지정 시 사용)
+            route_cache: 위치 쌍 캐시 (미지정 시 프로세스 공용 캐시)
         """
         self.client_id = client_id or getattr(settings, "NAVER_MAP_CLIENT_ID", None)
         self.client_secret = client_secret or getattr(settings, "NAVER_MAP_CLIENT_SECRET", None)
+        self.directions_url = directions_url or self.BASE_URL_DIRECTIONS
+        
+        if route_cache is None:
+            if NaverMapService._route_cache is None:
+                NaverMapService._route_cache = RoutePairCache(
+                    ttl_seconds=settings.NAVER_ROUTE_CACHE_TTL_SECONDS,
+                    redis_url=settings.REDIS_URL,
+                    max_entries=settings.NAVER_ROUTE_CACHE_MAX_ENTRIES
+                )
+            route_cache = NaverMapService._route_cache
+        self.route_cache = route_cache
         
         if not self.client_id or not self.client_secret:
             logger.warning("Naver Map API credentials not configured. Distance/duration calculation will be simulated.")
@@ -193,52 +357,69 @@ class NaverMapService:
             logger.warning("Naver Map API not configured. Using simulated distance/duration.")
             return self._simulate_distance_and_duration(origin_lat, origin_lng, dest_lat, dest_lng)
         
+        async with httpx.AsyncClient() as client:
+            result = await self._request_directions(client, origin_lat, origin_lng, dest_lat, dest_lng)
+        
+        if result is None:
+            return self._simulate_distance_and_duration(origin_lat, origin_lng, dest_lat, dest_lng)
+        
+        logger.info(f"Route calculated: {result['distance_km']}km, {result['duration_minutes']}분")
+        return result
+    
+    async def _request_directions(
+        self,
+        client: httpx.AsyncClient,
+        origin_lat: float,
+        origin_lng: float,
+        dest_lat: float,
+        dest_lng: float
+    ) -> Optional[Dict[str, float]]:
+        """
+        Directions API 단일 요청
+        
+        Returns:
+            {"distance_km", "duration_minutes"} 또는 실패 시 None
+        """
         try:
-            async with httpx.AsyncClient() as client:
-                # 네이버 Directions API 요청
-                response = await client.get(
-                    self.BASE_URL_DIRECTIONS,
-                    headers={
-                        "X-NCP-APIGW-API-KEY-ID": self.client_id,
-                        "X-NCP-APIGW-API-KEY": self.client_secret
-                    },
-                    params={
-                        "start": f"{origin_lng},{origin_lat}",  # 경도, 위도 순서
-                        "goal": f"{dest_lng},{dest_lat}",
-                        "option": "trafast"  # 실시간 빠른길
-                    }
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Directions API failed: {response.status_code} - {response.text}")
-                    return self._simulate_distance_and_duration(origin_lat, origin_lng, dest_lat, dest_lng)
-                
-                data = response.json()
-                
-                if data.get("code") != 0 or not data.get("route"):
-                    logger.warning(f"No route found: {data.get('message', 'Unknown error')}")
-                    return self._simulate_distance_and_duration(origin_lat, origin_lng, dest_lat, dest_lng)
-                
-                # trafast 결과 파싱
-                route = data["route"]["trafast"][0]
-                summary = route["summary"]
-                
-                distance_meters = summary["distance"]
-                duration_ms = summary["duration"]
-                
-                distance_km = round(distance_meters / 1000, 2)
-                duration_minutes = round(duration_ms / 60000, 0)
-                
-                logger.info(f"Route calculated: {distance_km}km, {duration_minutes}분")
-                
-                return {
-                    "distance_km": distance_km,
-                    "duration_minutes": duration_minutes
+            # 네이버 Directions API 요청
+            response = await client.get(
+                self.directions_url,
+                headers={
+                    "X-NCP-APIGW-API-KEY-ID": self.client_id,
+                    "X-NCP-APIGW-API-KEY": self.client_secret
+                },
+                params={
+                    "start": f"{origin_lng},{origin_lat}",  # 경도, 위도 순서
+                    "goal": f"{dest_lng},{dest_lat}",
+                    "option": "trafast"  # 실시간 빠른길
                 }
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Directions API failed: {response.status_code} - {response.text}")
+                return None
+            
+            data = response.json()
+            
+            if data.get("code") != 0 or not data.get("route"):
+                logger.warning(f"No route found: {data.get('message', 'Unknown error')}")
+                return None
+            
+            # trafast 결과 파싱
+            route = data["route"]["trafast"][0]
+            summary = route["summary"]
+            
+            distance_meters = summary["distance"]
+            duration_ms = summary["duration"]
+            
+            return {
+                "distance_km": round(distance_meters / 1000, 2),
+                "duration_minutes": round(duration_ms / 60000, 0)
+            }
         
         except Exception as e:
             logger.error(f"Distance/duration calculation error: {e}")
-            return self._simulate_distance_and_duration(origin_lat, origin_lng, dest_lat, dest_lng)
+            return None
     
     def _simulate_distance_and_duration(
         self,
@@ -350,11 +531,16 @@ class NaverMapService:
         """
         여러 위치 간의 거리 및 시간 행렬 생성
         
+        - 동일 좌표 쌍은 한 번만 조회
+        - 캐시(메모리 + Redis)에 있는 쌍은 API를 호출하지 않음
+        - 나머지는 공용 커넥션 풀에서 동시 요청 (토큰 버킷으로 초당 요청 수 제한)
+        - 개별 요청 실패 시 해당 쌍만 하버사인 시뮬레이션으로 대체
+        
         Args:
             locations: [(lat, lng), ...] 형식의 위치 리스트
-            use_cache: 캐시 사용 여부 (현재는 미구현, 향후 확장용)
-            batch_size: API 호출 배치 크기 (현재는 미구현, 향후 확장용)
-            delay_ms: API 호출 간 대기 시간(ms) (현재는 미구현, 향후 Rate Limit 대응용)
+            use_cache: 위치 쌍 캐시 사용 여부
+            batch_size: 최대 동시 API 요청 수
+            delay_ms: API 호출 간 최소 간격(ms). 0이면 설정값(NAVER_DIRECTIONS_RATE_PER_SECOND) 사용
             **kwargs: 추가 매개변수 (향후 확장용)
             
         Returns:
@@ -366,22 +552,64 @@ class NaverMapService:
         distance_matrix = [[0.0] * n for _ in range(n)]
         duration_matrix = [[0.0] * n for _ in range(n)]
         
-        # 모든 위치 쌍에 대해 거리/시간 계산
+        # 고유 좌표 쌍별 행렬 셀 목록 (같은 위치는 거리/시간 0)
+        pair_cells: Dict[str, List[Tuple[int, int]]] = {}
+        pair_coords: Dict[str, Tuple[Tuple[float, float], Tuple[float, float]]] = {}
         for i in range(n):
             for j in range(n):
-                if i == j:
-                    # 같은 위치는 거리/시간 0
-                    distance_matrix[i][j] = 0.0
-                    duration_matrix[i][j] = 0.0
-                else:
-                    # 거리 및 시간 계산
-                    result = await self.calculate_distance_and_duration(
-                        locations[i][0], locations[i][1],
-                        locations[j][0], locations[j][1]
-                    )
-                    
-                    distance_matrix[i][j] = result.get("distance_km", 0.0)
-                    duration_matrix[i][j] = result.get("duration_minutes", 0.0)
-        
-        logger.info(f"Distance matrix created for {n} locations")
+                if i == j or tuple(locations[i]) == tuple(locations[j]):
+                    continue
+                key = self.route_cache.make_key(locations[i], locations[j])
+                pair_cells.setdefault(key, []).append((i, j))
+                pair_coords[key] = (locations[i], locations[j])
+        
+        results: Dict[str, Dict[str, float]] = {}
+        if use_cache and pair_cells:
+            results = await self.route_cache.get_many(list(pair_cells))
+        
+        pending = [key for key in pair_cells if key not in results]
+        fetched: Dict[str, Dict[str, float]] = {}
+        simulated = 0
+        
+        if pending and self.client_id and self.client_secret:
+            concurrency = max(1, batch_size or settings.NAVER_DIRECTIONS_MAX_CONCURRENCY)
+            rate = 1000.0 / delay_ms if delay_ms else settings.NAVER_DIRECTIONS_RATE_PER_SECOND
+            bucket = AsyncTokenBucket(rate=rate, capacity=concurrency)
+            semaphore = asyncio.Semaphore(concurrency)
+            limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+            
+            async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(10.0)) as client:
+                async def fetch(key: str):
+                    (o_lat, o_lng), (d_lat, d_lng) = pair_coords[key]
+                    async with semaphore:
+                        await bucket.acquire()
+                        result = await self._request_directions(client, o_lat, o_lng, d_lat, d_lng)
+                    if result is not None:
+                        fetched[key] = result
+                
+                await asyncio.gather(*(fetch(key) for key in pending))
+            
+            if use_cache:
+                await self.route_cache.set_many(fetched)
+        
+        results.update(fetched)
+        
+        # API 실패 또는 미설정 쌍은 개별적으로 시뮬레이션 값 사용 (캐시에 저장하지 않음)
+        for key in pending:
+            if key not in results:
+                (o_lat, o_lng), (d_lat, d_lng) = pair_coords[key]
+                results[key] = self._simulate_distance_and_duration(o_lat, o_lng, d_lat, d_lng)
+                simulated += 1
+        
+        for key, cells in pair_cells.items():
+            result = results[key]
+            for i, j in cells:
+                distance_matrix[i][j] = result.get("distance_km", 0.0)
+                duration_matrix[i][j] = result.get("duration_minutes", 0.0)
+        
+        logger.info(
+            f"Distance matrix created for {n} locations "
+            f"(pairs={len(pair_cells)}, cached={len(pair_cells) - len(pending)}, "
+            f"fetched={len(fetched)}, simulated={simulated})"
+        )
         return distance_matrix, duration_matrix
@@ -0,0 +1,340 @@
+"""
+최적화 작업 큐
+- 최적화 요청은 즉시 job_id 로 응답하고 백그라운드에서 실행
+- 동시 실행 수 제한 (OPTIMIZATION_JOB_MAX_CONCURRENCY), 초과분은 대기열에서 순서대로 실행
+- 진행 상황(현재 최적 비용, 진행률)을 WebSocket 채널로 스트리밍
+- 결과는 보존 기간 동안 조회 가능 (프로세스 메모리 + Redis)
+"""
+
+import asyncio
+import json
+import queue
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+
+from app.core.config import settings
+from app.services.solver_pool import SolverProgressReporter, get_progress_queue
+from app.websocket.connection_manager import manager
+
+
+class JobStatus(str, Enum):
+    """작업 상태"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class OptimizationJob:
+    """최적화 작업"""
+    job_id: str
+    kind: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    user_id: Optional[int] = None
+    status: JobStatus = JobStatus.QUEUED
+    progress: float = 0.0  # 0 ~ 100
+    message: Optional[str] = None
+    best_cost: Optional[float] = None
+    solutions_found: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "params": self.params,
+            "user_id": self.user_id,
+            "status": self.status.value,
+            "progress": round(self.progress, 1),
+            "message": self.message,
+            "best_cost": self.best_cost,
+            "solutions_found": self.solutions_found,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+JobRunner = Callable[[OptimizationJob], Awaitable[Any]]
+
+
+class OptimizationJobService:
+    """
+    최적화 작업 큐 서비스
+
+    runner 는 OptimizationJob 을 받아 결과(JSON 직렬화 가능)를 반환하는 코루틴 함수입니다.
+    요청 DB 세션은 응답 후 닫히므로 runner 는 자체 세션을 열어야 합니다.
+    """
+
+    CHANNEL = "optimization_jobs"
+    KEY_PREFIX = "optimization:job"
+    REDIS_RETRY_SECONDS = 60
+
+    def __init__(
+        self,
+        max_concurrency: int = 2,
+        result_ttl_seconds: int = 86400,
+        max_jobs: int = 500,
+        redis_url: Optional[str] = None
+    ):
+        self.max_concurrency = max_concurrency
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_jobs = max_jobs
+        self.redis_url = redis_url
+
+        self._jobs: "OrderedDict[str, OptimizationJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._progress_task: Optional[asyncio.Task] = None
+        self._redis = None
+        self._redis_retry_at = 0.0
+
+    @staticmethod
+    def job_channel(job_id: str) -> str:
+        """작업별 WebSocket 채널 이름"""
+        return f"{OptimizationJobService.CHANNEL}:{job_id}"
+
+    async def submit(
+        self,
+        kind: str,
+        runner: JobRunner,
+        params: Optional[Dict[str, Any]] = None,
+        user_id: Optional[int] = None
+    ) -> OptimizationJob:
+        """작업 등록 (즉시 반환, 실행은 백그라운드)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        job = OptimizationJob(
+            job_id=uuid.uuid4().hex,
+            kind=kind,
+            params=jsonable_encoder(params or {}),
+            user_id=user_id
+        )
+        self._jobs[job.job_id] = job
+        self._prune()
+
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job, runner))
+        logger.info(f"최적화 작업 등록: {job.job_id} ({kind})")
+        await self._broadcast(job, "job_queued")
+        return job
+
+    async def _run(self, job: OptimizationJob, runner: JobRunner):
+        try:
+            async with self._semaphore:
+                job.status = JobStatus.RUNNING
+                job.started_at = datetime.now()
+                await self._broadcast(job, "job_started")
+
+                try:
+                    result = await runner(job)
+                    job.result = jsonable_encoder(result)
+                    job.status = JobStatus.COMPLETED
+                    job.progress = 100.0
+                except Exception as e:
+                    logger.error(f"최적화 작업 실패: {job.job_id} ({job.kind}): {e}")
+                    job.error = str(e)
+                    job.status = JobStatus.FAILED
+                finally:
+                    job.finished_at = datetime.now()
+
+            await self._persist(job)
+            await self._broadcast(job, "job_completed" if job.status == JobStatus.COMPLETED else "job_failed")
+            logger.info(
+                f"최적화 작업 종료: {job.job_id} ({job.status.value}, "
+                f"{(job.finished_at - job.started_at).total_seconds():.2f}초)"
+            )
+        finally:
+            self._tasks.pop(job.job_id, None)
+
+    async def report_progress(
+        self,
+        job_id: str,
+        progress: Optional[float] = None,
+        message: Optional[str] = None,
+        best_cost: Optional[float] = None,
+        solutions_found: Optional[int] = None
+    ):
+        """진행 상황 갱신 및 스트리밍"""
+        job = self._jobs.get(job_id)
+        if not job or job.is_finished:
+            return
+
+        if progress is not None:
+            job.progress = max(0.0, min(100.0, progress))
+        if message is not None:
+            job.message = message
+        if best_cost is not None:
+            job.best_cost = best_cost
+        if solutions_found is not None:
+            job.solutions_found = solutions_found
+
+        await self._broadcast(job, "job_progress")
+
+    def solver_progress(self, job_id: str, min_interval: float = 0.5) -> SolverProgressReporter:
+        """
+        솔버 프로세스에 넘길 진행 상황 전달자 생성
+
+        솔버 콜백 → 진행 상황 큐 → report_progress 로 이어집니다.
+        """
+        reporter = SolverProgressReporter(get_progress_queue(), job_id, min_interval)
+        if self._progress_task is None or self._progress_task.done():
+            self._progress_task = asyncio.create_task(self._drain_solver_progress())
+        return reporter
+
+    async def _drain_solver_progress(self):
+        """진행 상황 큐를 읽어 작업에 반영 (블로킹 get 은 스레드에서)"""
+        progress_queue = get_progress_queue()
+
+        def _get():
+            try:
+                return progress_queue.get(timeout=0.5)
+            except queue.Empty:
+                return None
+
+        try:
+            while True:
+                try:
+                    item = await asyncio.to_thread(_get)
+                except (EOFError, BrokenPipeError, ConnectionError):
+                    # Manager 종료 (셧다운)
+                    return
+                if item is None:
+                    if not self._tasks:
+                        return
+                    continue
+                await self.report_progress(
+                    item["key"],
+                    message=f"해 탐색 중 ({item['elapsed_seconds']}초)",
+                    best_cost=item["best_cost"],
+                    solutions_found=item["solutions_found"]
+                )
+        except asyncio.CancelledError:
+            pass
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 조회 (메모리 → Redis)"""
+        job = self._jobs.get(job_id)
+        if job:
+            return job.to_dict()
+
+        redis_client = await self._get_redis()
+        if redis_client:
+            try:
+                raw = await redis_client.get(f"{self.KEY_PREFIX}:{job_id}")
+                if raw:
+                    return json.loads(raw)
+            except Exception as e:
+                logger.warning(f"최적화 작업 조회 Redis 오류: {e}")
+        return None
+
+    def list_jobs(
+        self,
+        kind: Optional[str] = None,
+        user_id: Optional[int] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """최근 작업 목록 (결과 제외, 최신순)"""
+        jobs = [
+            job for job in reversed(self._jobs.values())
+            if (kind is None or job.kind == kind) and (user_id is None or job.user_id == user_id)
+        ]
+        return [job.to_dict(include_result=False) for job in jobs[:limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """작업 큐 통계"""
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+        return {"max_concurrency": self.max_concurrency, "jobs": counts}
+
+    async def stop(self):
+        """실행 중인 작업 및 진행 상황 수신 중지"""
+        tasks = list(self._tasks.values())
+        if self._progress_task:
+            tasks.append(self._progress_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._progress_task = None
+
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    def _prune(self):
+        """보존 기간이 지났거나 한도를 넘은 완료 작업 제거"""
+        now = datetime.now()
+        for job_id, job in list(self._jobs.items()):
+            expired = job.is_finished and (now - job.finished_at).total_seconds() > self.result_ttl_seconds
+            if expired or (len(self._jobs) > self.max_jobs and job.is_finished):
+                del self._jobs[job_id]
+
+    async def _broadcast(self, job: OptimizationJob, event: str):
+        message = {
+            "type": event,
+            "job": job.to_dict(include_result=event == "job_completed"),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        for channel in (self.job_channel(job.job_id), self.CHANNEL):
+            # Redis 연결 시 Pub/Sub 리스너가 로컬 채널에도 전달 (중복 전송 방지)
+            if manager.redis_client:
+                await manager.publish_to_redis(channel, message)
+            else:
+                await manager.broadcast_to_channel(channel, message)
+
+    async def _persist(self, job: OptimizationJob):
+        """완료된 작업을 Redis에 저장 (다른 워커에서도 조회 가능)"""
+        redis_client = await self._get_redis()
+        if not redis_client:
+            return
+        try:
+            await redis_client.setex(
+                f"{self.KEY_PREFIX}:{job.job_id}",
+                self.result_ttl_seconds,
+                json.dumps(job.to_dict(), default=str)
+            )
+        except Exception as e:
+            logger.warning(f"최적화 작업 저장 Redis 오류: {e}")
+
+    async def _get_redis(self):
+        if self._redis is not None or not self.redis_url or time.monotonic() < self._redis_retry_at:
+            return self._redis
+        try:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+            await self._redis.ping()
+        except Exception as e:
+            logger.warning(f"Optimization job Redis unavailable, using memory store only: {e}")
+            self._redis = None
+            self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_SECONDS
+        return self._redis
+
+
+# Global instance
+optimization_job_service = OptimizationJobService(
+    max_concurrency=settings.OPTIMIZATION_JOB_MAX_CONCURRENCY,
+    result_ttl_seconds=settings.OPTIMIZATION_JOB_RESULT_TTL_SECONDS,
+    redis_url=settings.REDIS_URL
+)
@@ -0,0 +1,407 @@
+"""
+Ranking Service - 기사 / 차량 / 고객 성과 일괄 계산
+- 엔티티별 지표를 GROUP BY 집계 쿼리 1회로 적재하고 점수 / 등급 / 순위는 pandas 로 벡터 계산
+- 단건 평가(evaluate_driver 등)도 같은 적재 / 점수 함수를 id 필터로 사용하므로 랭킹과 점수가 같음
+- top-N: 정렬 키가 SQL 집계로 정해지면(고객 매출) ORDER BY ... LIMIT, 점수 정렬은 벡터 계산 후 상위 N
+
+실제 컬럼이 없는 항목은 다음 값으로 계산합니다.
+- 배차의 주문: 하차(DELIVERY) 경로의 주문 (dispatch_routes.order_id)
+- 배송 완료: DELIVERED 주문, 완료 시각은 마지막 수정 시각 (updated_at)
+- 지연: 희망 배송일(requested_delivery_date) 이후 배송완료 (희망일 없으면 정시)
+- 적재율: 배차 팔레트 / 차량 최대 팔레트 (total_pallets / max_pallets)
+- 주행 거리: 배차 총 주행거리 (total_distance_km)
+- 고객: 주문의 상차 거래처 (pickup_client_id, 청구 기준과 동일), 매출은 기간 내 배차의 청구 항목 금액
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, case, distinct, func, select
+from sqlalchemy.orm import Session
+
+from app.models.billing import Invoice, InvoiceLineItem
+from app.models.client import Client
+from app.models.dispatch import Dispatch, DispatchRoute, RouteType
+from app.models.driver import Driver
+from app.models.order import Order, OrderStatus
+from app.models.vehicle import Vehicle
+from app.services.kpi_engine import hours_between
+
+
+DateLike = Union[date, datetime]
+Grades = Sequence[Tuple[float, str]]
+
+DRIVER_WEIGHTS = {
+    "delivery_completion": 0.25,
+    "on_time_delivery": 0.25,
+    "efficiency": 0.20,
+    "safety": 0.15,
+    "customer_satisfaction": 0.15,
+}
+DRIVER_GRADES: Grades = ((90, "S (우수)"), (80, "A (양호)"), (70, "B (보통)"), (60, "C (개선 필요)"))
+DRIVER_GRADE_FLOOR = "D (긴급 개선 필요)"
+
+CUSTOMER_GRADES: Grades = ((90, "A+ (매우 만족)"), (80, "A (만족)"), (70, "B (보통)"), (60, "C (개선 필요)"))
+CUSTOMER_GRADE_FLOOR = "D (불만족)"
+
+DEFAULT_PALLET_CAPACITY = 30      # 최대 팔레트 미등록 차량
+ESTIMATED_FUEL_EFFICIENCY = 5.5   # km/L (냉동차 기준 추정치)
+ESTIMATED_DISTANCE_EFFICIENCY = 90.0
+
+
+def grade_for(score: float, grades: Grades, floor: str) -> str:
+    """점수 -> 등급 (단건)"""
+    for threshold, label in grades:
+        if score >= threshold:
+            return label
+    return floor
+
+
+def grade_series(scores: pd.Series, grades: Grades, floor: str) -> pd.Series:
+    """점수 -> 등급 (벡터)"""
+    labels = np.select([scores >= threshold for threshold, _ in grades], [label for _, label in grades], floor)
+    return pd.Series(labels, index=scores.index)
+
+
+def _as_date(value: DateLike) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _count_if(*conditions):
+    return func.coalesce(func.sum(case((and_(*conditions), 1), else_=0)), 0)
+
+
+def _rate(numerator: pd.Series, denominator: pd.Series, default: float) -> pd.Series:
+    """백분율 (분모 0 이면 default)"""
+    return (numerator / denominator.where(denominator > 0) * 100).fillna(default)
+
+
+def _frame(result) -> pd.DataFrame:
+    return pd.DataFrame(result.all(), columns=list(result.keys()))
+
+
+def rank_by(df: pd.DataFrame, score: str, key: str, limit: Optional[int] = None) -> pd.DataFrame:
+    """점수 내림차순(동점은 key 오름차순) 정렬 후 rank 부여, limit 지정 시 상위 N"""
+    ranked = df.sort_values([score, key], ascending=[False, True], kind="mergesort")
+    if limit is not None:
+        ranked = ranked.head(limit)
+    ranked = ranked.reset_index(drop=True)
+    ranked["rank"] = ranked.index + 1
+    return ranked
+
+
+class RankingService:
+    """기사 / 차량 / 고객 지표 일괄 집계"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ========================================
+    # 배차 단위 집계 (기사 / 차량 공용)
+    # ========================================
+
+    def _dispatch_rows(self, start: date, end: date, *filters):
+        """기간 내 배차별 주문 수 / 배송완료 / 지연 (배차당 1행 서브쿼리)"""
+        delivered = Order.status == OrderStatus.DELIVERED
+        late = and_(
+            delivered,
+            Order.requested_delivery_date.isnot(None),
+            func.date(Order.updated_at) > Order.requested_delivery_date,
+        )
+        return (
+            select(
+                Dispatch.id.label("dispatch_id"),
+                Dispatch.vehicle_id,
+                Dispatch.driver_id,
+                Dispatch.dispatch_date,
+                func.coalesce(Dispatch.total_pallets, 0).label("total_pallets"),
+                func.coalesce(Dispatch.total_distance_km, 0).label("total_distance_km"),
+                func.count(Order.id).label("orders"),
+                _count_if(delivered).label("delivered"),
+                _count_if(late).label("late"),
+            )
+            .select_from(Dispatch)
+            .outerjoin(DispatchRoute, and_(
+                DispatchRoute.dispatch_id == Dispatch.id,
+                DispatchRoute.route_type == RouteType.DELIVERY,
+            ))
+            .outerjoin(Order, Order.id == DispatchRoute.order_id)
+            .where(Dispatch.dispatch_date >= start, Dispatch.dispatch_date <= end, *filters)
+            .group_by(Dispatch.id)
+            .subquery()
+        )
+
+    # ========================================
+    # 기사
+    # ========================================
+
+    def driver_scores(
+        self,
+        start_date: DateLike,
+        end_date: DateLike,
+        driver_ids: Optional[Iterable[int]] = None,
+    ) -> pd.DataFrame:
+        """
+        기간 내 배차가 있는 기사별 평가 점수 (쿼리 1회)
+
+        columns: driver_id, driver_name, dispatches, orders, delivered,
+                 delivery_completion, on_time_delivery, efficiency, safety,
+                 customer_satisfaction, overall_score, grade
+        """
+        filters = [Dispatch.driver_id.isnot(None)]
+        if driver_ids is not None:
+            filters.append(Dispatch.driver_id.in_(list(driver_ids)))
+        rows = self._dispatch_rows(_as_date(start_date), _as_date(end_date), *filters)
+
+        df = _frame(self.db.execute(
+            select(
+                Driver.id.label("driver_id"),
+                Driver.name.label("driver_name"),
+                func.count(rows.c.dispatch_id).label("dispatches"),
+                func.sum(rows.c.orders).label("orders"),
+                func.sum(rows.c.delivered).label("delivered"),
+                func.sum(rows.c.late).label("late"),
+            )
+            .join(rows, rows.c.driver_id == Driver.id)
+            .group_by(Driver.id, Driver.name)
+            .order_by(Driver.id)
+        ))
+        return self._score_drivers(df)
+
+    @staticmethod
+    def _score_drivers(df: pd.DataFrame) -> pd.DataFrame:
+        orders, delivered, late = df["orders"].astype(float), df["delivered"].astype(float), df["late"].astype(float)
+
+        df["delivery_completion"] = _rate(delivered, orders, 100.0)
+        df["on_time_delivery"] = _rate(delivered - late, delivered, 100.0)
+        # 배차당 5건 이상이면 만점
+        df["efficiency"] = (orders / df["dispatches"] / 5 * 100).clip(upper=100)
+        # 지연율만큼 최대 20점 감점, 최소 60점
+        df["safety"] = (100 - (late / delivered.where(delivered > 0)).fillna(0) * 20).clip(lower=60)
+        df["customer_satisfaction"] = df["delivery_completion"] * 0.5 + df["on_time_delivery"] * 0.5
+
+        df["overall_score"] = sum(df[column] * weight for column, weight in DRIVER_WEIGHTS.items())
+        df["grade"] = grade_series(df["overall_score"], DRIVER_GRADES, DRIVER_GRADE_FLOOR)
+
+        score_columns = [*DRIVER_WEIGHTS, "overall_score"]
+        df[score_columns] = df[score_columns].astype(float).round(2)
+        return df
+
+    def driver_rankings(
+        self,
+        start_date: DateLike,
+        end_date: DateLike,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """기사 종합 점수 순위"""
+        return rank_by(self.driver_scores(start_date, end_date), "overall_score", "driver_id", limit)
+
+    # ========================================
+    # 차량
+    # ========================================
+
+    def vehicle_scores(
+        self,
+        start_date: DateLike,
+        end_date: DateLike,
+        vehicle_ids: Optional[Iterable[int]] = None,
+    ) -> pd.DataFrame:
+        """
+        차량별 성능 지표 (배차 없는 차량 포함, 쿼리 1회)
+
+        columns: vehicle_id, vehicle_number, vehicle_type, dispatches, deliveries,
+                 fuel_efficiency, utilization_rate, efficiency_score,
+                 delivery_completion_rate, average_load_rate, total_distance_km
+        """
+        start, end = _as_date(start_date), _as_date(end_date)
+        filters = [Dispatch.vehicle_id.in_(list(vehicle_ids))] if vehicle_ids is not None else []
+        rows = self._dispatch_rows(start, end, *filters)
+
+        capacity = func.coalesce(func.nullif(Vehicle.max_pallets, 0), DEFAULT_PALLET_CAPACITY)
+        load_rate = rows.c.total_pallets * 100.0 / capacity
+        query = (
+            select(
+                Vehicle.id.label("vehicle_id"),
+                Vehicle.plate_number.label("vehicle_number"),
+                Vehicle.vehicle_type,
+                func.count(rows.c.dispatch_id).label("dispatches"),
+                func.count(distinct(rows.c.dispatch_date)).label("used_days"),
+                func.coalesce(func.sum(rows.c.orders), 0).label("deliveries"),
+                func.coalesce(func.sum(rows.c.delivered), 0).label("delivered"),
+                func.coalesce(func.avg(case((load_rate > 100, 100.0), else_=load_rate)), 0).label("average_load_rate"),
+                func.coalesce(func.sum(rows.c.total_distance_km), 0).label("total_distance_km"),
+            )
+            .outerjoin(rows, rows.c.vehicle_id == Vehicle.id)
+            .group_by(Vehicle.id, Vehicle.plate_number, Vehicle.vehicle_type)
+            .order_by(Vehicle.id)
+        )
+        if vehicle_ids is not None:
+            query = query.where(Vehicle.id.in_(list(vehicle_ids)))
+
+        df = _frame(self.db.execute(query))
+        total_days = (end_date - start_date).days + 1
+        return self._score_vehicles(df, total_days)
+
+    @staticmethod
+    def _score_vehicles(df: pd.DataFrame, total_days: int) -> pd.DataFrame:
+        dispatches = df["dispatches"].astype(float)
+        has_dispatches = dispatches > 0
+
+        df["average_load_rate"] = df["average_load_rate"].astype(float)
+        df["total_distance_km"] = df["total_distance_km"].astype(float)
+        df["fuel_efficiency"] = np.where(has_dispatches, ESTIMATED_FUEL_EFFICIENCY, 0.0)
+        df["utilization_rate"] = df["used_days"] / total_days * 100 if total_days > 0 else 0.0
+        df["delivery_completion_rate"] = _rate(df["delivered"].astype(float), df["deliveries"].astype(float), 100.0)
+
+        # 적재율 40점 + 배송 완료율 40점 + 거리 효율성 20점
+        efficiency = (
+            (df["average_load_rate"] * 0.4).clip(upper=40)
+            + df["delivery_completion_rate"] * 0.4
+            + ESTIMATED_DISTANCE_EFFICIENCY * 0.2
+        ).clip(upper=100)
+        df["efficiency_score"] = efficiency.where(has_dispatches, 0.0)
+        df["avg_deliveries_per_dispatch"] = (df["deliveries"] / dispatches.where(has_dispatches)).fillna(0)
+
+        score_columns = [
+            "fuel_efficiency", "utilization_rate", "efficiency_score", "delivery_completion_rate",
+            "average_load_rate", "total_distance_km", "avg_deliveries_per_dispatch",
+        ]
+        df[score_columns] = df[score_columns].astype(float).round(2)
+        return df
+
+    def vehicle_rankings(
+        self,
+        start_date: DateLike,
+        end_date: DateLike,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """차량 효율성 점수 순위"""
+        return rank_by(self.vehicle_scores(start_date, end_date), "efficiency_score", "vehicle_id", limit)
+
+    # ========================================
+    # 고객
+    # ========================================
+
+    def customer_scores(
+        self,
+        start_date: DateLike,
+        end_date: DateLike,
+        client_ids: Optional[Iterable[int]] = None,
+        limit: Optional[int] = None,
+        with_orders_only: bool = False,
+    ) -> pd.DataFrame:
+        """
+        고객별 만족도 지표 (쿼리 1회)
+
+        limit 지정 시 매출 내림차순 상위 N 고객만 SQL 에서 잘라 점수 계산
+        (with_orders_only 와 함께 사용하면 기간 내 주문이 있는 고객 중 상위 N)
+
+        columns: client_id, client_name, orders, delivered, cancelled, pending,
+                 orders_since_start, last_order_date, total_revenue,
+                 on_time_delivery_rate, order_completion_rate, avg_delivery_time_hours,
+                 temperature_violations, loyalty_score, satisfaction_score, grade
+        """
+        start, end = _as_date(start_date), _as_date(end_date)
+        previous_start = start - timedelta(days=(end_date - start_date).days)
+
+        current = and_(Order.order_date >= start, Order.order_date <= end)
+        delivered = Order.status == OrderStatus.DELIVERED
+        late = and_(
+            delivered,
+            Order.requested_delivery_date.isnot(None),
+            func.date(Order.updated_at) > Order.requested_delivery_date,
+        )
+        since_start = Order.order_date >= start
+        lead_hours = hours_between(self.db, Order.created_at, Order.updated_at)
+
+        order_facts = (
+            select(
+                Order.pickup_client_id.label("client_id"),
+                _count_if(current).label("orders"),
+                _count_if(current, delivered).label("delivered"),
+                _count_if(current, late).label("late"),
+                _count_if(current, Order.status == OrderStatus.CANCELLED).label("cancelled"),
+                _count_if(current, Order.status.in_([OrderStatus.PENDING, OrderStatus.IN_TRANSIT])).label("pending"),
+                func.sum(case((and_(current, delivered), lead_hours), else_=0)).label("delivery_hours"),
+                _count_if(Order.order_date >= previous_start, Order.order_date < start).label("previous_orders"),
+                _count_if(since_start).label("orders_since_start"),
+                func.max(case((since_start, Order.order_date))).label("last_order_date"),
+            )
+            .where(Order.pickup_client_id.isnot(None), Order.order_date >= previous_start)
+            .group_by(Order.pickup_client_id)
+            .subquery()
+        )
+        revenue = (
+            select(Invoice.client_id, func.sum(InvoiceLineItem.amount).label("revenue"))
+            .join(InvoiceLineItem, InvoiceLineItem.invoice_id == Invoice.id)
+            .join(Dispatch, Dispatch.id == InvoiceLineItem.dispatch_id)
+            .where(Dispatch.dispatch_date >= start, Dispatch.dispatch_date <= end)
+            .group_by(Invoice.client_id)
+            .subquery()
+        )
+
+        total_revenue = func.coalesce(revenue.c.revenue, 0)
+        query = (
+            select(
+                Client.id.label("client_id"),
+                Client.name.label("client_name"),
+                *(
+                    func.coalesce(order_facts.c[name], 0).label(name)
+                    for name in ("orders", "delivered", "late", "cancelled", "pending",
+                                 "delivery_hours", "previous_orders", "orders_since_start")
+                ),
+                order_facts.c.last_order_date,
+                total_revenue.label("total_revenue"),
+            )
+            .outerjoin(order_facts, order_facts.c.client_id == Client.id)
+            .outerjoin(revenue, revenue.c.client_id == Client.id)
+        )
+        if client_ids is not None:
+            query = query.where(Client.id.in_(list(client_ids)))
+        if with_orders_only:
+            query = query.where(order_facts.c.orders > 0)
+        if limit is not None:
+            query = query.order_by(total_revenue.desc(), Client.id).limit(limit)
+        else:
+            query = query.order_by(Client.id)
+
+        return self._score_customers(_frame(self.db.execute(query)))
+
+    @staticmethod
+    def _score_customers(df: pd.DataFrame) -> pd.DataFrame:
+        orders, delivered = df["orders"].astype(float), df["delivered"].astype(float)
+        previous = df["previous_orders"].astype(float)
+
+        df["on_time_delivery_rate"] = _rate(delivered - df["late"], delivered, 100.0)
+        df["order_completion_rate"] = _rate(delivered, orders, 100.0)
+        df["avg_delivery_time_hours"] = (df["delivery_hours"].astype(float) / delivered.where(delivered > 0)).fillna(0)
+        # 취소 주문의 20% 를 온도 위반으로 추정
+        df["temperature_violations"] = (df["cancelled"] * 0.2).astype(int)
+
+        # 직전 동일 기간 대비 주문 증가율 (신규 고객 70점, 50% 이상 증가 시 만점)
+        growth = (orders - previous) / previous.where(previous > 0) * 100
+        df["loyalty_score"] = (70 + growth / 2).clip(lower=0, upper=100).fillna(70.0)
+
+        # 정시 배송 40점 + 주문 완료 40점 + 온도 위반 20점
+        violation_rate = (df["temperature_violations"] / orders.where(orders > 0)).fillna(0)
+        satisfaction = (
+            df["on_time_delivery_rate"] / 100 * 40
+            + df["order_completion_rate"] / 100 * 40
+            + (20 - violation_rate * 100).clip(lower=0)
+        ).clip(upper=100)
+        df["satisfaction_score"] = satisfaction
+        df["grade"] = grade_series(satisfaction.astype(float), CUSTOMER_GRADES, CUSTOMER_GRADE_FLOOR)
+        df["total_revenue"] = df["total_revenue"].astype(float)
+
+        score_columns = [
+            "on_time_delivery_rate", "order_completion_rate", "avg_delivery_time_hours",
+            "loyalty_score", "satisfaction_score",
+        ]
+        df[score_columns] = df[score_columns].astype(float).round(2)
+        return df
+
+
+def get_ranking_service(db: Session) -> RankingService:
+    return RankingService(db)
@@ -8,11 +8,11 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
-from sqlalchemy import select, func, and_
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
 
 from app.websocket.connection_manager import manager
-from app.core.database import get_db
+from app.services.dashboard_stats_service import dashboard_stats_producer
+from app.core.async_database import get_async_sessionmaker
 
 from app.models.vehicle import Vehicle, VehicleStatus
 from app.models.dispatch import Dispatch
@@ -32,6 +32,7 @@ class RealtimeMetricsService:
         self.broadcast_interval = 5  # seconds
         self.broadcast_task: Optional[asyncio.Task] = None
         self.is_running = False
+        self._dashboard_version: Optional[int] = None
     
     async def start(self):
         """Start broadcasting metrics"""
@@ -79,135 +80,77 @@ class RealtimeMetricsService:
             logger.info("🛑 Broadcast loop cancelled")
     
     async def _broadcast_dashboard_metrics(self):
-        """Broadcast dashboard metrics to /ws/dashboard channel"""
+        """Broadcast dashboard metrics to /ws/dashboard channel (only when changed)"""
         try:
-            # Use next() to get single DB session from generator
-            db_gen = get_db()
-            db = next(db_gen)
-            try:
-                metrics = self._collect_dashboard_metrics(db)  # Call synchronously
-                
-                # Only broadcast if there are active connections
-                if "dashboard" in manager.active_connections and len(manager.active_connections["dashboard"]) > 0:
-                    await manager.broadcast_to_channel(
-                        "dashboard",
-                        {
-                            "type": "dashboard_update",
-                            "data": metrics,
-                            "timestamp": datetime.utcnow().isoformat()
-                        }
-                    )
-                    logger.debug(f"📊 Broadcasted dashboard metrics to {len(manager.active_connections['dashboard'])} clients")
-            finally:
-                # Close the session
-                try:
-                    next(db_gen)
-                except StopIteration:
-                    pass
+            # Only broadcast if there are active connections
+            connections = manager.active_connections.get("dashboard")
+            if not connections:
+                self._dashboard_version = None
+                return
+            
+            # Counters come from the shared producer (no per-broadcast DB queries)
+            stats = await dashboard_stats_producer.get_snapshot()
+            if stats is None or dashboard_stats_producer.version == self._dashboard_version:
+                return
+            self._dashboard_version = dashboard_stats_producer.version
+            
+            await manager.broadcast_to_channel(
+                "dashboard",
+                {
+                    "type": "dashboard_update",
+                    "data": self._to_dashboard_metrics(stats),
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+            )
+            logger.debug(f"📊 Broadcasted dashboard metrics to {len(connections)} clients")
         except Exception as e:
             import traceback
             logger.error(f"❌ Error broadcasting dashboard metrics: {type(e).__name__}: {e}")
             logger.debug(f"Traceback: {traceback.format_exc()}")
     
-    def _collect_dashboard_metrics(self, db) -> dict:
-        """Collect dashboard metrics from database (synchronous)"""
-        from app.models.dispatch import Dispatch, DispatchStatus
-        from app.models.order import Order, OrderStatus
-        from app.models.vehicle import Vehicle
-        
-        now = datetime.utcnow()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        try:
-            # Active dispatches (CONFIRMED or IN_PROGRESS)
-            active_dispatches = db.query(Dispatch).filter(
-                Dispatch.status.in_([
-                    DispatchStatus.CONFIRMED,
-                    DispatchStatus.IN_PROGRESS
-                ])
-            ).count()
-            
-            # Completed today (using dispatch_date and status)
-            completed_today = db.query(Dispatch).filter(
-                and_(
-                    Dispatch.status == DispatchStatus.COMPLETED,
-                    Dispatch.dispatch_date == datetime.utcnow().date()
-                )
-            ).count()
-            
-            # Pending orders
-            pending_orders = db.query(Order).filter(
-                Order.status == OrderStatus.PENDING
-            ).count()
-            
-            # Vehicles in transit
-            vehicles_in_transit = db.query(Vehicle).filter(
-                Vehicle.status == VehicleStatus.IN_USE
-            ).count()
-            
+    @staticmethod
+    def _to_dashboard_metrics(stats: dict) -> dict:
+        """Map shared dashboard stats to metrics payload"""
+        return {
+            "active_dispatches": stats.get("active_dispatches", 0),
+            "completed_today": stats.get("completed_today", 0),
+            "pending_orders": stats.get("pending_orders", 0),
+            "vehicles_in_transit": stats.get("active_vehicles", 0),
             # Temperature alerts (mock data for now)
-            temperature_alerts = 0
-            
-            return {
-                "active_dispatches": active_dispatches,
-                "completed_today": completed_today,
-                "pending_orders": pending_orders,
-                "vehicles_in_transit": vehicles_in_transit,
-                "temperature_alerts": temperature_alerts,
-                "timestamp": now.isoformat()
-            }
-        except Exception as e:
-            logger.error(f"❌ Error collecting dashboard metrics: {type(e).__name__}: {e}")
-            return {
-                "active_dispatches": 0,
-                "completed_today": 0,
-                "pending_orders": 0,
-                "vehicles_in_transit": 0,
-                "temperature_alerts": 0,
-                "timestamp": now.isoformat()
-            }
+            "temperature_alerts": 0,
+            "timestamp": datetime.utcnow().isoformat()
+        }
     
     async def _broadcast_vehicle_updates(self):
         """Broadcast vehicle location updates"""
         try:
-            # Use next() to get single DB session from generator
-            db_gen = get_db()
-            db = next(db_gen)
-            try:
-                # Get vehicles that have active tracking
-                from app.models.vehicle import Vehicle
-                
-                # Query vehicles synchronously
-                vehicles = db.query(Vehicle).filter(
-                    Vehicle.status == VehicleStatus.IN_USE
-                ).limit(50).all()
-                
-                
-                # Broadcast each vehicle update
-                for vehicle in vehicles:
-                    try:
-                        vehicle_data = {
-                            "type": "vehicle_location",
-                            "vehicle_id": vehicle.id,
-                            "plate_number": vehicle.plate_number,  # Fixed: license_plate → plate_number
-                            "status": vehicle.status.value if hasattr(vehicle.status, 'value') else str(vehicle.status),
-                            "timestamp": datetime.utcnow().isoformat()
-                        }
-                        
-                        await manager.broadcast_to_channel(
-                            f"vehicles/{vehicle.id}",
-                            vehicle_data
-                        )
-                    except Exception as ve:
-                        logger.error(f"❌ Error broadcasting vehicle {vehicle.id}: {type(ve).__name__}: {ve}")
-                        continue
-                        
-            finally:
-                # Close the session
+            # Async session - slow queries don't block other sockets
+            async with get_async_sessionmaker()() as db:
+                result = await db.execute(
+                    select(Vehicle.id, Vehicle.plate_number, Vehicle.status)
+                    .where(Vehicle.status == VehicleStatus.IN_USE)
+                    .limit(50)
+                )
+                vehicles = result.all()
+            
+            # Broadcast each vehicle update
+            for vehicle in vehicles:
                 try:
-                    next(db_gen)
-                except StopIteration:
-                    pass
+                    vehicle_data = {
+                        "type": "vehicle_location",
+                        "vehicle_id": vehicle.id,
+                        "plate_number": vehicle.plate_number,  # Fixed: license_plate → plate_number
+                        "status": vehicle.status.value if hasattr(vehicle.status, 'value') else str(vehicle.status),
+                        "timestamp": datetime.utcnow().isoformat()
+                    }
+                    
+                    await manager.broadcast_to_channel(
+                        f"vehicles/{vehicle.id}",
+                        vehicle_data
+                    )
+                except Exception as ve:
+                    logger.error(f"❌ Error broadcasting vehicle {vehicle.id}: {type(ve).__name__}: {ve}")
+                    continue
         except Exception as e:
             logger.error(f"❌ Error broadcasting vehicle updates: {type(e).__name__}: {e}")
     
@@ -7,16 +7,18 @@
 """
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, select
 from loguru import logger
 import asyncio
 
+from app.core.async_database import get_async_sessionmaker
 from app.models.vehicle import Vehicle
 from app.models.dispatch import Dispatch
 from app.services.uvis_service import get_uvis_service
 from app.services.uvis_gps_service import UvisGPSService
+from app.services.vehicle_state_store import vehicle_state_store
 from app.services.email_service import EmailService
 
 
@@ -375,34 +377,36 @@ class RealtimeMonitoringService:
         Returns:
             대시보드 데이터
         """
-        # 최근 1시간 내 GPS 로그
-        one_hour_ago = datetime.now() - timedelta(hours=1)
-        
-        # 활성 차량
-        active_vehicles = self.db.query(Vehicle).filter(
-            Vehicle.is_active == True
-        ).all()
+        # 비동기 세션 사용 (WebSocket 연결이 많아도 이벤트 루프를 막지 않음)
+        async with get_async_sessionmaker()() as db:
+            # 활성 차량
+            active_vehicles = (await db.execute(
+                select(Vehicle).where(Vehicle.is_active == True)
+            )).scalars().all()
+            
+            # 각 차량의 최신 위치/온도 (최신 상태 저장소)
+            states = await vehicle_state_store.get_many_async(db, [vehicle.id for vehicle in active_vehicles])
         
-        # 각 차량의 최신 위치/온도
         vehicle_status = []
         for vehicle in active_vehicles:
-            latest_gps = self.uvis_gps_service.get_latest_gps_by_vehicle(vehicle.id)
-            latest_temp = self.uvis_gps_service.get_latest_temperature_by_vehicle(vehicle.id)
+            state = states.get(vehicle.id)
+            has_gps = state is not None and state.gps_recorded_at is not None
+            has_temp = state is not None and state.temperature_recorded_at is not None
             
             vehicle_status.append({
                 'vehicle_id': vehicle.id,
-                'license_plate': vehicle.license_plate,
+                'license_plate': vehicle.plate_number,
                 'vehicle_type': vehicle.vehicle_type,
                 'location': {
-                    'latitude': latest_gps.latitude if latest_gps else None,
-                    'longitude': latest_gps.longitude if latest_gps else None,
-                    'speed': latest_gps.speed_kmh if latest_gps else None,
-                    'engine_on': latest_gps.is_engine_on if latest_gps else None,
-                    'timestamp': latest_gps.created_at.isoformat() if latest_gps else None
+                    'latitude': state.latitude if has_gps else None,
+                    'longitude': state.longitude if has_gps else None,
+                    'speed': state.speed_kmh if has_gps else None,
+                    'engine_on': state.is_engine_on if has_gps else None,
+                    'timestamp': state.gps_recorded_at.isoformat() if has_gps else None
                 },
                 'temperature': {
-                    'value': latest_temp.temperature_a if latest_temp else None,
-                    'timestamp': latest_temp.created_at.isoformat() if latest_temp else None
+                    'value': state.temperature_a if has_temp else None,
+                    'timestamp': state.temperature_recorded_at.isoformat() if has_temp else None
                 }
             })
         
@@ -6,16 +6,24 @@
 - 자동 재배차 알고리즘
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, date
+from sqlalchemy.orm import Session, selectinload
 from loguru import logger
 
 from app.models.order import Order, OrderStatus
-from app.models.dispatch import Dispatch, DispatchStatus
+from app.models.dispatch import Dispatch, DispatchStatus, RouteType
 from app.models import DispatchRoute
 from app.models.vehicle import Vehicle, VehicleStatus
 from app.services.cvrptw_service import AdvancedDispatchOptimizationService
+from app.services.dynamic_dispatch import (
+    IncrementalReoptimizer, RouteStop, VehicleTail, reoptimize_incremental
+)
+from app.services.solver_pool import run_in_solver_pool
+
+
+# 재계획 대상 배차 상태 (당일 계획/진행 중)
+ACTIVE_DISPATCH_STATUSES = [DispatchStatus.DRAFT, DispatchStatus.CONFIRMED, DispatchStatus.IN_PROGRESS]
 
 
 class DynamicRedispatchService:
@@ -28,7 +36,8 @@ class DynamicRedispatchService:
     async def add_urgent_order(
         self,
         order_id: int,
-        force_dispatch: bool = False
+        force_dispatch: bool = False,
+        incremental: bool = False
     ) -> Dict[str, Any]:
         """
         긴급 주문 추가 및 재배차
@@ -36,6 +45,7 @@ class DynamicRedispatchService:
         Args:
             order_id: 긴급 주문 ID
             force_dispatch: 강제 배차 여부 (기존 배차에 추가)
+            incremental: 증분 재최적화 (가까운 차량들의 남은 경로에만 삽입, 전체 재계산 없음)
             
         Returns:
             재배차 결과
@@ -54,7 +64,10 @@ class DynamicRedispatchService:
         order.priority = 1  # 최고 우선순위
         self.db.commit()
         
-        if force_dispatch:
+        if incremental:
+            # 현재 계획을 초기해로 영향 차량의 남은 경로만 재계획
+            result = await self._insert_order_incremental(order)
+        elif force_dispatch:
             # 기존 배차에 강제 추가
             result = await self._force_add_to_existing_dispatch(order)
         else:
@@ -68,7 +81,8 @@ class DynamicRedispatchService:
         self,
         vehicle_id: int,
         issue_type: str,
-        estimated_delay_minutes: Optional[int] = None
+        estimated_delay_minutes: Optional[int] = None,
+        incremental: bool = False
     ) -> Dict[str, Any]:
         """
         차량 문제 처리 (고장, 지연 등)
@@ -77,6 +91,7 @@ class DynamicRedispatchService:
             vehicle_id: 차량 ID
             issue_type: 문제 유형 ('breakdown', 'delay', 'accident')
             estimated_delay_minutes: 예상 지연 시간 (분)
+            incremental: 증분 재최적화 (남은 정류장을 주변 차량 경로에 분배)
             
         Returns:
             재배차 결과
@@ -91,14 +106,17 @@ class DynamicRedispatchService:
         # 해당 차량의 진행 중인 배차 조회
         active_dispatch = self.db.query(Dispatch).filter(
             Dispatch.vehicle_id == vehicle_id,
-            Dispatch.status.in_([DispatchStatus.PENDING, DispatchStatus.IN_PROGRESS])
+            Dispatch.status.in_(ACTIVE_DISPATCH_STATUSES)
         ).first()
         
         if not active_dispatch:
             logger.info(f"No active dispatch for vehicle {vehicle_id}")
             return {'status': 'no_action', 'message': 'No active dispatch found'}
         
-        if issue_type == 'breakdown':
+        if incremental and (issue_type != 'delay' or (estimated_delay_minutes or 0) > 60):
+            # 남은 정류장만 주변 차량에 분배 (적재 중인 화물은 현재 지점에서 환적)
+            result = await self._reassign_incremental(active_dispatch)
+        elif issue_type == 'breakdown':
             # 고장: 완전히 다른 차량에 재배차
             result = await self._reassign_to_different_vehicle(active_dispatch)
         elif issue_type == 'delay':
@@ -141,7 +159,7 @@ class DynamicRedispatchService:
                 Dispatch.id == dispatch_route.dispatch_id
             ).first()
             
-            if dispatch and dispatch.status in [DispatchStatus.PENDING, DispatchStatus.IN_PROGRESS]:
+            if dispatch and dispatch.status in ACTIVE_DISPATCH_STATUSES:
                 # 배차에서 주문 제거
                 self.db.delete(dispatch_route)
                 
@@ -213,7 +231,7 @@ class DynamicRedispatchService:
         """기존 배차에 강제 추가"""
         # 온도대가 맞는 진행 중인 배차 찾기
         compatible_dispatch = self.db.query(Dispatch).join(Vehicle).filter(
-            Dispatch.status.in_([DispatchStatus.PENDING, DispatchStatus.IN_PROGRESS]),
+            Dispatch.status.in_(ACTIVE_DISPATCH_STATUSES),
             Vehicle.vehicle_type == self._get_vehicle_type_for_temp(order.temperature_zone)
         ).first()
         
@@ -340,6 +358,313 @@ class DynamicRedispatchService:
             'method': 'full_redispatch'
         }
     
+    # ------------------------------------------------------------------
+    # 증분 재최적화 (Warm start)
+    # ------------------------------------------------------------------
+    
+    async def _insert_order_incremental(
+        self,
+        order: Order,
+        max_vehicles: int = 5,
+        time_limit_ms: int = 500
+    ) -> Dict[str, Any]:
+        """긴급 주문을 가까운 호환 차량들의 남은 경로에 삽입"""
+        compatible_types = self.optimization_service._convert_temp_zone_to_vehicle_types(order.temperature_zone)
+        dispatches = [
+            d for d in self._load_active_dispatches(order.requested_delivery_date or date.today())
+            if d.vehicle.vehicle_type in compatible_types
+        ]
+        
+        if not dispatches:
+            logger.info("No compatible active dispatch, falling back to full redispatch")
+            return await self._redispatch_all_pending()
+        
+        tails, route_rows = self._build_vehicle_tails(dispatches)
+        new_stops = self._order_stops(order)
+        if any(stop.latitude is None or stop.longitude is None for stop in new_stops):
+            raise ValueError(f"Order has no coordinates: {order.id}")
+        
+        return await self._reoptimize_and_apply(
+            dispatches, tails, route_rows, new_stops,
+            new_orders={order.id: order},
+            max_vehicles=max_vehicles,
+            time_limit_ms=time_limit_ms,
+            extra={'order_id': order.id}
+        )
+    
+    async def _reassign_incremental(
+        self,
+        dispatch: Dispatch,
+        max_vehicles: int = 5,
+        time_limit_ms: int = 500
+    ) -> Dict[str, Any]:
+        """운행 불가 차량의 남은 정류장을 주변 차량 경로에 분배"""
+        broken_tail, broken_rows = self._build_vehicle_tails([dispatch])
+        tail = broken_tail[0]
+        
+        if not tail.stops:
+            return {'status': 'no_action', 'message': 'All routes completed'}
+        
+        orders = {r.order_id: r.order for r in dispatch.routes if r.order_id}
+        zones = {o.temperature_zone for o in orders.values()}
+        compatible_types = set.intersection(*[
+            set(self.optimization_service._convert_temp_zone_to_vehicle_types(zone)) for zone in zones
+        ]) if zones else set()
+        
+        dispatches = [
+            d for d in self._load_active_dispatches(dispatch.dispatch_date)
+            if d.id != dispatch.id and d.vehicle.vehicle_type in compatible_types
+        ]
+        if not dispatches:
+            logger.info("No compatible active dispatch, falling back to full reassign")
+            return await self._reassign_to_different_vehicle(dispatch)
+        
+        tails, route_rows = self._build_vehicle_tails(dispatches)
+        route_rows.update(broken_rows)
+        
+        # 미완료 상차는 그대로, 이미 상차된 화물은 현재 지점에서 환적 상차
+        pickup_keys = {s.key for s in tail.stops if s.stop_type == 'pickup'}
+        new_stops = []
+        for stop in tail.stops:
+            if stop.stop_type == 'delivery' and f"{stop.order_id}:pickup" not in pickup_keys:
+                new_stops.append(RouteStop(
+                    key=f"{stop.order_id}:transfer",
+                    order_id=stop.order_id,
+                    stop_type='pickup',
+                    latitude=tail.start[0],
+                    longitude=tail.start[1],
+                    pallets=stop.pallets
+                ))
+            new_stops.append(stop)
+        
+        result = await self._reoptimize_and_apply(
+            dispatches + [dispatch], tails, route_rows, new_stops,
+            new_orders=orders,
+            max_vehicles=max_vehicles,
+            time_limit_ms=time_limit_ms,
+            extra={'original_dispatch_id': dispatch.id, 'vehicle_id': dispatch.vehicle_id},
+            transfer_label=f"환적 ({dispatch.vehicle.code})"
+        )
+        return result
+    
+    async def _reoptimize_and_apply(
+        self,
+        dispatches: List[Dispatch],
+        tails: List[VehicleTail],
+        route_rows: Dict[str, DispatchRoute],
+        new_stops: List[RouteStop],
+        new_orders: Dict[int, Order],
+        max_vehicles: int,
+        time_limit_ms: int,
+        extra: Dict[str, Any],
+        transfer_label: str = "환적"
+    ) -> Dict[str, Any]:
+        """영향 차량 선택 → 증분 재최적화 → 변경된 배차만 DB 반영"""
+        affected = IncrementalReoptimizer.select_affected_vehicles(tails, new_stops, max_vehicles)
+        plan = await run_in_solver_pool(
+            reoptimize_incremental, affected, new_stops, time_limit_ms, True
+        )
+        
+        dispatch_by_vehicle = {d.vehicle_id: d for d in dispatches}
+        stop_by_key = {s.key: s for t in affected for s in t.stops}
+        stop_by_key.update({s.key: s for s in new_stops})
+        
+        changed_dispatches = []
+        for vehicle_id in plan['changed_vehicles']:
+            dispatch = dispatch_by_vehicle[vehicle_id]
+            self._apply_tail(
+                dispatch, plan['routes'][vehicle_id], plan['distance_m'][vehicle_id],
+                route_rows, stop_by_key, new_orders, transfer_label
+            )
+            changed_dispatches.append(dispatch.id)
+        
+        for dispatch in dispatches:
+            dispatch.total_orders = len({r.order_id for r in dispatch.routes if r.order_id})
+        
+        unassigned_orders = sorted({stop_by_key[key].order_id for key in plan['unassigned']})
+        for order_id, order in new_orders.items():
+            if order_id not in unassigned_orders and order.status == OrderStatus.PENDING:
+                order.status = OrderStatus.ASSIGNED
+        
+        self.db.commit()
+        
+        return {
+            'status': 'success' if not unassigned_orders else 'partial',
+            **extra,
+            'affected_vehicles': [t.vehicle_id for t in affected],
+            'changed_dispatches': changed_dispatches,
+            'unassigned_orders': unassigned_orders,
+            'warm_start': plan['warm_start'],
+            'solve_time_ms': plan['solve_time_ms'],
+            'method': 'incremental'
+        }
+    
+    def _load_active_dispatches(self, dispatch_date: date) -> List[Dispatch]:
+        """당일 활성 배차 (경로/주문/차량 일괄 로드)"""
+        return self.db.query(Dispatch).options(
+            selectinload(Dispatch.routes).selectinload(DispatchRoute.order),
+            selectinload(Dispatch.vehicle)
+        ).filter(
+            Dispatch.dispatch_date == dispatch_date,
+            Dispatch.status.in_(ACTIVE_DISPATCH_STATUSES)
+        ).all()
+    
+    def _build_vehicle_tails(
+        self,
+        dispatches: List[Dispatch]
+    ) -> Tuple[List[VehicleTail], Dict[str, DispatchRoute]]:
+        """
+        배차별 남은 경로 구성
+        
+        주문 상태로 완료 정류장을 판단하여 고정합니다.
+        - 배송중: 상차 완료 (화물 적재 중)
+        - 배송완료: 상차/하차 완료
+        """
+        now = datetime.now()
+        now_minutes = now.hour * 60 + now.minute
+        tails = []
+        route_rows: Dict[str, DispatchRoute] = {}
+        
+        for dispatch in dispatches:
+            vehicle = dispatch.vehicle
+            routes = sorted(dispatch.routes, key=lambda r: r.sequence)
+            garage = (vehicle.garage_latitude, vehicle.garage_longitude)
+            start = next(((r.latitude, r.longitude) for r in routes if r.route_type == RouteType.GARAGE_START), garage)
+            end = next(((r.latitude, r.longitude) for r in routes if r.route_type == RouteType.GARAGE_END), start)
+            if start[0] is None:
+                start = end = (routes[0].latitude, routes[0].longitude) if routes else (37.5665, 126.9780)
+            
+            onboard = 0
+            stops = []
+            for route in routes:
+                if route.route_type not in (RouteType.PICKUP, RouteType.DELIVERY) or not route.order_id:
+                    continue
+                order = route.order
+                is_pickup = route.route_type == RouteType.PICKUP
+                done = order.status == OrderStatus.DELIVERED or (is_pickup and order.status == OrderStatus.IN_TRANSIT)
+                
+                if done:
+                    start = (route.latitude, route.longitude)
+                    if is_pickup and order.status == OrderStatus.IN_TRANSIT:
+                        onboard += order.pallet_count
+                    continue
+                
+                key = f"{route.order_id}:{'pickup' if is_pickup else 'delivery'}"
+                route_rows[key] = route
+                window = (order.pickup_start_time, order.pickup_end_time) if is_pickup else (order.delivery_start_time, order.delivery_end_time)
+                stops.append(RouteStop(
+                    key=key,
+                    order_id=route.order_id,
+                    stop_type='pickup' if is_pickup else 'delivery',
+                    latitude=route.latitude,
+                    longitude=route.longitude,
+                    pallets=order.pallet_count,
+                    time_window_start=self.optimization_service._time_str_to_minutes(window[0] or "00:00"),
+                    time_window_end=self.optimization_service._time_str_to_minutes(window[1]) or 1440
+                ))
+            
+            tails.append(VehicleTail(
+                vehicle_id=dispatch.vehicle_id,
+                start=start,
+                end=end,
+                max_pallets=vehicle.max_pallets,
+                onboard_pallets=onboard,
+                stops=stops,
+                start_time=now_minutes if dispatch.status == DispatchStatus.IN_PROGRESS else max(now_minutes, 480)
+            ))
+        
+        return tails, route_rows
+    
+    def _order_stops(self, order: Order) -> List[RouteStop]:
+        """신규 주문의 상차/하차 정류장"""
+        to_minutes = self.optimization_service._time_str_to_minutes
+        pickup_client = order.pickup_client
+        delivery_client = order.delivery_client
+        
+        return [
+            RouteStop(
+                key=f"{order.id}:pickup",
+                order_id=order.id,
+                stop_type='pickup',
+                latitude=(pickup_client.latitude if pickup_client else None) or order.pickup_latitude,
+                longitude=(pickup_client.longitude if pickup_client else None) or order.pickup_longitude,
+                pallets=order.pallet_count,
+                time_window_start=to_minutes(order.pickup_start_time or "00:00"),
+                time_window_end=to_minutes(order.pickup_end_time) or 1440,
+                service_time=pickup_client.loading_time_minutes if pickup_client else 30
+            ),
+            RouteStop(
+                key=f"{order.id}:delivery",
+                order_id=order.id,
+                stop_type='delivery',
+                latitude=(delivery_client.latitude if delivery_client else None) or order.delivery_latitude,
+                longitude=(delivery_client.longitude if delivery_client else None) or order.delivery_longitude,
+                pallets=order.pallet_count,
+                time_window_start=to_minutes(order.delivery_start_time or "00:00"),
+                time_window_end=to_minutes(order.delivery_end_time) or 1440,
+                service_time=delivery_client.loading_time_minutes if delivery_client else 30
+            ),
+        ]
+    
+    def _apply_tail(
+        self,
+        dispatch: Dispatch,
+        tail: List[Dict[str, Any]],
+        distance_m: int,
+        route_rows: Dict[str, DispatchRoute],
+        stop_by_key: Dict[str, RouteStop],
+        new_orders: Dict[int, Order],
+        transfer_label: str
+    ):
+        """재계획된 남은 경로를 배차에 반영 (완료 정류장 순서는 유지)"""
+        # 미완료 정류장은 모두 재배치 대상, 나머지(차고지 출발/완료 정류장)는 고정
+        replanned = {id(route) for route in route_rows.values()}
+        
+        fixed = []
+        garage_end = []
+        for route in sorted(dispatch.routes, key=lambda r: r.sequence):
+            if route.route_type == RouteType.GARAGE_END:
+                garage_end.append(route)
+            elif id(route) not in replanned:
+                fixed.append(route)
+        
+        sequence = 0
+        for route in fixed:
+            sequence += 1
+            route.sequence = sequence
+        
+        for item in tail:
+            sequence += 1
+            stop = stop_by_key[item['key']]
+            route = route_rows.get(item['key'])
+            if route is None:
+                order = new_orders.get(stop.order_id)
+                is_transfer = item['key'].endswith(':transfer')
+                location_name = transfer_label if is_transfer else f"{order.order_number if order else stop.order_id} ({'상차' if stop.stop_type == 'pickup' else '하차'})"
+                address = None
+                if order and not is_transfer:
+                    address = order.pickup_address if stop.stop_type == 'pickup' else order.delivery_address
+                route = DispatchRoute(
+                    route_type=RouteType.PICKUP if stop.stop_type == 'pickup' else RouteType.DELIVERY,
+                    order_id=stop.order_id,
+                    location_name=location_name,
+                    address=address or f"주소-{location_name}",
+                    latitude=stop.latitude,
+                    longitude=stop.longitude
+                )
+                self.db.add(route)
+                route_rows[item['key']] = route
+            route.dispatch = dispatch
+            route.sequence = sequence
+            route.estimated_arrival_time = f"{item['arrival_time'] // 60 % 24:02d}:{item['arrival_time'] % 60:02d}"
+            route.current_pallets = item['load']
+        
+        for route in garage_end:
+            sequence += 1
+            route.sequence = sequence
+        
+        dispatch.notes = ((dispatch.notes or "") + f"\n[증분 재배차 {datetime.now().strftime('%H:%M')}] 남은 경로 {distance_m / 1000:.1f}km").strip()
+    
     def _recalculate_dispatch_stats(self, dispatch: Dispatch):
         """배차 통계 재계산"""
         routes = self.db.query(DispatchRoute).filter(
@@ -0,0 +1,189 @@
+"""
+보고서 데이터 서비스
+PDF/Excel 보고서용 집계 쿼리 (보고서당 GROUP BY 1회) 및 스트리밍 출력 버퍼
+"""
+from datetime import date
+from tempfile import SpooledTemporaryFile
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.client import Client
+from app.models.dispatch import Dispatch, DispatchStatus
+from app.models.driver import Driver
+from app.models.order import Order, OrderStatus
+from app.models.vehicle import Vehicle
+
+
+# 보고서 파일은 이 크기까지만 메모리에 두고 초과분은 임시 파일로 내려씀
+REPORT_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+# 다운로드 응답 청크 크기
+STREAM_CHUNK_BYTES = 64 * 1024
+# 상세 행 조회 시 DB 커서에서 한 번에 가져오는 행 수
+ROW_FETCH_SIZE = 1000
+
+
+def spooled_output() -> BinaryIO:
+    """보고서 출력 버퍼 (REPORT_SPOOL_MAX_BYTES 초과 시 디스크로 전환)"""
+    return SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_BYTES)
+
+
+def iter_chunks(fileobj: BinaryIO, chunk_size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    파일 객체를 처음부터 청크 단위로 읽어 반환 (StreamingResponse 용, 완료 후 닫음)
+    """
+    try:
+        fileobj.seek(0)
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+class ReportDataService:
+    """보고서 집계 데이터 조회"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _period(start_date: date, end_date: date):
+        return and_(Dispatch.dispatch_date >= start_date, Dispatch.dispatch_date <= end_date)
+
+    def dispatch_status_counts(self, start_date: date, end_date: date) -> Dict[DispatchStatus, int]:
+        """기간 내 배차 상태별 건수"""
+        rows = self.db.execute(
+            select(Dispatch.status, func.count(Dispatch.id))
+            .where(self._period(start_date, end_date))
+            .group_by(Dispatch.status)
+        ).all()
+        return {status: count for status, count in rows}
+
+    def iter_dispatch_rows(
+        self,
+        start_date: date,
+        end_date: date,
+        limit: Optional[int] = None
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        기간 내 배차 상세 행 (배차번호, 일자, 차량번호, 기사명, 주문 수, 팔레트, 중량, 상태)
+
+        ROW_FETCH_SIZE 단위로 커서에서 읽으므로 전체 결과를 메모리에 올리지 않습니다.
+        """
+        query = (
+            select(
+                Dispatch.dispatch_number,
+                Dispatch.dispatch_date,
+                Vehicle.plate_number,
+                Driver.name,
+                Dispatch.total_orders,
+                Dispatch.total_pallets,
+                Dispatch.total_weight_kg,
+                Dispatch.status
+            )
+            .join(Vehicle, Vehicle.id == Dispatch.vehicle_id)
+            .outerjoin(Driver, Driver.id == Dispatch.driver_id)
+            .where(self._period(start_date, end_date))
+            .order_by(Dispatch.dispatch_date, Dispatch.id)
+            .execution_options(yield_per=ROW_FETCH_SIZE)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        yield from self.db.execute(query)
+
+    def vehicle_performance(
+        self,
+        start_date: date,
+        end_date: date,
+        vehicle_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        차량별 운행 실적 (배차 건수, 가동률, 평균 적재율, 총 주행거리)
+
+        가동률 = 배차 건수 / 기간 일수, 평균 적재율 = 평균 팔레트 / 최대 팔레트
+        """
+        query = (
+            select(
+                Vehicle.plate_number,
+                Vehicle.vehicle_type,
+                Vehicle.max_pallets,
+                func.count(Dispatch.id),
+                func.avg(Dispatch.total_pallets),
+                func.sum(Dispatch.total_distance_km)
+            )
+            .outerjoin(Dispatch, and_(Dispatch.vehicle_id == Vehicle.id, self._period(start_date, end_date)))
+            .group_by(Vehicle.id, Vehicle.plate_number, Vehicle.vehicle_type, Vehicle.max_pallets)
+            .order_by(Vehicle.plate_number)
+        )
+        if vehicle_id:
+            query = query.where(Vehicle.id == vehicle_id)
+
+        days_in_period = (end_date - start_date).days + 1
+        rows = []
+        for plate_number, vehicle_type, max_pallets, dispatches, avg_pallets, distance in self.db.execute(query):
+            rows.append({
+                "vehicle_number": plate_number,
+                "vehicle_type": vehicle_type.value if vehicle_type else None,
+                "total_dispatches": dispatches,
+                "utilization": dispatches / days_in_period * 100 if days_in_period > 0 else 0,
+                "avg_load": (avg_pallets or 0) / max_pallets * 100 if max_pallets else 0,
+                "total_distance_km": distance or 0.0
+            })
+        return rows
+
+    def driver_evaluation(
+        self,
+        start_date: date,
+        end_date: date,
+        driver_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """기사별 배차 실적 (배차 건수, 완료 건수, 완료율, 배차당 평균 주문 수)"""
+        completed = func.sum(case((Dispatch.status == DispatchStatus.COMPLETED, 1), else_=0))
+        query = (
+            select(Driver.name, func.count(Dispatch.id), completed, func.avg(Dispatch.total_orders))
+            .outerjoin(Dispatch, and_(Dispatch.driver_id == Driver.id, self._period(start_date, end_date)))
+            .group_by(Driver.id, Driver.name)
+            .order_by(Driver.name)
+        )
+        if driver_id:
+            query = query.where(Driver.id == driver_id)
+
+        return [
+            {
+                "driver_name": name,
+                "total_dispatches": dispatches,
+                "completed": completed_count or 0,
+                "completion_rate": (completed_count or 0) / dispatches * 100 if dispatches else 0,
+                "avg_orders": float(avg_orders or 0)
+            }
+            for name, dispatches, completed_count, avg_orders in self.db.execute(query)
+        ]
+
+    def customer_satisfaction(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """
+        상차 거래처별 주문 실적 (기간 내 주문이 있는 거래처만)
+
+        정시 배송은 별도 기록이 없어 배송완료 건수로 대신합니다.
+        """
+        delivered = func.sum(case((Order.status == OrderStatus.DELIVERED, 1), else_=0))
+        query = (
+            select(Client.name, func.count(Order.id), delivered)
+            .join(Order, Order.pickup_client_id == Client.id)
+            .where(Order.order_date >= start_date, Order.order_date <= end_date)
+            .group_by(Client.id, Client.name)
+            .order_by(Client.name)
+        )
+        return [
+            {
+                "client_name": name,
+                "total_orders": orders,
+                "completed": delivered_count or 0,
+                "on_time": delivered_count or 0,
+                "satisfaction": (delivered_count or 0) / orders * 100
+            }
+            for name, orders, delivered_count in self.db.execute(query)
+        ]
@@ -1,12 +1,13 @@
 """
 Report Generation Service - PDF Reports
 Generates comprehensive PDF reports for various business metrics
+
+Report data comes from one grouped query per report (ReportDataService) and
+the PDF is written to a spooled buffer that the API streams in chunks.
 """
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any
-from io import BytesIO
+from typing import BinaryIO, List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, letter
@@ -21,11 +22,9 @@ from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
-from app.models.dispatch import Dispatch
-from app.models.order import Order
+from app.models.dispatch import DispatchStatus
 from app.models.vehicle import Vehicle
-from app.models.user import User
-from app.models.client import Client
+from app.services.report_data_service import ReportDataService, spooled_output
 
 
 class PDFReportGenerator:
@@ -33,6 +32,7 @@ class PDFReportGenerator:
     
     def __init__(self, db: Session):
         self.db = db
+        self.data = ReportDataService(db)
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
     
@@ -70,9 +70,9 @@ class PDFReportGenerator:
         self,
         start_date: date,
         end_date: date
-    ) -> BytesIO:
+    ) -> BinaryIO:
         """Generate dispatch report PDF"""
-        buffer = BytesIO()
+        buffer = spooled_output()
         doc = SimpleDocTemplate(
             buffer,
             pagesize=A4,
@@ -93,19 +93,12 @@ class PDFReportGenerator:
         elements.append(title)
         elements.append(Spacer(1, 20))
         
-        # Query dispatches
-        dispatches = self.db.query(Dispatch).filter(
-            and_(
-                Dispatch.dispatch_date >= start_date,
-                Dispatch.dispatch_date <= end_date
-            )
-        ).all()
-        
-        # Summary statistics
-        total_dispatches = len(dispatches)
-        completed = sum(1 for d in dispatches if d.status == 'completed')
-        in_progress = sum(1 for d in dispatches if d.status == 'in_progress')
-        pending = sum(1 for d in dispatches if d.status == 'pending')
+        # Summary statistics (status counts)
+        status_counts = self.data.dispatch_status_counts(start_date, end_date)
+        total_dispatches = sum(status_counts.values())
+        completed = status_counts.get(DispatchStatus.COMPLETED, 0)
+        in_progress = status_counts.get(DispatchStatus.IN_PROGRESS, 0)
+        pending = status_counts.get(DispatchStatus.DRAFT, 0) + status_counts.get(DispatchStatus.CONFIRMED, 0)
         
         summary_data = [
             ['Metric', 'Value'],
@@ -135,16 +128,19 @@ class PDFReportGenerator:
         heading = Paragraph("Dispatch Details", self.styles['CustomHeading'])
         elements.append(heading)
         
-        if dispatches:
+        if total_dispatches:
             dispatch_data = [['Dispatch#', 'Date', 'Vehicle', 'Orders', 'Status']]
             
-            for dispatch in dispatches[:50]:  # Limit to 50 for PDF size
+            # Limit to 50 for PDF size
+            for number, dispatch_date, plate_number, _, orders, _, _, status in self.data.iter_dispatch_rows(
+                start_date, end_date, limit=50
+            ):
                 dispatch_data.append([
-                    dispatch.dispatch_number,
-                    str(dispatch.dispatch_date),
-                    dispatch.vehicle.vehicle_number if dispatch.vehicle else 'N/A',
-                    str(len(dispatch.orders)),
-                    dispatch.status.upper()
+                    number,
+                    str(dispatch_date),
+                    plate_number,
+                    str(orders or 0),
+                    status.name
                 ])
             
             dispatch_table = Table(dispatch_data, colWidths=[1.2*inch, 1*inch, 1.2*inch, 0.8*inch, 1*inch])
@@ -183,9 +179,9 @@ class PDFReportGenerator:
         start_date: date,
         end_date: date,
         vehicle_id: Optional[int] = None
-    ) -> BytesIO:
+    ) -> BinaryIO:
         """Generate vehicle performance report PDF"""
-        buffer = BytesIO()
+        buffer = spooled_output()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
         
         elements = []
@@ -195,51 +191,28 @@ class PDFReportGenerator:
         if vehicle_id:
             vehicle = self.db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
             if vehicle:
-                title_text = f"Vehicle Performance Report<br/>{vehicle.vehicle_number}"
+                title_text = f"Vehicle Performance Report<br/>{vehicle.plate_number}"
         
         title = Paragraph(f"{title_text}<br/>{start_date} to {end_date}", self.styles['CustomTitle'])
         elements.append(title)
         elements.append(Spacer(1, 20))
         
-        # Query vehicles
-        vehicle_query = self.db.query(Vehicle)
-        if vehicle_id:
-            vehicle_query = vehicle_query.filter(Vehicle.id == vehicle_id)
-        vehicles = vehicle_query.all()
-        
-        # Vehicle performance data
+        # Vehicle performance data (one grouped query for all vehicles)
         performance_data = [['Vehicle', 'Type', 'Dispatches', 'Utilization', 'Avg Load']]
         
-        for vehicle in vehicles:
-            # Get dispatches for this vehicle
-            dispatches = self.db.query(Dispatch).filter(
-                and_(
-                    Dispatch.vehicle_id == vehicle.id,
-                    Dispatch.dispatch_date >= start_date,
-                    Dispatch.dispatch_date <= end_date
-                )
-            ).all()
-            
-            total_dispatches = len(dispatches)
-            
-            # Calculate utilization (simplified)
-            days_in_period = (end_date - start_date).days + 1
-            utilization = (total_dispatches / days_in_period * 100) if days_in_period > 0 else 0
-            
-            # Calculate average load
-            avg_pallets = sum(d.total_pallets for d in dispatches) / total_dispatches if total_dispatches > 0 else 0
-            avg_load_pct = (avg_pallets / vehicle.pallet_capacity * 100) if vehicle.pallet_capacity > 0 else 0
-            
+        for row in self.data.vehicle_performance(start_date, end_date, vehicle_id):
             performance_data.append([
-                vehicle.vehicle_number,
-                vehicle.vehicle_type,
-                str(total_dispatches),
-                f"{utilization:.1f}%",
-                f"{avg_load_pct:.1f}%"
+                row["vehicle_number"],
+                row["vehicle_type"],
+                str(row["total_dispatches"]),
+                f"{row['utilization']:.1f}%",
+                f"{row['avg_load']:.1f}%"
             ])
         
         if len(performance_data) > 1:
-            perf_table = Table(performance_data, colWidths=[1.5*inch, 1.2*inch, 1*inch, 1*inch, 1*inch])
+            perf_table = Table(
+                performance_data, colWidths=[1.5*inch, 1.2*inch, 1*inch, 1*inch, 1*inch], repeatRows=1
+            )
             perf_table.setStyle(TableStyle([
                 ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -272,9 +245,9 @@ class PDFReportGenerator:
         start_date: date,
         end_date: date,
         driver_id: Optional[int] = None
-    ) -> BytesIO:
+    ) -> BinaryIO:
         """Generate driver evaluation report PDF"""
-        buffer = BytesIO()
+        buffer = spooled_output()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
         
         elements = []
@@ -287,40 +260,22 @@ class PDFReportGenerator:
         elements.append(title)
         elements.append(Spacer(1, 20))
         
-        # Query drivers
-        driver_query = self.db.query(User).filter(User.role == 'driver')
-        if driver_id:
-            driver_query = driver_query.filter(User.id == driver_id)
-        drivers = driver_query.all()
-        
-        # Driver evaluation data
+        # Driver evaluation data (one grouped query for all drivers)
         eval_data = [['Driver', 'Dispatches', 'Completed', 'Completion Rate', 'Avg Orders']]
         
-        for driver in drivers:
-            # Get dispatches for this driver
-            dispatches = self.db.query(Dispatch).filter(
-                and_(
-                    Dispatch.driver_id == driver.id,
-                    Dispatch.dispatch_date >= start_date,
-                    Dispatch.dispatch_date <= end_date
-                )
-            ).all()
-            
-            total_dispatches = len(dispatches)
-            completed = sum(1 for d in dispatches if d.status == 'completed')
-            completion_rate = (completed / total_dispatches * 100) if total_dispatches > 0 else 0
-            avg_orders = sum(len(d.orders) for d in dispatches) / total_dispatches if total_dispatches > 0 else 0
-            
+        for row in self.data.driver_evaluation(start_date, end_date, driver_id):
             eval_data.append([
-                driver.full_name,
-                str(total_dispatches),
-                str(completed),
-                f"{completion_rate:.1f}%",
-                f"{avg_orders:.1f}"
+                row["driver_name"],
+                str(row["total_dispatches"]),
+                str(row["completed"]),
+                f"{row['completion_rate']:.1f}%",
+                f"{row['avg_orders']:.1f}"
             ])
         
         if len(eval_data) > 1:
-            eval_table = Table(eval_data, colWidths=[1.5*inch, 1*inch, 1*inch, 1.2*inch, 1*inch])
+            eval_table = Table(
+                eval_data, colWidths=[1.5*inch, 1*inch, 1*inch, 1.2*inch, 1*inch], repeatRows=1
+            )
             eval_table.setStyle(TableStyle([
                 ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -0,0 +1,340 @@
+"""
+Rule Compiler - 배차 규칙 조건 컴파일 및 프로세스 캐시
+- JSON 조건 트리를 규칙 버전당 한 번만 파이썬 클로저로 컴파일 (RuleParser 와 동일한 의미)
+  평가 시 재귀 디스패치 / 연산자 조회 / 필드 경로 split 없음
+- 활성 규칙 목록은 프로세스 메모리에 캐시
+  같은 프로세스의 규칙 생성/수정/삭제는 커밋 시 자동 무효화 (실행 통계 갱신은 제외),
+  다른 워커의 변경은 주기적 시그니처(활성 규칙 수 / id 합 / version 합) 확인으로 반영
+  (SQL 로 규칙 정의를 직접 수정할 때는 version 을 올려야 다른 워커에 반영됨)
+- 바뀐 규칙만 다시 컴파일 (id 별 version + 정의 스탬프 비교)
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.dispatch_rule import DispatchRule
+from app.services.rule_parser import RuleParser
+
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+LOGICAL_KEYS = ("AND", "OR", "NOT")
+
+# 변경 시 캐시를 무효화하는 규칙 정의 컬럼 (execution_count 등 실행 통계 제외)
+DEFINITION_FIELDS = (
+    "name", "rule_type", "priority", "is_active", "conditions", "actions",
+    "apply_time_start", "apply_time_end", "apply_days", "version",
+)
+
+_PENDING_KEY = "dispatch_rules_changed"
+
+# 평가 시점에 값이 정해지는 특수 값
+_DYNAMIC_VALUES = {
+    "NOW()": datetime.now,
+    "TODAY()": lambda: datetime.now().date(),
+}
+
+_parser = RuleParser()
+
+
+def _always_true(context: Dict[str, Any]) -> bool:
+    return True
+
+
+def _compile_getter(field_path: str) -> Callable[[Dict[str, Any]], Any]:
+    """필드 경로 접근자 (예: "order.weight_kg" -> context['order']['weight_kg'])"""
+    parts = tuple(field_path.split("."))
+
+    def getter(context: Dict[str, Any]) -> Any:
+        value = context
+        for part in parts:
+            if isinstance(value, dict):
+                value = value.get(part)
+            elif hasattr(value, part):
+                value = getattr(value, part)
+            else:
+                return None
+            if value is None:
+                return None
+        return value
+
+    return getter
+
+
+def _compile_operator(operator_key: str, expected: Any) -> Callable[[Any], bool]:
+    """연산자 하나를 값 -> bool 클로저로 변환 (비교 실패 시 False)"""
+    operator = operator_key.lstrip("$")
+    if operator not in RuleParser.OPERATORS:
+        raise ValueError(f"Unsupported operator: {operator}")
+    operator_func = RuleParser.OPERATORS[operator]
+
+    if isinstance(expected, str) and expected.strip() in _DYNAMIC_VALUES:
+        resolve = _DYNAMIC_VALUES[expected.strip()]
+
+        def check_dynamic(value: Any) -> bool:
+            try:
+                return bool(operator_func(value, resolve()))
+            except Exception:
+                return False
+
+        return check_dynamic
+
+    if isinstance(expected, str):
+        expected = _parser._resolve_special_value(expected)
+
+    def check(value: Any) -> bool:
+        try:
+            return bool(operator_func(value, expected))
+        except Exception:
+            return False
+
+    return check
+
+
+def _compile_field(field_path: str, condition_value: Any) -> Predicate:
+    """필드 조건 컴파일 (연산자 객체 또는 단순 동등 비교)"""
+    getter = _compile_getter(field_path)
+
+    if not isinstance(condition_value, dict):
+        return lambda context: getter(context) == condition_value
+
+    checks = tuple(_compile_operator(op, expected) for op, expected in condition_value.items())
+    if len(checks) == 1:
+        check = checks[0]
+        return lambda context: check(getter(context))
+
+    def predicate(context: Dict[str, Any]) -> bool:
+        value = getter(context)
+        return all(check(value) for check in checks)
+
+    return predicate
+
+
+def compile_conditions(conditions: Any) -> Predicate:
+    """
+    규칙 조건 JSON 을 평가 클로저로 컴파일
+
+    RuleParser.parse_conditions 와 같은 결과를 내며, 잘못된 연산자는
+    평가 시점이 아니라 컴파일 시점에 ValueError 로 드러납니다.
+    """
+    if not conditions:
+        return _always_true
+
+    if "AND" in conditions:
+        children = tuple(compile_conditions(cond) for cond in conditions["AND"])
+        return lambda context: all(child(context) for child in children)
+
+    if "OR" in conditions:
+        children = tuple(compile_conditions(cond) for cond in conditions["OR"])
+        return lambda context: any(child(context) for child in children)
+
+    if "NOT" in conditions:
+        child = compile_conditions(conditions["NOT"])
+        return lambda context: not child(context)
+
+    if "if" in conditions:
+        children = tuple(
+            compile_conditions({key: value}) if key in LOGICAL_KEYS else _compile_field(key, value)
+            for key, value in conditions["if"].items()
+        )
+        return lambda context: all(child(context) for child in children)
+
+    # 단일 조건: 첫 번째 필드만 평가 (RuleParser 와 동일)
+    for key, value in conditions.items():
+        if key not in LOGICAL_KEYS:
+            return _compile_field(key, value)
+    return _always_true
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """컴파일된 배차 규칙 (세션과 무관한 불변 스냅샷)"""
+    id: int
+    name: str
+    rule_type: str
+    priority: int
+    conditions: Any
+    actions: Dict[str, Any]
+    apply_time_start: Optional[dt_time]
+    apply_time_end: Optional[dt_time]
+    apply_days: Optional[str]
+    stamp: Tuple[Any, ...]
+    predicate: Predicate
+
+    @classmethod
+    def from_model(cls, rule: DispatchRule) -> "CompiledRule":
+        return cls(
+            id=rule.id,
+            name=rule.name,
+            rule_type=rule.rule_type,
+            priority=rule.priority,
+            conditions=rule.conditions,
+            actions=rule.actions,
+            apply_time_start=rule.apply_time_start,
+            apply_time_end=rule.apply_time_end,
+            apply_days=rule.apply_days,
+            stamp=_stamp(rule),
+            predicate=compile_conditions(rule.conditions),
+        )
+
+
+def _stamp(rule: DispatchRule) -> Tuple[Any, ...]:
+    """규칙 정의 스탬프 (실행 통계 컬럼 제외)"""
+    return (
+        rule.version,
+        rule.name,
+        rule.rule_type,
+        rule.priority,
+        rule.apply_time_start,
+        rule.apply_time_end,
+        rule.apply_days,
+        json.dumps(rule.conditions, sort_keys=True, default=str),
+        json.dumps(rule.actions, sort_keys=True, default=str),
+    )
+
+
+class CompiledRuleCache:
+    """
+    활성 규칙 컴파일 캐시 (프로세스 공용)
+
+    - 같은 프로세스의 규칙 변경: 커밋 시 invalidate() -> 다음 조회 시 즉시 반영
+    - 다른 워커의 규칙 변경: CHECK_INTERVAL_SECONDS 마다 시그니처 집계 1회로 감지
+    """
+
+    CHECK_INTERVAL_SECONDS = 5.0
+
+    def __init__(self, check_interval_seconds: Optional[float] = None):
+        self.check_interval_seconds = (
+            self.CHECK_INTERVAL_SECONDS if check_interval_seconds is None else check_interval_seconds
+        )
+        self._lock = threading.Lock()
+        self._rules: List[CompiledRule] = []
+        self._by_id: Dict[int, CompiledRule] = {}
+        self._errors: Dict[int, Tuple[Tuple[Any, ...], str]] = {}
+        self._signature: Optional[Tuple[Any, ...]] = None
+        self._checked_at = 0.0
+        self.compile_count = 0
+
+    def invalidate(self) -> None:
+        """다음 조회 때 규칙 목록을 다시 확인 (바뀐 규칙만 재컴파일)"""
+        with self._lock:
+            self._signature = None
+            self._checked_at = 0.0
+
+    def clear(self) -> None:
+        """컴파일 결과까지 모두 제거"""
+        with self._lock:
+            self._rules = []
+            self._by_id = {}
+            self._errors = {}
+            self._signature = None
+            self._checked_at = 0.0
+            self.compile_count = 0
+
+    def get_rules(self, db: Session, rule_type: Optional[str] = None) -> List[CompiledRule]:
+        """활성 규칙 (우선순위 내림차순)"""
+        now = time.monotonic()
+        with self._lock:
+            if self._signature is None or now - self._checked_at >= self.check_interval_seconds:
+                signature = self._load_signature(db)
+                if signature != self._signature:
+                    self._reload(db)
+                    self._signature = signature
+                self._checked_at = now
+            rules = self._rules
+
+        if rule_type:
+            return [rule for rule in rules if rule.rule_type == rule_type]
+        return rules
+
+    def get_rule(self, rule: DispatchRule) -> CompiledRule:
+        """단일 규칙 컴파일 결과 (비활성 규칙 포함, 스탬프가 같으면 재사용)"""
+        with self._lock:
+            cached = self._by_id.get(rule.id)
+            if cached is not None and cached.stamp == _stamp(rule):
+                return cached
+        compiled = CompiledRule.from_model(rule)
+        with self._lock:
+            self.compile_count += 1
+        return compiled
+
+    @staticmethod
+    def _load_signature(db: Session) -> Tuple[Any, ...]:
+        row = db.execute(
+            select(
+                func.count(DispatchRule.id),
+                func.sum(DispatchRule.id),
+                func.sum(DispatchRule.version),
+            ).where(DispatchRule.is_active == True)  # noqa: E712
+        ).one()
+        return tuple(row)
+
+    def _reload(self, db: Session) -> None:
+        models = db.execute(
+            select(DispatchRule)
+            .where(DispatchRule.is_active == True)  # noqa: E712
+            .order_by(DispatchRule.priority.desc(), DispatchRule.id)
+        ).scalars().all()
+
+        rules: List[CompiledRule] = []
+        by_id: Dict[int, CompiledRule] = {}
+        errors: Dict[int, Tuple[Tuple[Any, ...], str]] = {}
+        for model in models:
+            stamp = _stamp(model)
+            cached = self._by_id.get(model.id)
+            if cached is not None and cached.stamp == stamp:
+                compiled = cached
+            elif model.id in self._errors and self._errors[model.id][0] == stamp:
+                errors[model.id] = self._errors[model.id]
+                continue
+            else:
+                try:
+                    compiled = CompiledRule.from_model(model)
+                except Exception as e:
+                    logger.warning(f"Dispatch rule {model.id} ({model.name}) failed to compile: {e}")
+                    errors[model.id] = (stamp, str(e))
+                    continue
+                finally:
+                    self.compile_count += 1
+            rules.append(compiled)
+            by_id[model.id] = compiled
+
+        self._rules = rules
+        self._by_id = by_id
+        self._errors = errors
+        logger.debug(f"Dispatch rule cache reloaded: {len(rules)} active, {len(errors)} invalid")
+
+
+compiled_rule_cache = CompiledRuleCache()
+
+
+@event.listens_for(DispatchRule, "after_insert")
+@event.listens_for(DispatchRule, "after_delete")
+def _mark_rule_written(mapper, connection, target: DispatchRule):
+    inspect(target).session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(DispatchRule, "after_update")
+def _mark_rule_updated(mapper, connection, target: DispatchRule):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in DEFINITION_FIELDS):
+        state.session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_rules(session: Session):
+    if session.info.pop(_PENDING_KEY, False):
+        compiled_rule_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_rules(session: Session):
+    session.info.pop(_PENDING_KEY, None)
@@ -2,13 +2,14 @@
 Rule Engine - 규칙 엔진 메인 클래스
 """
 from typing import Any, Dict, List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
 from app.services.rule_parser import RuleParser
 from app.services.rule_evaluator import RuleEvaluator
 from app.models.dispatch_rule import DispatchRule
 from app.models.order import Order
-from app.models.vehicle import Vehicle
+from app.models.vehicle import Vehicle, VehicleStatus
 from app.models.driver import Driver
 from app.models.dispatch import Dispatch
 
@@ -89,8 +90,12 @@ class RuleEngine:
         # 컨텍스트 구성
         context = self._build_context(order=order)
         
-        # Step 1: 제약 조건 규칙 평가
-        constraint_rules = self.evaluator.evaluate_rules(context, rule_type='constraint')
+        # 제약/배정 규칙을 한 번에 평가 후 타입별로 분리
+        matched_rules = self.evaluator.evaluate_rules(context)
+        constraint_rules = [mr for mr in matched_rules if mr['rule'].rule_type == 'constraint']
+        assignment_rules = [mr for mr in matched_rules if mr['rule'].rule_type == 'assignment']
+        
+        # Step 1: 제약 조건 수집
         constraints = []
         
         for mr in constraint_rules:
@@ -111,7 +116,7 @@ class RuleEngine:
                 })
         
         # Step 2: 제약 조건 만족하는 차량 필터링
-        query = self.db.query(Vehicle).filter(Vehicle.status == 'AVAILABLE')
+        query = self.db.query(Vehicle).filter(Vehicle.status == VehicleStatus.AVAILABLE)
         
         for constraint in constraints:
             if constraint['type'] == 'vehicle_type':
@@ -122,7 +127,7 @@ class RuleEngine:
             
             elif constraint['type'] == 'capacity':
                 min_capacity = constraint['value']
-                query = query.filter(Vehicle.capacity_kg >= min_capacity)
+                query = query.filter(Vehicle.max_weight_kg >= min_capacity)
         
         candidate_vehicles = query.all()
         
@@ -134,9 +139,7 @@ class RuleEngine:
                 'constraints': constraints
             }
         
-        # Step 3: 배정 규칙 평가
-        assignment_rules = self.evaluator.evaluate_rules(context, rule_type='assignment')
-        
+        # Step 3: 배정 규칙 적용
         recommended_vehicle = None
         assignment_method = 'default'
         
@@ -160,9 +163,9 @@ class RuleEngine:
             'order_id': order_id,
             'recommended_vehicle': {
                 'id': recommended_vehicle.id,
-                'vehicle_number': recommended_vehicle.vehicle_number,
+                'vehicle_number': recommended_vehicle.plate_number,
                 'vehicle_type': recommended_vehicle.vehicle_type,
-                'capacity_kg': recommended_vehicle.capacity_kg
+                'capacity_kg': recommended_vehicle.max_weight_kg
             },
             'assignment_method': assignment_method,
             'applied_rules': len(constraint_rules) + len(assignment_rules),
@@ -170,6 +173,45 @@ class RuleEngine:
             'total_candidates': len(candidate_vehicles)
         }
     
+    def apply_rules_to_orders(self, order_ids: List[int],
+                              rule_type: Optional[str] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        주문 묶음에 규칙 일괄 적용 (dry run)
+        
+        주문은 거래처와 함께 한 번에 조회하고, 컴파일된 규칙을 모든 주문
+        컨텍스트에 한 번에 평가합니다.
+        
+        Args:
+            order_ids: 주문 ID 리스트
+            rule_type: 규칙 타입 필터
+            
+        Returns:
+            주문 ID별 매칭된 규칙 리스트 (우선순위 순)
+        """
+        orders = self.db.execute(
+            select(Order)
+            .where(Order.id.in_(order_ids))
+            .options(selectinload(Order.pickup_client))
+            .order_by(Order.id)
+        ).scalars().all()
+        
+        contexts = [self._build_context(order=order) for order in orders]
+        matched_per_order = self.evaluator.evaluate_batch(contexts, rule_type)
+        
+        return {
+            order.id: [
+                {
+                    'rule_id': mr['rule'].id,
+                    'rule_name': mr['rule'].name,
+                    'rule_type': mr['rule'].rule_type,
+                    'priority': mr['rule'].priority,
+                    'actions': mr['actions']
+                }
+                for mr in matched
+            ]
+            for order, matched in zip(orders, matched_per_order)
+        }
+    
     def simulate_rules(self, test_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         규칙 시뮬레이션 (테스트 데이터 사용)
@@ -218,7 +260,7 @@ class RuleEngine:
             return {'error': 'Rule not found'}
         
         try:
-            matched = self.parser.parse_conditions(rule.conditions, test_data)
+            matched = self.evaluator.cache.get_rule(rule).predicate(test_data)
             
             return {
                 'rule_id': rule_id,
@@ -246,32 +288,35 @@ class RuleEngine:
             context['order'] = {
                 'id': order.id,
                 'order_number': order.order_number,
-                'client_id': order.client_id,
+                'client_id': order.pickup_client_id,
                 'pickup_address': order.pickup_address,
                 'delivery_address': order.delivery_address,
-                'total_weight_kg': order.total_weight_kg,
-                'total_pallets': order.total_pallets,
-                'is_urgent': order.is_urgent,
+                'total_weight_kg': order.weight_kg,
+                'total_pallets': order.pallet_count,
+                'priority': order.priority,
+                'is_urgent': getattr(order, 'is_urgent', False),
                 'status': order.status.value if hasattr(order.status, 'value') else order.status,
-                'delivery_deadline': order.delivery_deadline,
+                'delivery_deadline': order.requested_delivery_date,
+                'temperature_zone': order.temperature_zone.value if hasattr(order.temperature_zone, 'value') else order.temperature_zone,
                 'temperature_range': getattr(order, 'temperature_range', None),
-                'product_type': getattr(order, 'product_type', None)
+                'product_type': order.product_name
             }
             
-            # 클라이언트 정보 추가
-            if order.client:
+            # 클라이언트 정보 추가 (상차 거래처)
+            if order.pickup_client:
                 context['client'] = {
-                    'id': order.client.id,
-                    'name': order.client.company_name,
-                    'tier': getattr(order.client, 'tier', 'STANDARD')
+                    'id': order.pickup_client.id,
+                    'name': order.pickup_client.name,
+                    'tier': getattr(order.pickup_client, 'tier', 'STANDARD')
                 }
         
         if vehicle:
             context['vehicle'] = {
                 'id': vehicle.id,
-                'vehicle_number': vehicle.vehicle_number,
-                'vehicle_type': vehicle.vehicle_type,
-                'capacity_kg': vehicle.capacity_kg,
+                'vehicle_number': vehicle.plate_number,
+                'vehicle_type': vehicle.vehicle_type.value if hasattr(vehicle.vehicle_type, 'value') else vehicle.vehicle_type,
+                'capacity_kg': vehicle.max_weight_kg,
+                'max_pallets': vehicle.max_pallets,
                 'status': vehicle.status.value if hasattr(vehicle.status, 'value') else vehicle.status,
                 'age_years': getattr(vehicle, 'age_years', 0)
             }
@@ -7,9 +7,10 @@ import time as time_module
 from sqlalchemy.orm import Session
 
 from app.services.rule_parser import RuleParser
+from app.services.rule_compiler import CompiledRule, CompiledRuleCache, compiled_rule_cache
 from app.models.dispatch_rule import DispatchRule, RuleExecutionLog
 from app.models.dispatch import Dispatch
-from app.models.vehicle import Vehicle
+from app.models.vehicle import Vehicle, VehicleStatus
 from app.models.driver import Driver
 from app.models.order import Order
 
@@ -17,9 +18,10 @@ from app.models.order import Order
 class RuleEvaluator:
     """규칙 평가 및 실행"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[CompiledRuleCache] = None):
         self.db = db
         self.parser = RuleParser()
+        self.cache = cache or compiled_rule_cache
     
     def evaluate_rules(self, context: Dict[str, Any], rule_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -30,39 +32,53 @@ class RuleEvaluator:
             rule_type: 규칙 타입 필터 (assignment, constraint, optimization)
             
         Returns:
-            매칭된 규칙 리스트
+            매칭된 규칙 리스트 (우선순위 순)
         """
-        # 활성 규칙 조회
-        query = self.db.query(DispatchRule).filter(DispatchRule.is_active == True)
-        
-        if rule_type:
-            query = query.filter(DispatchRule.rule_type == rule_type)
+        return self.evaluate_batch([context], rule_type)[0]
+    
+    def evaluate_batch(self, contexts: List[Dict[str, Any]],
+                       rule_type: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """
+        여러 컨텍스트(주문/차량 묶음)에 컴파일된 규칙을 한 번에 평가
         
-        # 우선순위 순으로 정렬
-        rules = query.order_by(DispatchRule.priority.desc()).all()
+        규칙 목록은 캐시에서 한 번, 시간 제약은 규칙당 한 번만 확인하고
+        각 규칙의 조건 클로저를 모든 컨텍스트에 적용합니다.
         
-        matched_rules = []
+        Args:
+            contexts: 평가 컨텍스트 리스트
+            rule_type: 규칙 타입 필터
+            
+        Returns:
+            컨텍스트별 매칭된 규칙 리스트 (입력 순서, 각 리스트는 우선순위 순)
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in contexts]
+        if not contexts:
+            return results
         
-        for rule in rules:
+        for rule in self.cache.get_rules(self.db, rule_type):
             # 시간 제약 확인
             if not self._check_time_constraints(rule):
                 continue
             
             # 규칙 평가
-            start_time = time_module.time()
+            predicate = rule.predicate
+            start_time = time_module.perf_counter()
             try:
-                if self.parser.parse_conditions(rule.conditions, context):
-                    execution_time = int((time_module.time() - start_time) * 1000)
-                    matched_rules.append({
-                        'rule': rule,
-                        'actions': rule.actions,
-                        'execution_time_ms': execution_time
-                    })
+                matched = [index for index, context in enumerate(contexts) if predicate(context)]
             except Exception as e:
                 # 평가 실패 시 로그
-                self._log_execution(rule, context, success=False, error_message=str(e))
+                self._log_execution(rule, contexts[0], success=False, error_message=str(e))
+                continue
+            execution_time = int((time_module.perf_counter() - start_time) * 1000 / len(contexts))
+            
+            for index in matched:
+                results[index].append({
+                    'rule': rule,
+                    'actions': rule.actions,
+                    'execution_time_ms': execution_time
+                })
         
-        return matched_rules
+        return results
     
     def execute_rules(self, matched_rules: List[Dict[str, Any]], context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -109,16 +125,16 @@ class RuleEvaluator:
                 self._log_execution(rule, context, success=True, output_data=action_result)
                 
                 # 통계 업데이트
-                self._update_rule_stats(rule, success=True, execution_time_ms=matched_rule['execution_time_ms'])
+                self._update_rule_stats(rule.id, success=True, execution_time_ms=matched_rule['execution_time_ms'])
                 
             except Exception as e:
                 # 실패 로그
                 self._log_execution(rule, context, success=False, error_message=str(e))
-                self._update_rule_stats(rule, success=False)
+                self._update_rule_stats(rule.id, success=False)
         
         return results
     
-    def _check_time_constraints(self, rule: DispatchRule) -> bool:
+    def _check_time_constraints(self, rule: CompiledRule) -> bool:
         """시간 제약 확인"""
         now = datetime.now()
         current_time = now.time()
@@ -144,7 +160,7 @@ class RuleEvaluator:
         
         return True
     
-    def _execute_actions(self, rule: DispatchRule, actions: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_actions(self, rule: CompiledRule, actions: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """
         액션 실행
         
@@ -219,7 +235,7 @@ class RuleEvaluator:
         
         # 가용 차량 조회 (간단한 예시)
         available_vehicles = self.db.query(Vehicle).filter(
-            Vehicle.status == 'AVAILABLE'
+            Vehicle.status == VehicleStatus.AVAILABLE
         ).limit(10).all()
         
         if not available_vehicles:
@@ -231,7 +247,7 @@ class RuleEvaluator:
         
         return {
             'vehicle_id': nearest.id,
-            'vehicle_number': nearest.vehicle_number,
+            'vehicle_number': nearest.plate_number,
             'method': 'nearest_available'
         }
     
@@ -246,7 +262,7 @@ class RuleEvaluator:
             'required_types': vehicle_types
         }
     
-    def _log_execution(self, rule: DispatchRule, context: Dict[str, Any], 
+    def _log_execution(self, rule: CompiledRule, context: Dict[str, Any], 
                        success: bool, output_data: Optional[Dict] = None,
                        error_message: Optional[str] = None):
         """규칙 실행 로그 저장"""
@@ -280,9 +296,13 @@ class RuleEvaluator:
         
         return sanitized
     
-    def _update_rule_stats(self, rule: DispatchRule, success: bool, execution_time_ms: Optional[int] = None):
+    def _update_rule_stats(self, rule_id: int, success: bool, execution_time_ms: Optional[int] = None):
         """규칙 통계 업데이트"""
         
+        rule = self.db.get(DispatchRule, rule_id)
+        if rule is None:
+            return
+        
         rule.execution_count += 1
         
         if execution_time_ms:
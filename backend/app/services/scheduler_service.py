@@ -7,11 +7,15 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from loguru import logger
 from datetime import datetime
+import asyncio
 
+from app.core.config import settings
 from app.core.database import SessionLocal
 from app.services.recurring_order_generator import RecurringOrderGeneratorService
 from app.services.temperature_monitoring import TemperatureMonitoringService
 from app.services.maintenance_alert_service import MaintenanceAlertService
+from app.services.telemetry_storage_service import TelemetryStorageService
+from app.services.temperature_rollup_service import TemperatureRollupService
 
 
 class SchedulerService:
@@ -42,9 +46,29 @@ class SchedulerService:
             replace_existing=True
         )
         
+        # 텔레메트리 1분/1시간 집계 (증분)
+        self.scheduler.add_job(
+            self._rollup_telemetry,
+            trigger=IntervalTrigger(minutes=settings.TELEMETRY_ROLLUP_INTERVAL_MINUTES),
+            id='rollup_telemetry',
+            name='텔레메트리 집계',
+            replace_existing=True
+        )
+        
+        # 텔레메트리 파티션 생성 / 보존 기간 정리 (매일 새벽 3시 30분)
+        self.scheduler.add_job(
+            self._maintain_telemetry_storage,
+            trigger=CronTrigger(hour=3, minute=30),
+            id='maintain_telemetry_storage',
+            name='텔레메트리 보존 관리',
+            replace_existing=True
+        )
+        
         logger.info("✅ Scheduled jobs configured:")
         logger.info("  - 정기 주문 자동 생성: 매일 오전 6시")
         logger.info("  - 온도 데이터 자동 수집: 5분마다")
+        logger.info(f"  - 텔레메트리 집계: {settings.TELEMETRY_ROLLUP_INTERVAL_MINUTES}분마다")
+        logger.info("  - 텔레메트리 보존 관리: 매일 오전 3시 30분")
     
     async def _generate_recurring_orders(self):
         """정기 주문 자동 생성 (스케줄 작업)"""
@@ -100,6 +124,56 @@ class SchedulerService:
             logger.error(f"❌ Failed to collect temperature data: {e}")
         finally:
             db.close()
+        
+        # 수집 직후 온도 분석 집계 반영
+        await self._refresh_temperature_rollups()
+    
+    async def _rollup_telemetry(self):
+        """텔레메트리 증분 집계 (스케줄 작업, 스레드에서 실행)"""
+        try:
+            result = await asyncio.to_thread(self._run_telemetry_storage, "rollup")
+            if result:
+                logger.info(f"📈 Telemetry rollup completed: {result}")
+        except Exception as e:
+            logger.error(f"❌ Failed to roll up telemetry: {e}")
+        
+        # 늦게 도착한 온도 로그 반영
+        await self._refresh_temperature_rollups()
+    
+    async def _refresh_temperature_rollups(self):
+        """온도 분석 5분/1시간/1일 집계 증분 갱신 (스레드에서 실행)"""
+        try:
+            updated = await asyncio.to_thread(self._run_temperature_rollup)
+            if updated:
+                logger.debug(f"🌡️  Temperature rollups refreshed: {updated} buckets")
+        except Exception as e:
+            logger.error(f"❌ Failed to refresh temperature rollups: {e}")
+    
+    async def _maintain_telemetry_storage(self):
+        """텔레메트리 파티션 생성 및 보존 기간 정리 (스케줄 작업, 스레드에서 실행)"""
+        logger.info("🗄️  Starting telemetry storage maintenance...")
+        try:
+            await asyncio.to_thread(self._run_telemetry_storage, "ensure_partitions")
+            result = await asyncio.to_thread(self._run_telemetry_storage, "apply_retention")
+            logger.info(f"✅ Telemetry retention completed: {result}")
+        except Exception as e:
+            logger.error(f"❌ Failed to maintain telemetry storage: {e}")
+    
+    @staticmethod
+    def _run_telemetry_storage(operation: str):
+        db = SessionLocal()
+        try:
+            return getattr(TelemetryStorageService(db), operation)()
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _run_temperature_rollup() -> int:
+        db = SessionLocal()
+        try:
+            return TemperatureRollupService(db).refresh()
+        finally:
+            db.close()
     
     async def start(self):
         """스케줄러 시작"""
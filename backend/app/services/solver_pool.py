@@ -0,0 +1,139 @@
+"""
+최적화 솔버 프로세스 풀
+- OR-Tools SolveWithParameters 는 GIL을 잡고 이벤트 루프를 막으므로 별도 프로세스에서 실행
+- 워커(프로세스)당 하나의 풀을 공유하여 솔버 동시 실행 수를 제한
+"""
+
+import asyncio
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+_solver_pool: Optional[ProcessPoolExecutor] = None
+_solver_pool_lock = threading.Lock()
+_progress_manager = None
+_progress_queue = None
+
+
+def get_solver_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    솔버 프로세스 풀 싱글톤
+
+    SOLVER_POOL_WORKERS <= 0 이면 None (스레드에서 실행)
+    """
+    global _solver_pool
+    if settings.SOLVER_POOL_WORKERS <= 0:
+        return None
+
+    with _solver_pool_lock:
+        if _solver_pool is None:
+            # fork 는 이벤트 루프/스레드 상태를 복제하므로 spawn 사용
+            _solver_pool = ProcessPoolExecutor(
+                max_workers=settings.SOLVER_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Solver process pool initialized ({settings.SOLVER_POOL_WORKERS} workers)")
+        return _solver_pool
+
+
+def shutdown_solver_pool(wait: bool = False) -> None:
+    """솔버 프로세스 풀 종료"""
+    global _solver_pool, _progress_manager, _progress_queue
+    with _solver_pool_lock:
+        if _solver_pool is not None:
+            _solver_pool.shutdown(wait=wait, cancel_futures=True)
+            _solver_pool = None
+            logger.info("Solver process pool shutdown")
+        if _progress_manager is not None:
+            _progress_manager.shutdown()
+            _progress_manager = None
+        _progress_queue = None
+
+
+def get_progress_queue():
+    """
+    솔버 진행 상황 큐 싱글톤
+
+    프로세스 풀 사용 시 Manager 큐(프록시는 pickle 가능하여 솔버 프로세스로 전달 가능),
+    스레드 실행 시 일반 큐를 사용합니다.
+    """
+    global _progress_manager, _progress_queue
+    with _solver_pool_lock:
+        if _progress_queue is None:
+            if settings.SOLVER_POOL_WORKERS > 0:
+                _progress_manager = multiprocessing.get_context("spawn").Manager()
+                _progress_queue = _progress_manager.Queue()
+            else:
+                _progress_queue = queue.Queue()
+        return _progress_queue
+
+
+class SolverProgressReporter:
+    """
+    솔버 진행 상황 전달자 (솔버 프로세스 → 메인 프로세스)
+
+    OR-Tools 솔루션 콜백에서 현재 최적 비용으로 호출합니다.
+    너무 잦은 전송을 막기 위해 min_interval 초 간격으로만 큐에 넣습니다.
+    """
+
+    def __init__(self, progress_queue, key: str, min_interval: float = 0.5):
+        self.queue = progress_queue
+        self.key = key
+        self.min_interval = min_interval
+        self._started_at: Optional[float] = None
+        self._last_sent = 0.0
+        self._solutions = 0
+
+    def __call__(self, best_cost: float) -> None:
+        now = time.monotonic()
+        if self._started_at is None:
+            self._started_at = now
+        self._solutions += 1
+
+        if now - self._last_sent < self.min_interval:
+            return
+        self._last_sent = now
+
+        try:
+            self.queue.put_nowait({
+                "key": self.key,
+                "best_cost": best_cost,
+                "solutions_found": self._solutions,
+                "elapsed_seconds": round(now - self._started_at, 2)
+            })
+        except Exception:
+            # 진행 상황 전달 실패가 최적화를 중단시키면 안 됨
+            pass
+
+
+async def run_in_solver_pool(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    솔버 함수를 프로세스 풀에서 실행하고 결과를 기다림 (이벤트 루프는 블로킹되지 않음)
+
+    func 와 인자는 pickle 가능해야 합니다 (모듈 최상위 함수).
+    """
+    call = partial(func, *args, **kwargs)
+    pool = get_solver_pool()
+
+    if pool is None:
+        return await asyncio.to_thread(call)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, call)
+    except BrokenProcessPool:
+        # 워커 프로세스가 비정상 종료된 경우 풀을 재생성하여 한 번 재시도
+        logger.error("Solver process pool broken, restarting")
+        shutdown_solver_pool()
+        pool = get_solver_pool()
+        return await loop.run_in_executor(pool, call)
@@ -0,0 +1,382 @@
+"""
+텔레메트리 저장소 관리
+- GPS/온도/위치/센서 원시 로그를 차량 x 지표별 1분 집계로 증분 롤업, 1분 집계를 1시간 집계로 재집계
+- 보존 기간(TELEMETRY_RAW_RETENTION_DAYS)이 지난 원시 로그 삭제 (롤업된 구간만)
+- PostgreSQL: 월별 RANGE 파티션 미리 생성, 만료된 파티션은 DROP (대량 DELETE 없음)
+  SQLite(개발): 파티션 없이 (vehicle_id, 시각) 인덱스 + 범위 DELETE
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import DateTime, Integer, String, cast, delete, func, insert, literal, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.iot_sensor import SensorReading
+from app.models.telemetry_rollup import (
+    TelemetryRollupHour, TelemetryRollupMinute, TemperatureRollup5m, TemperatureRollupHour,
+)
+from app.models.uvis_gps import VehicleGPSLog, VehicleTemperatureLog
+from app.models.vehicle_location import VehicleLocation
+
+
+@dataclass(frozen=True)
+class TelemetrySource:
+    """
+    롤업/보존 대상 원시 로그 테이블
+
+    metrics: 지표 이름 -> 값 컬럼. series_column 이 있으면 지표 이름은 "{name}.{series}" (센서별)
+    """
+    name: str
+    model: Any
+    time_column: str
+    metrics: Dict[str, str] = field(default_factory=dict)
+    series_column: Optional[str] = None
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def time(self):
+        return getattr(self.model, self.time_column)
+
+
+TELEMETRY_SOURCES: Tuple[TelemetrySource, ...] = (
+    TelemetrySource("gps", VehicleGPSLog, "created_at", {"gps.speed_kmh": "speed_kmh"}),
+    TelemetrySource(
+        "temperature", VehicleTemperatureLog, "created_at",
+        {"temperature.a": "temperature_a", "temperature.b": "temperature_b"}
+    ),
+    TelemetrySource(
+        "location", VehicleLocation, "recorded_at",
+        {"location.speed_kmh": "speed", "location.temperature": "temperature_celsius"}
+    ),
+    TelemetrySource("sensor", SensorReading, "recorded_at", {"sensor": "value"}, series_column="sensor_id"),
+)
+
+
+def floor_time(value: datetime, seconds: int) -> datetime:
+    """UTC naive 시각을 버킷 시작으로 내림"""
+    epoch = int(value.replace(tzinfo=timezone.utc).timestamp())
+    return datetime.utcfromtimestamp(epoch - epoch % seconds)
+
+
+def time_bucket(column, seconds: int, dialect_name: str):
+    """
+    시각 컬럼의 버킷 시작 (UTC naive) SQL 식
+
+    SQLite 는 SQLAlchemy DateTime 저장 형식(마이크로초 포함 문자열)과 같게 만들어
+    바인드 파라미터와의 문자열 비교가 올바르게 동작하도록 합니다.
+    """
+    if dialect_name == "postgresql":
+        return func.timezone(
+            "UTC", func.to_timestamp(func.floor(func.extract("epoch", column) / seconds) * seconds),
+            type_=DateTime
+        )
+    epoch = cast(func.strftime("%s", column), Integer)
+    return func.strftime("%Y-%m-%d %H:%M:%S.000000", (epoch // seconds) * seconds, "unixepoch", type_=DateTime)
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def next_month(value: date) -> date:
+    return date(value.year + (value.month == 12), value.month % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: date) -> str:
+    """월별 파티션 테이블 이름 (예: vehicle_gps_logs_p202610)"""
+    return f"{table_name}_p{month:%Y%m}"
+
+
+class TelemetryStorageService:
+    """텔레메트리 롤업/보존/파티션 관리"""
+
+    REAGGREGATE_SECONDS = 600  # 늦게 도착한 데이터(단말 시각 기준) 반영을 위해 마지막 10분은 다시 집계
+    ROLLUP_LAG_SECONDS = 60  # 진행 중인 분은 집계하지 않음
+    MAX_ROLLUP_WINDOW = timedelta(days=1)  # 1회 실행당 소스별 최대 처리 구간 (초기 백필 분할)
+    LOCK_KEY = 7301  # PostgreSQL advisory lock (워커 간 동시 실행 방지)
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    # ------------------------------------------------------------------
+    # 롤업
+    # ------------------------------------------------------------------
+
+    def rollup(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        모든 소스의 미집계 구간을 1분/1시간 집계로 반영
+
+        Returns:
+            소스별 반영된 1분 집계 행 수
+        """
+        now = now or datetime.utcnow()
+        if not self._try_lock():
+            logger.info("텔레메트리 롤업: 다른 워커에서 실행 중")
+            return {}
+
+        result = {}
+        try:
+            for source in TELEMETRY_SOURCES:
+                window = self._pending_window(source, now)
+                if window is None:
+                    continue
+                start, end = window
+                result[source.name] = self._rollup_minutes(source, start, end)
+                self._rollup_hours(source, floor_time(start, 3600), end)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return result
+
+    def rolled_until(self, source: TelemetrySource) -> Optional[datetime]:
+        """1분 집계가 반영된 마지막 시각 (이 시각 이전 원시 로그는 집계 완료)"""
+        last_bucket = self.db.execute(
+            select(func.max(TelemetryRollupMinute.bucket_start))
+            .where(TelemetryRollupMinute.metric.like(f"{source.name}.%"))
+        ).scalar()
+        if last_bucket is None:
+            return None
+        return last_bucket + timedelta(seconds=TelemetryRollupMinute.BUCKET_SECONDS)
+
+    def _pending_window(self, source: TelemetrySource, now: datetime) -> Optional[Tuple[datetime, datetime]]:
+        """
+        이번 실행에서 집계할 [start, end) 구간
+
+        마지막 집계 이후 첫 원시 로그부터 최대 MAX_ROLLUP_WINDOW 만큼 진행하므로
+        데이터 공백이 길어도 백필이 멈추지 않습니다. 마지막 REAGGREGATE_SECONDS 는 매번 다시 집계합니다.
+        """
+        end = floor_time(now - timedelta(seconds=self.ROLLUP_LAG_SECONDS), TelemetryRollupMinute.BUCKET_SECONDS)
+
+        rolled = self.rolled_until(source)
+        query = select(func.min(source.time))
+        if rolled is not None:
+            query = query.where(source.time >= self._bind(source, rolled))
+        pending = self.db.execute(query).scalar()
+        if pending is None and rolled is None:
+            return None
+
+        if rolled is None:
+            start = floor_time(self._to_utc_naive(pending), TelemetryRollupMinute.BUCKET_SECONDS)
+        else:
+            start = floor_time(rolled - timedelta(seconds=self.REAGGREGATE_SECONDS), TelemetryRollupMinute.BUCKET_SECONDS)
+        if pending is not None:
+            frontier = max(start, floor_time(self._to_utc_naive(pending), TelemetryRollupMinute.BUCKET_SECONDS))
+            end = min(end, frontier + self.MAX_ROLLUP_WINDOW)
+        return (start, end) if start < end else None
+
+    def _metric_selects(self, source: TelemetrySource, start: datetime, end: datetime):
+        model = source.model
+        bucket = time_bucket(source.time, TelemetryRollupMinute.BUCKET_SECONDS, self.dialect)
+        time_range = (source.time >= self._bind(source, start), source.time < self._bind(source, end))
+
+        selects = []
+        for metric, column_name in source.metrics.items():
+            value = getattr(model, column_name)
+            group_by = [model.vehicle_id, bucket]
+            if source.series_column:
+                series = getattr(model, source.series_column)
+                metric_expr = literal(f"{metric}.", String) + cast(series, String)
+                group_by.append(series)
+            else:
+                metric_expr = literal(metric, String)
+
+            selects.append(
+                select(
+                    model.vehicle_id,
+                    metric_expr,
+                    bucket,
+                    func.count(value),
+                    func.sum(value),
+                    func.min(value),
+                    func.max(value),
+                )
+                .where(model.vehicle_id.isnot(None), value.isnot(None), *time_range)
+                .group_by(*group_by)
+            )
+        return selects
+
+    def _rollup_minutes(self, source: TelemetrySource, start: datetime, end: datetime) -> int:
+        """[start, end) 구간 1분 집계를 원시 로그에서 다시 계산 (delete + insert, 멱등)"""
+        self.db.execute(
+            delete(TelemetryRollupMinute).where(
+                TelemetryRollupMinute.metric.like(f"{source.name}.%"),
+                TelemetryRollupMinute.bucket_start >= start,
+                TelemetryRollupMinute.bucket_start < end,
+            )
+        )
+        result = self.db.execute(
+            insert(TelemetryRollupMinute).from_select(
+                ["vehicle_id", "metric", "bucket_start", "sample_count", "value_sum", "value_min", "value_max"],
+                union_all(*self._metric_selects(source, start, end)),
+            )
+        )
+        return result.rowcount or 0
+
+    def _rollup_hours(self, source: TelemetrySource, start: datetime, end: datetime):
+        """[start, end) 구간 1시간 집계를 1분 집계에서 다시 계산 (마지막 시간은 부분 집계)"""
+        minute = TelemetryRollupMinute
+        hour_bucket = time_bucket(minute.bucket_start, TelemetryRollupHour.BUCKET_SECONDS, self.dialect)
+        metric_filter = minute.metric.like(f"{source.name}.%")
+
+        self.db.execute(
+            delete(TelemetryRollupHour).where(
+                TelemetryRollupHour.metric.like(f"{source.name}.%"),
+                TelemetryRollupHour.bucket_start >= start,
+                TelemetryRollupHour.bucket_start < end,
+            )
+        )
+        self.db.execute(
+            insert(TelemetryRollupHour).from_select(
+                ["vehicle_id", "metric", "bucket_start", "sample_count", "value_sum", "value_min", "value_max"],
+                select(
+                    minute.vehicle_id,
+                    minute.metric,
+                    hour_bucket,
+                    func.sum(minute.sample_count),
+                    func.sum(minute.value_sum),
+                    func.min(minute.value_min),
+                    func.max(minute.value_max),
+                )
+                .where(metric_filter, minute.bucket_start >= start, minute.bucket_start < end)
+                .group_by(minute.vehicle_id, minute.metric, hour_bucket)
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # 보존 기간
+    # ------------------------------------------------------------------
+
+    def apply_retention(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        보존 기간이 지난 원시 로그/집계 삭제
+
+        원시 로그는 1분 집계가 반영된 구간까지만 삭제합니다 (롤업 전에 데이터가 사라지지 않음).
+        온도 분석 집계는 5분 집계에 1분 집계, 1시간 집계에 1시간 집계 보존 기간을 적용하고 1일 집계는 유지합니다.
+
+        Returns:
+            테이블별 DELETE 행 수 (파티션 DROP 으로 제거된 행은 포함하지 않음)
+        """
+        now = now or datetime.utcnow()
+        result: Dict[str, int] = {}
+
+        raw_cutoff = now - timedelta(days=settings.TELEMETRY_RAW_RETENTION_DAYS)
+        for source in TELEMETRY_SOURCES:
+            rolled = self.rolled_until(source)
+            if rolled is None:
+                continue
+            cutoff = min(raw_cutoff, rolled)
+            if source.model is VehicleTemperatureLog:
+                # 온도 분석 5분 집계에도 반영된 구간까지만 (마지막 재집계 구간 여유 1시간)
+                temperature_rolled = self.db.execute(select(func.max(TemperatureRollup5m.bucket_start))).scalar()
+                if temperature_rolled is None:
+                    continue
+                cutoff = min(cutoff, temperature_rolled - timedelta(hours=1))
+            if self._is_partitioned(source.table_name):
+                self._drop_partitions_before(source.table_name, cutoff.date())
+            deleted = self.db.execute(
+                delete(source.model).where(source.time < self._bind(source, cutoff))
+            ).rowcount
+            result[source.table_name] = deleted or 0
+
+        for model, days in (
+            (TelemetryRollupMinute, settings.TELEMETRY_MINUTE_ROLLUP_RETENTION_DAYS),
+            (TelemetryRollupHour, settings.TELEMETRY_HOUR_ROLLUP_RETENTION_DAYS),
+            (TemperatureRollup5m, settings.TELEMETRY_MINUTE_ROLLUP_RETENTION_DAYS),
+            (TemperatureRollupHour, settings.TELEMETRY_HOUR_ROLLUP_RETENTION_DAYS),
+        ):
+            if days > 0:
+                deleted = self.db.execute(
+                    delete(model).where(model.bucket_start < now - timedelta(days=days))
+                ).rowcount
+                result[model.__tablename__] = deleted or 0
+
+        self.db.commit()
+        return result
+
+    # ------------------------------------------------------------------
+    # 파티션 (PostgreSQL)
+    # ------------------------------------------------------------------
+
+    def ensure_partitions(self, today: Optional[date] = None) -> List[str]:
+        """이번 달부터 TELEMETRY_PARTITION_MONTHS_AHEAD 개월 뒤까지 월별 파티션 생성"""
+        today = today or datetime.utcnow().date()
+        created = []
+
+        for source in TELEMETRY_SOURCES:
+            if not self._is_partitioned(source.table_name):
+                continue
+            existing = set(self._partitions(source.table_name))
+            month = month_start(today)
+            for _ in range(settings.TELEMETRY_PARTITION_MONTHS_AHEAD + 1):
+                name = partition_name(source.table_name, month)
+                if name not in existing:
+                    self.db.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {source.table_name} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+                    ))
+                    created.append(name)
+                month = next_month(month)
+
+        self.db.commit()
+        if created:
+            logger.info(f"텔레메트리 파티션 생성: {', '.join(created)}")
+        return created
+
+    def _drop_partitions_before(self, table_name: str, cutoff: date):
+        """상한이 cutoff 이전인 월 파티션 DROP (나머지는 범위 DELETE 로 정리)"""
+        for name in self._partitions(table_name):
+            suffix = name[len(table_name) + 2:]
+            if not suffix.isdigit():
+                continue  # default 파티션
+            month = date(int(suffix[:4]), int(suffix[4:]), 1)
+            if next_month(month) <= cutoff:
+                self.db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                logger.info(f"텔레메트리 파티션 삭제: {name}")
+
+    def _is_partitioned(self, table_name: str) -> bool:
+        if self.dialect != "postgresql":
+            return False
+        return bool(self.db.execute(text(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :name"
+        ), {"name": table_name}).scalar())
+
+    def _partitions(self, table_name: str) -> List[str]:
+        return list(self.db.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :name ORDER BY c.relname"
+        ), {"name": table_name}).scalars())
+
+    # ------------------------------------------------------------------
+    # 공통
+    # ------------------------------------------------------------------
+
+    def _try_lock(self) -> bool:
+        """트랜잭션 범위 advisory lock (SQLite 는 단일 프로세스 개발용이므로 항상 성공)"""
+        if self.dialect != "postgresql":
+            return True
+        return bool(self.db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": self.LOCK_KEY}).scalar())
+
+    @staticmethod
+    def _bind(source: TelemetrySource, value: datetime) -> datetime:
+        """timezone 컬럼(created_at)과 비교할 때는 UTC 를 명시"""
+        if getattr(source.time.type, "timezone", False):
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    @staticmethod
+    def _to_utc_naive(value: datetime) -> datetime:
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
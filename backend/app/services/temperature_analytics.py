@@ -3,26 +3,80 @@ Temperature Analytics Service
 온도 분석 및 고급 리포팅 서비스
 Phase 3-A Part 5: 고급 분석 대시보드
 """
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc, case
-import statistics
+from sqlalchemy import func, and_, or_, case, select, true, union_all
+import math
 import logging
 
 from app.models.uvis_gps import VehicleTemperatureLog
-from app.models.vehicle_location import TemperatureAlert
-from app.models.vehicle import Vehicle
+from app.models.telemetry_rollup import TemperatureRollup5m, TemperatureRollupDay
+from app.models.vehicle_location import TemperatureAlert, VehicleLatestState
+from app.models.vehicle import Vehicle, VehicleType
 from app.models.dispatch import Dispatch
+from app.services.telemetry_storage_service import time_bucket
+from app.services.temperature_anomaly_detector import detect_fleet_anomalies
+from app.services.temperature_rollup_service import (
+    COMPLIANCE_RANGES, ROLLUP_COLUMNS, SENSORS, check_compliance, rollup_aggregate, tiered_ranges,
+)
 
 logger = logging.getLogger(__name__)
 
+FLEET_STATUSES = ("NORMAL", "VIOLATION", "NO_DATA")
+
 
 class TemperatureAnalytics:
-    """온도 분석 서비스"""
+    """
+    온도 분석 서비스
+    
+    준수율/성능 점수/트렌드는 원시 로그 대신 온도 집계(temperature_rollups_5m/1h/1d)에서 계산합니다.
+    집계는 TemperatureRollupService 가 스케줄러에서 증분 갱신합니다.
+    """
+    
+    SLOTS_PER_DAY = 288  # 5분 구간 수 (수집률 기준)
+    VIOLATION_DETAIL_LIMIT = 100
     
     def __init__(self, db: Session):
         self.db = db
+        self.dialect = db.get_bind().dialect.name
+    
+    def _rollup_totals(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        vehicle_ids: Optional[List[int]] = None,
+        bucket_seconds: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        기간 내 집계 합계 (차량별, bucket_seconds 지정 시 시간 버킷별)
+        
+        기간을 일/시간/5분 구간으로 나눠 각 구간에 맞는 집계 테이블만 읽습니다.
+        """
+        parts = []
+        for model, range_start, range_end in tiered_ranges(start_date, end_date):
+            query = select(
+                model.vehicle_id.label("vehicle_id"),
+                model.bucket_start.label("bucket_start"),
+                *[getattr(model, name).label(name) for name in ROLLUP_COLUMNS]
+            ).where(model.bucket_start >= range_start, model.bucket_start < range_end)
+            if vehicle_ids:
+                query = query.where(model.vehicle_id.in_(vehicle_ids))
+            parts.append(query)
+        if not parts:
+            return []
+        
+        rollups = union_all(*parts).subquery()
+        group_by = [rollups.c.vehicle_id]
+        if bucket_seconds:
+            group_by = [time_bucket(rollups.c.bucket_start, bucket_seconds, self.dialect).label("bucket")]
+        
+        rows = self.db.execute(
+            select(*group_by, *[rollup_aggregate(rollups.c[name], name).label(name) for name in ROLLUP_COLUMNS])
+            .group_by(*group_by)
+            .order_by(*group_by)
+        ).mappings().all()
+        return [dict(row) for row in rows]
     
     def get_compliance_report(
         self,
@@ -41,20 +95,10 @@ class TemperatureAnalytics:
         Returns:
             준수율, 위반 건수, 세부 내역
         """
-        # 온도 로그 조회
-        query = self.db.query(VehicleTemperatureLog).filter(
-            and_(
-                VehicleTemperatureLog.created_at >= start_date,
-                VehicleTemperatureLog.created_at <= end_date
-            )
-        )
-        
-        if vehicle_id:
-            query = query.filter(VehicleTemperatureLog.vehicle_id == vehicle_id)
+        totals = self._rollup_totals(start_date, end_date, [vehicle_id] if vehicle_id else None)
+        total_records = sum(row["record_count"] for row in totals)
         
-        logs = query.all()
-        
-        if not logs:
+        if not total_records:
             return {
                 "period": {
                     "start": start_date.isoformat(),
@@ -64,59 +108,17 @@ class TemperatureAnalytics:
                 "total_records": 0,
                 "compliant_records": 0,
                 "violation_records": 0,
-                "violations": []
+                "violations": [],
+                "violation_summary": self._summarize_violations(totals, {})
             }
         
-        # 준수/위반 분석
-        total_records = len(logs)
-        violations = []
-        
-        for log in logs:
-            vehicle = log.vehicle
-            if not vehicle:
-                continue
-            
-            vehicle_type = vehicle.vehicle_type
-            
-            # Sensor A 체크
-            if log.temperature_a is not None:
-                violation = self._check_compliance(
-                    temperature=log.temperature_a,
-                    vehicle_type=vehicle_type,
-                    sensor="A"
-                )
-                if violation:
-                    violations.append({
-                        "timestamp": log.created_at.isoformat(),
-                        "vehicle_id": log.vehicle_id,
-                        "vehicle_number": vehicle.plate_number,
-                        "sensor": "A",
-                        "temperature": log.temperature_a,
-                        "violation_type": violation,
-                        "latitude": log.latitude,
-                        "longitude": log.longitude
-                    })
-            
-            # Sensor B 체크
-            if log.temperature_b is not None:
-                violation = self._check_compliance(
-                    temperature=log.temperature_b,
-                    vehicle_type=vehicle_type,
-                    sensor="B"
-                )
-                if violation:
-                    violations.append({
-                        "timestamp": log.created_at.isoformat(),
-                        "vehicle_id": log.vehicle_id,
-                        "vehicle_number": vehicle.plate_number,
-                        "sensor": "B",
-                        "temperature": log.temperature_b,
-                        "violation_type": violation,
-                        "latitude": log.latitude,
-                        "longitude": log.longitude
-                    })
+        plate_numbers = dict(self.db.execute(
+            select(Vehicle.id, Vehicle.plate_number).where(Vehicle.id.in_([row["vehicle_id"] for row in totals]))
+        ).all())
         
-        violation_records = len(violations)
+        violation_records = sum(
+            row[f"temp_{sensor}_{kind}"] for row in totals for sensor in SENSORS for kind in ("too_hot", "too_cold")
+        )
         compliant_records = total_records - violation_records
         compliance_rate = (compliant_records / total_records * 100) if total_records > 0 else 100.0
         
@@ -129,60 +131,120 @@ class TemperatureAnalytics:
             "total_records": total_records,
             "compliant_records": compliant_records,
             "violation_records": violation_records,
-            "violations": violations[:100],  # Limit to 100 violations
-            "violation_summary": self._summarize_violations(violations)
+            "violations": self._recent_violations(start_date, end_date, vehicle_id),
+            "violation_summary": self._summarize_violations(totals, plate_numbers)
         }
     
+    def _recent_violations(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        vehicle_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        최근 위반 세부 내역 (최대 VIOLATION_DETAIL_LIMIT 건)
+        
+        5분 집계로 위반이 있는 구간을 먼저 찾고, 해당 차량/구간의 원시 로그만 최신순으로 읽습니다.
+        (원시 로그 보존 기간이 지난 구간은 집계에만 반영됩니다)
+        """
+        rollup = TemperatureRollup5m
+        violation_count = rollup.temp_a_too_hot + rollup.temp_a_too_cold + rollup.temp_b_too_hot + rollup.temp_b_too_cold
+        query = select(rollup.vehicle_id, rollup.bucket_start).where(
+            rollup.bucket_start >= start_date - timedelta(seconds=rollup.BUCKET_SECONDS),
+            rollup.bucket_start < end_date,
+            violation_count > 0
+        )
+        if vehicle_id:
+            query = query.where(rollup.vehicle_id == vehicle_id)
+        flagged = self.db.execute(
+            query.order_by(rollup.bucket_start.desc()).limit(self.VIOLATION_DETAIL_LIMIT)
+        ).all()
+        if not flagged:
+            return []
+        
+        since = max(start_date, min(bucket_start for _, bucket_start in flagged))
+        log = VehicleTemperatureLog
+        rows = self.db.execute(
+            select(
+                log.vehicle_id, log.created_at, log.temperature_a, log.temperature_b, log.latitude, log.longitude,
+                Vehicle.plate_number, Vehicle.vehicle_type
+            )
+            .join(Vehicle, Vehicle.id == log.vehicle_id)
+            .where(
+                log.vehicle_id.in_({vehicle for vehicle, _ in flagged}),
+                log.created_at >= since.replace(tzinfo=timezone.utc),
+                log.created_at <= end_date.replace(tzinfo=timezone.utc)
+            )
+            .order_by(log.created_at.desc())
+            .execution_options(yield_per=500)
+        )
+        
+        violations = []
+        for row in rows:
+            for sensor, temperature in (("A", row.temperature_a), ("B", row.temperature_b)):
+                if temperature is None:
+                    continue
+                violation = self._check_compliance(temperature, row.vehicle_type, sensor)
+                if violation:
+                    violations.append({
+                        "timestamp": row.created_at.isoformat(),
+                        "vehicle_id": row.vehicle_id,
+                        "vehicle_number": row.plate_number,
+                        "sensor": sensor,
+                        "temperature": temperature,
+                        "violation_type": violation,
+                        "latitude": row.latitude,
+                        "longitude": row.longitude
+                    })
+            if len(violations) >= self.VIOLATION_DETAIL_LIMIT:
+                break
+        rows.close()
+        
+        return violations[:self.VIOLATION_DETAIL_LIMIT]
+    
     def _check_compliance(
         self,
         temperature: float,
         vehicle_type: str,
         sensor: str
     ) -> Optional[str]:
-        """온도 준수 여부 체크"""
-        if vehicle_type == "냉동":
-            if temperature < -25.0:
-                return "TOO_COLD"
-            elif temperature > -15.0:
-                return "TOO_HOT"
-        elif vehicle_type == "냉장":
-            if temperature < 0.0:
-                return "TOO_COLD"
-            elif temperature > 5.0:
-                return "TOO_HOT"
-        
-        return None
+        """온도 준수 여부 체크 (차량 온도대별 범위, 집계와 동일 기준)"""
+        return check_compliance(temperature, vehicle_type)
     
-    def _summarize_violations(self, violations: List[Dict]) -> Dict[str, Any]:
-        """위반 요약"""
-        if not violations:
-            return {
-                "by_type": {},
-                "by_vehicle": {},
-                "by_sensor": {}
-            }
-        
+    def _summarize_violations(
+        self,
+        totals: List[Dict[str, Any]],
+        plate_numbers: Dict[int, str]
+    ) -> Dict[str, Any]:
+        """위반 요약 (집계 기준: 유형별/차량별/센서별 건수, 센서별 위반 지속 시간)"""
         by_type = {}
         by_vehicle = {}
         by_sensor = {}
-        
-        for v in violations:
-            # By violation type
-            v_type = v["violation_type"]
-            by_type[v_type] = by_type.get(v_type, 0) + 1
-            
-            # By vehicle
-            v_num = v["vehicle_number"]
-            by_vehicle[v_num] = by_vehicle.get(v_num, 0) + 1
-            
-            # By sensor
-            sensor = v["sensor"]
-            by_sensor[sensor] = by_sensor.get(sensor, 0) + 1
+        out_of_range_minutes = {}
+        
+        for row in totals:
+            for sensor in SENSORS:
+                hot = row[f"temp_{sensor}_too_hot"]
+                cold = row[f"temp_{sensor}_too_cold"]
+                seconds = row[f"temp_{sensor}_out_of_range_seconds"]
+                if hot:
+                    by_type["TOO_HOT"] = by_type.get("TOO_HOT", 0) + hot
+                if cold:
+                    by_type["TOO_COLD"] = by_type.get("TOO_COLD", 0) + cold
+                if hot or cold:
+                    v_num = plate_numbers.get(row["vehicle_id"], str(row["vehicle_id"]))
+                    by_vehicle[v_num] = by_vehicle.get(v_num, 0) + hot + cold
+                    by_sensor[sensor.upper()] = by_sensor.get(sensor.upper(), 0) + hot + cold
+                if seconds:
+                    out_of_range_minutes[sensor.upper()] = round(
+                        out_of_range_minutes.get(sensor.upper(), 0) + seconds / 60, 1
+                    )
         
         return {
             "by_type": by_type,
             "by_vehicle": by_vehicle,
-            "by_sensor": by_sensor
+            "by_sensor": by_sensor,
+            "out_of_range_minutes": out_of_range_minutes
         }
     
     def get_vehicle_performance_score(
@@ -200,85 +262,95 @@ class TemperatureAnalytics:
         Returns:
             성능 점수, 등급, 세부 지표
         """
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        # 온도 로그 조회
-        logs = self.db.query(VehicleTemperatureLog).filter(
-            and_(
-                VehicleTemperatureLog.vehicle_id == vehicle_id,
-                VehicleTemperatureLog.created_at >= start_date
-            )
-        ).all()
+        return self.get_performance_scores(days, [vehicle_id])[0]
+    
+    def get_performance_scores(
+        self,
+        days: int = 30,
+        vehicle_ids: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        차량별 온도 성능 점수 (집계 1회 조회)
         
-        if not logs:
-            return {
+        Args:
+            days: 분석 기간 (일)
+            vehicle_ids: 대상 차량 (None 이면 전체 차량)
+            
+        Returns:
+            차량별 성능 점수 리스트 (데이터가 없는 차량은 score 0, grade "N/A")
+        """
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=days)
+        
+        vehicle_query = select(Vehicle.id, Vehicle.plate_number)
+        if vehicle_ids is not None:
+            vehicle_query = vehicle_query.where(Vehicle.id.in_(vehicle_ids))
+        plate_numbers = dict(self.db.execute(vehicle_query).all())
+        totals = {row["vehicle_id"]: row for row in self._rollup_totals(start_date, end_date, vehicle_ids)}
+        
+        performances = []
+        for vehicle_id in (vehicle_ids if vehicle_ids is not None else plate_numbers):
+            row = totals.get(vehicle_id)
+            if not row or not row["record_count"]:
+                performances.append({
+                    "vehicle_id": vehicle_id,
+                    "score": 0,
+                    "grade": "N/A",
+                    "metrics": {},
+                    "message": "No data available"
+                })
+                continue
+            
+            # 성능 지표 계산
+            metrics = self._calculate_performance_metrics(row, days)
+            
+            # 점수 계산 (100점 만점)
+            score = self._calculate_performance_score(metrics)
+            
+            performances.append({
                 "vehicle_id": vehicle_id,
-                "score": 0,
-                "grade": "N/A",
-                "metrics": {},
-                "message": "No data available"
-            }
-        
-        # 성능 지표 계산
-        metrics = self._calculate_performance_metrics(logs)
-        
-        # 점수 계산 (100점 만점)
-        score = self._calculate_performance_score(metrics)
-        
-        # 등급 결정
-        grade = self._determine_grade(score)
-        
-        vehicle = self.db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
+                "vehicle_number": plate_numbers.get(vehicle_id),
+                "period_days": days,
+                "score": round(score, 2),
+                "grade": self._determine_grade(score),
+                "metrics": metrics,
+                "recommendations": self._generate_recommendations(metrics, score)
+            })
         
-        return {
-            "vehicle_id": vehicle_id,
-            "vehicle_number": vehicle.plate_number if vehicle else None,
-            "period_days": days,
-            "score": round(score, 2),
-            "grade": grade,
-            "metrics": metrics,
-            "recommendations": self._generate_recommendations(metrics, score)
-        }
+        return performances
     
-    def _calculate_performance_metrics(self, logs: List[VehicleTemperatureLog]) -> Dict[str, Any]:
-        """성능 지표 계산"""
-        temps_a = [log.temperature_a for log in logs if log.temperature_a is not None]
-        temps_b = [log.temperature_b for log in logs if log.temperature_b is not None]
-        
-        # 온도 안정성 (표준편차가 낮을수록 좋음)
-        stability_a = statistics.stdev(temps_a) if len(temps_a) > 1 else 0
-        stability_b = statistics.stdev(temps_b) if len(temps_b) > 1 else 0
-        
-        # 온도 범위 준수율
-        compliant_a = sum(1 for t in temps_a if -25 <= t <= -15)
-        compliant_b = sum(1 for t in temps_b if -25 <= t <= -15)
-        compliance_rate_a = (compliant_a / len(temps_a) * 100) if temps_a else 100
-        compliance_rate_b = (compliant_b / len(temps_b) * 100) if temps_b else 100
-        
-        # 평균 온도
-        avg_temp_a = statistics.mean(temps_a) if temps_a else None
-        avg_temp_b = statistics.mean(temps_b) if temps_b else None
+    def _calculate_performance_metrics(self, totals: Dict[str, Any], days: int) -> Dict[str, Any]:
+        """성능 지표 계산 (집계 합계: 건수/합/제곱합 기반)"""
+        metrics: Dict[str, Any] = {"total_records": totals["record_count"]}
+        
+        for sensor in SENSORS:
+            count = totals[f"temp_{sensor}_count"]
+            total = totals[f"temp_{sensor}_sum"]
+            violations = totals[f"temp_{sensor}_too_hot"] + totals[f"temp_{sensor}_too_cold"]
+            
+            # 온도 안정성 (표본 표준편차, 낮을수록 좋음)
+            stability = 0
+            if count > 1:
+                variance = (totals[f"temp_{sensor}_sq_sum"] - total * total / count) / (count - 1)
+                stability = math.sqrt(max(variance, 0.0))
+            
+            # 평균 온도 / 온도 범위 준수율
+            avg_temp = total / count if count else None
+            compliance_rate = ((count - violations) / count * 100) if count else 100
+            
+            metrics[f"sensor_{sensor}"] = {
+                "avg_temperature": round(avg_temp, 2) if avg_temp is not None else None,
+                "stability": round(stability, 2),
+                "compliance_rate": round(compliance_rate, 2),
+                "sample_count": count,
+                "out_of_range_minutes": round(totals[f"temp_{sensor}_out_of_range_seconds"] / 60, 1)
+            }
         
-        # 데이터 수집률 (예상 288개/일 = 5분마다)
-        expected_records = len(logs) / (288 * (len(logs) / 288))  # Simplified
-        data_collection_rate = min(100, (len(logs) / expected_records * 100)) if expected_records > 0 else 0
+        # 데이터 수집률 (5분마다 1건 기준, 데이터가 있는 5분 구간 비율)
+        expected_slots = days * self.SLOTS_PER_DAY
+        metrics["data_collection_rate"] = round(min(100, totals["sample_slots"] / expected_slots * 100), 2)
         
-        return {
-            "total_records": len(logs),
-            "sensor_a": {
-                "avg_temperature": round(avg_temp_a, 2) if avg_temp_a else None,
-                "stability": round(stability_a, 2),
-                "compliance_rate": round(compliance_rate_a, 2),
-                "sample_count": len(temps_a)
-            },
-            "sensor_b": {
-                "avg_temperature": round(avg_temp_b, 2) if avg_temp_b else None,
-                "stability": round(stability_b, 2),
-                "compliance_rate": round(compliance_rate_b, 2),
-                "sample_count": len(temps_b)
-            },
-            "data_collection_rate": round(data_collection_rate, 2)
-        }
+        return metrics
     
     def _calculate_performance_score(self, metrics: Dict[str, Any]) -> float:
         """성능 점수 계산 (100점 만점)"""
@@ -382,144 +454,135 @@ class TemperatureAnalytics:
         Returns:
             이상 패턴 리스트
         """
-        start_time = datetime.utcnow() - timedelta(hours=hours)
+        return detect_fleet_anomalies(self.db, hours, [vehicle_id]).get(vehicle_id, [])
+    
+    def detect_fleet_anomalies(self, hours: int = 24) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        전체 차량 온도 이상 패턴 감지 (조회 1회 + 벡터 연산)
         
-        logs = self.db.query(VehicleTemperatureLog).filter(
+        Args:
+            hours: 분석 기간 (시간)
+            
+        Returns:
+            {vehicle_id: 이상 패턴 리스트} (이상이 있는 차량만)
+        """
+        return detect_fleet_anomalies(self.db, hours)
+    
+    def _fleet_status_expression(self):
+        """차량 최신 온도 기준 상태 (NO_DATA / VIOLATION / NORMAL, 차량 온도대별 범위, 센서 A/B)"""
+        state = VehicleLatestState
+        out_of_range = [
             and_(
-                VehicleTemperatureLog.vehicle_id == vehicle_id,
-                VehicleTemperatureLog.created_at >= start_time
+                Vehicle.vehicle_type == VehicleType(vehicle_type),
+                or_(column < low, column > high)
             )
-        ).order_by(VehicleTemperatureLog.created_at).all()
-        
-        if len(logs) < 10:
-            return []
-        
-        anomalies = []
-        
-        # 1. 급격한 온도 변화 감지 (5°C 이상 변화)
-        for i in range(1, len(logs)):
-            prev_log = logs[i-1]
-            curr_log = logs[i]
-            
-            if prev_log.temperature_a and curr_log.temperature_a:
-                temp_diff = abs(curr_log.temperature_a - prev_log.temperature_a)
-                if temp_diff > 5.0:
-                    anomalies.append({
-                        "type": "RAPID_CHANGE",
-                        "sensor": "A",
-                        "timestamp": curr_log.created_at.isoformat(),
-                        "temperature_before": prev_log.temperature_a,
-                        "temperature_after": curr_log.temperature_a,
-                        "change": temp_diff,
-                        "severity": "HIGH" if temp_diff > 10 else "MEDIUM"
-                    })
-            
-            if prev_log.temperature_b and curr_log.temperature_b:
-                temp_diff = abs(curr_log.temperature_b - prev_log.temperature_b)
-                if temp_diff > 5.0:
-                    anomalies.append({
-                        "type": "RAPID_CHANGE",
-                        "sensor": "B",
-                        "timestamp": curr_log.created_at.isoformat(),
-                        "temperature_before": prev_log.temperature_b,
-                        "temperature_after": curr_log.temperature_b,
-                        "change": temp_diff,
-                        "severity": "HIGH" if temp_diff > 10 else "MEDIUM"
-                    })
-        
-        # 2. 장시간 이상 온도 유지 감지
-        temps_a = [log.temperature_a for log in logs if log.temperature_a is not None]
-        if temps_a:
-            avg_temp_a = statistics.mean(temps_a)
-            # 평균에서 3°C 이상 벗어난 경우가 30분 이상 지속
-            consecutive_count = 0
-            for log in logs:
-                if log.temperature_a and abs(log.temperature_a - avg_temp_a) > 3.0:
-                    consecutive_count += 1
-                else:
-                    consecutive_count = 0
-                
-                if consecutive_count >= 6:  # 30분 (5분 * 6)
-                    anomalies.append({
-                        "type": "PROLONGED_DEVIATION",
-                        "sensor": "A",
-                        "timestamp": log.created_at.isoformat(),
-                        "temperature": log.temperature_a,
-                        "expected": avg_temp_a,
-                        "deviation": abs(log.temperature_a - avg_temp_a),
-                        "severity": "MEDIUM"
-                    })
-                    consecutive_count = 0  # Reset after detection
-        
-        return anomalies
+            for vehicle_type, (low, high) in COMPLIANCE_RANGES.items()
+            for column in (state.temperature_a, state.temperature_b)
+        ]
+        return case(
+            (state.temperature_recorded_at.is_(None), "NO_DATA"),
+            (or_(*out_of_range), "VIOLATION"),
+            else_="NORMAL"
+        )
     
     def get_fleet_temperature_overview(
         self,
-        hours: int = 24
+        hours: int = 24,
+        status: Optional[str] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
     ) -> Dict[str, Any]:
         """
-        전체 차량 온도 현황 요약
+        전체 차량 온도 현황 요약 (쿼리 1회)
+        
+        차량 최신 상태 테이블(vehicle_latest_states)과 조인해 상태별 집계, 알림 건수,
+        요청한 페이지의 차량 목록을 한 문장으로 조회합니다.
         
         Args:
-            hours: 분석 기간 (시간)
+            hours: 분석 기간 (시간, 알림 통계)
+            status: 차량 목록 상태 필터 (NORMAL / VIOLATION / NO_DATA, None 이면 온도 데이터가 있는 차량 전체)
+            skip: 차량 목록 시작 위치
+            limit: 차량 목록 최대 건수 (None 이면 전체)
             
         Returns:
             전체 차량 요약 통계
         """
-        start_time = datetime.utcnow() - timedelta(hours=hours)
-        
-        # 차량별 최신 온도
-        vehicles = self.db.query(Vehicle).all()
-        
-        vehicle_status = []
-        for vehicle in vehicles:
-            latest_log = self.db.query(VehicleTemperatureLog).filter(
-                VehicleTemperatureLog.vehicle_id == vehicle.id
-            ).order_by(desc(VehicleTemperatureLog.created_at)).first()
-            
-            if latest_log:
-                status = "NORMAL"
-                if vehicle.vehicle_type == "냉동":
-                    if latest_log.temperature_a and (latest_log.temperature_a < -25 or latest_log.temperature_a > -15):
-                        status = "VIOLATION"
-                
-                vehicle_status.append({
-                    "vehicle_id": vehicle.id,
-                    "vehicle_number": vehicle.plate_number,
-                    "vehicle_type": vehicle.vehicle_type,
-                    "temperature_a": latest_log.temperature_a,
-                    "temperature_b": latest_log.temperature_b,
-                    "status": status,
-                    "last_updated": latest_log.created_at.isoformat()
-                })
+        if status is not None and status not in FLEET_STATUSES:
+            raise ValueError(f"지원하지 않는 상태입니다: {status}")
         
-        # 알림 통계
-        total_alerts = self.db.query(func.count(TemperatureAlert.id)).filter(
-            TemperatureAlert.detected_at >= start_time
-        ).scalar()
-        
-        critical_alerts = self.db.query(func.count(TemperatureAlert.id)).filter(
-            and_(
-                TemperatureAlert.detected_at >= start_time,
-                TemperatureAlert.severity == "CRITICAL"
+        start_time = datetime.utcnow() - timedelta(hours=hours)
+        state = VehicleLatestState
+        status_expression = self._fleet_status_expression()
+        vehicles = select(Vehicle.id).outerjoin(state, state.vehicle_id == Vehicle.id)
+        
+        def status_count(value: str):
+            return func.coalesce(func.sum(case((status_expression == value, 1), else_=0)), 0)
+        
+        def alert_count(*conditions):
+            return (
+                select(func.count(TemperatureAlert.id))
+                .where(TemperatureAlert.detected_at >= start_time, *conditions)
+                .scalar_subquery()
             )
-        ).scalar()
         
-        # 상태별 차량 수
-        normal_count = sum(1 for v in vehicle_status if v["status"] == "NORMAL")
-        violation_count = sum(1 for v in vehicle_status if v["status"] == "VIOLATION")
+        stats = vehicles.with_only_columns(
+            func.count(Vehicle.id).label("total_vehicles"),
+            *[status_count(value).label(value) for value in FLEET_STATUSES],
+            alert_count().label("total_alerts"),
+            alert_count(TemperatureAlert.severity == "CRITICAL").label("critical_alerts")
+        ).subquery()
+        
+        page = vehicles.add_columns(
+            Vehicle.plate_number, Vehicle.vehicle_type, state.temperature_a, state.temperature_b,
+            state.temperature_recorded_at, status_expression.label("status")
+        ).where(
+            status_expression == status if status else state.temperature_recorded_at.isnot(None)
+        ).order_by(Vehicle.id).offset(skip)
+        if limit is not None:
+            page = page.limit(limit)
+        page = page.subquery()
+        
+        # 집계 1행에 페이지를 LEFT JOIN (페이지가 비어도 집계는 반환)
+        rows = self.db.execute(
+            select(stats, page).select_from(stats.outerjoin(page, true()))
+        ).mappings().all()
+        
+        totals = rows[0]
+        total_vehicles = totals["total_vehicles"]
+        normal_count = totals["NORMAL"]
+        vehicle_status = [
+            {
+                "vehicle_id": row["id"],
+                "vehicle_number": row["plate_number"],
+                "vehicle_type": row["vehicle_type"],
+                "temperature_a": row["temperature_a"],
+                "temperature_b": row["temperature_b"],
+                "status": row["status"],
+                "last_updated": row["temperature_recorded_at"].isoformat() if row["temperature_recorded_at"] else None
+            }
+            for row in rows
+            if row["id"] is not None
+        ]
+        filtered = totals[status] if status else normal_count + totals["VIOLATION"]
         
         return {
             "period_hours": hours,
-            "total_vehicles": len(vehicles),
+            "total_vehicles": total_vehicles,
             "normal_vehicles": normal_count,
-            "violation_vehicles": violation_count,
-            "total_alerts": total_alerts,
-            "critical_alerts": critical_alerts,
+            "violation_vehicles": totals["VIOLATION"],
+            "no_data_vehicles": totals["NO_DATA"],
+            "total_alerts": totals["total_alerts"],
+            "critical_alerts": totals["critical_alerts"],
             "vehicle_status": vehicle_status,
+            "pagination": {
+                "status": status,
+                "skip": skip,
+                "limit": limit,
+                "total": filtered
+            },
             "summary": {
-                "compliance_rate": round((normal_count / len(vehicles) * 100) if vehicles else 100, 2),
-                "alert_rate": round((total_alerts / len(vehicles)) if vehicles else 0, 2)
+                "compliance_rate": round((normal_count / total_vehicles * 100) if total_vehicles else 100, 2),
+                "alert_rate": round((totals["total_alerts"] / total_vehicles) if total_vehicles else 0, 2)
             }
         }
     
@@ -538,31 +601,23 @@ class TemperatureAnalytics:
         Returns:
             일별 온도 트렌드
         """
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        query = self.db.query(
-            func.date(VehicleTemperatureLog.created_at).label("date"),
-            func.avg(VehicleTemperatureLog.temperature_a).label("avg_temp_a"),
-            func.min(VehicleTemperatureLog.temperature_a).label("min_temp_a"),
-            func.max(VehicleTemperatureLog.temperature_a).label("max_temp_a"),
-            func.count(VehicleTemperatureLog.id).label("record_count")
-        ).filter(
-            VehicleTemperatureLog.created_at >= start_date
-        )
-        
-        if vehicle_id:
-            query = query.filter(VehicleTemperatureLog.vehicle_id == vehicle_id)
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=days)
         
-        results = query.group_by(func.date(VehicleTemperatureLog.created_at)).order_by("date").all()
+        results = self._rollup_totals(
+            start_date, end_date, [vehicle_id] if vehicle_id else None,
+            bucket_seconds=TemperatureRollupDay.BUCKET_SECONDS
+        )
         
         trends = []
         for result in results:
+            count = result["temp_a_count"]
             trends.append({
-                "date": str(result.date),
-                "avg_temperature": round(float(result.avg_temp_a), 2) if result.avg_temp_a else None,
-                "min_temperature": round(float(result.min_temp_a), 2) if result.min_temp_a else None,
-                "max_temperature": round(float(result.max_temp_a), 2) if result.max_temp_a else None,
-                "record_count": result.record_count
+                "date": result["bucket"].date().isoformat(),
+                "avg_temperature": round(result["temp_a_sum"] / count, 2) if count else None,
+                "min_temperature": round(float(result["temp_a_min"]), 2) if result["temp_a_min"] is not None else None,
+                "max_temperature": round(float(result["temp_a_max"]), 2) if result["temp_a_max"] is not None else None,
+                "record_count": result["record_count"]
             })
         
         return {
@@ -0,0 +1,331 @@
+"""
+온도 이상 패턴 감지
+- 배치: 전체 차량 온도 로그를 컬럼 배열(DataFrame)로 한 번 읽어 벡터 연산으로 감지
+- 온라인: 차량별 롤링 상태를 유지하며 수집 시점에 측정 1건씩 감지 (TemperatureAlert 생성)
+
+감지 패턴:
+- RAPID_CHANGE: 직전 측정 대비 RAPID_CHANGE_THRESHOLD(℃) 초과 변화 (센서 A/B)
+- PROLONGED_DEVIATION: 센서 A 가 기준 평균에서 DEVIATION_THRESHOLD(℃) 초과로
+  PROLONGED_READINGS 회 연속 (5분 주기 기준 30분), 감지 후 카운트 초기화
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.uvis_gps import VehicleTemperatureLog
+from app.models.vehicle_location import TemperatureAlert
+from app.services.vehicle_state_store import to_utc_naive
+
+
+RAPID_CHANGE_THRESHOLD = 5.0
+RAPID_CHANGE_HIGH = 10.0
+DEVIATION_THRESHOLD = 3.0
+PROLONGED_READINGS = 6  # 30분 (5분 * 6)
+MIN_READINGS = 10  # 이보다 측정이 적은 차량은 감지하지 않음 (기준 평균 신뢰도)
+
+SENSOR_COLUMNS = (("A", "temperature_a"), ("B", "temperature_b"))
+
+
+def _rapid_change(sensor: str, timestamp: datetime, before: float, after: float) -> Dict[str, Any]:
+    change = abs(after - before)
+    return {
+        "type": "RAPID_CHANGE",
+        "sensor": sensor,
+        "timestamp": timestamp.isoformat(),
+        "temperature_before": before,
+        "temperature_after": after,
+        "change": change,
+        "severity": "HIGH" if change > RAPID_CHANGE_HIGH else "MEDIUM"
+    }
+
+
+def _prolonged_deviation(timestamp: datetime, temperature: float, expected: float) -> Dict[str, Any]:
+    return {
+        "type": "PROLONGED_DEVIATION",
+        "sensor": "A",
+        "timestamp": timestamp.isoformat(),
+        "temperature": temperature,
+        "expected": expected,
+        "deviation": abs(temperature - expected),
+        "severity": "MEDIUM"
+    }
+
+
+# ==================== 배치 ====================
+
+def load_readings(
+    db: Session,
+    start_time: datetime,
+    vehicle_ids: Optional[Iterable[int]] = None
+) -> pd.DataFrame:
+    """start_time 이후 온도 로그 (vehicle_id, created_at, temperature_a, temperature_b) 컬럼만 조회"""
+    log = VehicleTemperatureLog
+    query = select(log.vehicle_id, log.created_at, log.temperature_a, log.temperature_b).where(
+        log.vehicle_id.isnot(None),
+        log.created_at >= start_time
+    )
+    if vehicle_ids is not None:
+        query = query.where(log.vehicle_id.in_(list(vehicle_ids)))
+
+    rows = db.execute(query.order_by(log.vehicle_id, log.created_at)).all()
+    frame = pd.DataFrame.from_records(
+        rows, columns=["vehicle_id", "created_at", "temperature_a", "temperature_b"]
+    )
+    for _, column in SENSOR_COLUMNS:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    return frame
+
+
+def detect_anomalies(frame: pd.DataFrame) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    차량별 이상 패턴 (벡터 연산)
+
+    Args:
+        frame: vehicle_id, created_at, temperature_a, temperature_b 컬럼
+
+    Returns:
+        {vehicle_id: [이상 패턴, ...]} (이상이 없는 차량은 제외, 차량별 급변 -> 장시간 이탈 순, 시각순)
+    """
+    if frame.empty:
+        return {}
+
+    frame = frame.sort_values(["vehicle_id", "created_at"], kind="stable").reset_index(drop=True)
+    frame = frame[frame.groupby("vehicle_id")["vehicle_id"].transform("size") >= MIN_READINGS]
+    if frame.empty:
+        return {}
+
+    vehicles = frame["vehicle_id"]
+    grouped = frame.groupby("vehicle_id", sort=False)
+    anomalies: Dict[int, List[Tuple[int, int, Dict[str, Any]]]] = {}
+
+    # 1. 급격한 온도 변화 (직전 측정에 값이 없으면 비교하지 않음)
+    for sensor_index, (sensor, column) in enumerate(SENSOR_COLUMNS):
+        before = grouped[column].shift()
+        mask = (frame[column] - before).abs() > RAPID_CHANGE_THRESHOLD
+        for index in frame.index[mask]:
+            anomalies.setdefault(int(vehicles[index]), []).append((index * 2 + sensor_index, 0, _rapid_change(
+                sensor, frame.at[index, "created_at"], float(before[index]), float(frame.at[index, column])
+            )))
+
+    # 2. 장시간 이상 온도 유지 (센서 A, 차량별 기간 평균 기준)
+    temperature = frame["temperature_a"]
+    expected = grouped["temperature_a"].transform("mean")
+    deviated = (temperature - expected).abs() > DEVIATION_THRESHOLD
+    runs = ((deviated != deviated.shift()) | (vehicles != vehicles.shift())).cumsum()
+    position = deviated.groupby(runs).cumcount() + 1
+    mask = deviated & (position % PROLONGED_READINGS == 0)
+    for index in frame.index[mask]:
+        anomalies.setdefault(int(vehicles[index]), []).append((index, 1, _prolonged_deviation(
+            frame.at[index, "created_at"], float(temperature[index]), float(expected[index])
+        )))
+
+    return {
+        vehicle_id: [anomaly for _, _, anomaly in sorted(items, key=lambda item: (item[1], item[0]))]
+        for vehicle_id, items in anomalies.items()
+    }
+
+
+def detect_fleet_anomalies(
+    db: Session,
+    hours: int = 24,
+    vehicle_ids: Optional[Iterable[int]] = None
+) -> Dict[int, List[Dict[str, Any]]]:
+    """최근 hours 시간 전체(또는 지정) 차량 이상 패턴 (조회 1회 + 벡터 연산 1회)"""
+    start_time = datetime.utcnow() - timedelta(hours=hours)
+    return detect_anomalies(load_readings(db, start_time, vehicle_ids))
+
+
+# ==================== 온라인 ====================
+
+def _load_device_readings(
+    db: Session,
+    start_time: datetime
+) -> List[Tuple[int, datetime, Optional[float], Optional[float]]]:
+    """
+    start_time 이후 온도 로그 (vehicle_id, 측정 시각, temperature_a, temperature_b), 차량별 측정 시각순
+
+    측정 시각은 수집 경로와 같은 단말기 시각(KST -> UTC)이며, 파싱 불가/미래 시각이면 저장 시각을 사용합니다.
+    """
+    from app.services.uvis_gps_service import device_time_utc  # 순환 import 방지
+
+    log = VehicleTemperatureLog
+    rows = db.execute(
+        select(log.vehicle_id, log.tpl_date, log.tpl_time, log.created_at, log.temperature_a, log.temperature_b)
+        .where(log.vehicle_id.isnot(None), log.created_at >= start_time)
+    ).all()
+    readings = [
+        (
+            int(vehicle_id),
+            device_time_utc(tpl_date, tpl_time) or to_utc_naive(created_at),
+            None if temperature_a is None else float(temperature_a),
+            None if temperature_b is None else float(temperature_b),
+        )
+        for vehicle_id, tpl_date, tpl_time, created_at, temperature_a, temperature_b in rows
+    ]
+    readings.sort(key=lambda reading: (reading[0], reading[1]))
+    return readings
+
+
+@dataclass
+class _VehicleAnomalyState:
+    """차량별 롤링 상태"""
+    last_at: Optional[datetime] = None
+    last: Dict[str, Optional[float]] = field(default_factory=dict)
+    baseline: Deque[Tuple[datetime, float]] = field(default_factory=deque)
+    baseline_sum: float = 0.0
+    deviation_run: int = 0
+
+
+class OnlineAnomalyDetector:
+    """
+    수집 시점 온도 이상 감지
+
+    차량별 직전 측정, 센서 A 기준 평균(최근 BASELINE_HOURS 시간 롤링), 연속 이탈 횟수만 유지하므로
+    측정 1건당 O(1) 입니다. 프로세스 시작 후 첫 호출에서 최근 로그로 상태를 복원합니다.
+    """
+
+    BASELINE_HOURS = 24
+
+    def __init__(self):
+        self._states: Dict[int, _VehicleAnomalyState] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def observe(
+        self,
+        vehicle_id: int,
+        recorded_at: datetime,
+        temperature_a: Optional[float],
+        temperature_b: Optional[float]
+    ) -> List[Dict[str, Any]]:
+        """
+        측정 1건 반영
+
+        Returns:
+            감지된 이상 패턴 (이전 측정보다 오래된 측정은 무시하고 [] 반환)
+        """
+        recorded_at = to_utc_naive(recorded_at)
+        with self._lock:
+            return self._observe(self._states.setdefault(vehicle_id, _VehicleAnomalyState()),
+                                 recorded_at, {"A": temperature_a, "B": temperature_b})
+
+    def _observe(
+        self,
+        state: _VehicleAnomalyState,
+        recorded_at: datetime,
+        temperatures: Dict[str, Optional[float]]
+    ) -> List[Dict[str, Any]]:
+        if state.last_at is not None and recorded_at <= state.last_at:
+            return []
+
+        anomalies = []
+        for sensor, _ in SENSOR_COLUMNS:
+            before, after = state.last.get(sensor), temperatures[sensor]
+            if before is not None and after is not None and abs(after - before) > RAPID_CHANGE_THRESHOLD:
+                anomalies.append(_rapid_change(sensor, recorded_at, before, after))
+
+        temperature = temperatures["A"]
+        if temperature is not None:
+            state.baseline.append((recorded_at, temperature))
+            state.baseline_sum += temperature
+        cutoff = recorded_at - timedelta(hours=self.BASELINE_HOURS)
+        while state.baseline and state.baseline[0][0] < cutoff:
+            state.baseline_sum -= state.baseline.popleft()[1]
+
+        expected = state.baseline_sum / len(state.baseline) if state.baseline else None
+        if (
+            temperature is not None
+            and len(state.baseline) >= MIN_READINGS
+            and abs(temperature - expected) > DEVIATION_THRESHOLD
+        ):
+            state.deviation_run += 1
+            if state.deviation_run >= PROLONGED_READINGS:
+                anomalies.append(_prolonged_deviation(recorded_at, temperature, expected))
+                state.deviation_run = 0
+        else:
+            state.deviation_run = 0
+
+        state.last_at = recorded_at
+        state.last = dict(temperatures)
+        return anomalies
+
+    def observe_many(self, db: Session, readings: Iterable[Dict[str, Any]]) -> List[TemperatureAlert]:
+        """
+        수집된 측정 반영 후 감지된 이상을 TemperatureAlert 로 추가 (커밋은 호출자)
+
+        Args:
+            readings: vehicle_id, recorded_at, temperature_a, temperature_b 를 가진 dict
+        """
+        self._ensure_loaded(db)
+
+        alerts = []
+        for reading in sorted(
+            (r for r in readings if r.get("vehicle_id") is not None),
+            key=lambda r: to_utc_naive(r["recorded_at"])
+        ):
+            for anomaly in self.observe(
+                reading["vehicle_id"], reading["recorded_at"],
+                reading.get("temperature_a"), reading.get("temperature_b")
+            ):
+                alerts.append(self._to_alert(reading["vehicle_id"], anomaly))
+
+        if alerts:
+            db.add_all(alerts)
+            logger.warning(f"🌡️ 온도 이상 패턴 {len(alerts)}건 감지")
+        return alerts
+
+    @staticmethod
+    def _to_alert(vehicle_id: int, anomaly: Dict[str, Any]) -> TemperatureAlert:
+        if anomaly["type"] == "RAPID_CHANGE":
+            temperature = anomaly["temperature_after"]
+            message = (
+                f"센서 {anomaly['sensor']} 온도 급변: "
+                f"{anomaly['temperature_before']:.1f}°C → {temperature:.1f}°C"
+            )
+        else:
+            temperature = anomaly["temperature"]
+            message = (
+                f"센서 {anomaly['sensor']} 온도 장시간 이탈: {temperature:.1f}°C "
+                f"(기준 {anomaly['expected']:.1f}°C)"
+            )
+        return TemperatureAlert(
+            vehicle_id=vehicle_id,
+            alert_type=anomaly["type"],
+            severity="CRITICAL" if anomaly["severity"] == "HIGH" else "WARNING",
+            temperature_celsius=temperature,
+            detected_at=datetime.fromisoformat(anomaly["timestamp"]),
+            message=message
+        )
+
+    def _ensure_loaded(self, db: Session):
+        """최근 BASELINE_HOURS 시간 로그로 차량별 상태 복원 (프로세스당 1회, 알림 없음)"""
+        if self._loaded:
+            return
+        readings = _load_device_readings(db, datetime.utcnow() - timedelta(hours=self.BASELINE_HOURS))
+        with self._lock:
+            if self._loaded:
+                return
+            for vehicle_id, recorded_at, temperature_a, temperature_b in readings:
+                state = self._states.setdefault(vehicle_id, _VehicleAnomalyState())
+                self._observe(state, recorded_at, {"A": temperature_a, "B": temperature_b})
+            self._loaded = True
+        logger.info(
+            f"온도 이상 감지 상태 복원: 차량 {len({reading[0] for reading in readings})}대, 측정 {len(readings)}건"
+        )
+
+    def reset(self):
+        with self._lock:
+            self._states.clear()
+            self._loaded = False
+
+
+# 전역 인스턴스
+temperature_anomaly_monitor = OnlineAnomalyDetector()
@@ -0,0 +1,240 @@
+"""
+온도 집계 파이프라인
+- 원시 온도 로그(vehicle_temperature_logs)를 차량별 5분 집계로 증분 반영
+- 5분 집계 -> 1시간 -> 1일 재집계 (SQL INSERT ... SELECT)
+- 조회는 기간을 일/시간/5분 구간으로 나눠 가장 큰 단위의 집계를 사용 (tiered_ranges)
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.models.telemetry_rollup import TemperatureRollup5m, TemperatureRollupDay, TemperatureRollupHour
+from app.models.uvis_gps import VehicleTemperatureLog
+from app.models.vehicle import Vehicle, VehicleType
+from app.services.telemetry_storage_service import floor_time, time_bucket
+
+
+# 차량 온도대별 준수 범위 (℃, 경계 포함)
+COMPLIANCE_RANGES: Dict[str, Tuple[float, float]] = {
+    VehicleType.FROZEN.value: (-25.0, -15.0),
+    VehicleType.REFRIGERATED.value: (0.0, 5.0),
+}
+
+SENSORS = ("a", "b")
+
+ROLLUP_COLUMNS = ["record_count", "sample_slots"] + [
+    f"temp_{sensor}_{name}"
+    for sensor in SENSORS
+    for name in ("count", "sum", "sq_sum", "min", "max", "too_hot", "too_cold", "out_of_range_seconds")
+]
+
+
+def rollup_aggregate(column, name: str):
+    """집계 컬럼 재집계 함수 (min/max 는 그대로, 나머지는 합산)"""
+    if name.endswith("_min"):
+        return func.min(column)
+    if name.endswith("_max"):
+        return func.max(column)
+    return func.sum(column)
+
+
+def check_compliance(temperature: float, vehicle_type) -> Optional[str]:
+    """준수 범위 위반 유형 (TOO_COLD / TOO_HOT), 범위가 없는 온도대는 None"""
+    bounds = COMPLIANCE_RANGES.get(getattr(vehicle_type, "value", vehicle_type))
+    if bounds is None:
+        return None
+    if temperature < bounds[0]:
+        return "TOO_COLD"
+    if temperature > bounds[1]:
+        return "TOO_HOT"
+    return None
+
+
+def ceil_time(value: datetime, seconds: int) -> datetime:
+    floored = floor_time(value, seconds)
+    return floored if floored == value else floored + timedelta(seconds=seconds)
+
+
+def tiered_ranges(start: datetime, end: datetime) -> List[Tuple[type, datetime, datetime]]:
+    """
+    [start, end) 를 (집계 테이블, 구간 시작, 구간 끝) 목록으로 분할
+
+    가운데는 1일, 가장자리는 1시간/5분 집계를 사용합니다. 양 끝은 5분 단위로 맞춥니다
+    (시작은 내림, 끝은 올림).
+    """
+    start = floor_time(start, TemperatureRollup5m.BUCKET_SECONDS)
+    end = ceil_time(end, TemperatureRollup5m.BUCKET_SECONDS)
+    if start >= end:
+        return []
+
+    hour_start = ceil_time(start, TemperatureRollupHour.BUCKET_SECONDS)
+    hour_end = floor_time(end, TemperatureRollupHour.BUCKET_SECONDS)
+    if hour_start >= hour_end:
+        return [(TemperatureRollup5m, start, end)]
+
+    day_start = ceil_time(hour_start, TemperatureRollupDay.BUCKET_SECONDS)
+    day_end = floor_time(hour_end, TemperatureRollupDay.BUCKET_SECONDS)
+    if day_start >= day_end:
+        ranges = [
+            (TemperatureRollup5m, start, hour_start),
+            (TemperatureRollupHour, hour_start, hour_end),
+            (TemperatureRollup5m, hour_end, end),
+        ]
+    else:
+        ranges = [
+            (TemperatureRollup5m, start, hour_start),
+            (TemperatureRollupHour, hour_start, day_start),
+            (TemperatureRollupDay, day_start, day_end),
+            (TemperatureRollupHour, day_end, hour_end),
+            (TemperatureRollup5m, hour_end, end),
+        ]
+    return [(model, range_start, range_end) for model, range_start, range_end in ranges if range_start < range_end]
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class TemperatureRollupService:
+    """온도 집계 증분 갱신"""
+
+    MAX_SAMPLE_SECONDS = 600  # 측정 1건이 대표하는 최대 시간 (다음 측정까지, 수집 중단 구간은 제외)
+    REAGGREGATE_SECONDS = 900  # 다음 측정이 도착해야 확정되는 마지막 구간 재집계 (>= MAX_SAMPLE_SECONDS)
+    MAX_REFRESH_WINDOW = timedelta(days=1)  # 1회 실행당 최대 처리 구간 (초기 백필 분할)
+    LOCK_KEY = 7302  # PostgreSQL advisory lock
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    def refresh(self, now: Optional[datetime] = None) -> int:
+        """
+        새로 들어온 온도 로그를 5분/1시간/1일 집계에 반영
+
+        진행 중인 5분 구간도 부분 집계하며, 다음 실행에서 다시 계산됩니다.
+
+        Returns:
+            갱신된 5분 집계 행 수
+        """
+        now = now or datetime.utcnow()
+        if self.dialect == "postgresql" and not self.db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": self.LOCK_KEY}
+        ).scalar():
+            return 0
+
+        try:
+            window = self._pending_window(now)
+            if window is None:
+                self.db.commit()
+                return 0
+            start, end = window
+            updated = self._refresh_5m(start, end)
+            hour_start = floor_time(start, TemperatureRollupHour.BUCKET_SECONDS)
+            self._reaggregate(TemperatureRollup5m, TemperatureRollupHour, hour_start, end)
+            day_start = floor_time(start, TemperatureRollupDay.BUCKET_SECONDS)
+            self._reaggregate(TemperatureRollupHour, TemperatureRollupDay, day_start, end)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.debug(f"온도 집계 갱신: {start} ~ {end}, 5분 집계 {updated}건")
+        return updated
+
+    def _pending_window(self, now: datetime) -> Optional[Tuple[datetime, datetime]]:
+        """마지막 집계 이후 첫 로그부터 최대 MAX_REFRESH_WINDOW 구간 (마지막 REAGGREGATE_SECONDS 포함)"""
+        last_bucket = self.db.execute(select(func.max(TemperatureRollup5m.bucket_start))).scalar()
+        rolled = last_bucket + timedelta(seconds=TemperatureRollup5m.BUCKET_SECONDS) if last_bucket else None
+
+        query = select(func.min(VehicleTemperatureLog.created_at)).where(VehicleTemperatureLog.vehicle_id.isnot(None))
+        if rolled is not None:
+            query = query.where(VehicleTemperatureLog.created_at >= rolled.replace(tzinfo=timezone.utc))
+        pending = self.db.execute(query).scalar()
+        if pending is None and rolled is None:
+            return None
+
+        if rolled is None:
+            start = floor_time(_to_utc_naive(pending), TemperatureRollup5m.BUCKET_SECONDS)
+        else:
+            start = floor_time(rolled - timedelta(seconds=self.REAGGREGATE_SECONDS), TemperatureRollup5m.BUCKET_SECONDS)
+
+        end = now
+        if pending is not None:
+            frontier = max(start, floor_time(_to_utc_naive(pending), TemperatureRollup5m.BUCKET_SECONDS))
+            end = min(end, frontier + self.MAX_REFRESH_WINDOW)
+        return (start, end) if start < end else None
+
+    def _refresh_5m(self, start: datetime, end: datetime) -> int:
+        """[start, end) 5분 집계를 원시 로그에서 다시 계산 (컬럼 튜플만 조회, delete + insert)"""
+        log = VehicleTemperatureLog
+        rows = self.db.execute(
+            select(log.vehicle_id, log.created_at, log.temperature_a, log.temperature_b, Vehicle.vehicle_type)
+            .join(Vehicle, Vehicle.id == log.vehicle_id)
+            .where(
+                log.created_at >= start.replace(tzinfo=timezone.utc),
+                log.created_at < end.replace(tzinfo=timezone.utc),
+            )
+            .order_by(log.vehicle_id, log.created_at)
+        ).all()
+
+        buckets: Dict[Tuple[int, datetime], Dict[str, float]] = defaultdict(self._empty_bucket)
+        for index, (vehicle_id, created_at, temperature_a, temperature_b, vehicle_type) in enumerate(rows):
+            created_at = _to_utc_naive(created_at)
+            following = rows[index + 1] if index + 1 < len(rows) else None
+            duration = 0.0
+            if following is not None and following[0] == vehicle_id:
+                duration = min((_to_utc_naive(following[1]) - created_at).total_seconds(), self.MAX_SAMPLE_SECONDS)
+
+            bucket = buckets[(vehicle_id, floor_time(created_at, TemperatureRollup5m.BUCKET_SECONDS))]
+            bucket["record_count"] += 1
+            for sensor, value in zip(SENSORS, (temperature_a, temperature_b)):
+                if value is None:
+                    continue
+                prefix = f"temp_{sensor}_"
+                bucket[prefix + "count"] += 1
+                bucket[prefix + "sum"] += value
+                bucket[prefix + "sq_sum"] += value * value
+                bucket[prefix + "min"] = value if bucket[prefix + "min"] is None else min(bucket[prefix + "min"], value)
+                bucket[prefix + "max"] = value if bucket[prefix + "max"] is None else max(bucket[prefix + "max"], value)
+                violation = check_compliance(value, vehicle_type)
+                if violation:
+                    bucket[prefix + ("too_hot" if violation == "TOO_HOT" else "too_cold")] += 1
+                    bucket[prefix + "out_of_range_seconds"] += duration
+
+        self.db.execute(
+            delete(TemperatureRollup5m).where(
+                TemperatureRollup5m.bucket_start >= start, TemperatureRollup5m.bucket_start < end
+            )
+        )
+        if buckets:
+            self.db.execute(insert(TemperatureRollup5m), [
+                {**values, "vehicle_id": vehicle_id, "bucket_start": bucket_start, "sample_slots": 1}
+                for (vehicle_id, bucket_start), values in buckets.items()
+            ])
+        return len(buckets)
+
+    @staticmethod
+    def _empty_bucket() -> Dict[str, Optional[float]]:
+        return {name: None if name.endswith(("_min", "_max")) else 0 for name in ROLLUP_COLUMNS}
+
+    def _reaggregate(self, source, target, start: datetime, end: datetime):
+        """하위 집계(source)에서 상위 집계(target)의 [start, end) 구간을 다시 계산"""
+        bucket = time_bucket(source.bucket_start, target.BUCKET_SECONDS, self.dialect)
+        aggregates = [rollup_aggregate(getattr(source, name), name) for name in ROLLUP_COLUMNS]
+
+        self.db.execute(delete(target).where(target.bucket_start >= start, target.bucket_start < end))
+        self.db.execute(
+            insert(target).from_select(
+                ["vehicle_id", "bucket_start", *ROLLUP_COLUMNS],
+                select(source.vehicle_id, bucket, *aggregates)
+                .where(source.bucket_start >= start, source.bucket_start < end)
+                .group_by(source.vehicle_id, bucket)
+            )
+        )
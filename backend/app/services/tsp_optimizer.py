@@ -10,6 +10,8 @@ from loguru import logger
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
 
+from app.services.distance_matrix import get_distance_matrix_engine
+
 
 class TSPOptimizer:
     """TSP (Traveling Salesman Problem) 최적화 서비스"""
@@ -55,21 +57,8 @@ class TSPOptimizer:
         all_locations = [start_location] + [(loc['latitude'], loc['longitude']) for loc in locations]
         num_locations = len(all_locations)
         
-        # 거리 행렬 생성
-        distance_matrix = []
-        for i in range(num_locations):
-            row = []
-            for j in range(num_locations):
-                if i == j:
-                    row.append(0)
-                else:
-                    dist = TSPOptimizer.calculate_distance(
-                        all_locations[i][0], all_locations[i][1],
-                        all_locations[j][0], all_locations[j][1]
-                    )
-                    # Convert to meters for OR-Tools
-                    row.append(int(dist * 1000))
-            distance_matrix.append(row)
+        # 거리 행렬 생성 (미터, OR-Tools용)
+        distance_matrix = get_distance_matrix_engine().distance_matrix_m(all_locations).tolist()
         
         # OR-Tools TSP 설정
         manager = pywrapcp.RoutingIndexManager(num_locations, 1, 0)  # 1 vehicle, start at 0
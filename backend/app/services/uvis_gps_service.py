@@ -1,12 +1,17 @@
 """
 UVIS GPS 관제 시스템 API 서비스
 """
+import asyncio
 import httpx
 import json
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+import numpy as np
+import pandas as pd
+from loguru import logger
+from sqlalchemy import desc, event, inspect, insert
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 import time
 
 from app.models.uvis_gps import (
@@ -16,6 +21,8 @@ from app.models.uvis_gps import (
     UvisApiLog
 )
 from app.models.vehicle import Vehicle
+from app.services.temperature_anomaly_detector import temperature_anomaly_monitor
+from app.services.vehicle_state_store import VehicleLastState, vehicle_state_store
 
 
 # UVIS API 설정
@@ -23,38 +30,341 @@ UVIS_BASE_URL = "https://s1.u-vis.com/uvisc"
 UVIS_SERIAL_KEY = "S1910-3A84-4559--CC4"  # 업체 인증키
 ACCESS_KEY_VALID_MINUTES = 5  # 인증키 유효 시간
 
+# UVIS 단말기 시각 (BI_DATE/BI_TIME, TPL_DATE/TPL_TIME) 은 KST
+UVIS_DEVICE_UTC_OFFSET = timedelta(hours=9)
+
+# 속도 유효 범위 (255 등 상한 이상은 GPS 오류 값으로 간주하여 0으로 처리)
+GPS_MAX_SPEED_KMH = 250
+
+GPS_FIELDS = [
+    "TID_ID", "BI_DATE", "BI_TIME", "CM_NUMBER", "BI_TURN_ONOFF",
+    "BI_X_POSITION", "BI_Y_POSITION", "BI_GPS_SPEED",
+]
+TEMPERATURE_FIELDS = [
+    "OFF_KEY", "TID_ID", "TPL_DATE", "TPL_TIME", "CM_NUMBER",
+    "TPL_X_POSITION", "TPL_Y_POSITION",
+    "TPL_SIGNAL_A", "TPL_DEGREE_A", "TPL_SIGNAL_B", "TPL_DEGREE_B",
+]
+
+
+class DeviceVehicleMap:
+    """
+    UVIS 단말기 ID(TID_ID) → 차량 ID 매핑 캐시
+
+    폴링마다 항목별로 Vehicle 을 조회하는 대신 전체 매핑을 한 번 로드해 재사용합니다.
+    차량의 uvis_device_id 가 바뀌면(ORM 이벤트) 무효화되고, TTL 이 지나거나
+    등록되지 않은 단말기가 보이면(MISS_REFRESH_SECONDS 간격으로) 다시 로드합니다.
+    """
+
+    TTL_SECONDS = 300
+    MISS_REFRESH_SECONDS = 30
+
+    _map: Optional[Dict[str, int]] = None
+    _loaded_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def resolve(cls, db: Session, tid_ids: Iterable[Optional[str]]) -> Dict[str, int]:
+        """단말기 ID 목록에 대한 매핑 반환 (미등록 단말기는 포함되지 않음)"""
+        tid_ids = {str(tid_id) for tid_id in tid_ids if tid_id}
+        now = time.monotonic()
+
+        with cls._lock:
+            mapping = cls._map
+            age = now - cls._loaded_at
+        reload = (
+            mapping is None
+            or age > cls.TTL_SECONDS
+            or (age > cls.MISS_REFRESH_SECONDS and not tid_ids.issubset(mapping))
+        )
+        if reload:
+            mapping = cls._load(db)
+
+        return {tid_id: mapping[tid_id] for tid_id in tid_ids if tid_id in mapping}
+
+    @classmethod
+    def _load(cls, db: Session) -> Dict[str, int]:
+        rows = db.query(Vehicle.uvis_device_id, Vehicle.id).filter(
+            Vehicle.uvis_device_id.isnot(None)
+        ).all()
+        mapping = {str(device_id): vehicle_id for device_id, vehicle_id in rows}
+        with cls._lock:
+            cls._map = mapping
+            cls._loaded_at = time.monotonic()
+        logger.debug(f"UVIS 단말기 매핑 로드: {len(mapping)}대")
+        return mapping
+
+    @classmethod
+    def invalidate(cls):
+        """매핑 캐시 무효화"""
+        with cls._lock:
+            cls._map = None
+
+
+def _invalidate_device_map(mapper, connection, target):
+    if target.uvis_device_id is not None:
+        DeviceVehicleMap.invalidate()
+
+
+def _invalidate_device_map_on_update(mapper, connection, target):
+    if inspect(target).attrs.uvis_device_id.history.has_changes():
+        DeviceVehicleMap.invalidate()
+
+
+event.listen(Vehicle, "after_insert", _invalidate_device_map)
+event.listen(Vehicle, "after_delete", _invalidate_device_map)
+event.listen(Vehicle, "after_update", _invalidate_device_map_on_update)
+
+
+def _payload_frame(items: List[Dict[str, Any]], fields: List[str]) -> pd.DataFrame:
+    """UVIS 응답 → DataFrame (필요 컬럼만, 단말기 ID 없는 항목 제외)"""
+    df = pd.DataFrame.from_records(items).reindex(columns=fields)
+    valid = df["TID_ID"].notna() & (df["TID_ID"].astype(str).str.strip() != "")
+    if not valid.all():
+        logger.warning(f"단말기 ID 없는 UVIS 항목 {int((~valid).sum())}건 제외")
+    return df[valid]
+
+
+def _text(series: pd.Series, default: Optional[str] = None) -> pd.Series:
+    """문자열 컬럼 (결측은 default)"""
+    return series.astype(object).where(series.notna(), default).map(
+        lambda value: value if value is None else str(value)
+    )
+
+
+def _coordinate(series: pd.Series) -> pd.Series:
+    """좌표 문자열 → float (빈 값/파싱 불가 → NaN)"""
+    return pd.to_numeric(series.replace("", np.nan), errors="coerce")
+
+
+def _integer(series: pd.Series) -> pd.Series:
+    """정수 컬럼 (결측/파싱 불가/소수/무한대 → NA, 한 항목 때문에 전체 폴링이 실패하지 않도록)"""
+    value = pd.to_numeric(series, errors="coerce")
+    return value.where(np.isfinite(value) & (value == value.round())).astype("Int64")
+
+
+def _signed_temperature(signal: pd.Series, degree: pd.Series) -> pd.Series:
+    """온도 파싱 (부호 + 값, 0='+', 1='-')"""
+    value = pd.to_numeric(degree, errors="coerce")
+    negative = pd.to_numeric(signal, errors="coerce") == 1
+    return value.where(~negative, -value)
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """NaN/NA → None 으로 바꾼 INSERT 파라미터"""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def device_time_utc(date_str: Optional[str], time_str: Optional[str]) -> Optional[datetime]:
+    """UVIS 단말기 시각(KST YYYYMMDD + HHMMSS) → UTC naive (파싱 불가/미래 시각은 None)"""
+    try:
+        local = datetime.strptime(f"{date_str}{time_str}", "%Y%m%d%H%M%S")
+    except (TypeError, ValueError):
+        return None
+    utc = local - UVIS_DEVICE_UTC_OFFSET
+    return utc if utc <= datetime.utcnow() else None
+
+
+def parse_gps_payload(items: List[Dict[str, Any]], vehicle_ids: Dict[str, int]) -> List[Dict[str, Any]]:
+    """
+    UVIS 운행정보 응답 일괄 파싱/검증
+
+    Args:
+        items: UVIS-002 응답 항목
+        vehicle_ids: 단말기 ID → 차량 ID
+
+    Returns:
+        VehicleGPSLog INSERT 파라미터 리스트
+    """
+    df = _payload_frame(items, GPS_FIELDS)
+    if df.empty:
+        return []
+
+    tid_ids = _text(df["TID_ID"])
+    turn_onoff = _text(df["BI_TURN_ONOFF"], "Off")
+    raw_speed = pd.to_numeric(df["BI_GPS_SPEED"], errors="coerce")
+
+    # 비정상 속도(GPS 오류 값, 음수, 파싱 불가)는 0
+    valid_speed = (raw_speed >= 0) & (raw_speed < GPS_MAX_SPEED_KMH)
+    invalid_count = int((~valid_speed & raw_speed.notna()).sum())
+    if invalid_count:
+        logger.debug(f"비정상 속도 {invalid_count}건 → 0으로 수정")
+
+    rows = pd.DataFrame({
+        "vehicle_id": tid_ids.map(vehicle_ids).astype("Int64"),
+        "tid_id": tid_ids,
+        "bi_date": _text(df["BI_DATE"], ""),
+        "bi_time": _text(df["BI_TIME"], ""),
+        "cm_number": _text(df["CM_NUMBER"]),
+        "bi_turn_onoff": turn_onoff,
+        "bi_x_position": _text(df["BI_X_POSITION"], ""),
+        "bi_y_position": _text(df["BI_Y_POSITION"], ""),
+        "bi_gps_speed": _integer(raw_speed.round()),
+        "latitude": _coordinate(df["BI_X_POSITION"]),
+        "longitude": _coordinate(df["BI_Y_POSITION"]),
+        "is_engine_on": turn_onoff.str.lower().isin(["on", "1", "true"]),
+        "speed_kmh": raw_speed.where(valid_speed, 0).round().astype(int),
+    })
+    return _records(rows)
+
+
+def parse_temperature_payload(items: List[Dict[str, Any]], vehicle_ids: Dict[str, int]) -> List[Dict[str, Any]]:
+    """
+    UVIS 온도정보 응답 일괄 파싱/검증
+
+    Args:
+        items: UVIS-003 응답 항목
+        vehicle_ids: 단말기 ID → 차량 ID
+
+    Returns:
+        VehicleTemperatureLog INSERT 파라미터 리스트
+    """
+    df = _payload_frame(items, TEMPERATURE_FIELDS)
+    if df.empty:
+        return []
+
+    tid_ids = _text(df["TID_ID"])
+
+    rows = pd.DataFrame({
+        "vehicle_id": tid_ids.map(vehicle_ids).astype("Int64"),
+        "off_key": _text(df["OFF_KEY"]),
+        "tid_id": tid_ids,
+        "tpl_date": _text(df["TPL_DATE"], ""),
+        "tpl_time": _text(df["TPL_TIME"], ""),
+        "cm_number": _text(df["CM_NUMBER"]),
+        "tpl_x_position": _text(df["TPL_X_POSITION"], ""),
+        "tpl_y_position": _text(df["TPL_Y_POSITION"], ""),
+        "tpl_signal_a": _integer(df["TPL_SIGNAL_A"]),
+        "tpl_degree_a": _text(df["TPL_DEGREE_A"]),
+        "temperature_a": _signed_temperature(df["TPL_SIGNAL_A"], df["TPL_DEGREE_A"]),
+        "tpl_signal_b": _integer(df["TPL_SIGNAL_B"]),
+        "tpl_degree_b": _text(df["TPL_DEGREE_B"]),
+        "temperature_b": _signed_temperature(df["TPL_SIGNAL_B"], df["TPL_DEGREE_B"]),
+        "latitude": _coordinate(df["TPL_X_POSITION"]),
+        "longitude": _coordinate(df["TPL_Y_POSITION"]),
+    })
+    return _records(rows)
+
+
+# 공유 HTTP 클라이언트 (keep-alive 연결 풀)
+UVIS_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+UVIS_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+
+# 만료 ACCESS_KEY_REFRESH_MARGIN_SECONDS 전에 미리 재발급
+ACCESS_KEY_REFRESH_MARGIN_SECONDS = 60
+
+_uvis_client: Optional[httpx.AsyncClient] = None
+_uvis_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_uvis_client() -> httpx.AsyncClient:
+    """
+    프로세스 공용 UVIS AsyncClient 싱글톤
+
+    연결 풀은 이벤트 루프에 묶이므로 루프가 바뀌면(테스트 등) 새로 만듭니다.
+    """
+    global _uvis_client, _uvis_client_loop
+    loop = asyncio.get_running_loop()
+    if _uvis_client is None or _uvis_client.is_closed or _uvis_client_loop is not loop:
+        _uvis_client = httpx.AsyncClient(timeout=UVIS_HTTP_TIMEOUT, limits=UVIS_HTTP_LIMITS)
+        _uvis_client_loop = loop
+    return _uvis_client
+
+
+async def close_uvis_client() -> None:
+    """공용 UVIS 클라이언트 종료 (애플리케이션 종료 시)"""
+    global _uvis_client, _uvis_client_loop
+    if _uvis_client is not None:
+        await _uvis_client.aclose()
+        _uvis_client = None
+        _uvis_client_loop = None
+
+
+class AccessKeyCache:
+    """
+    UVIS 실시간 인증키 프로세스 캐시
+
+    유효 시간이 ACCESS_KEY_REFRESH_MARGIN_SECONDS 이상 남았으면 DB 조회 없이 반환합니다.
+    재발급은 한 번에 하나만 수행하고(single-flight), 재발급 중에는 아직 유효한 기존 키를 사용합니다.
+    """
+
+    _access_key: Optional[str] = None
+    _expires_at: float = 0.0  # monotonic
+    _lock: Optional[asyncio.Lock] = None
+    _lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def get(cls, margin_seconds: float = 0) -> Optional[str]:
+        """남은 유효 시간이 margin_seconds 를 넘는 캐시 키"""
+        if cls._access_key and cls._expires_at - time.monotonic() > margin_seconds:
+            return cls._access_key
+        return None
+
+    @classmethod
+    def store(cls, access_key: str, expires_at: datetime) -> None:
+        """키 저장 (expires_at 은 UTC)"""
+        if expires_at.tzinfo is not None:
+            expires_at = expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+        remaining = (expires_at - datetime.utcnow()).total_seconds()
+        cls._access_key = access_key
+        cls._expires_at = time.monotonic() + remaining
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls._access_key = None
+        cls._expires_at = 0.0
+
+    @classmethod
+    def lock(cls) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if cls._lock is None or cls._lock_loop is not loop:
+            cls._lock = asyncio.Lock()
+            cls._lock_loop = loop
+        return cls._lock
+
 
 class UvisGPSService:
     """UVIS GPS 관제 서비스"""
     
     def __init__(self, db: Session):
         self.db = db
-        self.client = httpx.Client(timeout=30.0)
-    
-    def __del__(self):
-        """클라이언트 정리"""
-        if hasattr(self, 'client'):
-            self.client.close()
     
     async def get_valid_access_key(self) -> Optional[str]:
         """
-        유효한 실시간 인증키 조회 (없으면 새로 발급)
+        유효한 실시간 인증키 조회 (만료 임박 시 미리 재발급)
         
         Returns:
             실시간 인증키 또는 None
         """
-        # 1. DB에서 유효한 키 조회
-        now = datetime.utcnow()
-        valid_key = self.db.query(UvisAccessKey).filter(
-            UvisAccessKey.is_active == True,
-            UvisAccessKey.expires_at > now
-        ).order_by(desc(UvisAccessKey.issued_at)).first()
+        # 1. 프로세스 캐시 (여유 있게 유효한 키)
+        access_key = AccessKeyCache.get(ACCESS_KEY_REFRESH_MARGIN_SECONDS)
+        if access_key:
+            return access_key
         
-        if valid_key:
-            return valid_key.access_key
+        lock = AccessKeyCache.lock()
+        if lock.locked():
+            # 다른 요청이 재발급 중이면 아직 유효한 기존 키 사용
+            access_key = AccessKeyCache.get()
+            if access_key:
+                return access_key
         
-        # 2. 유효한 키가 없으면 새로 발급
-        return await self.issue_access_key()
+        async with lock:
+            access_key = AccessKeyCache.get(ACCESS_KEY_REFRESH_MARGIN_SECONDS)
+            if access_key:
+                return access_key
+            
+            # 2. DB에서 유효한 키 조회 (다른 워커가 발급한 키)
+            refresh_after = datetime.utcnow() + timedelta(seconds=ACCESS_KEY_REFRESH_MARGIN_SECONDS)
+            valid_key = await self._run_db(self._find_valid_key, refresh_after)
+            
+            if valid_key:
+                access_key, expires_at = valid_key
+                AccessKeyCache.store(access_key, expires_at)
+                return access_key
+            
+            # 3. 유효한 키가 없거나 만료 임박이면 새로 발급
+            access_key = await self.issue_access_key()
+            return access_key or AccessKeyCache.get()
     
     async def issue_access_key(self) -> Optional[str]:
         """
@@ -73,11 +383,11 @@ class UvisGPSService:
         
         try:
             # API 호출
-            response = self.client.get(url, params=params)
+            response = await get_uvis_client().get(url, params=params)
             execution_time = int((time.time() - start_time) * 1000)
             
             # 로그 저장
-            self._save_api_log(
+            await self._save_api_log(
                 api_type="auth",
                 method="GET",
                 url=str(response.url),
@@ -103,32 +413,19 @@ class UvisGPSService:
                         now = datetime.utcnow()
                         expires_at = now + timedelta(minutes=ACCESS_KEY_VALID_MINUTES)
                         
-                        # 기존 키 비활성화
-                        self.db.query(UvisAccessKey).filter(
-                            UvisAccessKey.is_active == True
-                        ).update({"is_active": False})
-                        
-                        # 새 키 저장
-                        new_key = UvisAccessKey(
-                            serial_key=UVIS_SERIAL_KEY,
-                            access_key=access_key,
-                            issued_at=now,
-                            expires_at=expires_at,
-                            is_active=True
-                        )
-                        self.db.add(new_key)
-                        self.db.commit()
+                        await self._run_db(self._store_access_key, access_key, now, expires_at)
+                        AccessKeyCache.store(access_key, expires_at)
                         
                         return access_key
                 except Exception as e:
-                    print(f"⚠️ 인증키 파싱 실패: {e}")
+                    logger.warning(f"인증키 파싱 실패: {e}")
                     return None
             
             return None
             
         except Exception as e:
-            print(f"❌ UVIS 인증키 발급 실패: {e}")
-            self._save_api_log(
+            logger.error(f"UVIS 인증키 발급 실패: {e}")
+            await self._save_api_log(
                 api_type="auth",
                 method="GET",
                 url=url,
@@ -137,6 +434,30 @@ class UvisGPSService:
             )
             return None
     
+    @staticmethod
+    def _find_valid_key(db: Session, refresh_after: datetime) -> Optional[Tuple[str, datetime]]:
+        """refresh_after 이후까지 유효한 최신 인증키 (키, 만료 시각)"""
+        return db.query(UvisAccessKey.access_key, UvisAccessKey.expires_at).filter(
+            UvisAccessKey.is_active == True,
+            UvisAccessKey.expires_at > refresh_after
+        ).order_by(desc(UvisAccessKey.issued_at)).first()
+    
+    @staticmethod
+    def _store_access_key(db: Session, access_key: str, issued_at: datetime, expires_at: datetime):
+        """기존 키 비활성화 후 새 키 저장"""
+        db.query(UvisAccessKey).filter(
+            UvisAccessKey.is_active == True
+        ).update({"is_active": False})
+        
+        db.add(UvisAccessKey(
+            serial_key=UVIS_SERIAL_KEY,
+            access_key=access_key,
+            issued_at=issued_at,
+            expires_at=expires_at,
+            is_active=True
+        ))
+        db.commit()
+    
     async def get_vehicle_gps_data(self) -> List[Dict[str, Any]]:
         """
         UVIS-002: 실시간 운행정보 조회
@@ -147,7 +468,7 @@ class UvisGPSService:
         # 인증키 가져오기
         access_key = await self.get_valid_access_key()
         if not access_key:
-            print("❌ 유효한 인증키가 없습니다.")
+            logger.error("유효한 인증키가 없습니다.")
             return []
         
         url = f"{UVIS_BASE_URL}/SSOAction.do"
@@ -160,11 +481,11 @@ class UvisGPSService:
         start_time = time.time()
         
         try:
-            response = self.client.get(url, params=params)
+            response = await get_uvis_client().get(url, params=params)
             execution_time = int((time.time() - start_time) * 1000)
             
             # 로그 저장
-            self._save_api_log(
+            await self._save_api_log(
                 api_type="gps",
                 method="GET",
                 url=str(response.url),
@@ -177,23 +498,17 @@ class UvisGPSService:
             if response.status_code == 200:
                 data = response.json()
                 
-                # 🔍 DEBUG: UVIS API 원본 응답 로그
-                print(f"📥 UVIS GPS API 원본 응답 (첫 2개 항목):")
-                items = data if isinstance(data, list) else [data]
-                for idx, item in enumerate(items[:2]):
-                    print(f"   [{idx}] BI_TURN_ONOFF='{item.get('BI_TURN_ONOFF')}', BI_GPS_SPEED={item.get('BI_GPS_SPEED')}, TID_ID={item.get('TID_ID')}, CM_NUMBER={item.get('CM_NUMBER')}")
-                
                 # 데이터 저장
                 saved_count = await self._save_gps_data(data)
-                print(f"✅ GPS 데이터 {saved_count}건 저장 완료")
+                logger.info(f"GPS 데이터 {saved_count}건 저장 완료")
                 
                 return data if isinstance(data, list) else [data]
             
             return []
             
         except Exception as e:
-            print(f"❌ GPS 데이터 조회 실패: {e}")
-            self._save_api_log(
+            logger.error(f"GPS 데이터 조회 실패: {e}")
+            await self._save_api_log(
                 api_type="gps",
                 method="GET",
                 url=url,
@@ -212,7 +527,7 @@ class UvisGPSService:
         # 인증키 가져오기
         access_key = await self.get_valid_access_key()
         if not access_key:
-            print("❌ 유효한 인증키가 없습니다.")
+            logger.error("유효한 인증키가 없습니다.")
             return []
         
         url = f"{UVIS_BASE_URL}/SSOAction.do"
@@ -225,11 +540,11 @@ class UvisGPSService:
         start_time = time.time()
         
         try:
-            response = self.client.get(url, params=params)
+            response = await get_uvis_client().get(url, params=params)
             execution_time = int((time.time() - start_time) * 1000)
             
             # 로그 저장
-            self._save_api_log(
+            await self._save_api_log(
                 api_type="temperature",
                 method="GET",
                 url=str(response.url),
@@ -244,15 +559,15 @@ class UvisGPSService:
                 
                 # 데이터 저장
                 saved_count = await self._save_temperature_data(data)
-                print(f"✅ 온도 데이터 {saved_count}건 저장 완료")
+                logger.info(f"온도 데이터 {saved_count}건 저장 완료")
                 
                 return data if isinstance(data, list) else [data]
             
             return []
             
         except Exception as e:
-            print(f"❌ 온도 데이터 조회 실패: {e}")
-            self._save_api_log(
+            logger.error(f"온도 데이터 조회 실패: {e}")
+            await self._save_api_log(
                 api_type="temperature",
                 method="GET",
                 url=url,
@@ -261,163 +576,120 @@ class UvisGPSService:
             )
             return []
     
-    async def _save_gps_data(self, data: List[Dict[str, Any]]) -> int:
-        """GPS 데이터 DB 저장"""
-        saved_count = 0
-        
-        try:
-            items = data if isinstance(data, list) else [data]
-            
-            for item in items:
-                try:
-                    # 위도/경도 변환
-                    latitude = float(item.get("BI_X_POSITION", 0)) if item.get("BI_X_POSITION") else None
-                    longitude = float(item.get("BI_Y_POSITION", 0)) if item.get("BI_Y_POSITION") else None
-                    
-                    # 시동 상태 변환
-                    # UVIS API: "On" = 시동 ON, "Off" = 시동 OFF (또는 "1"/"0")
-                    turn_onoff = str(item.get("BI_TURN_ONOFF", "Off"))
-                    is_engine_on = turn_onoff.lower() in ["on", "1", "true"]
-                    
-                    # 속도 필터링 (유효성 검증)
-                    # 255는 GPS 오류 값으로 간주하여 0으로 처리
-                    raw_speed = item.get("BI_GPS_SPEED", 0)
-                    try:
-                        speed_kmh = float(raw_speed) if raw_speed is not None else 0
-                        # 비정상적인 속도 값 필터링
-                        if speed_kmh >= 250 or speed_kmh < 0:
-                            print(f"⚠️ 비정상 속도 감지: {speed_kmh} km/h → 0으로 수정")
-                            speed_kmh = 0
-                    except (ValueError, TypeError):
-                        print(f"⚠️ 속도 파싱 실패: {raw_speed} → 0으로 설정")
-                        speed_kmh = 0
-                    
-                    # 디버그 로그
-                    tid_id = item.get("TID_ID")
-                    cm_number = item.get("CM_NUMBER")
-                    raw_turn_onoff = item.get("BI_TURN_ONOFF")
-                    print(f"🚗 차량 {cm_number} (TID: {tid_id})")
-                    print(f"   원본 BI_TURN_ONOFF: {repr(raw_turn_onoff)} (type: {type(raw_turn_onoff).__name__})")
-                    print(f"   변환 후: '{turn_onoff}' → is_engine_on={is_engine_on}")
-                    print(f"   속도: {speed_kmh} km/h (원본: {raw_speed})")
-                    
-                    # 차량 찾기
-                    vehicle = self.db.query(Vehicle).filter(
-                        Vehicle.uvis_device_id == tid_id
-                    ).first()
-                    
-                    gps_log = VehicleGPSLog(
-                        vehicle_id=vehicle.id if vehicle else None,
-                        tid_id=tid_id,
-                        bi_date=item.get("BI_DATE", ""),
-                        bi_time=item.get("BI_TIME", ""),
-                        cm_number=item.get("CM_NUMBER"),
-                        bi_turn_onoff=turn_onoff,
-                        bi_x_position=item.get("BI_X_POSITION", ""),
-                        bi_y_position=item.get("BI_Y_POSITION", ""),
-                        bi_gps_speed=item.get("BI_GPS_SPEED"),
-                        latitude=latitude,
-                        longitude=longitude,
-                        is_engine_on=is_engine_on,
-                        speed_kmh=speed_kmh  # 필터링된 속도 사용
-                    )
-                    
-                    self.db.add(gps_log)
-                    saved_count += 1
-                    
-                except Exception as e:
-                    print(f"⚠️ GPS 데이터 저장 실패 (항목): {e}")
-                    continue
-            
-            self.db.commit()
-            
-        except Exception as e:
-            print(f"❌ GPS 데이터 저장 실패: {e}")
-            self.db.rollback()
+    async def sync_realtime_data(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        운행정보 + 온도정보 동시 조회/저장
         
-        return saved_count
+        Returns:
+            (GPS 데이터 리스트, 온도 데이터 리스트)
+        """
+        # 인증키를 먼저 확보해 두 요청이 같은 키를 사용하도록 함
+        await self.get_valid_access_key()
+        gps_data, temperature_data = await asyncio.gather(
+            self.get_vehicle_gps_data(),
+            self.get_vehicle_temperature_data()
+        )
+        return gps_data, temperature_data
     
+    async def _save_gps_data(self, data: List[Dict[str, Any]]) -> int:
+        """GPS 데이터 DB 저장 (일괄 파싱 + 다중 행 INSERT 1회, 스레드에서 실행)"""
+        items = data if isinstance(data, list) else [data]
+        if not items:
+            return 0
+        return await self._run_db(self._ingest, items, parse_gps_payload, VehicleGPSLog, "GPS", self._record_gps_states)
+
     async def _save_temperature_data(self, data: List[Dict[str, Any]]) -> int:
-        """온도 데이터 DB 저장"""
-        saved_count = 0
-        
+        """온도 데이터 DB 저장 (일괄 파싱 + 다중 행 INSERT 1회, 스레드에서 실행)"""
+        items = data if isinstance(data, list) else [data]
+        if not items:
+            return 0
+        return await self._run_db(
+            self._ingest, items, parse_temperature_payload, VehicleTemperatureLog, "온도", self._record_temperature_states
+        )
+
+    async def _run_db(self, work, *args):
+        """
+        블로킹 DB 작업을 스레드에서 실행 (이벤트 루프 비차단)
+
+        Session 은 스레드 간 공유할 수 없으므로 요청 세션(self.db)과 같은 엔진에
+        묶인 스레드 전용 세션을 만들어 work(db, *args) 로 전달합니다.
+        """
+        def run():
+            db = Session(bind=self.db.get_bind(), autoflush=False)
+            try:
+                return work(db, *args)
+            finally:
+                db.close()
+
+        return await asyncio.to_thread(run)
+
+    def _ingest(self, db: Session, items: List[Dict[str, Any]], parse, model, label: str, on_insert) -> int:
+        """단말기 매핑 → 일괄 파싱 → 다중 행 INSERT"""
         try:
-            items = data if isinstance(data, list) else [data]
-            
-            for item in items:
-                try:
-                    # 위도/경도 변환
-                    latitude = float(item.get("TPL_X_POSITION", 0)) if item.get("TPL_X_POSITION") else None
-                    longitude = float(item.get("TPL_Y_POSITION", 0)) if item.get("TPL_Y_POSITION") else None
-                    
-                    # 온도 변환 (부호 + 값)
-                    temp_a = self._parse_temperature(
-                        item.get("TPL_SIGNAL_A"),
-                        item.get("TPL_DEGREE_A")
-                    )
-                    temp_b = self._parse_temperature(
-                        item.get("TPL_SIGNAL_B"),
-                        item.get("TPL_DEGREE_B")
-                    )
-                    
-                    # 차량 찾기
-                    tid_id = item.get("TID_ID")
-                    vehicle = self.db.query(Vehicle).filter(
-                        Vehicle.uvis_device_id == tid_id
-                    ).first()
-                    
-                    temp_log = VehicleTemperatureLog(
-                        vehicle_id=vehicle.id if vehicle else None,
-                        off_key=item.get("OFF_KEY"),
-                        tid_id=tid_id,
-                        tpl_date=item.get("TPL_DATE", ""),
-                        tpl_time=item.get("TPL_TIME", ""),
-                        cm_number=item.get("CM_NUMBER"),
-                        tpl_x_position=item.get("TPL_X_POSITION", ""),
-                        tpl_y_position=item.get("TPL_Y_POSITION", ""),
-                        tpl_signal_a=item.get("TPL_SIGNAL_A"),
-                        tpl_degree_a=item.get("TPL_DEGREE_A"),
-                        temperature_a=temp_a,
-                        tpl_signal_b=item.get("TPL_SIGNAL_B"),
-                        tpl_degree_b=item.get("TPL_DEGREE_B"),
-                        temperature_b=temp_b,
-                        latitude=latitude,
-                        longitude=longitude
-                    )
-                    
-                    self.db.add(temp_log)
-                    saved_count += 1
-                    
-                except Exception as e:
-                    print(f"⚠️ 온도 데이터 저장 실패 (항목): {e}")
-                    continue
-            
-            self.db.commit()
-            
+            vehicle_ids = DeviceVehicleMap.resolve(db, [item.get("TID_ID") for item in items])
+            rows = parse(items, vehicle_ids)
         except Exception as e:
-            print(f"❌ 온도 데이터 저장 실패: {e}")
-            self.db.rollback()
-        
-        return saved_count
-    
-    def _parse_temperature(self, signal: Any, degree: Any) -> Optional[float]:
-        """온도 파싱 (부호 + 값)"""
+            logger.error(f"{label} 데이터 파싱 실패: {e}")
+            return 0
+
+        return self._bulk_insert(db, model, rows, label, on_insert)
+
+    def _bulk_insert(self, db: Session, model, rows: List[Dict[str, Any]], label: str, on_insert=None) -> int:
+        """
+        다중 행 INSERT
+
+        executemany 로 실행되며 PostgreSQL(psycopg2)에서는 SQLAlchemy insertmanyvalues 가
+        VALUES 다중 행 배치로, SQLite 에서는 executemany 로 처리합니다.
+        on_insert(db, rows) 는 같은 트랜잭션 안에서 호출됩니다 (차량 최신 상태 갱신).
+        """
+        if not rows:
+            return 0
+
         try:
-            if degree is None:
-                return None
-            
-            temp_value = float(degree)
-            
-            # 부호 처리 (0='+', 1='-')
-            if signal == 1 or signal == "1":
-                temp_value = -temp_value
-            
-            return temp_value
-            
-        except:
-            return None
+            db.execute(insert(model), rows)
+            if on_insert:
+                on_insert(db, rows)
+            db.commit()
+        except Exception as e:
+            logger.error(f"{label} 데이터 저장 실패 ({len(rows)}건): {e}")
+            db.rollback()
+            return 0
+
+        return len(rows)
+    
+    def _record_gps_states(self, db: Session, rows: List[Dict[str, Any]]):
+        """차량 최신 위치 갱신 (좌표 없는 항목 제외)"""
+        vehicle_state_store.record_positions(db, [
+            {
+                "vehicle_id": row["vehicle_id"],
+                "latitude": row["latitude"],
+                "longitude": row["longitude"],
+                "speed_kmh": row["speed_kmh"],
+                "is_engine_on": row["is_engine_on"],
+                "recorded_at": device_time_utc(row["bi_date"], row["bi_time"]),
+            }
+            for row in rows
+            if row["vehicle_id"] is not None and row["latitude"] is not None and row["longitude"] is not None
+        ])
+
+    def _record_temperature_states(self, db: Session, rows: List[Dict[str, Any]]):
+        """차량 최신 온도 갱신 및 온도 이상 패턴 감지 (온도 없는 항목 제외)"""
+        received_at = datetime.utcnow()
+        readings = [
+            {
+                "vehicle_id": row["vehicle_id"],
+                "temperature_a": row["temperature_a"],
+                "temperature_b": row["temperature_b"],
+                "recorded_at": device_time_utc(row["tpl_date"], row["tpl_time"]) or received_at,
+            }
+            for row in rows
+            if row["vehicle_id"] is not None
+            and (row["temperature_a"] is not None or row["temperature_b"] is not None)
+        ]
+        vehicle_state_store.record_temperatures(db, readings)
+        temperature_anomaly_monitor.observe_many(db, readings)
     
-    def _save_api_log(
+    async def _save_api_log(
         self,
         api_type: str,
         method: str,
@@ -428,32 +700,33 @@ class UvisGPSService:
         error_message: Optional[str] = None,
         execution_time_ms: Optional[int] = None
     ):
-        """API 호출 로그 저장"""
+        """API 호출 로그 저장 (스레드에서 실행)"""
+        log = UvisApiLog(
+            api_type=api_type,
+            method=method,
+            url=url,
+            request_params=request_params,
+            response_status=response_status,
+            response_data=response_data,
+            error_message=error_message,
+            execution_time_ms=execution_time_ms
+        )
+        await self._run_db(self._add_api_log, log)
+
+    @staticmethod
+    def _add_api_log(db: Session, log: UvisApiLog):
         try:
-            log = UvisApiLog(
-                api_type=api_type,
-                method=method,
-                url=url,
-                request_params=request_params,
-                response_status=response_status,
-                response_data=response_data,
-                error_message=error_message,
-                execution_time_ms=execution_time_ms
-            )
-            self.db.add(log)
-            self.db.commit()
+            db.add(log)
+            db.commit()
         except Exception as e:
-            print(f"⚠️ API 로그 저장 실패: {e}")
-            self.db.rollback()
+            logger.warning(f"API 로그 저장 실패: {e}")
+            db.rollback()
     
-    def get_latest_gps_by_vehicle(self, vehicle_id: int) -> Optional[VehicleGPSLog]:
-        """차량의 최신 GPS 로그 조회"""
-        return self.db.query(VehicleGPSLog).filter(
-            VehicleGPSLog.vehicle_id == vehicle_id
-        ).order_by(desc(VehicleGPSLog.created_at)).first()
+    def get_vehicle_state(self, vehicle_id: int) -> Optional[VehicleLastState]:
+        """차량 최신 상태 (위치 + 온도, 메모리 인덱스 조회)"""
+        return vehicle_state_store.get(self.db, vehicle_id)
     
-    def get_latest_temperature_by_vehicle(self, vehicle_id: int) -> Optional[VehicleTemperatureLog]:
-        """차량의 최신 온도 로그 조회"""
-        return self.db.query(VehicleTemperatureLog).filter(
-            VehicleTemperatureLog.vehicle_id == vehicle_id
-        ).order_by(desc(VehicleTemperatureLog.created_at)).first()
+    async def get_vehicle_location(self, vehicle_id: int) -> Optional[Tuple[float, float]]:
+        """차량 최신 위치 (위도, 경도)"""
+        state = vehicle_state_store.get(self.db, vehicle_id)
+        return state.position if state else None
@@ -10,6 +10,7 @@ from loguru import logger
 from ..core.config import get_settings
 from ..models import VehicleLocation, TemperatureAlert, Vehicle, Dispatch
 from ..schemas.vehicle_location import VehicleLocationCreate, TemperatureAlertCreate
+from .vehicle_state_store import vehicle_state_store
 from sqlalchemy.orm import Session
 
 
@@ -265,6 +266,21 @@ class UVISTrackingService:
             )
             
             db.add(location)
+            vehicle_state_store.record_positions(db, [{
+                "vehicle_id": vehicle_id,
+                "latitude": location.latitude,
+                "longitude": location.longitude,
+                "speed_kmh": location.speed,
+                "heading": location.heading,
+                "is_engine_on": location.is_ignition_on,
+                "recorded_at": uvis_timestamp or location.recorded_at
+            }])
+            if location.temperature_celsius is not None:
+                vehicle_state_store.record_temperatures(db, [{
+                    "vehicle_id": vehicle_id,
+                    "temperature_a": location.temperature_celsius,
+                    "recorded_at": uvis_timestamp or location.recorded_at
+                }])
             db.commit()
             db.refresh(location)
             
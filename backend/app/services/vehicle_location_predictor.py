@@ -16,6 +16,7 @@ import math
 from app.models.vehicle import Vehicle
 from app.models.vehicle_location import VehicleLocation
 from app.models.dispatch import Dispatch, DispatchRoute, DispatchStatus
+from app.services.vehicle_state_store import VehicleLastState, vehicle_state_store
 
 
 class VehicleLocationPredictor:
@@ -58,12 +59,10 @@ class VehicleLocationPredictor:
         if not vehicle:
             return {"success": False, "error": "Vehicle not found"}
         
-        # 1. 최신 GPS 위치
-        latest_location = self.db.query(VehicleLocation).filter(
-            VehicleLocation.vehicle_id == vehicle_id
-        ).order_by(VehicleLocation.recorded_at.desc()).first()
+        # 1. 최신 GPS 위치 (최신 상태 저장소)
+        latest_location = vehicle_state_store.get(self.db, vehicle_id)
         
-        if not latest_location:
+        if not latest_location or not latest_location.position:
             return {
                 "success": False,
                 "error": "No GPS data available",
@@ -120,7 +119,7 @@ class VehicleLocationPredictor:
     
     async def _predict_by_dispatch_route(
         self,
-        current_location: VehicleLocation,
+        current_location: VehicleLastState,
         dispatch: Dispatch,
         prediction_minutes: int
     ) -> Dict[str, Any]:
@@ -214,7 +213,7 @@ class VehicleLocationPredictor:
     async def _predict_by_history(
         self,
         vehicle_id: int,
-        current_location: VehicleLocation,
+        current_location: VehicleLastState,
         prediction_minutes: int
     ) -> Dict[str, Any]:
         """
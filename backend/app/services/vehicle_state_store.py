@@ -0,0 +1,323 @@
+"""
+차량 최신 상태 저장소
+- 수집(UVIS 폴링, 텔레메트리, 모바일 위치) 시 vehicle_latest_states 에 차량당 1행 upsert
+- 조회는 프로세스 메모리 인덱스에서 O(1) (로그 테이블 ORDER BY created_at DESC LIMIT 1 스캔 제거)
+  동기 세션(get/get_many/get_fleet)과 비동기 세션(*_async) 모두 지원
+- 다른 워커가 갱신한 상태는 updated_at 기준 증분 동기화로 반영
+"""
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.vehicle_location import VehicleLatestState
+
+
+POSITION_FIELDS = ("latitude", "longitude", "speed_kmh", "heading", "is_engine_on")
+TEMPERATURE_FIELDS = ("temperature_a", "temperature_b")
+
+_PENDING_KEY = "vehicle_state_pending"
+
+
+@dataclass(frozen=True)
+class VehicleLastState:
+    """차량 마지막 상태 (시각은 UTC naive)"""
+    vehicle_id: int
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    speed_kmh: Optional[float] = None
+    heading: Optional[float] = None
+    is_engine_on: Optional[bool] = None
+    gps_recorded_at: Optional[datetime] = None
+    temperature_a: Optional[float] = None
+    temperature_b: Optional[float] = None
+    temperature_recorded_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @property
+    def position(self) -> Optional[Tuple[float, float]]:
+        """(위도, 경도) 또는 None"""
+        if self.latitude is None or self.longitude is None:
+            return None
+        return (self.latitude, self.longitude)
+
+    @property
+    def recorded_at(self) -> Optional[datetime]:
+        """위치 측정 시각"""
+        return self.gps_recorded_at
+
+    @property
+    def speed(self) -> Optional[float]:
+        return self.speed_kmh
+
+    @property
+    def last_updated(self) -> Optional[datetime]:
+        """위치/온도 중 더 최근 측정 시각"""
+        times = [t for t in (self.gps_recorded_at, self.temperature_recorded_at) if t]
+        return max(times) if times else None
+
+    def position_age_seconds(self, now: Optional[datetime] = None) -> Optional[float]:
+        """위치 측정 후 경과 시간 (초)"""
+        if not self.gps_recorded_at:
+            return None
+        return ((now or datetime.utcnow()) - self.gps_recorded_at).total_seconds()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "vehicle_id": self.vehicle_id,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "speed_kmh": self.speed_kmh,
+            "heading": self.heading,
+            "is_engine_on": self.is_engine_on,
+            "gps_recorded_at": self.gps_recorded_at.isoformat() if self.gps_recorded_at else None,
+            "temperature_a": self.temperature_a,
+            "temperature_b": self.temperature_b,
+            "temperature_recorded_at": (
+                self.temperature_recorded_at.isoformat() if self.temperature_recorded_at else None
+            ),
+        }
+
+
+def to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """aware 시각은 UTC naive 로 변환 (naive 는 UTC 로 간주)"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class VehicleStateStore:
+    """
+    차량 최신 상태 저장소
+
+    쓰기: record_positions / record_temperatures 는 호출한 세션의 트랜잭션에 upsert 를 추가하고,
+    커밋되면 메모리 인덱스에 반영합니다 (롤백 시 폐기).
+    읽기: get / get_many / get_fleet 는 메모리 인덱스를 사용하며, SYNC_SECONDS 마다
+    다른 워커의 갱신분(updated_at 증분)만 DB에서 가져옵니다.
+    """
+
+    SYNC_SECONDS = 2.0
+    # 늦게 커밋된 트랜잭션을 놓치지 않도록 증분 조회 구간을 겹침
+    SYNC_OVERLAP = timedelta(seconds=10)
+
+    def __init__(self):
+        self._states: Dict[int, VehicleLastState] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._watermark: Optional[datetime] = None
+        self._synced_at = 0.0
+
+    # ==================== 쓰기 ====================
+
+    def record_positions(self, db: Session, updates: Iterable[Dict[str, Any]]) -> int:
+        """
+        위치 갱신 upsert (커밋은 호출자)
+
+        Args:
+            updates: vehicle_id, recorded_at 및 POSITION_FIELDS 일부를 가진 dict
+        """
+        return self._record(db, updates, POSITION_FIELDS, "gps_recorded_at")
+
+    def record_temperatures(self, db: Session, updates: Iterable[Dict[str, Any]]) -> int:
+        """
+        온도 갱신 upsert (커밋은 호출자)
+
+        Args:
+            updates: vehicle_id, recorded_at 및 TEMPERATURE_FIELDS 일부를 가진 dict
+        """
+        return self._record(db, updates, TEMPERATURE_FIELDS, "temperature_recorded_at")
+
+    def _record(
+        self,
+        db: Session,
+        updates: Iterable[Dict[str, Any]],
+        fields: Tuple[str, ...],
+        time_field: str
+    ) -> int:
+        now = datetime.utcnow()
+
+        # 차량별 가장 최근 측정값만 사용 (같은 차량을 한 문장에서 두 번 갱신할 수 없음)
+        latest: Dict[int, Dict[str, Any]] = {}
+        for update in updates:
+            vehicle_id = update.get("vehicle_id")
+            if vehicle_id is None:
+                continue
+            row = {field: update.get(field) for field in fields}
+            row["vehicle_id"] = int(vehicle_id)
+            row[time_field] = to_utc_naive(update.get("recorded_at")) or now
+            row["updated_at"] = now
+
+            previous = latest.get(row["vehicle_id"])
+            if previous is None or previous[time_field] <= row[time_field]:
+                latest[row["vehicle_id"]] = row
+
+        if not latest:
+            return 0
+
+        rows = list(latest.values())
+        self._upsert(db, rows, fields, time_field)
+        db.info.setdefault(_PENDING_KEY, []).append((self, rows, fields, time_field))
+        return len(rows)
+
+    @staticmethod
+    def _upsert(db: Session, rows: List[Dict[str, Any]], fields: Tuple[str, ...], time_field: str):
+        """측정 시각이 더 최신인 경우에만 덮어쓰는 upsert"""
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for row in rows:
+                db.merge(VehicleLatestState(**row))
+            return
+
+        table = VehicleLatestState.__table__
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.vehicle_id],
+            set_={
+                column: stmt.excluded[column]
+                for column in (*fields, time_field, "updated_at")
+            },
+            where=(table.c[time_field].is_(None)) | (table.c[time_field] <= stmt.excluded[time_field])
+        )
+        db.execute(stmt, rows)
+
+    def _apply(self, rows: List[Dict[str, Any]], fields: Tuple[str, ...], time_field: str):
+        """커밋된 갱신을 메모리 인덱스에 반영"""
+        with self._lock:
+            for row in rows:
+                vehicle_id = row["vehicle_id"]
+                current = self._states.get(vehicle_id)
+                if current is None:
+                    current = VehicleLastState(vehicle_id=vehicle_id)
+                elif getattr(current, time_field) and getattr(current, time_field) > row[time_field]:
+                    continue
+                self._states[vehicle_id] = replace(
+                    current,
+                    **{column: row[column] for column in (*fields, time_field, "updated_at")}
+                )
+
+    # ==================== 읽기 ====================
+
+    def get(self, db: Session, vehicle_id: int) -> Optional[VehicleLastState]:
+        """차량 최신 상태"""
+        self._sync(db)
+        return self._states.get(vehicle_id)
+
+    def get_many(self, db: Session, vehicle_ids: Iterable[int]) -> Dict[int, VehicleLastState]:
+        """여러 차량의 최신 상태 (상태가 없는 차량은 제외)"""
+        self._sync(db)
+        states = self._states
+        return {vehicle_id: states[vehicle_id] for vehicle_id in vehicle_ids if vehicle_id in states}
+
+    def get_fleet(self, db: Session) -> Dict[int, VehicleLastState]:
+        """전체 차량 최신 상태"""
+        self._sync(db)
+        with self._lock:
+            return dict(self._states)
+
+    def invalidate(self):
+        """메모리 인덱스 초기화 (다음 조회 시 전체 로드)"""
+        with self._lock:
+            self._states = {}
+            self._loaded = False
+            self._watermark = None
+            self._synced_at = 0.0
+
+    async def get_async(self, db: AsyncSession, vehicle_id: int) -> Optional[VehicleLastState]:
+        """차량 최신 상태 (비동기 세션)"""
+        await self._sync_async(db)
+        return self._states.get(vehicle_id)
+
+    async def get_many_async(self, db: AsyncSession, vehicle_ids: Iterable[int]) -> Dict[int, VehicleLastState]:
+        """여러 차량의 최신 상태 (비동기 세션)"""
+        await self._sync_async(db)
+        states = self._states
+        return {vehicle_id: states[vehicle_id] for vehicle_id in vehicle_ids if vehicle_id in states}
+
+    async def get_fleet_async(self, db: AsyncSession) -> Dict[int, VehicleLastState]:
+        """전체 차량 최신 상태 (비동기 세션)"""
+        await self._sync_async(db)
+        with self._lock:
+            return dict(self._states)
+
+    def _sync_due(self) -> bool:
+        return time.monotonic() - self._synced_at >= self.SYNC_SECONDS
+
+    def _sync_statement(self):
+        stmt = select(VehicleLatestState)
+        if self._loaded and self._watermark is not None:
+            stmt = stmt.where(VehicleLatestState.updated_at > self._watermark - self.SYNC_OVERLAP)
+        return stmt
+
+    def _sync(self, db: Session):
+        """처음에는 전체 로드, 이후 SYNC_SECONDS 간격으로 증분 동기화"""
+        if not self._sync_due():
+            return
+        try:
+            rows = db.execute(self._sync_statement()).scalars().all()
+        except Exception as e:
+            # 테이블 미생성 등 - 메모리 인덱스만 사용
+            logger.warning(f"차량 최신 상태 동기화 실패: {e}")
+            self._synced_at = time.monotonic()
+            return
+        self._merge_rows(rows)
+
+    async def _sync_async(self, db: AsyncSession):
+        """_sync 의 비동기 세션 버전"""
+        if not self._sync_due():
+            return
+        try:
+            rows = (await db.execute(self._sync_statement())).scalars().all()
+        except Exception as e:
+            logger.warning(f"차량 최신 상태 동기화 실패: {e}")
+            self._synced_at = time.monotonic()
+            return
+        self._merge_rows(rows)
+
+    def _merge_rows(self, rows: List[VehicleLatestState]):
+        with self._lock:
+            for row in rows:
+                self._states[row.vehicle_id] = VehicleLastState(
+                    vehicle_id=row.vehicle_id,
+                    latitude=row.latitude,
+                    longitude=row.longitude,
+                    speed_kmh=row.speed_kmh,
+                    heading=row.heading,
+                    is_engine_on=row.is_engine_on,
+                    gps_recorded_at=row.gps_recorded_at,
+                    temperature_a=row.temperature_a,
+                    temperature_b=row.temperature_b,
+                    temperature_recorded_at=row.temperature_recorded_at,
+                    updated_at=row.updated_at
+                )
+                if self._watermark is None or row.updated_at > self._watermark:
+                    self._watermark = row.updated_at
+            if not self._loaded:
+                logger.debug(f"차량 최신 상태 로드: {len(rows)}대")
+            self._loaded = True
+            self._synced_at = time.monotonic()
+
+
+# Global instance
+vehicle_state_store = VehicleStateStore()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_states(session: Session):
+    for store, rows, fields, time_field in session.info.pop(_PENDING_KEY, []):
+        store._apply(rows, fields, time_field)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_states(session: Session):
+    session.info.pop(_PENDING_KEY, None)
@@ -9,13 +9,15 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from loguru import logger
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy import case, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.vehicle import Vehicle
-from app.models.dispatch import Dispatch
+from app.models.dispatch import Dispatch, DispatchStatus
 from app.models.vehicle_location import VehicleLocation
 from app.models.vehicle_location import TemperatureAlert
 from app.services.notification_service import NotificationService
+from app.services.vehicle_state_store import vehicle_state_store
 
 
 class TelemetryData:
@@ -126,9 +128,20 @@ class VehicleTelemetryService:
                 latitude=data.latitude,
                 longitude=data.longitude,
                 speed=data.speed,
-                timestamp=data.timestamp
+                temperature_celsius=data.temperature,
+                fuel_level_percent=data.fuel_level,
+                is_ignition_on=data.engine_status == "ON",
+                recorded_at=data.timestamp
             )
             self.db.add(location)
+            vehicle_state_store.record_positions(self.db, [{
+                "vehicle_id": data.vehicle_id,
+                "latitude": data.latitude,
+                "longitude": data.longitude,
+                "speed_kmh": data.speed,
+                "is_engine_on": data.engine_status == "ON",
+                "recorded_at": data.timestamp
+            }])
             self.db.commit()
         except Exception as e:
             logger.error(f"Failed to save location for vehicle {data.vehicle_id}: {e}")
@@ -268,52 +281,65 @@ class VehicleTelemetryService:
                 logger.info(f"✅ Anomaly alert sent: {vehicle.plate_number} - {anomaly['type']}")
             except Exception as e:
                 logger.error(f"Failed to send anomaly alert: {e}")
-    
-    def get_vehicle_telemetry(self, vehicle_id: int, minutes: int = 60) -> Dict:
+
+
+class VehicleTelemetryQueryService:
+    """
+    텔레메트리 조회 서비스 (비동기 세션)
+
+    조회 API 와 WebSocket 에서 사용하며, 느린 쿼리가 이벤트 루프를 막지 않습니다.
+    """
+
+    # 최근 위치 기준 (이보다 오래되면 offline)
+    ONLINE_SECONDS = 300
+    MOVING_SPEED_KMH = 5
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_vehicle_telemetry(self, vehicle_id: int, minutes: int = 60) -> Dict:
         """
         차량 텔레메트리 히스토리 조회
-        
+
         Args:
             vehicle_id: 차량 ID
             minutes: 조회 기간 (분)
         """
         since = datetime.now() - timedelta(minutes=minutes)
-        
+
         # 위치 데이터
-        locations = self.db.query(VehicleLocation).filter(
-            and_(
-                VehicleLocation.vehicle_id == vehicle_id,
-                VehicleLocation.timestamp >= since
-            )
-        ).order_by(VehicleLocation.timestamp).all()
-        
+        locations = (await self.db.execute(
+            select(VehicleLocation)
+            .where(VehicleLocation.vehicle_id == vehicle_id, VehicleLocation.recorded_at >= since)
+            .order_by(VehicleLocation.recorded_at)
+        )).scalars().all()
+
         # 온도 알림
-        temp_alerts = self.db.query(TemperatureAlert).filter(
-            and_(
-                TemperatureAlert.vehicle_id == vehicle_id,
-                TemperatureAlert.created_at >= since
-            )
-        ).order_by(desc(TemperatureAlert.created_at)).all()
-        
+        temp_alerts = (await self.db.execute(
+            select(TemperatureAlert)
+            .where(TemperatureAlert.vehicle_id == vehicle_id, TemperatureAlert.detected_at >= since)
+            .order_by(desc(TemperatureAlert.detected_at))
+        )).scalars().all()
+
         # 최신 데이터
         latest_location = locations[-1] if locations else None
-        
+
         return {
             "vehicle_id": vehicle_id,
             "period_minutes": minutes,
             "data_points": len(locations),
             "latest": {
-                "latitude": latest_location.latitude if latest_location else None,
-                "longitude": latest_location.longitude if latest_location else None,
-                "speed": latest_location.speed if latest_location else None,
-                "timestamp": latest_location.timestamp.isoformat() if latest_location else None
+                "latitude": latest_location.latitude,
+                "longitude": latest_location.longitude,
+                "speed": latest_location.speed,
+                "timestamp": latest_location.recorded_at.isoformat()
             } if latest_location else None,
             "locations": [
                 {
                     "latitude": loc.latitude,
                     "longitude": loc.longitude,
                     "speed": loc.speed,
-                    "timestamp": loc.timestamp.isoformat()
+                    "timestamp": loc.recorded_at.isoformat()
                 }
                 for loc in locations
             ],
@@ -321,47 +347,53 @@ class VehicleTelemetryService:
                 {
                     "id": alert.id,
                     "alert_type": alert.alert_type,
-                    "temperature": alert.temperature,
+                    "temperature": alert.temperature_celsius,
                     "threshold_min": alert.threshold_min,
                     "threshold_max": alert.threshold_max,
                     "message": alert.message,
-                    "created_at": alert.created_at.isoformat()
+                    "created_at": alert.detected_at.isoformat()
                 }
                 for alert in temp_alerts
             ]
         }
-    
-    def get_all_vehicles_status(self) -> List[Dict]:
-        """전체 차량 실시간 상태 조회"""
-        vehicles = self.db.query(Vehicle).filter(Vehicle.is_active == True).all()
-        
+
+    async def get_all_vehicles_status(self) -> List[Dict]:
+        """전체 차량 실시간 상태 조회 (차량/배차 각 1쿼리 + 최신 상태 저장소)"""
+        vehicles = (await self.db.execute(
+            select(Vehicle).where(Vehicle.is_active == True)
+        )).scalars().all()
+        vehicle_ids = [vehicle.id for vehicle in vehicles]
+        if not vehicle_ids:
+            return []
+
+        states = await vehicle_state_store.get_many_async(self.db, vehicle_ids)
+
+        # 활성 배차 (차량당 1건)
+        active_dispatches: Dict[int, Any] = {}
+        rows = (await self.db.execute(
+            select(Dispatch.id, Dispatch.vehicle_id, Dispatch.dispatch_number, Dispatch.status)
+            .where(
+                Dispatch.vehicle_id.in_(vehicle_ids),
+                Dispatch.status.in_([DispatchStatus.CONFIRMED, DispatchStatus.IN_PROGRESS])
+            )
+            .order_by(Dispatch.id)
+        )).all()
+        for row in rows:
+            active_dispatches.setdefault(row.vehicle_id, row)
+
         result = []
         for vehicle in vehicles:
-            # 최근 위치 (5분 이내)
-            recent_location = self.db.query(VehicleLocation).filter(
-                and_(
-                    VehicleLocation.vehicle_id == vehicle.id,
-                    VehicleLocation.timestamp >= datetime.now() - timedelta(minutes=5)
-                )
-            ).order_by(desc(VehicleLocation.timestamp)).first()
-            
-            # 활성 배차
-            active_dispatch = self.db.query(Dispatch).filter(
-                and_(
-                    Dispatch.vehicle_id == vehicle.id,
-                    Dispatch.status.in_(['ASSIGNED', 'IN_PROGRESS'])
-                )
-            ).first()
-            
+            state = states.get(vehicle.id)
+            age = state.position_age_seconds() if state and state.position else None
+            recent = age is not None and age <= self.ONLINE_SECONDS
+
             # 상태 판단
-            if recent_location:
-                if recent_location.speed > 5:
-                    status = "moving"
-                else:
-                    status = "idle"
+            if recent:
+                status = "moving" if (state.speed_kmh or 0) > self.MOVING_SPEED_KMH else "idle"
             else:
                 status = "offline"
-            
+
+            active_dispatch = active_dispatches.get(vehicle.id)
             result.append({
                 "vehicle_id": vehicle.id,
                 "plate_number": vehicle.plate_number,
@@ -369,22 +401,53 @@ class VehicleTelemetryService:
                 "vehicle_type": vehicle.vehicle_type,
                 "status": status,
                 "location": {
-                    "latitude": recent_location.latitude if recent_location else None,
-                    "longitude": recent_location.longitude if recent_location else None,
-                    "speed": recent_location.speed if recent_location else None,
-                    "timestamp": recent_location.timestamp.isoformat() if recent_location else None
-                } if recent_location else None,
+                    "latitude": state.latitude,
+                    "longitude": state.longitude,
+                    "speed": state.speed_kmh,
+                    "timestamp": state.gps_recorded_at.isoformat()
+                } if recent else None,
                 "active_dispatch": {
                     "dispatch_id": active_dispatch.id,
-                    "order_number": active_dispatch.order.order_number if active_dispatch.order else None,
+                    "dispatch_number": active_dispatch.dispatch_number,
                     "status": active_dispatch.status
                 } if active_dispatch else None
             })
-        
+
         return result
 
+    async def get_statistics(self, hours: int = 24) -> Dict[str, Any]:
+        """최근 N시간 텔레메트리 통계 (위치 통계 1쿼리 + 알림 1쿼리)"""
+        since = datetime.now() - timedelta(hours=hours)
+
+        location_stats = (await self.db.execute(
+            select(
+                func.count(VehicleLocation.id).label("total"),
+                func.avg(VehicleLocation.speed).label("avg_speed"),
+                func.sum(case((VehicleLocation.speed > 100, 1), else_=0)).label("speeding")
+            ).where(VehicleLocation.recorded_at >= since)
+        )).one()
+
+        temp_alerts = (await self.db.execute(
+            select(func.count(TemperatureAlert.id)).where(TemperatureAlert.detected_at >= since)
+        )).scalar()
+
+        total_points = location_stats.total or 0
+        return {
+            "period_hours": hours,
+            "total_data_points": total_points,
+            "average_speed": round(location_stats.avg_speed, 2) if location_stats.avg_speed else 0,
+            "temperature_alerts": temp_alerts or 0,
+            "speeding_incidents": location_stats.speeding or 0,
+            "data_quality": "good" if total_points > hours * 10 else "poor"
+        }
+
 
 # 싱글톤 인스턴스 (DB 세션이 필요하므로 함수로 제공)
 def get_telemetry_service(db: Session) -> VehicleTelemetryService:
     """텔레메트리 서비스 인스턴스 생성"""
     return VehicleTelemetryService(db)
+
+
+def get_telemetry_query_service(db: AsyncSession) -> VehicleTelemetryQueryService:
+    """텔레메트리 조회 서비스 인스턴스 생성 (비동기 세션)"""
+    return VehicleTelemetryQueryService(db)
@@ -6,11 +6,11 @@ import asyncio
 import logging
 from typing import Dict, List, Optional
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 
-from app.services.uvis_gps_service import UvisGPSService
+from app.core.async_database import get_async_sessionmaker
+from app.services.vehicle_state_store import vehicle_state_store
 from app.websocket.connection_manager import manager
-from app.core.database import SessionLocal
 
 logger = logging.getLogger(__name__)
 
@@ -65,83 +65,62 @@ class VehicleTrackingService:
                 await asyncio.sleep(self.update_interval)
     
     async def _update_vehicle_positions(self):
-        """모든 차량 위치 업데이트 및 브로드캐스트"""
-        db = SessionLocal()
-        try:
-            from app.models.vehicle import Vehicle
-            from app.models.driver import Driver
-            
+        """모든 차량 위치 업데이트 및 브로드캐스트 (비동기 세션, 위치는 최신 상태 저장소)"""
+        from app.models.vehicle import Vehicle
+        
+        async with get_async_sessionmaker()() as db:
             # 활성 차량 조회
-            vehicles = db.query(Vehicle).filter(
-                Vehicle.is_active == True
-            ).all()
+            result = await db.execute(select(Vehicle).where(Vehicle.is_active == True))
+            vehicles = result.scalars().all()
             
             if not vehicles:
                 return
             
-            gps_service = UvisGPSService(db)
-            updates = []
+            states = await vehicle_state_store.get_many_async(db, [vehicle.id for vehicle in vehicles])
+        
+        updates = []
+        for vehicle in vehicles:
+            state = states.get(vehicle.id)
+            location = state.position if state else None
+            if not location:
+                continue
             
-            for vehicle in vehicles:
-                try:
-                    # GPS 위치 조회
-                    location = await gps_service.get_vehicle_location(vehicle.id)
-                    
-                    if not location:
-                        # 마지막 알려진 위치 사용
-                        if vehicle.last_known_latitude and vehicle.last_known_longitude:
-                            location = (vehicle.last_known_latitude, vehicle.last_known_longitude)
-                        else:
-                            continue
-                    
-                    # 위치 변경 감지
-                    last_pos = self.last_positions.get(vehicle.id)
-                    position_changed = (
-                        not last_pos or
-                        abs(last_pos[0] - location[0]) > 0.0001 or  # ~11m
-                        abs(last_pos[1] - location[1]) > 0.0001
-                    )
-                    
-                    if position_changed:
-                        # 위치 저장
-                        self.last_positions[vehicle.id] = location
-                        
-                        # 기사 정보
-                        driver = db.query(Driver).filter(Driver.id == vehicle.driver_id).first()
-                        
-                        # 업데이트 데이터
-                        update_data = {
-                            "type": "vehicle_location_update",
-                            "vehicle_id": vehicle.id,
-                            "license_plate": vehicle.license_plate,
-                            "driver_name": driver.name if driver else None,
-                            "driver_phone": driver.phone if driver else None,
-                            "latitude": location[0],
-                            "longitude": location[1],
-                            "status": vehicle.status,
-                            "vehicle_type": vehicle.vehicle_type,
-                            "temperature_type": vehicle.temperature_type,
-                            "timestamp": datetime.utcnow().isoformat()
-                        }
-                        
-                        updates.append(update_data)
-                
-                except Exception as e:
-                    logger.error(f"Error updating vehicle {vehicle.id}: {e}")
-                    continue
+            # 위치 변경 감지
+            last_pos = self.last_positions.get(vehicle.id)
+            position_changed = (
+                not last_pos or
+                abs(last_pos[0] - location[0]) > 0.0001 or  # ~11m
+                abs(last_pos[1] - location[1]) > 0.0001
+            )
             
-            # WebSocket 브로드캐스트
-            if updates:
-                await manager.broadcast({
-                    "type": "vehicle_positions",
-                    "vehicles": updates,
+            if position_changed:
+                # 위치 저장
+                self.last_positions[vehicle.id] = location
+                
+                # 업데이트 데이터
+                updates.append({
+                    "type": "vehicle_location_update",
+                    "vehicle_id": vehicle.id,
+                    "license_plate": vehicle.plate_number,
+                    "driver_name": vehicle.driver_name,
+                    "driver_phone": vehicle.driver_phone,
+                    "latitude": location[0],
+                    "longitude": location[1],
+                    "speed": state.speed_kmh,
+                    "status": vehicle.status,
+                    "vehicle_type": vehicle.vehicle_type,
                     "timestamp": datetime.utcnow().isoformat()
                 })
-                
-                logger.info(f"📡 Broadcasted {len(updates)} vehicle position updates")
         
-        finally:
-            db.close()
+        # WebSocket 브로드캐스트
+        if updates:
+            await manager.broadcast_to_all({
+                "type": "vehicle_positions",
+                "vehicles": updates,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+            
+            logger.info(f"📡 Broadcasted {len(updates)} vehicle position updates")
     
     async def broadcast_dispatch_update(self, dispatch_data: Dict):
         """
@@ -150,7 +129,7 @@ class VehicleTrackingService:
         Args:
             dispatch_data: 배차 정보
         """
-        await manager.broadcast({
+        await manager.broadcast_to_all({
             "type": "dispatch_update",
             "data": dispatch_data,
             "timestamp": datetime.utcnow().isoformat()
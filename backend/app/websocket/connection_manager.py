@@ -13,7 +13,7 @@ import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Set, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Set, Optional, Any
 from fastapi import WebSocket, WebSocketDisconnect
 from collections import defaultdict
 import redis.asyncio as aioredis
@@ -47,6 +47,10 @@ class ConnectionManager:
         self.redis_client: Optional[aioredis.Redis] = None
         self.pubsub_task: Optional[asyncio.Task] = None
         
+        # In-process listeners for Pub/Sub messages
+        # Format: {channel: [async callback(message)]}
+        self.channel_listeners: Dict[str, List[Callable[[dict], Awaitable[None]]]] = defaultdict(list)
+        
         # Heartbeat interval (seconds)
         self.heartbeat_interval = 30
         self.heartbeat_task: Optional[asyncio.Task] = None
@@ -283,6 +287,23 @@ class ConnectionManager:
         except Exception as e:
             logger.error(f"❌ Failed to publish to Redis: {e}")
     
+    def add_channel_listener(self, channel: str, callback: Callable[[dict], Awaitable[None]]):
+        """
+        Register in-process listener for Pub/Sub messages on a channel
+        
+        Called before the message is broadcast to the channel's WebSocket connections.
+        """
+        if callback not in self.channel_listeners[channel]:
+            self.channel_listeners[channel].append(callback)
+    
+    def remove_channel_listener(self, channel: str, callback: Callable[[dict], Awaitable[None]]):
+        """Remove in-process listener"""
+        listeners = self.channel_listeners.get(channel)
+        if listeners and callback in listeners:
+            listeners.remove(callback)
+            if not listeners:
+                del self.channel_listeners[channel]
+    
     async def _redis_pubsub_listener(self):
         """Background task to listen for Redis Pub/Sub messages"""
         if not self.redis_client:
@@ -299,8 +320,15 @@ class ConnectionManager:
             async for message in pubsub.listen():
                 if message["type"] == "pmessage":
                     try:
-                        channel = message["channel"].decode().replace("ws:", "")
-                        data = json.loads(message["data"].decode())
+                        # str when decode_responses=True
+                        channel = message["channel"]
+                        if isinstance(channel, bytes):
+                            channel = channel.decode()
+                        channel = channel.replace("ws:", "", 1)
+                        data = json.loads(message["data"])
+                        
+                        for listener in list(self.channel_listeners.get(channel, ())):
+                            await listener(data)
                         
                         # Broadcast to WebSocket channel
                         await self.broadcast_to_channel(channel, data)
@@ -53,7 +53,9 @@ async def lifespan(app: FastAPI):
     logger.info("Initializing WebSocket manager...")
     from app.websocket.connection_manager import manager
     from app.services.realtime_metrics_service import metrics_service
+    from app.services.dashboard_stats_service import dashboard_stats_producer
     await manager.initialize()
+    await dashboard_stats_producer.start()
     await metrics_service.start()
     
     # Start scheduler service
@@ -70,7 +72,20 @@ async def lifespan(app: FastAPI):
     from app.services.scheduler_service import scheduler_service
     await scheduler_service.stop()
     await metrics_service.stop()
+    await dashboard_stats_producer.stop()
+    
+    from app.services.optimization_job_service import optimization_job_service
+    await optimization_job_service.stop()
     await manager.shutdown()
+    
+    from app.services.solver_pool import shutdown_solver_pool
+    shutdown_solver_pool()
+    
+    from app.services.uvis_gps_service import close_uvis_client
+    await close_uvis_client()
+    
+    from app.core.async_database import dispose_async_engine
+    await dispose_async_engine()
 
 
 # Create FastAPI application
@@ -96,21 +111,19 @@ app.add_middleware(
 setup_security_middleware(app)
 
 # Configure Performance Monitoring Middleware
-# DISABLED: Also causes "Unexpected message received: http.request" error
-# TODO: Fix PerformanceMonitoringMiddleware to properly handle ASGI messages
-# app.add_middleware(
-#     PerformanceMonitoringMiddleware,
-#     slow_request_threshold=1.0,  # 1 second
-#     enable_memory_tracking=True
-# )
+# 순수 ASGI 구현 (WebSocket / 스트리밍 응답 통과), 라우트별 지연 히스토그램 기록
+app.add_middleware(
+    PerformanceMonitoringMiddleware,
+    slow_request_threshold=1.0,  # 1 second
+    enable_memory_tracking=False  # 요청마다 RSS 조회 비용
+)
 
 # Configure Compression Middleware
-# DISABLED: Causes "Unexpected message received: http.request" error
-# TODO: Fix CompressionMiddleware to properly handle ASGI messages
-# app.add_middleware(
-#     CompressionMiddleware,
-#     minimum_size=500  # 500 bytes
-# )
+# 순수 ASGI 구현, gzip / brotli (JSON·텍스트 응답만, 500 bytes 이상)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=500  # 500 bytes
+)
 
 
 # Health check endpoint
@@ -155,7 +168,7 @@ async def internal_error_handler(request, exc):
 
 # Import and include routers
 # from app.api import auth, clients, vehicles, orders, dispatches, tracking, uvis, redispatch, notices, purchase_orders, band_messages, uvis_gps, analytics, delivery_tracking, traffic, monitoring, cache
-from app.api import auth, clients, vehicles, orders, dispatches, tracking, uvis, redispatch, notices, purchase_orders, band_messages, uvis_gps, delivery_tracking, traffic, monitoring, cache, emergency, ml_training, ai_chat, ai_usage, ml_dispatch, ab_test, recurring_orders, order_templates, driver_schedules, urgent_dispatches, notifications, temperature_monitoring, temperature_analytics, billing, vehicle_maintenance, ml_predictions, telemetry, dispatch_optimization, analytics, mobile, dispatch_monitoring, ml_autolearning
+from app.api import auth, clients, vehicles, orders, dispatches, tracking, uvis, redispatch, notices, purchase_orders, band_messages, uvis_gps, delivery_tracking, traffic, monitoring, cache, emergency, ml_training, ai_chat, ai_usage, ml_dispatch, ab_test, recurring_orders, order_templates, driver_schedules, urgent_dispatches, notifications, temperature_monitoring, temperature_analytics, billing, vehicle_maintenance, ml_predictions, telemetry, dispatch_optimization, optimization_jobs, analytics, mobile, dispatch_monitoring, ml_autolearning
 from app.api.v1 import reports, realtime_monitoring, ml_models, fcm_notifications, performance, security, websocket, mobile_enhanced, billing_enhanced
 from app.api.v1.endpoints import dispatch_rules
 app.include_router(auth.router, prefix=f"{settings.API_PREFIX}/auth", tags=["Authentication"])
@@ -202,6 +215,7 @@ app.include_router(vehicle_maintenance.router, prefix=f"{settings.API_PREFIX}",
 app.include_router(ml_predictions.router, prefix=f"{settings.API_PREFIX}", tags=["ML Predictions"])  # Phase 4 Week 1-2
 app.include_router(telemetry.router, prefix=f"{settings.API_PREFIX}", tags=["Real-time Telemetry"])  # Phase 4 Week 3-4
 app.include_router(dispatch_optimization.router, prefix=f"{settings.API_PREFIX}", tags=["Dispatch Optimization"])  # Phase 4 Week 5-6
+app.include_router(optimization_jobs.router, prefix=f"{settings.API_PREFIX}", tags=["Optimization Jobs"])
 app.include_router(analytics.router, prefix=f"{settings.API_PREFIX}", tags=["Analytics & BI"])  # Phase 4 Week 7-8
 app.include_router(mobile.router, prefix=f"{settings.API_PREFIX}/mobile", tags=["Mobile App"])  # Phase 4 Week 9-10
 app.include_router(mobile_enhanced.router, prefix=f"{settings.API_PREFIX}", tags=["Mobile App Enhanced"])  # Phase 7: Mobile API Enhancements
@@ -17,6 +17,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from app.core.database import Base, get_db
 from app.core.config import settings
+import app.models  # noqa: F401  (관계 매퍼 등록)
+import app.models.simulation  # noqa: F401  (DispatchRule 관계 매퍼 등록)
 from main import app
 
 
@@ -51,6 +53,36 @@ def db() -> Generator[Session, None, None]:
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="function")
+def table_sessionmaker():
+    """
+    지정한 모델의 테이블만 만든 SQLite 세션 팩토리
+
+    전체 메타데이터에는 SQLite 가 만들 수 없는 타입(JSONB 등)이 있어,
+    서비스 단위 테스트는 db 대신 필요한 테이블만 골라 만듭니다.
+
+    사용: Session = table_sessionmaker(Vehicle, Order, path=None)
+    - path 없음: 세션 / 스레드 간 공유되는 :memory: DB
+    - path 지정: 파일 DB (같은 파일에 비동기 엔진을 붙일 때)
+    """
+    engines = []
+
+    def make(*models, path=None):
+        if path is None:
+            table_engine = create_engine(
+                "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+            )
+        else:
+            table_engine = create_engine(f"sqlite:///{path}")
+        engines.append(table_engine)
+        Base.metadata.create_all(table_engine, tables=[getattr(model, "__table__", model) for model in models])
+        return sessionmaker(bind=table_engine)
+
+    yield make
+    for table_engine in engines:
+        table_engine.dispose()
+
+
 @pytest.fixture(scope="function")
 def client(db: Session) -> Generator[TestClient, None, None]:
     """FastAPI 테스트 클라이언트 픽스처"""
@@ -0,0 +1,246 @@
+"""
+단위 테스트 - 순수 ASGI 미들웨어 (응답 압축 / 라우트 지연 히스토그램 / 입력 검증)
+"""
+
+import asyncio
+import gzip
+import json
+import zlib
+
+import brotli
+import pytest
+from fastapi import FastAPI, Request, WebSocket
+from fastapi.responses import Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.compression import CompressionMiddleware, parse_accept_encoding
+from app.middleware.performance import PerformanceMonitoringMiddleware, RouteLatencyHistogram
+from app.middleware.security import InputValidationMiddleware
+
+
+ITEMS = [{"id": i, "name": f"주문-{i}", "status": "PENDING"} for i in range(200)]
+
+
+class _PassThroughHTTPMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+@pytest.fixture
+def histogram():
+    return RouteLatencyHistogram()
+
+
+@pytest.fixture
+def client(histogram, tmp_path):
+    app = FastAPI()
+    (tmp_path / "a.txt").write_text("a")
+    app.mount("/uploads", StaticFiles(directory=str(tmp_path)), name="uploads")
+
+    sub_app = FastAPI()
+
+    @sub_app.get("/stops/{stop_id}")
+    async def stop(stop_id: str):
+        return {"stop_id": stop_id}
+
+    app.mount("/sub", sub_app)
+
+    @app.get("/orders/{order_id}")
+    async def order(order_id: str):
+        return {"order_id": order_id}
+
+    @app.get("/items")
+    async def items():
+        return ITEMS
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return ITEMS[item_id]
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield ("x" * 400 + f"{i}\n").encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/events")
+    async def events():
+        return StreamingResponse(iter([b"data: 1\n\n"] * 200), media_type="text/event-stream")
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" + b"\x00" * 2000, media_type="image/png")
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return await request.json()
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_text(await websocket.receive_text() * 1000)
+        await websocket.close()
+
+    app.add_middleware(_PassThroughHTTPMiddleware)
+    app.add_middleware(InputValidationMiddleware)
+    app.add_middleware(PerformanceMonitoringMiddleware, enable_memory_tracking=False, histogram=histogram)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+def _run(middleware, messages):
+    """ASGI 호출 후 전송된 메시지 수집"""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+
+    async def app(scope, receive, send):
+        for message in messages:
+            await send(message)
+
+    asyncio.run(middleware(app)(scope, receive, send))
+    return sent
+
+
+class TestCompressionMiddleware:
+    """응답 압축 테스트"""
+
+    def test_gzip_and_brotli_for_large_json(self, client):
+        response = client.get("/items", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json() == ITEMS
+
+        response = client.get("/items", headers={"Accept-Encoding": "gzip;q=0.5, br"})
+        assert response.headers["content-encoding"] == "br"
+        assert response.json() == ITEMS
+
+        with client.stream("GET", "/items", headers={"Accept-Encoding": "br"}) as raw:
+            body = b"".join(raw.iter_raw())
+        assert int(raw.headers["content-length"]) == len(body)
+        assert json.loads(brotli.decompress(body)) == ITEMS
+
+    def test_passthrough_rules(self, client):
+        small = client.get("/items/1", headers={"Accept-Encoding": "gzip, br"})
+        assert "content-encoding" not in small.headers
+
+        assert "content-encoding" not in client.get("/items", headers={"Accept-Encoding": "identity"}).headers
+        assert "content-encoding" not in client.get("/items", headers={"Accept-Encoding": "gzip;q=0"}).headers
+        assert "content-encoding" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+
+        events = client.get("/events", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in events.headers
+        assert events.content == b"data: 1\n\n" * 200
+
+        with client.websocket_connect("/ws") as websocket:
+            websocket.send_text("ping")
+            assert websocket.receive_text() == "ping" * 1000
+
+    def test_streaming_response_is_compressed_per_chunk(self, client):
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text == "".join("x" * 400 + f"{i}\n" for i in range(3))
+
+        chunks = [b"a" * 600, b"b" * 600, b"c" * 600, b""]
+        sent = _run(CompressionMiddleware, [
+            {"type": "http.response.start", "status": 200,
+             "headers": [(b"content-type", b"application/json"), (b"content-length", b"1800")]},
+            *({"type": "http.response.body", "body": chunk, "more_body": bool(chunk)} for chunk in chunks),
+        ])
+        assert dict(sent[0]["headers"])[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in dict(sent[0]["headers"])
+        assert len(sent) == 4  # minimum_size 도달 후 한 청크만 보류
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        # 종료 전에도 보낸 청크까지 복원됨 (청크마다 flush)
+        assert decompressor.decompress(sent[1]["body"]) == b"a" * 600 + b"b" * 600
+        assert decompressor.decompress(sent[2]["body"]) == b"c" * 600
+        assert gzip.decompress(b"".join(m["body"] for m in sent[1:])) == b"a" * 600 + b"b" * 600 + b"c" * 600
+
+    def test_parse_accept_encoding(self):
+        assert parse_accept_encoding("gzip, br;q=0.8, *;q=0") == {"gzip": 1.0, "br": 0.8, "*": 0.0}
+        assert CompressionMiddleware.select_encoding("*") == "br"
+        assert CompressionMiddleware.select_encoding("deflate") is None
+
+
+class TestPerformanceMonitoringMiddleware:
+    """라우트 지연 히스토그램 테스트"""
+
+    def test_route_templates_and_histogram(self, client, histogram):
+        for item_id in range(5):
+            response = client.get(f"/items/{item_id}")
+            assert response.headers["x-response-time"].endswith("s")
+        client.get("/items")
+        client.get("/nope/1")
+        with client.websocket_connect("/ws") as websocket:
+            websocket.send_text("a")
+            websocket.receive_text()
+
+        client.get("/orders/orders")
+        client.get("/orders/12")
+        client.get("/sub/stops/stops")
+        for name in ("a.txt", "missing-1.txt", "missing-2/x.txt"):
+            client.get(f"/uploads/{name}")
+
+        stats = {(s["method"], s["route"]): s for s in histogram.get_stats()}
+        assert set(stats) == {
+            ("GET", "/items/{item_id}"), ("GET", "/items"), ("GET", "<unmatched>"),
+            ("GET", "/orders/{order_id}"), ("GET", "/sub/stops/{stop_id}"), ("GET", "/uploads"),
+        }
+        assert stats[("GET", "/orders/{order_id}")]["count"] == 2
+        assert stats[("GET", "/uploads")]["count"] == 3  # 정적 파일 404 포함, 마운트 접두어 하나로
+        item_stats = stats[("GET", "/items/{item_id}")]
+        assert item_stats["count"] == 5
+        assert sum(item_stats["buckets"].values()) == 5
+        assert item_stats["p50_ms"] <= item_stats["p99_ms"] <= max(item_stats["max_ms"], 5)
+
+    def test_percentile_estimate(self):
+        histogram = RouteLatencyHistogram(buckets_ms=(10, 100))
+        for duration in (1, 2, 3, 50, 500):
+            histogram.record("GET", "/x", duration, status=200 if duration < 500 else 503)
+
+        stats = histogram.get_stats()[0]
+        assert (stats["p50_ms"], stats["p95_ms"], stats["errors"]) == (10, 500, 1)
+        assert stats["buckets"] == {"le_10": 3, "le_100": 1, "le_inf": 1}
+
+
+class TestInputValidationMiddleware:
+    """입력 검증 테스트"""
+
+    def test_blocks_dangerous_input_and_replays_body(self, client):
+        payload = {"name": "냉동 주문", "pallets": 3}
+        assert client.post("/echo", json=payload).json() == payload
+
+        blocked = client.post("/echo", json={"name": "x'; DROP TABLE orders"})
+        assert blocked.status_code == 400
+        assert blocked.json() == {"detail": "Invalid input detected"}
+
+    @pytest.mark.parametrize("payload", [
+        {"notes": "문 앞; 2층"},
+        {"product_name": "Select 등급 한우"},
+        {"notes": "Update 예정, create 후 delete 금지 -- 담당자 확인"},
+        {"notes": "A=1 and B=2", "address": "O'Neil Street"},
+        {"notes": "option = 냉동, button=1"},
+    ])
+    def test_ordinary_json_is_not_blocked(self, client, payload):
+        assert client.post("/echo", json=payload).json() == payload
+
+    @pytest.mark.parametrize("value", [
+        "' OR '1'='1",
+        "admin'--",
+        "1 UNION SELECT password FROM users",
+        "x; DROP TABLE orders",
+        "<img src=x onerror=alert(1)>",
+        "<script>alert(1)</script>",
+    ])
+    def test_injection_payloads_are_blocked(self, client, value):
+        assert client.post("/echo", json={"name": value}).status_code == 400
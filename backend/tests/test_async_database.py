@@ -0,0 +1,152 @@
+"""
+단위 테스트 - 비동기 DB 세션 및 비동기 조회 서비스
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.async_database import to_async_database_url
+from app.models.dispatch import Dispatch, DispatchStatus
+from app.models.order import Order
+from app.models.vehicle import Vehicle, VehicleType
+from app.models.vehicle_location import TemperatureAlert, VehicleLatestState, VehicleLocation
+from app.services.vehicle_state_store import VehicleStateStore, vehicle_state_store
+from app.services.vehicle_telemetry_service import VehicleTelemetryQueryService
+
+
+@pytest.fixture
+def telemetry_db(tmp_path, table_sessionmaker):
+    """차량/배차/위치 테이블을 가진 SQLite (동기: 데이터 준비, 비동기: 조회)"""
+    path = tmp_path / "telemetry.db"
+    Session = table_sessionmaker(
+        Vehicle, Order, Dispatch, VehicleLatestState, VehicleLocation, TemperatureAlert, path=path
+    )
+
+    session = Session()
+    for idx in range(1, 4):
+        session.add(Vehicle(
+            code=f"V{idx}", plate_number=f"V{idx}", vehicle_type=VehicleType.FROZEN,
+            max_pallets=16, max_weight_kg=10000, tonnage=5.0, is_active=True
+        ))
+    session.add(Dispatch(
+        dispatch_number="D-1", dispatch_date=datetime.utcnow().date(), vehicle_id=1,
+        status=DispatchStatus.IN_PROGRESS
+    ))
+    session.commit()
+    session.close()
+
+    Session.async_factory = async_sessionmaker(
+        create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool), expire_on_commit=False
+    )
+    vehicle_state_store.invalidate()
+    yield Session
+    vehicle_state_store.invalidate()
+
+
+class TestAsyncDatabaseUrl:
+    """비동기 드라이버 URL 변환 테스트"""
+
+    def test_driver_mapping(self):
+        assert to_async_database_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+        assert to_async_database_url("postgresql+psycopg2://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+        assert to_async_database_url("sqlite:///./dev.db") == "sqlite+aiosqlite:///./dev.db"
+
+    def test_unsupported_backend(self):
+        with pytest.raises(ValueError):
+            to_async_database_url("mysql://u:p@db/app")
+
+
+class TestAsyncStateStore:
+    """최신 상태 저장소 비동기 조회 테스트"""
+
+    async def test_async_reads_match_sync_writes(self, telemetry_db):
+        """동기 세션으로 기록한 상태를 비동기 세션으로 조회"""
+        writer = VehicleStateStore()
+        db = telemetry_db()
+        writer.record_positions(db, [{"vehicle_id": 2, "latitude": 37.5, "longitude": 127.0}])
+        db.commit()
+        db.close()
+
+        reader = VehicleStateStore()
+        async with telemetry_db.async_factory() as async_db:
+            assert (await reader.get_async(async_db, 2)).position == (37.5, 127.0)
+            assert set(await reader.get_fleet_async(async_db)) == {2}
+
+
+class TestTelemetryQueryService:
+    """텔레메트리 비동기 조회 테스트"""
+
+    async def test_vehicles_status(self, telemetry_db):
+        """최근 위치 기준 moving/idle/offline 판정 및 활성 배차"""
+        db = telemetry_db()
+        now = datetime.utcnow()
+        vehicle_state_store.record_positions(db, [
+            {"vehicle_id": 1, "latitude": 37.5, "longitude": 127.0, "speed_kmh": 60, "recorded_at": now},
+            {"vehicle_id": 2, "latitude": 37.6, "longitude": 127.1, "speed_kmh": 0, "recorded_at": now},
+            {"vehicle_id": 3, "latitude": 37.7, "longitude": 127.2, "speed_kmh": 50,
+             "recorded_at": now - timedelta(hours=1)},
+        ])
+        db.commit()
+        db.close()
+
+        async with telemetry_db.async_factory() as async_db:
+            vehicles = await VehicleTelemetryQueryService(async_db).get_all_vehicles_status()
+
+        status = {vehicle["vehicle_id"]: vehicle for vehicle in vehicles}
+        assert status[1]["status"] == "moving"
+        assert status[1]["active_dispatch"]["dispatch_number"] == "D-1"
+        assert status[2]["status"] == "idle"
+        assert status[3]["status"] == "offline"
+        assert status[3]["location"] is None
+
+    async def test_history_and_statistics(self, telemetry_db):
+        """위치 이력/통계 (recorded_at, detected_at 기준)"""
+        db = telemetry_db()
+        now = datetime.now()
+        for minutes, speed in ((30, 40.0), (10, 120.0)):
+            db.add(VehicleLocation(
+                vehicle_id=1, latitude=37.5, longitude=127.0, speed=speed,
+                recorded_at=now - timedelta(minutes=minutes)
+            ))
+        db.add(TemperatureAlert(
+            vehicle_id=1, alert_type="TOO_HOT", severity="WARNING", temperature_celsius=-10.0,
+            detected_at=now - timedelta(minutes=5)
+        ))
+        db.commit()
+        db.close()
+
+        async with telemetry_db.async_factory() as async_db:
+            service = VehicleTelemetryQueryService(async_db)
+            history = await service.get_vehicle_telemetry(1, minutes=60)
+            statistics = await service.get_statistics(hours=1)
+
+        assert history["data_points"] == 2
+        assert history["latest"]["speed"] == 120.0
+        assert history["temperature_alerts"][0]["temperature"] == -10.0
+        assert statistics["total_data_points"] == 2
+        assert statistics["average_speed"] == 80.0
+        assert statistics["speeding_incidents"] == 1
+        assert statistics["temperature_alerts"] == 1
+
+    async def test_queries_do_not_block_event_loop(self, telemetry_db):
+        """조회 중에도 다른 코루틴이 실행됨"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        async with telemetry_db.async_factory() as async_db:
+            service = VehicleTelemetryQueryService(async_db)
+            for _ in range(5):
+                await service.get_statistics(hours=1)
+        task.cancel()
+
+        assert ticks > 0
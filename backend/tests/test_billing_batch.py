@@ -0,0 +1,132 @@
+"""
+단위 테스트 - 월간 일괄 청구/정산 (일괄 로드 / 미청구 배차 제외 / 재실행 멱등성)
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app.models.billing import (
+    BillingPolicy, DriverSettlement, DriverSettlementItem, Invoice, InvoiceLineItem
+)
+from app.models.client import Client, ClientType
+from app.models.dispatch import Dispatch, DispatchRoute, DispatchStatus, RouteType
+from app.models.driver import Driver
+from app.models.order import Order, TemperatureZone
+from app.models.vehicle import Vehicle, VehicleType
+from app.services.billing_service import BillingService, DriverSettlementService
+
+
+@pytest.fixture
+def billing_db(table_sessionmaker):
+    session = table_sessionmaker(
+        Client, Vehicle, Driver, Order, Dispatch, DispatchRoute, BillingPolicy, Invoice, InvoiceLineItem,
+        DriverSettlement, DriverSettlementItem,
+    )()
+    for code, active in (("C1", True), ("C2", True), ("C3", False)):
+        session.add(Client(code=code, name=code, client_type=ClientType.BOTH, address="서울", is_active=active))
+    session.add(Vehicle(code="V1", plate_number="V1", vehicle_type=VehicleType.FROZEN,
+                        max_pallets=16, max_weight_kg=10000, tonnage=5.0))
+    for code in ("D1", "D2"):
+        session.add(Driver(code=code, name=code, phone="010"))
+    # C1: 물량 할인 (월 2건 이상 10%)
+    session.add(BillingPolicy(client_id=1, payment_terms_days=30, base_rate_per_km=2000.0,
+                              base_rate_per_pallet=5000.0, volume_discount_threshold=2, volume_discount_rate=10.0))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _dispatch(db, number, client_id, day, distance, pallets, driver_id=1, status=DispatchStatus.COMPLETED):
+    order = Order(order_number=f"O-{number}", order_date=day, temperature_zone=TemperatureZone.FROZEN,
+                  pickup_client_id=client_id, delivery_client_id=client_id, pallet_count=pallets,
+                  pickup_address="A", delivery_address="B")
+    dispatch = Dispatch(dispatch_number=number, dispatch_date=day, vehicle_id=1, driver_id=driver_id,
+                        total_distance_km=distance, status=status)
+    db.add_all([order, dispatch])
+    db.flush()
+    for sequence, route_type in enumerate((RouteType.PICKUP, RouteType.DELIVERY), start=1):
+        db.add(DispatchRoute(dispatch_id=dispatch.id, sequence=sequence, route_type=route_type, order_id=order.id,
+                             location_name="L", address="A", latitude=37.5, longitude=127.0))
+    db.commit()
+    return dispatch
+
+
+@pytest.fixture
+def october(billing_db):
+    _dispatch(billing_db, "DSP-1", 1, date(2026, 10, 5), 10, 2)
+    _dispatch(billing_db, "DSP-2", 1, date(2026, 10, 6), 5, 4)
+    _dispatch(billing_db, "DSP-3", 2, date(2026, 10, 7), 1, 1, driver_id=2)
+    _dispatch(billing_db, "DSP-4", 3, date(2026, 10, 7), 1, 1)                                   # 비활성 거래처
+    _dispatch(billing_db, "DSP-5", 1, date(2026, 10, 8), 1, 1, status=DispatchStatus.IN_PROGRESS)  # 미완료
+    _dispatch(billing_db, "DSP-6", 1, date(2026, 9, 30), 1, 1)                                   # 전월
+    return billing_db
+
+
+class TestMonthlyInvoices:
+    """월간 일괄 청구 테스트"""
+
+    def test_batch_invoices(self, october):
+        inserts = []
+        event.listen(october.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: inserts.append(statement.split("(")[0].strip())
+                     if statement.startswith("INSERT") else None)
+
+        invoices = BillingService(october).generate_monthly_invoices(2026, 10)
+
+        assert [(inv.client_id, inv.subtotal, inv.total_amount) for inv in invoices] == [
+            (1, 54000.0, 59400.0),  # (30000 + 30000) - 물량 할인 10%
+            (2, 7000.0, 7700.0),
+        ]
+        items = october.query(InvoiceLineItem).order_by(InvoiceLineItem.dispatch_id).all()
+        assert [(item.dispatch_id, item.pallets, item.discount_amount) for item in items] == [
+            (1, 2, 3000.0), (2, 4, 3000.0), (3, 1, 0.0),
+        ]
+        assert items[0].description == "배차번호: DSP-1 (A → B)"
+        assert invoices[0].invoice_number.endswith("-0001") and invoices[1].invoice_number.endswith("-0002")
+        # 기본 정책 생성 1회 + 청구서/항목 다중 행 INSERT 1회씩
+        assert inserts == ["INSERT INTO billing_policies", "INSERT INTO invoices", "INSERT INTO invoice_line_items"]
+
+    def test_rerun_is_idempotent(self, october):
+        service = BillingService(october)
+        service.generate_monthly_invoices(2026, 10)
+
+        assert service.generate_monthly_invoices(2026, 10) == []
+
+        _dispatch(october, "DSP-7", 2, date(2026, 10, 9), 2, 0, driver_id=2)
+        invoices = service.generate_monthly_invoices(2026, 10)
+        assert [(inv.client_id, inv.subtotal, inv.invoice_number[-4:]) for inv in invoices] == [(2, 4000.0, "0003")]
+        assert october.query(InvoiceLineItem).count() == 4
+
+    def test_concurrent_run_rolls_back(self, october):
+        """다른 실행이 먼저 청구한 배차는 UNIQUE 제약으로 묶음 전체 롤백"""
+        service = BillingService(october)
+        stale = service._load_billable_dispatches(date(2026, 10, 1), date(2026, 10, 31), [1, 2])
+        service.generate_monthly_invoices(2026, 10)
+
+        assert service._create_invoices(stale, date(2026, 10, 1), date(2026, 10, 31)) == []
+        assert october.query(Invoice).count() == 2
+
+    def test_single_client_invoice(self, october):
+        invoice = BillingService(october).generate_invoice_for_client(2, date(2026, 10, 1), date(2026, 10, 31))
+        assert [item.dispatch_id for item in invoice.line_items] == [3]
+        assert BillingService(october).generate_invoice_for_client(2, date(2026, 10, 1), date(2026, 10, 31)) is None
+
+
+class TestMonthlySettlements:
+    """월간 일괄 정산 테스트"""
+
+    def test_batch_settlements(self, october):
+        BillingService(october).generate_monthly_invoices(2026, 10)
+        service = DriverSettlementService(october)
+
+        settlements = service.generate_monthly_settlements(2026, 10, commission_rate=10.0)
+
+        # D1: DSP-1/2 (청구 27000 x 2) + DSP-4 (비활성 거래처, 미청구 0원)
+        assert [(s.driver_id, s.dispatch_count, s.total_revenue, s.net_amount, s.total_pallets) for s in settlements] == [
+            (1, 3, 54000.0, 48600.0, 7),
+            (2, 1, 7000.0, 6300.0, 1),
+        ]
+        assert service.generate_monthly_settlements(2026, 10) == []
+        assert october.query(DriverSettlementItem).count() == 4
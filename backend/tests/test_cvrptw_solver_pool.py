@@ -0,0 +1,85 @@
+"""
+단위 테스트 - 온도대별 CVRPTW 솔버 프로세스 풀 실행
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.models.order import TemperatureZone
+from app.models.vehicle import VehicleType
+from app.services import solver_pool
+from app.services.cvrptw_service import (
+    AdvancedDispatchOptimizationService, Location, VehicleInfo, solve_cvrptw
+)
+from app.services.distance_matrix import get_distance_matrix_engine
+
+
+def _problem(offset: float = 0.0):
+    """차고지 1곳 + 상차/하차 2쌍"""
+    coords = [
+        (37.50 + offset, 127.00),
+        (37.52 + offset, 127.02), (37.55 + offset, 127.05),
+        (37.48 + offset, 126.98), (37.45 + offset, 126.95),
+    ]
+    locations = [Location(id=0, name="depot", latitude=coords[0][0], longitude=coords[0][1], location_type="depot")]
+    for idx, (lat, lon) in enumerate(coords[1:], start=1):
+        is_pickup = idx % 2 == 1
+        locations.append(Location(
+            id=idx,
+            name=f"L{idx}",
+            latitude=lat,
+            longitude=lon,
+            location_type="pickup" if is_pickup else "delivery",
+            order_id=(idx + 1) // 2,
+            pallet_demand=2 if is_pickup else -2,
+        ))
+    vehicles = [VehicleInfo(id=1, code="V1", vehicle_type=VehicleType.FROZEN, max_pallets=10, max_weight_kg=5000, depot_index=0)]
+    engine = get_distance_matrix_engine()
+    return locations, vehicles, engine.distance_matrix_m(coords), engine.time_matrix_min(coords)
+
+
+@pytest.fixture
+def pool_workers(monkeypatch):
+    """2개 프로세스 솔버 풀"""
+    monkeypatch.setattr(settings, "SOLVER_POOL_WORKERS", 2)
+    solver_pool.shutdown_solver_pool(wait=True)
+    yield
+    solver_pool.shutdown_solver_pool(wait=True)
+
+
+class TestSolverPool:
+    """솔버 프로세스 풀 테스트"""
+
+    async def test_zones_solved_concurrently_in_pool(self, pool_workers):
+        """여러 온도대 문제를 프로세스 풀에서 동시에 풀고 스레드 실행과 같은 결과"""
+        problems = [_problem(0.0), _problem(0.1)]
+
+        results = await asyncio.gather(*(
+            solver_pool.run_in_solver_pool(solve_cvrptw, *problem, False, 2)
+            for problem in problems
+        ))
+
+        assert solver_pool.get_solver_pool() is not None
+        for problem, result in zip(problems, results):
+            expected = solve_cvrptw(*problem, False, 2)
+            assert result['total_distance'] == expected['total_distance']
+
+    async def test_disabled_pool_runs_in_thread(self, monkeypatch):
+        """SOLVER_POOL_WORKERS=0 이면 스레드에서 실행"""
+        monkeypatch.setattr(settings, "SOLVER_POOL_WORKERS", 0)
+
+        result = await solver_pool.run_in_solver_pool(solve_cvrptw, *_problem(), False, 1)
+
+        assert solver_pool.get_solver_pool() is None
+        assert result['total_distance'] > 0
+
+    def test_zone_time_limit(self):
+        """온도대별 시간 예산은 이름/값 모두 허용"""
+        service = AdvancedDispatchOptimizationService(db=None)
+
+        assert service._zone_time_limit(TemperatureZone.FROZEN, 30, None) == 30
+        assert service._zone_time_limit(TemperatureZone.FROZEN, 30, {"FROZEN": 60}) == 60
+        assert service._zone_time_limit(TemperatureZone.FROZEN, 30, {TemperatureZone.FROZEN.value: 45}) == 45
+        assert service._zone_time_limit(TemperatureZone.AMBIENT, 30, {"FROZEN": 60}) == 30
@@ -0,0 +1,238 @@
+"""
+단위 테스트 - 대시보드 통계 공유 생산자
+"""
+
+import asyncio
+import json
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.models.billing import BillingStatus, Invoice
+from app.models.dispatch import Dispatch
+from app.models.order import Order
+from app.models.vehicle import Vehicle, VehicleStatus, VehicleType
+from app.services.dashboard_stats_service import DashboardStatsProducer
+from app.websocket.connection_manager import manager
+
+
+@pytest.fixture
+def stats_db(tmp_path, table_sessionmaker):
+    """주문/배차/차량/청구서 테이블을 가진 SQLite 세션 팩토리 (동기: 데이터 준비, 비동기: 생산자 / SELECT 문 기록)"""
+    path = tmp_path / "stats.db"
+    Session = table_sessionmaker(Vehicle, Order, Dispatch, Invoice, path=path)
+
+    session = Session()
+    for idx in range(1, 4):
+        session.add(Vehicle(
+            code=f"V{idx}", plate_number=f"V{idx}", vehicle_type=VehicleType.FROZEN,
+            max_pallets=16, max_weight_kg=10000, tonnage=5.0,
+            status=VehicleStatus.AVAILABLE, is_active=True
+        ))
+    session.commit()
+    session.close()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    selects = []
+    event.listen(
+        async_engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statement.startswith("SELECT") and selects.append(statement)
+    )
+    Session.selects = selects
+    Session.async_factory = async_sessionmaker(async_engine)
+    yield Session
+
+
+class FakeRedis:
+    """리더 키/스냅샷/발행만 지원하는 Redis 대역 (워커 간 공유)"""
+
+    def __init__(self):
+        self.values = {}
+        self.published = []
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def pexpire(self, key, px):
+        return key in self.values
+
+    async def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+
+def _drain(queue):
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+
+class TestSharedProducer:
+    """집계 1회 + 팬아웃 테스트"""
+
+    async def test_db_load_independent_of_subscribers(self, stats_db):
+        """구독자 1명이든 100명이든 tick 당 쿼리 수 동일"""
+        producer = DashboardStatsProducer(session_factory=stats_db.async_factory)
+
+        await producer.subscribe()
+        stats_db.selects.clear()
+        await producer.tick()
+        single = len(stats_db.selects)
+
+        queues = [await producer.subscribe() for _ in range(100)]
+        stats_db.selects.clear()
+        await producer.tick()
+
+        assert single == 4
+        assert len(stats_db.selects) == single
+        assert all(not queue.empty() for queue in queues)
+
+    async def test_snapshot_then_deltas(self, stats_db):
+        """연결 시 전체 스냅샷, 이후 변경 항목만 전송"""
+        producer = DashboardStatsProducer(session_factory=stats_db.async_factory)
+        queue = await producer.subscribe()
+
+        snapshot = _drain(queue)
+        assert len(snapshot) == 1
+        assert snapshot[0]["available_vehicles"] == 3
+        assert snapshot[0]["loading"] is False
+
+        # 변경 없음 - 전송 없음
+        await producer.tick()
+        assert queue.empty()
+
+        db = stats_db()
+        db.query(Vehicle).filter(Vehicle.code == "V1").update({"status": VehicleStatus.IN_USE})
+        db.commit()
+        db.close()
+
+        await producer.tick()
+        delta = _drain(queue)
+        assert len(delta) == 1
+        assert set(delta[0]) == {"available_vehicles", "active_vehicles", "timestamp"}
+        assert delta[0]["available_vehicles"] == 2
+        assert delta[0]["active_vehicles"] == 1
+
+    async def test_revenue_from_invoices(self, stats_db):
+        """오늘/이번 달 수익 = 발행일 기준 청구서 총액 (취소 제외)"""
+        today = date.today()
+        db = stats_db()
+        for idx, (issue_date, amount, status) in enumerate([
+            (today, 1000.0, BillingStatus.SENT),
+            (today.replace(day=1), 500.0, BillingStatus.PAID),
+            (today, 9000.0, BillingStatus.CANCELLED),
+            (today.replace(day=1) - timedelta(days=1), 7000.0, BillingStatus.PAID),
+        ]):
+            db.add(Invoice(
+                invoice_number=f"INV-{idx}", client_id=1,
+                billing_period_start=issue_date, billing_period_end=issue_date,
+                issue_date=issue_date, due_date=issue_date, total_amount=amount, status=status
+            ))
+        db.commit()
+        db.close()
+
+        producer = DashboardStatsProducer(session_factory=stats_db.async_factory)
+        snapshot = _drain(await producer.subscribe())[0]
+
+        expected_today = 1500.0 if today.day == 1 else 1000.0
+        assert snapshot["revenue_today"] == expected_today
+        assert snapshot["revenue_month"] == 1500.0
+
+    async def test_no_queries_without_subscribers(self, stats_db):
+        """구독자가 없으면 집계하지 않음"""
+        producer = DashboardStatsProducer(session_factory=stats_db.async_factory)
+        queue = await producer.subscribe()
+        producer.unsubscribe(queue)
+
+        stats_db.selects.clear()
+        await producer.tick()
+        assert stats_db.selects == []
+
+    async def test_concurrent_connects_load_once(self, stats_db):
+        """동시에 연결된 구독자들의 초기 스냅샷은 1회만 집계"""
+        producer = DashboardStatsProducer(session_factory=stats_db.async_factory)
+        stats_db.selects.clear()
+
+        queues = await asyncio.gather(*[producer.subscribe() for _ in range(20)])
+
+        assert len(stats_db.selects) == 4
+        assert all(len(_drain(queue)) == 1 for queue in queues)
+
+    async def test_slow_subscriber_resynced_with_snapshot(self, stats_db):
+        """큐가 가득 찬 구독자는 전체 스냅샷으로 교체"""
+        producer = DashboardStatsProducer(session_factory=stats_db.async_factory)
+        queue = await producer.subscribe()
+
+        for version in range(producer.version + 1, producer.version + 1 + producer.QUEUE_SIZE + 5):
+            await producer.apply_message({"type": "dashboard_delta", "version": version, "data": {"pending_orders": version}})
+
+        messages = _drain(queue)
+        assert len(messages) <= producer.QUEUE_SIZE
+        assert any("loading" in message for message in messages)
+        assert messages[-1]["pending_orders"] == producer.version
+
+
+class TestClusterCoordination:
+    """Redis 리더 선출 테스트"""
+
+    async def test_only_leader_queries(self, stats_db, monkeypatch):
+        """여러 워커 중 리더만 집계하여 Pub/Sub 으로 발행"""
+        redis = FakeRedis()
+        monkeypatch.setattr(manager, "redis_client", redis)
+
+        workers = [DashboardStatsProducer(session_factory=stats_db.async_factory) for _ in range(3)]
+        for worker in workers:
+            monkeypatch.setattr(worker, "_subscribers", {asyncio.Queue()})
+
+        stats_db.selects.clear()
+        for worker in workers:
+            await worker.tick()
+
+        assert len(stats_db.selects) == 4
+        assert [channel for channel, _ in redis.published] == ["ws:dashboard_stats"]
+        assert redis.published[0][1]["type"] == "dashboard_snapshot"
+
+        # 팔로워는 Pub/Sub 메시지로 스냅샷 반영
+        follower = workers[1]
+        await follower.apply_message(redis.published[0][1])
+        assert (await follower.get_snapshot())["available_vehicles"] == 3
+
+    async def test_follower_reloads_after_missed_delta(self, stats_db, monkeypatch):
+        """delta 유실 시 Redis 공유 스냅샷으로 재동기화"""
+        redis = FakeRedis()
+        monkeypatch.setattr(manager, "redis_client", redis)
+        leader = DashboardStatsProducer(session_factory=stats_db.async_factory)
+        follower = DashboardStatsProducer(session_factory=stats_db.async_factory)
+        monkeypatch.setattr(leader, "_subscribers", {asyncio.Queue()})
+
+        await leader.tick()
+        await follower.apply_message(redis.published[0][1])
+
+        db = stats_db()
+        db.query(Vehicle).update({"status": VehicleStatus.IN_USE})
+        db.commit()
+        db.close()
+        await leader.tick()
+        db = stats_db()
+        db.query(Vehicle).filter(Vehicle.code == "V1").update({"status": VehicleStatus.AVAILABLE})
+        db.commit()
+        db.close()
+        await leader.tick()
+
+        # 두 번째 메시지 유실, 세 번째만 수신
+        stats_db.selects.clear()
+        await follower.apply_message(redis.published[2][1])
+
+        snapshot = await follower.get_snapshot()
+        assert snapshot["available_vehicles"] == 1
+        assert snapshot["active_vehicles"] == 2
+        assert stats_db.selects == []
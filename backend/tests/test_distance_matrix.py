@@ -0,0 +1,82 @@
+"""
+단위 테스트 - 거리 행렬 엔진
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.services.distance_matrix import DistanceMatrixEngine
+
+
+def _scalar_haversine_km(lat1, lon1, lat2, lon2):
+    """기존 루프 방식 Haversine (비교용)"""
+    R = 6371
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+    a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+
+class TestDistanceMatrixEngine:
+    """거리 행렬 엔진 테스트"""
+
+    def setup_method(self):
+        """각 테스트 전에 실행"""
+        self.engine = DistanceMatrixEngine(max_entries=4)
+        self.coords = [
+            (37.5665, 126.9780),  # 서울시청
+            (37.4979, 127.0276),  # 강남역
+            (37.4563, 126.7052),  # 인천
+            (35.1796, 129.0756),  # 부산
+        ]
+
+    def test_matches_scalar_haversine(self):
+        """스칼라 루프 계산과 동일한 결과"""
+        matrix = self.engine.distance_matrix_m(self.coords)
+
+        assert matrix.dtype == np.int32
+        assert matrix.shape == (4, 4)
+        for i, (lat1, lon1) in enumerate(self.coords):
+            for j, (lat2, lon2) in enumerate(self.coords):
+                expected = 0 if i == j else int(_scalar_haversine_km(lat1, lon1, lat2, lon2) * 1000)
+                assert abs(int(matrix[i, j]) - expected) <= 1
+
+    def test_time_matrix_uses_average_speed(self):
+        """평균 속도 기반 이동 시간 (분)"""
+        distance = self.engine.distance_matrix_m(self.coords)
+        time_matrix = self.engine.time_matrix_min(self.coords, avg_speed_kmh=40)
+
+        speed_m_per_min = 40 * 1000 / 60
+        assert time_matrix.dtype == np.int32
+        assert time_matrix[0, 3] == int(distance[0, 3] / speed_m_per_min)
+
+        congested = self.engine.time_matrix_min(self.coords, avg_speed_kmh=40, traffic_factor=1.2)
+        assert congested[0, 3] == int(time_matrix[0, 3] * 1.2)
+
+    def test_cache_hit_for_same_coordinates(self):
+        """동일 좌표 집합은 캐시에서 반환"""
+        first = self.engine.distance_matrix_m(self.coords)
+        second = self.engine.distance_matrix_m(list(self.coords))
+
+        assert first is second
+        assert self.engine.hits == 1
+        assert not second.flags.writeable
+
+    def test_cache_eviction(self):
+        """최대 개수 초과 시 오래된 항목 제거"""
+        for offset in range(6):
+            self.engine.distance_matrix_m([(37.0 + offset, 127.0), (37.5, 127.5)])
+
+        assert len(self.engine._cache) == 4
+
+    def test_empty_and_invalid_coordinates(self):
+        """빈 좌표 / 잘못된 좌표 처리"""
+        assert self.engine.distance_matrix_m([]).shape == (0, 0)
+
+        with pytest.raises(ValueError):
+            self.engine.distance_matrix_m([(37.5, 127.0, 1.0)])
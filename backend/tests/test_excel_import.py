@@ -0,0 +1,148 @@
+"""
+단위 테스트 - 엑셀 일괄 업로드 (일괄 조회 / 벡터 검증 / 청크 INSERT)
+"""
+
+import threading
+from datetime import date, time
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from sqlalchemy import event
+
+from app.models.client import Client, ClientType
+from app.models.order import Order, OrderStatus, TemperatureZone
+from app.models.vehicle import Vehicle, VehicleType
+from app.services.excel_template_service import ExcelTemplateService
+from app.services.excel_upload_service import ExcelUploadService
+from app.services.naver_map_service import NaverMapService
+
+
+def _excel(entity_type, rows):
+    """필드명 행 → 템플릿 한글 헤더 엑셀 바이트"""
+    headers = {field: korean for korean, field in ExcelTemplateService.get_korean_to_field_mapping(entity_type).items()}
+    buffer = BytesIO()
+    pd.DataFrame(rows).rename(columns=headers).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _order(number, pickup="C1", delivery="C2", **fields):
+    row = {
+        "order_number": number, "order_date": "2026-10-18", "temperature_zone": "냉동",
+        "pickup_client_code": pickup, "delivery_client_code": delivery, "pallet_count": 4,
+        "pickup_start_time": "09:00", "delivery_end_time": "18:00",
+    }
+    row.update(fields)
+    return row
+
+
+@pytest.fixture
+def upload_db(table_sessionmaker):
+    session = table_sessionmaker(Client, Vehicle, Order)()
+    for code in ("C1", "C2"):
+        session.add(Client(code=code, name=code, client_type=ClientType.BOTH, address="서울"))
+    session.commit()
+    session.add(Order(
+        order_number="DUP-1", order_date=date(2026, 10, 17), temperature_zone=TemperatureZone.FROZEN,
+        pickup_client_id=1, delivery_client_id=2, pallet_count=1
+    ))
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestOrderImport:
+    """주문 일괄 업로드 테스트"""
+
+    def test_bulk_insert_with_row_errors(self, upload_db, monkeypatch):
+        monkeypatch.setattr(ExcelUploadService, "CHUNK_SIZE", 2)
+        rows = [_order(f"NEW-{idx}") for idx in range(5)] + [
+            _order("NEW-0"),                        # 파일 내 중복
+            _order("DUP-1"),                        # 기존 주문번호
+            _order("BAD-1", delivery="C9"),         # 없는 거래처
+            _order("BAD-2", temperature_zone="초저온"),
+            _order("BAD-3", pickup_start_time="9시"),
+        ]
+        inserts = []
+        event.listen(upload_db.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: inserts.append(statement)
+                     if statement.startswith("INSERT") else None)
+        progress = []
+
+        result = ExcelUploadService.upload_orders(upload_db, _excel("orders", rows), progress=lambda *p: progress.append(p))
+
+        assert (result["total"], result["created"], result["failed"]) == (10, 5, 5)
+        assert result["created_codes"] == [f"NEW-{idx}" for idx in range(5)]
+        assert [(error["row"], error["error"]) for error in result["errors"]] == [
+            (7, "파일 내 중복 주문번호"),
+            (8, "이미 존재하는 주문번호"),
+            (9, "하차 거래처를 찾을 수 없음"),
+            (10, "온도대 값 오류 (냉동/냉장/상온)"),
+            (11, "시간 형식 오류 (HH:MM)"),
+        ]
+        assert len(inserts) == 3  # 5건 / 청크 2
+        assert progress == [(5, 10), (7, 10), (9, 10), (10, 10)]
+
+        order = upload_db.query(Order).filter_by(order_number="NEW-3").one()
+        assert (order.pickup_client_id, order.delivery_client_id, order.status) == (1, 2, OrderStatus.PENDING)
+        assert (order.pickup_start_time, order.pickup_end_time) == (time(9, 0), None)
+        assert (order.priority, order.is_stackable, order.requires_forklift) == (5, True, False)
+
+    def test_missing_key_column(self, upload_db):
+        with pytest.raises(ValueError):
+            ExcelUploadService.upload_orders(upload_db, _excel("vehicles", [{"code": "T1"}]))
+
+
+class TestClientImport:
+    """거래처 일괄 업로드 테스트"""
+
+    async def test_db_work_runs_off_event_loop(self, upload_db, monkeypatch):
+        """파싱/조회/저장은 스레드에서, 지오코딩만 이벤트 루프에서 실행"""
+        async def geocode_address(self, address):
+            return (37.5, 127.0) if address == "서울 중구" else None
+
+        monkeypatch.setattr(NaverMapService, "geocode_address", geocode_address)
+        loop_thread = threading.get_ident()
+        threads = []
+        event.listen(upload_db.get_bind(), "before_cursor_execute",
+                     lambda *args: threads.append(threading.get_ident()))
+        rows = [
+            {"code": "N1", "name": "신규1", "client_type": "상차", "address": "서울 중구"},
+            {"code": "N2", "name": "신규2", "client_type": "하차", "address": "없는 주소"},
+            {"code": "C1", "name": "중복", "client_type": "양쪽", "address": "서울"},
+        ]
+
+        result = await ExcelUploadService.upload_clients(upload_db, _excel("clients", rows))
+
+        assert result["created_codes"] == ["N1", "N2"]
+        assert [error["error"] for error in result["errors"]] == ["이미 존재하는 거래처 코드"]
+        assert threads and loop_thread not in threads
+        geocoded = {c.code: (c.geocoded, c.latitude) for c in upload_db.query(Client).filter(Client.code.in_(["N1", "N2"]))}
+        assert geocoded == {"N1": (True, 37.5), "N2": (False, None)}
+
+
+class TestVehicleImport:
+    """차량 일괄 업로드 테스트"""
+
+    def test_unique_columns(self, upload_db):
+        upload_db.add(Vehicle(code="OLD", plate_number="12가1111", vehicle_type=VehicleType.FROZEN,
+                              max_pallets=16, max_weight_kg=10000, tonnage=5.0))
+        upload_db.commit()
+        rows = [
+            {"code": "T1", "plate_number": "34나2222", "vehicle_type": "냉장", "max_pallets": 10,
+             "max_weight_kg": 5000, "tonnage": 5.0, "uvis_device_id": "D1"},
+            {"code": "T2", "plate_number": "12가1111", "vehicle_type": "냉동", "max_pallets": 10,
+             "max_weight_kg": 5000, "tonnage": 5.0},
+            {"code": "T3", "plate_number": "56다3333", "vehicle_type": "냉동", "max_pallets": 10,
+             "max_weight_kg": 5000, "tonnage": 5.0, "uvis_device_id": "D1"},
+            {"code": "T4", "plate_number": "78라4444", "vehicle_type": "냉동", "max_weight_kg": 5000, "tonnage": 5.0},
+        ]
+
+        result = ExcelUploadService.upload_vehicles(upload_db, _excel("vehicles", rows))
+
+        assert result["created_codes"] == ["T1"]
+        assert [error["error"] for error in result["errors"]] == [
+            "이미 존재하는 차량번호", "파일 내 중복 UVIS 단말기 ID", "max_pallets 값 누락 또는 형식 오류",
+        ]
+        vehicle = upload_db.query(Vehicle).filter_by(code="T1").one()
+        assert (vehicle.vehicle_type, vehicle.uvis_enabled, vehicle.max_pallets) == (VehicleType.REFRIGERATED, True, 10)
@@ -0,0 +1,98 @@
+"""
+단위 테스트 - 전체 차량 온도 현황 (쿼리 1회, 상태 필터/페이지)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.vehicle import Vehicle, VehicleType
+from app.models.vehicle_location import TemperatureAlert, VehicleLatestState
+from app.services.temperature_analytics import TemperatureAnalytics
+
+
+@pytest.fixture
+def fleet_db(table_sessionmaker):
+    """
+    차량 5대: 1 냉동 정상, 2 냉동 위반(B), 3 냉장 정상, 4 냉장 위반, 5 데이터 없음
+    """
+    session = table_sessionmaker(Vehicle, VehicleLatestState, TemperatureAlert)()
+    now = datetime.utcnow()
+    readings = {
+        1: (VehicleType.FROZEN, -20.0, -18.0),
+        2: (VehicleType.FROZEN, -20.0, -10.0),
+        3: (VehicleType.REFRIGERATED, 3.0, None),
+        4: (VehicleType.REFRIGERATED, 8.0, None),
+        5: (VehicleType.FROZEN, None, None),
+    }
+    for vehicle_id, (vehicle_type, temperature_a, temperature_b) in readings.items():
+        session.add(Vehicle(
+            code=f"V{vehicle_id}", plate_number=f"V{vehicle_id}", vehicle_type=vehicle_type,
+            max_pallets=16, max_weight_kg=10000, tonnage=5.0
+        ))
+        if temperature_a is not None:
+            session.add(VehicleLatestState(
+                vehicle_id=vehicle_id, temperature_a=temperature_a, temperature_b=temperature_b,
+                temperature_recorded_at=now, updated_at=now
+            ))
+    session.add_all([
+        TemperatureAlert(vehicle_id=2, alert_type="TOO_HOT", severity="CRITICAL",
+                         temperature_celsius=-10.0, detected_at=now),
+        TemperatureAlert(vehicle_id=4, alert_type="TOO_HOT", severity="WARNING",
+                         temperature_celsius=8.0, detected_at=now),
+        TemperatureAlert(vehicle_id=4, alert_type="TOO_HOT", severity="WARNING",
+                         temperature_celsius=8.0, detected_at=now - timedelta(days=3)),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(fleet_db):
+    executed = []
+    engine = fleet_db.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class TestFleetTemperatureOverview:
+    """전체 차량 온도 현황 테스트"""
+
+    def test_overview_in_one_query(self, fleet_db, statements):
+        overview = TemperatureAnalytics(fleet_db).get_fleet_temperature_overview(24)
+
+        assert len(statements) == 1
+        assert (
+            overview["total_vehicles"], overview["normal_vehicles"],
+            overview["violation_vehicles"], overview["no_data_vehicles"]
+        ) == (5, 2, 2, 1)
+        assert (overview["total_alerts"], overview["critical_alerts"]) == (2, 1)
+        assert [(v["vehicle_id"], v["status"]) for v in overview["vehicle_status"]] == [
+            (1, "NORMAL"), (2, "VIOLATION"), (3, "NORMAL"), (4, "VIOLATION"),
+        ]
+        assert overview["summary"]["compliance_rate"] == 40.0
+
+    def test_status_filter_and_paging(self, fleet_db):
+        analytics = TemperatureAnalytics(fleet_db)
+
+        page = analytics.get_fleet_temperature_overview(24, status="VIOLATION", skip=1, limit=1)
+        assert [v["vehicle_id"] for v in page["vehicle_status"]] == [4]
+        assert page["pagination"]["total"] == 2
+
+        no_data = analytics.get_fleet_temperature_overview(24, status="NO_DATA")
+        assert [(v["vehicle_id"], v["last_updated"]) for v in no_data["vehicle_status"]] == [(5, None)]
+
+        # 페이지가 비어도 집계는 반환
+        empty = analytics.get_fleet_temperature_overview(24, status="NORMAL", skip=10)
+        assert (empty["vehicle_status"], empty["normal_vehicles"]) == ([], 2)
+
+    def test_unknown_status(self, fleet_db):
+        with pytest.raises(ValueError):
+            TemperatureAnalytics(fleet_db).get_fleet_temperature_overview(24, status="HOT")
@@ -0,0 +1,165 @@
+"""
+단위 테스트 - 증분 재최적화 (Warm start 재배차)
+"""
+
+import time
+from datetime import date
+
+import pytest
+
+from app.core.config import settings
+from app.models.client import Client
+from app.models.dispatch import Dispatch, DispatchRoute, DispatchStatus, RouteType
+from app.models.order import Order, OrderStatus, TemperatureZone
+from app.models.vehicle import Vehicle, VehicleType
+from app.services.dynamic_dispatch import IncrementalReoptimizer, RouteStop, VehicleTail
+from app.services.redispatch_service import DynamicRedispatchService
+
+
+def _pair(order_id, pickup, delivery, pallets=2):
+    return [
+        RouteStop(f"{order_id}:pickup", order_id, "pickup", *pickup, pallets=pallets),
+        RouteStop(f"{order_id}:delivery", order_id, "delivery", *delivery, pallets=pallets),
+    ]
+
+
+class TestIncrementalReoptimizer:
+    """증분 재최적화 엔진 테스트"""
+
+    def setup_method(self):
+        """서울 서부/동부 두 차량"""
+        self.tails = [
+            VehicleTail(1, (37.55, 126.90), (37.55, 126.90), 16,
+                        stops=_pair(1, (37.56, 126.91), (37.57, 126.92))),
+            VehicleTail(2, (37.50, 127.10), (37.50, 127.10), 16, onboard_pallets=4,
+                        stops=[RouteStop("2:delivery", 2, "delivery", 37.51, 127.11, pallets=4)]
+                        + _pair(3, (37.52, 127.12), (37.53, 127.13))),
+        ]
+
+    def test_inserts_new_order_from_warm_start(self):
+        """현재 계획을 초기해로 사용하고 가까운 차량에 삽입"""
+        new_stops = _pair(9, (37.515, 127.115), (37.525, 127.125))
+
+        result = IncrementalReoptimizer().reoptimize(self.tails, new_stops, time_limit_ms=500)
+
+        assert result["warm_start"]
+        assert result["unassigned"] == []
+        keys = [item["key"] for item in result["routes"][2]]
+        assert keys.index("9:pickup") < keys.index("9:delivery")
+        assert result["changed_vehicles"] == [2]
+        assert [item["key"] for item in result["routes"][1]] == ["1:pickup", "1:delivery"]
+
+    def test_onboard_delivery_stays_on_vehicle(self):
+        """적재 중인 화물의 하차는 다른 차량으로 옮기지 않음"""
+        self.tails[1].start = (37.56, 126.90)  # 2번 차량이 1번 차량 근처로 이동
+
+        result = IncrementalReoptimizer().reoptimize(self.tails, [], time_limit_ms=500)
+
+        assert "2:delivery" in [item["key"] for item in result["routes"][2]]
+
+    def test_select_affected_vehicles(self):
+        """신규 정류장과 가까운 차량만 선택"""
+        new_stops = _pair(9, (37.515, 127.115), (37.525, 127.125))
+
+        affected = IncrementalReoptimizer.select_affected_vehicles(self.tails, new_stops, max_vehicles=1)
+
+        assert [t.vehicle_id for t in affected] == [2]
+
+
+@pytest.fixture
+def dispatch_db(monkeypatch, table_sessionmaker):
+    """당일 배차 2건(서부/동부)과 긴급 주문이 있는 SQLite 세션"""
+    monkeypatch.setattr(settings, "SOLVER_POOL_WORKERS", 0)
+    session = table_sessionmaker(Client, Vehicle, Order, Dispatch, DispatchRoute)()
+    today = date.today()
+
+    def order(number, status, pickup, delivery, pallets=2):
+        o = Order(
+            order_number=number, order_date=today, temperature_zone=TemperatureZone.FROZEN,
+            pallet_count=pallets, status=status,
+            pickup_latitude=pickup[0], pickup_longitude=pickup[1],
+            delivery_latitude=delivery[0], delivery_longitude=delivery[1],
+        )
+        session.add(o)
+        return o
+
+    def dispatch(code, garage, stops, status=DispatchStatus.IN_PROGRESS):
+        vehicle = Vehicle(code=code, plate_number=code, vehicle_type=VehicleType.FROZEN,
+                          max_pallets=16, max_weight_kg=10000, tonnage=5.0,
+                          garage_latitude=garage[0], garage_longitude=garage[1])
+        session.add(vehicle)
+        session.flush()
+        d = Dispatch(dispatch_number=f"D-{code}", dispatch_date=today, vehicle_id=vehicle.id, status=status)
+        session.add(d)
+        session.flush()
+        rows = [(RouteType.GARAGE_START, None, garage)] + stops + [(RouteType.GARAGE_END, None, garage)]
+        for seq, (route_type, o, point) in enumerate(rows, start=1):
+            session.add(DispatchRoute(
+                dispatch_id=d.id, sequence=seq, route_type=route_type, order_id=o.id if o else None,
+                location_name=f"{code}-{seq}", address="-", latitude=point[0], longitude=point[1]
+            ))
+        return d
+
+    west_done = order("W-1", OrderStatus.DELIVERED, (37.56, 126.91), (37.57, 126.92))
+    west_onboard = order("W-2", OrderStatus.IN_TRANSIT, (37.58, 126.93), (37.59, 126.94))
+    east = order("E-1", OrderStatus.ASSIGNED, (37.52, 127.12), (37.53, 127.13))
+    session.flush()
+
+    west = dispatch("W", (37.55, 126.90), [
+        (RouteType.PICKUP, west_done, (37.56, 126.91)), (RouteType.DELIVERY, west_done, (37.57, 126.92)),
+        (RouteType.PICKUP, west_onboard, (37.58, 126.93)), (RouteType.DELIVERY, west_onboard, (37.59, 126.94)),
+    ])
+    east_dispatch = dispatch("E", (37.50, 127.10), [
+        (RouteType.PICKUP, east, (37.52, 127.12)), (RouteType.DELIVERY, east, (37.53, 127.13)),
+    ])
+    urgent = order("U-1", OrderStatus.PENDING, (37.515, 127.115), (37.525, 127.125))
+    session.commit()
+
+    session.ids = {"west": west.id, "east": east_dispatch.id, "urgent": urgent.id,
+                   "west_vehicle": west.vehicle_id, "west_onboard": west_onboard.id}
+    yield session
+    session.close()
+
+
+def _route_orders(dispatch):
+    return [(r.route_type, r.order_id) for r in sorted(dispatch.routes, key=lambda r: r.sequence)]
+
+
+class TestIncrementalRedispatchService:
+    """증분 재배차 서비스 테스트"""
+
+    async def test_urgent_order_inserted_into_nearest_dispatch(self, dispatch_db):
+        """긴급 주문은 가까운 배차에만 삽입, 다른 배차는 그대로"""
+        ids = dispatch_db.ids
+        west_before = _route_orders(dispatch_db.get(Dispatch, ids["west"]))
+        service = DynamicRedispatchService(dispatch_db)
+
+        started = time.perf_counter()
+        result = await service.add_urgent_order(ids["urgent"], incremental=True)
+
+        assert time.perf_counter() - started < 1.0
+        assert result["status"] == "success"
+        assert result["changed_dispatches"] == [ids["east"]]
+        assert dispatch_db.get(Order, ids["urgent"]).status == OrderStatus.ASSIGNED
+
+        east = _route_orders(dispatch_db.get(Dispatch, ids["east"]))
+        assert east[0][0] == RouteType.GARAGE_START and east[-1][0] == RouteType.GARAGE_END
+        assert east.index((RouteType.PICKUP, ids["urgent"])) < east.index((RouteType.DELIVERY, ids["urgent"]))
+        assert _route_orders(dispatch_db.get(Dispatch, ids["west"])) == west_before
+
+    async def test_breakdown_transfers_remaining_stops(self, dispatch_db):
+        """고장 차량의 적재 화물은 현재 지점에서 환적, 완료 정류장은 유지"""
+        ids = dispatch_db.ids
+        service = DynamicRedispatchService(dispatch_db)
+
+        result = await service.handle_vehicle_issue(ids["west_vehicle"], "breakdown", incremental=True)
+
+        assert result["method"] == "incremental"
+        assert result["unassigned_orders"] == []
+        east = dispatch_db.get(Dispatch, ids["east"])
+        transfer = [r for r in east.routes if r.order_id == ids["west_onboard"]]
+        assert [r.route_type for r in sorted(transfer, key=lambda r: r.sequence)] == [RouteType.PICKUP, RouteType.DELIVERY]
+        assert transfer[0].latitude == 37.58  # 마지막 완료 지점(상차지)에서 환적
+
+        west = _route_orders(dispatch_db.get(Dispatch, ids["west"]))
+        assert [t for t, _ in west] == [RouteType.GARAGE_START, RouteType.PICKUP, RouteType.DELIVERY, RouteType.PICKUP, RouteType.GARAGE_END]
@@ -0,0 +1,126 @@
+"""
+단위 테스트 - KPI 엔진 (팩트 테이블당 1회 집계 / 기간 캐시 / KPI 조합)
+"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.models.billing import Invoice, InvoiceLineItem
+from app.models.client import Client, ClientType
+from app.models.dispatch import Dispatch, DispatchStatus
+from app.models.order import Order, OrderStatus, TemperatureZone
+from app.models.vehicle import Vehicle, VehicleType
+from app.services.analytics_service import AnalyticsService
+from app.services.kpi_engine import KPIEngine, KPIFactCache
+
+
+START, END = date(2026, 10, 11), date(2026, 10, 20)  # 직전 기간: 10/01 ~ 10/10
+
+
+@pytest.fixture
+def kpi_db(table_sessionmaker):
+    session = table_sessionmaker(Client, Vehicle, Order, Dispatch, Invoice, InvoiceLineItem)()
+    session.add(Client(code="C1", name="C1", client_type=ClientType.BOTH, address="서울"))
+    for idx in (1, 2):
+        session.add(Vehicle(code=f"V{idx}", plate_number=f"V{idx}", vehicle_type=VehicleType.FROZEN,
+                            max_pallets=16, max_weight_kg=10000, tonnage=5.0))
+
+    orders = [
+        # (order_date, status, requested_delivery_date, updated_at)
+        (date(2026, 10, 12), OrderStatus.DELIVERED, date(2026, 10, 13), datetime(2026, 10, 13, 9)),
+        (date(2026, 10, 12), OrderStatus.DELIVERED, date(2026, 10, 13), datetime(2026, 10, 14, 9)),
+        (date(2026, 10, 15), OrderStatus.DELIVERED, None, datetime(2026, 10, 15, 9)),
+        (date(2026, 10, 16), OrderStatus.PENDING, None, datetime(2026, 10, 16, 9)),
+        (date(2026, 10, 5), OrderStatus.DELIVERED, date(2026, 10, 6), datetime(2026, 10, 6, 9)),
+        (date(2026, 10, 6), OrderStatus.CANCELLED, None, datetime(2026, 10, 6, 9)),
+        (date(2026, 9, 1), OrderStatus.DELIVERED, None, datetime(2026, 9, 1, 9)),  # 범위 밖
+    ]
+    for idx, (order_date, status, due, updated_at) in enumerate(orders):
+        session.add(Order(order_number=f"O{idx}", order_date=order_date, temperature_zone=TemperatureZone.FROZEN,
+                          pickup_client_id=1, delivery_client_id=1, pallet_count=1, status=status,
+                          requested_delivery_date=due, updated_at=updated_at))
+
+    dispatches = [
+        # (dispatch_date, status, created_at, updated_at, planned_minutes, total_orders, billed_amount)
+        (date(2026, 10, 12), DispatchStatus.COMPLETED, datetime(2026, 10, 12, 8), datetime(2026, 10, 12, 11),
+         240, 2, 300000.0),
+        (date(2026, 10, 14), DispatchStatus.COMPLETED, datetime(2026, 10, 14, 8), datetime(2026, 10, 14, 13),
+         240, 1, None),
+        (date(2026, 10, 15), DispatchStatus.IN_PROGRESS, datetime(2026, 10, 15, 8), datetime(2026, 10, 15, 9),
+         120, 1, None),
+        (date(2026, 10, 3), DispatchStatus.COMPLETED, datetime(2026, 10, 3, 8), datetime(2026, 10, 3, 10),
+         480, 3, 200000.0),
+    ]
+    session.add(Invoice(invoice_number="INV-1", client_id=1, billing_period_start=date(2026, 10, 1),
+                        billing_period_end=date(2026, 10, 31), issue_date=date(2026, 11, 1),
+                        due_date=date(2026, 12, 1)))
+    for idx, (day, status, created_at, updated_at, minutes, total_orders, amount) in enumerate(dispatches):
+        dispatch = Dispatch(dispatch_number=f"DSP-{idx}", dispatch_date=day, vehicle_id=1, status=status,
+                            created_at=created_at, updated_at=updated_at,
+                            estimated_duration_minutes=minutes, total_orders=total_orders)
+        session.add(dispatch)
+        session.flush()
+        if amount:
+            session.add(InvoiceLineItem(invoice_id=1, dispatch_id=dispatch.id, description="D",
+                                        unit_price=amount, amount=amount))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(kpi_db):
+    executed = []
+    engine = kpi_db.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class TestKPIEngine:
+    """KPI 엔진 테스트"""
+
+    def test_all_kpis_in_one_query_per_fact_table(self, kpi_db, statements):
+        kpis = AnalyticsService(kpi_db).kpi_engine.compute(START, END, use_cache=False)
+
+        assert len(statements) == 2
+        values = {kpi.name: (kpi.value, kpi.change, kpi.status) for kpi in kpis}
+        assert values == {
+            "주문 처리율": (75.0, 25.0, "critical"),         # 3/4 vs 1/2
+            "정시 배송률": (50.0, -50.0, "critical"),        # 1/2 vs 1/1
+            "차량 가동률": (5.0, 0.0, "critical"),           # 8h / (10일 x 8h x 2대) vs 8h
+            "평균 배송 시간": (4.0, 2.0, "good"),            # (3 + 5) / 2 vs 2
+            "1일 평균 주문": (0.0, 0.0, "critical"),         # 0.4 vs 0.2 (소수점 0자리)
+            "일일 평균 매출": (0.0, 50.0, "critical"),       # 30000 vs 20000
+            "평균 주문 금액": (150.0, 125.0, "good"),        # 300000 / 2 vs 200000 / 3
+        }
+
+    def test_window_cache_and_custom_kpi_sets(self, kpi_db, statements):
+        engine = KPIEngine(kpi_db, cache=KPIFactCache())
+
+        order_kpis = engine.compute(START, END, ["daily_orders", "order_completion_rate"])
+        assert [kpi.name for kpi in order_kpis] == ["1일 평균 주문", "주문 처리율"]
+        assert len(statements) == 1  # 주문 팩트만 조회
+
+        engine.compute(START, END)
+        assert len(statements) == 2  # 배차 팩트 추가, 주문 팩트는 캐시
+        engine.compute(START, END, ["average_order_value", "on_time_delivery_rate"])
+        assert len(statements) == 2
+
+        engine.compute(date(2026, 10, 1), date(2026, 10, 10), ["daily_orders"])
+        assert len(statements) == 3  # 다른 기간은 별도 키
+
+    def test_empty_and_unknown_kpis(self, kpi_db):
+        engine = KPIEngine(kpi_db, cache=KPIFactCache())
+
+        empty = engine.compute(date(2027, 1, 1), date(2027, 1, 7), ["on_time_delivery_rate", "average_delivery_time"])
+        assert [(kpi.value, kpi.status, kpi.trend) for kpi in empty] == [(0.0, "critical", "stable")] * 2
+
+        with pytest.raises(ValueError):
+            engine.compute(START, END, ["nope"])
@@ -0,0 +1,175 @@
+"""
+단위 테스트 - 주문 / 배차 목록 (커서 페이지네이션 / 조인 프로젝션 / 일정한 쿼리 수)
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+
+from app.api import dispatches as dispatches_api
+from app.api import orders as orders_api
+from app.core.database import get_db
+from app.models.client import Client, ClientType
+from app.models.dispatch import Dispatch, DispatchRoute, DispatchStatus, RouteType
+from app.models.driver import Driver
+from app.models.order import Order, OrderStatus, TemperatureZone
+from app.models.vehicle import Vehicle, VehicleType
+from app.services.list_query import (
+    ExplainJSON, InvalidCursorError, decode_cursor, encode_cursor, list_dispatches, list_orders,
+)
+
+
+DAY0 = date(2025, 3, 1)
+ORDER_COUNT = 30
+DISPATCH_COUNT = 12
+
+
+@pytest.fixture
+def list_db(table_sessionmaker):
+    session = table_sessionmaker(Client, Vehicle, Driver, Order, Dispatch, DispatchRoute)()
+    for idx in (1, 2):
+        session.add(Client(code=f"C{idx}", name=f"거래처{idx}", client_type=ClientType.BOTH, address="서울"))
+        session.add(Vehicle(code=f"V{idx}", plate_number=f"12가{idx}", vehicle_type=VehicleType.FROZEN,
+                            max_pallets=16, max_weight_kg=10000, tonnage=5.0, driver_name=f"차량기사{idx}"))
+    session.add(Driver(code="D1", name="기사1", phone="010"))
+
+    # 같은 일자에 여러 건 -> (일자, id) 동률 처리 확인
+    for idx in range(1, ORDER_COUNT + 1):
+        session.add(Order(order_number=f"O{idx:03d}", order_date=DAY0 + timedelta(days=idx // 4),
+                          temperature_zone=TemperatureZone.FROZEN, pickup_client_id=1,
+                          delivery_client_id=2 if idx % 2 else None, pallet_count=1,
+                          status=OrderStatus.PENDING if idx % 3 else OrderStatus.DELIVERED))
+    for idx in range(1, DISPATCH_COUNT + 1):
+        session.add(Dispatch(dispatch_number=f"DSP-{idx:03d}", dispatch_date=DAY0 + timedelta(days=idx // 3),
+                             vehicle_id=1 + idx % 2, driver_id=1 if idx % 2 else None,
+                             status=DispatchStatus.CONFIRMED))
+        session.flush()
+        for seq, order_id in enumerate((idx, idx + DISPATCH_COUNT)):
+            session.add(DispatchRoute(dispatch_id=idx, sequence=seq, route_type=RouteType.DELIVERY, order_id=order_id,
+                                      location_name="하차", address="서울", latitude=37.5, longitude=127.0))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(list_db):
+    executed = []
+    engine = list_db.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def _walk(list_fn, db, **kwargs):
+    """next_cursor 를 따라 전체 페이지 수집"""
+    pages, cursor = [], None
+    while True:
+        page = list_fn(db, cursor=cursor, **kwargs)
+        pages.append(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+class TestOrderList:
+    """주문 목록 테스트"""
+
+    def test_cursor_walk_matches_full_ordering(self, list_db):
+        pages = _walk(list_orders, list_db, limit=7, count_mode="none")
+
+        ids = [item["id"] for page in pages for item in page.items]
+        expected = [o.id for o in sorted(list_db.query(Order).all(), key=lambda o: (o.order_date, o.id), reverse=True)]
+        assert ids == expected
+        assert [len(page.items) for page in pages] == [7, 7, 7, 7, 2]
+        assert all(page.total is None for page in pages)
+
+    def test_projection_includes_client_names_in_one_query(self, list_db, statements):
+        page = list_orders(list_db, limit=100, count_mode="none")
+
+        assert len(statements) == 1
+        first = next(item for item in page.items if item["order_number"] == "O001")
+        assert (first["pickup_client_name"], first["delivery_client_name"]) == ("거래처1", "거래처2")
+        second = next(item for item in page.items if item["order_number"] == "O002")
+        assert second["delivery_client_name"] is None
+
+    def test_filters_and_totals(self, list_db):
+        page = list_orders(list_db, limit=5, status=OrderStatus.DELIVERED)
+        assert page.total == ORDER_COUNT // 3
+        assert all(item["status"] == OrderStatus.DELIVERED for item in page.items)
+
+        # SQLite 는 추정치 대신 정확한 건수
+        assert list_orders(list_db, limit=5, count_mode="approx").total == ORDER_COUNT
+
+    def test_approx_count_explain_processes_binds_for_postgresql(self):
+        dialect = postgresql.psycopg2.dialect()
+        stmt = select(Order.id).where(Order.status == OrderStatus.PENDING, Order.order_date == DAY0)
+
+        compiled = ExplainJSON(stmt).compile(dialect=dialect)
+
+        assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT orders.id")
+        status_bind = next(bind for bind in compiled.binds.values() if bind.value is OrderStatus.PENDING)
+        assert status_bind.type.bind_processor(dialect)(status_bind.value) == "PENDING"  # 한글 값이 아닌 Enum 라벨
+
+    def test_invalid_cursor(self, list_db):
+        assert decode_cursor(encode_cursor(DAY0, 42)) == (DAY0, 42)
+        with pytest.raises(InvalidCursorError):
+            list_orders(list_db, cursor="not-a-cursor")
+
+
+class TestDispatchList:
+    """배차 목록 테스트"""
+
+    def test_constant_queries_for_any_page(self, list_db, statements):
+        first = list_dispatches(list_db, limit=5)
+        assert len(statements) == 3  # 본문 + 주문번호 + COUNT
+
+        statements.clear()
+        deep = list_dispatches(list_db, limit=5, cursor=first.next_cursor, count_mode="none")
+        assert len(statements) == 2
+        key = lambda item: (item["dispatch_date"], item["id"])  # noqa: E731
+        assert key(deep.items[0]) < key(first.items[-1])
+
+        ids = [item["id"] for page in _walk(list_dispatches, list_db, limit=5) for item in page.items]
+        assert sorted(ids) == list(range(1, DISPATCH_COUNT + 1)) and len(set(ids)) == DISPATCH_COUNT
+
+    def test_vehicle_driver_and_order_numbers(self, list_db):
+        items = {item["id"]: item for item in list_dispatches(list_db, limit=100).items}
+
+        assert (items[1]["vehicle_code"], items[1]["vehicle_plate"], items[1]["driver_name"]) == ("V2", "12가2", "기사1")
+        assert items[2]["driver_name"] == "차량기사1"  # 기사 미지정 -> 차량 운전자명
+        assert items[3]["order_numbers"] == "O003, O015"
+
+
+class TestListEndpoints:
+    """목록 API 테스트"""
+
+    @pytest.fixture
+    def client(self, list_db):
+        app = FastAPI()
+        app.include_router(orders_api.router, prefix="/orders")
+        app.include_router(dispatches_api.router, prefix="/dispatches")
+        app.dependency_overrides[get_db] = lambda: list_db
+        return TestClient(app)
+
+    def test_orders_and_dispatches_cursor(self, client):
+        body = client.get("/orders/", params={"limit": 10}).json()
+        assert body["total"] == ORDER_COUNT and len(body["items"]) == 10
+        assert body["items"][0]["pickup_client_name"] == "거래처1"
+
+        body = client.get("/orders/", params={"limit": 25, "cursor": body["next_cursor"], "count": "none"}).json()
+        assert body["total"] is None and body["next_cursor"] is None and len(body["items"]) == 20
+
+        body = client.get("/dispatches/", params={"limit": 100}).json()
+        assert body["total"] == DISPATCH_COUNT and body["next_cursor"] is None
+        assert body["items"][0]["order_numbers"]
+
+        assert client.get("/orders/", params={"cursor": "@@"}).status_code == 400
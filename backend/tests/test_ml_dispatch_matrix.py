@@ -0,0 +1,114 @@
+"""
+단위 테스트 - ML 배차 행렬 점수 계산 (sequential 모드와 결과 동일성)
+"""
+
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.order import TemperatureZone
+from app.models.vehicle import VehicleType, VehicleStatus
+from app.services.ml_dispatch_service import (
+    MLDispatchService, VehicleStateSnapshot, VehicleState
+)
+
+
+def _make_fleet(seed: int = 7, n_orders: int = 40, n_vehicles: int = 25):
+    """무작위 주문/차량 생성 (좌표 누락, 고정배차, 선호 하차지, 저전압 포함)"""
+    rng = random.Random(seed)
+    zones = list(TemperatureZone)
+    vehicle_types = list(VehicleType)
+
+    vehicles = []
+    for idx in range(n_vehicles):
+        vehicles.append(SimpleNamespace(
+            id=idx + 1,
+            code=f"V{idx + 1:03d}",
+            status=VehicleStatus.AVAILABLE if rng.random() > 0.1 else VehicleStatus.MAINTENANCE,
+            vehicle_type=rng.choice(vehicle_types),
+            max_pallets=rng.choice([10, 16, 20, 24]),
+            garage_latitude=None if idx % 11 == 0 else 37.3 + rng.random() * 0.5,
+            garage_longitude=126.8 + rng.random() * 0.5,
+            rotation_count_this_month=rng.randint(0, 20),
+            preferred_delivery_clients=[rng.randint(1, 8)] if idx % 3 == 0 else None,
+            is_one_way_fixed=idx % 6 == 0,
+        ))
+
+    orders = []
+    for idx in range(n_orders):
+        client_id = rng.randint(1, 8)
+        window = rng.choice([("08:00", "18:00"), ("22:00", "06:00"), (None, None), ("00:00", "00:30")])
+        orders.append(SimpleNamespace(
+            id=idx + 1,
+            order_number=f"ORD-{idx + 1:04d}",
+            temperature_zone=rng.choice(zones),
+            pallet_type=rng.choice(["11형", "12형"]),
+            pallet_count=rng.randint(1, 22),
+            pickup_latitude=None if idx % 13 == 0 else 37.3 + rng.random() * 0.5,
+            pickup_longitude=126.8 + rng.random() * 0.5,
+            delivery_latitude=37.3 + rng.random() * 0.5,
+            delivery_longitude=126.8 + rng.random() * 0.5,
+            delivery_client_id=client_id,
+            delivery_client=SimpleNamespace(
+                id=client_id,
+                unload_start_time=window[0],
+                unload_end_time=window[1],
+                blocked_vehicles=[rng.randint(1, n_vehicles)],
+            ),
+            is_fixed_dispatch=idx % 5 == 0,
+            fixed_vehicles=[rng.randint(1, n_vehicles)],
+        ))
+
+    now = datetime.now()
+    states = {
+        v.id: VehicleState(
+            latitude=37.4 + rng.random() * 0.3,
+            longitude=126.9 + rng.random() * 0.3,
+            recorded_at=now - timedelta(minutes=rng.choice([5, 30, 180])),
+            voltage=rng.choice([None, 27.0, 25.0, 23.0]),
+            engine_on=rng.random() > 0.5,
+        )
+        for v in vehicles if v.id % 4 != 0
+    }
+    return orders, vehicles, VehicleStateSnapshot(states)
+
+
+class TestMatrixScoring:
+    """행렬 점수 계산 테스트"""
+
+    async def test_matrix_matches_sequential(self):
+        """행렬 모드와 순차 모드의 순위/점수가 동일"""
+        orders, vehicles, snapshot = _make_fleet()
+        service = MLDispatchService(db=None, scoring_mode="sequential")
+
+        matrix_results = service.score_orders_matrix(orders, vehicles, snapshot)
+
+        for order, matrix_rankings in zip(orders, matrix_results):
+            sequential = await service.optimize_single_order(order, vehicles, snapshot=snapshot)
+
+            assert [r.vehicle.id for r in matrix_rankings] == [r.vehicle.id for r in sequential]
+            for m, s in zip(matrix_rankings, sequential):
+                assert m.total_score == pytest.approx(s.total_score, abs=1e-9)
+                assert m.agent_scores.distance == pytest.approx(s.agent_scores.distance, abs=1e-9)
+                assert m.agent_scores.time_window == pytest.approx(s.agent_scores.time_window, abs=1e-9)
+                assert m.agent_scores.preference == s.agent_scores.preference
+                assert m.agent_scores.voltage == s.agent_scores.voltage
+                assert m.reason.split(" (")[0] == s.reason.split(" (")[0]
+
+    async def test_optimize_dispatch_matrix_mode(self):
+        """optimize_dispatch가 행렬 모드에서 같은 구조를 반환"""
+        orders, vehicles, snapshot = _make_fleet(n_orders=5, n_vehicles=6)
+        service = MLDispatchService(db=None, scoring_mode="matrix")
+        service.load_vehicle_snapshot = lambda _vehicles: snapshot
+
+        results = await service.optimize_dispatch(orders, vehicles)
+
+        assert [r['order'] for r in results] == orders
+        assert all(isinstance(r['rankings'], list) for r in results)
+
+    def test_invalid_scoring_mode(self):
+        """알 수 없는 모드는 거부"""
+        with pytest.raises(ValueError):
+            MLDispatchService(db=None, scoring_mode="gpu")
@@ -0,0 +1,84 @@
+"""
+단위 테스트 - ML 배차 차량 상태 스냅샷
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from app.models.uvis_gps import VehicleGPSLog
+from app.services.ml_dispatch_service import (
+    VehicleStateSnapshot, DistanceOptimizer, VoltageSafetyChecker
+)
+
+
+@pytest.fixture
+def gps_db(table_sessionmaker):
+    """GPS 로그 테이블만 가진 SQLite 세션"""
+    session = table_sessionmaker(VehicleGPSLog)()
+
+    now = datetime.now()
+    for vehicle_id, minutes_ago, lat in [(1, 30, 37.50), (1, 5, 37.55), (2, 120, 37.40), (2, 90, 37.45)]:
+        session.add(VehicleGPSLog(
+            vehicle_id=vehicle_id,
+            tid_id=f"T{vehicle_id}",
+            bi_date="20260101",
+            bi_time="000000",
+            bi_x_position=str(lat),
+            bi_y_position="127.0",
+            latitude=lat,
+            longitude=127.0,
+            is_engine_on=True,
+            created_at=now - timedelta(minutes=minutes_ago)
+        ))
+    session.commit()
+
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session.statements = statements
+
+    yield session
+    session.close()
+    VehicleStateSnapshot.invalidate()
+
+
+class TestVehicleStateSnapshot:
+    """차량 상태 스냅샷 테스트"""
+
+    def test_loads_latest_row_per_vehicle_in_one_query(self, gps_db):
+        """차량별 최신 GPS를 쿼리 1회로 로드"""
+        snapshot = VehicleStateSnapshot.load(gps_db, [1, 2, 3])
+
+        assert len(gps_db.statements) == 1
+        assert snapshot.get(1).latitude == 37.55
+        assert snapshot.get(2).latitude == 37.45
+        assert snapshot.get(3) is None
+
+    def test_reuse_across_requests(self, gps_db):
+        """reuse_seconds 동안 스냅샷 재사용"""
+        VehicleStateSnapshot.load(gps_db, [1, 2], reuse_seconds=60)
+        VehicleStateSnapshot.load(gps_db, [1, 2], reuse_seconds=60)
+        VehicleStateSnapshot.load(gps_db, [1, 2, 3], reuse_seconds=60)
+
+        # 두 번째는 완전 재사용, 세 번째는 신규 차량(3)만 조회
+        assert len(gps_db.statements) == 2
+
+    async def test_agents_score_from_snapshot(self, gps_db):
+        """Agent가 스냅샷으로 점수 계산 (추가 쿼리 없음)"""
+        snapshot = VehicleStateSnapshot.load(gps_db, [1, 2])
+        gps_db.statements.clear()
+
+        vehicle = SimpleNamespace(id=1, code="V1", garage_latitude=37.0, garage_longitude=127.0)
+        stale_vehicle = SimpleNamespace(id=2, code="V2", garage_latitude=37.0, garage_longitude=127.0)
+
+        optimizer = DistanceOptimizer()
+        assert await optimizer._get_vehicle_location(vehicle, gps_db, snapshot) == (37.55, 127.0)
+        # 1시간 이상 지난 GPS는 차고지 사용
+        assert await optimizer._get_vehicle_location(stale_vehicle, gps_db, snapshot) == (37.0, 127.0)
+
+        checker = VoltageSafetyChecker(gps_db)
+        assert await checker.compute_score(vehicle, snapshot) == 1.0
+
+        assert gps_db.statements == []
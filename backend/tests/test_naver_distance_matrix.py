@@ -0,0 +1,152 @@
+"""
+단위 테스트 - Naver 거리 행렬 (로컬 스텁 서버)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from app.services.naver_map_service import (
+    NaverMapService, RoutePairCache, AsyncTokenBucket
+)
+
+
+FAIL_GOAL = "129.0756,35.1796"  # 부산행 요청은 실패 처리
+
+
+class _DirectionsStubHandler(BaseHTTPRequestHandler):
+    """Naver Directions API 스텁"""
+
+    requests = []
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        self.requests.append((params["start"][0], params["goal"][0]))
+
+        if params["goal"][0] == FAIL_GOAL:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        body = json.dumps({
+            "code": 0,
+            "route": {"trafast": [{"summary": {"distance": 12345, "duration": 1800000}}]}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def directions_stub():
+    """로컬 Directions 스텁 서버"""
+    _DirectionsStubHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _DirectionsStubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/driving", _DirectionsStubHandler.requests
+    server.shutdown()
+    server.server_close()
+
+
+def _service(url: str) -> NaverMapService:
+    return NaverMapService(
+        client_id="test-id",
+        client_secret="test-secret",
+        directions_url=url,
+        route_cache=RoutePairCache(ttl_seconds=60, redis_url=None)
+    )
+
+
+class TestNaverDistanceMatrix:
+    """Naver 거리 행렬 생성 테스트"""
+
+    async def test_matrix_uses_api_results(self, directions_stub):
+        """API 결과로 행렬 생성"""
+        url, requests = directions_stub
+        service = _service(url)
+        locations = [(37.5665, 126.9780), (37.4979, 127.0276), (37.4563, 126.7052)]
+
+        distance, duration = await service.create_distance_matrix(locations, batch_size=4)
+
+        assert len(requests) == 6
+        assert distance[0][1] == 12.35
+        assert duration[2][0] == 30
+        assert distance[1][1] == 0.0
+
+    async def test_cache_prevents_refetch(self, directions_stub):
+        """캐시된 위치 쌍은 다시 요청하지 않음"""
+        url, requests = directions_stub
+        service = _service(url)
+        locations = [(37.5665, 126.9780), (37.4979, 127.0276)]
+
+        await service.create_distance_matrix(locations)
+        await service.create_distance_matrix(locations)
+        await service.create_distance_matrix(locations + [(37.5665, 126.9780)])
+
+        assert len(requests) == 2
+
+    async def test_failed_pair_falls_back_to_simulation(self, directions_stub):
+        """실패한 쌍만 시뮬레이션 값 사용, 캐시에 저장하지 않음"""
+        url, requests = directions_stub
+        service = _service(url)
+        locations = [(37.5665, 126.9780), (35.1796, 129.0756)]
+
+        distance, _ = await service.create_distance_matrix(locations)
+        simulated = service._simulate_distance_and_duration(37.5665, 126.9780, 35.1796, 129.0756)
+
+        assert distance[1][0] == 12.35
+        assert distance[0][1] == simulated["distance_km"]
+
+        await service.create_distance_matrix(locations)
+        assert len(requests) == 3  # 실패 쌍만 재시도
+
+    async def test_without_credentials_is_simulated(self, directions_stub):
+        """API 키 미설정 시 HTTP 요청 없이 시뮬레이션"""
+        url, requests = directions_stub
+        service = _service(url)
+        service.client_id = None
+
+        distance, _ = await service.create_distance_matrix([(37.5, 127.0), (37.6, 127.1)])
+
+        assert not requests
+        assert distance[0][1] > 0
+
+
+class TestAsyncTokenBucket:
+    """토큰 버킷 테스트"""
+
+    async def test_rate_limit(self):
+        """버스트 이후에는 rate에 맞춰 대기"""
+        bucket = AsyncTokenBucket(rate=50, capacity=5)
+        started = time.monotonic()
+
+        for _ in range(10):
+            await bucket.acquire()
+
+        # 5개 버스트 + 나머지 5개는 초당 50개 → 최소 약 0.1초
+        assert time.monotonic() - started >= 0.09
+
+
+class TestRoutePairCache:
+    """위치 쌍 메모리 캐시 테스트"""
+
+    async def test_memory_cache_evicts_least_recently_used(self):
+        """한도를 넘으면 가장 오래 사용하지 않은 위치 쌍부터 제거"""
+        cache = RoutePairCache(ttl_seconds=60, redis_url=None, max_entries=2)
+        await cache.set_many({"a": {"distance": 1.0}, "b": {"distance": 2.0}})
+        await cache.get_many(["a"])  # a 사용 -> b 가 가장 오래됨
+
+        await cache.set_many({"c": {"distance": 3.0}})
+
+        assert list(await cache.get_many(["a", "b", "c"])) == ["a", "c"]
+        assert len(cache._memory) == 2
@@ -0,0 +1,208 @@
+"""
+단위 테스트 - 최적화 작업 큐
+"""
+
+import asyncio
+import queue
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api import optimization_jobs as optimization_jobs_api
+from app.api.auth import get_current_user
+from app.api.v1 import websocket as websocket_api
+from app.core.config import settings
+from app.models.user import UserRole
+from app.services import optimization_job_service as job_service_module
+from app.services import solver_pool
+from app.services.optimization_job_service import OptimizationJob, OptimizationJobService, JobStatus
+from app.websocket.connection_manager import manager
+
+
+class _FakeWebSocket:
+    """메시지를 기록하는 WebSocket 대역"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def send_json(self, message):
+        self.messages.append(message)
+
+
+@pytest.fixture
+def job_service(monkeypatch):
+    """스레드 모드 솔버 + 메모리 저장 작업 큐"""
+    monkeypatch.setattr(settings, "SOLVER_POOL_WORKERS", 0)
+    solver_pool.shutdown_solver_pool()
+    service = OptimizationJobService(max_concurrency=1, redis_url=None)
+    yield service
+    solver_pool.shutdown_solver_pool()
+
+
+async def _wait_finished(service, job_id, timeout=5.0):
+    async def _poll():
+        while True:
+            job = await service.get(job_id)
+            if job["status"] in (JobStatus.COMPLETED.value, JobStatus.FAILED.value):
+                return job
+            await asyncio.sleep(0.01)
+    return await asyncio.wait_for(_poll(), timeout)
+
+
+class TestOptimizationJobService:
+    """최적화 작업 큐 테스트"""
+
+    async def test_submit_returns_immediately_and_keeps_result(self, job_service):
+        """등록 즉시 반환, 완료 후 결과 조회"""
+        release = asyncio.Event()
+
+        async def runner(job):
+            await release.wait()
+            return {"routes": 3}
+
+        job = await job_service.submit("dispatch_optimization", runner, params={"order_ids": [1, 2]}, user_id=7)
+        assert job.status == JobStatus.QUEUED
+
+        release.set()
+        finished = await _wait_finished(job_service, job.job_id)
+
+        assert finished["status"] == "completed"
+        assert finished["result"] == {"routes": 3}
+        assert finished["progress"] == 100.0
+        assert job_service.list_jobs(user_id=7)[0]["job_id"] == job.job_id
+        assert "result" not in job_service.list_jobs()[0]
+
+    async def test_concurrency_is_capped(self, job_service):
+        """동시 실행 수 제한"""
+        running = 0
+        peak = 0
+
+        async def runner(job):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        jobs = [await job_service.submit("ml_dispatch", runner) for _ in range(4)]
+        for job in jobs:
+            await _wait_finished(job_service, job.job_id)
+
+        assert peak == 1
+
+    async def test_failed_job_records_error(self, job_service):
+        """실패한 작업은 오류 메시지 보존"""
+        async def runner(job):
+            raise ValueError("사용 가능한 차량이 없습니다")
+
+        job = await job_service.submit("dispatch_optimization", runner)
+        finished = await _wait_finished(job_service, job.job_id)
+
+        assert finished["status"] == "failed"
+        assert finished["error"] == "사용 가능한 차량이 없습니다"
+
+    async def test_solver_progress_streams_to_channel(self, job_service):
+        """솔버 진행 상황이 작업 채널로 스트리밍"""
+        websocket = _FakeWebSocket()
+        release = asyncio.Event()
+
+        async def runner(job):
+            reporter = job_service.solver_progress(job.job_id, min_interval=0)
+            await asyncio.to_thread(reporter, 1500)
+            await asyncio.to_thread(reporter, 1200)
+            await release.wait()
+            return {}
+
+        job = await job_service.submit("dispatch_optimization", runner)
+        channel = job_service.job_channel(job.job_id)
+        manager.active_connections[channel]["test"] = websocket
+        try:
+            async def _wait_progress():
+                while job.solutions_found < 2:
+                    await asyncio.sleep(0.01)
+            await asyncio.wait_for(_wait_progress(), 5)
+            release.set()
+            await _wait_finished(job_service, job.job_id)
+        finally:
+            manager.active_connections.pop(channel, None)
+
+        events = [m["type"] for m in websocket.messages]
+        assert "job_progress" in events
+        assert events[-1] == "job_completed"
+        assert job.best_cost == 1200
+        await job_service.stop()
+
+
+class TestJobAccess:
+    """작업 조회 권한 테스트 (등록자 또는 관리자)"""
+
+    OWNER = SimpleNamespace(id=1, role=UserRole.DISPATCHER, is_superuser=False, is_active=True)
+    OTHER = SimpleNamespace(id=2, role=UserRole.DISPATCHER, is_superuser=False, is_active=True)
+    ADMIN = SimpleNamespace(id=3, role=UserRole.ADMIN, is_superuser=False, is_active=True)
+
+    @pytest.fixture
+    def client(self, job_service, monkeypatch):
+        job = OptimizationJob(job_id="job-1", kind="ml_dispatch", params={"order_ids": [1]}, user_id=1)
+        job_service._jobs[job.job_id] = job
+        monkeypatch.setattr(job_service_module, "optimization_job_service", job_service)
+        monkeypatch.setattr(optimization_jobs_api, "optimization_job_service", job_service)
+
+        users = {"owner": self.OWNER, "other": self.OTHER, "admin": self.ADMIN}
+
+        async def fake_websocket_user(token, db):
+            return users.get(token)
+
+        monkeypatch.setattr(websocket_api, "get_current_user_websocket", fake_websocket_user)
+
+        app = FastAPI()
+        app.include_router(optimization_jobs_api.router)
+        app.include_router(websocket_api.router, prefix="/ws")
+        client = TestClient(app)
+        client.login = lambda user: app.dependency_overrides.__setitem__(get_current_user, lambda: user)
+        return client
+
+    def test_get_job_requires_owner_or_admin(self, client):
+        client.login(self.OWNER)
+        assert client.get("/optimization-jobs/job-1").json()["params"] == {"order_ids": [1]}
+        assert [job["job_id"] for job in client.get("/optimization-jobs").json()["jobs"]] == ["job-1"]
+
+        client.login(self.OTHER)
+        assert client.get("/optimization-jobs/job-1").status_code == 403
+        assert client.get("/optimization-jobs").json()["jobs"] == []  # 관리자가 아니면 내 작업만
+
+        client.login(self.ADMIN)
+        assert client.get("/optimization-jobs/job-1").status_code == 200
+
+    @pytest.mark.parametrize("token", [None, "invalid", "other"])
+    def test_websocket_rejects_non_owner(self, client, token):
+        url = "/ws/optimization-jobs/job-1" + (f"?token={token}" if token else "")
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect(url) as websocket:
+                websocket.receive_json()
+        assert exc_info.value.code == 1008
+
+    def test_websocket_sends_snapshot_to_owner(self, client):
+        with client.websocket_connect("/ws/optimization-jobs/job-1?token=owner") as websocket:
+            assert websocket.receive_json()["type"] == "connected"
+            message = websocket.receive_json()
+        assert message["type"] == "job_snapshot" and message["job"]["job_id"] == "job-1"
+
+
+class TestSolverProgressReporter:
+    """솔버 진행 상황 전달자 테스트"""
+
+    def test_throttles_messages(self):
+        """min_interval 안의 호출은 큐에 넣지 않음"""
+        progress_queue = queue.Queue()
+        reporter = solver_pool.SolverProgressReporter(progress_queue, "job-1", min_interval=60)
+
+        reporter(300)
+        reporter(200)
+
+        item = progress_queue.get_nowait()
+        assert item["key"] == "job-1"
+        assert item["best_cost"] == 300
+        assert progress_queue.empty()
@@ -0,0 +1,189 @@
+"""
+단위 테스트 - 기사 / 차량 / 고객 랭킹 (집계 쿼리 1회 / 단건 평가와 동일 점수 / top-N)
+"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.models.billing import Invoice, InvoiceLineItem
+from app.models.client import Client, ClientType
+from app.models.dispatch import Dispatch, DispatchRoute, RouteType
+from app.models.driver import Driver
+from app.models.order import Order, OrderStatus, TemperatureZone
+from app.models.vehicle import Vehicle, VehicleType
+from app.services.customer_analytics import CustomerSatisfactionAnalytics
+from app.services.driver_evaluation import DriverEvaluationSystem
+from app.services.vehicle_analytics import VehiclePerformanceAnalytics
+
+
+START, END = datetime(2025, 3, 1), datetime(2025, 3, 10)  # 직전 기간: 02/20 ~ 02/28
+
+
+@pytest.fixture
+def ranking_db(table_sessionmaker):
+    session = table_sessionmaker(
+        Client, Vehicle, Driver, Order, Dispatch, DispatchRoute, Invoice, InvoiceLineItem,
+    )()
+    for idx in (1, 2, 3):
+        session.add(Client(code=f"C{idx}", name=f"C{idx}", client_type=ClientType.BOTH, address="서울"))
+        session.add(Vehicle(code=f"V{idx}", plate_number=f"V{idx}", vehicle_type=VehicleType.FROZEN,
+                            max_pallets=16, max_weight_kg=10000, tonnage=5.0))
+        session.add(Driver(code=f"D{idx}", name=f"D{idx}", phone="010"))
+
+    orders = [
+        # (client, order_date, status, requested_delivery_date, updated_at)
+        (1, date(2025, 3, 2), OrderStatus.DELIVERED, date(2025, 3, 3), datetime(2025, 3, 3, 9)),
+        (1, date(2025, 3, 2), OrderStatus.DELIVERED, date(2025, 3, 3), datetime(2025, 3, 5, 9)),  # 지연
+        (1, date(2025, 3, 3), OrderStatus.CANCELLED, None, datetime(2025, 3, 3, 9)),
+        (2, date(2025, 3, 4), OrderStatus.DELIVERED, None, datetime(2025, 3, 4, 21)),
+        (2, date(2025, 3, 4), OrderStatus.PENDING, None, datetime(2025, 3, 4, 9)),
+        (1, date(2025, 2, 25), OrderStatus.DELIVERED, None, datetime(2025, 2, 25, 9)),  # 직전 기간
+    ]
+    for idx, (client_id, order_date, status, due, updated_at) in enumerate(orders, 1):
+        session.add(Order(order_number=f"O{idx}", order_date=order_date, temperature_zone=TemperatureZone.FROZEN,
+                          pickup_client_id=client_id, delivery_client_id=3, pallet_count=1, status=status,
+                          requested_delivery_date=due, created_at=datetime.combine(order_date, datetime.min.time()).replace(hour=9),
+                          updated_at=updated_at))
+
+    dispatches = [
+        # (dispatch_date, vehicle, driver, total_pallets, distance, delivered order ids)
+        (date(2025, 3, 2), 1, 1, 8, 100.0, [1, 2]),
+        (date(2025, 3, 3), 1, 1, 20, 50.0, [3]),
+        (date(2025, 3, 4), 2, 2, 4, 30.0, [4, 5]),
+        (date(2025, 2, 20), 2, 2, 16, 80.0, [6]),  # 범위 밖
+    ]
+    for idx, (day, vehicle_id, driver_id, pallets, distance, order_ids) in enumerate(dispatches, 1):
+        session.add(Dispatch(dispatch_number=f"DSP-{idx}", dispatch_date=day, vehicle_id=vehicle_id,
+                             driver_id=driver_id, total_pallets=pallets, total_distance_km=distance))
+        session.flush()
+        session.add(DispatchRoute(dispatch_id=idx, sequence=0, route_type=RouteType.PICKUP, order_id=order_ids[0],
+                                  location_name="상차", address="서울", latitude=37.5, longitude=127.0))
+        for seq, order_id in enumerate(order_ids, 1):
+            session.add(DispatchRoute(dispatch_id=idx, sequence=seq, route_type=RouteType.DELIVERY, order_id=order_id,
+                                      location_name="하차", address="서울", latitude=37.5, longitude=127.0))
+
+    for client_id, dispatch_id, amount in ((1, 1, 100000.0), (2, 3, 500000.0)):
+        session.add(Invoice(invoice_number=f"INV-{client_id}", client_id=client_id,
+                            billing_period_start=date(2025, 3, 1), billing_period_end=date(2025, 3, 31),
+                            issue_date=date(2025, 4, 1), due_date=date(2025, 5, 1)))
+        session.flush()
+        session.add(InvoiceLineItem(invoice_id=client_id, dispatch_id=dispatch_id, description="D",
+                                    unit_price=amount, amount=amount))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(ranking_db):
+    executed = []
+    engine = ranking_db.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class TestDriverRankings:
+    """기사 랭킹 테스트"""
+
+    def test_rankings_in_one_query_match_single_evaluation(self, ranking_db, statements):
+        system = DriverEvaluationSystem(ranking_db)
+
+        rankings = system.get_driver_rankings(START, END)
+
+        assert len(statements) == 1
+        assert [(r["driver_name"], r["rank"], r["overall_score"], r["grade"]) for r in rankings] == [
+            ("D2", 1, 71.75, "B (보통)"),
+            ("D1", 2, 57.42, "D (긴급 개선 필요)"),
+        ]
+        assert rankings[1]["scores"] == {
+            "delivery_completion": 66.67, "on_time_delivery": 50.0, "efficiency": 30.0,
+            "safety": 90.0, "customer_satisfaction": 58.33,
+        }
+        for ranked in rankings:
+            single = system.evaluate_driver(ranked["driver_id"], START, END)
+            assert {k: v for k, v in ranked.items() if k != "rank"} == single
+
+        assert "message" in system.evaluate_driver(3, START, END)
+        assert "error" in system.evaluate_driver(99, START, END)
+
+    def test_top_n(self, ranking_db):
+        top = DriverEvaluationSystem(ranking_db).get_driver_rankings(START, END, limit=1)
+
+        assert [(r["driver_name"], r["rank"]) for r in top] == [("D2", 1)]
+
+
+class TestVehicleRankings:
+    """차량 랭킹 테스트"""
+
+    def test_fleet_summary_in_one_query_match_single_report(self, ranking_db, statements):
+        analytics = VehiclePerformanceAnalytics(ranking_db)
+
+        summary = analytics.get_fleet_performance_summary(START, END, top_n=1)
+
+        assert len(statements) == 1
+        fleet = summary["all_vehicles"]
+        assert [(v["vehicle_number"], v["efficiency_score"], v["utilization_rate"], v["average_load_rate"])
+                for v in fleet] == [
+            ("V1", 74.67, 20.0, 75.0),   # 적재 (50 + 100) / 2, 완료 2/3
+            ("V2", 48.0, 10.0, 25.0),    # 적재 4/16, 완료 1/2
+            ("V3", 0.0, 0.0, 0.0),       # 배차 없음
+        ]
+        assert fleet[0]["total_distance_km"] == 150.0
+        assert summary["average_efficiency_score"] == 40.89
+        assert [v["vehicle_number"] for v in summary["top_performers"] + summary["low_performers"]] == ["V1", "V3"]
+        for report in fleet:
+            assert analytics.get_vehicle_performance_report(report["vehicle_id"], START, END) == report
+
+        comparison = analytics.compare_vehicles([2, 1], START, END)
+        assert [v["vehicle_number"] for v in comparison["vehicles"]] == ["V2", "V1"]
+        assert comparison["insights"]["most_efficient"] == "V1"
+
+    def test_maintenance_alerts(self, ranking_db, statements):
+        alerts = VehiclePerformanceAnalytics(ranking_db).get_vehicle_maintenance_alerts()
+
+        assert len(statements) == 1
+        assert [(a["vehicle_number"], a["alert_level"]) for a in alerts] == [
+            ("V1", "critical"), ("V2", "critical"), ("V3", "critical"),
+        ]
+
+
+class TestCustomerRankings:
+    """고객 랭킹 테스트"""
+
+    def test_top_customers_in_one_query_match_single_analysis(self, ranking_db, statements):
+        analytics = CustomerSatisfactionAnalytics(ranking_db)
+
+        top = analytics.get_top_customers(START, END, limit=2)
+
+        assert len(statements) == 1
+        assert [(c["partner_name"], c["total_revenue"], c["satisfaction_score"], c["loyalty_score"]) for c in top] == [
+            ("C2", 500000.0, 80.0, 70.0),     # 신규 고객
+            ("C1", 100000.0, 66.67, 100.0),   # 3건 vs 직전 1건
+        ]
+        assert [c["partner_name"] for c in analytics.get_top_customers(START, END, limit=1)] == ["C2"]
+
+        single = analytics.analyze_customer_satisfaction(1, START, END)
+        assert single["satisfaction_score"] == top[1]["satisfaction_score"]
+        assert single["metrics"] == {
+            "on_time_delivery_rate": 50.0, "order_completion_rate": 66.67, "avg_delivery_time_hours": 48.0,
+            "temperature_violations": 0, "loyalty_score": 100.0,
+        }
+        assert single["statistics"] == {"total_orders": 3, "completed_orders": 2, "cancelled_orders": 1,
+                                        "pending_orders": 0}
+        assert "message" in analytics.analyze_customer_satisfaction(3, START, END)
+
+    def test_churn_risk(self, ranking_db, statements):
+        at_risk = CustomerSatisfactionAnalytics(ranking_db).get_churn_risk_customers(START, END)
+
+        assert len(statements) == 1
+        assert [(c["partner_name"], c["risk_level"], c.get("last_order_date")) for c in at_risk] == [
+            ("C3", "high", None),
+            ("C1", "medium", "2025-03-03"),
+        ]
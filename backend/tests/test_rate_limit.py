@@ -0,0 +1,158 @@
+"""
+단위 테스트 - Rate Limiting (GCRA / 정책 선택 / ASGI 미들웨어 / Redis 장애 대체)
+"""
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.middleware.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimiter,
+    RateLimitMiddleware,
+    RateLimitPolicy,
+    RedisRateLimitBackend,
+    RouteRateLimit,
+)
+from app.middleware.security import create_rate_limiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter(
+        default_policy=RateLimitPolicy("default", 6, 60.0),
+        backend=MemoryRateLimitBackend(clock=clock),
+        route_policies=[RouteRateLimit("/auth/login", RateLimitPolicy("login", 2, 60.0), frozenset({"POST"}))],
+        api_key_policies={"partner-key": RateLimitPolicy("partner", 100, 60.0)},
+    )
+
+
+async def _hit(limiter, path="/orders", ip="1.1.1.1", method="GET", api_key=None):
+    return await limiter.hit(method, path, ip, api_key)
+
+
+class TestGCRA:
+    """GCRA 판정 테스트"""
+
+    async def test_limit_then_smooth_refill(self, limiter, clock):
+        results = [await _hit(limiter) for _ in range(7)]
+
+        assert [r.allowed for r in results] == [True] * 6 + [False]
+        assert [r.remaining for r in results[:6]] == [5, 4, 3, 2, 1, 0]
+        assert results[6].retry_after == pytest.approx(10.0)  # 60초 / 6건
+        assert results[5].reset_after == pytest.approx(60.0)
+
+        clock.now += 9.9
+        assert not (await _hit(limiter)).allowed
+        clock.now += 0.1
+        assert (await _hit(limiter)).allowed     # 1건분 회복
+        assert not (await _hit(limiter)).allowed
+
+        clock.now += 60
+        assert (await _hit(limiter)).remaining == 5  # 완전히 회복
+
+    async def test_policies_are_separate_counters(self, limiter):
+        assert [(await _hit(limiter, "/auth/login", method="POST")).allowed for _ in range(3)] == [True, True, False]
+        assert (await _hit(limiter, "/auth/login", method="GET")).allowed        # 메서드 불일치 -> 기본 정책
+        assert (await _hit(limiter, "/orders", ip="2.2.2.2")).remaining == 5      # IP 별 카운터
+
+        partner = [await _hit(limiter, api_key="partner-key") for _ in range(10)]
+        assert all(r.allowed and r.limit == 100 for r in partner)
+        assert (await _hit(limiter, api_key="other-key")).limit == 6             # 미등록 키 -> 기본 정책
+
+    async def test_rotating_unknown_keys_share_ip_counter(self, limiter):
+        login = [(await _hit(limiter, "/auth/login", method="POST", api_key=f"k{i}")).allowed for i in range(5)]
+        assert login == [True, True, False, False, False]
+
+        results = [await _hit(limiter, ip="3.3.3.3", api_key=f"rotated-{i}") for i in range(7)]
+        assert [r.allowed for r in results] == [True] * 6 + [False]
+        assert not (await _hit(limiter, ip="3.3.3.3")).allowed  # 헤더 없이도 같은 IP 카운터
+
+    def test_memory_backend_purges_recovered_keys(self, clock):
+        backend = MemoryRateLimitBackend(clock=clock)
+        policy = RateLimitPolicy("default", 10, 1.0)
+        for idx in range(100):
+            backend.hit_sync(f"ip:{idx}", policy)
+        assert len(backend) == 100
+
+        clock.now += MemoryRateLimitBackend.PURGE_INTERVAL_SECONDS
+        backend.hit_sync("ip:new", policy)
+        assert len(backend) == 1
+
+    async def test_redis_unavailable_falls_back_to_memory(self, clock):
+        backend = RedisRateLimitBackend("redis://127.0.0.1:1/0", fallback=MemoryRateLimitBackend(clock=clock))
+        policy = RateLimitPolicy("default", 2, 60.0)
+
+        results = [await backend.hit("ip:1", policy) for _ in range(3)]
+
+        assert [r.allowed for r in results] == [True, True, False]
+        assert backend._script is None and backend._redis_retry_at > 0
+
+    def test_api_key_limits_from_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_BACKEND", "memory")
+        monkeypatch.setattr(settings, "RATE_LIMIT_API_KEYS", {"partner-key": 500})
+
+        limiter = create_rate_limiter()
+
+        policy, key = limiter.resolve("GET", "/orders", "1.1.1.1", "partner-key")
+        assert policy.limit == 500 and key.startswith("api_key:key:")
+        assert limiter.resolve("GET", "/orders", "1.1.1.1", "other-key")[0] is limiter.default_policy
+
+
+class TestRateLimitMiddleware:
+    """미들웨어 테스트"""
+
+    @pytest.fixture
+    def client(self, limiter):
+        app = FastAPI()
+
+        @app.get("/orders")
+        async def orders():
+            return {"ok": True}
+
+        @app.get("/health")
+        async def health():
+            return {"status": "healthy"}
+
+        @app.websocket("/ws/echo")
+        async def echo(websocket: WebSocket):
+            await websocket.accept()
+            await websocket.send_text(await websocket.receive_text())
+            await websocket.close()
+
+        app.add_middleware(RateLimitMiddleware, limiter=limiter)
+        return TestClient(app)
+
+    def test_headers_and_429(self, client):
+        responses = [client.get("/orders") for _ in range(7)]
+
+        assert [r.status_code for r in responses] == [200] * 6 + [429]
+        assert responses[0].headers["x-ratelimit-limit"] == "6"
+        assert responses[0].headers["x-ratelimit-remaining"] == "5"
+        assert responses[6].headers["retry-after"] == "10"
+        assert responses[6].json()["retry_after"] == 10
+
+        assert client.get("/orders", headers={"X-Forwarded-For": "9.9.9.9, 10.0.0.1"}).status_code == 200
+
+    def test_exempt_paths_and_websocket_pass_through(self, client):
+        for _ in range(10):
+            assert client.get("/health").status_code == 200
+            with client.websocket_connect("/ws/echo") as websocket:
+                websocket.send_text("ping")
+                assert websocket.receive_text() == "ping"
+
+        assert client.get("/orders").headers["x-ratelimit-remaining"] == "5"
@@ -0,0 +1,169 @@
+"""
+단위 테스트 - 보고서 생성 (집계 1회 조회 / write-only 엑셀 / 청크 스트리밍)
+"""
+
+from datetime import date
+from io import BytesIO
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import event
+
+from app.models.client import Client, ClientType
+from app.models.dispatch import Dispatch, DispatchStatus
+from app.models.driver import Driver
+from app.models.order import Order, OrderStatus, TemperatureZone
+from app.models.vehicle import Vehicle, VehicleType
+from app.services.excel_generator import ExcelReportGenerator
+from app.services.export_service import FinancialReportExporter
+from app.services.report_data_service import ReportDataService, iter_chunks
+from app.services.report_generator import PDFReportGenerator
+from app.services.temperature_report_export import TemperatureReportExporter
+
+
+START, END = date(2026, 10, 1), date(2026, 10, 10)
+
+
+@pytest.fixture
+def report_db(table_sessionmaker):
+    """차량 2대 / 기사 2명, 기간 내 배차 3건 + 기간 밖 1건"""
+    session = table_sessionmaker(Vehicle, Driver, Dispatch, Client, Order)()
+    for idx in (1, 2):
+        session.add(Vehicle(code=f"V{idx}", plate_number=f"V{idx}", vehicle_type=VehicleType.FROZEN,
+                            max_pallets=16, max_weight_kg=10000, tonnage=5.0))
+        session.add(Driver(code=f"D{idx}", name=f"driver{idx}", phone="010"))
+    session.add(Client(code="C1", name="client1", client_type=ClientType.BOTH, address="서울"))
+    session.flush()
+    dispatches = [
+        (1, 1, date(2026, 10, 2), 8, 3, 100.0, DispatchStatus.COMPLETED),
+        (1, 1, date(2026, 10, 3), 16, 1, 50.0, DispatchStatus.IN_PROGRESS),
+        (2, 2, date(2026, 10, 4), 4, 2, None, DispatchStatus.COMPLETED),
+        (2, 2, date(2026, 11, 1), 16, 9, 999.0, DispatchStatus.COMPLETED),
+    ]
+    for idx, (vehicle_id, driver_id, day, pallets, orders, distance, status) in enumerate(dispatches):
+        session.add(Dispatch(
+            dispatch_number=f"DSP-{idx}", dispatch_date=day, vehicle_id=vehicle_id, driver_id=driver_id,
+            total_pallets=pallets, total_orders=orders, total_distance_km=distance, status=status
+        ))
+    for idx, status in enumerate((OrderStatus.DELIVERED, OrderStatus.PENDING)):
+        session.add(Order(
+            order_number=f"O{idx}", order_date=date(2026, 10, 5), temperature_zone=TemperatureZone.FROZEN,
+            pickup_client_id=1, delivery_client_id=1, pallet_count=1, status=status
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(report_db):
+    executed = []
+    engine = report_db.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class TestReportData:
+    """보고서 집계 테스트"""
+
+    def test_vehicle_performance_in_one_query(self, report_db, statements):
+        rows = ReportDataService(report_db).vehicle_performance(START, END)
+
+        assert len(statements) == 1
+        assert [(r["vehicle_number"], r["total_dispatches"], r["total_distance_km"]) for r in rows] == [
+            ("V1", 2, 150.0), ("V2", 1, 0.0),
+        ]
+        assert rows[0]["utilization"] == 20.0
+        assert rows[0]["avg_load"] == 75.0
+
+    def test_driver_and_customer_aggregates(self, report_db):
+        data = ReportDataService(report_db)
+
+        drivers = data.driver_evaluation(START, END)
+        assert [(d["driver_name"], d["total_dispatches"], d["completed"], d["avg_orders"]) for d in drivers] == [
+            ("driver1", 2, 1, 2.0), ("driver2", 1, 1, 2.0),
+        ]
+        assert data.driver_evaluation(START, END, driver_id=2)[0]["completion_rate"] == 100.0
+
+        customers = data.customer_satisfaction(START, END)
+        assert [(c["client_name"], c["total_orders"], c["completed"], c["satisfaction"]) for c in customers] == [
+            ("client1", 2, 1, 50.0),
+        ]
+        assert data.dispatch_status_counts(START, END) == {
+            DispatchStatus.COMPLETED: 2, DispatchStatus.IN_PROGRESS: 1,
+        }
+
+
+class TestReportOutput:
+    """보고서 파일 출력 테스트"""
+
+    def test_write_only_excel(self, report_db):
+        buffer = ExcelReportGenerator(report_db).generate_dispatch_report(START, END)
+        workbook = load_workbook(BytesIO(b"".join(iter_chunks(buffer, chunk_size=1024))))
+
+        assert workbook.sheetnames == ["Summary", "Dispatch Details", "Charts"]
+        details = list(workbook["Dispatch Details"].values)
+        assert [row[0] for row in details] == ["Dispatch Number", "DSP-0", "DSP-1", "DSP-2"]
+        assert details[1][2:4] == ("V1", "driver1")
+        assert list(workbook["Summary"].values)[4] == ("Total Dispatches", 3)
+        assert len(workbook["Charts"]._charts) == 1
+        assert buffer.closed
+
+    def test_pdf_reports(self, report_db):
+        generator = PDFReportGenerator(report_db)
+        for buffer in (
+            generator.generate_dispatch_report(START, END),
+            generator.generate_vehicle_performance_report(START, END, vehicle_id=1),
+            generator.generate_driver_evaluation_report(START, END),
+        ):
+            chunks = list(iter_chunks(buffer, chunk_size=512))
+            assert len(chunks) > 1
+            assert chunks[0].startswith(b"%PDF")
+
+    def test_financial_excel(self):
+        buffer = FinancialReportExporter().generate_excel(
+            {"total_revenue": 1000, "collected_amount": 800, "collection_rate": 80},
+            [{"month": "2024-01", "revenue": 1000, "collected": 800, "profit": 200}],
+            [{"client_name": "C1", "total_revenue": 1000, "invoice_count": 2, "collection_rate": 80}],
+            START, END,
+        )
+        workbook = load_workbook(BytesIO(b"".join(iter_chunks(buffer))))
+
+        assert workbook.sheetnames == ["재무 요약", "월별 추이", "TOP 10 거래처"]
+        summary = workbook["재무 요약"]
+        assert "A1:D1" in summary.merged_cells
+        assert summary["A5"].value == "항목"
+        assert summary["B6"].value == 1000 and summary["B6"].number_format == "#,##0"
+        assert summary["C9"].value is None
+        trends = workbook["월별 추이"]
+        assert [cell.value for cell in trends[4]] == ["2024-01", 1000, 800, 80, 200]
+        assert len(trends._charts) == 1
+        assert workbook["TOP 10 거래처"]["B4"].value == "C1"
+
+    def test_temperature_performance_excel(self, report_db, monkeypatch):
+        exporter = TemperatureReportExporter(report_db)
+        metrics = {
+            "sensor_a": {"compliance_rate": 90, "stability": 1.0},
+            "sensor_b": {"compliance_rate": 80, "stability": 3.0},
+            "data_collection_rate": 99,
+        }
+        monkeypatch.setattr(exporter.analytics, "get_performance_scores", lambda days: [
+            {"vehicle_number": "V1", "score": 50, "grade": "D", "metrics": metrics, "recommendations": []},
+            {"vehicle_number": "V2", "score": 95, "grade": "A", "metrics": metrics, "recommendations": ["a", "b", "c"]},
+            {"vehicle_number": "V3", "score": 0, "grade": "N/A", "metrics": {}, "recommendations": []},
+        ])
+
+        workbook = load_workbook(BytesIO(b"".join(iter_chunks(exporter.generate_performance_report(7)))))
+
+        ws = workbook["차량 성능 순위"]
+        assert "A1:H1" in ws.merged_cells
+        assert ws["A3"].value == "순위"
+        assert [row[1] for row in ws.iter_rows(min_row=4, values_only=True)] == ["V2", "V1"]
+        assert ws["H4"].value == "a; b"
+        assert ws["C4"].fill.fgColor.rgb.endswith("C6EFCE")
+        assert ws.column_dimensions["H"].width == 50
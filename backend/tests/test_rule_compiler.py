@@ -0,0 +1,145 @@
+"""
+단위 테스트 - 배차 규칙 컴파일 / 캐시 (1회 컴파일 / 커밋 시 무효화 / 일괄 평가)
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+
+from app.models.client import Client, ClientType
+from app.models.dispatch_rule import DispatchRule
+from app.models.order import Order, TemperatureZone
+from app.services.rule_compiler import compile_conditions, compiled_rule_cache
+from app.services.rule_engine import RuleEngine
+from app.services.rule_evaluator import RuleEvaluator
+from app.services.rule_parser import RuleParser
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+RULES = [
+    # (name, rule_type, priority, conditions, actions)
+    ("heavy", "constraint", 10, {"order.total_weight_kg": {"gte": 500}}, {"require_vehicle_capacity_kg": 1000}),
+    ("frozen", "assignment", 5, {"AND": [{"order.temperature_zone": "냉동"}, {"order.total_pallets": {"$lte": 10}}]},
+     {"assign_to": "nearest_available_vehicle"}),
+    ("vip", "assignment", 1, {"client.name": {"startswith": "VIP"}}, {"notify_dispatcher": True}),
+]
+
+
+@pytest.fixture
+def rule_db(table_sessionmaker):
+    session = table_sessionmaker(Client, Order, DispatchRule)()
+    for name, rule_type, priority, conditions, actions in RULES:
+        session.add(DispatchRule(name=name, rule_type=rule_type, priority=priority,
+                                 conditions=conditions, actions=actions))
+    session.add(DispatchRule(name="inactive", rule_type="constraint", priority=99, is_active=False,
+                             conditions={}, actions={"x": 1}))
+    session.commit()
+    compiled_rule_cache.clear()
+    yield session
+    session.close()
+    compiled_rule_cache.clear()
+
+
+def _context(weight, zone, pallets, client="ACME"):
+    return {
+        "order": {"total_weight_kg": weight, "temperature_zone": zone, "total_pallets": pallets},
+        "client": {"name": client},
+    }
+
+
+def _names(matched):
+    return [mr["rule"].name for mr in matched]
+
+
+class TestCompileConditions:
+    """조건 컴파일 테스트"""
+
+    @pytest.mark.parametrize("conditions", [
+        {},
+        {"order.total_weight_kg": {"gt": 100, "lt": 1000}},
+        {"OR": [{"order.temperature_zone": "냉장"}, {"NOT": {"order.total_pallets": {"in": [1, 2]}}}]},
+        {"if": {"order.total_weight_kg": {"between": [100, 600]}, "OR": [{"client.name": {"contains": "C"}}]}},
+        {"order.missing.deep": {"ne": None}},
+        {"order.total_pallets": {"gt": "2 * 3"}},
+        {"client.name": {"regex": "^AC"}},
+    ])
+    def test_matches_rule_parser(self, conditions):
+        parser = RuleParser()
+        predicate = compile_conditions(conditions)
+        for context in (_context(500, "냉동", 2), _context(50, "냉장", 8, client="VIP-1"), _context(None, None, None)):
+            assert predicate(context) == parser.parse_conditions(conditions, context)
+
+    def test_unknown_operator_fails_at_compile_time(self):
+        with pytest.raises(ValueError):
+            compile_conditions({"order.total_weight_kg": {"near": 1}})
+
+
+class TestCompiledRuleCache:
+    """규칙 캐시 테스트"""
+
+    def test_compile_once_and_no_queries_while_cached(self, rule_db):
+        evaluator = RuleEvaluator(rule_db)
+        assert _names(evaluator.evaluate_rules(_context(800, "냉동", 4, client="VIP-7"))) == ["heavy", "frozen", "vip"]
+        assert compiled_rule_cache.compile_count == 3
+
+        statements = []
+        event.listen(rule_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+        for _ in range(20):
+            evaluator.evaluate_rules(_context(100, "냉장", 4), rule_type="assignment")
+        RuleEvaluator(rule_db).evaluate_batch([_context(i, "냉동", i % 20) for i in range(5000)])
+
+        assert compiled_rule_cache.compile_count == 3
+        assert statements == []
+
+    def test_commit_invalidates_only_changed_rules(self, rule_db):
+        evaluator = RuleEvaluator(rule_db)
+        evaluator.evaluate_rules(_context(800, "냉동", 4))
+
+        # 실행 통계 갱신은 무효화하지 않음
+        evaluator._update_rule_stats(1, success=True, execution_time_ms=3)
+        assert compiled_rule_cache._signature is not None
+
+        rule = rule_db.get(DispatchRule, 1)
+        rule.conditions = {"order.total_weight_kg": {"gte": 1000}}
+        rule.version += 1
+        rule_db.commit()
+
+        assert _names(evaluator.evaluate_rules(_context(800, "냉동", 4))) == ["frozen"]
+        assert compiled_rule_cache.compile_count == 4
+
+        rule_db.get(DispatchRule, 4).is_active = True
+        rule_db.commit()
+        assert _names(evaluator.evaluate_rules(_context(800, "냉동", 4)))[0] == "inactive"
+        assert compiled_rule_cache.compile_count == 5
+
+    def test_batch_matches_per_context_evaluation(self, rule_db):
+        evaluator = RuleEvaluator(rule_db)
+        contexts = [_context(i * 37 % 900, ("냉동", "냉장")[i % 2], i % 15, client=f"VIP-{i}" if i % 3 else "A")
+                    for i in range(300)]
+
+        batch = evaluator.evaluate_batch(contexts)
+
+        assert [_names(matched) for matched in batch] == [_names(evaluator.evaluate_rules(c)) for c in contexts]
+
+    def test_apply_rules_to_orders(self, rule_db):
+        rule_db.add(Client(code="C1", name="VIP 상회", client_type=ClientType.BOTH, address="서울"))
+        for idx, (zone, pallets, weight) in enumerate(
+            ((TemperatureZone.FROZEN, 4, 700.0), (TemperatureZone.REFRIGERATED, 12, 100.0))
+        ):
+            rule_db.add(Order(order_number=f"O{idx}", order_date=date(2026, 10, 18), temperature_zone=zone,
+                              pickup_client_id=1, delivery_client_id=1, pallet_count=pallets, weight_kg=weight))
+        rule_db.commit()
+
+        result = RuleEngine(rule_db).apply_rules_to_orders([1, 2])
+
+        assert {order_id: [r["rule_name"] for r in rules] for order_id, rules in result.items()} == {
+            1: ["heavy", "frozen", "vip"],
+            2: ["vip"],
+        }
@@ -0,0 +1,180 @@
+"""
+단위 테스트 - 텔레메트리 롤업 / 보존 기간
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func
+
+from app.models.dispatch import Dispatch
+from app.models.iot_sensor import SensorReading, SensorType, VehicleSensor
+from app.models.order import Order
+from app.models.telemetry_rollup import (
+    TelemetryRollupHour, TelemetryRollupMinute, TemperatureRollup5m, TemperatureRollupHour,
+)
+from app.models.uvis_gps import VehicleGPSLog, VehicleTemperatureLog
+from app.models.vehicle import Vehicle, VehicleType
+from app.models.vehicle_location import VehicleLocation
+from app.services.telemetry_storage_service import (
+    TelemetryStorageService, floor_time, next_month, partition_name,
+)
+
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+
+@pytest.fixture
+def storage_db(table_sessionmaker):
+    """원시 로그/집계 테이블을 가진 SQLite 세션"""
+    session = table_sessionmaker(
+        Vehicle, Order, Dispatch, VehicleSensor, VehicleGPSLog, VehicleTemperatureLog, VehicleLocation,
+        SensorReading, TelemetryRollupMinute, TelemetryRollupHour, TemperatureRollup5m, TemperatureRollupHour,
+    )()
+    for idx in (1, 2):
+        session.add(Vehicle(
+            code=f"V{idx}", plate_number=f"V{idx}", vehicle_type=VehicleType.FROZEN,
+            max_pallets=16, max_weight_kg=10000, tonnage=5.0
+        ))
+    session.add(VehicleSensor(vehicle_id=1, sensor_type=SensorType.FUEL, sensor_name="fuel"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _gps(vehicle_id, at, speed):
+    return VehicleGPSLog(
+        vehicle_id=vehicle_id, tid_id="T", bi_date="20261018", bi_time="120000",
+        bi_x_position="37.5", bi_y_position="127.0", speed_kmh=speed, created_at=at
+    )
+
+
+def _temperature(vehicle_id, at, temperature_a):
+    return VehicleTemperatureLog(
+        vehicle_id=vehicle_id, tid_id="T", tpl_date="20261018", tpl_time="120000",
+        temperature_a=temperature_a, created_at=at
+    )
+
+
+def _minutes(db, metric):
+    return {
+        (row.vehicle_id, row.bucket_start): (row.sample_count, row.value_sum, row.value_min, row.value_max)
+        for row in db.query(TelemetryRollupMinute).filter(TelemetryRollupMinute.metric == metric)
+    }
+
+
+class TestRollup:
+    """1분/1시간 집계 테스트"""
+
+    def test_minute_and_hour_aggregates(self, storage_db):
+        """차량 x 지표 x 분 단위 count/sum/min/max, 시간 집계는 분 집계 합산"""
+        base = datetime(2026, 10, 18, 10, 0, 0)
+        storage_db.add_all([
+            _gps(1, base + timedelta(seconds=10), 40),
+            _gps(1, base + timedelta(seconds=50), 60),
+            _gps(1, base + timedelta(minutes=1, seconds=5), 80),
+            _gps(2, base + timedelta(seconds=30), 20),
+            _temperature(1, base + timedelta(seconds=20), -18.0),
+            _temperature(1, base + timedelta(seconds=40), -16.0),
+            VehicleLocation(vehicle_id=1, latitude=37.5, longitude=127.0, speed=30.0, recorded_at=base),
+            SensorReading(sensor_id=1, vehicle_id=1, value=55.0, recorded_at=base),
+        ])
+        storage_db.commit()
+
+        result = TelemetryStorageService(storage_db).rollup(now=NOW)
+
+        assert result == {"gps": 3, "temperature": 1, "location": 1, "sensor": 1}
+        assert _minutes(storage_db, "gps.speed_kmh") == {
+            (1, base): (2, 100.0, 40.0, 60.0),
+            (1, base + timedelta(minutes=1)): (1, 80.0, 80.0, 80.0),
+            (2, base): (1, 20.0, 20.0, 20.0),
+        }
+        assert _minutes(storage_db, "temperature.a") == {(1, base): (2, -34.0, -18.0, -16.0)}
+        assert _minutes(storage_db, "temperature.b") == {}
+        assert _minutes(storage_db, "location.speed_kmh") == {(1, base): (1, 30.0, 30.0, 30.0)}
+        assert _minutes(storage_db, "sensor.1") == {(1, base): (1, 55.0, 55.0, 55.0)}
+
+        hour = storage_db.query(TelemetryRollupHour).filter_by(vehicle_id=1, metric="gps.speed_kmh").one()
+        assert hour.bucket_start == base
+        assert (hour.sample_count, hour.value_min, hour.value_max) == (3, 40.0, 80.0)
+        assert hour.value_avg == 60.0
+
+    def test_rerun_is_idempotent_and_picks_up_late_rows(self, storage_db):
+        """재실행해도 중복 없음, 재집계 구간의 늦은 데이터는 반영"""
+        base = NOW - timedelta(minutes=5)
+        storage_db.add(VehicleLocation(vehicle_id=1, latitude=37.5, longitude=127.0, speed=30.0, recorded_at=base))
+        storage_db.commit()
+
+        service = TelemetryStorageService(storage_db)
+        service.rollup(now=NOW)
+        service.rollup(now=NOW)
+        assert _minutes(storage_db, "location.speed_kmh") == {(1, base): (1, 30.0, 30.0, 30.0)}
+
+        # 단말 시각 기준으로 늦게 도착한 위치
+        storage_db.add(VehicleLocation(vehicle_id=1, latitude=37.5, longitude=127.0, speed=50.0, recorded_at=base))
+        storage_db.commit()
+        service.rollup(now=NOW + timedelta(minutes=1))
+
+        assert _minutes(storage_db, "location.speed_kmh") == {(1, base): (2, 80.0, 30.0, 50.0)}
+        assert storage_db.query(TelemetryRollupHour).filter_by(metric="location.speed_kmh").one().sample_count == 2
+
+    def test_backfill_advances_across_gaps(self, storage_db):
+        """1회 처리 구간(1일)보다 긴 데이터 공백이 있어도 진행"""
+        storage_db.add_all([
+            _gps(1, NOW - timedelta(days=10), 10),
+            _gps(1, NOW - timedelta(days=2), 20),
+        ])
+        storage_db.commit()
+
+        service = TelemetryStorageService(storage_db)
+        service.rollup(now=NOW)
+        service.rollup(now=NOW)
+        assert sorted(count for count, *_ in _minutes(storage_db, "gps.speed_kmh").values()) == [1, 1]
+
+        # 새 데이터가 없으면 마지막 구간만 다시 집계 (결과 동일)
+        service.rollup(now=NOW)
+        assert sorted(count for count, *_ in _minutes(storage_db, "gps.speed_kmh").values()) == [1, 1]
+
+
+class TestRetention:
+    """보존 기간 정리 테스트"""
+
+    def test_deletes_only_rolled_raw_rows(self, storage_db, monkeypatch):
+        """보존 기간이 지났어도 집계되지 않은 원시 로그는 유지"""
+        from app.services import telemetry_storage_service
+        monkeypatch.setattr(telemetry_storage_service.settings, "TELEMETRY_RAW_RETENTION_DAYS", 7)
+        monkeypatch.setattr(telemetry_storage_service.settings, "TELEMETRY_MINUTE_ROLLUP_RETENTION_DAYS", 30)
+
+        storage_db.add_all([
+            _gps(1, NOW - timedelta(days=40), 10),
+            _gps(1, NOW - timedelta(days=8), 20),
+            _gps(1, NOW - timedelta(days=1), 30),
+            _temperature(1, NOW - timedelta(days=8), -18.0),
+        ])
+        storage_db.commit()
+
+        service = TelemetryStorageService(storage_db)
+        # GPS 만 집계된 상태
+        service._rollup_minutes(telemetry_storage_service.TELEMETRY_SOURCES[0], NOW - timedelta(days=41), NOW)
+        storage_db.commit()
+
+        result = service.apply_retention(now=NOW)
+
+        assert result["vehicle_gps_logs"] == 2
+        assert "vehicle_temperature_logs" not in result
+        assert storage_db.query(VehicleGPSLog).count() == 1
+        assert storage_db.query(VehicleTemperatureLog).count() == 1
+        # 1분 집계 보존 기간(30일) 초과분 삭제
+        assert storage_db.query(func.count(TelemetryRollupMinute.id)).scalar() == 2
+
+
+class TestHelpers:
+    """버킷/파티션 이름 계산"""
+
+    def test_floor_and_partition_names(self):
+        assert floor_time(datetime(2026, 10, 18, 10, 59, 59), 3600) == datetime(2026, 10, 18, 10, 0, 0)
+        assert next_month(date(2026, 12, 1)) == date(2027, 1, 1)
+        assert partition_name("vehicle_gps_logs", date(2026, 10, 1)) == "vehicle_gps_logs_p202610"
+
+    def test_sqlite_has_no_partitions(self, storage_db):
+        assert TelemetryStorageService(storage_db).ensure_partitions() == []
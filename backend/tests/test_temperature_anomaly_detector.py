@@ -0,0 +1,171 @@
+"""
+단위 테스트 - 온도 이상 패턴 감지 (배치/온라인)
+"""
+
+import random
+import statistics
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from app.models.uvis_gps import VehicleTemperatureLog
+from app.models.vehicle import Vehicle, VehicleType
+from app.models.vehicle_location import TemperatureAlert
+from app.services.temperature_analytics import TemperatureAnalytics
+from app.services.temperature_anomaly_detector import OnlineAnomalyDetector, detect_anomalies
+
+
+BASE = datetime(2026, 10, 18, 0, 0, 0)
+
+
+def _reference(rows):
+    """기존 차량별 루프 구현 (측정값 0 이 없는 데이터 기준)"""
+    if len(rows) < 10:
+        return []
+    anomalies = []
+    for prev, curr in zip(rows, rows[1:]):
+        for sensor, index in (("A", 1), ("B", 2)):
+            if prev[index] is not None and curr[index] is not None and abs(curr[index] - prev[index]) > 5.0:
+                change = abs(curr[index] - prev[index])
+                anomalies.append(("RAPID_CHANGE", sensor, curr[0], round(change, 6), "HIGH" if change > 10 else "MEDIUM"))
+    temps_a = [row[1] for row in rows if row[1] is not None]
+    if temps_a:
+        mean = statistics.mean(temps_a)
+        count = 0
+        for row in rows:
+            count = count + 1 if row[1] is not None and abs(row[1] - mean) > 3.0 else 0
+            if count >= 6:
+                anomalies.append(("PROLONGED_DEVIATION", "A", row[0], round(abs(row[1] - mean), 6), "MEDIUM"))
+                count = 0
+    return anomalies
+
+
+def _summary(anomalies):
+    return [
+        (a["type"], a["sensor"], datetime.fromisoformat(a["timestamp"]),
+         round(a.get("change", a.get("deviation")), 6), a["severity"])
+        for a in anomalies
+    ]
+
+
+def _series(rng, count):
+    rows, temperature = [], -20.0
+    for idx in range(count):
+        temperature += rng.choice([0.5, -0.5, 1.5, -1.5, 6.5, -6.5, 11.5])
+        temperature = max(min(temperature, 5.0), -40.0) or 0.5
+        other = None if idx % 7 == 3 else temperature + rng.choice([0.25, 6.25, -12.25])
+        rows.append((BASE + timedelta(minutes=5 * idx), temperature, other))
+    return rows
+
+
+class TestBatchDetection:
+    """배치 감지 테스트"""
+
+    def test_matches_per_vehicle_loop(self):
+        """전체 차량 일괄 감지 결과 = 차량별 루프 결과"""
+        rng = random.Random(7)
+        fleet = {1: _series(rng, 120), 2: _series(rng, 80), 3: _series(rng, 9)}
+        frame = pd.DataFrame(
+            [(vehicle_id, *row) for vehicle_id, rows in fleet.items() for row in rows],
+            columns=["vehicle_id", "created_at", "temperature_a", "temperature_b"]
+        ).sample(frac=1, random_state=1)
+
+        result = detect_anomalies(frame)
+
+        assert 3 not in result  # 측정 10건 미만
+        for vehicle_id in (1, 2):
+            expected = _reference(fleet[vehicle_id])
+            assert expected
+            assert _summary(result[vehicle_id]) == expected
+
+    def test_vehicle_anomalies_from_db(self, table_sessionmaker):
+        db = table_sessionmaker(Vehicle, VehicleTemperatureLog)()
+        db.add(Vehicle(code="V1", plate_number="V1", vehicle_type=VehicleType.FROZEN,
+                       max_pallets=16, max_weight_kg=10000, tonnage=5.0))
+        start = datetime.utcnow() - timedelta(hours=2)
+        db.add_all([
+            VehicleTemperatureLog(vehicle_id=1, tid_id="T", tpl_date="20261018", tpl_time="000000",
+                                  temperature_a=-20.0 if idx != 5 else -8.0,
+                                  created_at=start + timedelta(minutes=5 * idx))
+            for idx in range(12)
+        ])
+        db.commit()
+
+        analytics = TemperatureAnalytics(db)
+        anomalies = analytics.detect_temperature_anomalies(1, hours=24)
+
+        assert [(a["type"], a["severity"]) for a in anomalies] == [("RAPID_CHANGE", "HIGH"), ("RAPID_CHANGE", "HIGH")]
+        assert analytics.detect_fleet_anomalies(hours=24) == {1: anomalies}
+        db.close()
+
+
+class TestOnlineDetection:
+    """온라인 감지 테스트"""
+
+    def test_rapid_change_on_ingest(self):
+        detector = OnlineAnomalyDetector()
+        assert detector.observe(1, BASE, -20.0, -19.0) == []
+
+        anomalies = detector.observe(1, BASE + timedelta(minutes=5), -13.0, -19.5)
+        assert [(a["type"], a["sensor"], a["change"]) for a in anomalies] == [("RAPID_CHANGE", "A", 7.0)]
+        # 이전 측정보다 오래된 측정은 무시
+        assert detector.observe(1, BASE, 10.0, 10.0) == []
+        # 차량별 상태 분리
+        assert detector.observe(2, BASE + timedelta(minutes=5), 10.0, None) == []
+
+    def test_prolonged_deviation_after_baseline(self):
+        detector = OnlineAnomalyDetector()
+        at = BASE
+        for _ in range(20):
+            assert detector.observe(1, at, -20.0, None) == []
+            at += timedelta(minutes=5)
+
+        # -24℃ 로 이탈 (급변 아님), 6회 연속 시 1회 감지 후 초기화
+        detected = []
+        for _ in range(12):
+            detected.append(detector.observe(1, at, -24.5, None))
+            at += timedelta(minutes=5)
+        flagged = [idx for idx, items in enumerate(detected) if items]
+        assert flagged == [5]
+        assert detected[5][0]["type"] == "PROLONGED_DEVIATION"
+
+    def test_observe_many_adds_alerts(self, table_sessionmaker):
+        db = table_sessionmaker(Vehicle, VehicleTemperatureLog, TemperatureAlert)()
+        db.add(Vehicle(code="V1", plate_number="V1", vehicle_type=VehicleType.FROZEN,
+                       max_pallets=16, max_weight_kg=10000, tonnage=5.0))
+        db.commit()
+
+        detector = OnlineAnomalyDetector()
+        now = datetime.utcnow()
+        alerts = detector.observe_many(db, [
+            {"vehicle_id": 1, "recorded_at": now, "temperature_a": -8.0, "temperature_b": None},
+            {"vehicle_id": 1, "recorded_at": now - timedelta(minutes=5), "temperature_a": -20.0, "temperature_b": None},
+        ])
+        db.commit()
+
+        assert [(alert.alert_type, alert.severity) for alert in alerts] == [("RAPID_CHANGE", "CRITICAL")]
+        assert db.query(TemperatureAlert).one().temperature_celsius == -8.0
+        db.close()
+
+    def test_state_restored_on_device_clock(self, table_sessionmaker):
+        """재시작 후 상태 복원은 수집 경로와 같은 단말기 시각 기준 (저장 시각이 늦어도 새 측정을 버리지 않음)"""
+        db = table_sessionmaker(Vehicle, VehicleTemperatureLog, TemperatureAlert)()
+        db.add(Vehicle(code="V1", plate_number="V1", vehicle_type=VehicleType.FROZEN,
+                       max_pallets=16, max_weight_kg=10000, tonnage=5.0))
+        now = datetime.utcnow().replace(microsecond=0)
+        measured = now - timedelta(minutes=20)
+        kst = measured + timedelta(hours=9)
+        db.add(VehicleTemperatureLog(
+            vehicle_id=1, tid_id="T1", tpl_date=kst.strftime("%Y%m%d"), tpl_time=kst.strftime("%H%M%S"),
+            temperature_a=-20.0, created_at=now  # 수집 지연으로 저장 시각이 측정 시각보다 늦음
+        ))
+        db.commit()
+
+        detector = OnlineAnomalyDetector()
+        alerts = detector.observe_many(db, [
+            {"vehicle_id": 1, "recorded_at": measured + timedelta(minutes=5), "temperature_a": -8.0, "temperature_b": None},
+        ])
+
+        assert detector._states[1].last_at == measured + timedelta(minutes=5)
+        assert [alert.alert_type for alert in alerts] == ["RAPID_CHANGE"]
+        db.close()
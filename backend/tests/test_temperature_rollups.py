@@ -0,0 +1,165 @@
+"""
+단위 테스트 - 온도 분석 집계 (5분/1시간/1일) 및 집계 기반 분석
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.telemetry_rollup import TemperatureRollup5m, TemperatureRollupDay, TemperatureRollupHour
+from app.models.uvis_gps import VehicleTemperatureLog
+from app.models.vehicle import Vehicle, VehicleType
+from app.services.telemetry_storage_service import floor_time
+from app.services.temperature_analytics import TemperatureAnalytics
+from app.services.temperature_rollup_service import TemperatureRollupService, tiered_ranges
+
+
+@pytest.fixture
+def rollup_db(table_sessionmaker):
+    """온도 로그/집계 테이블을 가진 SQLite 세션 (1: 냉동, 2: 냉장)"""
+    session = table_sessionmaker(
+        Vehicle, VehicleTemperatureLog, TemperatureRollup5m, TemperatureRollupHour, TemperatureRollupDay)(
+    )
+    for idx, vehicle_type in ((1, VehicleType.FROZEN), (2, VehicleType.REFRIGERATED)):
+        session.add(Vehicle(
+            code=f"V{idx}", plate_number=f"V{idx}", vehicle_type=vehicle_type,
+            max_pallets=16, max_weight_kg=10000, tonnage=5.0
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def base():
+    """2시간 전 정각 (분석 API 는 현재 시각 기준)"""
+    return floor_time(datetime.utcnow() - timedelta(hours=2), 3600)
+
+
+def _log(vehicle_id, at, temperature_a, temperature_b=None):
+    return VehicleTemperatureLog(
+        vehicle_id=vehicle_id, tid_id="T", tpl_date=at.strftime("%Y%m%d"), tpl_time=at.strftime("%H%M%S"),
+        temperature_a=temperature_a, temperature_b=temperature_b, created_at=at
+    )
+
+
+def _seed(db, base):
+    db.add_all([
+        _log(1, base, -18.0, -19.0),
+        _log(1, base + timedelta(minutes=1), -10.0, -19.0),   # A 초과 (다음 측정까지 60초)
+        _log(1, base + timedelta(minutes=2), -18.0, -19.0),
+        _log(1, base + timedelta(minutes=6), -30.0, -19.0),   # A 미달 (마지막 측정)
+        _log(2, base, 3.0),
+        _log(2, base + timedelta(minutes=5), 4.0),
+    ])
+    db.commit()
+    TemperatureRollupService(db).refresh(now=datetime.utcnow())
+
+
+class TestTemperatureRollupService:
+    """증분 집계 테스트"""
+
+    def test_refresh_aggregates_tiers(self, rollup_db, base):
+        _seed(rollup_db, base)
+
+        first = rollup_db.query(TemperatureRollup5m).filter_by(vehicle_id=1, bucket_start=base).one()
+        assert (first.record_count, first.temp_a_count, first.temp_a_sum) == (3, 3, -46.0)
+        assert (first.temp_a_min, first.temp_a_max) == (-18.0, -10.0)
+        assert (first.temp_a_too_hot, first.temp_a_too_cold, first.temp_a_out_of_range_seconds) == (1, 0, 60.0)
+        assert first.temp_b_too_hot + first.temp_b_too_cold == 0
+
+        hour = rollup_db.query(TemperatureRollupHour).filter_by(vehicle_id=1).one()
+        assert hour.bucket_start == base
+        assert (hour.record_count, hour.sample_slots, hour.temp_a_too_hot, hour.temp_a_too_cold) == (4, 2, 1, 1)
+        assert rollup_db.query(TemperatureRollupDay).filter_by(vehicle_id=1).one().record_count == 4
+
+        # 냉장 차량은 냉장 범위(0~5℃) 기준
+        refrigerated = rollup_db.query(TemperatureRollupHour).filter_by(vehicle_id=2).one()
+        assert refrigerated.temp_a_too_hot + refrigerated.temp_a_too_cold == 0
+
+    def test_refresh_is_idempotent_and_picks_up_late_rows(self, rollup_db, base):
+        _seed(rollup_db, base)
+        service = TemperatureRollupService(rollup_db)
+        service.refresh(now=datetime.utcnow())
+        assert rollup_db.query(TemperatureRollupHour).filter_by(vehicle_id=1).one().record_count == 4
+
+        rollup_db.add(_log(1, base + timedelta(minutes=7), -20.0))
+        rollup_db.commit()
+        service.refresh(now=datetime.utcnow())
+
+        assert rollup_db.query(TemperatureRollupHour).filter_by(vehicle_id=1).one().record_count == 5
+        assert rollup_db.query(TemperatureRollup5m).filter_by(vehicle_id=1).count() == 2
+
+    def test_tiered_ranges(self):
+        ranges = tiered_ranges(datetime(2026, 10, 1, 22, 7), datetime(2026, 10, 4, 1, 53))
+        assert [(model.__tablename__, start, end) for model, start, end in ranges] == [
+            ("temperature_rollups_5m", datetime(2026, 10, 1, 22, 5), datetime(2026, 10, 1, 23, 0)),
+            ("temperature_rollups_1h", datetime(2026, 10, 1, 23, 0), datetime(2026, 10, 2)),
+            ("temperature_rollups_1d", datetime(2026, 10, 2), datetime(2026, 10, 4)),
+            ("temperature_rollups_1h", datetime(2026, 10, 4), datetime(2026, 10, 4, 1, 0)),
+            ("temperature_rollups_5m", datetime(2026, 10, 4, 1, 0), datetime(2026, 10, 4, 1, 55)),
+        ]
+        assert [model for model, _, _ in tiered_ranges(datetime(2026, 10, 1, 10, 1), datetime(2026, 10, 1, 10, 20))] \
+            == [TemperatureRollup5m]
+
+
+class TestRollupAnalytics:
+    """집계 기반 분석 테스트"""
+
+    def test_compliance_report(self, rollup_db, base):
+        _seed(rollup_db, base)
+        analytics = TemperatureAnalytics(rollup_db)
+
+        report = analytics.get_compliance_report(base - timedelta(hours=1), datetime.utcnow())
+
+        assert (report["total_records"], report["violation_records"]) == (6, 2)
+        assert report["violation_summary"]["by_type"] == {"TOO_HOT": 1, "TOO_COLD": 1}
+        assert report["violation_summary"]["by_vehicle"] == {"V1": 2}
+        assert report["violation_summary"]["out_of_range_minutes"] == {"A": 1.0}
+        assert [(v["temperature"], v["violation_type"]) for v in report["violations"]] == [
+            (-30.0, "TOO_COLD"), (-10.0, "TOO_HOT"),
+        ]
+
+        # 원시 로그가 보존 기간으로 삭제되어도 집계는 유지 (세부 내역만 비어 있음)
+        rollup_db.query(VehicleTemperatureLog).delete()
+        rollup_db.commit()
+        report = analytics.get_compliance_report(base - timedelta(hours=1), datetime.utcnow())
+        assert (report["total_records"], report["violation_records"], report["violations"]) == (6, 2, [])
+
+    def test_empty_compliance_report(self, rollup_db):
+        report = TemperatureAnalytics(rollup_db).get_compliance_report(
+            datetime.utcnow() - timedelta(days=1), datetime.utcnow()
+        )
+        assert report["total_records"] == 0
+        assert report["violation_summary"]["by_type"] == {}
+
+    def test_performance_scores(self, rollup_db, base):
+        _seed(rollup_db, base)
+        analytics = TemperatureAnalytics(rollup_db)
+
+        scores = {perf["vehicle_id"]: perf for perf in analytics.get_performance_scores(days=7)}
+
+        frozen = scores[1]["metrics"]
+        assert frozen["sensor_a"]["compliance_rate"] == 50.0
+        assert frozen["sensor_a"]["avg_temperature"] == -19.0
+        assert frozen["sensor_b"]["stability"] == 0.0
+        assert frozen["data_collection_rate"] == round(2 / (7 * 288) * 100, 2)
+        # 냉장 차량은 냉장 범위 기준으로 모두 준수
+        assert scores[2]["metrics"]["sensor_a"]["compliance_rate"] == 100.0
+        assert analytics.get_vehicle_performance_score(1, days=7) == scores[1]
+
+    def test_performance_score_without_data(self, rollup_db):
+        assert TemperatureAnalytics(rollup_db).get_vehicle_performance_score(1, days=7)["grade"] == "N/A"
+
+    def test_temperature_trends(self, rollup_db, base):
+        _seed(rollup_db, base)
+
+        trends = TemperatureAnalytics(rollup_db).get_temperature_trends(vehicle_id=1, days=7)["trends"]
+
+        assert trends == [{
+            "date": base.date().isoformat(),
+            "avg_temperature": -19.0,
+            "min_temperature": -30.0,
+            "max_temperature": -10.0,
+            "record_count": 4,
+        }]
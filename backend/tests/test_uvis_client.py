@@ -0,0 +1,206 @@
+"""
+단위 테스트 - UVIS 비동기 클라이언트 (인증키 캐시, 동시 조회)
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.models.uvis_gps import UvisAccessKey, UvisApiLog, VehicleGPSLog, VehicleTemperatureLog
+from app.models.vehicle_location import VehicleLatestState
+from app.models.vehicle import Vehicle
+from app.services import uvis_gps_service
+from app.services.uvis_gps_service import AccessKeyCache, DeviceVehicleMap, UvisGPSService
+from app.services.vehicle_state_store import vehicle_state_store
+
+
+class FakeUvis:
+    """UVIS API 모의 서버 (응답 지연 포함)"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        method = request.url.params.get("method")
+        gubun = request.url.params.get("GUBUN")
+        self.calls.append(gubun or method)
+        await asyncio.sleep(self.delay)
+
+        if method == "GetAccessKeyWithValues":
+            return httpx.Response(200, json=[{"AccessKey": f"KEY{len(self.calls)}"}])
+        if gubun == "01":
+            return httpx.Response(200, json=[{
+                "TID_ID": "TID00000001", "BI_DATE": "20260101", "BI_TIME": "120000",
+                "BI_TURN_ONOFF": "On", "BI_X_POSITION": "37.5", "BI_Y_POSITION": "127.0",
+                "BI_GPS_SPEED": 40,
+            }])
+        return httpx.Response(200, json=[{
+            "TID_ID": "TID00000001", "TPL_DATE": "20260101", "TPL_TIME": "120000",
+            "TPL_SIGNAL_A": 1, "TPL_DEGREE_A": "18",
+        }])
+
+    @property
+    def auth_calls(self) -> int:
+        return self.calls.count("GetAccessKeyWithValues")
+
+
+@pytest.fixture
+def fake_uvis(monkeypatch):
+    fake = FakeUvis()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    monkeypatch.setattr(uvis_gps_service, "get_uvis_client", lambda: client)
+    AccessKeyCache.invalidate()
+    DeviceVehicleMap.invalidate()
+    yield fake
+    AccessKeyCache.invalidate()
+    DeviceVehicleMap.invalidate()
+
+
+@pytest.fixture
+def uvis_db(table_sessionmaker):
+    """UVIS 관련 테이블을 가진 SQLite 세션"""
+    session = table_sessionmaker(
+        Vehicle, VehicleLatestState, UvisAccessKey, UvisApiLog, VehicleGPSLog, VehicleTemperatureLog)(
+    )
+    yield session
+    session.close()
+    vehicle_state_store.invalidate()
+
+
+class TestAccessKeyCache:
+    """인증키 캐시 테스트"""
+
+    async def test_key_issued_once_and_cached(self, fake_uvis, uvis_db):
+        """동시 요청에도 발급은 1회, 이후 캐시 사용"""
+        service = UvisGPSService(uvis_db)
+
+        keys = await asyncio.gather(*[service.get_valid_access_key() for _ in range(5)])
+        await service.get_valid_access_key()
+
+        assert len(set(keys)) == 1
+        assert fake_uvis.auth_calls == 1
+
+    async def test_proactive_refresh_before_expiry(self, fake_uvis, uvis_db):
+        """만료 임박 키는 미리 재발급"""
+        service = UvisGPSService(uvis_db)
+        AccessKeyCache.store("OLDKEY", datetime.utcnow() + timedelta(seconds=30))
+
+        key = await service.get_valid_access_key()
+
+        assert key != "OLDKEY"
+        assert fake_uvis.auth_calls == 1
+
+    async def test_reuses_key_issued_by_other_worker(self, fake_uvis, uvis_db):
+        """DB에 유효한 키가 있으면 발급하지 않음"""
+        uvis_db.add(UvisAccessKey(
+            serial_key="S", access_key="SHARED", is_active=True,
+            expires_at=datetime.utcnow() + timedelta(minutes=4)
+        ))
+        uvis_db.commit()
+
+        assert await UvisGPSService(uvis_db).get_valid_access_key() == "SHARED"
+        assert fake_uvis.auth_calls == 0
+
+    async def test_key_db_work_runs_off_event_loop(self, fake_uvis, uvis_db, monkeypatch):
+        """키 조회/저장은 스레드 전용 세션에서 실행"""
+        find = UvisGPSService._find_valid_key
+        threads = []
+
+        def slow_find(db, refresh_after):
+            threads.append(threading.get_ident())
+            time.sleep(0.2)
+            return find(db, refresh_after)
+
+        monkeypatch.setattr(UvisGPSService, "_find_valid_key", staticmethod(slow_find))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        key = await UvisGPSService(uvis_db).get_valid_access_key()
+        task.cancel()
+
+        assert ticks >= 10
+        assert threads and threads[0] != threading.get_ident()
+        stored = uvis_db.query(UvisAccessKey).filter(UvisAccessKey.is_active == True).one()
+        assert stored.access_key == key
+
+
+class TestConcurrentSync:
+    """GPS/온도 동시 조회 테스트"""
+
+    async def test_gps_and_temperature_fetched_concurrently(self, fake_uvis, uvis_db):
+        """두 요청이 겹쳐서 실행되고 결과가 저장됨"""
+        service = UvisGPSService(uvis_db)
+        await service.get_valid_access_key()
+        fake_uvis.delay = 0.2
+
+        started = time.perf_counter()
+        gps_data, temperature_data = await service.sync_realtime_data()
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.35
+        assert len(gps_data) == 1 and len(temperature_data) == 1
+        assert uvis_db.query(VehicleGPSLog).count() == 1
+        assert uvis_db.query(VehicleTemperatureLog).one().temperature_a == -18.0
+
+    async def test_event_loop_not_blocked(self, fake_uvis, uvis_db):
+        """UVIS 응답 대기 중에도 다른 코루틴 실행"""
+        service = UvisGPSService(uvis_db)
+        await service.get_valid_access_key()
+        fake_uvis.delay = 0.2
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await service.get_vehicle_gps_data()
+        task.cancel()
+
+        assert ticks >= 10
+
+    async def test_db_writes_run_off_event_loop(self, fake_uvis, uvis_db, monkeypatch):
+        """매핑 조회/INSERT 가 느려도 이벤트 루프는 계속 실행 (스레드 전용 세션 사용)"""
+        service = UvisGPSService(uvis_db)
+        await service.get_valid_access_key()
+
+        resolve = DeviceVehicleMap.resolve.__func__
+        sessions = []
+
+        def slow_resolve(cls, db, tid_ids):
+            sessions.append(db)
+            time.sleep(0.2)
+            return resolve(cls, db, tid_ids)
+
+        monkeypatch.setattr(DeviceVehicleMap, "resolve", classmethod(slow_resolve))
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await service.sync_realtime_data()
+        task.cancel()
+
+        assert ticks >= 10
+        assert len(sessions) == 2 and all(db is not uvis_db for db in sessions)
+        assert uvis_db.query(VehicleGPSLog).count() == 1
+        assert uvis_db.query(UvisApiLog).filter(UvisApiLog.api_type == "temperature").count() == 1
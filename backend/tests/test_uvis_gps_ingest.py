@@ -0,0 +1,190 @@
+"""
+단위 테스트 - UVIS GPS/온도 일괄 수집
+"""
+
+import time
+
+import pytest
+from sqlalchemy import event
+
+from app.models.uvis_gps import VehicleGPSLog, VehicleTemperatureLog
+from app.models.vehicle_location import TemperatureAlert, VehicleLatestState
+from app.models.vehicle import Vehicle, VehicleType
+from app.services.uvis_gps_service import (
+    DeviceVehicleMap, UvisGPSService, parse_gps_payload, parse_temperature_payload
+)
+from app.services.vehicle_state_store import vehicle_state_store
+
+
+def _gps_item(tid_id, **overrides):
+    item = {
+        "TID_ID": tid_id,
+        "BI_DATE": "20260101",
+        "BI_TIME": "120000",
+        "CM_NUMBER": "12가3456",
+        "BI_TURN_ONOFF": "On",
+        "BI_X_POSITION": "37.5665",
+        "BI_Y_POSITION": "126.9780",
+        "BI_GPS_SPEED": 60,
+    }
+    item.update(overrides)
+    return item
+
+
+@pytest.fixture
+def uvis_db(table_sessionmaker):
+    """차량/GPS/온도 로그 테이블을 가진 SQLite 세션"""
+    session = table_sessionmaker(
+        Vehicle, VehicleLatestState, VehicleGPSLog, VehicleTemperatureLog, TemperatureAlert,
+    )()
+    DeviceVehicleMap.invalidate()
+
+    for idx in range(1, 4):
+        session.add(Vehicle(
+            code=f"V{idx}", plate_number=f"V{idx}", vehicle_type=VehicleType.FROZEN,
+            max_pallets=16, max_weight_kg=10000, tonnage=5.0,
+            uvis_device_id=f"TID0000000{idx}"
+        ))
+    session.commit()
+
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session.statements = statements
+
+    yield session
+    session.close()
+    DeviceVehicleMap.invalidate()
+    vehicle_state_store.invalidate()
+
+
+class TestPayloadParsing:
+    """UVIS 응답 일괄 파싱 테스트"""
+
+    def test_gps_fields(self):
+        """좌표/시동/속도 변환 및 비정상 값 처리"""
+        rows = parse_gps_payload([
+            _gps_item("TID00000001"),
+            _gps_item("TID00000002", BI_TURN_ONOFF="Off", BI_GPS_SPEED=255, BI_X_POSITION=""),
+            _gps_item("TID00000009", BI_TURN_ONOFF=None, BI_GPS_SPEED="abc", BI_Y_POSITION="bad"),
+            _gps_item(None),
+        ], {"TID00000001": 1, "TID00000002": 2})
+
+        assert len(rows) == 3  # 단말기 ID 없는 항목 제외
+
+        assert rows[0]["vehicle_id"] == 1
+        assert rows[0]["latitude"] == pytest.approx(37.5665)
+        assert rows[0]["is_engine_on"] is True
+        assert rows[0]["speed_kmh"] == 60
+
+        assert rows[1]["is_engine_on"] is False
+        assert rows[1]["bi_gps_speed"] == 255
+        assert rows[1]["speed_kmh"] == 0
+        assert rows[1]["latitude"] is None
+        assert rows[1]["bi_x_position"] == ""
+
+        assert rows[2]["vehicle_id"] is None
+        assert rows[2]["bi_turn_onoff"] == "Off"
+        assert rows[2]["speed_kmh"] == 0
+        assert rows[2]["longitude"] is None
+
+    def test_temperature_sign(self):
+        """부호(1='-') 적용"""
+        rows = parse_temperature_payload([
+            {"TID_ID": "TID00000001", "TPL_DATE": "20260101", "TPL_TIME": "120000",
+             "TPL_SIGNAL_A": "1", "TPL_DEGREE_A": "18.5", "TPL_SIGNAL_B": 0, "TPL_DEGREE_B": "3"},
+            {"TID_ID": "TID00000002", "TPL_SIGNAL_A": 0, "TPL_DEGREE_A": None},
+        ], {"TID00000001": 1})
+
+        assert rows[0]["temperature_a"] == -18.5
+        assert rows[0]["temperature_b"] == 3.0
+        assert rows[0]["tpl_signal_a"] == 1
+        assert rows[1]["temperature_a"] is None
+        assert rows[1]["tpl_date"] == ""
+
+    def test_non_integral_values_become_null(self):
+        """소수/무한대 부호·속도 값은 해당 필드만 None (TypeError 로 전체 실패하지 않음)"""
+        rows = parse_temperature_payload([
+            {"TID_ID": "TID00000001", "TPL_SIGNAL_A": "1.5", "TPL_DEGREE_A": "18", "TPL_SIGNAL_B": 1.0, "TPL_DEGREE_B": "2"},
+        ], {"TID00000001": 1})
+        assert rows[0]["tpl_signal_a"] is None and rows[0]["temperature_a"] == 18.0
+        assert rows[0]["tpl_signal_b"] == 1 and rows[0]["temperature_b"] == -2.0
+
+        gps = parse_gps_payload([_gps_item("TID00000001", BI_GPS_SPEED="inf")], {"TID00000001": 1})
+        assert gps[0]["bi_gps_speed"] is None and gps[0]["speed_kmh"] == 0
+
+
+class TestBulkIngest:
+    """일괄 저장 테스트"""
+
+    async def test_fleet_poll_uses_single_lookup_and_insert(self, uvis_db):
+        """차량 매핑 조회 1회 + INSERT 1회로 저장"""
+        service = UvisGPSService(uvis_db)
+        items = [_gps_item(f"TID0000000{idx % 3 + 1}") for idx in range(300)]
+
+        saved = await service._save_gps_data(items)
+
+        assert saved == 300
+        assert uvis_db.query(VehicleGPSLog).count() == 300
+        assert uvis_db.query(VehicleGPSLog).filter(VehicleGPSLog.vehicle_id.is_(None)).count() == 0
+        inserts = [s for s in uvis_db.statements if s.startswith("INSERT INTO vehicle_gps_logs")]
+        selects = [s for s in uvis_db.statements if "FROM vehicles" in s]
+        assert len(inserts) == 1
+        assert len(selects) == 1
+
+        # 두 번째 폴링은 캐시된 매핑 사용
+        uvis_db.statements.clear()
+        await service._save_gps_data(items)
+        assert not [s for s in uvis_db.statements if "FROM vehicles" in s]
+
+    async def test_temperature_ingest(self, uvis_db):
+        """온도 데이터 일괄 저장"""
+        service = UvisGPSService(uvis_db)
+        saved = await service._save_temperature_data([
+            {"TID_ID": "TID00000003", "TPL_DATE": "20260101", "TPL_TIME": "120000",
+             "TPL_SIGNAL_A": 1, "TPL_DEGREE_A": "20"},
+        ])
+
+        assert saved == 1
+        log = uvis_db.query(VehicleTemperatureLog).one()
+        assert log.vehicle_id == 3
+        assert log.temperature_a == -20.0
+
+    async def test_malformed_row_does_not_drop_poll(self, uvis_db):
+        """부호 값이 소수인 항목이 있어도 나머지 항목은 저장"""
+        service = UvisGPSService(uvis_db)
+        saved = await service._save_temperature_data([
+            {"TID_ID": "TID00000001", "TPL_SIGNAL_A": 1, "TPL_DEGREE_A": "18"},
+            {"TID_ID": "TID00000002", "TPL_SIGNAL_A": "1.5", "TPL_DEGREE_A": "5"},
+            {"TID_ID": "TID00000003", "TPL_SIGNAL_A": 0, "TPL_DEGREE_A": "4"},
+        ])
+
+        assert saved == 3
+        logs = {log.vehicle_id: log for log in uvis_db.query(VehicleTemperatureLog).all()}
+        assert logs[1].temperature_a == -18.0 and logs[3].temperature_a == 4.0
+        assert logs[2].tpl_signal_a is None
+
+    async def test_map_refreshed_on_device_change(self, uvis_db):
+        """단말기 변경 시 매핑 무효화"""
+        service = UvisGPSService(uvis_db)
+        await service._save_gps_data([_gps_item("TID00000001")])
+
+        vehicle = uvis_db.query(Vehicle).filter(Vehicle.code == "V1").one()
+        vehicle.uvis_device_id = "TID00000099"
+        uvis_db.commit()
+
+        await service._save_gps_data([_gps_item("TID00000099")])
+        latest = uvis_db.query(VehicleGPSLog).order_by(VehicleGPSLog.id.desc()).first()
+        assert latest.vehicle_id == vehicle.id
+
+    async def test_unknown_device_reload_throttled(self, uvis_db, monkeypatch):
+        """미등록 단말기는 MISS_REFRESH_SECONDS 간격으로만 재조회"""
+        service = UvisGPSService(uvis_db)
+        await service._save_gps_data([_gps_item("TID00000001")])
+        uvis_db.statements.clear()
+
+        await service._save_gps_data([_gps_item("UNKNOWN0001")])
+        assert not [s for s in uvis_db.statements if "FROM vehicles" in s]
+
+        monkeypatch.setattr(DeviceVehicleMap, "_loaded_at", time.monotonic() - DeviceVehicleMap.MISS_REFRESH_SECONDS - 1)
+        await service._save_gps_data([_gps_item("UNKNOWN0001")])
+        assert len([s for s in uvis_db.statements if "FROM vehicles" in s]) == 1
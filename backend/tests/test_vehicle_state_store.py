@@ -0,0 +1,146 @@
+"""
+단위 테스트 - 차량 최신 상태 저장소
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.uvis_gps import VehicleGPSLog, VehicleTemperatureLog
+from app.models.vehicle import Vehicle, VehicleType
+from app.models.vehicle_location import VehicleLatestState
+from app.services.uvis_gps_service import DeviceVehicleMap, UvisGPSService
+from app.services.vehicle_state_store import VehicleStateStore, vehicle_state_store
+
+
+@pytest.fixture
+def state_db(table_sessionmaker):
+    """차량/로그/최신 상태 테이블을 가진 SQLite 세션 팩토리"""
+    # :memory: DB를 세션 간 공유
+    Session = table_sessionmaker(Vehicle, VehicleLatestState, VehicleGPSLog, VehicleTemperatureLog)
+
+    session = Session()
+    for idx in range(1, 4):
+        session.add(Vehicle(
+            code=f"V{idx}", plate_number=f"V{idx}", vehicle_type=VehicleType.FROZEN,
+            max_pallets=16, max_weight_kg=10000, tonnage=5.0,
+            uvis_device_id=f"TID0000000{idx}"
+        ))
+    session.commit()
+    session.close()
+
+    statements = []
+    event.listen(Session.kw["bind"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+    Session.statements = statements
+
+    vehicle_state_store.invalidate()
+    DeviceVehicleMap.invalidate()
+    yield Session
+    vehicle_state_store.invalidate()
+    DeviceVehicleMap.invalidate()
+
+
+class TestVehicleStateStore:
+    """저장소 읽기/쓰기 테스트"""
+
+    def test_record_applies_on_commit_only(self, state_db):
+        """커밋 시 메모리 반영, 롤백 시 폐기"""
+        store = VehicleStateStore()
+        db = state_db()
+        now = datetime.utcnow()
+
+        store.record_positions(db, [{"vehicle_id": 1, "latitude": 37.5, "longitude": 127.0, "recorded_at": now}])
+        db.rollback()
+        assert store.get(db, 1) is None
+
+        store.record_positions(db, [{"vehicle_id": 1, "latitude": 37.6, "longitude": 127.1, "recorded_at": now}])
+        store.record_temperatures(db, [{"vehicle_id": 1, "temperature_a": -18.0, "recorded_at": now}])
+        db.commit()
+
+        state = store.get(db, 1)
+        assert state.position == (37.6, 127.1)
+        assert state.temperature_a == -18.0
+        assert db.query(VehicleLatestState).count() == 1
+
+    def test_older_measurement_ignored(self, state_db):
+        """늦게 도착한 과거 측정값은 덮어쓰지 않음 (DB, 메모리 모두)"""
+        store = VehicleStateStore()
+        db = state_db()
+        now = datetime.utcnow()
+
+        store.record_positions(db, [{"vehicle_id": 2, "latitude": 37.5, "longitude": 127.0, "recorded_at": now}])
+        db.commit()
+        store.record_positions(db, [
+            {"vehicle_id": 2, "latitude": 35.0, "longitude": 129.0, "recorded_at": now - timedelta(minutes=5)}
+        ])
+        db.commit()
+
+        assert store.get(db, 2).latitude == 37.5
+        assert db.query(VehicleLatestState).get(2).latitude == 37.5
+
+    def test_reads_are_served_from_memory(self, state_db):
+        """로드 후 조회는 DB 쿼리 없이 처리"""
+        writer = VehicleStateStore()
+        db = state_db()
+        writer.record_positions(db, [
+            {"vehicle_id": vehicle_id, "latitude": 37.0 + vehicle_id, "longitude": 127.0}
+            for vehicle_id in (1, 2, 3)
+        ])
+        db.commit()
+
+        reader = VehicleStateStore()
+        assert len(reader.get_fleet(db)) == 3
+
+        state_db.statements.clear()
+        for _ in range(100):
+            reader.get(db, 1)
+            reader.get_many(db, [1, 2, 3])
+        assert state_db.statements == []
+
+    def test_incremental_sync_from_other_worker(self, state_db, monkeypatch):
+        """다른 워커(저장소 인스턴스)의 갱신을 증분 동기화로 반영"""
+        worker_a, worker_b = VehicleStateStore(), VehicleStateStore()
+        db = state_db()
+
+        assert worker_b.get(db, 3) is None
+
+        worker_a.record_positions(db, [{"vehicle_id": 3, "latitude": 36.0, "longitude": 128.0}])
+        db.commit()
+
+        monkeypatch.setattr(worker_b, "_synced_at", 0.0)
+        assert worker_b.get(db, 3).position == (36.0, 128.0)
+
+
+class TestIngestUpdatesStore:
+    """UVIS 수집 경로 연동 테스트"""
+
+    async def test_uvis_poll_updates_latest_state(self, state_db):
+        """GPS/온도 수집 시 차량별 최신 상태 갱신 (단말기 시각 KST → UTC)"""
+        db = state_db()
+        service = UvisGPSService(db)
+        kst_now = datetime.utcnow() + timedelta(hours=9)
+        earlier = kst_now - timedelta(minutes=1)
+
+        await service._save_gps_data([
+            {"TID_ID": "TID00000001", "BI_DATE": earlier.strftime("%Y%m%d"), "BI_TIME": earlier.strftime("%H%M%S"),
+             "BI_TURN_ONOFF": "On", "BI_X_POSITION": "37.1", "BI_Y_POSITION": "127.1", "BI_GPS_SPEED": 30},
+            {"TID_ID": "TID00000001", "BI_DATE": kst_now.strftime("%Y%m%d"), "BI_TIME": kst_now.strftime("%H%M%S"),
+             "BI_TURN_ONOFF": "On", "BI_X_POSITION": "37.2", "BI_Y_POSITION": "127.2", "BI_GPS_SPEED": 50},
+            {"TID_ID": "TID00000002", "BI_DATE": kst_now.strftime("%Y%m%d"), "BI_TIME": kst_now.strftime("%H%M%S"),
+             "BI_TURN_ONOFF": "Off", "BI_X_POSITION": "", "BI_Y_POSITION": "", "BI_GPS_SPEED": 0},
+        ])
+        await service._save_temperature_data([
+            {"TID_ID": "TID00000001", "TPL_DATE": kst_now.strftime("%Y%m%d"), "TPL_TIME": kst_now.strftime("%H%M%S"),
+             "TPL_SIGNAL_A": 1, "TPL_DEGREE_A": "19"},
+        ])
+
+        state = service.get_vehicle_state(1)
+        assert state.position == (37.2, 127.2)
+        assert state.speed_kmh == 50
+        assert state.temperature_a == -19.0
+        assert abs(state.position_age_seconds()) < 5
+        assert await service.get_vehicle_location(1) == (37.2, 127.2)
+
+        # 좌표 없는 항목은 위치를 갱신하지 않음
+        assert service.get_vehicle_state(2) is None
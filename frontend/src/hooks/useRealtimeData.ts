@@ -23,6 +23,7 @@ interface UseRealtimeDataOptions {
   autoReconnect?: boolean;
   reconnectInterval?: number;
   maxReconnectAttempts?: number;
+  mergeUpdates?: boolean; // 부분 업데이트(delta)를 기존 데이터에 병합
 }
 
 interface UseRealtimeDataReturn<T> {
@@ -46,7 +47,8 @@ export function useRealtimeData<T = any>(
     onError,
     autoReconnect = true,
     reconnectInterval = 1000, // Start with 1 second
-    maxReconnectAttempts = 10
+    maxReconnectAttempts = 10,
+    mergeUpdates = false
   } = options;
 
   const [data, setData] = useState<T | null>(null);
@@ -115,7 +117,8 @@ export function useRealtimeData<T = any>(
           // Only update state for actual data messages or messages with meaningful data
           if (message.type !== 'connected' && message.type !== 'keepalive') {
             // Update data
-            setData(message.data || message);
+            const update = message.data || message;
+            setData((prev) => (mergeUpdates && prev ? { ...prev, ...update } : update));
           }
           
           // Call custom message handler (even for system messages)
@@ -179,6 +182,7 @@ export function useRealtimeData<T = any>(
     onError,
     autoReconnect,
     maxReconnectAttempts,
+    mergeUpdates,
     getBackoffDelay
   ]);
 
@@ -298,7 +302,8 @@ export function useRealtimeDashboard(token?: string) {
     onConnect: () => console.log('📊 Dashboard WebSocket connected'),
     onDisconnect: () => console.log('📊 Dashboard WebSocket disconnected'),
     autoReconnect: true,
-    maxReconnectAttempts: 15 // Allow more attempts for dashboard
+    maxReconnectAttempts: 15, // Allow more attempts for dashboard
+    mergeUpdates: true // 첫 메시지 이후에는 변경된 항목만 수신
   });
 }
 
@@ -53,7 +53,8 @@ const DashboardPage: React.FC = () => {
           try {
             const data = JSON.parse(event.data);
             console.log('📊 Dashboard stats updated:', data);
-            setStats(data);
+            // 첫 메시지는 전체 통계, 이후에는 변경된 항목만 수신
+            setStats((prev) => ({ ...(prev ?? {}), ...data } as DashboardStats));
             setLoading(false);
           } catch (error) {
             console.error('Failed to parse WebSocket message:', error);